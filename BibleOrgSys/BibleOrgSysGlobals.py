@@ -136,6 +136,7 @@ commandLineArguments = Namespace()
 strictCheckingFlag = debugFlag = False
 maxProcesses = 1
 alreadyMultiprocessing = False # Not used in this module, but set to prevent multiple levels of multiprocessing (illegal)
+maxIOThreads = 8 # Number of threads used for prefetching (book) files -- see InputOutput/FilePrefetcher.py
 verbosityLevel = 2
 verbosityString = 'Normal'
 
@@ -1499,6 +1500,7 @@ def addStandardOptionsAndProcess( parserObject, exportAvailable=False ) -> None:
     EWgroup.add_argument( '-w', '--warnings', action='store_true', dest='warnings', default=False, help="log warnings and errors to console" )
     verbosityGroup.add_argument( '-d', '--debug', action='store_true', dest='debug', default=False, help="output even more information for the programmer/debugger" )
     parserObject.add_argument( '-1', '--single', action='store_true', dest='single', default=False, help="don't use multiprocessing (that's the digit one)" )
+    parserObject.add_argument( '--iothreads', type=int, dest='iothreads', default=None, metavar='N', help="number of threads for reading files (1 to disable prefetching)" )
     parserObject.add_argument( '-c', '--strict', action='store_true', dest='strict', default=False, help="perform very strict checking of all input" )
     if exportAvailable:
         parserObject.add_argument('-x', '--export', action='store_true', dest='export', default=False, help="export the data file(s)")
@@ -1525,6 +1527,8 @@ def addStandardOptionsAndProcess( parserObject, exportAvailable=False ) -> None:
         maxProcesses = maxProcesses - reservedProcesses
         #dPrint( 'Quiet', debuggingThisModule, "maxProcesses", maxProcesses )
     if commandLineArguments.single: maxProcesses = 1
+    global maxIOThreads
+    if commandLineArguments.iothreads is not None: maxIOThreads = max( 1, commandLineArguments.iothreads )
     if debugFlag or debuggingThisModule:
         if maxProcesses > 1:
             dPrint( 'Quiet', debuggingThisModule, f"DEBUG/SINGLE MODE: Reducing maxProcesses from {maxProcesses} down to 1" )
@@ -1543,6 +1547,7 @@ def printAllGlobals( indent=None ):
     dPrint( 'Quiet', debuggingThisModule, "{}commandLineArguments: {}".format( ' '*indent, commandLineArguments ) )
     dPrint( 'Quiet', debuggingThisModule, "{}debugFlag: {}".format( ' '*indent, debugFlag ) )
     dPrint( 'Quiet', debuggingThisModule, "{}maxProcesses: {}".format( ' '*indent, maxProcesses ) )
+    dPrint( 'Quiet', debuggingThisModule, "{}maxIOThreads: {}".format( ' '*indent, maxIOThreads ) )
     dPrint( 'Quiet', debuggingThisModule, "{}verbosityString: {}".format( ' '*indent, verbosityString ) )
     dPrint( 'Quiet', debuggingThisModule, "{}verbosityLevel: {}".format( ' '*indent, verbosityLevel ) )
     dPrint( 'Quiet', debuggingThisModule, "{}strictCheckingFlag: {}".format( ' '*indent, strictCheckingFlag ) )
@@ -52,8 +52,8 @@ Contains functions:
     toBibleDoor( outputFolderpath:Optional[Path]=None, removeVerseBridges=False )
     toUSX2XML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
     toUSXXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
-    toUSFXXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
-    toOSISXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
+    toUSFXXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None, humanReadable=True )
+    toOSISXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None, humanReadable=True )
     toZefaniaXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
     toHaggaiXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
     toOpenSongXML( outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None )
@@ -64,12 +64,18 @@ Contains functions:
     toMyBible( outputFolderpath:Optional[Path]=None )
     toSwordSearcher( outputFolderpath:Optional[Path]=None )
     toDrupalBible( outputFolderpath:Optional[Path]=None )
-    toPhotoBible( outputFolderpath:Optional[Path]=None )
+    toPhotoBible( outputFolderpath:Optional[Path]=None, rendererName:Optional[str]=None, maxRenderers:Optional[int]=None )
     toODF( outputFolderpath:Optional[Path]=None ) for LibreOffice/OpenOffice exports
-    toTeX( outputFolderpath:Optional[Path]=None ) and thence to PDF
-    doAllExports( givenOutputFolderName=None, wantPhotoBible=False, wantODFs=False, wantPDFs=False )
+    toTeX( outputFolderpath:Optional[Path]=None, maxJobs:Optional[int]=None ) and thence to PDF
+    doAllExports( givenOutputFolderName=None, wantPhotoBible=False, wantODFs=False, wantPDFs=False, wantArchives=True )
         (doAllExports supports multiprocessing — it shares the exports out amongst available processes)
 
+Most exports also make zipped (and some also tarred) archives of their files for easier downloading
+    (using ZipPackager which deflates the files in background threads, often as soon as they're written).
+    These can be turned off by setting self.wantExportArchives to False (or with doAllExports( wantArchives=False )).
+
+The PhotoBible pages are rendered in batches in the background by ImageMagick or Pillow (see PhotoPageRenderer.py).
+
 Note that not all exports export all books.
     Some formats only handle subsets of books (or markers/fields),
         e.g. may not handle front or back matter, glossaries, or deuterocanonical books.
@@ -89,7 +95,7 @@ import zipfile
 import tarfile
 import subprocess
 import multiprocessing
-import signal
+from contextlib import nullcontext
 
 # BibleOrgSys imports
 if __name__ == '__main__':
@@ -99,7 +105,10 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.InputOutput import ControlFiles
-from BibleOrgSys.InputOutput.MLWriter import MLWriter
+from BibleOrgSys.InputOutput.MLWriter import MLWriter, validateMLWriters
+from BibleOrgSys.InputOutput.ZipPackager import ZipPackager, zipFolder
+from BibleOrgSys.InputOutput.PhotoPageRenderer import getPhotoPageRenderer
+from BibleOrgSys.InputOutput.ExternalJobRunner import ExternalJobRunner, OfficeJobRunner
 from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS, BOS_NESTING_MARKERS, InternalBibleExtraList
 from BibleOrgSys.Internals.InternalBible import InternalBible
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
@@ -111,10 +120,10 @@ from BibleOrgSys.Reference.USFM3Markers import OFTEN_IGNORED_USFM_HEADER_MARKERS
 from BibleOrgSys.Misc.NoisyReplaceFunctions import noisyRegExDeleteAll
 
 
-LAST_MODIFIED_DATE = '2020-07-14' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "BibleWriter"
 PROGRAM_NAME = "Bible writer"
-PROGRAM_VERSION = '0.96'
+PROGRAM_VERSION = '0.99'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -141,7 +150,8 @@ def setDefaultControlFolderpath( newFolderName:Path ) -> None:
 
 
 
-ALL_CHAR_MARKERS = None
+ALL_CHAR_MARKERS = None # Ordered list (for iterating)
+ALL_CHAR_MARKERS_SET = None # Same markers as a frozenset (for fast membership tests)
 # The following are used by both toHTML5 and toBibleDoor
 ipHTMLClassDict = {'ip':'introductionParagraph', 'ipi':'introductionParagraphIndented',
                     'ipq':'introductionQuoteParagraph', 'ipr':'introductionRightAlignedParagraph',
@@ -163,27 +173,6 @@ pqHTMLClassDict = {'p':'proseParagraph', 'm':'flushLeftParagraph',
 
 
 
-def killLibreOfficeServiceManager() -> None:
-    """
-    Doesn't work in Windows.
-    """
-    vPrint( 'Info', debuggingThisModule, "Killing LibreOffice ServiceManager…" )
-
-    p = subprocess.Popen(['ps', 'xa'], stdout=subprocess.PIPE) # NOTE: Linux-only code!!!
-    out, err = p.communicate()
-    for lineBytes in out.splitlines():
-        line = bytes.decode( lineBytes )
-        #dPrint( 'Quiet', debuggingThisModule, "line", repr(line) )
-        if 'libreoffice' in line and "ServiceManager" in line:
-            pid = int( line.split(None, 1)[0] )
-            #dPrint( 'Quiet', debuggingThisModule, "pid", pid )
-            if BibleOrgSysGlobals.verbosityLevel > 1: logger.info( "  Killing {!r}".format( line ) )
-            try: os.kill( pid, signal.SIGKILL )
-            except PermissionError: # it must belong to another user
-                logger.error( "Don't have permission to kill LibreOffice ServiceManager" )
-# end of killLibreOfficeServiceManager
-
-
 class BibleWriter( InternalBible ):
     """
     Class to export Bibles.
@@ -196,10 +185,12 @@ class BibleWriter( InternalBible ):
         #    """
         InternalBible.__init__( self  ) # Initialise the base class
         self.doneSetupGeneric = False
+        self.wantExportArchives = True # Make zip (and tar) archives of the exported files (for easier downloading)
 
-        global ALL_CHAR_MARKERS
+        global ALL_CHAR_MARKERS, ALL_CHAR_MARKERS_SET
         if ALL_CHAR_MARKERS is None:
             ALL_CHAR_MARKERS = BibleOrgSysGlobals.loadedUSFMMarkers.getCharacterMarkersList( expandNumberableMarkers=True )
+            ALL_CHAR_MARKERS_SET = BibleOrgSysGlobals.loadedUSFMMarkers.characterMarkerSet
     # end of BibleWriter.__init_
 
 
@@ -219,10 +210,9 @@ class BibleWriter( InternalBible ):
             if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert filename
             filename = BibleOrgSysGlobals.makeSafeFilename( f'{filename}.pickle' ) # Same as in InternalBible.pickle()
             filepath = Path( outputFolderpath ).joinpath( filename )
-            vPrint( 'Info', debuggingThisModule, f"  Zipping {filename} pickle file…" )
-            zf = zipfile.ZipFile( f'{filepath}.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-            zf.write( filepath, filename )
-            zf.close()
+            if self.wantExportArchives:
+                vPrint( 'Info', debuggingThisModule, f"  Zipping {filename} pickle file…" )
+                with ZipPackager( f'{filepath}.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
             if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
                 vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toPickleObject finished successfully." )
@@ -509,13 +499,9 @@ class BibleWriter( InternalBible ):
         self.writeBOSBCVFiles( outputFolderpath ) # This function is part of InternalBible
 
         # Now create a zipped collection (for easier download)
-        vPrint( 'Info', debuggingThisModule, "  Zipping BCV files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping BCV files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllFiles.zip' ), outputFolderpath )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toBOSBCV finished successfully." )
@@ -594,13 +580,9 @@ class BibleWriter( InternalBible ):
             if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert indentLevel == 0
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping PseudoUSFM files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping PseudoUSFM files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllFiles.zip' ), outputFolderpath )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toPseudoUSFM finished successfully." )
@@ -710,7 +692,7 @@ class BibleWriter( InternalBible ):
                 else: # not a continuation marker
                     adjValue = fullText
                     #if pseudoMarker in ('it','bk','ca','nd',): # Character markers to be closed — had to remove ft and xt from this list for complex footnotes with f fr fq ft fq ft f*
-                    if pseudoMarker in ALL_CHAR_MARKERS: # Character markers to be closed
+                    if pseudoMarker in ALL_CHAR_MARKERS_SET: # Character markers to be closed
                         #if (bookUSFM[-2]=='\\' or bookUSFM[-3]=='\\') and bookUSFM[-1]!=' ':
                         if bookUSFM[-1] != ' ':
                             bookUSFM += ' ' # Separate markers by a space e.g., \p\bk Revelation
@@ -745,29 +727,25 @@ class BibleWriter( InternalBible ):
             vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toUSFM2 markers were {}").format( ignoredMarkers ) )
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping USFM2 files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllUSFM2Files.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
-        # Now create the gzipped file
-        vPrint( 'Info', debuggingThisModule, "  GZipping USFM2 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM2Files.gzip' ), 'w:gz' )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.usfm' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
-        # Now create the bz2 file
-        vPrint( 'Info', debuggingThisModule, "  BZipping USFM2 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM2Files.bz2' ), 'w:bz2' )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.usfm' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping USFM2 files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllUSFM2Files.zip' ), outputFolderpath )
+            # Now create the gzipped file
+            vPrint( 'Info', debuggingThisModule, "  GZipping USFM2 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM2Files.gzip' ), 'w:gz' )
+            for filename in os.listdir( outputFolderpath ):
+                if filename.endswith( '.usfm' ):
+                    filepath = os.path.join( outputFolderpath, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
+            # Now create the bz2 file
+            vPrint( 'Info', debuggingThisModule, "  BZipping USFM2 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM2Files.bz2' ), 'w:bz2' )
+            for filename in os.listdir( outputFolderpath ):
+                if filename.endswith( '.usfm' ):
+                    filepath = os.path.join( outputFolderpath, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toUSFM2 finished successfully." )
@@ -881,7 +859,7 @@ class BibleWriter( InternalBible ):
                 else: # not a continuation marker
                     adjValue = fullText
                     #if pseudoMarker in ('it','bk','ca','nd',): # Character markers to be closed — had to remove ft and xt from this list for complex footnotes with f fr fq ft fq ft f*
-                    if pseudoMarker in ALL_CHAR_MARKERS: # Character markers to be closed
+                    if pseudoMarker in ALL_CHAR_MARKERS_SET: # Character markers to be closed
                         #if (bookUSFM[-2]=='\\' or bookUSFM[-3]=='\\') and bookUSFM[-1]!=' ':
                         if bookUSFM[-1] != ' ':
                             bookUSFM += ' ' # Separate markers by a space e.g., \p\bk Revelation
@@ -916,29 +894,25 @@ class BibleWriter( InternalBible ):
             vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toUSFM3 markers were {}").format( ignoredMarkers ) )
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping USFM3 files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllUSFM3Files.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.usfm' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
-        # Now create the gzipped file
-        vPrint( 'Info', debuggingThisModule, "  GZipping USFM3 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM3Files.gzip' ), 'w:gz' )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.usfm' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
-        # Now create the bz2 file
-        vPrint( 'Info', debuggingThisModule, "  BZipping USFM3 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM3Files.bz2' ), 'w:bz2' )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.usfm' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping USFM3 files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllUSFM3Files.zip' ), outputFolderpath, includeExtensions=('.usfm',) )
+            # Now create the gzipped file
+            vPrint( 'Info', debuggingThisModule, "  GZipping USFM3 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM3Files.gzip' ), 'w:gz' )
+            for filename in os.listdir( outputFolderpath ):
+                if filename.endswith( '.usfm' ):
+                    filepath = os.path.join( outputFolderpath, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
+            # Now create the bz2 file
+            vPrint( 'Info', debuggingThisModule, "  BZipping USFM3 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSFM3Files.bz2' ), 'w:bz2' )
+            for filename in os.listdir( outputFolderpath ):
+                if filename.endswith( '.usfm' ):
+                    filepath = os.path.join( outputFolderpath, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toUSFM3 finished successfully." )
@@ -1057,7 +1031,7 @@ class BibleWriter( InternalBible ):
                         else: # not a continuation marker
                             adjValue = value
                             #if pseudoMarker in ('it','bk','ca','nd',): # Character markers to be closed — had to remove ft and xt from this list for complex footnotes with f fr fq ft fq ft f*
-                            if pseudoMarker in ALL_CHAR_MARKERS: # Character markers to be closed
+                            if pseudoMarker in ALL_CHAR_MARKERS_SET: # Character markers to be closed
                                 #if (ESFMLine[-2]=='\\' or ESFMLine[-3]=='\\') and ESFMLine[-1]!=' ':
                                 if ESFMLine[-1] != ' ':
                                     ESFMLine += ' ' # Separate markers by a space e.g., \p\bk Revelation
@@ -1083,13 +1057,9 @@ class BibleWriter( InternalBible ):
             vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toESFM markers were {}").format( ignoredMarkers ) )
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping ESFM files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllESFMFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping ESFM files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllESFMFiles.zip' ), outputFolderpath )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toESFM finished successfully." )
@@ -1177,13 +1147,9 @@ class BibleWriter( InternalBible ):
                             #.format( entry.getMarker(), entry.getOriginalMarker(), entry.getAdjustedText(), entry.getCleanText(), entry.getExtras() ) )
 
             # Now create a zipped collection
-            vPrint( 'Info', debuggingThisModule, "  Zipping text files…" )
-            zf = zipfile.ZipFile( os.path.join( wtfOutputFolder, 'AllTextFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-            for filename in os.listdir( wtfOutputFolder ):
-                if not filename.endswith( '.zip' ):
-                    filepath = os.path.join( wtfOutputFolder, filename )
-                    zf.write( filepath, filename ) # Save in the archive without the path
-            zf.close()
+            if self.wantExportArchives:
+                vPrint( 'Info', debuggingThisModule, "  Zipping text files…" )
+                zipFolder( os.path.join( wtfOutputFolder, 'AllTextFiles.zip' ), wtfOutputFolder )
 
         # Main code for toText()
         # Write the plain text files
@@ -1306,13 +1272,9 @@ class BibleWriter( InternalBible ):
                 vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toVPL markers were {}").format( ignoredMarkers ) )
 
             # Now create a zipped collection
-            vPrint( 'Info', debuggingThisModule, "  Zipping VPL text files…" )
-            zf = zipfile.ZipFile( os.path.join( thisOutputFolder, 'AllVPLTextFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-            for filename in os.listdir( thisOutputFolder ):
-                if not filename.endswith( '.zip' ):
-                    filepath = os.path.join( thisOutputFolder, filename )
-                    zf.write( filepath, filename ) # Save in the archive without the path
-            zf.close()
+            if self.wantExportArchives:
+                vPrint( 'Info', debuggingThisModule, "  Zipping VPL text files…" )
+                zipFolder( os.path.join( thisOutputFolder, 'AllVPLTextFiles.zip' ), thisOutputFolder )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toVPL finished successfully." )
@@ -1634,76 +1596,77 @@ class BibleWriter( InternalBible ):
         # First determine our format
         verseByVerse = True
 
-        # Write the formatted text files
-        for BBB,bookObject in self.books.items():
-            internalBibleBookData = bookObject._processedLines
+        # Each file is added to the zipped collection (and deflated in the background) as soon as it's written
+        #   (and the incomplete archive is abandoned if anything goes wrong)
+        with (ZipPackager( os.path.join( outputFolderpath, 'AllMarkdownFiles.zip' ) ) if self.wantExportArchives else nullcontext()) as zipPackager:
 
-            filename = "BOS-BibleWriter-{}.md".format( BBB )
-            filepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( filename ) )
-            vPrint( 'Info', debuggingThisModule, '  toMarkdown: ' + _("Writing {!r}…").format( filepath ) )
-            ourGlobals = {}
-            ourGlobals['nextFootnoteIndex'] = ourGlobals['nextEndnoteIndex'] = ourGlobals['nextXRefIndex'] = 0
-            ourGlobals['footnoteMD'], ourGlobals['endnoteMD'], ourGlobals['xrefMD'] = [], [], []
-            C, V = '-1', '-1' # So first/id line starts at -1:0
-            textBuffer = ''
-            with open( filepath, 'wt', encoding='utf-8' ) as myFile:
-                gotVP = None
-                for entry in internalBibleBookData:
-                    marker, adjText, extras = entry.getMarker(), entry.getAdjustedText(), entry.getExtras()
-                    if marker in USFM_PRECHAPTER_MARKERS:
-                        if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
-                            assert C=='-1' or marker=='rem' or marker.startswith('mte')
-                        V = str( int(V) + 1 )
+            # Write the formatted text files
+            for BBB,bookObject in self.books.items():
+                internalBibleBookData = bookObject._processedLines
 
-                    if marker in OFTEN_IGNORED_USFM_HEADER_MARKERS or marker in ('ie',): # Just ignore these lines
-                        ignoredMarkers.add( marker )
-                    elif marker in ('mt1','mt2','mt3','mt4', 'imt1','imt2','imt3','imt4',):
-                        if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
-                        level = int( marker[-1] )
-                        myFile.write( "\n{} {}\n".format( '#'*level, adjText ) )
-                    elif marker in ('mte1','mte2','mte3','mte4', 'imte1','imte2','imte3','imte4',):
-                        if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
-                        level = int( marker[-1] )
-                        myFile.write( "\n{} {}\n\n".format( '#'*level, adjText ) )
-                    elif marker in ('s1','s2','s3','s4', 'is1','is2','is3','is4', 'ms1','ms2','ms3','ms4', ):
-                        if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
-                        level = int( marker[-1] ) + 2 # so s1 becomes header #3
-                        myFile.write( "\n{} {}\n".format( '#'*level, adjText ) )
-                    elif marker == 'c':
-                        C, V = adjText, '0'
-                        if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
-                        myFile.write( "\n\nChapter {}".format( adjText ) )
-                    elif marker == 'vp#': # This precedes a v field and has the verse number to be printed
-                        gotVP = adjText # Just remember it for now
-                    elif marker == 'v':
-                        V = adjText
-                        if gotVP: # this is the verse number to be published
-                            adjText = gotVP
-                            gotVP = None
-                        if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
-                        myFile.write( "\n{} ".format( adjText ) )
-                    elif marker in ('p',): # Drop out these fields
-                        ignoredMarkers.add( marker )
-                    elif adjText:
-                        textBuffer += (' ' if textBuffer else '') + __formatMarkdownVerseText( BBB, C, V, adjText, extras )
-                if textBuffer: myFile.write( "{}\n".format( textBuffer ) ) # Write the last bit
+                filename = "BOS-BibleWriter-{}.md".format( BBB )
+                filepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( filename ) )
+                vPrint( 'Info', debuggingThisModule, '  toMarkdown: ' + _("Writing {!r}…").format( filepath ) )
+                ourGlobals = {}
+                ourGlobals['nextFootnoteIndex'] = ourGlobals['nextEndnoteIndex'] = ourGlobals['nextXRefIndex'] = 0
+                ourGlobals['footnoteMD'], ourGlobals['endnoteMD'], ourGlobals['xrefMD'] = [], [], []
+                C, V = '-1', '-1' # So first/id line starts at -1:0
+                textBuffer = ''
+                with open( filepath, 'wt', encoding='utf-8' ) as myFile:
+                    gotVP = None
+                    for entry in internalBibleBookData:
+                        marker, adjText, extras = entry.getMarker(), entry.getAdjustedText(), entry.getExtras()
+                        if marker in USFM_PRECHAPTER_MARKERS:
+                            if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
+                                assert C=='-1' or marker=='rem' or marker.startswith('mte')
+                            V = str( int(V) + 1 )
 
-                    #if verseByVerse:
-                        #myFile.write( "{} ({}): {!r} {!r} {}\n" \
-                            #.format( entry.getMarker(), entry.getOriginalMarker(), entry.getAdjustedText(), entry.getCleanText(), entry.getExtras() ) )
+                        if marker in OFTEN_IGNORED_USFM_HEADER_MARKERS or marker in ('ie',): # Just ignore these lines
+                            ignoredMarkers.add( marker )
+                        elif marker in ('mt1','mt2','mt3','mt4', 'imt1','imt2','imt3','imt4',):
+                            if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
+                            level = int( marker[-1] )
+                            myFile.write( "\n{} {}\n".format( '#'*level, adjText ) )
+                        elif marker in ('mte1','mte2','mte3','mte4', 'imte1','imte2','imte3','imte4',):
+                            if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
+                            level = int( marker[-1] )
+                            myFile.write( "\n{} {}\n\n".format( '#'*level, adjText ) )
+                        elif marker in ('s1','s2','s3','s4', 'is1','is2','is3','is4', 'ms1','ms2','ms3','ms4', ):
+                            if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
+                            level = int( marker[-1] ) + 2 # so s1 becomes header #3
+                            myFile.write( "\n{} {}\n".format( '#'*level, adjText ) )
+                        elif marker == 'c':
+                            C, V = adjText, '0'
+                            if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
+                            myFile.write( "\n\nChapter {}".format( adjText ) )
+                        elif marker == 'vp#': # This precedes a v field and has the verse number to be printed
+                            gotVP = adjText # Just remember it for now
+                        elif marker == 'v':
+                            V = adjText
+                            if gotVP: # this is the verse number to be published
+                                adjText = gotVP
+                                gotVP = None
+                            if textBuffer: myFile.write( "{}".format( textBuffer ) ); textBuffer = ''
+                            myFile.write( "\n{} ".format( adjText ) )
+                        elif marker in ('p',): # Drop out these fields
+                            ignoredMarkers.add( marker )
+                        elif adjText:
+                            textBuffer += (' ' if textBuffer else '') + __formatMarkdownVerseText( BBB, C, V, adjText, extras )
+                    if textBuffer: myFile.write( "{}\n".format( textBuffer ) ) # Write the last bit
+                if zipPackager is not None: zipPackager.addFile( filepath )
 
-        if ignoredMarkers:
-            logger.info( "toMarkdown: Ignored markers were {}".format( ignoredMarkers ) )
-            vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toMarkdown markers were {}").format( ignoredMarkers ) )
+                        #if verseByVerse:
+                            #myFile.write( "{} ({}): {!r} {!r} {}\n" \
+                                #.format( entry.getMarker(), entry.getOriginalMarker(), entry.getAdjustedText(), entry.getCleanText(), entry.getExtras() ) )
 
-        # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping markdown files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllMarkdownFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+            if ignoredMarkers:
+                logger.info( "toMarkdown: Ignored markers were {}".format( ignoredMarkers ) )
+                vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toMarkdown markers were {}").format( ignoredMarkers ) )
+
+            # Now finish the zipped collection
+            if zipPackager is not None:
+                vPrint( 'Info', debuggingThisModule, "  Zipping markdown files…" )
+                zipPackager.addFolder( outputFolderpath ) # Any other files in the folder
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toMarkdown finished successfully." )
@@ -2478,42 +2441,43 @@ class BibleWriter( InternalBible ):
             except KeyError: filename = BBB + '.html'
             filenameDict[BBB] = BibleOrgSysGlobals.makeSafeFilename( filename.replace( ' ', '_' ) )
 
-        html5Globals = {}
-        if 'HTML5Files' not in controlDict or controlDict['HTML5Files']=='byBook':
-            for BBB,bookData in self.books.items(): # Now export the books
-                vPrint( 'Info', debuggingThisModule, _("    Exporting {} to HTML5 format…").format( BBB ) )
-                xw = MLWriter( filenameDict[BBB], WEBoutputFolder, 'HTML' )
-                xw.setHumanReadable()
-                xw.start( noAutoXML=True )
-                xw.writeLineText( '<!DOCTYPE html>', noTextCheck=True )
-                xw.writeLineOpen( 'html' )
-                if BibleOrgSysGlobals.debugFlag: writeHTML5Book( xw, BBB, bookData, html5Globals ) # Halts on errors
-                else:
-                    try: writeHTML5Book( xw, BBB, bookData, html5Globals )
-                    except Exception as err:
-                        vPrint( 'Quiet', debuggingThisModule, BBB, "Unexpected error:", sys.exc_info()[0], err)
-                        logger.error( "toHTML5: Oops, creating {} failed!".format( BBB ) )
-                xw.writeLineClose( 'html' )
-                xw.close()
-            writeHomePage()
-            writeAboutPage()
-        elif BibleOrgSysGlobals.debugFlag and debuggingThisModule: halt # not done yet
+        # Each page is added to the zipped collection (and deflated in the background) as soon as it's written
+        #   (and the incomplete archive is abandoned if anything goes wrong)
+        with (ZipPackager( os.path.join( outputFolderpath, 'AllWebFiles.zip' ) ) if self.wantExportArchives else nullcontext()) as zipPackager:
+
+            html5Globals = {}
+            if 'HTML5Files' not in controlDict or controlDict['HTML5Files']=='byBook':
+                for BBB,bookData in self.books.items(): # Now export the books
+                    vPrint( 'Info', debuggingThisModule, _("    Exporting {} to HTML5 format…").format( BBB ) )
+                    xw = MLWriter( filenameDict[BBB], WEBoutputFolder, 'HTML' )
+                    xw.setHumanReadable( 'All' if humanReadable else 'Machine' )
+                    xw.start( noAutoXML=True )
+                    xw.writeLineText( '<!DOCTYPE html>', noTextCheck=True )
+                    xw.writeLineOpen( 'html' )
+                    if BibleOrgSysGlobals.debugFlag: writeHTML5Book( xw, BBB, bookData, html5Globals ) # Halts on errors
+                    else:
+                        try: writeHTML5Book( xw, BBB, bookData, html5Globals )
+                        except Exception as err:
+                            vPrint( 'Quiet', debuggingThisModule, BBB, "Unexpected error:", sys.exc_info()[0], err)
+                            logger.error( "toHTML5: Oops, creating {} failed!".format( BBB ) )
+                    xw.writeLineClose( 'html' )
+                    xw.close()
+                    if zipPackager is not None: zipPackager.addFile( os.path.join( WEBoutputFolder, filenameDict[BBB] ) )
+                writeHomePage()
+                writeAboutPage()
+            elif BibleOrgSysGlobals.debugFlag and debuggingThisModule: halt # not done yet
 
-        if ignoredMarkers:
-            logger.info( "toHTML5: Ignored markers were {}".format( ignoredMarkers ) )
-            vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toHTML5 markers were {}").format( ignoredMarkers ) )
-        if unhandledMarkers:
-            logger.warning( "toHTML5: Unhandled markers were {}".format( unhandledMarkers ) )
-            vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toHTML5 markers were {}").format( unhandledMarkers ) )
+            if ignoredMarkers:
+                logger.info( "toHTML5: Ignored markers were {}".format( ignoredMarkers ) )
+                vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toHTML5 markers were {}").format( ignoredMarkers ) )
+            if unhandledMarkers:
+                logger.warning( "toHTML5: Unhandled markers were {}".format( unhandledMarkers ) )
+                vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toHTML5 markers were {}").format( unhandledMarkers ) )
 
-        # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping HTML5 files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllWebFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( WEBoutputFolder ):
-            if not filename.endswith( '.zip' ):
-                filepath = os.path.join( WEBoutputFolder, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+            # Now finish the zipped collection
+            if zipPackager is not None:
+                vPrint( 'Info', debuggingThisModule, "  Zipping HTML5 files…" )
+                zipPackager.addFolder( WEBoutputFolder ) # The home and about pages and css files
 
         if validationSchema: validationResult = xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
@@ -3993,7 +3957,7 @@ class BibleWriter( InternalBible ):
                             subTokens = lcToken.split()
                             firstToken = subTokens[0]
                             #dPrint( 'Quiet', debuggingThisModule, "ft", firstToken )
-                            if firstToken in ALL_CHAR_MARKERS: # Yes, confirmed
+                            if firstToken in ALL_CHAR_MARKERS_SET: # Yes, confirmed
                                 if fCharOpen: # assume that the last one is closed by this one
                                     if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert not frOpen
                                     USXfootnoteXML += f'>{adjToken}</char>'
@@ -4006,7 +3970,7 @@ class BibleWriter( InternalBible ):
                                 adjToken = token[len(firstToken)+1:] # Get the bit after the space
                                 fCharOpen = firstToken
                             else: # The problem is that a closing marker doesn't have to be followed by a space
-                                if firstToken[-1]=='*' and firstToken[:-1] in ALL_CHAR_MARKERS: # it's a closing tag (that was followed by a space)
+                                if firstToken[-1]=='*' and firstToken[:-1] in ALL_CHAR_MARKERS_SET: # it's a closing tag (that was followed by a space)
                                     if fCharOpen:
                                         if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert not frOpen
                                         if not firstToken.startswith( fCharOpen+'*' ): # It's not a matching tag
@@ -4017,7 +3981,7 @@ class BibleWriter( InternalBible ):
                                 else:
                                     ixAS = firstToken.find( '*' )
                                     #dPrint( 'Quiet', debuggingThisModule, firstToken, ixAS, firstToken[:ixAS] if ixAS!=-1 else '' )
-                                    if ixAS!=-1 and ixAS<4 and firstToken[:ixAS] in ALL_CHAR_MARKERS: # it's a closing tag
+                                    if ixAS!=-1 and ixAS<4 and firstToken[:ixAS] in ALL_CHAR_MARKERS_SET: # it's a closing tag
                                         if fCharOpen:
                                             if debuggingThisModule or BibleOrgSysGlobals.debugFlag:
                                                 assert not frOpen
@@ -4208,7 +4172,7 @@ class BibleWriter( InternalBible ):
                 xw.writeLineClose( 'para' )
             xw.writeLineClose( 'usx' )
             xw.close( writeFinalNL=True ) # Try to imitate Paratext output as closely as possible
-            if validationSchema: return xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
+            return xw # so it can be validated later
         # end of toUSX2XML.writeUSXBook
 
         # Set-up our Bible reference system
@@ -4223,14 +4187,22 @@ class BibleWriter( InternalBible ):
         #USXOutputFolder = BibleOrgSysGlobals.DEFAULT_WRITEABLE_OUTPUT_FOLDERPATH.joinpath( "USX output/' )
         #if not os.access( USXOutputFolder, os.F_OK ): os.mkdir( USXOutputFolder ) # Make the empty folder if there wasn't already one there
 
-        validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+        bookWriters = []
         for BBB,bookData in self.books.items():
-            bookResults = writeUSXBook( BBB, bookData )
-            if validationSchema:
-                if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
-                if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
-                if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
-        if validationSchema:
+            bookWriter = writeUSXBook( BBB, bookData )
+            if bookWriter is not None: bookWriters.append( bookWriter )
+        validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+        if validationSchema: # Validate all the books together (so the schema is only compiled once)
+            allBookResults = validateMLWriters( bookWriters, validationSchema )
+            if None in allBookResults: # Don't pretend that they all validated
+                logger.error( "toUSX2XML: Unable to validate {} of {} books against {}".format( allBookResults.count( None ), len(allBookResults), validationSchema ) )
+                validationResults = None
+            else:
+                for bookResults in allBookResults:
+                    if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
+                    if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
+                    if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
+        if validationSchema and validationResults is not None:
             if validationResults[0] > 0:
                 with open( os.path.join( outputFolderpath, 'ValidationErrors.txt' ), 'wt', encoding='utf-8' ) as veFile:
                     if validationResults[1]: veFile.write( validationResults[1] + '\n\n\n' ) # Normally empty
@@ -4247,29 +4219,25 @@ class BibleWriter( InternalBible ):
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toUSX2XML books were {}").format( unhandledBooks ) )
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping USX2 files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllUSX2Files.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( filesFolder ):
-            #if not filename.endswith( '.zip' ):
-            filepath = os.path.join( filesFolder, filename )
-            zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
-        # Now create the gzipped file
-        vPrint( 'Info', debuggingThisModule, "  GZipping USX2 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX2Files.gzip' ), 'w:gz' )
-        for filename in os.listdir( filesFolder ):
-            if filename.endswith( '.usx' ):
-                filepath = os.path.join( filesFolder, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
-        # Now create the bz2 file
-        vPrint( 'Info', debuggingThisModule, "  BZipping USX2 files…" )
-        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX2Files.bz2' ), 'w:bz2' )
-        for filename in os.listdir( filesFolder ):
-            if filename.endswith( '.usx' ):
-                filepath = os.path.join( filesFolder, filename )
-                tar.add( filepath, arcname=filename, recursive=False )
-        tar.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping USX2 files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllUSX2Files.zip' ), filesFolder, excludeExtensions=() )
+            # Now create the gzipped file
+            vPrint( 'Info', debuggingThisModule, "  GZipping USX2 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX2Files.gzip' ), 'w:gz' )
+            for filename in os.listdir( filesFolder ):
+                if filename.endswith( '.usx' ):
+                    filepath = os.path.join( filesFolder, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
+            # Now create the bz2 file
+            vPrint( 'Info', debuggingThisModule, "  BZipping USX2 files…" )
+            tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX2Files.bz2' ), 'w:bz2' )
+            for filename in os.listdir( filesFolder ):
+                if filename.endswith( '.usx' ):
+                    filepath = os.path.join( filesFolder, filename )
+                    tar.add( filepath, arcname=filename, recursive=False )
+            tar.close()
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toUSX2XML finished successfully." )
@@ -4313,7 +4281,7 @@ class BibleWriter( InternalBible ):
 
 
 
-    def toUSFXXML( self, outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None ):
+    def toUSFXXML( self, outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None, humanReadable=True ):
         """
         Using settings from the given control file,
             converts the USFM information to UTF-8 USFX XML files.
@@ -4508,7 +4476,7 @@ class BibleWriter( InternalBible ):
                             subTokens = lcToken.split()
                             firstToken = subTokens[0]
                             #dPrint( 'Quiet', debuggingThisModule, "ft", firstToken )
-                            if firstToken in ALL_CHAR_MARKERS: # Yes, confirmed
+                            if firstToken in ALL_CHAR_MARKERS_SET: # Yes, confirmed
                                 if fCharOpen: # assume that the last one is closed by this one
                                     if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert not frOpen
                                     USFXfootnoteXML += '>' + adjToken + '</char>'
@@ -4521,7 +4489,7 @@ class BibleWriter( InternalBible ):
                                 adjToken = token[len(firstToken)+1:] # Get the bit after the space
                                 fCharOpen = firstToken
                             else: # The problem is that a closing marker doesn't have to be followed by a space
-                                if firstToken[-1]=='*' and firstToken[:-1] in ALL_CHAR_MARKERS: # it's a closing tag (that was followed by a space)
+                                if firstToken[-1]=='*' and firstToken[:-1] in ALL_CHAR_MARKERS_SET: # it's a closing tag (that was followed by a space)
                                     if fCharOpen:
                                         if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert not frOpen
                                         if not firstToken.startswith( fCharOpen+'*' ): # It's not a matching tag
@@ -4532,7 +4500,7 @@ class BibleWriter( InternalBible ):
                                 else:
                                     ixAS = firstToken.find( '*' )
                                     #dPrint( 'Quiet', debuggingThisModule, firstToken, ixAS, firstToken[:ixAS] if ixAS!=-1 else '' )
-                                    if ixAS!=-1 and ixAS<4 and firstToken[:ixAS] in ALL_CHAR_MARKERS: # it's a closing tag
+                                    if ixAS!=-1 and ixAS<4 and firstToken[:ixAS] in ALL_CHAR_MARKERS_SET: # it's a closing tag
                                         if fCharOpen:
                                             if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert not frOpen
                                             if not firstToken.startswith( fCharOpen+'*' ): # It's not a matching tag
@@ -4723,7 +4691,7 @@ class BibleWriter( InternalBible ):
         except KeyError: filename = 'Bible.usfx'
         xw = MLWriter( filename, outputFolderpath )
         #xw = MLWriter( BibleOrgSysGlobals.makeSafeFilename( USFXNumber+USFXAbbrev+"_usfx.xml" ), outputFolderpath )
-        xw.setHumanReadable( 'All' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
+        xw.setHumanReadable( 'All' if humanReadable else 'Machine' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
         xw.spaceBeforeSelfcloseTag = True # Try to imitate Haiola output as closely as possible
         #xw.start( lineEndings='w', writeBOM=True ) # Try to imitate Haiola output as closely as possible
         xw.start()
@@ -4750,10 +4718,9 @@ class BibleWriter( InternalBible ):
 
         # Now create a zipped version
         filepath = os.path.join( outputFolderpath, filename )
-        vPrint( 'Info', debuggingThisModule, "  Zipping {} USFX file…".format( filename ) )
-        zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-        zf.write( filepath, filename )
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping {} USFX file…".format( filename ) )
+            with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toUSFXXML finished successfully." )
@@ -4846,7 +4813,7 @@ class BibleWriter( InternalBible ):
 
 
 
-    def toOSISXML( self, outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None ):
+    def toOSISXML( self, outputFolderpath:Optional[Path]=None, controlDict=None, validationSchema=None, humanReadable=True ):
         """
         Using settings from the given control file,
             converts the USFM information to one or more UTF-8 OSIS XML files.
@@ -5511,12 +5478,12 @@ class BibleWriter( InternalBible ):
         # Start of main toOSIS code
         if 'osisFiles' not in controlDict or controlDict['osisFiles']=='byBook': # Write an individual XML file for each book
             vPrint( 'Info', debuggingThisModule, _("  Exporting individually to OSIS XML format…") )
-            validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+            bookWriters = []
             for BBB,bookData in self.books.items(): # Process each Bible book
                 try: fn = controlDict['osisOutputFilename'].replace( '_Bible', "_Book-{}".format(BBB) )
                 except KeyError: fn = 'Book-{}.osis'.format( BBB )
                 xw = MLWriter( BibleOrgSysGlobals.makeSafeFilename( fn ), outputFolderpath )
-                xw.setHumanReadable( 'All' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
+                xw.setHumanReadable( 'All' if humanReadable else 'Machine' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
                 xw.start()
                 xw.writeLineOpen( 'osis', [('xmlns',OSISNameSpace), ('xmlns:xsi',"http://www.w3.org/2001/XMLSchema-instance"), ('xsi:schemaLocation',OSISNameSpace+' '+OSISSchemaLocation)] )
                 try: xlg = controlDict['xmlLanguage']
@@ -5531,13 +5498,19 @@ class BibleWriter( InternalBible ):
                 xw.writeLineClose( 'osisText' )
                 xw.writeLineClose( 'osis' )
                 xw.close()
-                if validationSchema:
-                    bookResults = xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
-                    if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
-                    if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
-                    if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
-            if validationSchema:
-                if validationResults[0] > 0:
+                bookWriters.append( xw )
+            validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+            if validationSchema: # Validate all the books together (so the schema is only compiled once)
+                allBookResults = validateMLWriters( bookWriters, validationSchema )
+                if None in allBookResults: # Don't pretend that they all validated
+                    logger.error( "toOSISXML: Unable to validate {} of {} books against {}".format( allBookResults.count( None ), len(allBookResults), validationSchema ) )
+                    validationResults = None
+                else:
+                    for bookResults in allBookResults:
+                        if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
+                        if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
+                        if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
+                if validationResults is not None and validationResults[0] > 0:
                     with open( os.path.join( outputFolderpath, 'ValidationErrors.txt' ), 'wt', encoding='utf-8' ) as veFile:
                         if validationResults[1]: veFile.write( validationResults[1] + '\n\n\n' ) # Normally empty
                         if validationResults[2]: veFile.write( validationResults[2] )
@@ -5545,7 +5518,7 @@ class BibleWriter( InternalBible ):
             vPrint( 'Info', debuggingThisModule, _("  Exporting to OSIS XML format…") )
             filename = BibleOrgSysGlobals.makeSafeFilename( controlDict['osisOutputFilename'] )
             xw = MLWriter( filename, outputFolderpath )
-            xw.setHumanReadable( 'All' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
+            xw.setHumanReadable( 'All' if humanReadable else 'Machine' ) # Can be set to 'All', 'Header', or 'None' — one output file went from None/Header=4.7MB to All=5.7MB
             xw.start()
             xw.writeLineOpen( 'osis', [('xmlns',OSISNameSpace), ('xmlns:xsi',"http://www.w3.org/2001/XMLSchema-instance"), ('xsi:schemaLocation',OSISNameSpace+' '+OSISSchemaLocation)] )
             xw.writeLineOpen( 'osisText', [('osisRefWork',"Bible" ), ('xml:lang',controlDict['xmlLanguage']), ('osisIDWork',controlDict['osisIDWork'])] )
@@ -5559,10 +5532,9 @@ class BibleWriter( InternalBible ):
             xw.close()
             # Now create a zipped version
             filepath = os.path.join( outputFolderpath, filename )
-            vPrint( 'Info', debuggingThisModule, "  Zipping {} OSIS file…".format( filename ) )
-            zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-            zf.write( filepath, filename )
-            zf.close()
+            if self.wantExportArchives:
+                vPrint( 'Info', debuggingThisModule, "  Zipping {} OSIS file…".format( filename ) )
+                with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
             if validationSchema: validationResults = xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
         else:
             logger.critical( "Unrecognized toOSIS control \"osisFiles\" = {!r}".format( controlDict['osisFiles'] ) )
@@ -6064,10 +6036,9 @@ class BibleWriter( InternalBible ):
 
         # Now create a zipped version
         filepath = os.path.join( outputFolderpath, filename )
-        vPrint( 'Info', debuggingThisModule, "  Zipping {} Zefania file…".format( filename ) )
-        zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-        zf.write( filepath, filename )
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping {} Zefania file…".format( filename ) )
+            with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
         if validationSchema: validationResult = xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
@@ -6256,10 +6227,9 @@ class BibleWriter( InternalBible ):
 
         # Now create a zipped version
         filepath = os.path.join( outputFolderpath, filename )
-        vPrint( 'Info', debuggingThisModule, "  Zipping {} Haggai file…".format( filename ) )
-        zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-        zf.write( filepath, filename )
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping {} Haggai file…".format( filename ) )
+            with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
         if validationSchema: validationResult = xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
@@ -7261,10 +7231,9 @@ class BibleWriter( InternalBible ):
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toSwordSearcher books were {}").format( unhandledBooks ) )
 
         # Now create a zipped version
-        vPrint( 'Info', debuggingThisModule, "  Zipping {} SwordSearcher file…".format( filename ) )
-        zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-        zf.write( filepath )
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping {} SwordSearcher file…".format( filename ) )
+            with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toSwordSearcher finished successfully." )
@@ -7443,10 +7412,9 @@ class BibleWriter( InternalBible ):
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toDrupalBible books were {}").format( unhandledBooks ) )
 
         # Now create a zipped version
-        vPrint( 'Info', debuggingThisModule, "  Zipping {} DrupalBible file…".format( filename ) )
-        zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-        zf.write( filepath )
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping {} DrupalBible file…".format( filename ) )
+            with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toDrupalBible finished successfully." )
@@ -7455,7 +7423,7 @@ class BibleWriter( InternalBible ):
 
 
 
-    def toPhotoBible( self, outputFolderpath:Optional[Path]=None ):
+    def toPhotoBible( self, outputFolderpath:Optional[Path]=None, rendererName:Optional[str]=None, maxRenderers:Optional[int]=None ):
         """
         Write the internal Bible format out into small JPEG (photo) files
             that can be downloaded into a cheap (non-Java) camera phone.
@@ -7466,6 +7434,10 @@ class BibleWriter( InternalBible ):
 
         Although this code could be made to handle different fonts,
             ImageMagick convert is unable to handle complex scripts.  :(
+
+        The pages are rendered (a book at a time) in the background by rendererName
+            ('ImageMagick' or 'Pillow' — see InputOutput/PhotoPageRenderer.py)
+            using up to maxRenderers worker threads.
         """
         import unicodedata
         vPrint( 'Normal', debuggingThisModule, "Running BibleWriter:toPhotoBible… {}".format( datetime.now().strftime('%H:%M') ) )
@@ -7494,6 +7466,9 @@ class BibleWriter( InternalBible ):
             logger.critical( "toPhotoBible needs a blank jpg file for {}x{} image".format( pixelWidth, pixelHeight ) )
             if BibleOrgSysGlobals.debugFlag and debuggingThisModule: halt
             return False
+        if not rendererName: rendererName = self.getSetting( 'PBRenderer' ) # Can be 'ImageMagick' or 'Pillow'
+        renderer = getPhotoPageRenderer( blankFilepath, rendererName, maxRenderers )
+        if renderer is None: return False
         leftPadding = 1
         defaultFontSize, defaultLeadingRatio = 20, 1.2
         defaultLineSize = int( defaultLeadingRatio * defaultFontSize )
@@ -7531,39 +7506,6 @@ class BibleWriter( InternalBible ):
         verseDigitSubstitutions = { '0':'⁰', '1':'¹', '2':'²', '3':'³', '4':'⁴', '5':'⁵', '6':'⁶', '7':'⁷', '8':'⁸', '9':'⁹', }
 
 
-        def renderCommands( commandList, jpegFilepath ):
-            """
-            Given a list of commands, apply them to the existing JPEG file.
-
-            Returns an errorcode.
-            """
-            #dPrint( 'Quiet', debuggingThisModule, "renderCommands: {} on {}".format( commandList, jpegFilepath ) )
-
-            # Run the script on our data
-            if sys.platform.startswith( 'win' ): parameters = [ 'imconvert.exe' ]
-            else: parameters = ['/usr/bin/timeout', '10s', '/usr/bin/convert' ]
-            parameters.extend( commandList )
-            parameters.append( jpegFilepath ) # input file
-            parameters.append( jpegFilepath ) # output file
-            #dPrint( 'Quiet', debuggingThisModule, "Parameters", repr(parameters) )
-            myProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
-            programOutputBytes, programErrorOutputBytes = myProcess.communicate()
-            returnCode = myProcess.returncode
-
-            # Process the output
-            if programOutputBytes:
-                programOutputString = programOutputBytes.decode( encoding='utf-8', errors='replace' )
-                logger.critical( "renderCommands: " + programOutputString )
-                #with open( os.path.join( outputFolderpath, 'UncompressedScriptOutput.txt" ), 'wt', encoding='utf-8' ) as myFile: myFile.write( programOutputString )
-            if programErrorOutputBytes:
-                programErrorOutputString = programErrorOutputBytes.decode( encoding='utf-8', errors='replace' )
-                logger.critical( "renderE: " + programErrorOutputString )
-                #with open( os.path.join( outputFolderpath, 'UncompressedScriptErrorOutput.txt" ), 'wt', encoding='utf-8' ) as myFile: myFile.write( programErrorOutputString )
-
-            return returnCode
-        # end of toPhotoBible.renderCommands
-
-
         lastFontcolor = lastFontsize = lastFontname = None # We keep track of these to avoid unnecessary duplicates
         def renderLine( across, down, text, fontsize, fontname, fontcolor ):
             """
@@ -7627,9 +7569,6 @@ class BibleWriter( InternalBible ):
 
             #dPrint( 'Quiet', debuggingThisModule, "\nrenderPage( {}, {}, {}, {}, {}, {} )".format( BBB, C, repr(bookName), repr(text), jpegFilepath, fontsize ) )
 
-            # Create the blank file
-            shutil.copy( blankFilepath, jpegFilepath ) # Copy it under its own name
-
             if fontsize is None: fontsize = defaultFontSize
             leading = int( defaultLeadingRatio * fontsize )
             #dPrint( 'Quiet', debuggingThisModule, "Leading is {} for {}".format( leading, fontsize ) )
@@ -7787,8 +7726,8 @@ class BibleWriter( InternalBible ):
                 #dPrint( 'Quiet', debuggingThisModule, outputLineCount, maxLines, outputLineCount>=maxLines )
                 if outputLineCount >= maxLines: break
 
-            # Now render all those commands at once
-            renderCommands( totalCommands, jpegFilepath ) # Do all the rendering at once
+            # Now queue all those commands to be rendered at once (the renderer creates the file from the blank)
+            renderer.addPage( totalCommands, jpegFilepath )
 
             # Find the left-over text
             leftoverText = ''
@@ -7978,11 +7917,18 @@ class BibleWriter( InternalBible ):
                     #if BibleOrgSysGlobals.debugFlag: halt
                 lastMarker = marker
             if textBuffer: renderChapterText( BBB, BBBnum, bookName, bookAbbrev, C, intC, maxChapters, numVerses, textBuffer, bookFolderpath ) # Write the last bit
+            renderer.flush() # Render this book in the background while we lay out the next one
 
                     #if verseByVerse:
                         #myFile.write( "{} ({}): {!r} {!r} {}\n" \
                             #.format( entry.getMarker(), entry.getOriginalMarker(), entry.getAdjustedText(), entry.getCleanText(), entry.getExtras() ) )
 
+        renderer.close() # Wait for all the pages to be finished
+        self.photoBibleRenderStats = renderer.stats
+        vPrint( 'Info', debuggingThisModule, "  toPhotoBible: {}".format( renderer ) )
+        if renderer.stats['failedBatches']:
+            logger.error( "toPhotoBible: {} rendering failed for {} batch(es)".format( renderer.rendererName, renderer.stats['failedBatches'] ) )
+
         if ignoredMarkers:
             logger.info( "toPhotoBible: Ignored markers were {}".format( ignoredMarkers ) )
             vPrint( 'Info', debuggingThisModule, "  " + _("WARNING: Ignored toPhotoBible markers were {}").format( ignoredMarkers ) )
@@ -7991,33 +7937,28 @@ class BibleWriter( InternalBible ):
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toPhotoBible markers were {}").format( unhandledMarkers ) )
 
         # Now create some zipped collections (for easier downloads)
-        vPrint( 'Info', debuggingThisModule, "  Zipping PhotoBible files…" )
-        for subset in ('OT','NT','Other','All'):
-            loadFolder = outputFolderpath if subset=='All' else os.path.join( outputFolderpath, subset+'/' )
-            #dPrint( 'Quiet', debuggingThisModule, repr(subset), "Load folder =", repr(loadFolder) )
-            if os.path.exists( loadFolder ):
-                zf = zipfile.ZipFile( os.path.join( outputFolderpath, subset+'PhotoBible.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-                for root, dirs, files in os.walk( loadFolder ):
-                    for filename in files:
-                        if not filename.endswith( '.zip' ):
-                            #dPrint( 'Quiet', debuggingThisModule, repr(loadFolder), repr(root), repr(dirs), repr(files) )
-                            #dPrint( 'Quiet', debuggingThisModule, repr(os.path.relpath(os.path.join(root, filename))), repr(os.path.join(loadFolder, '..')) )
-                            #dPrint( 'Quiet', debuggingThisModule, os.path.join(root,filename), os.path.relpath(os.path.join(root, filename), os.path.join(loadFolder, '..')) ) # Save in the archive without the path
-                            #  Save in the archive without the path —
-                            #   parameters are filename to compress, archive name (relative path) to save as
-                            zf.write( os.path.join(root,filename), os.path.relpath(os.path.join(root, filename), os.path.join(loadFolder, '..')) ) # Save in the archive without the path
-                            #zf.write( filepath, filename ) # Save in the archive without the path
-                zf.close()
-        #if self.abbreviation in ('MBTV','WEB','OEB',): # Do a special zip file of just Matthew as a test download
-        if 'MAT' in self: # Do a zip file of just Matthew as a smaller download for testers
-            zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'MatthewPhotoBible.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-            loadFolder = os.path.join( outputFolderpath, 'NT/' )
-            for root, dirs, files in os.walk( loadFolder ):
-                for filename in files:
-                    if '40-Mat' in root and not filename.endswith( '.zip' ): #  Save in the archive without the path —
-                        #   parameters are filename to compress, archive name (relative path) to save as
-                        zf.write( os.path.join(root,filename), os.path.relpath(os.path.join(root, filename), os.path.join(loadFolder, '..')) ) # Save in the archive without the path
-            zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping PhotoBible files…" )
+            for subset in ('OT','NT','Other','All'):
+                loadFolder = outputFolderpath if subset=='All' else os.path.join( outputFolderpath, subset+'/' )
+                #dPrint( 'Quiet', debuggingThisModule, repr(subset), "Load folder =", repr(loadFolder) )
+                if os.path.exists( loadFolder ):
+                    with ZipPackager( os.path.join( outputFolderpath, subset+'PhotoBible.zip' ) ) as zipPackager:
+                        for root, dirs, files in os.walk( loadFolder ):
+                            for filename in files:
+                                if not filename.endswith( '.zip' ):
+                                    #  Save in the archive without the path —
+                                    #   parameters are filename to compress, archive name (relative path) to save as
+                                    zipPackager.addFile( os.path.join(root,filename), os.path.relpath(os.path.join(root, filename), os.path.join(loadFolder, '..')) )
+            #if self.abbreviation in ('MBTV','WEB','OEB',): # Do a special zip file of just Matthew as a test download
+            if 'MAT' in self: # Do a zip file of just Matthew as a smaller download for testers
+                loadFolder = os.path.join( outputFolderpath, 'NT/' )
+                with ZipPackager( os.path.join( outputFolderpath, 'MatthewPhotoBible.zip' ) ) as zipPackager:
+                    for root, dirs, files in os.walk( loadFolder ):
+                        for filename in files:
+                            if '40-Mat' in root and not filename.endswith( '.zip' ): #  Save in the archive without the path —
+                                #   parameters are filename to compress, archive name (relative path) to save as
+                                zipPackager.addFile( os.path.join(root,filename), os.path.relpath(os.path.join(root, filename), os.path.join(loadFolder, '..')) )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toPhotoBible finished successfully at {}".format( datetime.now().strftime('%H:%M') ) )
@@ -8025,17 +7966,19 @@ class BibleWriter( InternalBible ):
     # end of BibleWriter.toPhotoBible
 
 
-    def toODF( self, outputFolderpath:Optional[Path]=None ):
+    def toODF( self, outputFolderpath:Optional[Path]=None, maxJobs:Optional[int]=None ):
         """
         Write the internal Bible format out into Open Document Format (ODF)
             suitable for opening in LibreOffice or OpenOffice.
 
+        Up to maxJobs books are created at once, each worker with its own headless LibreOffice
+            (see InputOutput/ExternalJobRunner.py).
+
         This function hasn't been tested in Windows
             and probably won't work.
         """
         import uno
         from com.sun.star.lang import IllegalArgumentException
-        from time import sleep
 
         vPrint( 'Normal', debuggingThisModule, "Running BibleWriter:toODF… {}".format( datetime.now().strftime('%H:%M') ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert self.books
@@ -8045,8 +7988,6 @@ class BibleWriter( InternalBible ):
         if not os.access( outputFolderpath, os.F_OK ): os.makedirs( outputFolderpath ) # Make the empty folder if there wasn't already one there
         os.chmod( outputFolderpath, 0o777 ) # Allow all users to write to this folder (ServiceManager might run as a different user)
 
-        weStartedLibreOffice = False
-        DEFAULT_OPENOFFICE_PORT = 2002
         startWithTemplate = True # Start with template (all styles already built) or just a blank document (much slower)
 
         ODF_PARAGRAPH_BREAK = uno.getConstantByName( "com.sun.star.text.ControlCharacter.PARAGRAPH_BREAK" )
@@ -8056,65 +7997,9 @@ class BibleWriter( InternalBible ):
         #ODF_HARD_SPACE = uno.getConstantByName( "com.sun.star.text.ControlCharacter.HARD_SPACE" )
         #ODF_APPEND_PARAGRAPH = uno.getConstantByName( "com.sun.star.text.ControlCharacter.APPEND_PARAGRAPH" )
 
-        def isServiceManagerRunning():
-            """
-            Checks to see if the LibreOffice ServiceManager is in the list of running tasks
-            """
-            for pid in os.listdir('/proc'):
-                try:
-                    procInfoBytes = open(os.path.join('/proc', pid, 'cmdline'), 'rb').read()
-                    if b'StarOffice.ServiceManager' in procInfoBytes: return True
-                except IOError: # proc has already terminated
-                    continue
-            return False
-        # end of isServiceManagerRunning
-
-        def startLibreOfficeServiceManager():
-            """
-            """
-            if debuggingThisModule or BibleOrgSysGlobals.verbosityLevel > 1:
-                vPrint( 'Quiet', debuggingThisModule, "Starting LibreOffice ServiceManager…" )
-            # Start LibreOffice
-            #       Either: /usr/bin/libreoffice --accept="socket,host=localhost,port=2002;urp;StarOffice.ServiceManager"
-            #       Or: /usr/bin/libreoffice --accept="socket,host=localhost,port=2002;urp;StarOffice.ServiceManager" --norestore --nologo --headless
-            if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                os.system( '/usr/bin/libreoffice --accept="socket,host=localhost,port={};urp;StarOffice.ServiceManager" &'.format( DEFAULT_OPENOFFICE_PORT ) )
-            else: # run LibreOffice headless
-                os.system( '/usr/bin/libreoffice --accept="socket,host=localhost,port={};urp;StarOffice.ServiceManager" --norestore --nologo --headless &'.format( DEFAULT_OPENOFFICE_PORT ) )
-            weStartedLibreOffice = True
-            if 0:
-                parameters = ['/usr/bin/libreoffice', '--accept="socket,host=localhost,port={};urp;StarOffice.ServiceManager"'.format( DEFAULT_OPENOFFICE_PORT ),'--norestore','--nologo','--headless']
-                vPrint( 'Quiet', debuggingThisModule, "Parameters", repr(parameters) )
-                myProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
-                sleep( 5 ) # Wait
-                #programOutputBytes, programErrorOutputBytes = myProcess.communicate()
-                #returnCode = myProcess.returncode
-                #dPrint( 'Quiet', debuggingThisModule, "returnCode", returnCode )
-                # Why does this give:
-                #   context = resolver.resolve("uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext")
-                #   BibleWriter.NoConnectException: Connector : couldn't connect to socket (Success)
-            sleep( 1 ) # Wait a second to get sure that LibreOffice has time to start up
-        # end of startLibreOfficeServiceManager
-
-        restartLOSMForEachBook = True # Restart LibreOffice ServiceManager for each book
-        #   We restart for each book coz sometimes it seems to lock-up and then lots of books don't get created
-        if not restartLOSMForEachBook:
-            if isServiceManagerRunning(): killLibreOfficeServiceManager() # Seems safer to always do this
-            #assert not isServiceManagerRunning() # could be running in another user
-            startLibreOfficeServiceManager()
-            weStartedLibreOffice = True
-
-            # Set-up LibreOffice
-            localContext = uno.getComponentContext()
-            urlResolver = localContext.ServiceManager.createInstanceWithContext( "com.sun.star.bridge.UnoUrlResolver", localContext )
-            componentContext = urlResolver.resolve( "uno:socket,host=localhost,port={};urp;StarOffice.ComponentContext".format( DEFAULT_OPENOFFICE_PORT ) )
-            serviceManager = componentContext.ServiceManager
-            frameDesktop = serviceManager.createInstanceWithContext( "com.sun.star.frame.Desktop", componentContext )
-            #model = frameDesktop.getCurrentComponent()
-
-            # Locate our empty template file (with all the styles there already) that we'll start from
-            templateFilepath = os.path.join( os.getcwd(), defaultControlFolderpath, "BibleBook.ott" )
-            sourceURL = "file://{}".format( templateFilepath ) if startWithTemplate else "private:factory/swriter"
+        # Locate our empty template file (with all the styles there already) that we'll start from
+        templateFilepath = os.path.join( os.getcwd(), defaultControlFolderpath, "BibleBook.ott" )
+        sourceURL = "file://{}".format( templateFilepath ) if startWithTemplate else "private:factory/swriter"
 
         ignoredMarkers, unhandledMarkers = set(), set()
 
@@ -9050,8 +8935,10 @@ class BibleWriter( InternalBible ):
         # end of toODF.insertFormattedODFText
 
 
-        def createODFBook( bookNum, BBB:str, bookObject ):
+        def createODFBook( frameDesktop, bookNum, BBB:str, bookObject ):
             """
+            Run by the OfficeJobRunner (with the Desktop of one of its LibreOffice instances).
+
             Returns a True/False result
             """
             vPrint( 'Info', debuggingThisModule, "  Creating ODF file for {}…".format( BBB ) )
@@ -9252,88 +9139,34 @@ class BibleWriter( InternalBible ):
             # Save the created document
             document.storeAsURL( 'file://{}'.format( filepath ), () )
             document.dispose() # Close the document (even though it might be a headless server anyway)
+            createdFilepaths[BBB] = filepath
             vPrint( 'Never', debuggingThisModule, "Finished {}".format( BBB ) )
             return True
         # end of toODF.createODFBook
 
 
         # Main code (continued) for toODF()
+        createdFilepaths = {} # Filled in by the workers (by BBB)
+        # Each book is added to the zipped collection (and deflated in the background) as soon as its job finishes
+        zipPackager = ZipPackager( os.path.join( outputFolderpath, 'AllODFFiles.zip' ) ) if self.wantExportArchives else None
+
         # Create and save the ODF files
+        #   Each worker keeps its own LibreOffice instance which gets restarted if a book fails or locks up
         createCount = 0
-        for j, (BBB,bookObject) in enumerate( self.books.items() ):
-            #if createODFBook( j, BBB, bookObject ):
-                #createCount += 1
-
-            if restartLOSMForEachBook:
-                if isServiceManagerRunning(): killLibreOfficeServiceManager() # Seems safer to always do this
-                #assert not isServiceManagerRunning() # could be running in another user
-                startLibreOfficeServiceManager()
-                weStartedLibreOffice = True
-
-                # Set-up LibreOffice
-                localContext = uno.getComponentContext()
-                urlResolver = localContext.ServiceManager.createInstanceWithContext( "com.sun.star.bridge.UnoUrlResolver", localContext )
-                componentContext = urlResolver.resolve( "uno:socket,host=localhost,port={};urp;StarOffice.ComponentContext".format( DEFAULT_OPENOFFICE_PORT ) )
-                serviceManager = componentContext.ServiceManager
-                frameDesktop = serviceManager.createInstanceWithContext( "com.sun.star.frame.Desktop", componentContext )
-                #model = frameDesktop.getCurrentComponent()
-
-                # Locate our empty template file (with all the styles there already) that we'll start from
-                templateFilepath = os.path.join( os.getcwd(), defaultControlFolderpath, "BibleBook.ott" )
-                sourceURL = "file://{}".format( templateFilepath ) if startWithTemplate else "private:factory/swriter"
-
-            if BibleOrgSysGlobals.alreadyMultiprocessing or 'win' in sys.platform: # SIGALRM doesn't work
-                try:
-                    if createODFBook( j, BBB, bookObject ):
+        try:
+            with OfficeJobRunner( maxJobs=maxJobs ) as jobRunner:
+                for j, (BBB,bookObject) in enumerate( self.books.items() ):
+                    timeoutSeconds = max( 150, len(bookObject._processedLines)//40 ) # But depends on footnotes, etc. as well
+                    jobRunner.addJob( BBB, createODFBook, j, BBB, bookObject, timeoutSeconds=timeoutSeconds )
+                for result in jobRunner.iterResults(): # in book order (while the later books are still being created)
+                    if result['result'] is True:
                         createCount += 1
-                except Exception as err:
-                    vPrint( 'Quiet', debuggingThisModule, "BibleWriter.doAllExports.toODF {} Unexpected error:".format( BBB ), sys.exc_info()[0], err)
-                    killLibreOfficeServiceManager()
-                    logger.error( "BibleWriter.doAllExports.toODF: Oops, {} failed!".format( BBB ) )
-                    break
-            else: # *nix system hopefully
-                if 0: # Signal doesn't time out when LOSM locks up :-(
-                    timeoutSeconds = max( 20, len(bookObject._processedLines)//40 ) # But depends on footnotes, etc. as well
-                    vPrint( 'Quiet', debuggingThisModule, "Timeout for {} is {}s".format( BBB, timeoutSeconds ) )
-                    class ODFTimeoutException( Exception ): pass
-                    def TimeoutHandler( signum, frame ):
-                        logger.critical( _("createODFBook( {} ) went too long!").format( BBB ) )
-                        raise ODFTimeoutException( "ODF writer timed out on {}".format( BBB ) )
-                    # end of TimeoutHandler
-                    signal.signal( signal.SIGALRM, TimeoutHandler )
-                    signal.alarm( timeoutSeconds )
-                    try:
-                        if createODFBook( j, BBB, bookObject ):
-                            createCount += 1
-                        signal.alarm( 0 ) # Disable timeout
-                    except ODFTimeoutException as err:
-                        vPrint( 'Quiet', debuggingThisModule, "BibleWriter.doAllExports.toODF {} Timeout error:".format( BBB ), sys.exc_info()[0], err)
-                        logger.critical( "BibleWriter.doAllExports.toODF: Oops, {} timed out. Aborting!".format( BBB ) )
-                        killLibreOfficeServiceManager() # Shut down the locked-up  process
-                        if not restartLOSMForEachBook: break # No real point in continuing with locked-up system
-                else: # try something else # NOTE: Linux-only code!!!
-                    # NOTE: This shell script must be findable in the current working directory
-                    timeoutFilepath = './BOS_LOSM_Timeout.sh'
-                    if os.path.exists( timeoutFilepath ):
-                        proc = subprocess.Popen( [timeoutFilepath] ) # Does a 150s timeout then kills
-                        try:
-                            if createODFBook( j, BBB, bookObject ):
-                                createCount += 1
-                            proc.terminate() # Will hopefully terminate the timeout before the shell script kills the LO ServiceManager
-                        except KeyboardInterrupt:
-                            killLibreOfficeServiceManager() # Shut down the locked-up  process
-                            raise KeyboardInterrupt
-                        except Exception as err: # BibleWriter.DisposedException (where does BibleWriter.com.sun.star.lang.DisposedException come from???)
-                            vPrint( 'Quiet', debuggingThisModule, "BibleWriter.doAllExports.toODF {} Timeout error:".format( BBB ), sys.exc_info()[0], err)
-                            logger.critical( "BibleWriter.doAllExports.toODF: Oops, {} timed out. Aborting!".format( BBB ) )
-                            killLibreOfficeServiceManager() # Shut down the locked-up  process
-                            if not restartLOSMForEachBook: break # No real point in continuing with locked-up system
-                    else:
-                        if createODFBook( j, BBB, bookObject ):
-                            createCount += 1
-
-        if weStartedLibreOffice and not BibleOrgSysGlobals.debugFlag: # Now kill our LibreOffice server
-            killLibreOfficeServiceManager()
+                        if zipPackager is not None: zipPackager.addFile( createdFilepaths[result['name']] )
+        except BaseException:
+            if zipPackager is not None: zipPackager.abandon()
+            raise
+        for result in jobRunner.getFailures():
+            logger.critical( "BibleWriter.toODF: Oops, {} {}!".format( result['name'], 'timed out' if result['timedOut'] else 'failed' ) )
 
         if ignoredMarkers:
             logger.info( "toODF: Ignored markers were {}".format( ignoredMarkers ) )
@@ -9342,15 +9175,12 @@ class BibleWriter( InternalBible ):
             logger.warning( "toODF: Unhandled markers were {}".format( unhandledMarkers ) )
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toODF markers were {}").format( unhandledMarkers ) )
 
-        # Now create a zipped collection
+        # Now finish the zipped collection
         if createCount > 0:
-            vPrint( 'Info', debuggingThisModule, "  Zipping ODF files…" )
-            zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllODFFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-            for filename in os.listdir( outputFolderpath ):
-                if not filename.endswith( '.zip' ):
-                    filepath = os.path.join( outputFolderpath, filename )
-                    zf.write( filepath, filename ) # Save in the archive without the path
-            zf.close()
+            if zipPackager is not None:
+                vPrint( 'Info', debuggingThisModule, "  Zipping ODF files…" )
+                zipPackager.addFolder( outputFolderpath ) # Any other files in the folder
+                zipPackager.close()
 
             if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
                 vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toODF finished successfully ({} files) at {}".format( createCount, datetime.now().strftime('%H:%M') ) )
@@ -9362,10 +9192,12 @@ class BibleWriter( InternalBible ):
 
 
 
-    def toTeX( self, outputFolderpath:Optional[str]=None ) -> bool:
+    def toTeX( self, outputFolderpath:Optional[str]=None, maxJobs:Optional[int]=None ) -> bool:
         """
         Write the pseudo USFM out into a TeX (typeset) format.
             The format varies, depending on whether or not there are paragraph markers in the text.
+
+        Up to maxJobs xelatex PDF compiles are run at once (see InputOutput/ExternalJobRunner.py).
         """
         vPrint( 'Normal', debuggingThisModule, "Running BibleWriter:toTeX… {}".format( datetime.now().strftime('%H:%M') ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag: assert self.books
@@ -9491,161 +9323,160 @@ class BibleWriter( InternalBible ):
         # end of toTeX:texText
 
 
-        def makePDFs( BBB:str, texFilepath, timeout ):
+        def makePDFs( BBB:str, texFilepath, timeoutSeconds ):
             """
-            Call xelatex to make the Bible PDF file(s) from the .tex file.
+            Queue xelatex jobs to make the Bible PDF file(s) from the .tex file.
+
+            Each job runs in its own temporary folder (with the Bible.cls file for that style)
+                so that several books can be compiled at once.
             """
             assert texFilepath.endswith( '.tex' )
             mainFilepath = texFilepath[:-4] # Remove the .tex bit
+            texFilename = os.path.basename( texFilepath )
+            mainFilename = texFilename[:-4]
 
             # Work through the various class files for different styles of Bible layouts
             for filenamePart in ( 'Bible1','Bible2', ):
-                filepath = os.path.join( defaultControlFolderpath, filenamePart+'.cls' )
-                try:
-                    shutil.copy( filepath, outputFolderpath ) # Copy it under its own name
-                    shutil.copy( filepath, os.path.join( outputFolderpath, 'Bible.cls' ) ) # Copy it also under the generic name
-                except FileNotFoundError: logger.warning( "Unable to find TeX control file: {}".format( filepath ) )
-
-                # Now run xelatex (TeX -> PDF)
-                parameters = ['/usr/bin/timeout', timeout, '/usr/bin/xelatex', '-interaction=batchmode', os.path.abspath(texFilepath) ]
-                #dPrint( 'Quiet', debuggingThisModule, "makeIndividualPDF (xelatex) parameters", parameters )
-                os.chdir( outputFolderpath ) # So the paths for the Bible.cls file are correct
-                myProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
-                programOutputBytes, programErrorOutputBytes = myProcess.communicate()
-                os.chdir( cwdSave ) # Restore the path again
-                if myProcess.returncode == 124: # it timed out
-                    programErrorOutputBytes += "xelatex {}: Timed out after {}".format( BBB, timeout ).encode( 'utf-8' )
-                # Process the output
-                if programOutputBytes:
-                    programOutputString = programOutputBytes.decode( encoding='utf-8', errors='replace' )
-                    #programOutputString = programOutputString.replace( baseFolder + ('' if baseFolder[-1]=='/' else '/'), '' ) # Remove long file paths to make it easier for the user to read
-                    #with open( os.path.join( outputFolderpath, 'ScriptOutput.txt" ), 'wt', encoding='utf-8' ) as myFile: myFile.write( programOutputString )
-                    #dPrint( 'Quiet', debuggingThisModule, "pOS", programOutputString )
-                if programErrorOutputBytes:
-                    programErrorOutputString = programErrorOutputBytes.decode( encoding='utf-8', errors='replace' )
-                    #with open( os.path.join( outputFolderpath, 'ScriptErrorOutput.txt" ), 'wt', encoding='utf-8' ) as myFile: myFile.write( programErrorOutputString )
-                    dPrint( 'Quiet', debuggingThisModule, "pEOS", programErrorOutputString )
-
+                inputFileDict = { texFilename:texFilepath }
+                for filename in ( "lettrine.sty", filenamePart+'.cls', ):
+                    filepath = os.path.join( defaultControlFolderpath, filename )
+                    if os.path.isfile( filepath ):
+                        inputFileDict['Bible.cls' if filename.endswith( '.cls' ) else filename] = filepath # The class is also needed under the generic name
                 # Rename our PDF (and the log file) according to the style
-                try: os.replace( mainFilepath+'.log', mainFilepath+'.'+filenamePart+'.log' )
-                except FileNotFoundError: pass # That's fine
-                try: os.replace( mainFilepath+'.pdf', mainFilepath+'.'+filenamePart+'.pdf' )
-                except FileNotFoundError: pass # That's fine
+                outputFileDict = { mainFilename+'.pdf':mainFilepath+'.'+filenamePart+'.pdf',
+                                    mainFilename+'.log':mainFilepath+'.'+filenamePart+'.log' }
+                # Now queue xelatex (TeX -> PDF)
+                jobRunner.addJob( f'xelatex {BBB} {filenamePart}', [xelatexFilepath, '-interaction=batchmode', texFilename],
+                                        inputFileDict, outputFileDict, timeoutSeconds )
         # end of toTeX.makePDFs
 
 
-        # Write the plain text XeTeX file
-        cwdSave = os.getcwd() # Save the current working directory before changing (below) to the output directory
-        allFilename = "All-BOS-BibleWriter.tex"
-        allFilepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( allFilename ) )
-        vPrint( 'Info', debuggingThisModule, '  toTeX: ' + _("Writing {!r}…").format( allFilepath ) )
-        with open( allFilepath, 'wt', encoding='utf-8' ) as allFile:
-            writeTeXHeader( allFile )
-            for j, (BBB,bookObject) in enumerate( self.books.items() ):
-                haveTitle = haveIntro = False
-                filename = "{:02}-{}_BOS-BibleWriter.tex".format( j, BBB )
-                filepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( filename ) )
-                vPrint( 'Info', debuggingThisModule, '  toTeX: ' + _("Writing {!r}…").format( filepath ) )
-                with open( filepath, 'wt', encoding='utf-8' ) as bookFile:
-                    writeTeXHeader( bookFile )
-                    allFile.write( "\n\\BibleBook{{{}}}\n".format( bookObject.getAssumedBookNames()[0] ) )
-                    bookFile.write( "\n\\BibleBook{{{}}}\n".format( bookObject.getAssumedBookNames()[0] ) )
-                    bookFile.write( "\n\\BibleBookTableOfContents\n".format( bookObject.getAssumedBookNames()[0] ) )
-                    gotVP = None
-                    C, V = '-1', '-1' # So first/id line starts at -1:0
-                    for entry in bookObject._processedLines:
-                        marker, text = entry.getMarker(), entry.getFullText()
-                        if '¬' in marker or marker in BOS_ADDED_NESTING_MARKERS or marker=='v=':
-                            continue # Just ignore added markers — not needed here
-                        if marker in USFM_PRECHAPTER_MARKERS:
-                            if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
-                                assert C=='-1' or marker=='rem' or marker.startswith('mte')
-                            V = str( int(V) + 1 )
+        # Copy the TeX class files to our output folder (so the user can run xelatex on the .tex files)
+        for filenamePart in ( 'Bible1','Bible2', ):
+            filepath = os.path.join( defaultControlFolderpath, filenamePart+'.cls' )
+            try:
+                shutil.copy( filepath, outputFolderpath ) # Copy it under its own name
+                shutil.copy( filepath, os.path.join( outputFolderpath, 'Bible.cls' ) ) # Copy it also under the generic name (used by the .tex files)
+            except FileNotFoundError: logger.warning( "Unable to find TeX control file: {}".format( filepath ) )
 
-                        if marker in OFTEN_IGNORED_USFM_HEADER_MARKERS or marker in ('ie',): # Just ignore these lines
-                            ignoredMarkers.add( marker )
-                        elif marker in mtMarkerTranslate:
-                            if not haveTitle:
-                                allFile.write( "\n\\BibleTitlePage\n" )
-                                bookFile.write( "\n\\BibleTitlePage\n" )
-                                haveTitle = True
-                            allFile.write( "\\{}{{{}}}\n".format( mtMarkerTranslate[marker], texText(text) ) )
-                            bookFile.write( "\\{}{{{}}}\n".format( mtMarkerTranslate[marker], texText(text) ) )
-                        elif marker in imtMarkerTranslate:
-                            if not haveIntro:
-                                allFile.write( "\n\\BibleIntro\n" )
-                                bookFile.write( "\n\\BibleIntro\n" )
-                                haveIntro = True
-                            allFile.write( "\\{}{{{}}}\n".format( imtMarkerTranslate[marker], texText(text) ) )
-                            bookFile.write( "\\{}{{{}}}\n".format( imtMarkerTranslate[marker], texText(text) ) )
-                        elif marker in ipMarkerTranslate:
-                            if not haveIntro:
-                                allFile.write( "\n\\BibleIntro\n" )
-                                bookFile.write( "\n\\BibleIntro\n" )
-                                haveIntro = True
-                            allFile.write( "\\BibleParagraphStyle{}\n".format( ipMarkerTranslate[marker] ) )
-                            bookFile.write( "\\BibleParagraphStyle{}\n".format( ipMarkerTranslate[marker] ) )
-                            allFile.write( "{}\n".format( texText(text) ) )
-                            bookFile.write( "{}\n".format( texText(text) ) )
-                        elif marker in ipListMarkerTranslate:
-                            if not haveIntro:
-                                allFile.write( "\n\\BibleIntro\n" )
-                                bookFile.write( "\n\\BibleIntro\n" )
-                                haveIntro = True
-                            allFile.write( "\\BibleParagraphStyle{}\n".format( ipListMarkerTranslate[marker] ) )
-                            bookFile.write( "\\BibleParagraphStyle{}\n".format( ipListMarkerTranslate[marker] ) )
-                            allFile.write( "{}\n".format( texText(text) ) )
-                            bookFile.write( "{}\n".format( texText(text) ) )
-
-                        elif marker=='c':
-                            C, V = text, '0'
-                            if text == '1': # Assume chapter 1 is the start of the actual Bible text
-                                allFile.write( "\n\\BibleText\n" )
-                                bookFile.write( "\n\\BibleText\n" )
-                        elif marker=='c#':
-                            allFile.write( "\\chapterNumber{{{}}}".format( texText(text) ) ) # no NL
-                            bookFile.write( "\\chapterNumber{{{}}}".format( texText(text) ) ) # no NL
-                        elif marker == 'vp#': # This precedes a v field and has the verse number to be printed
-                            gotVP = text # Just remember it for now
-                        elif marker=='v':
-                            V = text
-                            if gotVP: # this is the verse number to be published
-                                text = gotVP
-                                gotVP = None
-                            if text != '1': # Don't write verse 1 number
-                                allFile.write( "\\verseNumber{{{}}}".format( texText(text) ) ) # no NL
-                                bookFile.write( "\\verseNumber{{{}}}".format( texText(text) ) ) # no NL
-
-                        elif marker in sMarkerTranslate:
-                            allFile.write( "\n\\{}{{{}}}\n".format( sMarkerTranslate[marker], texText(text) ) )
-                            bookFile.write( "\n\\{}{{{}}}\n".format( sMarkerTranslate[marker], texText(text) ) )
-                            bookFile.write( "\n\\addcontentsline{{toc}}{{toc}}{{{}}}\n".format( texText(text) ) )
-                        elif marker=='r':
-                            allFile.write( "\\BibleSectionCrossReference{{{}}}\n".format( texText(text) ) )
-                            bookFile.write( "\\BibleSectionCrossReference{{{}}}\n".format( texText(text) ) )
-                        elif marker in pMarkerTranslate:
-                            assert not text
-                            allFile.write( "\\BibleParagraphStyle{}\n".format( pMarkerTranslate[marker] ) )
-                            bookFile.write( "\\BibleParagraphStyle{}\n".format( pMarkerTranslate[marker] ) )
-                        elif marker in listMarkerTranslate:
-                            assert not text
-                            allFile.write( "\\BibleParagraphStyle{}\n".format( listMarkerTranslate[marker] ) )
-                            bookFile.write( "\\BibleParagraphStyle{}\n".format( listMarkerTranslate[marker] ) )
-                        elif marker in ('v~','p~',):
-                            allFile.write( "{}\n".format( texText(text) ) )
-                            bookFile.write( "{}\n".format( texText(text) ) )
-                        else:
-                            if text:
-                                logger.error( "toTeX: {} lost text in {} field in {} {}:{} {!r}".format( self.abbreviation, marker, BBB, C, V, text ) )
-                                #if BibleOrgSysGlobals.debugFlag: halt
-                            unhandledMarkers.add( marker )
-                        #if extras and marker not in ('v~','p~',): logger.critical( "toTeX: extras not handled for {} at {} {}:{}".format( marker, BBB, C, V ) )
-                    allFile.write( "\\BibleBookEnd\n" )
-                    bookFile.write( "\\BibleBookEnd\n" )
-                    bookFile.write( "\\end{document}\n" )
-                makePDFs( BBB, filepath, '30s' )
-            allFile.write( "\\end{document}\n" )
-        makePDFs( 'All', allFilepath, '3m' )
+        # Write the plain text XeTeX file (and compile each book in the background as it's finished)
+        xelatexFilepath = shutil.which( 'xelatex' ) or '/usr/bin/xelatex'
+        with ExternalJobRunner( maxJobs=maxJobs ) as jobRunner: # Waits for all the PDFs at the end (even if something fails)
+            allFilename = "All-BOS-BibleWriter.tex"
+            allFilepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( allFilename ) )
+            vPrint( 'Info', debuggingThisModule, '  toTeX: ' + _("Writing {!r}…").format( allFilepath ) )
+            with open( allFilepath, 'wt', encoding='utf-8' ) as allFile:
+                writeTeXHeader( allFile )
+                for j, (BBB,bookObject) in enumerate( self.books.items() ):
+                    haveTitle = haveIntro = False
+                    filename = "{:02}-{}_BOS-BibleWriter.tex".format( j, BBB )
+                    filepath = os.path.join( outputFolderpath, BibleOrgSysGlobals.makeSafeFilename( filename ) )
+                    vPrint( 'Info', debuggingThisModule, '  toTeX: ' + _("Writing {!r}…").format( filepath ) )
+                    with open( filepath, 'wt', encoding='utf-8' ) as bookFile:
+                        writeTeXHeader( bookFile )
+                        allFile.write( "\n\\BibleBook{{{}}}\n".format( bookObject.getAssumedBookNames()[0] ) )
+                        bookFile.write( "\n\\BibleBook{{{}}}\n".format( bookObject.getAssumedBookNames()[0] ) )
+                        bookFile.write( "\n\\BibleBookTableOfContents\n".format( bookObject.getAssumedBookNames()[0] ) )
+                        gotVP = None
+                        C, V = '-1', '-1' # So first/id line starts at -1:0
+                        for entry in bookObject._processedLines:
+                            marker, text = entry.getMarker(), entry.getFullText()
+                            if '¬' in marker or marker in BOS_ADDED_NESTING_MARKERS or marker=='v=':
+                                continue # Just ignore added markers — not needed here
+                            if marker in USFM_PRECHAPTER_MARKERS:
+                                if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
+                                    assert C=='-1' or marker=='rem' or marker.startswith('mte')
+                                V = str( int(V) + 1 )
+
+                            if marker in OFTEN_IGNORED_USFM_HEADER_MARKERS or marker in ('ie',): # Just ignore these lines
+                                ignoredMarkers.add( marker )
+                            elif marker in mtMarkerTranslate:
+                                if not haveTitle:
+                                    allFile.write( "\n\\BibleTitlePage\n" )
+                                    bookFile.write( "\n\\BibleTitlePage\n" )
+                                    haveTitle = True
+                                allFile.write( "\\{}{{{}}}\n".format( mtMarkerTranslate[marker], texText(text) ) )
+                                bookFile.write( "\\{}{{{}}}\n".format( mtMarkerTranslate[marker], texText(text) ) )
+                            elif marker in imtMarkerTranslate:
+                                if not haveIntro:
+                                    allFile.write( "\n\\BibleIntro\n" )
+                                    bookFile.write( "\n\\BibleIntro\n" )
+                                    haveIntro = True
+                                allFile.write( "\\{}{{{}}}\n".format( imtMarkerTranslate[marker], texText(text) ) )
+                                bookFile.write( "\\{}{{{}}}\n".format( imtMarkerTranslate[marker], texText(text) ) )
+                            elif marker in ipMarkerTranslate:
+                                if not haveIntro:
+                                    allFile.write( "\n\\BibleIntro\n" )
+                                    bookFile.write( "\n\\BibleIntro\n" )
+                                    haveIntro = True
+                                allFile.write( "\\BibleParagraphStyle{}\n".format( ipMarkerTranslate[marker] ) )
+                                bookFile.write( "\\BibleParagraphStyle{}\n".format( ipMarkerTranslate[marker] ) )
+                                allFile.write( "{}\n".format( texText(text) ) )
+                                bookFile.write( "{}\n".format( texText(text) ) )
+                            elif marker in ipListMarkerTranslate:
+                                if not haveIntro:
+                                    allFile.write( "\n\\BibleIntro\n" )
+                                    bookFile.write( "\n\\BibleIntro\n" )
+                                    haveIntro = True
+                                allFile.write( "\\BibleParagraphStyle{}\n".format( ipListMarkerTranslate[marker] ) )
+                                bookFile.write( "\\BibleParagraphStyle{}\n".format( ipListMarkerTranslate[marker] ) )
+                                allFile.write( "{}\n".format( texText(text) ) )
+                                bookFile.write( "{}\n".format( texText(text) ) )
+
+                            elif marker=='c':
+                                C, V = text, '0'
+                                if text == '1': # Assume chapter 1 is the start of the actual Bible text
+                                    allFile.write( "\n\\BibleText\n" )
+                                    bookFile.write( "\n\\BibleText\n" )
+                            elif marker=='c#':
+                                allFile.write( "\\chapterNumber{{{}}}".format( texText(text) ) ) # no NL
+                                bookFile.write( "\\chapterNumber{{{}}}".format( texText(text) ) ) # no NL
+                            elif marker == 'vp#': # This precedes a v field and has the verse number to be printed
+                                gotVP = text # Just remember it for now
+                            elif marker=='v':
+                                V = text
+                                if gotVP: # this is the verse number to be published
+                                    text = gotVP
+                                    gotVP = None
+                                if text != '1': # Don't write verse 1 number
+                                    allFile.write( "\\verseNumber{{{}}}".format( texText(text) ) ) # no NL
+                                    bookFile.write( "\\verseNumber{{{}}}".format( texText(text) ) ) # no NL
+
+                            elif marker in sMarkerTranslate:
+                                allFile.write( "\n\\{}{{{}}}\n".format( sMarkerTranslate[marker], texText(text) ) )
+                                bookFile.write( "\n\\{}{{{}}}\n".format( sMarkerTranslate[marker], texText(text) ) )
+                                bookFile.write( "\n\\addcontentsline{{toc}}{{toc}}{{{}}}\n".format( texText(text) ) )
+                            elif marker=='r':
+                                allFile.write( "\\BibleSectionCrossReference{{{}}}\n".format( texText(text) ) )
+                                bookFile.write( "\\BibleSectionCrossReference{{{}}}\n".format( texText(text) ) )
+                            elif marker in pMarkerTranslate:
+                                assert not text
+                                allFile.write( "\\BibleParagraphStyle{}\n".format( pMarkerTranslate[marker] ) )
+                                bookFile.write( "\\BibleParagraphStyle{}\n".format( pMarkerTranslate[marker] ) )
+                            elif marker in listMarkerTranslate:
+                                assert not text
+                                allFile.write( "\\BibleParagraphStyle{}\n".format( listMarkerTranslate[marker] ) )
+                                bookFile.write( "\\BibleParagraphStyle{}\n".format( listMarkerTranslate[marker] ) )
+                            elif marker in ('v~','p~',):
+                                allFile.write( "{}\n".format( texText(text) ) )
+                                bookFile.write( "{}\n".format( texText(text) ) )
+                            else:
+                                if text:
+                                    logger.error( "toTeX: {} lost text in {} field in {} {}:{} {!r}".format( self.abbreviation, marker, BBB, C, V, text ) )
+                                    #if BibleOrgSysGlobals.debugFlag: halt
+                                unhandledMarkers.add( marker )
+                            #if extras and marker not in ('v~','p~',): logger.critical( "toTeX: extras not handled for {} at {} {}:{}".format( marker, BBB, C, V ) )
+                        allFile.write( "\\BibleBookEnd\n" )
+                        bookFile.write( "\\BibleBookEnd\n" )
+                        bookFile.write( "\\end{document}\n" )
+                    makePDFs( BBB, filepath, 30 )
+                allFile.write( "\\end{document}\n" )
+            makePDFs( 'All', allFilepath, 180 )
+        for result in jobRunner.getFailures():
+            if result['error']: logger.error( "toTeX: {} failed: {}".format( result['name'], result['error'] ) )
+            elif result['timedOut']: logger.error( "toTeX: {} timed out".format( result['name'] ) )
+            if result['stderr']: dPrint( 'Quiet', debuggingThisModule, "pEOS", result['stderr'] )
+        vPrint( 'Info', debuggingThisModule, "  toTeX: {}".format( jobRunner ) )
 
         if ignoredMarkers:
             logger.info( "toTeX: Ignored markers were {}".format( ignoredMarkers ) )
@@ -9655,19 +9486,10 @@ class BibleWriter( InternalBible ):
             vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toTeX markers were {}").format( unhandledMarkers ) )
 
         # Now create a zipped collection
-        vPrint( 'Info', debuggingThisModule, "  Zipping PDF files…" )
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllBible1PDFFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.Bible1.pdf' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
-        zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllBible2PDFFiles.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-        for filename in os.listdir( outputFolderpath ):
-            if filename.endswith( '.Bible2.pdf' ):
-                filepath = os.path.join( outputFolderpath, filename )
-                zf.write( filepath, filename ) # Save in the archive without the path
-        zf.close()
+        if self.wantExportArchives:
+            vPrint( 'Info', debuggingThisModule, "  Zipping PDF files…" )
+            zipFolder( os.path.join( outputFolderpath, 'AllBible1PDFFiles.zip' ), outputFolderpath, includeExtensions=('.Bible1.pdf',) )
+            zipFolder( os.path.join( outputFolderpath, 'AllBible2PDFFiles.zip' ), outputFolderpath, includeExtensions=('.Bible2.pdf',) )
 
         if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
             vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toTeX finished successfully at {}".format( datetime.now().strftime('%H:%M') ) )
@@ -9696,19 +9518,22 @@ class BibleWriter( InternalBible ):
     # end of BibleWriter.doExportHelper
 
 
-    def doAllExports( self, givenOutputFolderName=None, wantPhotoBible=None, wantODFs=None, wantPDFs=None ) -> Dict[str,bool]:
+    def doAllExports( self, givenOutputFolderName=None, wantPhotoBible=None, wantODFs=None, wantPDFs=None, wantArchives:bool=True ) -> Dict[str,bool]:
         """
         If the output folder is specified, it is expected that it's already created.
         Otherwise a new subfolder is created in the current folder.
 
         The three very processor intensive exports require explicit inclusion.
 
+        If wantArchives is False, the exports don't make zip (or tar) archives of their files.
+
         Returns a dictionary of result flags.
         """
         allWord = _("all") if wantPhotoBible and wantODFs and wantPDFs else _("most")
         vPrint( 'Normal', debuggingThisModule, "BibleWriterV{}.doAllExports: ".format(PROGRAM_VERSION) + _("Exporting {} ({}) to {} formats… {}").format( self.name, self.objectTypeString, allWord, datetime.now().strftime('%H:%M') ) )
 
         if not self.projectName: self.projectName = self.getAName() # Seems no post-processing was done???
+        self.wantExportArchives = wantArchives # Set before the multiprocessing so that the copies get it also
 
         if givenOutputFolderName is None:
             givenOutputFolderName = BibleOrgSysGlobals.DEFAULT_WRITEABLE_OUTPUT_FOLDERPATH
@@ -9900,13 +9725,12 @@ class BibleWriter( InternalBible ):
                 swExportResult, tWExportResult, MySwExportResult, ESwExportResult, MyBExportResult, SwSExportResult,
                 DrExportResult ) = results
             if wantODFs: # Do this one separately (coz it's so much longer, plus often locks up)
-                # Timeout is now done per book inside the toODF function
+                # Timeout is now done per book (by our OfficeJobRunner) inside the toODF function
                 #if BibleOrgSysGlobals.alreadyMultiprocessing or 'win' in sys.platform: # SIGALRM doesn't work
                 try: ODFExportResult = self.toODF( ODFOutputFolder )
                 except Exception as err:
                     ODFExportResult = False
                     vPrint( 'Quiet', debuggingThisModule, "BibleWriter.doAllExports.toODF Unexpected error:", sys.exc_info()[0], err)
-                    killLibreOfficeServiceManager()
                     logger.error( "BibleWriter.doAllExports.toODF: Oops, failed!" )
                 #else: # *nix system hopefully
                     #timeoutSeconds = int(60*len(self.books)*processorFactor) # (was 1200s=20m but failed for projects with > 66 books)
@@ -10075,7 +9899,6 @@ class BibleWriter( InternalBible ):
                 except Exception as err:
                     ODFExportResult = False
                     vPrint( 'Quiet', debuggingThisModule, "BibleWriter.doAllExports.toODF Unexpected error:", sys.exc_info()[0], err)
-                    killLibreOfficeServiceManager()
                     logger.error( "BibleWriter.doAllExports.toODF: Oops, failed!" )
             if wantPDFs: # Do TeX export last because it's slowest
                 try: TeXExportResult = self.toTeX( TeXOutputFolder )
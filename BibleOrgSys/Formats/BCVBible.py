@@ -38,6 +38,7 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
 from BibleOrgSys.Bible import Bible, BibleBook
 from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList, InternalBibleEntry
 
@@ -512,17 +513,26 @@ class BCVBibleBook( BibleBook ):
         fixErrors:List[str] = []
         self._processedLines = InternalBibleEntryList() # Contains more-processed tuples which contain the actual Bible text -- see below
 
+        def getCVFilename( CV ) -> str:
+            """ Returns the filename for the given verse (or the introduction). """
+            if isinstance( CV, tuple) and len(CV)==2:
+                return self.BBB+'_C'+CV[0]+'V'+CV[1]+'.txt'
+            return self.BBB+'__Intro.txt'
+        # end of getCVFilename
+
+        # There's a file for every verse so read them ahead using threads (in case we're on a slow filesystem)
+        prefetcher = FilePrefetcher( [os.path.join( self.sourceFolder, getCVFilename( CV ) ) for CV in self.givenCVList] )
+
         DUMMY_VALUE = 999999 # Some number bigger than the number of characters in a line
         for CV in self.givenCVList:
             lineCount = 0
             if isinstance( CV, tuple) and len(CV)==2:
                 C, V = CV
-                filename = self.BBB+'_C'+C+'V'+V+'.txt'
             else:
                 assert CV == ('-1',)
                 C = V = '-1', '0'
-                filename = self.BBB+'__Intro.txt'
-            with open( os.path.join( self.sourceFolder, filename ), 'rt', encoding='utf-8' ) as myFile: # Automatically closes the file when done
+            filename = getCVFilename( CV )
+            with prefetcher.open( os.path.join( self.sourceFolder, filename ), 'utf-8' ) as myFile: # Automatically closes the file when done
                 for line in myFile:
                     lineCount += 1
                     if lineCount==1 and line and line[0]==chr(65279): #U+FEFF
@@ -559,6 +569,7 @@ class BCVBibleBook( BibleBook ):
 
             #if loadErrors: self.checkResultsDictionary['Load Errors'] = loadErrors
             #if debugging: vPrint( 'Quiet', debuggingThisModule, self._rawLines ); halt
+        prefetcher.close()
         if fixErrors: self.checkResultsDictionary['Fix Text Errors'] = fixErrors
         self._processedFlag = True
         self.makeBookCVIndex()
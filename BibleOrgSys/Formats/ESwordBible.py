@@ -46,10 +46,10 @@ e.g.,
     And God calleth to the expanse `Heavens;' and there is an evening, and there is a morning--day second.<CM>
 """
 
-LAST_MODIFIED_DATE = '2020-04-12' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "e-SwordBible"
 PROGRAM_NAME = "e-Sword Bible format handler"
-PROGRAM_VERSION = '0.41'
+PROGRAM_VERSION = '0.43'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -71,6 +71,7 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible, BibleBook
+from BibleOrgSys.InputOutput.SQLiteBulkWriter import SQLiteBulkWriter
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
 
 
@@ -1167,7 +1168,7 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
 
     self here is a Bible object with _processedLines
     """
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
     from BibleOrgSys.Reference.USFM3Markers import OFTEN_IGNORED_USFM_HEADER_MARKERS, USFM_ALL_INTRODUCTION_MARKERS, USFM_BIBLE_PARAGRAPH_MARKERS, removeUSFMCharacterField, replaceUSFMCharacterFields
     from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS, BOS_NESTING_MARKERS
     from BibleOrgSys.Formats.theWordBible import theWordOTBookLines, theWordNTBookLines, theWordBookLines, theWordIgnoredIntroMarkers
@@ -1462,11 +1463,11 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
     # end of toESword.composeVerseLine
 
 
-    def writeESwordBibleBook( sqlObject, BBB:str, ourGlobals ):
+    def makeESwordBibleBookRows( BBB:str, ourGlobals ):
         """
-        Writes a book to the e-Sword sqlObject file.
+        Generates the (Book,Chapter,Verse,Scripture) rows of a book for the e-Sword Bible table.
         """
-        #dPrint( 'Quiet', debuggingThisModule, "toESword.writeESwordBibleBook( {}, {}, {}".format( sqlObject, BBB, ourGlobals ) )
+        #dPrint( 'Quiet', debuggingThisModule, "toESword.makeESwordBibleBookRows( {}, {}".format( BBB, ourGlobals ) )
         nonlocal lineCount
         bkData = self.books[BBB] if BBB in self.books else None
         #dPrint( 'Quiet', debuggingThisModule, bkData._processedLines )
@@ -1512,8 +1513,7 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
                         # Stay one line behind (because paragraph indicators get appended to the previous line)
                         if ourGlobals['lastBCV'] is not None \
                         and ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-                            sqlObject.execute( 'INSERT INTO "Bible" VALUES(?,?,?,?)', \
-                                (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
+                            yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
                             lineCount += 1
                     ourGlobals['lastLine'] = composedLine
                 ourGlobals['lastBCV'] = (nBBB,C,V)
@@ -1529,10 +1529,22 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
 
         # Write the last line of the file
         if ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-            sqlObject.execute( 'INSERT INTO "Bible" VALUES(?,?,?,?)', \
-                (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
+            yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
             lineCount += 1
-    # end of toESword.writeESwordBibleBook
+    # end of toESword.makeESwordBibleBookRows
+
+
+    def makeESwordBibleRows():
+        """
+        Generates the rows for all the books in the KJV order.
+        """
+        BBB = startBBB
+        while True:
+            yield from makeESwordBibleBookRows( BBB, mySettings )
+            handledBooks.append( BBB )
+            if BBB == endBBB: break
+            BBB = BOS.getNextBookCode( BBB )
+    # end of toESword.makeESwordBibleRows
 
 
     # Set-up their Bible reference system
@@ -1564,72 +1576,61 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
     else: filename = 'export'
     if not filename.endswith( extension ): filename += extension # Make sure that we have the right file extension
     filepath = os.path.join( outputFolder, BibleOrgSysGlobals.makeSafeFilename( filename ) )
-    if os.path.exists( filepath ): os.remove( filepath )
-    vPrint( 'Info', debuggingThisModule, '  writeESwordBibleBook: ' + _("Writing {!r}…").format( filepath ) )
-    conn = sqlite3.connect( filepath )
-    cursor = conn.cursor()
-
-    # First write the settings Details table
-    exeStr = 'CREATE TABLE Details (Description NVARCHAR(255), Abbreviation NVARCHAR(50), Comments TEXT, Version TEXT, VersionDate DATETIME, PublishDate DATETIME, RightToLeft BOOL, OT BOOL, NT BOOL, Strong BOOL' # incomplete
-    customCSS = self.getSetting( 'CustomCSS' )
-    if customCSS: exeStr += ', CustomCSS TEXT'
-    exeStr += ')'
-    cursor.execute( exeStr )
-
-    values = []
+    vPrint( 'Info', debuggingThisModule, '  createESwordBibleModule: ' + _("Writing {!r}…").format( filepath ) )
+    with SQLiteBulkWriter( filepath ) as writer: # Replaces any existing file (and deletes the incomplete file if anything fails)
+        # First write the settings Details table
+        exeStr = 'CREATE TABLE Details (Description NVARCHAR(255), Abbreviation NVARCHAR(50), Comments TEXT, Version TEXT, VersionDate DATETIME, PublishDate DATETIME, RightToLeft BOOL, OT BOOL, NT BOOL, Strong BOOL' # incomplete
+        customCSS = self.getSetting( 'CustomCSS' )
+        if customCSS: exeStr += ', CustomCSS TEXT'
+        exeStr += ')'
+        writer.execute( exeStr )
 
-    description = self.getSetting( 'Description' )
-    if not description: description = self.getSetting( 'description' )
-    if not description: description = self.name
-    values.append( description )
+        values = []
 
-    if self.abbreviation: abbreviation = self.abbreviation
-    else: abbreviation = self.getSetting( 'WorkAbbreviation' )
-    if not abbreviation: abbreviation = self.name[:3].upper()
-    values.append( abbreviation )
+        description = self.getSetting( 'Description' )
+        if not description: description = self.getSetting( 'description' )
+        if not description: description = self.name
+        values.append( description )
 
-    comments = self.getSetting( 'Comments' )
-    values.append( comments )
+        if self.abbreviation: abbreviation = self.abbreviation
+        else: abbreviation = self.getSetting( 'WorkAbbreviation' )
+        if not abbreviation: abbreviation = self.name[:3].upper()
+        values.append( abbreviation )
 
-    version = self.getSetting( 'Version' )
-    values.append( version )
+        comments = self.getSetting( 'Comments' )
+        values.append( comments )
 
-    versionDate = self.getSetting( 'VersionDate' )
-    values.append( versionDate )
+        version = self.getSetting( 'Version' )
+        values.append( version )
 
-    publishDate = self.getSetting( 'PublishDate' )
-    values.append( publishDate )
+        versionDate = self.getSetting( 'VersionDate' )
+        values.append( versionDate )
 
-    rightToLeft = self.getSetting( 'RightToLeft' )
-    values.append( rightToLeft )
+        publishDate = self.getSetting( 'PublishDate' )
+        values.append( publishDate )
 
-    values.append( True if testament=='OT' or testament=='BOTH' else False )
-    values.append( True if testament=='NT' or testament=='BOTH' else False )
+        rightToLeft = self.getSetting( 'RightToLeft' )
+        values.append( rightToLeft )
 
-    Strong = self.getSetting( 'Strong' )
-    values.append( Strong if Strong else False )
+        values.append( True if testament=='OT' or testament=='BOTH' else False )
+        values.append( True if testament=='NT' or testament=='BOTH' else False )
 
-    if customCSS: values.append( customCSS )
+        Strong = self.getSetting( 'Strong' )
+        values.append( Strong if Strong else False )
 
-    exeStr = 'INSERT INTO "Details" VALUES(' + '?,'*(len(values)-1) + '?)'
-    #dPrint( 'Quiet', debuggingThisModule, exeStr, values )
-    cursor.execute( exeStr, values )
+        if customCSS: values.append( customCSS )
 
-    # Now create and fill the Bible table
-    cursor.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT)' )
-    conn.commit() # save (commit) the changes
-    BBB, lineCount = startBBB, 0
-    while True: # Write each Bible book in the KJV order
-        writeESwordBibleBook( cursor, BBB, mySettings )
-        conn.commit() # save (commit) the changes
-        handledBooks.append( BBB )
-        if BBB == endBBB: break
-        BBB = BOS.getNextBookCode( BBB )
+        exeStr = 'INSERT INTO "Details" VALUES(' + '?,'*(len(values)-1) + '?)'
+        #dPrint( 'Quiet', debuggingThisModule, exeStr, values )
+        writer.execute( exeStr, values )
 
-    # Now create the index
-    cursor.execute( 'CREATE INDEX BookChapterVerseIndex ON Bible (Book, Chapter, Verse)' )
-    conn.commit() # save (commit) the changes
-    cursor.close()
+        # Now create and fill the Bible table (all in the one transaction)
+        writer.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT)' )
+        # Creating the index is quicker after all the verses are loaded
+        writer.deferStatement( 'CREATE INDEX BookChapterVerseIndex ON Bible (Book, Chapter, Verse)' )
+        lineCount = 0
+        writer.executemany( 'INSERT INTO "Bible" VALUES(?,?,?,?)', makeESwordBibleRows() )
+        # The changes are saved (committed) at the end of the with block
 
     if mySettings['unhandledMarkers']:
         logging.warning( "BibleWriter.toESword: Unhandled markers were {}".format( mySettings['unhandledMarkers'] ) )
@@ -1642,10 +1643,9 @@ def createESwordBibleModule( self, outputFolder, controlDict ):
         vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toESword books were {}").format( unhandledBooks ) )
 
     # Now create a zipped version
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} e-Sword file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if self.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} e-Sword file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toESword finished successfully." )
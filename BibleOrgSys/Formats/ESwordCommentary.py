@@ -65,10 +65,10 @@ from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisational
 from BibleOrgSys.Formats.ESwordBible import handleESwordLine
 
 
-LAST_MODIFIED_DATE = '2020-04-29' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "e-SwordCommentary"
 PROGRAM_NAME = "e-Sword Commentary format handler"
-PROGRAM_VERSION = '0.07'
+PROGRAM_VERSION = '0.08'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -619,7 +619,7 @@ def createESwordCommentaryModule( self, outputFolder, controlDict ):
 
     self here is a Bible object with _processedLines
     """
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
     from BibleOrgSys.Reference.USFM3Markers import OFTEN_IGNORED_USFM_HEADER_MARKERS, USFM_ALL_INTRODUCTION_MARKERS, removeUSFMCharacterField, replaceUSFMCharacterFields
     from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS, BOS_NESTING_MARKERS
     from BibleOrgSys.Formats.theWordBible import theWordOTBookLines, theWordNTBookLines, theWordBookLines, theWordIgnoredIntroMarkers
@@ -1093,10 +1093,9 @@ def createESwordCommentaryModule( self, outputFolder, controlDict ):
         vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toESword books were {}").format( unhandledBooks ) )
 
     # Now create a zipped version
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} e-Sword file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if self.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} e-Sword file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toESword finished successfully." )
@@ -52,10 +52,10 @@ from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKE
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
 
 
-LAST_MODIFIED_DATE = '2020-05-03' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "EasyWorshipBible"
 PROGRAM_NAME = "EasyWorship Bible format handler"
-PROGRAM_VERSION = '0.15'
+PROGRAM_VERSION = '0.16'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -159,7 +159,7 @@ def createEasyWorshipBible( BibleObject, outputFolder=None ):
         and since we don't know the meaning of all the binary pieces of the file,
         we can't be certain yet that this output will actually work. :-(
     """
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
 
     # It seems 7-9 give the correct two header bytes
     ZLIB_COMPRESSION_LEVEL = 9 #  -1=default(=6), 0=none, 1=fastest…9=highest compression level
@@ -351,10 +351,9 @@ def createEasyWorshipBible( BibleObject, outputFolder=None ):
 
     # Now create a zipped version
     filepath = os.path.join( outputFolder, filename )
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} EWB file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if BibleObject.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} EWB file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.createEasyWorshipBible finished successfully." )
@@ -5,7 +5,7 @@
 #
 # Module handling (Java) Go Bible files (intended for feature phones)
 #
-# Copyright (C) 2019-2020 Robert Hunt
+# Copyright (C) 2019-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -29,15 +29,13 @@ See https://github.com/xkjyeah/gobible-creator
 and https://github.com/DavidHaslam/GoBibleCore.
 """
 from gettext import gettext as _
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 import os
 import struct
 import multiprocessing
-import tempfile
 import zipfile
-from shutil import rmtree
 
 if __name__ == '__main__':
     import sys
@@ -50,10 +48,10 @@ from BibleOrgSys.Bible import Bible, BibleBook
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
 
 
-LAST_MODIFIED_DATE = '2020-04-29' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "GoBible"
 PROGRAM_NAME = "Go Bible format handler"
-PROGRAM_VERSION = '0.04'
+PROGRAM_VERSION = '0.06'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -158,6 +156,25 @@ def GoBibleFileCheck( givenPathname, strictCheck=True, autoLoad=False, autoLoadB
 # end of GoBibleFileCheck
 
 
+def listArchiveFolder( archiveNames, folderName:str ) -> Tuple[List[str],List[str]]:
+    """
+    Given the names from a zip archive,
+        find the files and the subfolders directly inside the given folder.
+
+    The folderName must be '' (for the top level) or end with a slash.
+
+    Returns two sorted lists: fileNames, folderNames
+    """
+    foundFiles, foundFolders = set(), set()
+    for name in archiveNames:
+        if not name.startswith( folderName ) or name == folderName: continue
+        firstPart, slash, remainder = name[len(folderName):].partition( '/' )
+        if slash: foundFolders.add( firstPart )
+        else: foundFiles.add( firstPart )
+    return sorted( foundFiles ), sorted( foundFolders )
+# end of listArchiveFolder
+
+
 
 class GoBible( Bible ):
     """
@@ -192,28 +209,27 @@ class GoBible( Bible ):
         self.name = self.givenName
         #if self.name is None:
             #pass
+        self.archive = None # Only kept open while loadBooks() is reading the books
     # end of GoBible.__init__
 
 
     def preload( self ):
         """
-        Loads the Metadata file if it can be found.
+        Reads the main Index file (which lists the books and chapters) from the .jar file.
+
+        Nothing is extracted -- the book files are read straight out of the archive
+            when each book is loaded.
         """
         fnPrint( debuggingThisModule, "preload() from {}".format( self.sourceFilepath ) )
 
-        self.unzippedFolderpath = tempfile.mkdtemp( suffix='_GoBible', prefix='BOS_' )
-        vPrint( 'Info', debuggingThisModule, "Extracting files into {}…".format( self.unzippedFolderpath ) )
+        self.dataFolderpath = 'Bible Data/' # Within the archive
         with zipfile.ZipFile( self.sourceFilepath ) as myzip:
-            # NOTE: Could be a security risk here
-            myzip.extractall( self.unzippedFolderpath )
-
-        # Do a preliminary check on the contents of our folder
-        foundFiles, foundFolders = [], []
-        for something in os.listdir( self.unzippedFolderpath ):
-            somepath = os.path.join( self.unzippedFolderpath, something )
-            if os.path.isdir( somepath ): foundFolders.append( something )
-            elif os.path.isfile( somepath ): foundFiles.append( something )
-            else: logging.error( "GoBible.preload: Not sure what {!r} is in {}!".format( somepath, self.unzippedFolderpath ) )
+            self.archiveNames = set( myzip.namelist() )
+            mainIndexFilename = self.dataFolderpath + 'Index'
+            mainIndexContents = myzip.read( mainIndexFilename ) if mainIndexFilename in self.archiveNames else None
+
+        # Do a preliminary check on the contents of our archive
+        foundFiles, foundFolders = listArchiveFolder( self.archiveNames, '' )
         numVitalFolders = 0
         if foundFolders:
             unexpectedFolders = []
@@ -225,26 +241,20 @@ class GoBible( Bible ):
                     continue
                 unexpectedFolders.append( folderName )
             if unexpectedFolders:
-                logging.info( _("GoBible.preload: Surprised to see subfolders in {!r}: {}").format( self.unzippedFolderpath, unexpectedFolders ) )
+                logging.info( _("GoBible.preload: Surprised to see subfolders in {!r}: {}").format( self.sourceFilepath, unexpectedFolders ) )
         if not foundFiles:
-            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any files in {!r}".format( self.unzippedFolderpath ) )
+            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any files in {!r}".format( self.sourceFilepath ) )
             raise FileNotFoundError # No use continuing
         if not numVitalFolders:
-            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any vital folders in {!r}".format( self.unzippedFolderpath ) )
+            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any vital folders in {!r}".format( self.sourceFilepath ) )
             raise FileNotFoundError # No use continuing
 
-        self.dataFolderpath = os.path.join( self.unzippedFolderpath, 'Bible Data/' )
-        if not os.path.isdir( self.dataFolderpath ):
+        foundFiles, foundFolders = listArchiveFolder( self.archiveNames, self.dataFolderpath )
+        if not foundFiles and not foundFolders:
             logging.critical( _("GoBible.preload: Unable to find folder: {}").format( self.dataFolderpath ) )
 
         # Do a preliminary check on the contents of our subfolder
         #self.discoveredBookList = []
-        foundFiles, foundFolders = [], []
-        for something in os.listdir( self.dataFolderpath ):
-            somepath = os.path.join( self.dataFolderpath, something )
-            if os.path.isdir( somepath ): foundFolders.append( something )
-            elif os.path.isfile( somepath ): foundFiles.append( something )
-            else: logging.error( "GoBible.preload: Not sure what {!r} is in {}!".format( somepath, self.dataFolderpath ) )
         numBookFolders = 0
         if foundFolders:
             unexpectedFolders = []
@@ -263,10 +273,10 @@ class GoBible( Bible ):
             if unexpectedFolders:
                 logging.info( _("GoBible.preload: Surprised to see subfolders in {!r}: {}").format( self.dataFolderpath, unexpectedFolders ) )
         if not foundFiles:
-            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any files in {!r}".format( self.dataFolderpath ) )
+            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any files in {!r} in {}".format( self.dataFolderpath, self.sourceFilepath ) )
             raise FileNotFoundError # No use continuing
         if not numBookFolders:
-            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any book folders in {!r}".format( self.dataFolderpath ) )
+            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find any book folders in {!r} in {}".format( self.dataFolderpath, self.sourceFilepath ) )
             raise FileNotFoundError # No use continuing
         #dPrint( 'Never', debuggingThisModule, "GoBible.preload: Discovered", self.discoveredBookList )
 
@@ -283,9 +293,10 @@ class GoBible( Bible ):
             assert len(result) == stringLength # Read string correctly
             return result, stringLength+2
 
-        # Load the Index file
-        with open( os.path.join( self.dataFolderpath, 'Index' ), 'rb' ) as main_index_file:
-            mainIndexContents = main_index_file.read()
+        # Decode the Index file (already read in above)
+        if mainIndexContents is None:
+            vPrint( 'Quiet', debuggingThisModule, "GoBible.preload: Couldn't find the main Index file in {!r} in {}".format( self.dataFolderpath, self.sourceFilepath ) )
+            raise FileNotFoundError # No use continuing
         index = 0
         numBooks, = struct.unpack( "<H", mainIndexContents[index:index+2] ); index += 2
         vPrint( 'Never', debuggingThisModule, "numBooks", numBooks )
@@ -386,11 +397,32 @@ class GoBible( Bible ):
     # end of GoBible.preload
 
 
+    def readBookFiles( self, filenameBase:str ) -> Dict[str,bytes]:
+        """
+        Read all of the files for one book straight out of the .jar file
+            (without reading or decompressing the files for any other books).
+
+        The member names come from the list made by preload(),
+            and the archive that loadBooks() holds open is used if there is one.
+
+        Returns a dictionary with the filenames (without the folder) as keys.
+        """
+        fnPrint( debuggingThisModule, f"GoBible.readBookFiles( {filenameBase!r} )" )
+
+        bookFolderName = f'{self.dataFolderpath}{filenameBase}/'
+        fileNames, _folderNames = listArchiveFolder( self.archiveNames, bookFolderName )
+        if self.archive is not None:
+            return { fileName:self.archive.read( bookFolderName+fileName ) for fileName in fileNames }
+        with zipfile.ZipFile( self.sourceFilepath ) as myzip:
+            return { fileName:myzip.read( bookFolderName+fileName ) for fileName in fileNames }
+    # end of GoBible.readBookFiles
+
+
     def loadBook( self, BBB:str ):
         """
         Load the requested book into self.books if it's not already loaded.
 
-        NOTE: You should ensure that preload() has been called first.
+        Only the files for this book are read from the .jar file.
         """
         fnPrint( debuggingThisModule, "GoBible.loadBook( {} )".format( BBB ) )
         if BBB in self.books: return # Already loaded
@@ -398,6 +430,7 @@ class GoBible( Bible ):
             logging.warning( "We had already tried loading GoBible {} for {}".format( BBB, self.name ) )
             return # We've already attempted to load this book
         self.triedLoadingBook[BBB] = True
+        if not self.preloadDone: self.preload()
         if BBB in self.bookList:
             if BibleOrgSysGlobals.verbosityLevel > 2 or BibleOrgSysGlobals.debugFlag: vPrint( 'Quiet', debuggingThisModule, _("  GoBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
             GoBibleBk = GoBibleBook( self, BBB )
@@ -441,33 +474,36 @@ class GoBible( Bible ):
         if not self.preloadDone: self.preload()
 
         if self.bookList:
-            if BibleOrgSysGlobals.maxProcesses > 1 \
+            BBBsToLoad = [BBB for BBB in self.bookList if BBB not in self.books] # Some might have been loaded already
+            if BibleOrgSysGlobals.maxProcesses > 1 and len(BBBsToLoad) > 1 \
             and not BibleOrgSysGlobals.alreadyMultiprocessing: # Get our subprocesses ready and waiting for work
                 if BibleOrgSysGlobals.verbosityLevel > 1:
-                    vPrint( 'Quiet', debuggingThisModule, _("Loading {} GoBible books using {} processes…").format( len(self.bookList), BibleOrgSysGlobals.maxProcesses ) )
+                    vPrint( 'Quiet', debuggingThisModule, _("Loading {} GoBible books using {} processes…").format( len(BBBsToLoad), BibleOrgSysGlobals.maxProcesses ) )
                     vPrint( 'Quiet', debuggingThisModule, _("  NOTE: Outputs (including error and warning messages) from loading various books may be interspersed.") )
                 BibleOrgSysGlobals.alreadyMultiprocessing = True
                 with multiprocessing.Pool( processes=BibleOrgSysGlobals.maxProcesses ) as pool: # start worker processes
-                    results = pool.map( self._loadBookMP, self.bookList ) # have the pool do our loads
-                    assert len(results) == len(self.bookList)
+                    results = pool.map( self._loadBookMP, BBBsToLoad ) # have the pool do our loads
+                    assert len(results) == len(BBBsToLoad)
                     for bBook in results:
                         bBook.containerBibleObject = self # Because the pickling and unpickling messes this up
                         self.stashBook( bBook ) # Saves them in the correct order
+                        self.triedLoadingBook[bBook.BBB] = True
                 BibleOrgSysGlobals.alreadyMultiprocessing = False
             else: # Just single threaded
                 # Load the books one by one -- assuming that they have regular Paratext style filenames
-                for BBB in self.bookList:
-                    #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
-                        #dPrint( 'Quiet', debuggingThisModule, _("  GoBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
-                    loadedBook = self.loadBook( BBB ) # also saves it
+                self.archive = zipfile.ZipFile( self.sourceFilepath ) # Open the .jar file once for all the books
+                try:
+                    for BBB in BBBsToLoad:
+                        #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
+                            #dPrint( 'Quiet', debuggingThisModule, _("  GoBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
+                        loadedBook = self.loadBook( BBB ) # also saves it
+                finally:
+                    self.archive.close()
+                    self.archive = None
         else:
             logging.critical( "GoBible: " + _("No books to load in folder '{}'!").format( self.sourceFolder ) )
         #dPrint( 'Quiet', debuggingThisModule, self.getBookList() )
 
-        # Delete the temporary folder (where .jar was unzipped)
-        rmtree( self.unzippedFolderpath )
-        self.unzippedFolderpath = None
-
         self.doPostLoadProcessing()
     # end of GoBible.load
 # end of GoBible class
@@ -495,7 +531,7 @@ class GoBibleBook( BibleBook ):
 
     def load( self, indexToBook ):
         """
-        Load the Go Bible book from a folder.
+        Load the Go Bible book from its files in the .jar archive.
 
         Tries to combine physical lines into logical lines,
             i.e., so that all lines begin with a GoBible paragraph marker.
@@ -507,14 +543,13 @@ class GoBibleBook( BibleBook ):
         """
         fnPrint( debuggingThisModule, f"GoBibleBook.load( {indexToBook} )" )
         filenameBase = self.containerBibleObject.filenameBases[indexToBook]
-        folderpath = os.path.join( self.containerBibleObject.dataFolderpath, filenameBase+'/' )
+        bookFiles = self.containerBibleObject.readBookFiles( filenameBase ) # Only the files for this book
         loadErrors:List[str] = []
 
         # Load the book index first
-        indexPath = os.path.join( folderpath, 'Index' )
-        vPrint( 'Info', debuggingThisModule, "  " + _("Loading book index {}…").format( indexPath ) )
-        with open( indexPath, 'rb' ) as bookIndexFile:
-            bookIndexContents = bookIndexFile.read()
+        vPrint( 'Info', debuggingThisModule, "  " + _("Loading book index {}/Index…").format( filenameBase ) )
+        try: bookIndexContents = bookFiles['Index']
+        except KeyError: raise FileNotFoundError( f"GoBible has no Index for {filenameBase} in {self.containerBibleObject.sourceFilepath}" )
         numChapters = self.containerBibleObject.numChaptersList[indexToBook]
         index = 0
         chapterLengths = []
@@ -550,10 +585,10 @@ class GoBibleBook( BibleBook ):
                     #dPrint( 'Quiet', debuggingThisModule, chapterText[chapterOffset:] )
                     #assert chapterOffset == dataLength # Check we used all of the last one
                     chapterText = chapterText[chapterOffset:]
-                textFilepath = os.path.join( folderpath, f'{filenameBase} {fileIndexNumber}' )
-                vPrint( 'Info', debuggingThisModule, f"At book {indexToBook+1} chapter {chapterNumberIndex+1}: loading Bible text from '{textFilepath}'…" )
-                with open( textFilepath, 'rb' ) as chapterFile:
-                    chapterDataFull = chapterFile.read()
+                textFilename = f'{filenameBase} {fileIndexNumber}'
+                vPrint( 'Info', debuggingThisModule, f"At book {indexToBook+1} chapter {chapterNumberIndex+1}: loading Bible text from '{textFilename}'…" )
+                try: chapterDataFull = bookFiles[textFilename]
+                except KeyError: raise FileNotFoundError( f"GoBible has no '{textFilename}' in {self.containerBibleObject.sourceFilepath}" )
                 lastFileIndexNumber = fileIndexNumber
                 #dPrint( 'Quiet', debuggingThisModule, chapterDataFull[:200], '…' )
                 dataLength, = struct.unpack( ">I", chapterDataFull[:4] )
@@ -665,7 +700,6 @@ def briefDemo() -> None:
 
         result2 = GoBibleFileCheck( testFolder, autoLoad=True )
         vPrint( 'Normal', debuggingThisModule, "GoBible TestA2", result2 )
-        if isinstance( result2, GoBible ): rmtree( result2.unzippedFolderpath )
 
         result3 = GoBibleFileCheck( testFolder, autoLoadBooks=True )
         vPrint( 'Normal', debuggingThisModule, "GoBible TestA3", result3 )
@@ -724,7 +758,6 @@ def fullDemo() -> None:
 
             result2 = GoBibleFileCheck( testFolder, autoLoad=True )
             vPrint( 'Normal', debuggingThisModule, "GoBible TestA2", result2 )
-            if isinstance( result2, GoBible ): rmtree( result2.unzippedFolderpath )
 
             result3 = GoBibleFileCheck( testFolder, autoLoadBooks=True )
             vPrint( 'Normal', debuggingThisModule, "GoBible TestA3", result3 )
@@ -99,13 +99,14 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible, BibleBook
+from BibleOrgSys.InputOutput.SQLiteBulkWriter import SQLiteBulkWriter
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
 
 
-LAST_MODIFIED_DATE = '2020-06-14' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "MyBibleBible"
 PROGRAM_NAME = "MyBible Bible format handler"
-PROGRAM_VERSION = '0.21'
+PROGRAM_VERSION = '0.23'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -749,7 +750,7 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
 
     self here is a Bible object with _processedLines
     """
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
     from BibleOrgSys.Reference.USFM3Markers import OFTEN_IGNORED_USFM_HEADER_MARKERS, USFM_ALL_INTRODUCTION_MARKERS, USFM_BIBLE_PARAGRAPH_MARKERS, removeUSFMCharacterField, replaceUSFMCharacterFields
     from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS, BOS_NESTING_MARKERS
     from BibleOrgSys.Formats.theWordBible import theWordOTBookLines, theWordNTBookLines, theWordBookLines, theWordIgnoredIntroMarkers
@@ -1070,11 +1071,13 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
     # end of toMyBible.composeVerseLine
 
 
-    def writeMyBibleBook( sqlObject, BBB:str, nBBB, bkData, ourGlobals ):
+    def makeMyBibleBookRows( BBB:str, nBBB, bkData, ourGlobals ):
         """
-        Writes a book to the MyBible sqlObject file.
+        Generates the (book_number,chapter,verse,text) rows of a book for the MyBible verses table.
+
+        Returns (via StopIteration) True if the book was handled.
         """
-        fnPrint( debuggingThisModule, "writeMyBibleBook( …, {}, {}, …, {} )".format( BBB, nBBB, ourGlobals ) )
+        fnPrint( debuggingThisModule, "makeMyBibleBookRows( {}, {}, …, {} )".format( BBB, nBBB, ourGlobals ) )
 
         try: verseList = BOS.getNumVersesList( BBB )
         except KeyError: return False
@@ -1119,12 +1122,7 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
                         # Stay one line behind (because paragraph indicators get appended to the previous line)
                         if ourGlobals['lastBCV'] is not None \
                         and ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-                            try:
-                                sqlObject.execute( 'INSERT INTO verses VALUES(?,?,?,?)', \
-                                (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
-                            except Exception as e:
-                                logging.critical( f"MyBible: error using {ourGlobals}: {e}" )
-                                raise e # again
+                            yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
                             #lineCount += 1
                     ourGlobals['lastLine'] = composedLine
                 ourGlobals['lastBCV'] = (nBBB,C,V)
@@ -1140,11 +1138,26 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
 
         # Write the last line of the file
         if ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-            sqlObject.execute( 'INSERT INTO verses VALUES(?,?,?,?)', \
-                (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
+            yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
             #lineCount += 1
         return True
-    # end of toMyBible.writeMyBibleBook
+    # end of toMyBible.makeMyBibleBookRows
+
+
+    def makeMyBibleRows():
+        """
+        Generates the verse rows for all of the books that we know how to encode.
+        """
+        for bkData in self:
+            BBB = bkData.BBB
+            if BBB in BOOKS_TO_IGNORE: continue # No way to encode these books
+            #dPrint( 'Quiet', debuggingThisModule, "LOOP2", self.name, BBB )
+            adjBBB = BBB
+            #if BBB=='ESG': adjBBB = 'GES'
+            bookColor, bookNumber, rusAbbrev, rusName, engAbbrev, engName = BOOK_TABLE[adjBBB]
+            if (yield from makeMyBibleBookRows( BBB, bookNumber, bkData, mySettings )):
+                handledBooks.append( BBB )
+    # end of toMyBible.makeMyBibleRows
 
 
     # Set-up their Bible reference system
@@ -1187,94 +1200,72 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
 
     if not filename.endswith( extension ): filename += extension # Make sure that we have the right file extension
     filepath = os.path.join( outputFolder, BibleOrgSysGlobals.makeSafeFilename( filename ) )
-    if os.path.exists( filepath ): os.remove( filepath )
-    vPrint( 'Info', debuggingThisModule, '  writeMyBibleBook: ' + _("Writing {!r}…").format( filepath ) )
-    conn = sqlite3.connect( filepath )
-    cursor = conn.cursor()
-
-
-    # First write the settings info table
-    cursor.execute( 'CREATE TABLE info (name TEXT, value TEXT)' )
-    exeStr = 'INSERT INTO info VALUES(?,?)'
-
-    description = self.getSetting( 'MyBibleDescription' )
-    if not description: description = self.getSetting( 'Description' )
-    if not description: description = self.getSetting( 'description' )
-    if not description: description = self.name
-    if not description: description = 'Unknown'
-    cursor.execute( exeStr, ('description', description) )
-
-    chapterString = self.getSetting( 'MyBibleChapterString' )
-    if not chapterString: chapterString = 'Chapter'
-    cursor.execute( exeStr, ('chapter_string', chapterString) )
-
-    language = self.getSetting( 'MyBibleLanguage' )
-    if not language: language = 'en'
-    cursor.execute( exeStr, ('language', language) )
-
-    ISOLanguageCode = self.getSetting( 'ISOLanguageCode' )
-    if not ISOLanguageCode: ISOLanguageCode = 'eng'
-    cursor.execute( exeStr, ('language_iso639-2b', ISOLanguageCode) )
-
-    cursor.execute( exeStr, ('russian_numbering', 'false') )
-
-    Strong = self.getSetting( 'Strong' )
-    if not Strong: Strong = 'false'
-    cursor.execute( exeStr, ('strong_numbers', Strong) )
-
-    rightToLeft = self.getSetting( 'RightToLeft' )
-    if not rightToLeft: rightToLeft = 'false'
-    cursor.execute( exeStr, ('right_to_left', rightToLeft) )
-    conn.commit() # save (commit) the changes
-
-
-    BOOKS_TO_IGNORE = ( 'FRT', 'INT', 'BAK', 'GLS', 'OTH', 'XXA','XXB','XXC','XXD','XXE','XXF','XXG', 'NDX', 'UNK',
-                       'PS2', 'ESG','GES', 'MA4', ) # This line are ones containing verse data but which we don't know how to encode
-
-    # Now create and fill the Bible books table
-    cursor.execute( 'CREATE TABLE books_all(book_color TEXT, book_number NUMERIC, short_name TEXT, long_name TEXT, is_present NUMERIC)' )
-    exeStr = 'INSERT INTO books_all VALUES(?,?,?,?,?)'
-    for bkData in self:
-        BBB = bkData.BBB
-        if BBB in BOOKS_TO_IGNORE: continue # No way to encode these books
-        #dPrint( 'Quiet', debuggingThisModule, "LOOP1", self.name, BBB )
-        adjBBB = BBB
-        #if BBB=='ESG': adjBBB = 'GES'
-        bookColor, bookNumber, rusAbbrev, rusName, engAbbrev, engName = BOOK_TABLE[adjBBB]
-
-        bookAbbrev = self.getSetting( BBB+'Abbreviation' )
-        if not bookAbbrev: bookAbbrev = self.getSetting( BBB+'ShortName' )
-        if not bookAbbrev: bookAbbrev = engAbbrev
-
-        bookName = self.getSetting( BBB+'LongName' )
-        if not bookName: bookName = self.getSetting( BBB+'ShortName' )
-        if not bookName: bookName = engName
-
-        cursor.execute( exeStr, (bookColor, bookNumber, bookAbbrev, bookName, 1) )
-    conn.commit() # save (commit) the changes
-
-    # Now create and fill the Bible verses table
-    cursor.execute( 'CREATE TABLE verses (book_number NUMERIC, chapter NUMERIC, verse NUMERIC, text TEXT)' )
-    #exeStr = 'INSERT INTO verses VALUES(?,?,?,?)'
-    for bkData in self:
-        BBB = bkData.BBB
-        if BBB in BOOKS_TO_IGNORE: continue # No way to encode these books
-        #dPrint( 'Quiet', debuggingThisModule, "LOOP2", self.name, BBB )
-        adjBBB = BBB
-        #if BBB=='ESG': adjBBB = 'GES'
-        bookColor, bookNumber, rusAbbrev, rusName, engAbbrev, engName = BOOK_TABLE[adjBBB]
-        #cursor.execute( exeStr, (bookNumber, C, V, adjustedLine) )
-        if writeMyBibleBook( cursor, BBB, bookNumber, bkData, mySettings ):
-            try: conn.commit() # save (commit) the changes
-            except Exception as e:
-                logging.critical( f"MyBible: error writing {filepath}: {e}" )
-                raise e # again
-            handledBooks.append( BBB )
-
-    # Now create the index to the verses
-    cursor.execute( 'CREATE UNIQUE INDEX verses_index on "verses" (book_number, chapter, verse)' )
-    conn.commit() # save (commit) the changes
-    cursor.close() # All done
+    vPrint( 'Info', debuggingThisModule, '  createMyBibleModule: ' + _("Writing {!r}…").format( filepath ) )
+    with SQLiteBulkWriter( filepath ) as writer: # Replaces any existing file (and deletes the incomplete file if anything fails)
+        # First write the settings info table
+        writer.execute( 'CREATE TABLE info (name TEXT, value TEXT)' )
+        exeStr = 'INSERT INTO info VALUES(?,?)'
+
+        description = self.getSetting( 'MyBibleDescription' )
+        if not description: description = self.getSetting( 'Description' )
+        if not description: description = self.getSetting( 'description' )
+        if not description: description = self.name
+        if not description: description = 'Unknown'
+        writer.execute( exeStr, ('description', description) )
+
+        chapterString = self.getSetting( 'MyBibleChapterString' )
+        if not chapterString: chapterString = 'Chapter'
+        writer.execute( exeStr, ('chapter_string', chapterString) )
+
+        language = self.getSetting( 'MyBibleLanguage' )
+        if not language: language = 'en'
+        writer.execute( exeStr, ('language', language) )
+
+        ISOLanguageCode = self.getSetting( 'ISOLanguageCode' )
+        if not ISOLanguageCode: ISOLanguageCode = 'eng'
+        writer.execute( exeStr, ('language_iso639-2b', ISOLanguageCode) )
+
+        writer.execute( exeStr, ('russian_numbering', 'false') )
+
+        Strong = self.getSetting( 'Strong' )
+        if not Strong: Strong = 'false'
+        writer.execute( exeStr, ('strong_numbers', Strong) )
+
+        rightToLeft = self.getSetting( 'RightToLeft' )
+        if not rightToLeft: rightToLeft = 'false'
+        writer.execute( exeStr, ('right_to_left', rightToLeft) )
+
+
+        BOOKS_TO_IGNORE = ( 'FRT', 'INT', 'BAK', 'GLS', 'OTH', 'XXA','XXB','XXC','XXD','XXE','XXF','XXG', 'NDX', 'UNK',
+                           'PS2', 'ESG','GES', 'MA4', ) # This line are ones containing verse data but which we don't know how to encode
+
+        # Now create and fill the Bible books table
+        writer.execute( 'CREATE TABLE books_all(book_color TEXT, book_number NUMERIC, short_name TEXT, long_name TEXT, is_present NUMERIC)' )
+        exeStr = 'INSERT INTO books_all VALUES(?,?,?,?,?)'
+        for bkData in self:
+            BBB = bkData.BBB
+            if BBB in BOOKS_TO_IGNORE: continue # No way to encode these books
+            #dPrint( 'Quiet', debuggingThisModule, "LOOP1", self.name, BBB )
+            adjBBB = BBB
+            #if BBB=='ESG': adjBBB = 'GES'
+            bookColor, bookNumber, rusAbbrev, rusName, engAbbrev, engName = BOOK_TABLE[adjBBB]
+
+            bookAbbrev = self.getSetting( BBB+'Abbreviation' )
+            if not bookAbbrev: bookAbbrev = self.getSetting( BBB+'ShortName' )
+            if not bookAbbrev: bookAbbrev = engAbbrev
+
+            bookName = self.getSetting( BBB+'LongName' )
+            if not bookName: bookName = self.getSetting( BBB+'ShortName' )
+            if not bookName: bookName = engName
+
+            writer.execute( exeStr, (bookColor, bookNumber, bookAbbrev, bookName, 1) )
+
+        # Now create and fill the Bible verses table (all in the one transaction)
+        writer.execute( 'CREATE TABLE verses (book_number NUMERIC, chapter NUMERIC, verse NUMERIC, text TEXT)' )
+        # Creating the index to the verses is quicker after they're all loaded
+        writer.deferStatement( 'CREATE UNIQUE INDEX verses_index on "verses" (book_number, chapter, verse)' )
+        writer.executemany( 'INSERT INTO verses VALUES(?,?,?,?)', makeMyBibleRows() )
+        # The changes are saved (committed) at the end of the with block
 
     if mySettings['unhandledMarkers']:
         logging.warning( "BibleWriter.toMyBible: Unhandled markers were {}".format( mySettings['unhandledMarkers'] ) )
@@ -1287,10 +1278,9 @@ def createMyBibleModule( self, outputFolder, controlDict ) -> bool:
         vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toMyBible books were {}").format( unhandledBooks ) )
 
     # Now create a zipped version
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} MyBible file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if self.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} MyBible file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toMyBible finished successfully." )
@@ -49,21 +49,23 @@ e.g.,
     And God calleth to the expanse `Heavens;' and there is an evening, and there is a morning--day second.<CM>
 """
 
-LAST_MODIFIED_DATE = '2020-04-12' # by RJH
+LAST_MODIFIED_DATE = '2021-02-01' # by RJH
 SHORT_PROGRAM_NAME = "MySwordBible"
 PROGRAM_NAME = "MySword Bible format handler"
-PROGRAM_VERSION = '0.36'
+PROGRAM_VERSION = '0.38'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
 from gettext import gettext as _
+from typing import Any, Dict, Tuple
 import logging
 import os
 from pathlib import Path
 import sqlite3
 import multiprocessing
+from itertools import groupby
 
 if __name__ == '__main__':
     import sys
@@ -73,6 +75,7 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible, BibleBook
+from BibleOrgSys.InputOutput.SQLiteBulkWriter import SQLiteBulkWriter
 from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
 from BibleOrgSys.Formats.theWordBible import handleRTFLine
 
@@ -233,7 +236,8 @@ class MySwordBible( Bible ):
         elif not self.sourceFilename.upper().endswith( BIBLE_FILENAME_ENDINGS_TO_ACCEPT[0] ):
             logging.critical( "{} doesn't appear to be a MySword Bible file".format( self.sourceFilename ) )
 
-        connection = sqlite3.connect( self.sourceFilepath )
+        # Open it read-only (and tell SQLite that nothing else will change it so it needn't do any locking)
+        connection = sqlite3.connect( f'{Path( self.sourceFilepath ).resolve().as_uri()}?mode=ro&immutable=1', uri=True )
         connection.row_factory = sqlite3.Row # Enable row names
         self.cursor = connection.cursor()
 
@@ -256,9 +260,31 @@ class MySwordBible( Bible ):
     # end of MySwordBible.preload
 
 
+    def _makeVerseDict( self, BBB:str, bookRows, verseList ) -> Dict[Tuple[int,int],Any]:
+        """
+        Given the (Book,Chapter,Verse,Scripture) rows for a book from the database,
+            return a dictionary of the Scripture lines indexed by (C,V) integers.
+
+        Rows that don't fit the versification are reported and ignored
+            (missing verses are reported by the caller as it steps through the versification).
+        """
+        verseDict = {}
+        for row in bookRows:
+            try: C, V = int(row[1]), int(row[2])
+            except (TypeError, ValueError): C = V = 0
+            if 1 <= C <= len(verseList) and 1 <= V <= verseList[C-1]:
+                verseDict[(C,V)] = row[3]
+            else: logging.warning( "MySwordBible.load: Ignoring unexpected verse line at {} {}:{}".format( BBB, row[1], row[2] ) )
+        return verseDict
+    # end of MySwordBible._makeVerseDict
+
+
     def load( self ):
         """
         Load all the books out of the SQLite3 database.
+
+        All the verses are read (in order) with one query
+            and each book's rows are put into that book as we go.
         """
         fnPrint( debuggingThisModule, "load()…" )
         assert self.preloadDone
@@ -276,6 +302,24 @@ class MySwordBible( Bible ):
             testament, BBB = 'NT', 'MAT'
             booksExpected, textLineCountExpected = 27, 7957
 
+        self.cursor.execute( 'select Book, Chapter, Verse, Scripture from Bible order by Book, Chapter, Verse' )
+        bookRowGroups = groupby( self.cursor, key=lambda row: row[0] )
+        nextBookRowGroup = next( bookRowGroups, None )
+        def getBookVerseDict():
+            """
+            Get the rows for BBB (nBBB) from the query
+                (skipping any books that we don't expect).
+            """
+            nonlocal nextBookRowGroup
+            while nextBookRowGroup is not None and nextBookRowGroup[0] < nBBB:
+                logging.warning( "MySwordBible.load: Ignoring unexpected book number {}".format( nextBookRowGroup[0] ) )
+                nextBookRowGroup = next( bookRowGroups, None )
+            if nextBookRowGroup is None or nextBookRowGroup[0] != nBBB: return {}
+            verseDict = self._makeVerseDict( BBB, nextBookRowGroup[1], verseList )
+            nextBookRowGroup = next( bookRowGroups, None )
+            return verseDict
+        # end of load.getBookVerseDict
+
         # Create the first book
         thisBook = BibleBook( self, BBB )
         thisBook.objectNameString = 'MySword Bible Book object'
@@ -284,6 +328,7 @@ class MySwordBible( Bible ):
         verseList = self.BibleOrganisationalSystem.getNumVersesList( BBB )
         numC, numV = len(verseList), verseList[0]
         nBBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
+        verseDict = getBookVerseDict()
         C = V = 1
 
         bookCount = 0
@@ -291,15 +336,7 @@ class MySwordBible( Bible ):
         continued = ourGlobals['haveParagraph'] = False
         haveLines = False
         while True:
-            self.cursor.execute('select Scripture from Bible where Book=? and Chapter=? and Verse=?', (nBBB,C,V) )
-            try:
-                row = self.cursor.fetchone()
-                line = row[0]
-            except TypeError: # This reference is missing (row is None)
-                #dPrint( 'Quiet', debuggingThisModule, "something wrong at", BBB, C, V )
-                #if BibleOrgSysGlobals.debugFlag: halt
-                #dPrint( 'Quiet', debuggingThisModule, row )
-                line = None
+            line = verseDict.get( (C,V) ) # None if this reference is missing
             #dPrint( 'Quiet', debuggingThisModule, nBBB, BBB, C, V, 'MySw file line is "' + line + '"' )
             if line is None: logging.warning( "MySwordBible.load: Have missing verse line at {} {}:{}".format( BBB, C, V ) )
             else: # line is not None
@@ -342,6 +379,7 @@ class MySwordBible( Bible ):
                     verseList = self.BibleOrganisationalSystem.getNumVersesList( BBB )
                     numC, numV = len(verseList), verseList[0]
                     nBBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
+                    verseDict = getBookVerseDict()
                     C = V = 1
                     #thisBook.addLine( 'c', str(C) )
                 else: # next chapter only
@@ -353,6 +391,8 @@ class MySwordBible( Bible ):
                 thisBook.addLine( 'p', '' )
                 ourGlobals['haveParagraph'] = False
 
+        if nextBookRowGroup is not None:
+            logging.info( "MySwordBible.load: Ignored book number {} and following".format( nextBookRowGroup[0] ) )
         self.cursor.close()
         del self.cursor
         self.applySuppliedMetadata( 'MySword' ) # Copy some to self.settingsDict
@@ -396,6 +436,8 @@ class MySwordBible( Bible ):
         verseList = self.BibleOrganisationalSystem.getNumVersesList( BBB )
         numC, numV = len(verseList), verseList[0]
         nBBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
+        self.cursor.execute( 'select Book, Chapter, Verse, Scripture from Bible where Book=? order by Chapter, Verse', (nBBB,) )
+        verseDict = self._makeVerseDict( BBB, self.cursor, verseList )
         C = V = 1
 
         #bookCount = 0
@@ -403,15 +445,7 @@ class MySwordBible( Bible ):
         continued = ourGlobals['haveParagraph'] = False
         haveLines = False
         while True:
-            self.cursor.execute('select Scripture from Bible where Book=? and Chapter=? and Verse=?', (nBBB,C,V) )
-            try:
-                row = self.cursor.fetchone()
-                line = row[0]
-            except TypeError: # This reference is missing (row is None)
-                #dPrint( 'Quiet', debuggingThisModule, "something wrong at", BBB, C, V )
-                #if BibleOrgSysGlobals.debugFlag: halt
-                #dPrint( 'Quiet', debuggingThisModule, row )
-                line = None
+            line = verseDict.get( (C,V) ) # None if this reference is missing
             #dPrint( 'Quiet', debuggingThisModule, nBBB, BBB, C, V, 'MySw file line is "' + line + '"' )
             if line is None: logging.warning( "MySwordBible.load: Have missing verse line at {} {}:{}".format( BBB, C, V ) )
             else: # line is not None
@@ -466,9 +500,9 @@ def createMySwordModule( self, outputFolder, controlDict ):
     from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS, BOS_NESTING_MARKERS
     from BibleOrgSys.Formats.theWordBible import theWordOTBookLines, theWordNTBookLines, theWordBookLines, theWordHandleIntroduction, theWordComposeVerseLine
 
-    def writeMSBook( sqlObject, BBB:str, ourGlobals ):
+    def makeMSBookRows( BBB:str, ourGlobals ):
         """
-        Writes a book to the MySword sqlObject file.
+        Generates the (Book,Chapter,Verse,Scripture) rows of a book for the MySword Bible table.
         """
         nonlocal lineCount
         bkData = self.books[BBB] if BBB in self.books else None
@@ -512,8 +546,7 @@ def createMySwordModule( self, outputFolder, controlDict ):
                     # Stay one line behind (because paragraph indicators get appended to the previous line)
                     if ourGlobals['lastBCV'] is not None \
                     and ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-                        sqlObject.execute( 'INSERT INTO "Bible" VALUES(?,?,?,?)', \
-                            (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
+                        yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
                         lineCount += 1
                     ourGlobals['lastLine'] = composedLine
                 ourGlobals['lastBCV'] = (nBBB,C,V)
@@ -529,10 +562,22 @@ def createMySwordModule( self, outputFolder, controlDict ):
 
         # Write the last line of the file
         if ourGlobals['lastLine']: # don't bother writing blank (unfinished?) verses
-            sqlObject.execute( 'INSERT INTO "Bible" VALUES(?,?,?,?)', \
-                (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine']) )
+            yield (ourGlobals['lastBCV'][0],ourGlobals['lastBCV'][1],ourGlobals['lastBCV'][2],ourGlobals['lastLine'])
             lineCount += 1
-    # end of createMySwordModule.writeMSBook
+    # end of createMySwordModule.makeMSBookRows
+
+
+    def makeMSRows():
+        """
+        Generates the rows for all the books in the KJV order.
+        """
+        BBB = startBBB
+        while True:
+            yield from makeMSBookRows( BBB, mySettings )
+            handledBooks.append( BBB )
+            if BBB == endBBB: break
+            BBB = BOS.getNextBookCode( BBB )
+    # end of createMySwordModule.makeMSRows
 
 
     # Set-up their Bible reference system
@@ -564,74 +609,65 @@ def createMySwordModule( self, outputFolder, controlDict ):
     else: filename = 'export'
     if not filename.endswith( extension ): filename += extension # Make sure that we have the right file extension
     filepath = os.path.join( outputFolder, BibleOrgSysGlobals.makeSafeFilename( filename ) )
-    if os.path.exists( filepath ): os.remove( filepath )
     vPrint( 'Info', debuggingThisModule, '  createMySwordModule: ' + _("Writing {!r}…").format( filepath ) )
-    conn = sqlite3.connect( filepath )
-    cursor = conn.cursor()
-
-    # First write the settings Details table
-    exeStr = 'CREATE TABLE Details(Description NVARCHAR(255), Abbreviation NVARCHAR(50), Comments TEXT, Version TEXT, VersionDate DATETIME, PublishDate DATETIME, RightToLeft BOOL, OT BOOL, NT BOOL, Strong BOOL' # incomplete
-    customCSS = self.getSetting( 'CustomCSS' )
-    if customCSS: exeStr += ', CustomCSS TEXT'
-    exeStr += ')'
-    cursor.execute( exeStr )
-
-    values = []
-
-    description = self.getSetting( 'Description' )
-    if not description: description = self.getSetting( 'description' )
-    if not description: description = self.name
-    values.append( description )
-
-    if self.abbreviation: abbreviation = self.abbreviation
-    else: abbreviation = self.getSetting( 'WorkAbbreviation' )
-    if not abbreviation: abbreviation = self.name[:3].upper()
-    values.append( abbreviation )
-
-    comments = self.getSetting( 'Comments' )
-    values.append( comments )
-
-    version = self.getSetting( 'Version' )
-    values.append( version )
-
-    versionDate = self.getSetting( 'VersionDate' )
-    values.append( versionDate )
-
-    publishDate = self.getSetting( 'PublishDate' )
-    values.append( publishDate )
-
-    rightToLeft = self.getSetting( 'RightToLeft' )
-    values.append( rightToLeft )
-
-    values.append( True if testament=='OT' or testament=='BOTH' else False )
-    values.append( True if testament=='NT' or testament=='BOTH' else False )
-
-    Strong = self.getSetting( 'Strong' )
-    values.append( Strong if Strong else False )
-
-    if customCSS: values.append( customCSS )
-
-    exeStr = 'INSERT INTO "Details" VALUES(' + '?,'*(len(values)-1) + '?)'
-    #dPrint( 'Quiet', debuggingThisModule, exeStr, values )
-    cursor.execute( exeStr, values )
-    #if BibleOrgSysGlobals.debugFlag: cursor.execute( exeStr, values )
-    #else: # Not debugging
-        #try: cursor.execute( exeStr, values )
-        #except sqlite3.InterfaceError:
-            #logging.critical( "SQLite3 Interface error executing {} with {}".format( exeStr, values ) )
-
-    # Now create and fill the Bible table
-    cursor.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT, Primary Key(Book,Chapter,Verse))' )
-    conn.commit() # save (commit) the changes
-    BBB, lineCount = startBBB, 0
-    while True: # Write each Bible book in the KJV order
-        writeMSBook( cursor, BBB, mySettings )
-        conn.commit() # save (commit) the changes
-        handledBooks.append( BBB )
-        if BBB == endBBB: break
-        BBB = BOS.getNextBookCode( BBB )
-    conn.commit() # save (commit) the changes
-    cursor.close()
+    with SQLiteBulkWriter( filepath ) as writer: # Replaces any existing file (and deletes the incomplete file if anything fails)
+        # First write the settings Details table
+        exeStr = 'CREATE TABLE Details(Description NVARCHAR(255), Abbreviation NVARCHAR(50), Comments TEXT, Version TEXT, VersionDate DATETIME, PublishDate DATETIME, RightToLeft BOOL, OT BOOL, NT BOOL, Strong BOOL' # incomplete
+        customCSS = self.getSetting( 'CustomCSS' )
+        if customCSS: exeStr += ', CustomCSS TEXT'
+        exeStr += ')'
+        writer.execute( exeStr )
+
+        values = []
+
+        description = self.getSetting( 'Description' )
+        if not description: description = self.getSetting( 'description' )
+        if not description: description = self.name
+        values.append( description )
+
+        if self.abbreviation: abbreviation = self.abbreviation
+        else: abbreviation = self.getSetting( 'WorkAbbreviation' )
+        if not abbreviation: abbreviation = self.name[:3].upper()
+        values.append( abbreviation )
+
+        comments = self.getSetting( 'Comments' )
+        values.append( comments )
+
+        version = self.getSetting( 'Version' )
+        values.append( version )
+
+        versionDate = self.getSetting( 'VersionDate' )
+        values.append( versionDate )
+
+        publishDate = self.getSetting( 'PublishDate' )
+        values.append( publishDate )
+
+        rightToLeft = self.getSetting( 'RightToLeft' )
+        values.append( rightToLeft )
+
+        values.append( True if testament=='OT' or testament=='BOTH' else False )
+        values.append( True if testament=='NT' or testament=='BOTH' else False )
+
+        Strong = self.getSetting( 'Strong' )
+        values.append( Strong if Strong else False )
+
+        if customCSS: values.append( customCSS )
+
+        exeStr = 'INSERT INTO "Details" VALUES(' + '?,'*(len(values)-1) + '?)'
+        #dPrint( 'Quiet', debuggingThisModule, exeStr, values )
+        writer.execute( exeStr, values )
+        #if BibleOrgSysGlobals.debugFlag: cursor.execute( exeStr, values )
+        #else: # Not debugging
+            #try: cursor.execute( exeStr, values )
+            #except sqlite3.InterfaceError:
+                #logging.critical( "SQLite3 Interface error executing {} with {}".format( exeStr, values ) )
+
+        # Now create and fill the Bible table (all in the one transaction)
+        # NOTE: SQLite can't add a primary key later, so this one isn't deferred
+        writer.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT, Primary Key(Book,Chapter,Verse))' )
+        lineCount = 0
+        writer.executemany( 'INSERT INTO "Bible" VALUES(?,?,?,?)', makeMSRows() )
+        # The changes are saved (committed) at the end of the with block
 
     if mySettings['unhandledMarkers']:
         logging.warning( "BibleWriter.createMySwordModule: Unhandled markers were {}".format( mySettings['unhandledMarkers'] ) )
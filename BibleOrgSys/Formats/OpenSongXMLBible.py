@@ -67,7 +67,6 @@ Sample:
 from gettext import gettext as _
 import logging
 import os
-import zipfile
 from pathlib import Path
 from xml.etree.ElementTree import ElementTree
 
@@ -85,12 +84,13 @@ from BibleOrgSys.Bible import Bible, BibleBook
 from BibleOrgSys.Reference.USFM3Markers import OFTEN_IGNORED_USFM_HEADER_MARKERS, USFM_ALL_INTRODUCTION_MARKERS, \
                             USFM_PRECHAPTER_MARKERS, USFM_BIBLE_PARAGRAPH_MARKERS
 from BibleOrgSys.InputOutput.MLWriter import MLWriter
+from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
 
 
-LAST_MODIFIED_DATE = '2020-05-04' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "OpenSongBible"
 PROGRAM_NAME = "OpenSong XML Bible format handler"
-PROGRAM_VERSION = '0.39'
+PROGRAM_VERSION = '0.40'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -351,10 +351,9 @@ def createOpenSongXML( BibleObject, outputFolder=None, controlDict=None, validat
 
     # Now create a zipped version
     filepath = os.path.join( outputFolder, filename )
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} OpenSong file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if BibleObject.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} OpenSong file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if validationSchema: return xw.validate( validationSchema )
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
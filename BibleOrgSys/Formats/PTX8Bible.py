@@ -39,11 +39,16 @@ The raw material for this module is produced by the UBS/SIL Paratext program
 TODO: Check if PTX8Bible object should be based on USFMBible.
 """
 from gettext import gettext as _
+from typing import Optional
 import sys
 import os
 from pathlib import Path
 import logging
 import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import fnmatch
+import hashlib
 from xml.etree.ElementTree import ElementTree
 import json
 
@@ -55,14 +60,15 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible
 from BibleOrgSys.InputOutput.USFMFilenames import USFMFilenames
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
 from BibleOrgSys.Formats.USFMBibleBook import USFMBibleBook
 from BibleOrgSys.Reference.LDML import LDMLFile
 
 
-LAST_MODIFIED_DATE = '2020-04-21' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "Paratext8Bible"
 PROGRAM_NAME = "Paratext-8 Bible handler"
-PROGRAM_VERSION = '0.27'
+PROGRAM_VERSION = '0.28'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -474,6 +480,211 @@ def loadPTX8Versifications( BibleObject ):
 # end of PTX8Bible.loadPTX8Versifications
 
 
+# Each group of PTX8 metadata is parsed by one PTX8Bible loader method
+#   which fills the given suppliedMetadata['PTX8'] keys (if its files exist).
+# The (UPPER-CASE) filename patterns are used to decide if a cached copy is still current.
+PTX8_METADATA_LOADERS = {
+    'loadUniqueId': ( ('UniqueId',), ('UNIQUE.ID',) ),
+    'loadPTX8BooksNames': ( ('BooksNames',), ('BOOKNAMES.XML',) ),
+    'loadPTX8ProjectUserAccess': ( ('ProjectUsers',), ('PROJECTUSERACCESS.XML',) ),
+    'loadPTX8Languages': ( ('Languages',), ('*.LDML',) ),
+    'loadPTX8Lexicon': ( ('Lexicon',), ('LEXICON.XML',) ),
+    'loadPTX8SpellingStatus': ( ('SpellingStatus',), ('SPELLINGSTATUS.XML',) ),
+    'loadPTX8WordAnalyses': ( ('WordAnalyses',), ('WORDANALYSES.XML',) ),
+    'loadPTX8Canons': ( ('Canons',), ('CANONS.XML',) ),
+    'loadPTX8CheckingStatus': ( ('CheckingStatusByBook','CheckingStatusByCheck',), ('CHECKINGSTATUS.XML',) ),
+    'loadPTX8CommentTags': ( ('CommentTags',), ('COMMENTTAGS.XML',) ),
+    'loadPTX8DerivedTranslationStatus': ( ('DerivedTranslationStatusByBook',), ('DERIVEDTRANSLATIONSTATUS.XML',) ),
+    'loadPTX8Notes': ( ('PTXNotesByName','PTXNotesByThread',), ('NOTES_*.XML',) ),
+    'loadPTX8TermRenderings': ( ('TermRenderings',), ('TERMRENDERINGS.XML',) ),
+    'loadPTX8ParallelPassageStatus': ( ('ParallelPassageStatus',), ('PARALLELPASSAGESTATUS.XML',) ),
+    'loadPTX8ProjectBiblicalTerms': ( ('ProjectBiblicalTerms',), ('PROJECTBIBLICALTERMS.XML',) ),
+    'loadPTX8ProjectProgress': ( ('ProjectProgress',), ('PROJECTPROGRESS.XML',) ),
+    'loadPTX8ProjectProgressCSV': ( ('ProjectProgressCSV',), ('PROJECTPROGRESS.CSV',) ),
+    'loadPTX8PrintConfig': ( ('PrintConfig',), ('PRINT*.XML',) ),
+    'loadPTX8Autocorrects': ( ('Autocorrects',), ('AUTOCORRECT.TXT',) ),
+    'loadPTX8Styles': ( ('Styles',), ('*.STY',) ),
+    'loadPTX8PrintDraftChanges': ( ('PrintDraftChanges',), ('PRINTDRAFTCHANGES.TXT',) ),
+    'loadPTX8Versifications': ( ('Versifications',), ('*.VRS',) ),
+    'loadPTX8Licence': ( ('Licence',), ('LICENSE.JSON',) ),
+    }
+
+
+def getPTX8MetadataSignature( folderpath, filenamePatterns ):
+    """
+    Find the files in the folder whose (UPPER-CASE) names match any of the patterns.
+
+    Returns a sorted list of (filename, modificationTime, size) 3-tuples
+        which changes whenever any of those files are added, removed, or edited.
+    """
+    signature = []
+    with os.scandir( folderpath ) as folderEntries:
+        for folderEntry in folderEntries:
+            if not folderEntry.is_file(): continue
+            filenameUPPER = folderEntry.name.upper()
+            if filenameUPPER.endswith( '.BAK' ): continue
+            if any( fnmatch.fnmatchcase( filenameUPPER, pattern ) for pattern in filenamePatterns ):
+                fileStat = folderEntry.stat()
+                signature.append( (folderEntry.name, fileStat.st_mtime_ns, fileStat.st_size) )
+    return sorted( signature )
+# end of PTX8Bible.getPTX8MetadataSignature
+
+
+
+class PTX8MetadataDict( dict ):
+    """
+    The dictionary used for suppliedMetadata['PTX8'].
+
+    Each group of Paratext metadata files is only parsed (by the PTX8Bible loader method)
+        when one of its keys is first used, e.g., by 'Notes' in, or by [], get(), or items().
+    A parsed group is also pickled into the cache folder (if there is one)
+        so that it can be reused until one of its files changes.
+    """
+    def __init__( self, BibleObject, cacheFolderpath=None ) -> None:
+        """
+        Create an empty dictionary for the given PTX8Bible object.
+        """
+        dict.__init__( self )
+        self.BibleObject, self.cacheFolderpath = BibleObject, cacheFolderpath
+        self.pendingLoaders = {} # Maps loader names to their metadata keys
+        self.loaderLocks = {}
+    # end of PTX8MetadataDict.__init__
+
+
+    def __reduce__( self ):
+        """
+        Pickle the loaded entries and the still pending loaders (but not the locks).
+        """
+        return ( self.__class__, (self.BibleObject, self.cacheFolderpath),
+                    {'pendingLoaders':self.pendingLoaders}, None, iter( dict.items( self ) ) )
+    def __setstate__( self, state ) -> None:
+        self.pendingLoaders = state['pendingLoaders']
+        self.loaderLocks = { loaderName:threading.RLock() for loaderName in self.pendingLoaders }
+    # end of PTX8MetadataDict.__reduce__
+
+
+    def addLoader( self, loaderName:str ) -> None:
+        """
+        Remember a PTX8Bible loader method to be run when one of its keys is needed.
+        """
+        self.pendingLoaders[loaderName] = PTX8_METADATA_LOADERS[loaderName][0]
+        self.loaderLocks[loaderName] = threading.RLock()
+    # end of PTX8MetadataDict.addLoader
+
+
+    def resolve( self, loaderName:str ) -> None:
+        """
+        Run the given loader (unless it's already been run)
+            or copy its results from the cache if its files haven't changed.
+
+        Safe to be called from multiple threads.
+        """
+        fnPrint( debuggingThisModule, f"PTX8MetadataDict.resolve( {loaderName} )" )
+        try: loaderLock = self.loaderLocks[loaderName]
+        except KeyError: return # It was never pending
+        with loaderLock:
+            if loaderName not in self.pendingLoaders: return # Another thread beat us to it
+            keys, filenamePatterns = PTX8_METADATA_LOADERS[loaderName]
+            sourceFilepath = self.BibleObject.sourceFilepath
+            signature = getPTX8MetadataSignature( sourceFilepath, filenamePatterns )
+            if signature: # Nothing to do if there's no files
+                cacheFilename = None
+                if self.cacheFolderpath:
+                    cacheFilename = 'PTX8_{}_{}.pickle'.format(
+                        hashlib.md5( os.path.abspath( sourceFilepath ).encode( 'utf-8' ) ).hexdigest(), loaderName )
+                    try: cachedData = BibleOrgSysGlobals.unpickleObject( cacheFilename, self.cacheFolderpath )
+                    except FileNotFoundError: cachedData = None
+                    except Exception as err:
+                        logging.warning( "PTX8 metadata cache file {} was unusable: {} {}".format( cacheFilename, sys.exc_info()[0], err ) )
+                        cachedData = None
+                    if cachedData and cachedData['signature'] == signature:
+                        vPrint( 'Verbose', debuggingThisModule, f"PTX8MetadataDict: Using cached {loaderName} results" )
+                        dict.update( self, cachedData['metadata'] )
+                        for filename,_mtime,_size in signature:
+                            try: self.BibleObject.filepathsNotYetLoaded.remove( os.path.join( sourceFilepath, filename ) )
+                            except ValueError: pass # It might have been a new file
+                        del self.pendingLoaders[loaderName]
+                        return
+
+                if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag or debuggingThisModule:
+                    getattr( self.BibleObject, loaderName )() # Stop if any of them fail
+                else: # normal operation
+                    # Don't crash if they fail
+                    try: getattr( self.BibleObject, loaderName )()
+                    except Exception as err:
+                        logging.error( '{} failed with {} {}'.format( loaderName, sys.exc_info()[0], err ) )
+                        del self.pendingLoaders[loaderName]
+                        return
+
+                if cacheFilename:
+                    cachedData = { 'signature':signature,
+                                    'metadata':{ key:dict.__getitem__( self, key ) for key in keys if dict.__contains__( self, key ) } }
+                    try: BibleOrgSysGlobals.pickleObject( cachedData, cacheFilename, self.cacheFolderpath )
+                    except Exception as err:
+                        logging.warning( "Unable to save PTX8 metadata cache file {}: {} {}".format( cacheFilename, sys.exc_info()[0], err ) )
+            del self.pendingLoaders[loaderName]
+    # end of PTX8MetadataDict.resolve
+
+
+    def resolveKey( self, key ) -> None:
+        """
+        Make sure that the loader (if any) for the given key has been run.
+        """
+        for loaderName,keys in list( self.pendingLoaders.items() ):
+            if key in keys: self.resolve( loaderName ); break
+    # end of PTX8MetadataDict.resolveKey
+
+
+    def resolveAll( self, maxThreads:Optional[int]=None ) -> None:
+        """
+        Run all of the pending loaders, using a pool of threads if possible.
+
+        maxThreads defaults to BibleOrgSysGlobals.maxIOThreads.
+        """
+        fnPrint( debuggingThisModule, f"PTX8MetadataDict.resolveAll( {maxThreads} )" )
+        if maxThreads is None: maxThreads = BibleOrgSysGlobals.maxIOThreads
+        loaderNames = list( self.pendingLoaders )
+        if maxThreads > 1 and len(loaderNames) > 1:
+            vPrint( 'Verbose', debuggingThisModule, f"PTX8MetadataDict: Loading {len(loaderNames)} metadata groups using {maxThreads} threads…" )
+            with ThreadPoolExecutor( max_workers=min( maxThreads, len(loaderNames) ) ) as executor:
+                for future in [executor.submit( self.resolve, loaderName ) for loaderName in loaderNames]:
+                    future.result() # Reraises any exception from the loader
+        else:
+            for loaderName in loaderNames: self.resolve( loaderName )
+    # end of PTX8MetadataDict.resolveAll
+
+
+    def __getitem__( self, key ):
+        self.resolveKey( key )
+        return dict.__getitem__( self, key )
+    def __contains__( self, key ) -> bool:
+        self.resolveKey( key )
+        return dict.__contains__( self, key )
+    def get( self, key, default=None ):
+        self.resolveKey( key )
+        return dict.get( self, key, default )
+    def __iter__( self ):
+        self.resolveAll()
+        return dict.__iter__( self )
+    def __len__( self ) -> int:
+        self.resolveAll()
+        return dict.__len__( self )
+    def keys( self ):
+        self.resolveAll()
+        return dict.keys( self )
+    def values( self ):
+        self.resolveAll()
+        return dict.values( self )
+    def items( self ):
+        self.resolveAll()
+        return dict.items( self )
+    def __repr__( self ) -> str:
+        self.resolveAll()
+        return dict.__repr__( self )
+    # end of PTX8MetadataDict dictionary methods
+# end of class PTX8MetadataDict
+
+
 
 class PTX8Bible( Bible ):
     """
@@ -512,6 +723,7 @@ class PTX8Bible( Bible ):
         self.settingsFilepath = None
         self.filepathsNotYetLoaded = []
         self.conflicts = []
+        self.metadataCacheFolderpath = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( 'PTX8Metadata/' ) # Can be set to None before preload()
 
         # Create empty containers for loading the XML metadata files
         #projectUsersDict = self.PTXStyles = self.PTXVersification = self.PTXLanguage = None
@@ -569,7 +781,7 @@ class PTX8Bible( Bible ):
             vPrint( 'Quiet', debuggingThisModule, "USFMFilenamesObject", self.USFMFilenamesObject )
 
         if self.suppliedMetadata is None: self.suppliedMetadata = {}
-        self.suppliedMetadata['PTX8'] = {}
+        self.suppliedMetadata['PTX8'] = PTX8MetadataDict( self, self.metadataCacheFolderpath )
 
         if self.settingsFilepath is None: # it might have been loaded first
             # Attempt to load the settings file
@@ -594,90 +806,45 @@ class PTX8Bible( Bible ):
             self.availableBBBs.add( BBB )
             self.possibleFilenameDict[BBB] = filename
 
+        # Register the paratext metadata loaders -- the files are only parsed when their metadata is first used
+        for loaderName in PTX8_METADATA_LOADERS:
+            self.suppliedMetadata['PTX8'].addLoader( loaderName )
         if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag or debuggingThisModule:
-            # Load the paratext metadata (and stop if any of them fail)
-            self.loadPTX8Autocorrects() # from text file (if it exists)
-            self.loadPTX8BooksNames() # from XML (if it exists)
-            self.loadPTX8Canons() # from XML (if it exists)
-            self.loadPTX8CheckingStatus() # from XML (if it exists)
-            self.loadPTX8CommentTags() # from XML (if they exist)
-            self.loadPTX8DerivedTranslationStatus() # from XML (if it exists)
-            result = loadPTX8Languages( self ) # from LDML file(s)
-            if result: self.suppliedMetadata['PTX8']['Languages'] = result
-            self.loadPTX8Lexicon() # from XML (if it exists)
-            self.loadPTX8Licence() # from JSON file (if it exists)
-            self.loadPTX8Notes() # from XML (if they exist)
-            self.loadPTX8TermRenderings() # from XML (if they exist)
-            self.loadPTX8ParallelPassageStatus() # from XML (if it exists)
-            self.loadPTX8ProjectBiblicalTerms() # from XML (if it exists)
-            self.loadPTX8ProjectProgress() # from XML (if it exists)
-            self.loadPTX8ProjectProgressCSV() # from text file (if it exists)
-            self.loadPTX8ProjectUserAccess() # from XML (if it exists)
-            self.loadPTX8PrintConfig()  # from XML (if it exists)
-            self.loadPTX8SpellingStatus() # from XML (if it exists)
-            self.loadPTX8Styles() # from text files (if they exist)
-            self.loadPTX8PrintDraftChanges() # from text file (if it exists)
-            self.loadUniqueId() # Text file
-            result = loadPTX8Versifications( self ) # from text file (if it exists)
-            if result: self.suppliedMetadata['PTX8']['Versifications'] = result
-            self.loadPTX8WordAnalyses() # from XML (if it exists)
-        else: # normal operation
-            # Put all of these in try blocks so they don't crash us if they fail
-            try: self.loadUniqueId() # Text file
-            except Exception as err: logging.error( 'loadUniqueId failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8BooksNames() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8BooksNames failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8ProjectUserAccess() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectUserAccess failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:
-                result = loadPTX8Languages( self ) # from LDML file(s)
-                if result: self.suppliedMetadata['PTX8']['Languages'] = result
-            except Exception as err: logging.error( 'loadPTX8Languages failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Lexicon() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Lexicon failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8SpellingStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8SpellingStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8WordAnalyses() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8WordAnalyses failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Canons() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Canons failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8CheckingStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8CheckingStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8CommentTags() # from XML (if they exist)
-            except Exception as err: logging.error( 'loadPTX8CommentTags failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8DerivedTranslationStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8DerivedTranslationStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Notes() # from XML (if they exist) but we don't do the CommentTags.xml file yet
-            except Exception as err: logging.error( 'loadPTX8Notes failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8TermRenderings() # from XML (if they exist)
-            except Exception as err: logging.error( 'loadPTX8TermRenderings failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ParallelPassageStatus() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ParallelPassageStatus failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectBiblicalTerms() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectBiblicalTerms failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectProgress() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectProgress failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:self.loadPTX8ProjectProgressCSV() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8ProjectProgressCSV failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8PrintConfig() # from XML (if it exists)
-            except Exception as err: logging.error( 'loadPTX8PrintConfig failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Autocorrects() # from text file (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Autocorrects failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Styles() # from text files (if they exist)
-            except Exception as err: logging.error( 'loadPTX8Styles failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8PrintDraftChanges() # from text files (if they exist)
-            except Exception as err: logging.error( 'loadPTX8PrintDraftChanges failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try:
-                result = loadPTX8Versifications( self ) # from text file (if it exists)
-                if result: self.suppliedMetadata['PTX8']['Versifications'] = result
-            except Exception as err: logging.error( 'loadPTX8Versifications failed with {} {}'.format( sys.exc_info()[0], err ) )
-            try: self.loadPTX8Licence() # from JSON file (if it exists)
-            except Exception as err: logging.error( 'loadPTX8Licence failed with {} {}'.format( sys.exc_info()[0], err ) )
+            self.suppliedMetadata['PTX8'].resolveAll() # Load them all now (and stop if any of them fail)
 
         self.preloadDone = True
     # end of PTX8Bible.preload
 
 
+    def loadPTX8Metadata( self, maxThreads:Optional[int]=None ) -> None:
+        """
+        Load all of the paratext metadata now (rather than when it is first used),
+            using a pool of threads to parse the files concurrently.
+        """
+        fnPrint( debuggingThisModule, f"loadPTX8Metadata( {maxThreads} )" )
+        if not self.preloadDone: self.preload()
+        self.suppliedMetadata['PTX8'].resolveAll( maxThreads )
+    # end of PTX8Bible.loadPTX8Metadata
+
+
+    def loadPTX8Languages( self ) -> None:
+        """
+        Load the LDML files into self.suppliedMetadata['PTX8'].
+        """
+        result = loadPTX8Languages( self ) # from LDML file(s)
+        if result: self.suppliedMetadata['PTX8']['Languages'] = result
+    # end of PTX8Bible.loadPTX8Languages
+
+
+    def loadPTX8Versifications( self ) -> None:
+        """
+        Load the versification files into self.suppliedMetadata['PTX8'].
+        """
+        result = loadPTX8Versifications( self ) # from text file (if it exists)
+        if result: self.suppliedMetadata['PTX8']['Versifications'] = result
+    # end of PTX8Bible.loadPTX8Versifications
+
+
     def loadPTX8Autocorrects( self ):
         """
         Load the AutoCorrect.txt file (which is a text file)
@@ -739,21 +906,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( bookNamesFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading books names data from {}…".format( bookNamesFilepath ) )
-        self.XMLTree = ElementTree().parse( bookNamesFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( bookNamesFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         booksNamesDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag=='BookNames':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag=='BookNames':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual book data
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 if element.tag == 'book':
                     BibleOrgSysGlobals.checkXMLNoSubelements( element, elementLocation )
@@ -781,7 +948,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 bookname settings tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 bookname settings tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( bookNamesFilepath )
@@ -803,8 +970,8 @@ class PTX8Bible( Bible ):
         if not os.path.exists( lexiconFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading project lexicon data from {}…".format( lexiconFilepath ) )
-        self.XMLTree = ElementTree().parse( lexiconFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( lexiconFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         lexiconDict = { 'Entries':{} }
         #loadErrors:List[str] = []
@@ -886,14 +1053,14 @@ class PTX8Bible( Bible ):
 
 
         # Find the main container
-        if self.XMLTree.tag == 'Lexicon':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'Lexicon':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
 
@@ -927,7 +1094,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 lexicon tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 lexicon tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( lexiconFilepath )
@@ -952,21 +1119,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( projectUsersFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading project user data from {}…".format( projectUsersFilepath ) )
-        self.XMLTree = ElementTree().parse( projectUsersFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( projectUsersFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         projectUsersDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag=='ProjectUserAccess':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag=='ProjectUserAccess':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Process the attributes first
             peerSharingFlag = None
-            for attrib,value in self.XMLTree.items():
+            for attrib,value in XMLTree.items():
                 if attrib=='PeerSharing': peerSharingFlag = getFlagFromAttribute( attrib, value )
                 else:
                     logging.error( _("Unprocessed {!r} attribute ({}) in {}").format( attrib, value, treeLocation ) )
@@ -974,7 +1141,7 @@ class PTX8Bible( Bible ):
             projectUsersDict['PeerSharingFlag'] = peerSharingFlag
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoText( element, elementLocation )
@@ -1061,7 +1228,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 project users settings tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 project users settings tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( projectUsersFilepath )
@@ -1088,28 +1255,28 @@ class PTX8Bible( Bible ):
         if not os.path.exists( canonsFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading canons data from {}…".format( canonsFilepath ) )
-        self.XMLTree = ElementTree().parse( canonsFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( canonsFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         canonsDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag == 'Canons':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation, 'CA01' )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation, 'CA02' )
+        if XMLTree.tag == 'Canons':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation, 'CA01' )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation, 'CA02' )
 
             # Process the attributes first
             nextId = None
-            for attrib,value in self.XMLTree.items():
+            for attrib,value in XMLTree.items():
                 if attrib=='NextId': nextId = value
                 else:
                     logging.error( _("Unprocessed {!r} attribute ({}) in {}").format( attrib, value, treeLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
 
@@ -1163,7 +1330,7 @@ class PTX8Bible( Bible ):
                 assert Id not in canonsDict
                 canonsDict[Id] = tempDict
         else:
-            logging.critical( _("Unrecognised PTX8 checking tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 checking tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( canonsFilepath )
@@ -1187,21 +1354,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( checkingStatusFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading checking status data from {}…".format( checkingStatusFilepath ) )
-        self.XMLTree = ElementTree().parse( checkingStatusFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( checkingStatusFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         checkingStatusByBookDict, checkingStatusByCheckDict = {}, {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag == 'CheckingStatuses':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'CheckingStatuses':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoAttributes( element, elementLocation )
@@ -1237,7 +1404,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 checking tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 checking tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( checkingStatusFilepath )
@@ -1268,18 +1435,18 @@ class PTX8Bible( Bible ):
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading comment tags from {}…".format( commentTagFilepath ) )
 
-        self.XMLTree = ElementTree().parse( commentTagFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( commentTagFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         # Find the main container
-        if self.XMLTree.tag == 'TagList':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'TagList':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoTail( element, elementLocation )
@@ -1306,7 +1473,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 comment tag list tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 comment tag list tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( commentTagFilepath )
@@ -1331,21 +1498,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( derivedTranslationStatusFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading derived translation status data from {}…".format( derivedTranslationStatusFilepath ) )
-        self.XMLTree = ElementTree().parse( derivedTranslationStatusFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( derivedTranslationStatusFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         derivedTranslationStatusByBookDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag == 'DerivedTranslationVerseList':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'DerivedTranslationVerseList':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoTail( element, elementLocation )
@@ -1378,7 +1545,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 derived translation tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 derived translation tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictDerivedTranslationFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( derivedTranslationStatusFilepath )
@@ -1451,19 +1618,19 @@ class PTX8Bible( Bible ):
             noteFilepath = os.path.join( self.sourceFilepath, noteFilename )
             vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading notes from {}…".format( noteFilepath ) )
 
-            self.XMLTree = ElementTree().parse( noteFilepath )
-            if not len( self.XMLTree ):
+            XMLTree = ElementTree().parse( noteFilepath )
+            if not len( XMLTree ):
                 logging.info( "Notes for {} seems empty.".format( noterName ) )
 
             # Find the main container
-            if self.XMLTree.tag == 'CommentList':
-                treeLocation = "PTX8 notes file ({}) for {}".format( self.XMLTree.tag, noterName )
-                BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-                BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-                BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+            if XMLTree.tag == 'CommentList':
+                treeLocation = "PTX8 notes file ({}) for {}".format( XMLTree.tag, noterName )
+                BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+                BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+                BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
                 # Now process the actual entries
-                for element in self.XMLTree:
+                for element in XMLTree:
                     elementLocation = element.tag + ' in ' + treeLocation
                     #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                     BibleOrgSysGlobals.checkXMLNoText( element, elementLocation )
@@ -1535,7 +1702,7 @@ class PTX8Bible( Bible ):
                     if thread not in notesDictByThread: notesDictByThread[thread] = []
                     notesDictByThread[thread].append( commentDict )
             else:
-                logging.critical( _("Unrecognised PTX8 {} note/comment list tag: {}").format( noterName, self.XMLTree.tag ) )
+                logging.critical( _("Unrecognised PTX8 {} note/comment list tag: {}").format( noterName, XMLTree.tag ) )
                 if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
             #dPrint( 'Quiet', debuggingThisModule, "\nNotes for {}: ({}) {}".format( noterName, len(notesDictByName[noterName]), notesDictByName[noterName] ) )
@@ -1579,21 +1746,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( parallelPassageStatusFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading parallel passage status data from {}…".format( parallelPassageStatusFilepath ) )
-        self.XMLTree = ElementTree().parse( parallelPassageStatusFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( parallelPassageStatusFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         parallelPassageStatusDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag == 'PassageStatus':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'PassageStatus':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
 
@@ -1649,7 +1816,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 parallel passage status tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 parallel passage status tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( parallelPassageStatusFilepath )
@@ -1675,18 +1842,18 @@ class PTX8Bible( Bible ):
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading Biblical terms from {}…".format( projectBiblicalTermsFilepath ) )
 
-        self.XMLTree = ElementTree().parse( projectBiblicalTermsFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( projectBiblicalTermsFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         # Find the main container
-        if self.XMLTree.tag=='BiblicalTermsList':
-            treeLocation = "PTX8 {} in project Biblical terms".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag=='BiblicalTermsList':
+            treeLocation = "PTX8 {} in project Biblical terms".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoTail( element, elementLocation )
@@ -1743,7 +1910,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element '{}' in {}").format( element.tag, element.text, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 {} project Biblical terms tag: {}").format( versionName, self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 {} project Biblical terms tag: {}").format( versionName, XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( projectBiblicalTermsFilepath )
@@ -1771,18 +1938,18 @@ class PTX8Bible( Bible ):
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading Progress from {}…".format( projectProgressFilepath ) )
 
-        self.XMLTree = ElementTree().parse( projectProgressFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( projectProgressFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         # Find the main container
-        if self.XMLTree.tag=='ProgressInfo':
-            treeLocation = "PTX8 {} in Project Progress".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag=='ProgressInfo':
+            treeLocation = "PTX8 {} in Project Progress".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoTail( element, elementLocation )
@@ -2065,7 +2232,7 @@ class PTX8Bible( Bible ):
                 #dPrint( 'Quiet', debuggingThisModule, "bookStatusDict", bookStatusDict )
                 #projectProgressDict.append( bookStatusDict )
         else:
-            logging.critical( _("Unrecognised PTX8 {} project progress tag: {}").format( versionName, self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 {} project progress tag: {}").format( versionName, XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( projectProgressFilepath )
@@ -2140,18 +2307,18 @@ class PTX8Bible( Bible ):
             printConfigFilepath = os.path.join( self.sourceFilepath, printConfigFilename )
             vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading PrintConfig from {}…".format( printConfigFilepath ) )
 
-            self.XMLTree = ElementTree().parse( printConfigFilepath )
-            assert self.XMLTree # Fail here if we didn't load anything at all
+            XMLTree = ElementTree().parse( printConfigFilepath )
+            assert XMLTree # Fail here if we didn't load anything at all
 
             # Find the main container
-            if self.XMLTree.tag == 'PrintDraftConfiguration':
-                treeLocation = "PTX8 {} file for {}".format( self.XMLTree.tag, printConfigType )
-                BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-                BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-                BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+            if XMLTree.tag == 'PrintDraftConfiguration':
+                treeLocation = "PTX8 {} file for {}".format( XMLTree.tag, printConfigType )
+                BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+                BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+                BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
                 # Now process the actual entries
-                for element in self.XMLTree:
+                for element in XMLTree:
                     elementLocation = element.tag + ' in ' + treeLocation
                     #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
 
@@ -2195,7 +2362,7 @@ class PTX8Bible( Bible ):
                     #dPrint( 'Quiet', debuggingThisModule, "bookStatusDict", bookStatusDict )
                     #printConfigDict[printConfigType].append( bookStatusDict )
             else:
-                logging.critical( _("Unrecognised PTX8 {} print configuration tag: {}").format( printConfigType, self.XMLTree.tag ) )
+                logging.critical( _("Unrecognised PTX8 {} print configuration tag: {}").format( printConfigType, XMLTree.tag ) )
                 if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
             try: self.filepathsNotYetLoaded.remove( printConfigFilepath )
@@ -2384,21 +2551,21 @@ class PTX8Bible( Bible ):
         if not os.path.exists( spellingStatusFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading spelling status data from {}…".format( spellingStatusFilepath ) )
-        self.XMLTree = ElementTree().parse( spellingStatusFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( spellingStatusFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         spellingStatusDict = {}
         #loadErrors:List[str] = []
 
         # Find the main container
-        if self.XMLTree.tag == 'SpellingStatus':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'SpellingStatus':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoText( element, elementLocation )
@@ -2435,7 +2602,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 spelling status tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 spelling status tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( spellingStatusFilepath )
@@ -2548,18 +2715,18 @@ class PTX8Bible( Bible ):
 
         TermRenderingsDict = {}
 
-        self.XMLTree = ElementTree().parse( renderingTermsFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( renderingTermsFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         # Find the main container
-        if self.XMLTree.tag == 'TermRenderingsList':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'TermRenderingsList':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoText( element, elementLocation )
@@ -2631,7 +2798,7 @@ class PTX8Bible( Bible ):
                 TermRenderingsDict[Id] = termRenderingEntryDict
                 #dPrint( 'Quiet', debuggingThisModule, "termRenderingEntryDict", termRenderingEntryDict ); halt
         else:
-            logging.critical( _("Unrecognised PTX8 {} term renderings tag: {}").format( versionName, self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 {} term renderings tag: {}").format( versionName, XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( renderingTermsFilepath )
@@ -2689,8 +2856,8 @@ class PTX8Bible( Bible ):
         if not os.path.exists( wordAnalysesFilepath ): return
 
         vPrint( 'Verbose', debuggingThisModule, "PTX8Bible.loading word analysis data from {}…".format( wordAnalysesFilepath ) )
-        self.XMLTree = ElementTree().parse( wordAnalysesFilepath )
-        assert self.XMLTree # Fail here if we didn't load anything at all
+        XMLTree = ElementTree().parse( wordAnalysesFilepath )
+        assert XMLTree # Fail here if we didn't load anything at all
 
         wordAnalysesDict = {}
         #loadErrors:List[str] = []
@@ -2724,14 +2891,14 @@ class PTX8Bible( Bible ):
 
 
         # Find the main container
-        if self.XMLTree.tag == 'WordAnalyses':
-            treeLocation = "PTX8 {} file".format( self.XMLTree.tag )
-            BibleOrgSysGlobals.checkXMLNoAttributes( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoText( self.XMLTree, treeLocation )
-            BibleOrgSysGlobals.checkXMLNoTail( self.XMLTree, treeLocation )
+        if XMLTree.tag == 'WordAnalyses':
+            treeLocation = "PTX8 {} file".format( XMLTree.tag )
+            BibleOrgSysGlobals.checkXMLNoAttributes( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoText( XMLTree, treeLocation )
+            BibleOrgSysGlobals.checkXMLNoTail( XMLTree, treeLocation )
 
             # Now process the actual entries
-            for element in self.XMLTree:
+            for element in XMLTree:
                 elementLocation = element.tag + ' in ' + treeLocation
                 #dPrint( 'Quiet', debuggingThisModule, "Processing {}…".format( elementLocation ) )
                 BibleOrgSysGlobals.checkXMLNoText( element, elementLocation )
@@ -2766,7 +2933,7 @@ class PTX8Bible( Bible ):
                     logging.error( _("Unprocessed {} element in {}").format( element.tag, elementLocation ) )
                     if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag and BibleOrgSysGlobals.haltOnXMLWarning: halt
         else:
-            logging.critical( _("Unrecognised PTX8 word analysis tag: {}").format( self.XMLTree.tag ) )
+            logging.critical( _("Unrecognised PTX8 word analysis tag: {}").format( XMLTree.tag ) )
             if BibleOrgSysGlobals.strictCheckingFlag or BibleOrgSysGlobals.debugFlag: halt
 
         try: self.filepathsNotYetLoaded.remove( wordAnalysesFilepath )
@@ -2871,11 +3038,18 @@ class PTX8Bible( Bible ):
                 BibleOrgSysGlobals.alreadyMultiprocessing = False
             else: # Just single threaded
                 # Load the books one by one -- assuming that they have regular Paratext style filenames
-                for BBB,filename in self.maximumPossibleFilenameTuples:
-                    #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
-                        #dPrint( 'Quiet', debuggingThisModule, _("  PTX8Bible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
-                    #if BBB not in self.books:
-                    self.loadBook( BBB, filename ) # also saves it
+                #   but read the files ahead using threads (in case we're on a slow filesystem)
+                self.bookFilePrefetcher = FilePrefetcher( [os.path.join( self.sourceFolder, filename )
+                                                    for BBB,filename in self.maximumPossibleFilenameTuples] )
+                try:
+                    for BBB,filename in self.maximumPossibleFilenameTuples:
+                        #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
+                            #dPrint( 'Quiet', debuggingThisModule, _("  PTX8Bible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
+                        #if BBB not in self.books:
+                        self.loadBook( BBB, filename ) # also saves it
+                finally:
+                    self.bookFilePrefetcher.close()
+                    self.bookFilePrefetcher = None # Can't be pickled
         else:
             logging.critical( "PTX8Bible: " + _("No books to load in folder '{}'!").format( self.sourceFolder ) )
         #dPrint( 'Quiet', debuggingThisModule, self.getBookList() )
@@ -3021,6 +3195,7 @@ def briefDemo() -> None:
                     #dPrint( 'Quiet', debuggingThisModule, "Tried finding '{}' in '{}': got '{}'".format( ref, name, UB.getXRefBBB( ref ) ) )
 
                 # Print unloaded metadata filepaths
+                PTX8_Bible.loadPTX8Metadata() # Parse any metadata that hasn't been used yet
                 if PTX8_Bible.filepathsNotYetLoaded and BibleOrgSysGlobals.verbosityLevel > 0:
                     vPrint( 'Quiet', debuggingThisModule, "\nFollowing {} file paths have not been processed in folder {}:" \
                                 .format( len(PTX8_Bible.filepathsNotYetLoaded), testFolder ) )
@@ -3201,6 +3376,7 @@ def fullDemo() -> None:
                     #dPrint( 'Quiet', debuggingThisModule, "Tried finding '{}' in '{}': got '{}'".format( ref, name, UB.getXRefBBB( ref ) ) )
 
                 # Print unloaded metadata filepaths
+                PTX8_Bible.loadPTX8Metadata() # Parse any metadata that hasn't been used yet
                 if PTX8_Bible.filepathsNotYetLoaded and BibleOrgSysGlobals.verbosityLevel > 0:
                     vPrint( 'Quiet', debuggingThisModule, "\nFollowing {} file paths have not been processed in folder {}:" \
                                 .format( len(PTX8_Bible.filepathsNotYetLoaded), testFolder ) )
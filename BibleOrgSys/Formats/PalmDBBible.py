@@ -5,7 +5,7 @@
 #
 # Module handling PDB Bible files
 #
-# Copyright (C) 2013-2020 Robert Hunt
+# Copyright (C) 2013-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -35,6 +35,7 @@ Limitations:
     …
 """
 from gettext import gettext as _
+from typing import List, Optional
 from pathlib import Path
 import logging
 import os
@@ -52,10 +53,10 @@ from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible, BibleBook
 
 
-LAST_MODIFIED_DATE = '2020-04-21' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "PDBBible"
 PROGRAM_NAME = "PDB Bible format handler"
-PROGRAM_VERSION = '0.67'
+PROGRAM_VERSION = '0.68'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -167,15 +168,119 @@ def PalmDBBibleFileCheck( givenFolderName, strictCheck:bool=True, autoLoad:bool=
 # end of PalmDBBibleFileCheck
 
 
+characterReplacements = ( ( '\xe2\x80\x94', '—' ), ( '\xe2\x80\x96', 'WWW' ),
+                          ( '\xe2\x80\x98', '’' ), ( '\xe2\x80\x99', '’' ),
+                          ( '\xe2\x80\x9c', '“' ), ( '\xe2\x80\x9d', '”' ),
+                          ( 'Ã\x83Æ\x92Ã\x82Â¡', 'á' ), ( 'Ã\x83Æ\x92Ã\x82Â©', 'é' ), ( 'Ã\x83Æ\x92Ã\x82Â\xad', 'í' ), )
+def getBinaryString( binary, numBytes ):
+    """
+    Gets bytes out of the binary and converts them to characters.
+    Stops when numBytes is reached, or a NULL is encountered.
+
+    Returns the string.
+    """
+    #if BibleOrgSysGlobals.debugFlag:
+        #dPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} )").format( hexlify(binary), binary, numBytes ) )
+    if len(binary) < numBytes: halt # Too few bytes provided
+    binary = binary[:numBytes]
+    if debuggingThisModule:
+        for someInt in binary:
+            #dPrint( 'Quiet', debuggingThisModule, repr(someInt) )
+            if someInt == 0xe2:
+                vPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} ) found e2").format( hexlify(binary), binary, numBytes ) )
+    result = ''
+    errorFlag = False
+    for j, value in enumerate( binary ):
+        if j>=numBytes or value==0: break
+        if value > 0x7F:
+            if debuggingThisModule:
+                vPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} ) found non-ascii").format( hexlify(binary), binary, numBytes ) )
+                vPrint( 'Quiet', debuggingThisModule, "{} Got non-ASCII character {:02x}->{!r}".format( j, value, chr(value) ) )
+            errorFlag = True
+        result += chr( value )
+    if errorFlag:
+        if debuggingThisModule:
+            #dPrint( 'Quiet', debuggingThisModule, "{:04x}".format( ord('“') ) ) # ”
+            vPrint( 'Quiet', debuggingThisModule, "Got1 invalid string {!r}".format( result ) )
+        result = result.replace( '\x97', '—' )
+        if numBytes == 1:
+            if result == '\x92': result = '’'
+            #elif result == '\x97': result = '—'
+        elif numBytes >= 3:
+            bits = binary[1:3]
+            if debuggingThisModule:
+                vPrint( 'Quiet', debuggingThisModule, "bits {!r}".format( bits ) )
+                bitInt, = struct.unpack( ">H", bits )
+                vPrint( 'Quiet', debuggingThisModule, "bitInt {:04x}".format( bitInt ) )
+                vPrint( 'Quiet', debuggingThisModule, "try", repr(bits.decode(encoding='latin-1')) )
+            for byteSeries, replacement in characterReplacements:
+                ix =  result.find( byteSeries )
+                if debuggingThisModule and ix != -1: vPrint( 'Quiet', debuggingThisModule, "found {}".format( byteSeries ) )
+                result = result.replace( byteSeries, replacement )
+            #if   result.startswith( '\xe2\x80\x94' ): result = 'XXX' + result[3:]
+            #elif result.startswith( '\xe2\x80\x98' ): result = 'YYY' + result[3:]
+            #elif result.startswith( '\xe2\x80\x99' ): result = 'ZZZ' + result[3:]
+            #elif result.startswith( '\xe2\x80\x9c' ): result = 'PPP' + result[3:]
+            #elif result.startswith( '\xe2\x80\x9d' ): result = 'QQQ' + result[3:]
+            #else: halt
+            if debuggingThisModule:
+                if '\xe2' in result: halt
+                vPrint( 'Quiet', debuggingThisModule, "Got2 invalid string {!r}".format( result ) )
+    return result
+# end of getBinaryString
+
+
+def getFileString( thisFile, numBytes ):
+    """
+    Used for reading the PalmDB header information from the file.
+    """
+    #if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+        #dPrint( 'Quiet', debuggingThisModule, _("getFileString( {}, {} )").format( thisFile, numBytes ) )
+    return getBinaryString( thisFile.read( numBytes ), numBytes )
+# end of getFileString
+
+
+def getBBBFromBookNumber( bookNumber:int ) -> Optional[str]:
+    """
+    Convert a PalmDB Bible book number (10, 20, …) to a BBB code.
+
+    Returns None if we don't know the number.
+    """
+    BBB = None
+    if bookNumber % 10 == 0:
+        if bookNumber <= 160:
+            BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( bookNumber / 10 )
+        elif bookNumber == 170: BBB = 'TOB'
+        elif bookNumber == 180: BBB = 'JDT'
+        elif bookNumber == 190: BBB = 'EST'
+        elif 220 <= bookNumber <= 260:
+            BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-40) / 10 )
+        elif 290 <= bookNumber <= 310:
+            BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-60) / 10 )
+        elif bookNumber == 320: BBB = 'BAR'
+        elif 330 <= bookNumber <= 730:
+            BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-70) / 10 )
+    elif bookNumber == 315: BBB = 'LJE'
+    return BBB
+# end of getBBBFromBookNumber
+
+
 
 class PalmDBBible( Bible ):
     """
     Class for reading, validating, and converting PalmDBBible files.
+
+    preload() only reads the PalmDB record list and the Bible header record
+        (which indexes the records for each book).
+    The shared word lists are decoded once (when the first book is loaded),
+        and then loading a book only reads and decodes the records for that book.
     """
     def __init__( self, sourceFolder, givenName, encoding='utf-8' ) -> None:
         """
         Constructor: just sets up the Bible object.
         """
+        fnPrint( debuggingThisModule, f"PalmDBBible.__init__( '{sourceFolder}', {givenName!r}, {encoding!r} )" )
+
          # Setup and initialise the base class first
         Bible.__init__( self )
         self.objectNameString = 'PDB Bible object'
@@ -194,120 +299,158 @@ class PalmDBBible( Bible ):
         self.name = self.givenName
         #if self.name is None:
             #pass
+        self.words = None # Decoded from the word list records when the first book is loaded
     # end of PalmDBBible.__init__
 
 
-    def load( self ):
+    def readRecord( self, recordNumber:int, thisFile ) -> bytes:
         """
-        Load a single source file and load book elements.
+        Uses self.mainDBIndex to read in the specified PalmDB record.
+            dataOffset gives the file offset from the beginning of the file.
         """
-        vPrint( 'Info', debuggingThisModule, _("Loading {}…").format( self.sourceFilepath ) )
-        loadErrors:List[str] = []
-        mainDBIndex = []
-
-
-        def readRecord( recordNumber, thisFile ):
-            """
-            Uses mainDBIndex to read in the specified PalmDB record.
-                dataOffset gives the file offset from the beginning of the file.
-            """
-            if BibleOrgSysGlobals.debugFlag:
-                if debuggingThisModule:
-                    vPrint( 'Quiet', debuggingThisModule, _("readRecord( {}, {} )").format( recordNumber, thisFile ) )
-                assert recordNumber < len(mainDBIndex)
-            dataOffset, recordLength, recordAttributes, id0, id1, id2 = mainDBIndex[recordNumber]
-            #recordLength = 99999 if recordNumber==len(mainDBIndex)-1 else (mainDBIndex[recordNumber+1][0] - dataOffset)
-            #dPrint( 'Quiet', debuggingThisModule, " dataOffset={} recordLength={}".format( dataOffset, recordLength ) )
-            #dPrint( 'Quiet', debuggingThisModule, " recordAttributes={} id0={} id1={} id2={}".format( recordAttributes, id0, id1, id2 ) )
-            thisFile.seek( dataOffset )
-            #dPrint( 'Quiet', debuggingThisModule, "Reading {} bytes from record {} at offset {}".format( recordLength, recordNumber, dataOffset ) )
-            binaryInfo = thisFile.read( recordLength )
-            if recordNumber < len(mainDBIndex)-1: assert len(binaryInfo) == recordLength
-            return binaryInfo
-        # end of readRecord
-
-        characterReplacements = ( ( '\xe2\x80\x94', '—' ), ( '\xe2\x80\x96', 'WWW' ),
-                                  ( '\xe2\x80\x98', '’' ), ( '\xe2\x80\x99', '’' ),
-                                  ( '\xe2\x80\x9c', '“' ), ( '\xe2\x80\x9d', '”' ),
-                                  ( 'Ã\x83Æ\x92Ã\x82Â¡', 'á' ), ( 'Ã\x83Æ\x92Ã\x82Â©', 'é' ), ( 'Ã\x83Æ\x92Ã\x82Â\xad', 'í' ), )
-        def getBinaryString( binary, numBytes ):
-            """
-            Gets bytes out of the binary and converts them to characters.
-            Stops when numBytes is reached, or a NULL is encountered.
-
-            Returns the string.
-            """
-            #if BibleOrgSysGlobals.debugFlag:
-                #dPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} )").format( hexlify(binary), binary, numBytes ) )
-            if len(binary) < numBytes: halt # Too few bytes provided
-            binary = binary[:numBytes]
+        if BibleOrgSysGlobals.debugFlag:
             if debuggingThisModule:
-                for someInt in binary:
-                    #dPrint( 'Quiet', debuggingThisModule, repr(someInt) )
-                    if someInt == 0xe2:
-                        vPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} ) found e2").format( hexlify(binary), binary, numBytes ) )
-            result = ''
-            errorFlag = False
-            for j, value in enumerate( binary ):
-                if j>=numBytes or value==0: break
-                if value > 0x7F:
-                    if debuggingThisModule:
-                        vPrint( 'Quiet', debuggingThisModule, _("getBinaryString( {}={}, {} ) found non-ascii").format( hexlify(binary), binary, numBytes ) )
-                        vPrint( 'Quiet', debuggingThisModule, "{} Got non-ASCII character {:02x}->{!r}".format( j, value, chr(value) ) )
-                    errorFlag = True
-                result += chr( value )
-            if errorFlag:
-                if debuggingThisModule:
-                    #dPrint( 'Quiet', debuggingThisModule, "{:04x}".format( ord('“') ) ) # ”
-                    vPrint( 'Quiet', debuggingThisModule, "Got1 invalid string {!r}".format( result ) )
-                result = result.replace( '\x97', '—' )
-                if numBytes == 1:
-                    if result == '\x92': result = '’'
-                    #elif result == '\x97': result = '—'
-                elif numBytes >= 3:
-                    bits = binary[1:3]
-                    if debuggingThisModule:
-                        vPrint( 'Quiet', debuggingThisModule, "bits {!r}".format( bits ) )
-                        bitInt, = struct.unpack( ">H", bits )
-                        vPrint( 'Quiet', debuggingThisModule, "bitInt {:04x}".format( bitInt ) )
-                        vPrint( 'Quiet', debuggingThisModule, "try", repr(bits.decode(encoding='latin-1')) )
-                    for byteSeries, replacement in characterReplacements:
-                        ix =  result.find( byteSeries )
-                        if debuggingThisModule and ix != -1: vPrint( 'Quiet', debuggingThisModule, "found {}".format( byteSeries ) )
-                        result = result.replace( byteSeries, replacement )
-                    #if   result.startswith( '\xe2\x80\x94' ): result = 'XXX' + result[3:]
-                    #elif result.startswith( '\xe2\x80\x98' ): result = 'YYY' + result[3:]
-                    #elif result.startswith( '\xe2\x80\x99' ): result = 'ZZZ' + result[3:]
-                    #elif result.startswith( '\xe2\x80\x9c' ): result = 'PPP' + result[3:]
-                    #elif result.startswith( '\xe2\x80\x9d' ): result = 'QQQ' + result[3:]
-                    #else: halt
-                    if debuggingThisModule:
-                        if '\xe2' in result: halt
-                        vPrint( 'Quiet', debuggingThisModule, "Got2 invalid string {!r}".format( result ) )
-            return result
-        # end of getBinaryString
+                vPrint( 'Quiet', debuggingThisModule, _("readRecord( {}, {} )").format( recordNumber, thisFile ) )
+            assert recordNumber < len(self.mainDBIndex)
+        dataOffset, recordLength, recordAttributes, id0, id1, id2 = self.mainDBIndex[recordNumber]
+        #recordLength = 99999 if recordNumber==len(mainDBIndex)-1 else (mainDBIndex[recordNumber+1][0] - dataOffset)
+        #dPrint( 'Quiet', debuggingThisModule, " dataOffset={} recordLength={}".format( dataOffset, recordLength ) )
+        #dPrint( 'Quiet', debuggingThisModule, " recordAttributes={} id0={} id1={} id2={}".format( recordAttributes, id0, id1, id2 ) )
+        thisFile.seek( dataOffset )
+        #dPrint( 'Quiet', debuggingThisModule, "Reading {} bytes from record {} at offset {}".format( recordLength, recordNumber, dataOffset ) )
+        binaryInfo = thisFile.read( recordLength )
+        if recordNumber < len(self.mainDBIndex)-1: assert len(binaryInfo) == recordLength
+        return binaryInfo
+    # end of PalmDBBible.readRecord
+
+
+    def preload( self ) -> None:
+        """
+        Read the PalmDB header and record list,
+            and the Bible header record which tells us which records belong to which book.
 
+        The book records themselves aren't read here.
+        """
+        fnPrint( debuggingThisModule, "preload() from {}".format( self.sourceFilepath ) )
+        vPrint( 'Info', debuggingThisModule, _("Preloading {}…").format( self.sourceFilepath ) )
 
-        def getFileString( thisFile, numBytes ):
-            """
-            Used for reading the PalmDB header information from the file.
-            """
-            #if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                #dPrint( 'Quiet', debuggingThisModule, _("getFileString( {}, {} )").format( thisFile, numBytes ) )
-            return getBinaryString( thisFile.read( numBytes ), numBytes )
-        # end of getFileString
+        with open( self.sourceFilepath, 'rb' ) as myFile: # Automatically closes the file when done
+            vPrint( 'Normal', debuggingThisModule, _("Loading PalmDB header info…") )
+            name = getFileString( myFile, 32 )
+            binary4 = myFile.read( 4 )
+            attributes, version = struct.unpack( ">hh", binary4 )
+            binary12 = myFile.read( 12 )
+            creationDate, lastModificationDate, lastBackupDate = struct.unpack( ">III", binary12 )
+            binary12 = myFile.read( 12 )
+            modificationNumber, appInfoID, sortInfoID = struct.unpack( ">III", binary12 )
+            appType = getFileString( myFile, 4 )
+            creator = getFileString( myFile, 4 )
+            vPrint( 'Normal', debuggingThisModule, "  name = {!r} appType = {!r} creator = {!r}".format( name, appType, creator ) )
+            vPrint( 'Verbose', debuggingThisModule, "  attributes={} version={}".format( attributes, version ) )
+            vPrint( 'Verbose', debuggingThisModule, "  creationDate={} lastModificationDate={} lastBackupDate={}".format( creationDate, lastModificationDate, lastBackupDate ) )
+            vPrint( 'Verbose', debuggingThisModule, "  modificationNumber={} appInfoID={} sortInfoID={}".format( modificationNumber, appInfoID, sortInfoID ) )
+            binary4 = myFile.read( 4 )
+            uniqueIDseed = struct.unpack( ">I", binary4 )
+            binary6 = myFile.read( 6 )
+            nextRecordListID, numDBRecords = struct.unpack( ">IH", binary6 )
+            vPrint( 'Verbose', debuggingThisModule, "  uniqueIDseed={} nextRecordListID={} numDBRecords={}".format( uniqueIDseed, nextRecordListID, numDBRecords ) )
+            vPrint( 'Verbose', debuggingThisModule, "  numDBRecords =", numDBRecords )
+            tmpIndex, mainDBIndex = [], []
+            for n in range( numDBRecords ):
+                binary8 = myFile.read( 8 )
+                dataOffset, recordAttributes, id0, id1, id2 = struct.unpack( ">IBBBB", binary8 )
+                #dPrint( 'Quiet', debuggingThisModule, '', dataOffset, recordAttributes, id0, id1, id2 )
+                assert recordAttributes + id0 + id1 + id2 == 0
+                tmpIndex.append( (dataOffset, recordAttributes, id0, id1, id2) )
+            for recordNumber in range( len(tmpIndex) ):
+                dataOffset, recordAttributes, id0, id1, id2 = tmpIndex[recordNumber]
+                recordLength = 4096 if recordNumber==len(tmpIndex)-1 else (tmpIndex[recordNumber+1][0] - dataOffset)
+                mainDBIndex.append( (dataOffset, recordLength, recordAttributes, id0, id1, id2) )
+            self.mainDBIndex = mainDBIndex
+            if 0:
+                vPrint( 'Quiet', debuggingThisModule, "  {} DB header bytes read".format( myFile.tell() ) )
+                vPrint( 'Quiet', debuggingThisModule, '' )
+                for recordNumber in range( len(mainDBIndex) ):
+                    dataOffset, recordLength, recordAttributes, id0, id1, id2 = mainDBIndex[recordNumber]
+                    vPrint( 'Quiet', debuggingThisModule, "Record {} @ {} len={} attribs={} {} {} {}".format( recordNumber, dataOffset, recordLength, recordAttributes, id0, id1, id2 ) )
+                    #assert recordLength <= 4096
+                    if 0:
+                        recordBytes = self.readRecord( recordNumber, myFile )
+                        if recordNumber < 8 or recordLength < 200:
+                            vPrint( 'Quiet', debuggingThisModule, "    {}\n    {}".format( hexlify(recordBytes), recordBytes ) )
+                        else: vPrint( 'Quiet', debuggingThisModule, "    {}".format( hexlify(recordBytes) ) )
+            #if BibleOrgSysGlobals.debugFlag:
+                #halt
 
+            # Now read the first record of actual Bible data which is the Bible header info
+            vPrint( 'Info', debuggingThisModule, "\nLoading Bible header info…" )
+            binary = self.readRecord( 0, myFile )
+            byteOffset = 0
+            versionName = getBinaryString( binary, 16 ); byteOffset += 16
+            versionInfo = getBinaryString( binary[byteOffset:], 128 ); byteOffset += 128
+            separatorCharacter = getBinaryString( binary[byteOffset:], 1 ); byteOffset += 1
+            vPrint( 'Info', debuggingThisModule, repr(versionName), repr(versionInfo), repr(separatorCharacter) )
+            assert separatorCharacter == ' '
+            versionAttribute, wordIndexIndex, numWordListRecords, numBooks = struct.unpack( ">BHHH",  binary[byteOffset:byteOffset+7] ); byteOffset += 7
+            #dPrint( 'Quiet', debuggingThisModule, "  versionAttribute =",versionAttribute )
+            copyProtectedFlag = versionAttribute & 1
+            byteShiftedFlag = not versionAttribute & 2
+            RTLFlag = versionAttribute & 4
+            if BibleOrgSysGlobals.verbosityLevel > 1:
+                if copyProtectedFlag: vPrint( 'Quiet', debuggingThisModule, " Copy protected!" ); halt
+                else: vPrint( 'Quiet', debuggingThisModule, " Not copy protected." )
+                if byteShiftedFlag: vPrint( 'Quiet', debuggingThisModule, "  BYTE SHIFTED! # See http://en.wikipedia.org/wiki/Shift_JIS for Japanese" )
+                else: vPrint( 'Quiet', debuggingThisModule, " Not byte shifted." )
+                if RTLFlag: vPrint( 'Quiet', debuggingThisModule, " Right-aligned (RTL languages)!" ); halt
+                else: vPrint( 'Quiet', debuggingThisModule, " Left-aligned (LTR languages)." )
+                if BibleOrgSysGlobals.verbosityLevel > 3:
+                    vPrint( 'Quiet', debuggingThisModule, "  wordIndexIndex={} numWordListRecords={} numBooks={}".format( wordIndexIndex, numWordListRecords, numBooks ) )
+            bookIndexMetadata = []
+            for n in range(  0, numBooks ):
+                bookNumber, bookRecordLocation, numBookRecords = struct.unpack( ">HHH",  binary[byteOffset:byteOffset+6] ); byteOffset += 6
+                shortName = getBinaryString( binary[byteOffset:], 8 ); byteOffset += 8
+                longName = getBinaryString( binary[byteOffset:], 32 ); byteOffset += 32
+                if BibleOrgSysGlobals.verbosityLevel > 3:
+                    vPrint( 'Quiet', debuggingThisModule, '    Book {:2}: {!r} {!r} bkNum={} loc={} numBookRecords={}'.format( n+1, shortName, longName, bookNumber, bookRecordLocation, numBookRecords ) )
+                bookIndexMetadata.append( (shortName, longName, bookNumber, bookRecordLocation, numBookRecords) )
+            assert byteOffset == len(binary)
+            #if BibleOrgSysGlobals.debugFlag:
+                #dPrint( 'Quiet', debuggingThisModule, "bookIndexMetadata", len(bookIndexMetadata), bookIndexMetadata )
+                #halt
+        self.PDBName, self.separatorCharacter = name, separatorCharacter
+        self.byteShiftedFlag, self.wordIndexIndex = byteShiftedFlag, wordIndexIndex
+
+        # Work out the book codes so we know which books are available (without reading any book records)
+        self.bookIndexDict = {}
+        for shortName, longName, bookNumber, bookRecordLocation, numBookRecords in bookIndexMetadata:
+            BBB = getBBBFromBookNumber( bookNumber )
+            if BBB is None:
+                logging.error( _("PalmDBBible.preload: Unable to determine book code for book number {} ({!r} {!r}) in {}").format( bookNumber, shortName, longName, self.sourceFilepath ) )
+                continue
+            self.bookIndexDict[BBB] = (shortName, longName, bookNumber, bookRecordLocation, numBookRecords)
+            self.availableBBBs.add( BBB )
+        self.bookList = list( self.bookIndexDict.keys() )
+        vPrint( 'Info', debuggingThisModule, "PalmDBBible.preload: {} book details preloaded".format( len(self.bookList) ) )
+
+        self.preloadDone = True
+    # end of PalmDBBible.preload
+
+
+    def loadWordlists( self ) -> None:
+        """
+        Load the word lists (which are shared by all of the books) into self.words.
 
-        words = []
-        def loadWordlists():
-            """
-            """
-            nonlocal words
-            fnPrint( debuggingThisModule, "loadWordlists()" )
+        This is only done once, and only when the first book is requested.
+        """
+        fnPrint( debuggingThisModule, "loadWordlists()" )
+        if not self.preloadDone: self.preload()
+        words, loadErrors = [], []
+        separatorCharacter, wordIndexIndex = self.separatorCharacter, self.wordIndexIndex
 
-            # Now read the word index info
-            vPrint( 'Normal', debuggingThisModule, _("Loading word index info…") )
-            binary = readRecord( wordIndexIndex, myFile )
+        # Now read the word index info
+        vPrint( 'Normal', debuggingThisModule, _("Loading word index info…") )
+        with open( self.sourceFilepath, 'rb' ) as myFile: # Automatically closes the file when done
+            binary = self.readRecord( wordIndexIndex, myFile )
             byteOffset = 0
             totalIndicesCount, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
             #dPrint( 'Quiet', debuggingThisModule, " totalIndicesCount =",totalIndicesCount )
@@ -341,7 +484,7 @@ class PalmDBBible( Bible ):
                     #dPrint( 'Quiet', debuggingThisModule, "Got {} bytes available in buffer".format(  numRemainingBufferBytes ) )
                     if numRemainingBufferBytes < wordLength: # Need to continue to the next record
                         #binary += myFile.read( 256 ) # These records are assumed here to be contiguous
-                        binary += readRecord( wordIndexIndex+recordOffset+1, myFile )
+                        binary += self.readRecord( wordIndexIndex+recordOffset+1, myFile )
                         recordOffset += 1
                     if not compressedFlag:
                         # We have a pointer to an array of characters
@@ -398,7 +541,126 @@ class PalmDBBible( Bible ):
                     vPrint( 'Quiet', debuggingThisModule, "      Loaded {} {}-char words (now have {}={:04x} total): {}".format( numLoaded, wordLength, len(words), len(words), wordDisplay ) )
             #dPrint( 'Quiet', debuggingThisModule, 'xyz', byteOffset, len(binary) )
             assert byteOffset == len(binary)
-        # end of loadWordlists
+        self.words = words
+        dPrint( 'Never', debuggingThisModule, "numWords =", len(words) )
+        if loadErrors:
+            self.checkResultsDictionary['Load Errors'] = loadErrors
+    # end of PalmDBBible.loadWordlists
+
+
+    def loadBook( self, BBB:str ) -> None:
+        """
+        Load the requested book into self.books if it's not already loaded.
+        """
+        fnPrint( debuggingThisModule, "PalmDBBible.loadBook( {} )".format( BBB ) )
+        if BBB in self.books: return # Already loaded
+        if BBB in self.triedLoadingBook:
+            logging.warning( "We had already tried loading PalmDBBible {} for {}".format( BBB, self.name ) )
+            return # We've already attempted to load this book
+        self.triedLoadingBook[BBB] = True
+        if not self.preloadDone: self.preload()
+        if BBB in self.bookIndexDict:
+            if self.words is None: self.loadWordlists()
+            if BibleOrgSysGlobals.verbosityLevel > 2 or BibleOrgSysGlobals.debugFlag: vPrint( 'Quiet', debuggingThisModule, _("  PalmDBBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
+            PalmDBBk = PalmDBBibleBook( self, BBB )
+            PalmDBBk.load()
+            self.stashBook( PalmDBBk )
+        else: logging.info( "PalmDBBible book {} is not listed as being available".format( BBB ) )
+    # end of PalmDBBible.loadBook
+
+
+    def _loadBookMP( self, BBB:str ) -> Optional[BibleBook]:
+        """
+        Multiprocessing version!
+        Load the requested book if it's not already loaded (but doesn't save it as that is not safe for multiprocessing)
+
+        The word lists must already be loaded (so they're not decoded again in every process).
+        """
+        fnPrint( debuggingThisModule, f"PalmDBBible._loadBookMP( {BBB} )" )
+        assert BBB not in self.books
+        self.triedLoadingBook[BBB] = True
+        if BBB in self.bookIndexDict:
+            if BibleOrgSysGlobals.verbosityLevel > 2 or BibleOrgSysGlobals.debugFlag:
+                vPrint( 'Quiet', debuggingThisModule, '  ' + "Loading {} from {} from {}…".format( BBB, self.name, self.sourceFolder ) )
+            PalmDBBk = PalmDBBibleBook( self, BBB )
+            PalmDBBk.load()
+            if BibleOrgSysGlobals.verbosityLevel > 2 or BibleOrgSysGlobals.debugFlag:
+                vPrint( 'Quiet', debuggingThisModule, _("    Finishing loading PalmDBBible book {}.").format( BBB ) )
+            return PalmDBBk
+        else: logging.info( "PalmDBBible book {} is not listed as being available".format( BBB ) )
+    # end of PalmDBBible._loadBookMP
+
+
+    def loadBooks( self ) -> None:
+        """
+        Load all the books.
+
+        The books are independent (once the word lists are loaded)
+            so they're decoded in parallel if we're allowed multiple processes.
+        """
+        vPrint( 'Info', debuggingThisModule, _("Loading {}…").format( self.sourceFilepath ) )
+
+        if not self.preloadDone: self.preload()
+
+        if self.bookList:
+            if self.words is None: self.loadWordlists()
+            BBBsToLoad = [BBB for BBB in self.bookList if BBB not in self.books]
+            if BibleOrgSysGlobals.maxProcesses > 1 and len(BBBsToLoad) > 1 \
+            and not BibleOrgSysGlobals.alreadyMultiprocessing: # Get our subprocesses ready and waiting for work
+                if BibleOrgSysGlobals.verbosityLevel > 1:
+                    vPrint( 'Quiet', debuggingThisModule, _("Loading {} PalmDB books using {} processes…").format( len(BBBsToLoad), BibleOrgSysGlobals.maxProcesses ) )
+                    vPrint( 'Quiet', debuggingThisModule, _("  NOTE: Outputs (including error and warning messages) from loading various books may be interspersed.") )
+                BibleOrgSysGlobals.alreadyMultiprocessing = True
+                with multiprocessing.Pool( processes=BibleOrgSysGlobals.maxProcesses ) as pool: # start worker processes
+                    results = pool.map( self._loadBookMP, BBBsToLoad ) # have the pool do our loads
+                    assert len(results) == len(BBBsToLoad)
+                    for bBook in results:
+                        bBook.containerBibleObject = self # Because the pickling and unpickling messes this up
+                        self.stashBook( bBook ) # Saves them in the correct order
+                        self.triedLoadingBook[bBook.BBB] = True
+                BibleOrgSysGlobals.alreadyMultiprocessing = False
+            else: # Just single threaded
+                for BBB in BBBsToLoad:
+                    self.loadBook( BBB ) # also saves it
+        else:
+            logging.critical( "PalmDBBible: " + _("No books to load in {!r}!").format( self.sourceFilepath ) )
+
+        self.doPostLoadProcessing()
+    # end of PalmDBBible.loadBooks
+
+    def load( self ) -> None:
+        self.loadBooks()
+# end of PalmDBBible class
+
+
+
+class PalmDBBibleBook( BibleBook ):
+    """
+    Class to decode and manipulate a single PalmDB Bible book.
+    """
+
+    def __init__( self, containerBibleObject:Bible, BBB:str ) -> None:
+        """
+        Create the PalmDB Bible book object.
+        """
+        BibleBook.__init__( self, containerBibleObject, BBB ) # Initialise the base class
+        self.objectNameString = 'Palm Bible Book object'
+        self.objectTypeString = 'Palm'
+    # end of PalmDBBibleBook.__init__
+
+
+    def load( self ) -> None:
+        """
+        Read and decode just the records for this book
+            (using the record index and the word lists from the container Bible).
+        """
+        fnPrint( debuggingThisModule, f"PalmDBBibleBook.load() for {self.BBB}" )
+        container = self.containerBibleObject
+        shortName, longName, bookNumber, bookRecordLocation, numBookRecords = container.bookIndexDict[self.BBB]
+        mainDBIndex, words, separatorCharacter = container.mainDBIndex, container.words, container.separatorCharacter
+        numWords, byteShiftedFlag = len(words), container.byteShiftedFlag
+        BBB = self.BBB
+        loadErrors:List[str] = []
 
 
         remainder14count = remainder14bits = 0
@@ -462,7 +724,7 @@ class PalmDBBible( Bible ):
         hadP = False
         def saveSegment( BBB:str, C:str, V:str, verseText ):
             """
-            Used to save the verse data into the global thisBook.
+            Used to save the verse data into the global self.
             """
             nonlocal hadP
             if BibleOrgSysGlobals.debugFlag:
@@ -509,13 +771,13 @@ class PalmDBBible( Bible ):
                 assert C == 0
                 adjText = adjText[6:].lstrip()
                 vPrint( 'Never', debuggingThisModule, "  adjText BOOK={!r}".format( adjText ) )
-                thisBook.addLine( 'mt', adjText ); adjText = ''
+                self.addLine( 'mt', adjText ); adjText = ''
             elif adjText.startswith( '<CHAPTER>' ):
                 assert C > 0
                 adjText = adjText[9:].lstrip()
-                thisBook.addLine( 'c', str(C) )
-                thisBook.addLine( 's', adjText ); adjText = ''
-                thisBook.addLine( 'p', '' ); hadP = True
+                self.addLine( 'c', str(C) )
+                self.addLine( 's', adjText ); adjText = ''
+                self.addLine( 'p', '' ); hadP = True
             elif adjText.startswith( '<VERSE>' ):
                 assert C > 0
                 adjText = adjText[7:].lstrip()
@@ -523,318 +785,179 @@ class PalmDBBible( Bible ):
                 adjText = adjText[6:].lstrip()
                 vPrint( 'Never', debuggingThisModule, "  adjText DESC={!r}".format( adjText ) )
                 marker = 'ip' if C==0 else 's'
-                thisBook.addLine( marker, adjText ); adjText = ''
-                if marker == 's': thisBook.addLine( 'p', '' ); hadP = True
+                self.addLine( marker, adjText ); adjText = ''
+                if marker == 's': self.addLine( 'p', '' ); hadP = True
             if adjText:
                 if not hadP:
-                    thisBook.addLine( 'p', '' ); hadP = True
+                    self.addLine( 'p', '' ); hadP = True
                 #if adjText != adjText1: vPrint( 'Quiet', debuggingThisModule, "  adjText3={!r}".format( adjText ) )
-                thisBook.addLine( 'v', '{} {}'.format( V, adjText ) )
+                self.addLine( 'v', '{} {}'.format( V, adjText ) )
         # end of saveSegment
 
 
-        # main code for load()
-        with open( self.sourceFilepath, 'rb' ) as myFile: # Automatically closes the file when done
-            # Read the PalmDB header info
-            vPrint( 'Normal', debuggingThisModule, _("Loading PalmDB header info…") )
-            name = getFileString( myFile, 32 )
-            binary4 = myFile.read( 4 )
-            attributes, version = struct.unpack( ">hh", binary4 )
-            binary12 = myFile.read( 12 )
-            creationDate, lastModificationDate, lastBackupDate = struct.unpack( ">III", binary12 )
-            binary12 = myFile.read( 12 )
-            modificationNumber, appInfoID, sortInfoID = struct.unpack( ">III", binary12 )
-            appType = getFileString( myFile, 4 )
-            creator = getFileString( myFile, 4 )
-            vPrint( 'Normal', debuggingThisModule, "  name = {!r} appType = {!r} creator = {!r}".format( name, appType, creator ) )
-            vPrint( 'Verbose', debuggingThisModule, "  attributes={} version={}".format( attributes, version ) )
-            vPrint( 'Verbose', debuggingThisModule, "  creationDate={} lastModificationDate={} lastBackupDate={}".format( creationDate, lastModificationDate, lastBackupDate ) )
-            vPrint( 'Verbose', debuggingThisModule, "  modificationNumber={} appInfoID={} sortInfoID={}".format( modificationNumber, appInfoID, sortInfoID ) )
-            binary4 = myFile.read( 4 )
-            uniqueIDseed = struct.unpack( ">I", binary4 )
-            binary6 = myFile.read( 6 )
-            nextRecordListID, numDBRecords = struct.unpack( ">IH", binary6 )
-            vPrint( 'Verbose', debuggingThisModule, "  uniqueIDseed={} nextRecordListID={} numDBRecords={}".format( uniqueIDseed, nextRecordListID, numDBRecords ) )
-            vPrint( 'Verbose', debuggingThisModule, "  numDBRecords =", numDBRecords )
-            tmpIndex = []
-            for n in range( numDBRecords ):
-                binary8 = myFile.read( 8 )
-                dataOffset, recordAttributes, id0, id1, id2 = struct.unpack( ">IBBBB", binary8 )
-                #dPrint( 'Quiet', debuggingThisModule, '', dataOffset, recordAttributes, id0, id1, id2 )
-                assert recordAttributes + id0 + id1 + id2 == 0
-                tmpIndex.append( (dataOffset, recordAttributes, id0, id1, id2) )
-            for recordNumber in range( len(tmpIndex) ):
-                dataOffset, recordAttributes, id0, id1, id2 = tmpIndex[recordNumber]
-                recordLength = 4096 if recordNumber==len(tmpIndex)-1 else (tmpIndex[recordNumber+1][0] - dataOffset)
-                mainDBIndex.append( (dataOffset, recordLength, recordAttributes, id0, id1, id2) )
-            if 0:
-                vPrint( 'Quiet', debuggingThisModule, "  {} DB header bytes read".format( myFile.tell() ) )
-                vPrint( 'Quiet', debuggingThisModule, '' )
-                for recordNumber in range( len(mainDBIndex) ):
-                    dataOffset, recordLength, recordAttributes, id0, id1, id2 = mainDBIndex[recordNumber]
-                    vPrint( 'Quiet', debuggingThisModule, "Record {} @ {} len={} attribs={} {} {} {}".format( recordNumber, dataOffset, recordLength, recordAttributes, id0, id1, id2 ) )
-                    #assert recordLength <= 4096
-                    if 0:
-                        recordBytes = readRecord( recordNumber, myFile )
-                        if recordNumber < 8 or recordLength < 200:
-                            vPrint( 'Quiet', debuggingThisModule, "    {}\n    {}".format( hexlify(recordBytes), recordBytes ) )
-                        else: vPrint( 'Quiet', debuggingThisModule, "    {}".format( hexlify(recordBytes) ) )
-            #if BibleOrgSysGlobals.debugFlag:
-                #halt
-
-            # Now read the first record of actual Bible data which is the Bible header info
-            vPrint( 'Info', debuggingThisModule, "\nLoading Bible header info…" )
-            binary = readRecord( 0, myFile )
+        vPrint( 'Info', debuggingThisModule, "\n{!r} {!r} bookNumber={} bookRecordLocation={} numBookRecords={}".format( shortName, longName, bookNumber, bookRecordLocation, numBookRecords ) )
+        with open( container.sourceFilepath, 'rb' ) as myFile: # Automatically closes the file when done
+            # Read the header record
+            binary = container.readRecord( bookRecordLocation, myFile )
+            #dPrint( 'Quiet', debuggingThisModule, binary )
             byteOffset = 0
-            versionName = getBinaryString( binary, 16 ); byteOffset += 16
-            versionInfo = getBinaryString( binary[byteOffset:], 128 ); byteOffset += 128
-            separatorCharacter = getBinaryString( binary[byteOffset:], 1 ); byteOffset += 1
-            vPrint( 'Info', debuggingThisModule, repr(versionName), repr(versionInfo), repr(separatorCharacter) )
-            assert separatorCharacter == ' '
-            versionAttribute, wordIndexIndex, numWordListRecords, numBooks = struct.unpack( ">BHHH",  binary[byteOffset:byteOffset+7] ); byteOffset += 7
-            #dPrint( 'Quiet', debuggingThisModule, "  versionAttribute =",versionAttribute )
-            copyProtectedFlag = versionAttribute & 1
-            byteShiftedFlag = not versionAttribute & 2
-            RTLFlag = versionAttribute & 4
-            if BibleOrgSysGlobals.verbosityLevel > 1:
-                if copyProtectedFlag: vPrint( 'Quiet', debuggingThisModule, " Copy protected!" ); halt
-                else: vPrint( 'Quiet', debuggingThisModule, " Not copy protected." )
-                if byteShiftedFlag: vPrint( 'Quiet', debuggingThisModule, "  BYTE SHIFTED! # See http://en.wikipedia.org/wiki/Shift_JIS for Japanese" )
-                else: vPrint( 'Quiet', debuggingThisModule, " Not byte shifted." )
-                if RTLFlag: vPrint( 'Quiet', debuggingThisModule, " Right-aligned (RTL languages)!" ); halt
-                else: vPrint( 'Quiet', debuggingThisModule, " Left-aligned (LTR languages)." )
-                if BibleOrgSysGlobals.verbosityLevel > 3:
-                    vPrint( 'Quiet', debuggingThisModule, "  wordIndexIndex={} numWordListRecords={} numBooks={}".format( wordIndexIndex, numWordListRecords, numBooks ) )
-            bookIndexMetadata = []
-            for n in range(  0, numBooks ):
-                bookNumber, bookRecordLocation, numBookRecords = struct.unpack( ">HHH",  binary[byteOffset:byteOffset+6] ); byteOffset += 6
-                shortName = getBinaryString( binary[byteOffset:], 8 ); byteOffset += 8
-                longName = getBinaryString( binary[byteOffset:], 32 ); byteOffset += 32
-                if BibleOrgSysGlobals.verbosityLevel > 3:
-                    vPrint( 'Quiet', debuggingThisModule, '    Book {:2}: {!r} {!r} bkNum={} loc={} numBookRecords={}'.format( n+1, shortName, longName, bookNumber, bookRecordLocation, numBookRecords ) )
-                bookIndexMetadata.append( (shortName, longName, bookNumber, bookRecordLocation, numBookRecords) )
+            numChapters, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+            #dPrint( 'Quiet', debuggingThisModule, longName, "numChapters", numChapters )
+            accumulatedVersesList = []
+            for c in range( numChapters ):
+                accumulatedVerses, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+                accumulatedVersesList.append( accumulatedVerses )
+                #dPrint( 'Quiet', debuggingThisModule, c+1, accumulatedVerses, "accumulatedVerses" )
+            accumulatedTokensPerChapterList = []
+            for c in range( numChapters ):
+                accumulatedTokensPerChapter, = struct.unpack( ">I",  binary[byteOffset:byteOffset+4] ); byteOffset += 4
+                #dPrint( 'Quiet', debuggingThisModule, c+1, accumulatedTokensPerChapter, "accumulatedTokensPerChapter" )
+                accumulatedTokensPerChapterList.append( accumulatedTokensPerChapter )
+            accumulatedTokensPerVerseList = []
+            totalAccumulatedVerses = 0
+            for n in range( accumulatedVerses ):
+                accumulatedTokensPerVerse, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+                #dPrint( 'Quiet', debuggingThisModule, n+1, accumulatedTokensPerVerse, "accumulatedTokensPerVerse" )
+                accumulatedTokensPerVerseList.append( accumulatedTokensPerVerse )
+                totalAccumulatedVerses += accumulatedTokensPerVerse
+            if debuggingThisModule:
+                vPrint( 'Quiet', debuggingThisModule, "accumulatedVerses", len(accumulatedVersesList), accumulatedVersesList )
+                vPrint( 'Quiet', debuggingThisModule, "accumulatedTokensPerChapter", len(accumulatedTokensPerChapterList), accumulatedTokensPerChapterList )
+                vPrint( 'Quiet', debuggingThisModule, "accumulatedTokensPerVerse", len(accumulatedTokensPerVerseList), accumulatedTokensPerVerseList )
+            assert len(accumulatedTokensPerVerseList) == accumulatedVerses
+            #dPrint( 'Quiet', debuggingThisModule, "Acc V & T", totalAccumulatedVerses, accumulatedTokensPerChapter )
             assert byteOffset == len(binary)
-            #if BibleOrgSysGlobals.debugFlag:
-                #dPrint( 'Quiet', debuggingThisModule, "bookIndexMetadata", len(bookIndexMetadata), bookIndexMetadata )
-                #halt
-
-            # Now load the word lists
-            loadWordlists()
-            numWords = len(words)
-            dPrint( 'Never', debuggingThisModule, "numWords =", numWords )
-            #if BibleOrgSysGlobals.debugFlag:
-                #dPrint( 'Quiet', debuggingThisModule, "words", numWords, words[:200], words[-80:] )
-                #halt
 
-            # Now read in the Bible book chapter/verse data
-            vPrint( 'Normal', debuggingThisModule, _("Loading Bible book chapter/verse lists…") )
-            ## There seems to be no absolute standard for these :-(
-            #convertSNtoBBB = {'GE':'GEN', 'EX':'EXO', 'DTN':'DEU', '1SAM':'SA1', '2SAM':'SA2', '1SA':'SA1', '2SA':'SA2', '1KI':'KI1', '2KI':'KI2',
-                            #'1CHR':'CH1', '2CHR':'CH2', '1CH':'CH1', '2CH':'CH2', 'PS':'PSA', 'PRV':'PRO', 'SONG':'SNG', 'EZK':'EZE', 'JOEL':'JOL',
-                            #'AM':'AMO', 'NAM':'NAH', 'OBD':'OBA', 'JON':'JNA', 'MI':'MIC',
-                            #'MT':'MAT', 'MK':'MRK', 'LK':'LUK', 'JOHN':'JHN', '1COR':'CO1', '2COR':'CO2', '1CO':'CO1', '2CO':'CO2',
-                            #'PHIL':'PHP', '1THESS':'TH1', '2THESS':'TH2', '1TH':'TH1', '2TH':'TH2', '1TIM':'TI1', '2TIM':'TI2', '1TI':'TI1', '2TI':'TI2',
-                            #'JAS':'JAM', 'PHLM':'PHM', '1PET':'PE1', '2PET':'PE2', '1PE':'PE1', '2PE':'PE2', '1JO':'JN1', '2JO':'JN2', '3JO':'JN3', '1JN':'JN1', '2JN':'JN2', '3JN':'JN3',
-                            #'JUDE':'JDE', 'JUD':'JDE', }
-            #convertBNtoBBB = {10:'GEN', 20:'EXO', 30:'LEV', 40:'NUM', 50:'DEU', '1SAM':'SA1', '2SAM':'SA2', '1SA':'SA1', '2SA':'SA2', '1KI':'KI1', '2KI':'KI2',
-                            #'1CHR':'CH1', '2CHR':'CH2', '1CH':'CH1', '2CH':'CH2', 'PS':'PSA', 'PRV':'PRO', 'SONG':'SNG', 'EZK':'EZE', 'JOEL':'JOL',
-                            #'AM':'AMO', 'NAM':'NAH', 'OBD':'OBA', 'JON':'JNA', 'MI':'MIC',
-                            #'MT':'MAT', 'MK':'MRK', 'LK':'LUK', 'JOHN':'JHN', '1COR':'CO1', '2COR':'CO2', '1CO':'CO1', '2CO':'CO2',
-                            #'PHIL':'PHP', '1THESS':'TH1', '2THESS':'TH2', '1TH':'TH1', '2TH':'TH2', '1TIM':'TI1', '2TIM':'TI2', '1TI':'TI1', '2TI':'TI2',
-                            #'JAS':'JAM', 'PHLM':'PHM', '1PET':'PE1', '2PET':'PE2', '1PE':'PE1', '2PE':'PE2', '1JO':'JN1', '2JO':'JN2', '3JO':'JN3', '1JN':'JN1', '2JN':'JN2', '3JN':'JN3',
-                            #'JUDE':'JDE', 'JUD':'JDE', }
-            for shortName, longName, bookNumber, bookRecordLocation, numBookRecords in bookIndexMetadata:
-                vPrint( 'Info', debuggingThisModule, "\n{!r} {!r} bookNumber={} bookRecordLocation={} numBookRecords={}".format( shortName, longName, bookNumber, bookRecordLocation, numBookRecords ) )
-                #myFile.seek( mainDBIndex[bookRecordLocation] )
-                #binary = myFile.read( 102400 )
-                # Read the header record
-                binary = readRecord( bookRecordLocation, myFile )
-                #dPrint( 'Quiet', debuggingThisModule, binary )
-                byteOffset = 0
-                numChapters, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                #dPrint( 'Quiet', debuggingThisModule, longName, "numChapters", numChapters )
-                accumulatedVersesList = []
-                for c in range( numChapters ):
-                    accumulatedVerses, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    accumulatedVersesList.append( accumulatedVerses )
-                    #dPrint( 'Quiet', debuggingThisModule, c+1, accumulatedVerses, "accumulatedVerses" )
-                accumulatedTokensPerChapterList = []
-                for c in range( numChapters ):
-                    accumulatedTokensPerChapter, = struct.unpack( ">I",  binary[byteOffset:byteOffset+4] ); byteOffset += 4
-                    #dPrint( 'Quiet', debuggingThisModule, c+1, accumulatedTokensPerChapter, "accumulatedTokensPerChapter" )
-                    accumulatedTokensPerChapterList.append( accumulatedTokensPerChapter )
-                accumulatedTokensPerVerseList = []
-                totalAccumulatedVerses = 0
-                for n in range( accumulatedVerses ):
-                    accumulatedTokensPerVerse, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    #dPrint( 'Quiet', debuggingThisModule, n+1, accumulatedTokensPerVerse, "accumulatedTokensPerVerse" )
-                    accumulatedTokensPerVerseList.append( accumulatedTokensPerVerse )
-                    totalAccumulatedVerses += accumulatedTokensPerVerse
-                if debuggingThisModule:
-                    vPrint( 'Quiet', debuggingThisModule, "accumulatedVerses", len(accumulatedVersesList), accumulatedVersesList )
-                    vPrint( 'Quiet', debuggingThisModule, "accumulatedTokensPerChapter", len(accumulatedTokensPerChapterList), accumulatedTokensPerChapterList )
-                    vPrint( 'Quiet', debuggingThisModule, "accumulatedTokensPerVerse", len(accumulatedTokensPerVerseList), accumulatedTokensPerVerseList )
-                assert len(accumulatedTokensPerVerseList) == accumulatedVerses
-                #dPrint( 'Quiet', debuggingThisModule, "Acc V & T", totalAccumulatedVerses, accumulatedTokensPerChapter )
-                assert byteOffset == len(binary)
-
-                # Find total characters
-                #totalCharacters = 0
-                #for accumulatedVerses in accumulatedVersesList:
-                    #totalCharacters += accumulatedTokensPerVerseList[accumulatedVerses]
-                totalCharacters = accumulatedTokensPerChapterList[-1] + accumulatedTokensPerVerseList[-1]
-                #dPrint( 'Quiet', debuggingThisModule, "totalCharacters", totalCharacters )
-
-                # Read the Bible word data records
-                vPrint( 'Info', debuggingThisModule, "\nReading {}{} Bible words for {} {}/{}…".format( totalCharacters, ' byte-shifted' if byteShiftedFlag else '', name, shortName, longName ) )
-                BBB = None
-                if bookNumber % 10 == 0:
-                    if bookNumber <= 160:
-                        BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( bookNumber / 10 )
-                    elif bookNumber == 170: BBB = 'TOB'
-                    elif bookNumber == 180: BBB = 'JDT'
-                    elif bookNumber == 190: BBB = 'EST'
-                    elif 220 <= bookNumber <= 260:
-                        BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-40) / 10 )
-                    elif 290 <= bookNumber <= 310:
-                        BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-60) / 10 )
-                    elif bookNumber == 320: BBB = 'BAR'
-                    elif 330 <= bookNumber <= 730:
-                        BBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( (bookNumber-70) / 10 )
-                elif bookNumber == 315: BBB = 'LJE'
-                #BBB = convertBNtoBBB[bookNumber]
-                #shortNameUpper = shortName.upper()
-                #BBB = convertSNtoBBB[shortNameUpper] if shortNameUpper in convertSNtoBBB else shortNameUpper
-                vPrint( 'Info', debuggingThisModule, " Loading {} {}…".format( name, BBB ) )
-                #if self.name == 'kjv' and BBB=='GAL': continue
-                thisBook = BibleBook( self, BBB )
-                thisBook.objectNameString = 'Palm Bible Book object'
-                thisBook.objectTypeString = 'Palm'
-                #thisBook.addLine( 'id', BBB ) # Would need to be USFM code not BBB!
-                thisBook.addLine( 'h', longName )
-                thisBook.addLine( 'toc1', longName )
-                thisBook.addLine( 'toc1', longName )
-                thisBook.addLine( 'toc3', shortName )
-                hadP = False
-
-                C = V = 0
-                nextRecordNumber = bookRecordLocation+1
-                accumulatedVerseCount = verseCount = recordCount = 0
-                remainder14count = remainder14bits = 0
-                byteOffset = 0
-                binary = b''
-                verse = ''
-                for j in range( totalCharacters ):
-                    #if BBB=='EXO' and V==3: halt
-                    #dPrint( 'Quiet', debuggingThisModule, self.name )
-                    #if (name == 'kjv' and BBB=='GAL' and V>5) \
-                    #or (name == 'kjv' and BBB=='TI2' and V>24) \
-                    #or (name in ('hcsba','i_tb','AYT','i_bis',) and BBB=='GAL' and V>24):
-                        #logging.error( "PalmDBBible: Aborted book {} at {}:{} because of formatting issue".format( BBB, C, V ) )
-                        #loadErrors.append( _("PalmDBBible: Aborted book {} at {}:{} because of formatting issue").format( BBB, C, V ) )
-                        #thisBook.addPriorityError( 50, C, V, _("Aborted load because of decoding issue") )
-                        #break # WHY does it fail???
-                    if byteOffset+1 >= len(binary) + int(remainder14count/8) \
-                    and bookRecordLocation+recordCount+1 < len(mainDBIndex): # Need to continue to the next record
-                        #binary += myFile.read( 256 ) # These records are assumed here to be contiguous
-                        binary += readRecord( bookRecordLocation+recordCount+1, myFile )
-                        recordCount += 1
-                        if debuggingThisModule:
-                            vPrint( 'Quiet', debuggingThisModule, "Record {}/{}".format( recordCount, numBookRecords ) )
-                            vPrint( 'Quiet', debuggingThisModule, "BibleWords {}/{}={}…".format( byteOffset, len(binary), hexlify(binary[byteOffset:byteOffset+32]) ) )
-                        #byteOffset = 0
-                        #if j==0:
-                            #assert binary[byteOffset:byteOffset+2] == b'\xFF\xFF'
-                            #byteOffset = 2
-                    if byteShiftedFlag:
-                        #dPrint( 'Quiet', debuggingThisModule, "offset", byteOffset, hexlify(binary[byteOffset:byteOffset+4]) )
-                        ix, bytesUsed = get14( binary[byteOffset:byteOffset+2] )
-                        byteOffset += bytesUsed
-                        if ix >= 0x3FF0: ix = ix | 0xC000 # To get it into the original range
-                    else: ix, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
-                    vPrint( 'Never', debuggingThisModule, "  here bO was {} ix={:04x}={}".format( byteOffset-2, ix, ix ) )
-                    if ix > len(words):
-                        #dPrint( 'Quiet', debuggingThisModule, "Got HUGE ix {:04x} {}/{}".format( ix, ix, len(words) ) )
-                        #ix = ix | 0xC000 # To get it into the original range
-                        #assert 0xFFFC <= ix <= 0xFFFF
-                        if   ix == 0xFFFF: word = '<BOOK>'
-                        elif ix == 0xFFFE: word = '<CHAPTER>'
-                        elif ix == 0xFFFD: word = '<DESC>'
-                        elif ix == 0xFFFC: word = '<VERSE>'
-                        #elif ix == 0xFFF4: word = '<44444>'
-                        else:
-                            if debuggingThisModule:
-                                vPrint( 'Quiet', debuggingThisModule, "\n\n\nGot HUGE ix {:04x} {}/{} @ {}/{}".format( ix, ix, len(words), byteOffset, len(binary) ) )
-                            word = '<UNKNOWN>'
-                            if debuggingThisModule: halt
-                            #if C==0: C = 1
-                        #dPrint( 'Quiet', debuggingThisModule, "{} {}:{} tC={} vC={} acc={} {!r}".format( BBB, C, V, j, verseCount, accumulatedTokensPerVerseList[verseCount], verse ) )
+            # Find total characters
+            #totalCharacters = 0
+            #for accumulatedVerses in accumulatedVersesList:
+                #totalCharacters += accumulatedTokensPerVerseList[accumulatedVerses]
+            totalCharacters = accumulatedTokensPerChapterList[-1] + accumulatedTokensPerVerseList[-1]
+            #dPrint( 'Quiet', debuggingThisModule, "totalCharacters", totalCharacters )
+
+            # Read the Bible word data records
+            vPrint( 'Info', debuggingThisModule, "\nReading {}{} Bible words for {} {}/{}…".format( totalCharacters, ' byte-shifted' if byteShiftedFlag else '', container.PDBName, shortName, longName ) )
+            vPrint( 'Info', debuggingThisModule, " Loading {} {}…".format( container.PDBName, BBB ) )
+            #self.addLine( 'id', BBB ) # Would need to be USFM code not BBB!
+            self.addLine( 'h', longName )
+            self.addLine( 'toc1', longName )
+            self.addLine( 'toc1', longName )
+            self.addLine( 'toc3', shortName )
+
+            C = V = 0
+            nextRecordNumber = bookRecordLocation+1
+            accumulatedVerseCount = verseCount = recordCount = 0
+            remainder14count = remainder14bits = 0
+            byteOffset = 0
+            binary = b''
+            verse = ''
+            for j in range( totalCharacters ):
+                #if BBB=='EXO' and V==3: halt
+                #dPrint( 'Quiet', debuggingThisModule, self.name )
+                #if (name == 'kjv' and BBB=='GAL' and V>5) \
+                #or (name == 'kjv' and BBB=='TI2' and V>24) \
+                #or (name in ('hcsba','i_tb','AYT','i_bis',) and BBB=='GAL' and V>24):
+                    #logging.error( "PalmDBBible: Aborted book {} at {}:{} because of formatting issue".format( BBB, C, V ) )
+                    #loadErrors.append( _("PalmDBBible: Aborted book {} at {}:{} because of formatting issue").format( BBB, C, V ) )
+                    #self.addPriorityError( 50, C, V, _("Aborted load because of decoding issue") )
+                    #break # WHY does it fail???
+                if byteOffset+1 >= len(binary) + int(remainder14count/8) \
+                and bookRecordLocation+recordCount+1 < len(mainDBIndex): # Need to continue to the next record
+                    #binary += myFile.read( 256 ) # These records are assumed here to be contiguous
+                    binary += container.readRecord( bookRecordLocation+recordCount+1, myFile )
+                    recordCount += 1
+                    if debuggingThisModule:
+                        vPrint( 'Quiet', debuggingThisModule, "Record {}/{}".format( recordCount, numBookRecords ) )
+                        vPrint( 'Quiet', debuggingThisModule, "BibleWords {}/{}={}…".format( byteOffset, len(binary), hexlify(binary[byteOffset:byteOffset+32]) ) )
+                    #byteOffset = 0
+                    #if j==0:
+                        #assert binary[byteOffset:byteOffset+2] == b'\xFF\xFF'
+                        #byteOffset = 2
+                if byteShiftedFlag:
+                    #dPrint( 'Quiet', debuggingThisModule, "offset", byteOffset, hexlify(binary[byteOffset:byteOffset+4]) )
+                    ix, bytesUsed = get14( binary[byteOffset:byteOffset+2] )
+                    byteOffset += bytesUsed
+                    if ix >= 0x3FF0: ix = ix | 0xC000 # To get it into the original range
+                else: ix, = struct.unpack( ">H",  binary[byteOffset:byteOffset+2] ); byteOffset += 2
+                vPrint( 'Never', debuggingThisModule, "  here bO was {} ix={:04x}={}".format( byteOffset-2, ix, ix ) )
+                if ix > len(words):
+                    #dPrint( 'Quiet', debuggingThisModule, "Got HUGE ix {:04x} {}/{}".format( ix, ix, len(words) ) )
+                    #ix = ix | 0xC000 # To get it into the original range
+                    #assert 0xFFFC <= ix <= 0xFFFF
+                    if   ix == 0xFFFF: word = '<BOOK>'
+                    elif ix == 0xFFFE: word = '<CHAPTER>'
+                    elif ix == 0xFFFD: word = '<DESC>'
+                    elif ix == 0xFFFC: word = '<VERSE>'
+                    #elif ix == 0xFFF4: word = '<44444>'
                     else:
-                        if ix == 0: word = ''
-                        else: word = words[ix-1]
-                    vPrint( 'Never', debuggingThisModule, "  {} {}:{} {}word={!r}".format( BBB, C, V, 'compressed ' if ix>numWords else '', word ) )
-                    for wordBit in word.split(): # Handle each part of combined words separately to ensure correct handling of each part
-                        if wordBit.startswith( '<BOOK>' ):
-                            #dPrint( 'Quiet', debuggingThisModule, "\n<BOOK>" )
-                            #if not word.startswith( '<BOOK>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
-                            if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                            C = V = 0
-                        elif wordBit.startswith( '<CHAPTER>' ):
-                            #dPrint( 'Quiet', debuggingThisModule, "\n<CHAPTER>" )
-                            #if not word.startswith( '<CHAPTER>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
-                            if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                            accumulatedVerseCount += verseCount
-                            verseCount = 0
-                            C += 1; V = 0
-                        elif wordBit.startswith( '<DESC>' ):
-                            vPrint( 'Never', debuggingThisModule, "\n<DESC>" )
-                            #if not word.startswith( '<DESC>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
-                            if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                        elif wordBit.startswith( '<VERSE>' ):
-                            #dPrint( 'Quiet', debuggingThisModule, "\n<VERSE>" )
-                            #if not word.startswith( '<VERSE>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
-                            if C==0: C = 1; vPrint( 'Quiet', debuggingThisModule, "Correct C to one!" )
-                            if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                            if V==0: V = 1
-                        elif wordBit.startswith( '<UNKNOWN>' ):
-                            vPrint( 'Never', debuggingThisModule, "\n<UNKNOWN>" )
-                            if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                        verse += wordBit + separatorCharacter
-                    #dPrint( 'Quiet', debuggingThisModule, repr(word), repr(verse) )
-                    #dPrint( 'Quiet', debuggingThisModule, "{} {}:{} tC={} vC={} acc={} {!r}".format( BBB, C, V, j, verseCount, accumulatedTokensPerVerseList[verseCount], word ) )
-                    maxCount = accumulatedTokensPerVerseList[verseCount+accumulatedVerseCount]
-                    if C > 1: maxCount += accumulatedTokensPerChapterList[C-1]
-                    #dPrint( 'Quiet', debuggingThisModule, "cC={} vC={} mC={}".format( accumulatedVerseCount, verseCount, maxCount ) )
-                    if j+1 >= maxCount:
+                        if debuggingThisModule:
+                            vPrint( 'Quiet', debuggingThisModule, "\n\n\nGot HUGE ix {:04x} {}/{} @ {}/{}".format( ix, ix, len(words), byteOffset, len(binary) ) )
+                        word = '<UNKNOWN>'
+                        if debuggingThisModule: halt
+                        #if C==0: C = 1
+                    #dPrint( 'Quiet', debuggingThisModule, "{} {}:{} tC={} vC={} acc={} {!r}".format( BBB, C, V, j, verseCount, accumulatedTokensPerVerseList[verseCount], verse ) )
+                else:
+                    if ix == 0: word = ''
+                    else: word = words[ix-1]
+                vPrint( 'Never', debuggingThisModule, "  {} {}:{} {}word={!r}".format( BBB, C, V, 'compressed ' if ix>numWords else '', word ) )
+                for wordBit in word.split(): # Handle each part of combined words separately to ensure correct handling of each part
+                    if wordBit.startswith( '<BOOK>' ):
+                        #dPrint( 'Quiet', debuggingThisModule, "\n<BOOK>" )
+                        #if not word.startswith( '<BOOK>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
                         if verse: saveSegment( BBB, C, V, verse ); verse = ''
-                        verseCount += 1
-                        V += 1
-                    if 'throne of God and of the Lamb . In the midst of the street' in verse:
-                        if BibleOrgSysGlobals.verbosityLevel > 1:
-                            vPrint( 'Quiet', debuggingThisModule, "Handle Rev 22:1-2 special case in KJV", repr(verse) )
-                        logging.warning( "PalmDBBible: Handled special verse-split case for Rev 22:1-2" )
-                        loadErrors.append( _("PalmDBBible: Handled special verse-split case for Rev 22:1-2") )
-                        thisBook.addPriorityError( 10, C, V, _("Handled special verse-split case for Rev 22:1-2") )
-                        bits = verse.split( '.', 1 )
-                        saveSegment( BBB, C, V, bits[0]+'.' )
-                        verse = bits[1]
-                        #verseCount += 1
-                        V += 1
-                    #tokenCount += 1
-                    #if len(verse)>200: vPrint( 'Quiet', debuggingThisModule, repr(verse) ); halt
-                #dPrint( 'Quiet', debuggingThisModule, "verse", repr(verse[:100]) )
-                #dPrint( 'Quiet', debuggingThisModule, "Done", byteOffset, len(binary) )
-                #assert byteOffset == len(binary)
-                self.stashBook( thisBook )
-            #if BibleOrgSysGlobals.debugFlag:
-                #halt
+                        C = V = 0
+                    elif wordBit.startswith( '<CHAPTER>' ):
+                        #dPrint( 'Quiet', debuggingThisModule, "\n<CHAPTER>" )
+                        #if not word.startswith( '<CHAPTER>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
+                        if verse: saveSegment( BBB, C, V, verse ); verse = ''
+                        accumulatedVerseCount += verseCount
+                        verseCount = 0
+                        C += 1; V = 0
+                    elif wordBit.startswith( '<DESC>' ):
+                        vPrint( 'Never', debuggingThisModule, "\n<DESC>" )
+                        #if not word.startswith( '<DESC>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
+                        if verse: saveSegment( BBB, C, V, verse ); verse = ''
+                    elif wordBit.startswith( '<VERSE>' ):
+                        #dPrint( 'Quiet', debuggingThisModule, "\n<VERSE>" )
+                        #if not word.startswith( '<VERSE>' ): vPrint( 'Quiet', debuggingThisModule, repr(verse), '+', repr(word) ); halt
+                        if C==0: C = 1; vPrint( 'Quiet', debuggingThisModule, "Correct C to one!" )
+                        if verse: saveSegment( BBB, C, V, verse ); verse = ''
+                        if V==0: V = 1
+                    elif wordBit.startswith( '<UNKNOWN>' ):
+                        vPrint( 'Never', debuggingThisModule, "\n<UNKNOWN>" )
+                        if verse: saveSegment( BBB, C, V, verse ); verse = ''
+                    verse += wordBit + separatorCharacter
+                #dPrint( 'Quiet', debuggingThisModule, repr(word), repr(verse) )
+                #dPrint( 'Quiet', debuggingThisModule, "{} {}:{} tC={} vC={} acc={} {!r}".format( BBB, C, V, j, verseCount, accumulatedTokensPerVerseList[verseCount], word ) )
+                maxCount = accumulatedTokensPerVerseList[verseCount+accumulatedVerseCount]
+                if C > 1: maxCount += accumulatedTokensPerChapterList[C-1]
+                #dPrint( 'Quiet', debuggingThisModule, "cC={} vC={} mC={}".format( accumulatedVerseCount, verseCount, maxCount ) )
+                if j+1 >= maxCount:
+                    if verse: saveSegment( BBB, C, V, verse ); verse = ''
+                    verseCount += 1
+                    V += 1
+                if 'throne of God and of the Lamb . In the midst of the street' in verse:
+                    if BibleOrgSysGlobals.verbosityLevel > 1:
+                        vPrint( 'Quiet', debuggingThisModule, "Handle Rev 22:1-2 special case in KJV", repr(verse) )
+                    logging.warning( "PalmDBBible: Handled special verse-split case for Rev 22:1-2" )
+                    loadErrors.append( _("PalmDBBible: Handled special verse-split case for Rev 22:1-2") )
+                    self.addPriorityError( 10, C, V, _("Handled special verse-split case for Rev 22:1-2") )
+                    bits = verse.split( '.', 1 )
+                    saveSegment( BBB, C, V, bits[0]+'.' )
+                    verse = bits[1]
+                    #verseCount += 1
+                    V += 1
+                #tokenCount += 1
+                #if len(verse)>200: vPrint( 'Quiet', debuggingThisModule, repr(verse) ); halt
+            #dPrint( 'Quiet', debuggingThisModule, "verse", repr(verse[:100]) )
+            #dPrint( 'Quiet', debuggingThisModule, "Done", byteOffset, len(binary) )
+            #assert byteOffset == len(binary)
+
+        if loadErrors: self.checkResultsDictionary['Load Errors'] = loadErrors
+    # end of PalmDBBibleBook.load
+# end of class PalmDBBibleBook
 
-        if loadErrors:
-            self.checkResultsDictionary['Load Errors'] = loadErrors
 
-        self.doPostLoadProcessing()
-    # end of PalmDBBible.load
-# end of PalmDBBible class
 
 
 
@@ -43,6 +43,7 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.InputOutput.USFMFilenames import USFMFilenames
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
 from BibleOrgSys.Formats.USFMBibleBook import USFMBibleBook
 from BibleOrgSys.Bible import Bible
 
@@ -670,11 +671,18 @@ class USFMBible( Bible ):
                 BibleOrgSysGlobals.alreadyMultiprocessing = False
             else: # Just single threaded
                 # Load the books one by one -- assuming that they have regular Paratext style filenames
-                for BBB,filename in self.maximumPossibleFilenameTuples:
-                    #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
-                        #dPrint( 'Quiet', debuggingThisModule, _("  USFMBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
-                    #loadedBook = self.loadBook( BBB, filename ) # also saves it
-                    self.loadBook( BBB, filename ) # also saves it
+                #   but read the files ahead using threads (in case we're on a slow filesystem)
+                self.bookFilePrefetcher = FilePrefetcher( [os.path.join( self.sourceFolder, filename )
+                                                    for BBB,filename in self.maximumPossibleFilenameTuples] )
+                try:
+                    for BBB,filename in self.maximumPossibleFilenameTuples:
+                        #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
+                            #dPrint( 'Quiet', debuggingThisModule, _("  USFMBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
+                        #loadedBook = self.loadBook( BBB, filename ) # also saves it
+                        self.loadBook( BBB, filename ) # also saves it
+                finally:
+                    self.bookFilePrefetcher.close()
+                    self.bookFilePrefetcher = None # Can't be pickled
         else:
             logging.critical( "USFMBible: " + _("No books to load in folder '{}'!").format( self.sourceFolder ) )
         #dPrint( 'Quiet', debuggingThisModule, self.getBookList() )
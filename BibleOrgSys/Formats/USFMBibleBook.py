@@ -398,7 +398,8 @@ class USFMBibleBook( BibleBook ):
         self.sourceFilepath = os.path.join( folder, filename ) if folder else filename
         originalBook = USFMFile()
         if encoding is None: encoding = 'utf-8'
-        originalBook.read( self.sourceFilepath, encoding=encoding )
+        originalBook.read( self.sourceFilepath, encoding=encoding,
+                           prefetcher=getattr( self.containerBibleObject, 'bookFilePrefetcher', None ) )
 
         # Do some important cleaning up before we save the data
         C, V = '-1', '-1' # So first/id line starts at -1:0
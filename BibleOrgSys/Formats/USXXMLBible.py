@@ -40,14 +40,15 @@ if __name__ == '__main__':
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.InputOutput.USXFilenames import USXFilenames
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
 from BibleOrgSys.Formats.USXXMLBibleBook import USXXMLBibleBook
 from BibleOrgSys.Bible import Bible
 
 
-LAST_MODIFIED_DATE = '2020-11-08' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "USXXMLBibleHandler"
 PROGRAM_NAME = "USX XML Bible handler"
-PROGRAM_VERSION = '0.39'
+PROGRAM_VERSION = '0.41'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -322,8 +323,15 @@ class USXXMLBible( Bible ):
             BibleOrgSysGlobals.alreadyMultiprocessing = False
         else: # Just single threaded
             #dPrint( 'Quiet', debuggingThisModule, self.USXFilenamesObject.getConfirmedFilenameTuples() ); halt
-            for BBB,filename in self.possibleFilenameDict.items():
-                self.loadBook( BBB, filename ) # also saves it
+            #   but read the files ahead using threads (in case we're on a slow filesystem)
+            self.bookFilePrefetcher = FilePrefetcher( [os.path.join( self.givenFolderName, filename )
+                                                for filename in self.possibleFilenameDict.values()] )
+            try:
+                for BBB,filename in self.possibleFilenameDict.items():
+                    self.loadBook( BBB, filename ) # also saves it
+            finally:
+                self.bookFilePrefetcher.close()
+                self.bookFilePrefetcher = None # Can't be pickled
                 #UBB = USXXMLBibleBook( self, BBB )
                 #UBB.load( filename, self.givenFolderName, self.encoding )
                 #UBB.validateMarkers()
@@ -489,12 +497,12 @@ def createUSXXMLBible( self, outputFolderpath, controlDict, validationSchema ) -
 
     If a schema is given (either a path or URL), the XML output files are validated.
     """
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import zipFolder
     import tarfile
 
     from BibleOrgSys.Internals.InternalBibleInternals import BOS_ADDED_NESTING_MARKERS
     from BibleOrgSys.Reference.USFM3Markers import USFM_PRECHAPTER_MARKERS
-    from BibleOrgSys.InputOutput.MLWriter import MLWriter
+    from BibleOrgSys.InputOutput.MLWriter import MLWriter, validateMLWriters
     from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem
     from BibleOrgSys.Reference.BibleReferences import BibleReferenceList
 
@@ -1016,7 +1024,7 @@ def createUSXXMLBible( self, outputFolderpath, controlDict, validationSchema ) -
             xw.writeLineClose( 'para' )
         xw.writeLineClose( 'usx' )
         xw.close( writeFinalNL=False ) # Try to imitate Paratext output as closely as possible
-        if validationSchema: return xw.validate( validationSchema ) # Returns a 3-tuple: intCode, logString, errorLogString
+        return xw # so it can be validated later
     # end of toUSXXML.writeUSX3Book
 
     # Set-up our Bible reference system
@@ -1031,14 +1039,22 @@ def createUSXXMLBible( self, outputFolderpath, controlDict, validationSchema ) -
     #USXOutputFolder = BibleOrgSysGlobals.DEFAULT_WRITEABLE_OUTPUT_FOLDERPATH.joinpath( "USX output/' )
     #if not os.access( USXOutputFolder, os.F_OK ): os.mkdir( USXOutputFolder ) # Make the empty folder if there wasn't already one there
 
-    validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+    bookWriters = []
     for BBB,bookData in self.books.items():
-        bookResults = writeUSX3Book( BBB, bookData )
-        if validationSchema:
-            if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
-            if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
-            if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
-    if validationSchema:
+        bookWriter = writeUSX3Book( BBB, bookData )
+        if bookWriter is not None: bookWriters.append( bookWriter )
+    validationResults = ( 0, '', '', ) # xmllint result code, program output, error output
+    if validationSchema: # Validate all the books together (so the schema is only compiled once)
+        allBookResults = validateMLWriters( bookWriters, validationSchema )
+        if None in allBookResults: # Don't pretend that they all validated
+            logger.error( "createUSXXMLBible: Unable to validate {} of {} books against {}".format( allBookResults.count( None ), len(allBookResults), validationSchema ) )
+            validationResults = None
+        else:
+            for bookResults in allBookResults:
+                if bookResults[0] > validationResults[0]: validationResults = ( bookResults[0], validationResults[1], validationResults[2], )
+                if bookResults[1]: validationResults = ( validationResults[0], validationResults[1] + bookResults[1], validationResults[2], )
+                if bookResults[2]: validationResults = ( validationResults[0], validationResults[1], validationResults[2] + bookResults[2], )
+    if validationSchema and validationResults is not None:
         if validationResults[0] > 0:
             with open( os.path.join( outputFolderpath, 'ValidationErrors.txt' ), 'wt', encoding='utf-8' ) as veFile:
                 if validationResults[1]: veFile.write( validationResults[1] + '\n\n\n' ) # Normally empty
@@ -1055,29 +1071,25 @@ def createUSXXMLBible( self, outputFolderpath, controlDict, validationSchema ) -
         vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled toUSXXML books were {}").format( unhandledBooks ) )
 
     # Now create a zipped collection
-    vPrint( 'Info', debuggingThisModule, "  Zipping USX3 files…" )
-    zf = zipfile.ZipFile( os.path.join( outputFolderpath, 'AllUSX3Files.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
-    for filename in os.listdir( filesFolder ):
-        #if not filename.endswith( '.zip' ):
-        filepath = os.path.join( filesFolder, filename )
-        zf.write( filepath, filename ) # Save in the archive without the path
-    zf.close()
-    # Now create the gzipped file
-    vPrint( 'Info', debuggingThisModule, "  GZipping USX3 files…" )
-    tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX3Files.gzip' ), 'w:gz' )
-    for filename in os.listdir( filesFolder ):
-        if filename.endswith( '.usx' ):
-            filepath = os.path.join( filesFolder, filename )
-            tar.add( filepath, arcname=filename, recursive=False )
-    tar.close()
-    # Now create the bz2 file
-    vPrint( 'Info', debuggingThisModule, "  BZipping USX3 files…" )
-    tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX3Files.bz2' ), 'w:bz2' )
-    for filename in os.listdir( filesFolder ):
-        if filename.endswith( '.usx' ):
-            filepath = os.path.join( filesFolder, filename )
-            tar.add( filepath, arcname=filename, recursive=False )
-    tar.close()
+    if self.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping USX3 files…" )
+        zipFolder( os.path.join( outputFolderpath, 'AllUSX3Files.zip' ), filesFolder, excludeExtensions=() )
+        # Now create the gzipped file
+        vPrint( 'Info', debuggingThisModule, "  GZipping USX3 files…" )
+        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX3Files.gzip' ), 'w:gz' )
+        for filename in os.listdir( filesFolder ):
+            if filename.endswith( '.usx' ):
+                filepath = os.path.join( filesFolder, filename )
+                tar.add( filepath, arcname=filename, recursive=False )
+        tar.close()
+        # Now create the bz2 file
+        vPrint( 'Info', debuggingThisModule, "  BZipping USX3 files…" )
+        tar = tarfile.open( os.path.join( outputFolderpath, 'AllUSX3Files.bz2' ), 'w:bz2' )
+        for filename in os.listdir( filesFolder ):
+            if filename.endswith( '.usx' ):
+                filepath = os.path.join( filesFolder, filename )
+                tar.add( filepath, arcname=filename, recursive=False )
+        tar.close()
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.toUSXXML finished successfully." )
@@ -521,7 +521,12 @@ class USXXMLBibleBook( BibleBook ):
         self.sourceFilename = filename
         self.sourceFolder = folder
         self.sourceFilepath = os.path.join( folder, filename ) if folder else filename
-        try: self.XMLTree = ElementTree().parse( self.sourceFilepath )
+        prefetcher = getattr( self.containerBibleObject, 'bookFilePrefetcher', None )
+        try:
+            if prefetcher is None: self.XMLTree = ElementTree().parse( self.sourceFilepath )
+            else:
+                with prefetcher.openBinary( self.sourceFilepath ) as XMLFile:
+                    self.XMLTree = ElementTree().parse( XMLFile )
         except ParseError as err:
             logging.critical( "Loader parse error in xml file {}: {} {}".format( filename, sys.exc_info()[0], err ) )
             loadErrors.append( "Loader parse error in xml file {}: {} {}".format( filename, sys.exc_info()[0], err ) )
@@ -49,11 +49,15 @@ e.g.,
     And God calleth to the expanse `Heavens;' and there is an evening, and there is a morning--day second.<CM>
 """
 from gettext import gettext as _
+from typing import Dict, Optional, Tuple
 import logging
 import os
 from pathlib import Path
 import re
 import multiprocessing
+from array import array
+from itertools import accumulate
+from types import MappingProxyType
 
 if __name__ == '__main__':
     import sys
@@ -69,17 +73,15 @@ from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisational
 from BibleOrgSys.Bible import Bible, BibleBook
 
 
-LAST_MODIFIED_DATE = '2020-04-18' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "theWordBible"
 PROGRAM_NAME = "theWord Bible format handler"
-PROGRAM_VERSION = '0.55'
+PROGRAM_VERSION = '0.57'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
-BOS = None
-
 filenameEndingsToAccept = ('.OT','.NT','.ONT','.OTX','.NTX','.ONTX',) # Must be UPPERCASE
 
 
@@ -220,6 +222,105 @@ def theWordBibleFileCheck( givenFolderName, strictCheck:bool=True, autoLoad:bool
 
 
 
+def getTheWordVolumeType( fileExtension:str ) -> str:
+    """
+    Given a theWord file extension, e.g., '.ont'
+        return the volumeType ('OT', 'NT', or 'BOTH').
+    """
+    fileExtensionUpper = fileExtension.upper()
+    if fileExtensionUpper in ('.OT','.OTX',): return 'OT'
+    if fileExtensionUpper in ('.NT','.NTX',): return 'NT'
+    return 'BOTH'
+# end of getTheWordVolumeType
+
+
+
+class theWordVerseTable:
+    """
+    An immutable table of the verse for each line of a theWord module
+        (for one volume type, i.e., 'OT', 'NT', or 'BOTH')
+        so that the line number <-> (BBB,C,V) mapping is just a lookup in either direction.
+
+    Use getTheWordVerseTable (below) rather than making these directly.
+    """
+    def __init__( self, volumeType:str ) -> None:
+        """
+        Make the table from the GENERIC-KJV-66-ENG versification system.
+        """
+        fnPrint( debuggingThisModule, f"theWordVerseTable.__init__( {volumeType} )" )
+        assert volumeType in ('OT','NT','BOTH',)
+        if volumeType == 'OT': books, bookLines = theWordOTBooks, theWordOTBookLines
+        elif volumeType == 'NT': books, bookLines = theWordNTBooks, theWordNTBookLines
+        elif volumeType == 'BOTH': books, bookLines = theWordBooks, theWordBookLines
+
+        BOS = BibleOrganisationalSystem( 'GENERIC-KJV-66-ENG' )
+        lineBCVs, bookRanges = [], {}
+        for BBB, numLines in zip( books, bookLines ):
+            firstLineNumber = len(lineBCVs)
+            for C, numVerses in enumerate( BOS.getNumVersesList( BBB ), start=1 ):
+                lineBCVs.extend( (BBB,C,V) for V in range( 1, numVerses+1 ) )
+            assert len(lineBCVs) - firstLineNumber == numLines
+            bookRanges[BBB] = range( firstLineNumber, len(lineBCVs) )
+
+        self.volumeType, self.books = volumeType, tuple( books )
+        self.lineBCVs = tuple( lineBCVs ) # Indexed by the line number (0… )
+        self.totalLines = len( self.lineBCVs )
+        self.BCVLines = MappingProxyType( { BCV:lineNumber for lineNumber,BCV in enumerate( self.lineBCVs ) } )
+        self.bookRanges = MappingProxyType( bookRanges )
+        self.bookLastLines = frozenset( bookRange[-1] for bookRange in bookRanges.values() )
+    # end of theWordVerseTable.__init__
+
+
+    def __str__( self ) -> str:
+        return f"theWordVerseTable for {self.volumeType} with {self.totalLines:,} lines in {len(self.books)} books"
+    def __len__( self ) -> int:
+        return self.totalLines
+
+
+    def getBBBCV( self, lineNumber:int ) -> Tuple[str,int,int]:
+        """
+        Given a line number (0… )
+            return BBB, C, V 3-tuple.
+
+        if lineNumber is beyond the verse lines, returns BBB='MDA' for metadata
+        """
+        if lineNumber >= self.totalLines: return 'MDA', 0, lineNumber - self.totalLines
+        return self.lineBCVs[lineNumber]
+    # end of theWordVerseTable.getBBBCV
+
+
+    def getLineNumber( self, BBB:str, C, V ) -> Optional[int]:
+        """
+        Given a verse reference (C and V can be strings or integers)
+            return the line number (0… ) or None if there's no such verse in this volume type.
+        """
+        try: return self.BCVLines.get( (BBB,int(C),int(V)) )
+        except ValueError: return None # Couldn't convert C or V
+    # end of theWordVerseTable.getLineNumber
+
+
+    def getBookLines( self, BBB:str ) -> range:
+        """
+        Returns the range of line numbers for the book (empty if it's not in this volume type).
+        """
+        return self.bookRanges.get( BBB, range( 0 ) )
+    # end of theWordVerseTable.getBookLines
+# end of class theWordVerseTable
+
+
+_theWordVerseTables:Dict[str,theWordVerseTable] = {}
+def getTheWordVerseTable( volumeType:str='BOTH' ) -> theWordVerseTable:
+    """
+    Returns the (shared) theWordVerseTable for the volumeType ('OT', 'NT', or 'BOTH')
+        making it the first time.
+    """
+    if volumeType not in _theWordVerseTables:
+        _theWordVerseTables[volumeType] = theWordVerseTable( volumeType )
+    return _theWordVerseTables[volumeType]
+# end of getTheWordVerseTable
+
+
+
 def theWordGetBBBCV( lineNumber, volumeType='BOTH' ):
     """
     Given a line number (0… )
@@ -232,31 +333,7 @@ def theWordGetBBBCV( lineNumber, volumeType='BOTH' ):
     assert 0 <= lineNumber < 32000
     assert volumeType in ('OT','NT','BOTH',)
 
-    global BOS
-    if BOS is None: BOS = BibleOrganisationalSystem( 'GENERIC-KJV-66-ENG' )
-
-    if volumeType == 'OT':
-        bookCount, books, totalLines, bookLines = theWordOTBookCount, theWordOTBooks, theWordOTTotalLines, theWordOTBookLines
-    elif volumeType == 'NT':
-        bookCount, books, totalLines, bookLines = theWordNTBookCount, theWordNTBooks, theWordNTTotalLines, theWordNTBookLines
-    elif volumeType == 'BOTH':
-        bookCount, books, totalLines, bookLines = theWordBookCount, theWordBooks, theWordTotalLines, theWordBookLines
-
-    if lineNumber >= totalLines: return 'MDA', 0, lineNumber - totalLines
-
-    # Find the book chapter and verse
-    runningTotal = 0
-    for BBB, lines in zip( books, bookLines ):
-        if lineNumber < (runningTotal + lines): # we're in this book
-            verseList = BOS.getNumVersesList( BBB )
-            verseTotal = 0
-            for j, verseCount in enumerate( verseList ):
-                C = j + 1
-                if lineNumber < (runningTotal + verseTotal + verseCount ):
-                    return BBB, C, lineNumber - runningTotal - verseTotal + 1
-                verseTotal += verseCount
-            halt # programming error
-        runningTotal += lines
+    return getTheWordVerseTable( volumeType ).getBBBCV( lineNumber )
 # end of theWordGetBBBCV
 
 
@@ -819,6 +896,8 @@ class theWordBible( Bible ):
 
         if self.fileExtension.upper().endswith('X'):
             logging.warning( _("theWordBible: File {!r} is encrypted").format( self.sourceFilepath ) )
+        self.volumeType = getTheWordVolumeType( self.fileExtension )
+        self.lineOffsets = self.lineOffsetsKey = None # Index for getVerseLine (made when first needed)
     # end of theWordBible.__init__
 
 
@@ -828,9 +907,6 @@ class theWordBible( Bible ):
         """
         vPrint( 'Info', debuggingThisModule, _("Loading {}…").format( self.sourceFilepath ) )
 
-        global BOS
-        if BOS is None: BOS = BibleOrganisationalSystem( 'GENERIC-KJV-66-ENG' )
-
         if self.suppliedMetadata is None: self.suppliedMetadata = {}
         self.suppliedMetadata['theWord'] = {}
 
@@ -840,26 +916,17 @@ class theWordBible( Bible ):
             logging.error( _("theWordBible: File {!r} is encrypted").format( self.sourceFilepath ) )
             return
 
-        if fileExtensionUpper in ('.ONT','.ONTX',):
-            testament, BBB = 'BOTH', 'GEN'
-            booksExpected, textLineCountExpected = theWordBookCount, theWordTotalLines
-        elif fileExtensionUpper in ('.OT','.OTX',):
-            testament, BBB = 'OT', 'GEN'
-            booksExpected, textLineCountExpected = theWordOTBookCount, theWordOTTotalLines
-        elif fileExtensionUpper in ('.NT','.NTX',):
-            testament, BBB = 'NT', 'MAT'
-            booksExpected, textLineCountExpected = theWordNTBookCount, theWordOTTotalLines
+        verseTable = getTheWordVerseTable( self.volumeType )
+        lineBCVs, bookLastLines = verseTable.lineBCVs, verseTable.bookLastLines
+        booksExpected, textLineCountExpected = len(verseTable.books), verseTable.totalLines
 
         # Create the first book
+        BBB = verseTable.books[0]
         thisBook = BibleBook( self, BBB )
         thisBook.objectNameString = 'theWord Bible Book object'
         thisBook.objectTypeString = 'theWord'
         consecutiveBlankLineCount, hadText = 0, False
 
-        verseList = BOS.getNumVersesList( BBB )
-        numC, numV = len(verseList), verseList[0]
-        C = V = 1
-
         lastLine, lineCount, bookCount = '', 0, 0
         ourGlobals = {}
         continued = ourGlobals['haveParagraph'] = False
@@ -880,6 +947,7 @@ class theWordBible( Bible ):
                         #lastLine = line
 
                         if lineCount <= textLineCountExpected: # assume it's verse text
+                            BBB, C, V = lineBCVs[lineCount-1]
                             #dPrint( 'Quiet', debuggingThisModule, lineCount, BBB, C, V, 'tW file line is "' + line + '"' )
                             if line:
                                 hadText = True
@@ -892,33 +960,20 @@ class theWordBible( Bible ):
                                 consecutiveBlankLineCount += 1
 
                             handleRTFLine( self.name, BBB, C, V, line, thisBook, ourGlobals )
-                            V += 1
-                            if V > numV:
-                                C += 1
-                                if C > numC: # Save this book now
-                                    if hadText:
-                                        vPrint( 'Verbose', debuggingThisModule, "Saving", BBB, bookCount+1 )
-                                        self.stashBook( thisBook )
-                                    else: logging.warning( "theWordBible.load: Didn't save {} because it was blank".format( BBB ) )
-
-                                    bookCount += 1
-                                    if bookCount >= booksExpected: break
-                                    BBB = BOS.getNextBookCode( BBB )
-                                    # Create the next book
-                                    thisBook = BibleBook( self, BBB )
-                                    thisBook.objectNameString = 'theWord Bible Book object'
-                                    thisBook.objectTypeString = 'theWord'
-
-                                    verseList = BOS.getNumVersesList( BBB )
-                                    numC, numV = len(verseList), verseList[0]
-                                    C = V = 1
-                                    # Don't append c 1 yet, because there might be a book heading to precede it
-                                    consecutiveBlankLineCount, hadText = 0, False
-                                else: # next chapter only
-                                    #thisBook.addLine( 'c', str(C) )
-                                    numV = verseList[C-1]
-                                    V = 1
-                                #thisBook.addLine( 'cc', str(C) ) # All chapter numbers except the first
+                            if lineCount-1 in bookLastLines: # Save this book now
+                                if hadText:
+                                    vPrint( 'Verbose', debuggingThisModule, "Saving", BBB, bookCount+1 )
+                                    self.stashBook( thisBook )
+                                else: logging.warning( "theWordBible.load: Didn't save {} because it was blank".format( BBB ) )
+
+                                bookCount += 1
+                                if bookCount >= booksExpected: break
+                                # Create the next book
+                                thisBook = BibleBook( self, lineBCVs[lineCount][0] )
+                                thisBook.objectNameString = 'theWord Bible Book object'
+                                thisBook.objectTypeString = 'theWord'
+                                # Don't append c 1 yet, because there might be a book heading to precede it
+                                consecutiveBlankLineCount, hadText = 0, False
 
                             #if ourGlobals['haveParagraph']:
                                 #thisBook.addLine( 'p', '' )
@@ -961,6 +1016,39 @@ class theWordBible( Bible ):
         self.applySuppliedMetadata( 'theWord' ) # Copy some to self.settingsDict
         self.doPostLoadProcessing()
     # end of theWordBible.load
+
+
+    def getVerseLine( self, BBB:str, C, V ) -> Optional[str]:
+        """
+        Returns the original line from the module file for the given verse
+            (without loading the module)
+            or None if there's no such verse.
+
+        The first call reads through the file once to index the start of each line,
+            then each verse is read by seeking straight to it.
+        """
+        fnPrint( debuggingThisModule, f"theWordBible.getVerseLine( {BBB}, {C}, {V} )" )
+
+        lineNumber = getTheWordVerseTable( self.volumeType ).getLineNumber( BBB, C, V )
+        if lineNumber is None: return None
+
+        fileStat = os.stat( self.sourceFilepath )
+        if self.lineOffsets is None or self.lineOffsetsKey != (fileStat.st_size,fileStat.st_mtime):
+            vPrint( 'Info', debuggingThisModule, _("Indexing lines in {}…").format( self.sourceFilepath ) )
+            with open( self.sourceFilepath, 'rb' ) as binaryFile:
+                self.lineOffsets = array( 'Q', [0] )
+                self.lineOffsets.extend( accumulate( len(lineBytes) for lineBytes in binaryFile ) )
+            self.lineOffsetsKey = fileStat.st_size, fileStat.st_mtime
+        if lineNumber+1 >= len(self.lineOffsets): return None # File is too short
+
+        with open( self.sourceFilepath, 'rb' ) as binaryFile:
+            binaryFile.seek( self.lineOffsets[lineNumber] )
+            lineBytes = binaryFile.read( self.lineOffsets[lineNumber+1] - self.lineOffsets[lineNumber] )
+        line = lineBytes.decode( self.encoding or 'utf-8', errors='replace' ).rstrip( '\r\n' )
+        if lineNumber == 0 and line and line[0]==chr(65279): #U+FEFF
+            line = line[1:] # Remove the Unicode Byte Order Marker (BOM)
+        return line
+    # end of theWordBible.getVerseLine
 # end of theWordBible class
 
 
@@ -1153,7 +1241,7 @@ def createTheWordModule( self, outputFolder, controlDict ):
     self here is a Bible object with _processedLines
     """
     from datetime import datetime
-    import zipfile
+    from BibleOrgSys.InputOutput.ZipPackager import ZipPackager
 
 
     def writetWBook( writerObject, BBB:str, ourGlobals ):
@@ -1163,17 +1251,15 @@ def createTheWordModule( self, outputFolder, controlDict ):
         nonlocal lineCount
         bkData = self.books[BBB] if BBB in self.books else None
         #dPrint( 'Quiet', debuggingThisModule, bkData._processedLines )
-        verseList = BOS.getNumVersesList( BBB )
-        numC, numV = len(verseList), verseList[0]
 
         resettheWordMargins( ourGlobals )
         if bkData: # write book headings (stuff before chapter 1)
             ourGlobals['line'] = theWordHandleIntroduction( BBB, bkData, ourGlobals )
 
         # Write the verses (whether or not they're populated)
-        C = V = 1
         ourGlobals['lastLine'] = None
-        while True:
+        for lineNumber in verseTable.getBookLines( BBB ):
+            _BBB, C, V = verseTable.lineBCVs[lineNumber]
             verseData, composedLine = None, ''
             if bkData:
                 try:
@@ -1203,14 +1289,6 @@ def createTheWordModule( self, outputFolder, controlDict ):
                 writerObject.write( ourGlobals['lastLine'] + '\n' ) # Write it whether or not we got data
                 lineCount += 1
             ourGlobals['lastLine'] = composedLine
-            V += 1
-            if V > numV:
-                C += 1
-                if C > numC:
-                    break
-                else: # next chapter only
-                    numV = verseList[C-1]
-                    V = 1
         # Write the last line of the file
         assert '\n' not in ourGlobals['lastLine'] # This would mess everything up
         writerObject.write( ourGlobals['lastLine'] + '\n' ) # Write it whether or not we got data
@@ -1218,20 +1296,17 @@ def createTheWordModule( self, outputFolder, controlDict ):
     # end of totheWord.writetWBook
 
 
-    # Set-up their Bible reference system
-    BOS = BibleOrganisationalSystem( 'GENERIC-KJV-66-ENG' )
-    #BRL = BibleReferenceList( BOS, BibleObject=None )
-
     # Try to figure out if it's an OT/NT or what (allow for up to 6 extra books like FRT,GLS, etc.)
     if len(self) <= (39+6) and self.containsAnyOT39Books() and not self.containsAnyNT27Books():
-        testament, extension, startBBB, endBBB = 'OT', '.ot', 'GEN', 'MAL'
-        booksExpected, textLineCountExpected, checkTotals = 39, 23145, theWordOTBookLines
+        testament, extension = 'OT', '.ot'
+        checkTotals = theWordOTBookLines
     elif len(self) <= (27+6) and self.containsAnyNT27Books() and not self.containsAnyOT39Books():
-        testament, extension, startBBB, endBBB = 'NT', '.nt', 'MAT', 'REV'
-        booksExpected, textLineCountExpected, checkTotals = 27, 7957, theWordNTBookLines
+        testament, extension = 'NT', '.nt'
+        checkTotals = theWordNTBookLines
     else: # assume it's an entire Bible
-        testament, extension, startBBB, endBBB = 'BOTH', '.ont', 'GEN', 'REV'
-        booksExpected, textLineCountExpected, checkTotals = 66, 31102, theWordBookLines
+        testament, extension = 'BOTH', '.ont'
+        checkTotals = theWordBookLines
+    verseTable = getTheWordVerseTable( testament ) # Gives the verse for each line
 
     vPrint( 'Info', debuggingThisModule, _("  Exporting to theWord format…") )
     mySettings = {}
@@ -1251,8 +1326,8 @@ def createTheWordModule( self, outputFolder, controlDict ):
         try: myFile.write('\ufeff') # theWord needs the BOM
         except UnicodeEncodeError: # why does this fail on Windows???
             logging.critical( _("totheWord: Unable to write BOM to file") )
-        BBB, bookCount, lineCount, checkCount = startBBB, 0, 0, 0
-        while True: # Write each Bible book in the KJV order
+        bookCount, lineCount, checkCount = 0, 0, 0
+        for BBB in verseTable.books: # Write each Bible book in the KJV order
             writetWBook( myFile, BBB, mySettings )
             checkCount += checkTotals[bookCount]
             bookCount += 1
@@ -1260,8 +1335,6 @@ def createTheWordModule( self, outputFolder, controlDict ):
                 logging.critical( "Wrong number of lines written: {} {} {} {}".format( bookCount, BBB, lineCount, checkCount ) )
                 if BibleOrgSysGlobals.debugFlag: halt
             handledBooks.append( BBB )
-            if BBB == endBBB: break
-            BBB = BOS.getNextBookCode( BBB )
 
         # Now append the various settings if any
         written = []
@@ -1304,10 +1377,9 @@ def createTheWordModule( self, outputFolder, controlDict ):
         vPrint( 'Normal', debuggingThisModule, "  " + _("WARNING: Unhandled totheWord books were {}").format( unhandledBooks ) )
 
     # Now create a zipped version
-    vPrint( 'Info', debuggingThisModule, "  Zipping {} theWord file…".format( filename ) )
-    zf = zipfile.ZipFile( filepath+'.zip', 'w', compression=zipfile.ZIP_DEFLATED )
-    zf.write( filepath, filename )
-    zf.close()
+    if self.wantExportArchives:
+        vPrint( 'Info', debuggingThisModule, "  Zipping {} theWord file…".format( filename ) )
+        with ZipPackager( filepath+'.zip' ) as zipPackager: zipPackager.addFile( filepath, filename )
 
     if BibleOrgSysGlobals.verbosityLevel > 0 and BibleOrgSysGlobals.maxProcesses > 1:
         vPrint( 'Quiet', debuggingThisModule, "  BibleWriter.totheWord finished successfully." )
@@ -1370,6 +1442,8 @@ def briefDemo() -> None:
         assert theWordGetBBBCV( 0 ) == ('GEN', 1, 1)
         assert theWordGetBBBCV( 1532 ) == ('GEN', 50, 26)
         assert theWordGetBBBCV( 1533 ) == ('EXO', 1, 1)
+        assert getTheWordVerseTable( 'NT' ).getLineNumber( 'MAT', '1', '1' ) == 0
+        vPrint( 'Normal', debuggingThisModule, getTheWordVerseTable( 'BOTH' ) )
 
 
 
@@ -1451,6 +1525,8 @@ def fullDemo() -> None:
         assert theWordGetBBBCV( 0 ) == ('GEN', 1, 1)
         assert theWordGetBBBCV( 1532 ) == ('GEN', 50, 26)
         assert theWordGetBBBCV( 1533 ) == ('EXO', 1, 1)
+        assert getTheWordVerseTable( 'NT' ).getLineNumber( 'MAT', '1', '1' ) == 0
+        vPrint( 'Normal', debuggingThisModule, getTheWordVerseTable( 'BOTH' ) )
 
 
 
@@ -52,6 +52,7 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
 from BibleOrgSys.Bible import Bible, BibleBook
 from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList, InternalBibleEntry
 
@@ -514,10 +515,17 @@ class uWNotesBible( Bible ):
                 BibleOrgSysGlobals.alreadyMultiprocessing = False
             else: # Just single threaded
                 # Load the books one by one -- assuming that they have regular Paratext style filenames
-                for BBB in self.givenBookList:
-                    #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
-                        #dPrint( 'Quiet', debuggingThisModule, _("  uWNotesBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
-                    self.loadBook( BBB ) # also saves it
+                #   but read the files ahead using threads (in case we're on a slow filesystem)
+                self.bookFilePrefetcher = FilePrefetcher( [os.path.join( self.sourceFolder, self.possibleFilenameDict[BBB] )
+                                                    for BBB in self.givenBookList if BBB in self.possibleFilenameDict] )
+                try:
+                    for BBB in self.givenBookList:
+                        #if BibleOrgSysGlobals.verbosityLevel>1 or BibleOrgSysGlobals.debugFlag:
+                            #dPrint( 'Quiet', debuggingThisModule, _("  uWNotesBible: Loading {} from {} from {}…").format( BBB, self.name, self.sourceFolder ) )
+                        self.loadBook( BBB ) # also saves it
+                finally:
+                    self.bookFilePrefetcher.close()
+                    self.bookFilePrefetcher = None # Can't be pickled
         else:
             logging.critical( "uWNotesBible: " + _("No books to load in folder '{}'!").format( self.sourceFolder ) )
         #dPrint( 'Quiet', debuggingThisModule, self.getBookList() )
@@ -596,7 +604,8 @@ class uWNotesBibleBook( BibleBook ):
         fixErrors:List[str] = []
         lineCount = 0
         lastC, lastV = '-1', '0'
-        with open( os.path.join( self.filepath ), 'rt', encoding='utf-8' ) as myFile: # Automatically closes the file when done
+        prefetcher = getattr( self.containerBibleObject, 'bookFilePrefetcher', None )
+        with (open( self.filepath, 'rt', encoding='utf-8' ) if prefetcher is None else prefetcher.open( self.filepath, 'utf-8' )) as myFile: # Automatically closes the file when done
             for line in myFile:
                 line = line.rstrip( '\n\r' )
                 lineCount += 1
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ExternalJobRunner.py
+#
+# Module for running jobs with external programs (like xelatex or LibreOffice) for the exporters
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for running the jobs of the BibleWriter exporters which use external programs,
+    e.g., toTeX (xelatex for each book) and toODF (LibreOffice for each book).
+
+A bounded number of jobs run at once (in worker threads which mostly just wait for the external program)
+    and each job has a timeout.
+The results of each job are collected as a dictionary (in the order that the jobs were added) with the keys:
+    'name': the given job name, e.g., 'GEN Bible1'
+    'returnCode': the exit code of the program (or None if it never ran or was killed)
+    'timedOut': True if the job was stopped because it went too long
+    'error': a string if the job couldn't be run or raised an exception, otherwise None
+    'stdout', 'stderr': the decoded program output (empty strings for office jobs)
+    'outputs': a list of the filepaths that were created
+    'result': the return value of the function (office jobs only)
+    'seconds': the elapsed (wall-clock) time for the job
+
+ExternalJobRunner: Runs programs, each in its own temporary folder
+    (so jobs can't overwrite each other's intermediate files
+        and we don't need to change the current working directory of the process).
+OfficeJobRunner: Runs functions which need a LibreOffice Desktop object,
+    keeping one headless LibreOffice instance (with its own port and user profile) for each worker.
+    If a job times out or fails, only that worker's own instance is stopped and restarted
+        (rather than killing every LibreOffice ServiceManager process found by name).
+
+Contains the classes: ExternalJobRunner, OfficeConnection, OfficeJobRunner
+"""
+from gettext import gettext as _
+from typing import Dict, Iterator, List, Optional
+import os
+import sys
+import logging
+import shutil
+import subprocess
+import signal
+import threading
+import queue
+import time
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try: import uno # Part of LibreOffice
+except ImportError: uno = None
+
+if __name__ == '__main__':
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "ExternalJobRunner"
+PROGRAM_NAME = "External Job Runner"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+DEFAULT_OFFICE_PORT = 2002 # The first worker uses this one, the next one uses 2003, etc.
+OFFICE_STARTUP_SECONDS = 30
+
+
+
+def _newResult( jobName:str ) -> dict:
+    """
+    Return a new result dictionary for the job.
+    """
+    return { 'name':jobName, 'returnCode':None, 'timedOut':False, 'error':None,
+            'stdout':'', 'stderr':'', 'outputs':[], 'result':None, 'seconds':0.0 }
+# end of _newResult
+
+
+def _killProcess( process ) -> None:
+    """
+    Kill the process (and any children that it started in its session) if it's still running.
+    """
+    if process.poll() is not None: return # It has already finished
+    try:
+        if sys.platform.startswith( 'win' ): process.kill()
+        else: os.killpg( process.pid, signal.SIGKILL ) # It was started with start_new_session
+    except (ProcessLookupError, PermissionError): pass # It must have just finished
+# end of _killProcess
+
+
+
+class _JobRunner:
+    """
+    Base class for the runners which handles the worker threads and the results.
+    """
+    def __init__( self, maxJobs:Optional[int]=None, defaultTimeoutSeconds:float=60 ) -> None:
+        """
+        maxJobs defaults to the number of processes we're allowed
+            (or just one at a time if we're already running multiprocessing exports).
+        """
+        if maxJobs is None:
+            maxJobs = 1 if BibleOrgSysGlobals.alreadyMultiprocessing else BibleOrgSysGlobals.maxProcesses
+        self.maxJobs, self.defaultTimeoutSeconds = max( 1, maxJobs ), defaultTimeoutSeconds
+        self.executor = ThreadPoolExecutor( max_workers=self.maxJobs, thread_name_prefix=self.__class__.__name__ )
+        self.futures = []
+        self.results:List[dict] = []
+    # end of _JobRunner.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        numFailed = len( self.getFailures() )
+        return f"{self.__class__.__name__} object running up to {self.maxJobs} job(s) at once: {len(self.futures)} job(s) added, {len(self.results)} finished, {numFailed} failed"
+    # end of _JobRunner.__str__
+
+
+    def __enter__( self ):
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        self.close()
+
+
+    def _submit( self, jobFunction, *args ) -> None:
+        """
+        Add the job to the queue for the workers.
+        """
+        self.futures.append( self.executor.submit( jobFunction, *args ) )
+    # end of _JobRunner._submit
+
+
+    def iterResults( self ) -> Iterator[dict]:
+        """
+        Yield the result dictionary of each job so far (in the order that the jobs were added)
+            as soon as that job has finished,
+            so that the caller can process each output (e.g., zip it) while the later jobs are still running.
+        """
+        self.results = []
+        for future in self.futures:
+            self.results.append( future.result() )
+            yield self.results[-1]
+    # end of _JobRunner.iterResults
+
+
+    def wait( self ) -> List[dict]:
+        """
+        Wait for all the jobs so far to finish.
+
+        Returns the list of result dictionaries (in the order that the jobs were added).
+        """
+        self.results = [future.result() for future in self.futures]
+        return self.results
+    # end of _JobRunner.wait
+
+
+    def getFailures( self ) -> List[dict]:
+        """
+        Returns a list of the result dictionaries of the finished jobs which failed.
+        """
+        return [result for result in self.results if result['timedOut'] or result['error'] or result['returnCode']]
+    # end of _JobRunner.getFailures
+
+
+    def close( self ) -> List[dict]:
+        """
+        Wait for all the jobs to finish and shut down the workers.
+
+        Returns the list of result dictionaries.
+        """
+        fnPrint( debuggingThisModule, f"{self.__class__.__name__}.close()" )
+        results = self.wait()
+        self.executor.shutdown()
+        return results
+    # end of _JobRunner.close
+# end of class _JobRunner
+
+
+
+class ExternalJobRunner( _JobRunner ):
+    """
+    Runs external programs in temporary folders.
+
+    Use it as a context manager or call close(), e.g.,
+        with ExternalJobRunner( maxJobs=2 ) as runner:
+            runner.addJob( 'GEN', ['/usr/bin/xelatex','GEN.tex'], inputFileDict={'GEN.tex':texFilepath},
+                                        outputFileDict={'GEN.pdf':pdfFilepath}, timeoutSeconds=30 )
+        for result in runner.getFailures(): …
+    """
+    def addJob( self, jobName:str, parameters:List[str], inputFileDict:Optional[Dict[str,str]]=None,
+                        outputFileDict:Optional[Dict[str,str]]=None, timeoutSeconds:Optional[float]=None ) -> None:
+        """
+        Add a job to be run as soon as a worker is available.
+
+        The given input files are copied into a new temporary folder (where the program is run)
+            with the names given by the keys of inputFileDict,
+            so the parameters should normally just use those names.
+        After the program finishes, any of the files named by the keys of outputFileDict that were created
+            are moved to the filepaths given by the values.
+        """
+        fnPrint( debuggingThisModule, f"ExternalJobRunner.addJob( {jobName}, {parameters}, {inputFileDict}, {outputFileDict}, {timeoutSeconds} )" )
+        self._submit( self._runJob, jobName, parameters, inputFileDict or {}, outputFileDict or {},
+                        self.defaultTimeoutSeconds if timeoutSeconds is None else timeoutSeconds )
+    # end of ExternalJobRunner.addJob
+
+
+    def _runJob( self, jobName:str, parameters:List[str], inputFileDict:Dict[str,str], outputFileDict:Dict[str,str], timeoutSeconds:float ) -> dict:
+        """
+        Run in a worker thread.
+
+        Returns a result dictionary.
+        """
+        result = _newResult( jobName )
+        startTime = time.perf_counter()
+        jobFolderpath = tempfile.mkdtemp( prefix='BOS_Job_' )
+        try:
+            for filename, sourceFilepath in inputFileDict.items():
+                shutil.copy( sourceFilepath, os.path.join( jobFolderpath, filename ) )
+            process = subprocess.Popen( parameters, cwd=jobFolderpath, stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        start_new_session=not sys.platform.startswith( 'win' ) )
+            try: programOutputBytes, programErrorOutputBytes = process.communicate( timeout=timeoutSeconds )
+            except subprocess.TimeoutExpired:
+                result['timedOut'] = True
+                _killProcess( process )
+                programOutputBytes, programErrorOutputBytes = process.communicate()
+                logging.error( f"ExternalJobRunner: {jobName} timed out after {timeoutSeconds}s" )
+            else: result['returnCode'] = process.returncode
+            result['stdout'] = programOutputBytes.decode( encoding='utf-8', errors='replace' )
+            result['stderr'] = programErrorOutputBytes.decode( encoding='utf-8', errors='replace' )
+            for filename, destinationFilepath in outputFileDict.items():
+                filepath = os.path.join( jobFolderpath, filename )
+                if os.path.isfile( filepath ):
+                    shutil.move( filepath, destinationFilepath )
+                    result['outputs'].append( destinationFilepath )
+        except (OSError, subprocess.SubprocessError) as err: # e.g., the program isn't installed
+            result['error'] = str( err )
+            logging.error( f"ExternalJobRunner: {jobName} failed: {err}" )
+        finally:
+            shutil.rmtree( jobFolderpath, ignore_errors=True )
+        result['seconds'] = time.perf_counter() - startTime
+        if result['returnCode']:
+            logging.warning( f"ExternalJobRunner: {jobName} returned {result['returnCode']}" )
+        return result
+    # end of ExternalJobRunner._runJob
+# end of class ExternalJobRunner
+
+
+
+class OfficeConnection:
+    """
+    A headless LibreOffice instance (with its own port and user profile) started and owned by us,
+        and the UNO connection to it.
+    """
+    def __init__( self, port:int=DEFAULT_OFFICE_PORT, officeFilepath:Optional[str]=None ) -> None:
+        """
+        """
+        fnPrint( debuggingThisModule, f"OfficeConnection.__init__( {port}, {officeFilepath} )" )
+        self.port = port
+        self.officeFilepath = officeFilepath or shutil.which( 'soffice' ) or shutil.which( 'libreoffice' ) or '/usr/bin/libreoffice'
+        self.process = self.profileFolderpath = self.frameDesktop = None
+        self.lock = threading.Lock()
+    # end of OfficeConnection.__init__
+
+
+    def __str__( self ) -> str:
+        return f"OfficeConnection object on port {self.port} ({'running' if self.isRunning() else 'stopped'})"
+
+
+    def isRunning( self ) -> bool:
+        """
+        Returns True if our LibreOffice process is still there.
+        """
+        return self.process is not None and self.process.poll() is None
+    # end of OfficeConnection.isRunning
+
+
+    def start( self ) -> None:
+        """
+        Start a headless LibreOffice (if it's not already running) and connect to it.
+
+        Raises an exception (e.g., OSError, or a UNO NoConnectException) if we can't.
+        """
+        fnPrint( debuggingThisModule, f"OfficeConnection.start() on port {self.port}" )
+        if self.isRunning() and self.frameDesktop is not None: return
+        self.stop() # Just in case it died
+        if uno is None: raise ImportError( "OfficeConnection needs the LibreOffice uno module" )
+        vPrint( 'Info', debuggingThisModule, f"Starting LibreOffice on port {self.port}…" )
+        self.profileFolderpath = tempfile.mkdtemp( prefix='BOS_LOProfile_' ) # So that several instances can run at once
+        parameters = [self.officeFilepath,
+                    f'--accept=socket,host=localhost,port={self.port};urp;StarOffice.ServiceManager',
+                    '--norestore', '--nologo', '--nodefault', '--headless',
+                    f'-env:UserInstallation={Path(self.profileFolderpath).as_uri()}']
+        self.process = subprocess.Popen( parameters, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                        start_new_session=not sys.platform.startswith( 'win' ) )
+
+        # Now wait until it's listening
+        localContext = uno.getComponentContext()
+        urlResolver = localContext.ServiceManager.createInstanceWithContext( "com.sun.star.bridge.UnoUrlResolver", localContext )
+        startTime = time.monotonic()
+        while True:
+            try:
+                componentContext = urlResolver.resolve( f"uno:socket,host=localhost,port={self.port};urp;StarOffice.ComponentContext" )
+                break
+            except Exception as err: # com.sun.star.connection.NoConnectException
+                if not self.isRunning() or time.monotonic() - startTime > OFFICE_STARTUP_SECONDS:
+                    self.stop()
+                    raise err
+                time.sleep( 0.5 )
+        self.frameDesktop = componentContext.ServiceManager.createInstanceWithContext( "com.sun.star.frame.Desktop", componentContext )
+    # end of OfficeConnection.start
+
+
+    def stop( self ) -> None:
+        """
+        Close our LibreOffice instance (politely if possible) and remove its temporary user profile.
+        """
+        fnPrint( debuggingThisModule, f"OfficeConnection.stop() on port {self.port}" )
+        with self.lock:
+            if self.frameDesktop is not None and self.isRunning():
+                try: self.frameDesktop.terminate()
+                except Exception: pass # It might be locked up or already gone
+            self.frameDesktop = None
+            if self.process is not None:
+                try: self.process.wait( timeout=5 )
+                except subprocess.TimeoutExpired:
+                    _killProcess( self.process )
+                    self.process.wait()
+                self.process = None
+            if self.profileFolderpath is not None:
+                shutil.rmtree( self.profileFolderpath, ignore_errors=True )
+                self.profileFolderpath = None
+    # end of OfficeConnection.stop
+
+
+    def restart( self ) -> None:
+        """
+        Stop and start our LibreOffice instance, e.g., after it locked up.
+        """
+        self.stop()
+        self.start()
+    # end of OfficeConnection.restart
+
+
+    def kill( self ) -> None:
+        """
+        Kill our LibreOffice instance straight away (e.g., from the watchdog timer when it's locked up),
+            which makes any UNO calls that are waiting on it fail.
+        """
+        with self.lock:
+            if self.process is not None: _killProcess( self.process )
+    # end of OfficeConnection.kill
+# end of class OfficeConnection
+
+
+
+class OfficeJobRunner( _JobRunner ):
+    """
+    Runs functions of the form function( frameDesktop, *args ) with up to maxJobs LibreOffice instances.
+
+    Each instance is started when it's first needed, and then reused for the following jobs
+        (unless a job fails or times out, in which case it's restarted for the next job).
+    """
+    def __init__( self, maxJobs:Optional[int]=None, defaultTimeoutSeconds:float=150, basePort:int=DEFAULT_OFFICE_PORT ) -> None:
+        """
+        """
+        fnPrint( debuggingThisModule, f"OfficeJobRunner.__init__( {maxJobs}, {defaultTimeoutSeconds}, {basePort} )" )
+        _JobRunner.__init__( self, maxJobs, defaultTimeoutSeconds )
+        self.connections = [OfficeConnection( basePort+n ) for n in range( self.maxJobs )]
+        self.connectionQueue = queue.Queue()
+        for connection in self.connections: self.connectionQueue.put( connection )
+    # end of OfficeJobRunner.__init__
+
+
+    def addJob( self, jobName:str, function, *args, timeoutSeconds:Optional[float]=None ) -> None:
+        """
+        Add a job to be run as soon as a worker (and its LibreOffice instance) is available.
+        """
+        fnPrint( debuggingThisModule, f"OfficeJobRunner.addJob( {jobName}, {function}, … {timeoutSeconds} )" )
+        self._submit( self._runJob, jobName, function, args,
+                        self.defaultTimeoutSeconds if timeoutSeconds is None else timeoutSeconds )
+    # end of OfficeJobRunner.addJob
+
+
+    def _runJob( self, jobName:str, function, args, timeoutSeconds:float ) -> dict:
+        """
+        Run in a worker thread.
+
+        Returns a result dictionary.
+        """
+        result = _newResult( jobName )
+        startTime = time.perf_counter()
+        connection = self.connectionQueue.get()
+        try:
+            connection.start() # if it's not already running
+            timedOutEvent = threading.Event()
+            def onTimeout():
+                timedOutEvent.set()
+                connection.kill() # so that the UNO call fails (rather than us waiting forever)
+            watchdog = threading.Timer( timeoutSeconds, onTimeout )
+            watchdog.start()
+            try: result['result'] = function( connection.frameDesktop, *args )
+            finally:
+                watchdog.cancel()
+                result['timedOut'] = timedOutEvent.is_set()
+        except Exception as err: # Can be all kinds of UNO exceptions (e.g., DisposedException if it was killed)
+            result['error'] = f"{err.__class__.__name__}: {err}"
+            logging.error( f"OfficeJobRunner: {jobName} {'timed out after {}s'.format(timeoutSeconds) if result['timedOut'] else 'failed'}: {result['error']}" )
+            connection.stop() # So that it gets restarted for the next job
+        finally:
+            self.connectionQueue.put( connection )
+        result['seconds'] = time.perf_counter() - startTime
+        return result
+    # end of OfficeJobRunner._runJob
+
+
+    def close( self ) -> List[dict]:
+        """
+        Wait for all the jobs to finish and then close our LibreOffice instances.
+
+        Returns the list of result dictionaries.
+        """
+        results = _JobRunner.close( self )
+        for connection in self.connections: connection.stop()
+        return results
+    # end of OfficeJobRunner.close
+# end of class OfficeJobRunner
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate running a few jobs.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    with ExternalJobRunner( maxJobs=2, defaultTimeoutSeconds=2 ) as runner:
+        runner.addJob( 'Quick', [sys.executable, '-c', 'print("Done")'] )
+        runner.addJob( 'Slow', [sys.executable, '-c', 'import time; time.sleep(5)'] )
+        runner.addJob( 'Missing', ['/NoSuchFolder/NoSuchProgram'] )
+    vPrint( 'Quiet', debuggingThisModule, runner )
+    for result in runner.results:
+        vPrint( 'Quiet', debuggingThisModule, f"  {result['name']}: returnCode={result['returnCode']} timedOut={result['timedOut']} error={result['error']} stdout={result['stdout']!r} ({result['seconds']:.2f}s)" )
+# end of ExternalJobRunner.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+# end of ExternalJobRunner.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of ExternalJobRunner.py
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# FilePrefetcher.py
+#
+# Module for reading a set of (book) files concurrently in background threads
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for prefetching files.
+
+Loading a Bible from a folder of (often small) book files is mostly
+    waiting for the filesystem if that's over a network
+    (and the multiprocessing Pool doesn't help when we're not multiprocessing).
+
+  FilePrefetcher: Given a list of filepaths, starts reading them all (as bytes)
+        using a pool of threads (BibleOrgSysGlobals.maxIOThreads)
+        and then hands the contents back to the (unchanged) parsers on request
+        either as bytes, as decoded text, or as an open file-like object.
+
+    Only a limited number of files (and bytes) are read ahead of the parser
+        so that a large project doesn't have to fit into memory.
+
+    If a file wasn't prefetched (or couldn't be read or decoded),
+        the file is just opened normally instead
+        so that any errors are still reported by the parser in the usual way.
+
+Contains the class: FilePrefetcher
+"""
+from gettext import gettext as _
+from typing import Dict, Iterable, Optional, IO
+from collections import deque
+import os
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "FilePrefetcher"
+PROGRAM_NAME = "File prefetcher"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+MAX_PREFETCH_FILES = 32 # Maximum number of files read ahead (and not yet claimed)
+MAX_PREFETCH_BYTES = 32_000_000 # Stop reading ahead once the unclaimed files hold this much
+
+
+
+class FilePrefetcher:
+    """
+    Class for reading a list of files concurrently (in the order given)
+        and then handing each one back (once) when the parser asks for it.
+
+    No more than maxFiles files are read ahead of the parser,
+        and no more are started once the unclaimed files hold maxBytes
+        (so that limit can be exceeded by the maxThreads reads that are already in progress).
+
+    The files are expected to be claimed in the order given,
+        so claiming a file discards any unclaimed files given before it
+        (which will just be read normally if they're asked for later).
+
+    Can be used as a context manager.
+    """
+
+    def __init__( self, filepaths:Iterable, maxThreads:Optional[int]=None,
+                        maxFiles:int=MAX_PREFETCH_FILES, maxBytes:int=MAX_PREFETCH_BYTES ) -> None:
+        """
+        Starts reading the first of the given files immediately in the background.
+
+        maxThreads defaults to BibleOrgSysGlobals.maxIOThreads.
+            If this is less than two, nothing is prefetched
+            (and the open/get functions just read the file normally).
+        """
+        fnPrint( debuggingThisModule, f"FilePrefetcher.__init__( …, {maxThreads}, {maxFiles}, {maxBytes:,} )" )
+        if maxThreads is None: maxThreads = BibleOrgSysGlobals.maxIOThreads
+        self.maxThreads, self.maxFiles, self.maxBytes = maxThreads, max( 1, maxFiles ), maxBytes
+        self.__futures:Dict[str,Future] = {} # In the order given
+        self.__sizes:Dict[str,int] = {} # Lengths of the files that have been read but not claimed
+        self.__waiting = deque() # Files not yet started
+        self.__lock = threading.Lock()
+        self.__executor = None
+        filepaths = list( dict.fromkeys( os.path.normpath( os.fspath( filepath ) ) for filepath in filepaths ) ) # Removes duplicates
+        if maxThreads > 1 and len(filepaths) > 1:
+            self.__executor = ThreadPoolExecutor( max_workers=min( maxThreads, len(filepaths) ),
+                                                  thread_name_prefix='BOSPrefetch' )
+            self.__waiting.extend( filepaths )
+            with self.__lock: self.__startReads()
+        vPrint( 'Never', debuggingThisModule, f"FilePrefetcher: Prefetching {len(self)} files using {maxThreads} threads" )
+    # end of FilePrefetcher.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        return f"FilePrefetcher object with {len(self)} file(s) waiting" \
+                + (' (closed)' if self.__executor is None else f" using {self.maxThreads} threads")
+    # end of FilePrefetcher.__str__
+
+
+    def __len__( self ) -> int:
+        """ Returns the number of files (to be) prefetched but not yet handed back. """
+        return len( self.__futures ) + len( self.__waiting )
+
+
+    def __contains__( self, filepath ) -> bool:
+        """ Returns True if the file is (to be) prefetched (and hasn't been handed back yet). """
+        filepath = os.path.normpath( os.fspath( filepath ) )
+        return filepath in self.__futures or filepath in self.__waiting
+
+
+    def __readFile( self, filepath:str ) -> bytes:
+        """
+        Runs in a worker thread.
+
+        Notes the file size (unless the file has already been claimed or discarded)
+            and then starts reading more files if we're still within our limits.
+        """
+        fileBytes = b''
+        try:
+            with open( filepath, 'rb' ) as binaryFile:
+                fileBytes = binaryFile.read()
+        finally: # Even if the read failed
+            with self.__lock:
+                if filepath in self.__futures:
+                    self.__sizes[filepath] = len( fileBytes )
+                    if self.__executor is not None: self.__startReads()
+        return fileBytes
+    # end of FilePrefetcher.__readFile
+
+
+    def __startReads( self ) -> None:
+        """
+        Start reading more of the waiting files until we reach our limits.
+
+        No more reads are started than we have threads
+            so that we know the sizes of most of the unclaimed files.
+
+        Must be called with the lock held.
+        """
+        while self.__waiting and len(self.__futures) < self.maxFiles \
+        and len(self.__futures) - len(self.__sizes) < self.maxThreads \
+        and sum( self.__sizes.values() ) < self.maxBytes:
+            filepath = self.__waiting.popleft()
+            self.__futures[filepath] = self.__executor.submit( self.__readFile, filepath )
+    # end of FilePrefetcher.__startReads
+
+
+    def __claim( self, filepath:str ) -> Optional[Future]:
+        """
+        Removes the file (and any unclaimed files given before it)
+            and starts reading more files.
+
+        Returns the Future if the file was being read, else None.
+        """
+        with self.__lock:
+            if filepath in self.__futures:
+                for earlierFilepath in list( self.__futures ):
+                    self.__sizes.pop( earlierFilepath, None )
+                    future = self.__futures.pop( earlierFilepath )
+                    if earlierFilepath == filepath: break
+                    future.cancel()
+                    vPrint( 'Never', debuggingThisModule, f"FilePrefetcher: Discarded unclaimed {earlierFilepath}" )
+            elif filepath in self.__waiting:
+                for future in self.__futures.values(): future.cancel()
+                self.__futures, self.__sizes = {}, {}
+                while self.__waiting.popleft() != filepath: pass
+                future = None # It hasn't been read yet
+            else: return None
+            if self.__executor is not None: self.__startReads()
+        return future
+    # end of FilePrefetcher.__claim
+
+
+    def __enter__( self ):
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        self.close()
+
+
+    def close( self ) -> None:
+        """
+        Cancels any reads that haven't started yet and discards any unclaimed file contents.
+        """
+        fnPrint( debuggingThisModule, "FilePrefetcher.close()" )
+        with self.__lock:
+            for future in self.__futures.values(): future.cancel()
+            self.__futures, self.__sizes = {}, {}
+            self.__waiting.clear()
+            if self.__executor is not None:
+                self.__executor.shutdown( wait=False )
+                self.__executor = None
+    # end of FilePrefetcher.close
+
+
+    def getBytes( self, filepath ) -> Optional[bytes]:
+        """
+        Waits for the given file (if necessary) and returns its contents
+            (and forgets it so that the memory can be freed).
+
+        Returns None if the file wasn't prefetched or couldn't be read
+            (in which case the caller should read it in the normal way to get the usual error).
+        """
+        fnPrint( debuggingThisModule, f"FilePrefetcher.getBytes( {filepath} )" )
+        future = self.__claim( os.path.normpath( os.fspath( filepath ) ) )
+        if future is None: return None
+        try: return future.result()
+        except Exception as err: # Let the normal open report it
+            logging.debug( f"FilePrefetcher: Prefetch of {filepath} failed with {err}" )
+            return None
+    # end of FilePrefetcher.getBytes
+
+
+    def getText( self, filepath, encoding:Optional[str]=None ) -> Optional[str]:
+        """
+        Like getBytes but decodes the file (default UTF-8) and translates line endings
+            (like opening it in text mode would do).
+
+        Returns None if the file wasn't prefetched, couldn't be read, or doesn't decode.
+        """
+        fnPrint( debuggingThisModule, f"FilePrefetcher.getText( {filepath}, {encoding} )" )
+        fileBytes = self.getBytes( filepath )
+        if fileBytes is None: return None
+        try: fileText = fileBytes.decode( encoding or 'utf-8' )
+        except (UnicodeError, LookupError) as err: # Let the normal open and read report it
+            logging.debug( f"FilePrefetcher: Unable to decode {filepath} as {encoding}: {err}" )
+            return None
+        return io.StringIO( fileText, newline=None ).read() if '\r' in fileText else fileText
+    # end of FilePrefetcher.getText
+
+
+    def open( self, filepath, encoding:Optional[str]=None ) -> IO[str]:
+        """
+        Returns a file-like object (opened for reading text)
+            which the caller can use exactly like the result of open( filepath, 'rt', encoding=encoding ).
+        """
+        fileText = self.getText( filepath, encoding )
+        if fileText is None: return open( filepath, 'rt', encoding=encoding or 'utf-8' )
+        return io.StringIO( fileText )
+    # end of FilePrefetcher.open
+
+
+    def openBinary( self, filepath ) -> IO[bytes]:
+        """
+        Returns a binary file-like object
+            which the caller can use exactly like the result of open( filepath, 'rb' ),
+            e.g., to give to an XML parser.
+        """
+        fileBytes = self.getBytes( filepath )
+        if fileBytes is None: return open( filepath, 'rb' )
+        return io.BytesIO( fileBytes )
+    # end of FilePrefetcher.openBinary
+# end of class FilePrefetcher
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate prefetching some USFM files.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import time
+    testFolder = BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest1/' )
+    filepaths = [os.path.join( testFolder, filename ) for filename in sorted( os.listdir( testFolder ) )
+                                        if os.path.isfile( os.path.join( testFolder, filename ) )]
+    for maxThreads in (1, BibleOrgSysGlobals.maxIOThreads):
+        startTime = time.perf_counter()
+        with FilePrefetcher( filepaths, maxThreads ) as prefetcher:
+            vPrint( 'Quiet', debuggingThisModule, prefetcher )
+            numLines = 0
+            for filepath in filepaths:
+                with prefetcher.open( filepath, encoding='utf-8' ) as textFile:
+                    for _line in textFile: numLines += 1
+        vPrint( 'Quiet', debuggingThisModule, f"  Read {numLines:,} lines from {len(filepaths)} files using {maxThreads} thread(s) in {(time.perf_counter()-startTime)*1000:.1f} ms" )
+# end of FilePrefetcher.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+# end of FilePrefetcher.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of FilePrefetcher.py
@@ -5,7 +5,7 @@
 #
 # Module handling pretty writing of XML (and xHTML) and HTML files
 #
-# Copyright (C) 2010-2020 Robert Hunt
+# Copyright (C) 2010-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -30,11 +30,19 @@ Why write yet another module to do this?
     Better control of file layout and indentation
     It only took half a day anyway.
 
-TODO: Add buffering
+setHumanReadable( 'Machine' ) gives a fast mode for big exports
+    where nobody is going to read the output:
+        no indenting or line-wrapping (or backtracking in the buffer)
+            although newlines are still written wherever 'All' would write them
+            (because they can be significant whitespace, e.g., between words),
+        output chunks are just collected in a list and written out every _machineFlushSize characters,
+        and tags, attributes and text are only checked if BibleOrgSysGlobals.strictCheckingFlag is set.
+
 TODO: Add writeAutoDTD
 
 """
 from gettext import gettext as _
+from typing import List, Optional, Tuple
 import os
 import logging
 from pathlib import Path
@@ -46,12 +54,13 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput.XMLValidator import getSharedXMLValidator
 
 
-LAST_MODIFIED_DATE = '2020-04-19' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "MLWriter"
 PROGRAM_NAME = "ML Writer"
-PROGRAM_VERSION = '0.37'
+PROGRAM_VERSION = '0.40'
 programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -102,6 +111,10 @@ class MLWriter:
         self._buffer = ''
         self._bufferFlushSize = 1000 # Flush the buffer to the disk when it gets this many characters
         self._bufferSaveSize = 30 # How much off the buffer to hold back for possible backtracking
+        self._machineMode = False # Set by setHumanReadable( 'Machine' )
+        self._chunks = [] # Used instead of _buffer in machine mode
+        self._chunksLength = 0
+        self._machineFlushSize = 65_536 # Characters to collect in machine mode before writing them to disk
         self._openStack = [] # Here we keep track of what XML markers need to be closed
         self._currentColumn = 0
         self._nl = '\n'
@@ -141,12 +154,15 @@ class MLWriter:
             'Header': Just the header section
             'None'
             'NLSpace':
+            'Machine': Like 'All' but no indenting, line wrapping or (unless strict checking) field checking
         """
-        assert value in ('All', 'Header', 'None', 'NLSpace',)
+        assert value in ('All', 'Header', 'None', 'NLSpace', 'Machine',)
+        assert self._status == 'Idle' or (value=='Machine') == self._machineMode # Can't switch buffering half-way through
         self._humanReadable = value
         self._indentPerLevel = indentSize
-        if value=='NLSpace':
+        if value in ('NLSpace','Machine'):
             self._limitColumns = False
+        self._machineMode = value == 'Machine'
     # end of MLWriter.setHumanReadableFlag
 
 
@@ -169,6 +185,13 @@ class MLWriter:
     def _writeBuffer( self, writeAll=True ):
         """ Writes the buffer to the file. """
         assert self.__outputFile is not None
+        if self._chunks: # machine mode
+            if writeAll:
+                self._writeToFile( ''.join( self._chunks ) )
+                self._chunks, self._chunksLength = [], 0
+            elif len(self._chunks) > 1: # Keep the last chunk (in case removeFinalNewline is called)
+                self._writeToFile( ''.join( self._chunks[:-1] ) )
+                self._chunks, self._chunksLength = self._chunks[-1:], len( self._chunks[-1] )
         if self._buffer:
             #dPrint( 'Quiet', debuggingThisModule, "Writing buffer of {} characters".format( len(self._buffer) ) )
             if writeAll: # Write it all
@@ -185,6 +208,11 @@ class MLWriter:
     def _writeToBuffer( self, string ):
         """ Writes a string to the buffer.
             NOTE: This doesn't update self._currentColumn (because we don't know what we're writing here). """
+        if self._machineMode:
+            self._chunks.append( string )
+            self._chunksLength += len( string )
+            if self._chunksLength >= self._machineFlushSize: self._writeBuffer( False )
+            return
         if len(self._buffer) >= self._bufferFlushSize: # Our buffer is getting too big (and slow)
             self._writeBuffer( False ) # Physically write most of it to disk
         self._buffer += string
@@ -197,6 +225,10 @@ class MLWriter:
             Prepends appropriate indenting.
             Append newlines if requested.
         """
+        if self._machineMode: # No indenting or line wrapping (but keep the newlines)
+            if noNL: self._writeToBuffer( string )
+            else: self._writeToBuffer( string + self._nl )
+            return len( string )
         assert self.__outputFile is not None
         chars = self._SP() + string
         length = len( chars )
@@ -256,6 +288,12 @@ class MLWriter:
         """
         Removes a final newline sequence from the buffer.
         """
+        if self._machineMode:
+            if self._chunks and self._chunks[-1].endswith( self._nl ):
+                self._chunks[-1] = self._chunks[-1][:-len(self._nl)]
+                self._chunksLength -= len(self._nl)
+            self._suppressFollowingIndent = suppressFollowingIndent
+            return
         removed = False
         if self._buffer:
             if self._nl in ('\n','\r') and self._buffer[-1]==self._nl:
@@ -307,6 +345,7 @@ class MLWriter:
         Returns a checked string containing the tag name. Note that special characters should have already been handled before calling this routine.
         """
         #dPrint( 'Quiet', debuggingThisModule, "tagString: {!r}", tagString )
+        if self._machineMode and not BibleOrgSysGlobals.strictCheckingFlag: return tagString
         assert tagString # It can't be blank
         assert '<' not in tagString and '>' not in tagString and '"' not in tagString
         return tagString
@@ -317,6 +356,7 @@ class MLWriter:
         """
         Returns a checked string containing the tag name. Note that special characters should have already been handled before calling this routine.
         """
+        if self._machineMode and not BibleOrgSysGlobals.strictCheckingFlag: return textString
         assert textString # It can't be blank
         if '<' in textString or '>' in textString or '"' in textString:
             logging.error( "MLWriter:checkText: " + _("unexpected characters found in {} {!r}").format( self._outputType, textString ) )
@@ -348,6 +388,7 @@ class MLWriter:
         """
         Returns a checked string containing the attribute name. Note that special characters should have already been handled before calling this routine.
         """
+        if self._machineMode and not BibleOrgSysGlobals.strictCheckingFlag: return nameString
         assert nameString # It can't be blank
         assert '<' not in nameString and '>' not in nameString and '"' not in nameString
         return nameString
@@ -359,6 +400,7 @@ class MLWriter:
         Returns a checked string containing the attribute value. Note that special characters should have already been handled before calling this routine.
         """
         if isinstance( valueString, int ): valueString = str( valueString ) # Do an automatic conversion if they pass us an integer
+        if self._machineMode and not BibleOrgSysGlobals.strictCheckingFlag: return valueString
         assert valueString # It can't be blank (can it?)
         assert '<' not in valueString and '>' not in valueString and '"' not in valueString
         return valueString
@@ -501,7 +543,7 @@ class MLWriter:
             logging.error( "MLWriter.close: " + _("have unclosed tags: {}").format(self._openStack) )
             if BibleOrgSysGlobals.debugFlag and (debuggingThisModule or BibleOrgSysGlobals.strictCheckingFlag): halt
         if writeFinalNL: self.writeNewLine()
-        if self._buffer: self._writeBuffer()
+        if self._buffer or self._chunks: self._writeBuffer()
         if self._status != 'Buffered': pass
         self.__outputFile.close()
         self._status = 'Closed'
@@ -526,6 +568,8 @@ class MLWriter:
         """
         Validate the just closed file against the given schema (pathname or URL).
 
+        Uses the shared XMLValidator so that the schema is only compiled once.
+
         Returns a 3-tuple consisting of
             a result code (0=success)
             and two strings containing the program output and error output.
@@ -535,37 +579,51 @@ class MLWriter:
         assert self._status == 'Closed'
 
         if self._outputType == 'XML':
-            import subprocess # for running xmllint
-            # Not sure if this will work on most Linux systems -- certainly won't work on other operating systems
-            schemaFilepath = str(schemaFilepath) # In case it's a Path object
-            parameters = [ '/usr/bin/xmllint', '--noout', '--relaxng' if '.rng' in schemaFilepath else '--schema', schemaFilepath, str(self._outputFilePath) ]
-            try:
-                checkProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
-                checkProgramOutputBytes, checkProgramErrorOutputBytes = checkProcess.communicate()
-                returnCode = checkProcess.returncode
-            except FileNotFoundError:
-                logging.error( "MLWriter.validate is unable to open {!r}".format( parameters[0] ) )
-                if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag: halt
-                return None
-            checkProgramOutputString = checkProgramErrorOutputString = ''
-            if checkProgramOutputBytes: checkProgramOutputString = '{}:\n{}'.format( self._filename, checkProgramOutputBytes.decode( encoding='utf-8', errors='replace' ) )
-            if checkProgramErrorOutputBytes:
-                tempString = checkProgramErrorOutputBytes.decode( encoding='utf-8', errors='replace' )
-                if tempString.count('\n')>1 or not tempString.endswith('validates\n'):
-                    checkProgramErrorOutputString = '{}:\n{}'.format( self._filename, tempString )
-            xmllintError = ("No error", "Unclassified", "Error in DTD", "Validation error", "Validation error", "Error in schema compilation", "Error writing output", "Error in pattern", "Error in reader registration", "Out of memory")
-            if returnCode != 0:
-                vPrint( 'Info', debuggingThisModule, "  WARNING: xmllint gave an error on the created {} file: {} = {}".format( self._filename, returnCode, xmllintError[returnCode] ) )
-                if returnCode == 5: # schema error
-                    logging.critical( "MLWriter.validate couldn't read/parse the schema at {}".format( schemaFilepath ) )
-                    if BibleOrgSysGlobals.debugFlag and (debuggingThisModule or BibleOrgSysGlobals.strictCheckingFlag): halt
-            else: vPrint( 'Verbose', debuggingThisModule, "  xmllint validated the xml file {}.".format( self._filename ) )
-            return returnCode, checkProgramOutputString, checkProgramErrorOutputString,
+            return getSharedXMLValidator().validate( self._outputFilePath, schemaFilepath, self._filename )
     # end of MLWriter.validate
 # end of MLWriter class
 
 
 
+def validateMLWriters( MLWriters:List[MLWriter], schemaFilepath ) -> List[Optional[Tuple[int,str,str]]]:
+    """
+    Validate the files from a list of closed XML writers (e.g., one for each book)
+        against the same schema (using a pool of threads).
+
+    Returns a list of the MLWriter.validate() 3-tuples in the same order.
+    """
+    for writer in MLWriters: assert writer._status == 'Closed' and writer._outputType == 'XML'
+    return getSharedXMLValidator().validateMany( [(writer._outputFilePath,writer._filename) for writer in MLWriters], schemaFilepath )
+# end of validateMLWriters
+
+
+
+def benchmarkMLWriter( numVerses:int=31_102 ) -> None:
+    """
+    Compare writing an OSIS-like file (one element per verse)
+        in the human-readable and machine modes.
+    """
+    import time
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        for mode in ('All', 'None', 'Machine'):
+            startTime = time.perf_counter()
+            mlWr = MLWriter( f'Benchmark{mode}.xml', tempFolderpath )
+            mlWr.setHumanReadable( mode )
+            mlWr.start()
+            mlWr.writeLineOpen( 'osis', ('xmlns','http://www.bibletechnologies.net/2003/OSIS/namespace') )
+            mlWr.writeLineOpen( 'div', [('type','book'),('osisID','Gen')] )
+            for v in range( 1, numVerses+1 ):
+                mlWr.writeLineOpenSelfclose( 'verse', [('sID',f'Gen.1.{v}'),('osisID',f'Gen.1.{v}')] )
+                mlWr.writeLineText( f"In the beginning &amp; verse {v} text goes here", noNL=True )
+                mlWr.writeLineOpenSelfclose( 'verse', ('eID',f'Gen.1.{v}') )
+            mlWr.autoClose()
+            seconds = time.perf_counter() - startTime
+            vPrint( 'Quiet', debuggingThisModule, f"  {mode} mode wrote {os.path.getsize( os.path.join( tempFolderpath, f'Benchmark{mode}.xml' ) ):,} bytes in {seconds:.2f}s" )
+# end of benchmarkMLWriter
+
+
 def briefDemo() -> None:
     """
     Main program to handle command line parameters and then run what they want.
@@ -726,6 +784,9 @@ def fullDemo() -> None:
         mlWr.autoClose()
         vPrint( 'Quiet', debuggingThisModule, mlWr ) # Just print a summary
         vPrint( 'Quiet', debuggingThisModule, mlWr.validate( schema ) )
+
+    if 1: # Compare the speed of the human-readable and machine modes
+        benchmarkMLWriter()
 # end of MLWriter.fullDemo
 
 if __name__ == '__main__':
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# PhotoPageRenderer.py
+#
+# Module for rendering PhotoBible pages (small JPEG files) in batches
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for rendering the pages of a PhotoBible (see BibleWriter.toPhotoBible).
+
+BibleWriter.toPhotoBible lays out each page as a list of ImageMagick convert commands, e.g.,
+    ['-font', 'Andika', '-pointsize', '20', '-fill', 'opaque', '-draw', "text 1,22 'Genesis 1'", …]
+    and it used to run a separate '/usr/bin/timeout 10s /usr/bin/convert' process for every page.
+
+The renderers here collect the pages (usually a book at a time)
+    and render each batch in a pool of worker threads
+    (which just wait for the subprocess, or else spend most of their time in Pillow's C code)
+    while the exporter carries on laying out the next book.
+
+  ImageMagickPageRenderer: Renders a whole batch of pages with one convert process,
+        i.e., convert ( page1.jpg commands… -write page1.jpg +delete ) ( page2.jpg … ) … null:
+        (so the output is the same as running each page separately).
+    The batch is split up if the command line would be too long (Windows only allows 32K characters)
+        and if a convert process fails, its pages are tried again one at a time.
+  PillowPageRenderer: Renders the same command lists in-process with Pillow (PIL) if it's installed
+        (so doesn't need ImageMagick, and can handle complex scripts if suitable fonts are installed).
+
+getPhotoPageRenderer( blankFilepath, rendererName ) returns a suitable renderer
+    (ImageMagick by default if it's installed, otherwise Pillow).
+
+Contains the classes: ImageMagickPageRenderer, PillowPageRenderer
+"""
+from gettext import gettext as _
+from typing import List, Optional, Tuple
+import os
+import sys
+import logging
+import shutil
+import subprocess
+import threading
+import time
+import re
+import ast
+from concurrent.futures import ThreadPoolExecutor
+
+try: from PIL import Image, ImageColor, ImageDraw, ImageFont
+except ImportError: Image = None # Pillow is optional
+
+if __name__ == '__main__':
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "PhotoPageRenderer"
+PROGRAM_NAME = "PhotoBible page renderer"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+RENDERER_NAMES = ('ImageMagick', 'Pillow')
+IMAGEMAGICK_SECONDS_PER_PAGE = 10 # Used for the timeout (as it was for a single page)
+IMAGEMAGICK_MAX_COMMAND_LINE_LENGTH = 30_000 if sys.platform.startswith( 'win' ) else 120_000 # Windows limit is 32,767 characters
+FONT_FOLDERPATHS = ( '/usr/share/fonts/', '/usr/local/share/fonts/', os.path.expanduser( '~/.fonts/' ),
+                    os.path.expanduser( '~/.local/share/fonts/' ), 'C:\\Windows\\Fonts\\', '/Library/Fonts/' )
+
+
+
+def getImageMagickParameters() -> List[str]:
+    """
+    Returns the start of the convert command line for this system (as was used by toPhotoBible).
+    """
+    if sys.platform.startswith( 'win' ): return ['imconvert.exe']
+    return ['/usr/bin/convert']
+# end of getImageMagickParameters
+
+
+def isImageMagickAvailable() -> bool:
+    """
+    Returns True if we can find the ImageMagick convert program.
+    """
+    return shutil.which( getImageMagickParameters()[0] ) is not None
+# end of isImageMagickAvailable
+
+
+
+class _PhotoPageRenderer:
+    """
+    Base class for the renderers which handles the batches and the pool of worker threads.
+
+    Use it as a context manager:
+        with ImageMagickPageRenderer( blankFilepath ) as renderer:
+            renderer.addPage( commandList, jpegFilepath )
+            …
+            renderer.flush() # e.g., at the end of each book
+    and all the pages are finished at the end.
+    """
+    rendererName = None
+
+    def __init__( self, blankFilepath:str, maxWorkers:Optional[int]=None, maxPagesPerBatch:int=200 ) -> None:
+        """
+        blankFilepath is the (coloured) background JPEG file which each page starts from.
+
+        maxWorkers defaults to the number of processes we're allowed
+            (or just one extra thread if we're already running multiprocessing exports).
+        """
+        fnPrint( debuggingThisModule, f"{self.__class__.__name__}.__init__( {blankFilepath}, {maxWorkers}, {maxPagesPerBatch} )" )
+        self.blankFilepath, self.maxPagesPerBatch = blankFilepath, maxPagesPerBatch
+        if maxWorkers is None:
+            maxWorkers = 1 if BibleOrgSysGlobals.alreadyMultiprocessing else BibleOrgSysGlobals.maxProcesses
+        self.maxWorkers = max( 1, maxWorkers )
+        self.batch:List[Tuple[List[str],str]] = [] # Entries are 2-tuples: commandList, jpegFilepath
+        self.futures = []
+        self.executor = None
+        self.statsLock = threading.Lock()
+        self.stats = { 'pages':0, 'batches':0, 'failedBatches':0, 'renderSeconds':0.0 }
+    # end of _PhotoPageRenderer.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        return f"{self.__class__.__name__} object with {self.maxWorkers} worker(s): {self.stats}"
+    # end of _PhotoPageRenderer.__str__
+
+
+    def __enter__( self ):
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        self.close()
+
+
+    def addPage( self, commandList:List[str], jpegFilepath:str ) -> None:
+        """
+        Add the page to the current batch
+            (which is automatically sent for rendering if it gets big).
+        """
+        self.batch.append( (commandList, jpegFilepath) )
+        if len(self.batch) >= self.maxPagesPerBatch: self.flush()
+    # end of _PhotoPageRenderer.addPage
+
+
+    def flush( self ) -> None:
+        """
+        Send the current batch of pages off to be rendered in the background.
+        """
+        if not self.batch: return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor( max_workers=self.maxWorkers, thread_name_prefix=self.__class__.__name__ )
+        self.futures.append( self.executor.submit( self._timeBatch, self.batch ) )
+        self.batch = []
+    # end of _PhotoPageRenderer.flush
+
+
+    def _timeBatch( self, batch ) -> None:
+        """
+        Run in a worker thread to render the batch and update the stats.
+        """
+        startTime = time.perf_counter()
+        try: succeeded = self._renderBatch( batch )
+        except Exception as err: # Got to catch and report the exceptions here
+            logging.critical( f"{self.__class__.__name__}: Unexpected error rendering {len(batch)} page(s) starting with {batch[0][1]}: {err}" )
+            succeeded = False
+        elapsedSeconds = time.perf_counter() - startTime
+        with self.statsLock:
+            self.stats['pages'] += len(batch)
+            self.stats['batches'] += 1
+            if not succeeded: self.stats['failedBatches'] += 1
+            self.stats['renderSeconds'] += elapsedSeconds
+    # end of _PhotoPageRenderer._timeBatch
+
+
+    def close( self ) -> None:
+        """
+        Send off any remaining pages and wait for all the rendering to finish.
+        """
+        fnPrint( debuggingThisModule, f"{self.__class__.__name__}.close()" )
+        self.flush()
+        for future in self.futures: future.result()
+        self.futures = []
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+    # end of _PhotoPageRenderer.close
+# end of class _PhotoPageRenderer
+
+
+
+class ImageMagickPageRenderer( _PhotoPageRenderer ):
+    """
+    Renders each batch of pages with a single ImageMagick convert process.
+    """
+    rendererName = 'ImageMagick'
+    maxCommandLineLength = IMAGEMAGICK_MAX_COMMAND_LINE_LENGTH
+
+    @staticmethod
+    def _getPageParameters( commandList:List[str], jpegFilepath:str ) -> List[str]:
+        """
+        Returns the convert parameters to render the one page (inside parentheses).
+        """
+        return ['(', jpegFilepath] + commandList + ['-write', jpegFilepath, '+delete', ')']
+    # end of ImageMagickPageRenderer._getPageParameters
+
+
+    def _renderBatch( self, batch ) -> bool:
+        """
+        Split the batch into as few convert processes as the command line length allows
+            and if any of them fail, try their pages again one at a time.
+
+        Returns True if all of the pages were rendered.
+        """
+        fnPrint( debuggingThisModule, f"ImageMagickPageRenderer._renderBatch( {len(batch)} page(s) )" )
+        commandLineLength = sum( len(parameter)+3 for parameter in getImageMagickParameters()+['/usr/bin/timeout','9999s','null:'] )
+        subBatches, subBatch, subBatchLength = [], [], commandLineLength
+        for commandList, jpegFilepath in batch:
+            pageLength = sum( len(parameter)+3 for parameter in self._getPageParameters( commandList, jpegFilepath ) ) # Allow for spaces and quotes
+            if subBatch and subBatchLength + pageLength > self.maxCommandLineLength:
+                subBatches.append( subBatch )
+                subBatch, subBatchLength = [], commandLineLength
+            subBatch.append( (commandList, jpegFilepath) )
+            subBatchLength += pageLength
+        if subBatch: subBatches.append( subBatch )
+
+        succeeded = True
+        for subBatch in subBatches:
+            if self._runConvert( subBatch ): continue
+            if len(subBatch) > 1:
+                logging.warning( f"ImageMagickPageRenderer: Retrying {len(subBatch)} page(s) starting with {subBatch[0][1]} one at a time" )
+                for page in subBatch:
+                    if not self._runConvert( [page] ): succeeded = False
+            else: succeeded = False
+        return succeeded
+    # end of ImageMagickPageRenderer._renderBatch
+
+
+    def _runConvert( self, pages ) -> bool:
+        """
+        Each page is copied from the blank file,
+            and then the commands are applied to it inside parentheses
+            so that one convert process can render all of them.
+
+        Returns True if convert succeeded.
+        """
+        fnPrint( debuggingThisModule, f"ImageMagickPageRenderer._runConvert( {len(pages)} page(s) )" )
+        parameters = [] if sys.platform.startswith( 'win' ) \
+                        else ['/usr/bin/timeout', f'{IMAGEMAGICK_SECONDS_PER_PAGE*len(pages)}s']
+        parameters.extend( getImageMagickParameters() )
+        for commandList, jpegFilepath in pages:
+            shutil.copy( self.blankFilepath, jpegFilepath ) # Create the blank file (so it's still there if convert fails)
+            parameters.extend( self._getPageParameters( commandList, jpegFilepath ) )
+        parameters.append( 'null:' ) # No other output
+        #dPrint( 'Quiet', debuggingThisModule, "Parameters", repr(parameters) )
+        myProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
+        programOutputBytes, programErrorOutputBytes = myProcess.communicate()
+
+        # Process the output
+        if programOutputBytes:
+            logging.critical( "renderCommands: " + programOutputBytes.decode( encoding='utf-8', errors='replace' ) )
+        if programErrorOutputBytes:
+            logging.critical( "renderE: " + programErrorOutputBytes.decode( encoding='utf-8', errors='replace' ) )
+        return myProcess.returncode == 0
+    # end of ImageMagickPageRenderer._runConvert
+# end of class ImageMagickPageRenderer
+
+
+
+class PillowPageRenderer( _PhotoPageRenderer ):
+    """
+    Renders the pages in-process using Pillow (interpreting the ImageMagick commands).
+
+    ImageMagick font names (e.g., 'Charis-SIL') are matched against the installed font files.
+    """
+    rendererName = 'Pillow'
+    drawTextRegex = re.compile( r'text (-?[0-9.]+),(-?[0-9.]+) (.+)', re.DOTALL )
+    colorNameDict = { 'opaque':'black' } # ImageMagick names that Pillow doesn't know
+
+    def __init__( self, blankFilepath:str, maxWorkers:Optional[int]=None, maxPagesPerBatch:int=200 ) -> None:
+        """
+        """
+        if Image is None: raise ImportError( "PillowPageRenderer needs Pillow (PIL) to be installed" )
+        _PhotoPageRenderer.__init__( self, blankFilepath, maxWorkers, maxPagesPerBatch )
+        self.fontFilepathDict = {}
+        self.threadData = threading.local() # Each thread has its own font objects
+    # end of PillowPageRenderer.__init__
+
+
+    def _getFontFilepath( self, fontname:str ) -> Optional[str]:
+        """
+        Find the font file for the ImageMagick font name, e.g., 'Charis-SIL' might find CharisSIL-Regular.ttf
+            (trying fc-match first if it's available).
+
+        Returns None if nothing suitable was found.
+        """
+        try: return self.fontFilepathDict[fontname]
+        except KeyError: pass
+
+        fontFilepath = None
+        if shutil.which( 'fc-match' ):
+            try:
+                fontFilepath = subprocess.run( ['fc-match', '--format=%{file}', fontname.replace( '-', ' ' )],
+                                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True ).stdout.decode( 'utf-8' )
+            except (OSError, subprocess.CalledProcessError): pass
+            # fc-match always returns something, so make sure it's (roughly) the one we asked for
+            if fontFilepath and fontname.replace( '-', '' ).lower() not in os.path.basename( fontFilepath ).replace( '-', '' ).lower():
+                fontFilepath = None
+        if not fontFilepath:
+            wantedName = fontname.replace( '-', '' ).replace( ' ', '' ).lower()
+            candidates = []
+            for fontFolderpath in FONT_FOLDERPATHS:
+                for root, dirs, files in os.walk( fontFolderpath ):
+                    for filename in files:
+                        name, extension = os.path.splitext( filename )
+                        if extension.lower() in ('.ttf','.otf') \
+                        and name.replace( '-', '' ).replace( '_', '' ).replace( ' ', '' ).lower().startswith( wantedName ):
+                            candidates.append( (0 if 'regular' in name.lower() else 1, len(name), os.path.join( root, filename )) )
+            if candidates: fontFilepath = sorted( candidates )[0][2]
+        if not fontFilepath:
+            logging.warning( f"PillowPageRenderer: Unable to find a font file for {fontname!r}" )
+        self.fontFilepathDict[fontname] = fontFilepath
+        return fontFilepath
+    # end of PillowPageRenderer._getFontFilepath
+
+
+    def _getFont( self, fontname:str, fontsize:int ):
+        """
+        Returns a (cached) Pillow font object for this thread.
+        """
+        try: fontDict = self.threadData.fontDict
+        except AttributeError: fontDict = self.threadData.fontDict = {}
+        try: return fontDict[(fontname,fontsize)]
+        except KeyError: pass
+        with self.statsLock: fontFilepath = self._getFontFilepath( fontname )
+        if fontFilepath: font = ImageFont.truetype( fontFilepath, fontsize )
+        else:
+            try: font = ImageFont.truetype( 'DejaVuSans.ttf', fontsize )
+            except OSError: font = ImageFont.load_default()
+        fontDict[(fontname,fontsize)] = font
+        return font
+    # end of PillowPageRenderer._getFont
+
+
+    def _getColor( self, colorName:str ):
+        """
+        Convert ImageMagick colour names like 'royalBlue' or 'red1' for Pillow.
+        """
+        colorName = self.colorNameDict.get( colorName, colorName )
+        try: return ImageColor.getrgb( colorName )
+        except ValueError:
+            try: return ImageColor.getrgb( colorName.rstrip( '0123456789' ) ) # e.g., X11 'red1' is just 'red'
+            except ValueError:
+                logging.error( f"PillowPageRenderer: Unknown colour {colorName!r}" )
+                return (0, 0, 0)
+    # end of PillowPageRenderer._getColor
+
+
+    def _renderBatch( self, batch ) -> bool:
+        """
+        Draw the pages one at a time.
+
+        Returns True if all pages were successful.
+        """
+        fnPrint( debuggingThisModule, f"PillowPageRenderer._renderBatch( {len(batch)} page(s) )" )
+        succeeded = True
+        for commandList, jpegFilepath in batch:
+            image = Image.open( self.blankFilepath )
+            image.load()
+            draw = ImageDraw.Draw( image )
+            fontname, fontsize, fill = None, 12, (0, 0, 0) # ImageMagick defaults to 12 point
+            commandIterator = iter( commandList )
+            for command in commandIterator:
+                argument = next( commandIterator )
+                if command == '-font': fontname = argument
+                elif command == '-pointsize': fontsize = int( float( argument ) )
+                elif command == '-fill': fill = self._getColor( argument )
+                elif command == '-draw':
+                    match = self.drawTextRegex.fullmatch( argument )
+                    if match is None:
+                        logging.error( f"PillowPageRenderer: Can't draw {argument!r} in {jpegFilepath}" )
+                        succeeded = False; continue
+                    text = ast.literal_eval( match.group( 3 ) ) # It was written with {!r}
+                    draw.text( (float(match.group( 1 )),float(match.group( 2 ))), text,
+                                fill=fill, font=self._getFont( fontname, fontsize ), anchor='ls' ) # ImageMagick positions the baseline
+                else:
+                    logging.error( f"PillowPageRenderer: Unknown command {command!r} for {jpegFilepath}" )
+                    succeeded = False
+            image.save( jpegFilepath, quality='keep' ) # The same JPEG settings as the blank file
+            image.close()
+        return succeeded
+    # end of PillowPageRenderer._renderBatch
+# end of class PillowPageRenderer
+
+
+
+def getPhotoPageRenderer( blankFilepath:str, rendererName:Optional[str]=None, maxWorkers:Optional[int]=None ):
+    """
+    Returns a renderer object for the given name ('ImageMagick' or 'Pillow')
+        or if no name is given, ImageMagick if it's installed, otherwise Pillow if it's installed.
+
+    Returns None if the renderer isn't available.
+    """
+    fnPrint( debuggingThisModule, f"getPhotoPageRenderer( {blankFilepath}, {rendererName}, {maxWorkers} )" )
+    if rendererName is None:
+        if isImageMagickAvailable(): rendererName = 'ImageMagick'
+        elif Image is not None: rendererName = 'Pillow'
+        else:
+            logging.critical( "getPhotoPageRenderer: " + _("Need either ImageMagick or Pillow installed to render PhotoBible pages") )
+            return None
+    if rendererName == 'ImageMagick':
+        return ImageMagickPageRenderer( blankFilepath, maxWorkers )
+    if rendererName == 'Pillow':
+        if Image is None:
+            logging.critical( "getPhotoPageRenderer: " + _("Pillow is not installed") )
+            return None
+        return PillowPageRenderer( blankFilepath, maxWorkers )
+    logging.critical( f"getPhotoPageRenderer: Unknown renderer {rendererName!r} (expected one of {RENDERER_NAMES})" )
+    return None
+# end of getPhotoPageRenderer
+
+
+
+def benchmarkPhotoBible( outputFolderpath=None ) -> None:
+    """
+    Export a test Bible with each of the available renderers
+        and display the total wall time and the cost per page.
+    """
+    import tempfile
+    from BibleOrgSys.Formats.USFMBible import USFMBible
+
+    testFolderpath = BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFM2AllMarkersProject/' )
+    testBible = USFMBible( testFolderpath, givenName='USFM2AllMarkersProject' )
+    testBible.load()
+    for rendererName in RENDERER_NAMES:
+        if (rendererName == 'ImageMagick' and not isImageMagickAvailable()) \
+        or (rendererName == 'Pillow' and Image is None):
+            vPrint( 'Quiet', debuggingThisModule, f"  {rendererName} isn't available" )
+            continue
+        for maxWorkers in (1, BibleOrgSysGlobals.maxProcesses):
+            with tempfile.TemporaryDirectory() as tempFolderpath:
+                startTime = time.perf_counter()
+                testBible.toPhotoBible( outputFolderpath or tempFolderpath, rendererName=rendererName, maxRenderers=maxWorkers )
+                elapsedSeconds = time.perf_counter() - startTime
+            stats = testBible.photoBibleRenderStats
+            vPrint( 'Quiet', debuggingThisModule, f"  {rendererName} with {maxWorkers} worker(s): {stats['pages']:,} pages in {stats['batches']:,} batches took {elapsedSeconds:.2f}s total"
+                                                + (f" ({1000*stats['renderSeconds']/stats['pages']:.1f}ms rendering per page)" if stats['pages'] else '') )
+            if maxWorkers == BibleOrgSysGlobals.maxProcesses: break
+# end of benchmarkPhotoBible
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate rendering one page.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import tempfile
+    blankFilepath = BibleOrgSysGlobals.BOS_LIBRARY_BASE_FOLDERPATH.joinpath( 'ControlFiles/', 'yblank-240x320.jpg' )
+    renderer = getPhotoPageRenderer( blankFilepath )
+    if renderer is None: return
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        with renderer:
+            renderer.addPage( ['-font', 'Andika', '-pointsize', '20', '-fill', 'opaque', '-draw', "text 1,22 'Genesis 1'",
+                                '-font', 'Charis-SIL', '-fill', 'royalBlue', '-draw', "text 1,46 '¹In the beginning'"],
+                            os.path.join( tempFolderpath, 'Demo.jpg' ) )
+        vPrint( 'Quiet', debuggingThisModule, renderer )
+# end of PhotoPageRenderer.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+
+    BibleOrgSysGlobals.preloadCommonData()
+    benchmarkPhotoBible()
+# end of PhotoPageRenderer.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of PhotoPageRenderer.py
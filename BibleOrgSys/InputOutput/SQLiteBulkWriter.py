@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SQLiteBulkWriter.py
+#
+# Module for quickly creating (new) SQLite3 database files
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for creating SQLite3 database files (e.g., MySword, MyBible, and e-Sword modules).
+
+The exporters used to INSERT one verse at a time and commit after each book
+    which makes SQLite do a lot of unnecessary (journal and disk sync) work.
+
+  SQLiteBulkWriter: Creates a new database file and writes it in a single transaction
+        with the rollback journal and disk syncing turned off (because if it fails,
+        we just delete the incomplete file and make it again).
+    Rows are normally supplied by a generator to executemany
+        and indexes can be deferred until after all of the data has been loaded.
+
+Contains the class: SQLiteBulkWriter
+"""
+from gettext import gettext as _
+from typing import Iterable, List, Optional
+import os
+import logging
+import sqlite3
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-01-31' # by RJH
+SHORT_PROGRAM_NAME = "SQLiteBulkWriter"
+PROGRAM_NAME = "SQLite3 bulk writer"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+
+class SQLiteBulkWriter:
+    """
+    Class for creating a new SQLite3 database file as quickly as possible.
+
+    Use it as a context manager:
+        with SQLiteBulkWriter( filepath ) as writer:
+            writer.execute( 'CREATE TABLE …' )
+            writer.executemany( 'INSERT INTO …', rowGenerator )
+            writer.deferStatement( 'CREATE INDEX …' )
+    and everything is committed (after the deferred statements are run) at the end,
+        or the incomplete file is deleted if there's an exception.
+    """
+    def __init__( self, filepath ) -> None:
+        """
+        Any existing file is replaced.
+        """
+        fnPrint( debuggingThisModule, f"SQLiteBulkWriter.__init__( {filepath} )" )
+        self.filepath = filepath
+        self.deferredStatements:List[str] = []
+        self.numRows = 0
+        self.connection = self.cursor = None
+    # end of SQLiteBulkWriter.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        return f"SQLiteBulkWriter object for {self.filepath} with {self.numRows:,} row(s) inserted" \
+                + ('' if self.connection is not None else ' (closed)')
+    # end of SQLiteBulkWriter.__str__
+
+
+    def open( self ) -> None:
+        """
+        Create the new database file and start the transaction.
+        """
+        fnPrint( debuggingThisModule, "SQLiteBulkWriter.open()" )
+        if os.path.exists( self.filepath ): os.remove( self.filepath )
+        self.connection = sqlite3.connect( self.filepath, isolation_level=None ) # We handle the transaction ourselves
+        self.cursor = self.connection.cursor()
+        self.cursor.execute( 'PRAGMA journal_mode=OFF' ) # No rollback journal while we're building it
+        self.cursor.execute( 'PRAGMA synchronous=OFF' ) # Don't wait for the disk
+        self.cursor.execute( 'BEGIN' )
+    # end of SQLiteBulkWriter.open
+
+
+    def __enter__( self ):
+        self.open()
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        if excType is None: self.close()
+        else: self.abandon()
+
+
+    def execute( self, SQLString:str, parameters:Iterable=() ) -> None:
+        """
+        Execute one SQL statement, e.g., to create a table.
+        """
+        self.cursor.execute( SQLString, parameters )
+    # end of SQLiteBulkWriter.execute
+
+
+    def executemany( self, SQLString:str, rows:Iterable ) -> int:
+        """
+        Execute the SQL statement (e.g., an INSERT) for each row,
+            where rows can be a generator (so all the rows don't need to be in memory at once).
+
+        Returns the number of rows.
+        """
+        fnPrint( debuggingThisModule, f"SQLiteBulkWriter.executemany( {SQLString}, … )" )
+        self.cursor.executemany( SQLString, rows )
+        numRows = self.cursor.rowcount
+        if numRows > 0: self.numRows += numRows
+        return numRows
+    # end of SQLiteBulkWriter.executemany
+
+
+    def deferStatement( self, SQLString:str ) -> None:
+        """
+        Save a statement (e.g., CREATE INDEX) to be run after all of the data has been loaded
+            (which is quicker than updating the index for each row).
+        """
+        self.deferredStatements.append( SQLString )
+    # end of SQLiteBulkWriter.deferStatement
+
+
+    def close( self ) -> None:
+        """
+        Run any deferred statements and commit everything.
+        """
+        fnPrint( debuggingThisModule, "SQLiteBulkWriter.close()" )
+        if self.connection is None: return
+        for SQLString in self.deferredStatements:
+            self.cursor.execute( SQLString )
+        self.deferredStatements = []
+        self.cursor.execute( 'COMMIT' )
+        self.cursor.close()
+        self.connection.close()
+        self.connection = self.cursor = None
+    # end of SQLiteBulkWriter.close
+
+
+    def abandon( self ) -> None:
+        """
+        Close the database and delete the incomplete file.
+        """
+        fnPrint( debuggingThisModule, "SQLiteBulkWriter.abandon()" )
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = self.cursor = None
+        try: os.remove( self.filepath )
+        except OSError as err: logging.error( f"SQLiteBulkWriter: Unable to delete incomplete {self.filepath}: {err}" )
+    # end of SQLiteBulkWriter.abandon
+# end of class SQLiteBulkWriter
+
+
+
+def benchmarkBulkWriter( outputFolderpath=None ) -> None:
+    """
+    Compare writing a 66-book (31,102 verse) e-Sword style Bible table
+        one row (and one book commit) at a time (like the exporters used to)
+        with the bulk writer.
+    """
+    import time
+    import tempfile
+    from BibleOrgSys.Formats.theWordBible import getTheWordVerseTable
+
+    verseTable = getTheWordVerseTable( 'BOTH' )
+    def makeRows():
+        for BBB, C, V in verseTable.lineBCVs:
+            yield BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB ), C, V, f'Verse text for {BBB} {C}:{V} {"x"*80}'
+
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        if outputFolderpath is None: outputFolderpath = tempFolderpath
+        filepath = os.path.join( outputFolderpath, 'BulkWriterBenchmark.bblx' )
+
+        if os.path.exists( filepath ): os.remove( filepath )
+        startTime = time.perf_counter()
+        connection = sqlite3.connect( filepath )
+        cursor = connection.cursor()
+        cursor.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT)' )
+        connection.commit()
+        lastBookNumber = None
+        for row in makeRows():
+            if row[0] != lastBookNumber and lastBookNumber is not None: connection.commit() # once per book
+            cursor.execute( 'INSERT INTO "Bible" VALUES(?,?,?,?)', row )
+            lastBookNumber = row[0]
+        cursor.execute( 'CREATE INDEX BookChapterVerseIndex ON Bible (Book, Chapter, Verse)' )
+        connection.commit()
+        connection.close()
+        oldSeconds = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        with SQLiteBulkWriter( filepath ) as writer:
+            writer.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT)' )
+            writer.deferStatement( 'CREATE INDEX BookChapterVerseIndex ON Bible (Book, Chapter, Verse)' )
+            writer.executemany( 'INSERT INTO "Bible" VALUES(?,?,?,?)', makeRows() )
+        newSeconds = time.perf_counter() - startTime
+
+    vPrint( 'Quiet', debuggingThisModule, f"  Writing {len(verseTable):,} verses: one at a time took {oldSeconds:.2f}s, bulk writer took {newSeconds:.2f}s ({oldSeconds/newSeconds:.1f}x)" )
+# end of benchmarkBulkWriter
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate writing a small database.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        filepath = os.path.join( tempFolderpath, 'Demo.SQLite3' )
+        with SQLiteBulkWriter( filepath ) as writer:
+            writer.execute( 'CREATE TABLE verses (book_number NUMERIC, chapter NUMERIC, verse NUMERIC, text TEXT)' )
+            writer.deferStatement( 'CREATE UNIQUE INDEX verses_index on "verses" (book_number, chapter, verse)' )
+            writer.executemany( 'INSERT INTO verses VALUES(?,?,?,?)', ((10,1,V,f'Verse {V}') for V in range( 1, 32 )) )
+            vPrint( 'Quiet', debuggingThisModule, writer )
+        vPrint( 'Quiet', debuggingThisModule, writer )
+# end of SQLiteBulkWriter.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+
+    BibleOrgSysGlobals.preloadCommonData()
+    benchmarkBulkWriter()
+# end of SQLiteBulkWriter.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of SQLiteBulkWriter.py
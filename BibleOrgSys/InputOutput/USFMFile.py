@@ -132,7 +132,7 @@ class USFMFile:
     # end of USFMFile.__str__
 
 
-    def read( self, USFMFilepath:str, ignoreSFMs:Optional[bool]=None, encoding:Optional[str]=None ) -> None:
+    def read( self, USFMFilepath:str, ignoreSFMs:Optional[bool]=None, encoding:Optional[str]=None, prefetcher=None ) -> None:
         """
         Read a simple USFM (Unified Standard Format Marker) file into a list of tuples.
 
@@ -140,6 +140,7 @@ class USFMFile:
         @type USFMFilepath: string
         @param key: The SFM record marker (not including the backslash)
         @type encoding: string
+        @param prefetcher: Optional FilePrefetcher which might already have the file contents
         @rtype: list
 
         Puts the result into self.lines
@@ -151,7 +152,7 @@ class USFMFile:
         if encoding is None: encoding = 'utf-8'
 
         lastLine, lineCount, result = '', 0, []
-        with open( USFMFilepath, encoding=encoding ) as ourFile: # Automatically closes the file when done
+        with (open( USFMFilepath, encoding=encoding ) if prefetcher is None else prefetcher.open( USFMFilepath, encoding )) as ourFile: # Automatically closes the file when done
             try:
                 for line in ourFile:
                     lineCount += 1
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# XMLValidator.py
+#
+# Module for validating XML files against RelaxNG and XML Schema (XSD) schemas
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for validating XML files against schemas.
+
+We used to run /usr/bin/xmllint for each exported file
+    which meant that (for example) the USX schema was read and compiled again
+    for each of the 66+ books (and nothing was validated if xmllint wasn't installed).
+
+  XMLValidator: If lxml is installed, compiles each schema only once
+        (keyed by the schema path and its modification time)
+        and then validates files in-process, or several at once with a pool of threads.
+    The pool is kept for the life of the validator so that the worker threads
+        (and hence their compiled schemas) get reused by later calls.
+    Otherwise it falls back to running xmllint (like we used to).
+
+    Either way, the results are returned as the usual xmllint 3-tuple:
+        a result code (0=success, see xmllintError below)
+        and two strings containing the program output and error output.
+
+NOTE: libxml2 validation contexts mustn't be used by two threads at once
+    so each worker thread keeps its own compiled copy of each schema.
+
+Contains the class: XMLValidator
+    and the function: getSharedXMLValidator
+"""
+from gettext import gettext as _
+from typing import List, Optional, Tuple
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try: from lxml import etree
+except ImportError: etree = None # We'll fall back to using xmllint
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "XMLValidator"
+PROGRAM_NAME = "XML schema validator"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+XMLLINT_FILEPATH = '/usr/bin/xmllint'
+xmllintError = ("No error", "Unclassified", "Error in DTD", "Validation error", "Validation error", "Error in schema compilation", "Error writing output", "Error in pattern", "Error in reader registration", "Out of memory")
+XMLLINT_UNCLASSIFIED, XMLLINT_VALIDATION_ERROR, XMLLINT_SCHEMA_ERROR = 1, 3, 5
+
+
+
+class XMLValidator:
+    """
+    Class for validating XML files against RelaxNG (.rng) or XML Schema (.xsd) schemas.
+    """
+    def __init__( self, useLxml:Optional[bool]=None ) -> None:
+        """
+        useLxml defaults to True if lxml is installed.
+        """
+        fnPrint( debuggingThisModule, f"XMLValidator.__init__( {useLxml} )" )
+        self.useLxml = etree is not None if useLxml is None else useLxml
+        if self.useLxml and etree is None:
+            logging.error( "XMLValidator: lxml isn't installed -- will try xmllint instead" )
+            self.useLxml = False
+        self.__threadData = threading.local() # Each thread has its own compiled schemas
+        self.__lock = threading.Lock()
+        self.__executor, self.__executorSize = None, 0 # Our long-lived pool of validation threads
+        self.stats = { 'compiledSchemas':0, 'validatedFiles':0, 'failedFiles':0 }
+    # end of XMLValidator.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        return f"XMLValidator object using {'lxml' if self.useLxml else 'xmllint'}" \
+                f" ({self.stats['compiledSchemas']} schema compilation(s), {self.stats['validatedFiles']} file(s) validated, {self.stats['failedFiles']} failed)"
+    # end of XMLValidator.__str__
+
+
+    def __countStat( self, statName:str ) -> None:
+        with self.__lock: self.stats[statName] += 1
+
+
+    def _getCompiledSchema( self, schemaFilepath:str ) -> Tuple[Optional[object],str]:
+        """
+        Returns the compiled lxml schema (RelaxNG or XMLSchema) object (or None)
+            along with any error message.
+
+        The result is remembered (for this thread) until the schema file is modified.
+        """
+        try: schemaCache = self.__threadData.schemaCache
+        except AttributeError: schemaCache = self.__threadData.schemaCache = {}
+        try: mtime = os.stat( schemaFilepath ).st_mtime_ns
+        except OSError: mtime = None # Probably a URL
+        cacheKey = schemaFilepath, mtime
+        try: return schemaCache[cacheKey]
+        except KeyError: pass
+
+        vPrint( 'Verbose', debuggingThisModule, f"XMLValidator: Compiling schema {schemaFilepath}…" )
+        self.__countStat( 'compiledSchemas' )
+        try:
+            schemaTree = etree.parse( schemaFilepath, etree.XMLParser( no_network=False ) ) # Like xmllint, allow imported schemas to be fetched
+            result = (etree.RelaxNG( schemaTree ) if '.rng' in schemaFilepath else etree.XMLSchema( schemaTree )), ''
+        except (OSError, etree.XMLSyntaxError, etree.RelaxNGParseError, etree.XMLSchemaParseError) as err:
+            result = None, f'{schemaFilepath}: {err}\n'
+        schemaCache[cacheKey] = result # Even if it failed, so we don't keep trying
+        return result
+    # end of XMLValidator._getCompiledSchema
+
+
+    def _validateWithLxml( self, XMLFilepath:str, schemaFilepath:str ) -> Tuple[int,str,str]:
+        """
+        Returns the xmllint style result code and error output string.
+        """
+        schema, errorString = self._getCompiledSchema( schemaFilepath )
+        if schema is None: return XMLLINT_SCHEMA_ERROR, '', errorString
+
+        try: XMLTree = etree.parse( XMLFilepath )
+        except (OSError, etree.XMLSyntaxError) as err:
+            return XMLLINT_UNCLASSIFIED, '', f'{err}\n'
+        if schema.validate( XMLTree ): return 0, '', f'{XMLFilepath} validates\n'
+        return XMLLINT_VALIDATION_ERROR, '', ''.join( f'{entry}\n' for entry in schema.error_log ) \
+                                                + f'{XMLFilepath} fails to validate\n'
+    # end of XMLValidator._validateWithLxml
+
+
+    def _validateWithXmllint( self, XMLFilepath:str, schemaFilepath:str ) -> Optional[Tuple[int,str,str]]:
+        """
+        Runs the xmllint program (probably only works on Linux).
+
+        Returns None if xmllint can't be run.
+        """
+        import subprocess
+        parameters = [ XMLLINT_FILEPATH, '--noout', '--relaxng' if '.rng' in schemaFilepath else '--schema', schemaFilepath, XMLFilepath ]
+        try:
+            checkProcess = subprocess.Popen( parameters, stdout=subprocess.PIPE, stderr=subprocess.PIPE )
+            checkProgramOutputBytes, checkProgramErrorOutputBytes = checkProcess.communicate()
+        except FileNotFoundError:
+            logging.error( "XMLValidator is unable to open {!r}".format( parameters[0] ) )
+            return None
+        return checkProcess.returncode, checkProgramOutputBytes.decode( encoding='utf-8', errors='replace' ), \
+                                        checkProgramErrorOutputBytes.decode( encoding='utf-8', errors='replace' )
+    # end of XMLValidator._validateWithXmllint
+
+
+    def validate( self, XMLFilepath, schemaFilepath, displayName:Optional[str]=None ) -> Optional[Tuple[int,str,str]]:
+        """
+        Validate the XML file against the given schema (pathname or URL).
+
+        Returns a 3-tuple consisting of
+            a result code (0=success)
+            and two strings containing the program output and error output
+                (each preceded by displayName (default is the filename) if not empty).
+        or None if there's no way to validate it.
+        """
+        fnPrint( debuggingThisModule, f"XMLValidator.validate( {XMLFilepath}, {schemaFilepath}, {displayName} )" )
+        XMLFilepath, schemaFilepath = str(XMLFilepath), str(schemaFilepath) # In case they're Path objects
+        if displayName is None: displayName = os.path.basename( XMLFilepath )
+
+        results = self._validateWithLxml( XMLFilepath, schemaFilepath ) if self.useLxml \
+                    else self._validateWithXmllint( XMLFilepath, schemaFilepath )
+        if results is None:
+            if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag: halt
+            return None
+        returnCode, outputString, errorOutputString = results
+
+        checkProgramOutputString = checkProgramErrorOutputString = ''
+        if outputString: checkProgramOutputString = '{}:\n{}'.format( displayName, outputString )
+        if errorOutputString:
+            if errorOutputString.count('\n')>1 or not errorOutputString.endswith('validates\n'):
+                checkProgramErrorOutputString = '{}:\n{}'.format( displayName, errorOutputString )
+        if returnCode != 0:
+            self.__countStat( 'failedFiles' )
+            vPrint( 'Info', debuggingThisModule, "  WARNING: Validation gave an error on the {} file: {} = {}".format( displayName, returnCode, xmllintError[returnCode] if returnCode < len(xmllintError) else '?' ) )
+            if returnCode == XMLLINT_SCHEMA_ERROR:
+                logging.critical( "XMLValidator couldn't read/parse the schema at {}".format( schemaFilepath ) )
+                if BibleOrgSysGlobals.debugFlag and (debuggingThisModule or BibleOrgSysGlobals.strictCheckingFlag): halt
+        else:
+            self.__countStat( 'validatedFiles' )
+            vPrint( 'Verbose', debuggingThisModule, "  Validated the xml file {}.".format( displayName ) )
+        return returnCode, checkProgramOutputString, checkProgramErrorOutputString,
+    # end of XMLValidator.validate
+
+
+    def _getExecutor( self, numThreads:int ) -> ThreadPoolExecutor:
+        """
+        Returns our thread pool (only making a new one if we need more threads than before).
+
+        Because the same worker threads get reused,
+            each one only has to compile each schema once.
+        """
+        with self.__lock:
+            if self.__executor is None or numThreads > self.__executorSize:
+                if self.__executor is not None: self.__executor.shutdown( wait=False ) # Finishes any existing work
+                self.__executor = ThreadPoolExecutor( max_workers=numThreads, thread_name_prefix='BOSValidate' )
+                self.__executorSize = numThreads
+            return self.__executor
+    # end of XMLValidator._getExecutor
+
+
+    def close( self ) -> None:
+        """
+        Shut down our pool of threads (if any).
+
+        The validator can still be used afterwards (a new pool will be made if needed).
+        """
+        fnPrint( debuggingThisModule, "XMLValidator.close()" )
+        with self.__lock:
+            executor, self.__executor, self.__executorSize = self.__executor, None, 0
+        if executor is not None: executor.shutdown( wait=True )
+    # end of XMLValidator.close
+
+
+    def validateMany( self, XMLFilepathsAndNames:List[Tuple[str,Optional[str]]], schemaFilepath, maxThreads:Optional[int]=None ) -> List[Optional[Tuple[int,str,str]]]:
+        """
+        Validate a list of (XMLFilepath,displayName) files against the same schema
+            using a pool of threads (default BibleOrgSysGlobals.maxIOThreads).
+
+        Returns a list of the validate() results in the same order.
+        """
+        fnPrint( debuggingThisModule, f"XMLValidator.validateMany( ({len(XMLFilepathsAndNames)}), {schemaFilepath}, {maxThreads} )" )
+        if maxThreads is None: maxThreads = BibleOrgSysGlobals.maxIOThreads
+        if maxThreads < 2 or len(XMLFilepathsAndNames) < 2:
+            return [self.validate( XMLFilepath, schemaFilepath, displayName ) for XMLFilepath,displayName in XMLFilepathsAndNames]
+        executor = self._getExecutor( maxThreads ) # Not min'd with the number of files so that the pool size stays constant
+        return list( executor.map( lambda pathAndName: self.validate( pathAndName[0], schemaFilepath, pathAndName[1] ),
+                                    XMLFilepathsAndNames ) )
+    # end of XMLValidator.validateMany
+# end of class XMLValidator
+
+
+
+_sharedXMLValidator = None
+
+def getSharedXMLValidator() -> XMLValidator:
+    """
+    Returns the XMLValidator shared by the MLWriters and exporters
+        (so that each schema is only compiled once).
+    """
+    global _sharedXMLValidator
+    if _sharedXMLValidator is None:
+        _sharedXMLValidator = XMLValidator()
+    return _sharedXMLValidator
+# end of getSharedXMLValidator
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate validating a couple of small files.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        schemaFilepath = os.path.join( tempFolderpath, 'Demo.xsd' )
+        with open( schemaFilepath, 'wt', encoding='utf-8' ) as schemaFile:
+            schemaFile.write( '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:element name="book" type="xs:string"/></xs:schema>' )
+        filepathsAndNames = []
+        for j,XMLText in enumerate( ('<book>Good</book>', '<chapter>Bad</chapter>', '<book>Unclosed') ):
+            XMLFilepath = os.path.join( tempFolderpath, f'Demo{j}.xml' )
+            with open( XMLFilepath, 'wt', encoding='utf-8' ) as XMLFile: XMLFile.write( XMLText )
+            filepathsAndNames.append( (XMLFilepath,None) )
+        validator = XMLValidator()
+        for result in validator.validateMany( filepathsAndNames, schemaFilepath ):
+            vPrint( 'Quiet', debuggingThisModule, f"  {result}" )
+        vPrint( 'Quiet', debuggingThisModule, validator )
+        validator.close()
+# end of XMLValidator.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+# end of XMLValidator.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of XMLValidator.py
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ZipPackager.py
+#
+# Module for quickly packaging export files into ZIP archives
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for creating ZIP archives of exported files (e.g., AllWebFiles.zip).
+
+The exporters used to write all of their files, and then reopen the folder
+    with zipfile.ZipFile and re-read and deflate every file, one at a time on one core.
+
+  ZipPackager: Files can be added as soon as they've been written
+        (or bytes can be added directly without any file at all)
+        and they are read and deflated in a pool of background threads
+        (zlib releases the GIL so this really does run in parallel)
+        while the exporter carries on producing the next file.
+    Members are written to the archive (in the order that they were added)
+        as soon as they're ready, so the archive is complete very soon after the last file is added.
+
+The archives are ordinary (non-ZIP64) deflated ZIP files which can be read by zipfile
+    or any other unzipper.
+
+Contains the class: ZipPackager
+"""
+from gettext import gettext as _
+from typing import Iterable, List, Optional, Set
+import os
+import logging
+import time
+import zlib
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "ZipPackager"
+PROGRAM_NAME = "ZIP archive packager"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+# ZIP record layouts (see PKWARE APPNOTE.TXT) -- the same as used by zipfile
+LOCAL_HEADER_STRUCT = struct.Struct( '<4s2B4HL2L2H' )
+CENTRAL_DIRECTORY_STRUCT = struct.Struct( '<4s4B4HL2L5H2L' )
+END_OF_CENTRAL_DIRECTORY_STRUCT = struct.Struct( '<4s4H2LH' )
+ZIP_VERSION = 20 # 2.0 (needed for deflate)
+ZIP_DEFLATED = 8
+ZIP_UTF8_FLAG = 0x800
+ZIP_MAX_32BIT = 0xFFFFFFFF # We don't write ZIP64 archives
+ZIP_MAX_MEMBERS = 0xFFFF
+SYSTEM_UNIX = 3
+
+
+def _DOSDateTime( timeStruct ):
+    """
+    Convert a time.struct_time to the two 16-bit DOS (date,time) fields used in ZIP headers.
+    """
+    year = max( 1980, timeStruct.tm_year )
+    return (year-1980) << 9 | timeStruct.tm_mon << 5 | timeStruct.tm_mday, \
+            timeStruct.tm_hour << 11 | timeStruct.tm_min << 5 | timeStruct.tm_sec // 2
+# end of _DOSDateTime
+
+
+def _deflateMember( filepath, data:Optional[bytes], compressLevel:int ):
+    """
+    Run in a worker thread to read (if necessary) and deflate one member.
+
+    Returns a 6-tuple: CRC, compressedSize, uncompressedSize, DOSDate, DOSTime, and the compressed bytes.
+    """
+    if data is None:
+        with open( filepath, 'rb' ) as memberFile:
+            modeTime = os.fstat( memberFile.fileno() ).st_mtime
+            data = memberFile.read()
+        timeStruct = time.localtime( modeTime )
+    else: timeStruct = time.localtime()
+    compressor = zlib.compressobj( compressLevel, zlib.DEFLATED, -15 ) # Raw deflate stream (no zlib header)
+    compressedData = compressor.compress( data ) + compressor.flush()
+    return (zlib.crc32( data ), len(compressedData), len(data)) + _DOSDateTime( timeStruct ) + (compressedData,)
+# end of _deflateMember
+
+
+
+class ZipPackager:
+    """
+    Class for creating a new ZIP archive with members deflated in parallel.
+
+    Use it as a context manager:
+        with ZipPackager( zipFilepath ) as zipPackager:
+            …write a file…
+            zipPackager.addFile( filepath ) # Starts deflating it straight away
+            zipPackager.addBytes( 'README.txt', someBytes )
+            zipPackager.addFolder( folderpath ) # Adds any other files that weren't already added
+    and the archive is finished at the end
+        (or the incomplete archive is deleted if there's an exception).
+    """
+    def __init__( self, zipFilepath, maxThreads:Optional[int]=None, compressLevel:int=6 ) -> None:
+        """
+        Any existing file is replaced.
+
+        maxThreads defaults to the number of processes we're allowed
+            (or just one extra thread if we're already running multiprocessing exports).
+        compressLevel is the zlib level (the same default as zipfile).
+        """
+        fnPrint( debuggingThisModule, f"ZipPackager.__init__( {zipFilepath}, {maxThreads}, {compressLevel} )" )
+        self.zipFilepath, self.compressLevel = zipFilepath, compressLevel
+        if maxThreads is None:
+            maxThreads = 1 if BibleOrgSysGlobals.alreadyMultiprocessing else BibleOrgSysGlobals.maxProcesses
+        self.maxThreads = max( 1, maxThreads )
+        self.arcnames:Set[str] = set()
+        self.pendingMembers = deque() # Entries are 2-tuples: arcname, future
+        self.centralDirectoryEntries:List[bytes] = []
+        self.numBytesIn = 0
+        self.zipFile = self.executor = None
+    # end of ZipPackager.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the object.
+
+        @return: the name of the object formatted as a string
+        @rtype: string
+        """
+        return f"ZipPackager object for {self.zipFilepath} with {len(self.arcnames):,} member(s) ({self.numBytesIn:,} bytes)" \
+                + ('' if self.zipFile is not None else ' (closed)')
+    # end of ZipPackager.__str__
+
+
+    def open( self ) -> None:
+        """
+        Create the new archive file and start the pool of threads.
+        """
+        fnPrint( debuggingThisModule, "ZipPackager.open()" )
+        self.zipFile = open( self.zipFilepath, 'wb' )
+        self.executor = ThreadPoolExecutor( max_workers=self.maxThreads, thread_name_prefix='ZipPackager' )
+    # end of ZipPackager.open
+
+
+    def __enter__( self ):
+        self.open()
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        if excType is None: self.close()
+        else: self.abandon()
+
+
+    def _addMember( self, arcname:str, filepath, data:Optional[bytes] ) -> bool:
+        """
+        Start deflating the member in the background (and write out any members which are already finished).
+
+        Returns False if there's already a member with that name.
+        """
+        if self.zipFile is None: self.open()
+        arcname = arcname.replace( os.sep, '/' )
+        if arcname in self.arcnames:
+            logging.warning( f"ZipPackager: Already have {arcname!r} in {self.zipFilepath}" )
+            return False
+        self.arcnames.add( arcname )
+        self.pendingMembers.append( (arcname, self.executor.submit( _deflateMember, filepath, data, self.compressLevel )) )
+        self._writeFinishedMembers( wait=len(self.pendingMembers) > 4 * self.maxThreads ) # Don't let the queue (and memory use) grow too far
+        return True
+    # end of ZipPackager._addMember
+
+
+    def addFile( self, filepath, arcname:Optional[str]=None ) -> bool:
+        """
+        Add the (already written and closed) file to the archive
+            as arcname (defaults to the filename without the folder).
+        """
+        fnPrint( debuggingThisModule, f"ZipPackager.addFile( {filepath}, {arcname} )" )
+        return self._addMember( os.path.basename( filepath ) if arcname is None else arcname, filepath, None )
+    # end of ZipPackager.addFile
+
+
+    def addBytes( self, arcname:str, data:bytes ) -> bool:
+        """
+        Add the data to the archive as arcname (without any file on disk).
+        """
+        fnPrint( debuggingThisModule, f"ZipPackager.addBytes( {arcname}, {len(data)} )" )
+        return self._addMember( arcname, None, data )
+    # end of ZipPackager.addBytes
+
+
+    def addFolder( self, folderpath, excludeExtensions:Iterable[str]=('.zip',), includeExtensions:Optional[Iterable[str]]=None ) -> int:
+        """
+        Add the files in the folder (but not any subfolders)
+            which haven't already been added (by name).
+
+        Files with names ending with any of the excludeExtensions are skipped
+            and if includeExtensions is given, only files ending with one of those are added.
+
+        Returns the number of files added.
+        """
+        fnPrint( debuggingThisModule, f"ZipPackager.addFolder( {folderpath}, {excludeExtensions}, {includeExtensions} )" )
+        excludeExtensions = tuple( excludeExtensions )
+        if includeExtensions is not None: includeExtensions = tuple( includeExtensions )
+        ourFilepath = os.path.abspath( self.zipFilepath )
+        numAdded = 0
+        for filename in os.listdir( folderpath ):
+            if filename in self.arcnames \
+            or (excludeExtensions and filename.endswith( excludeExtensions )) \
+            or (includeExtensions is not None and not filename.endswith( includeExtensions )):
+                continue
+            filepath = os.path.join( folderpath, filename )
+            if not os.path.isfile( filepath ) or os.path.abspath( filepath ) == ourFilepath: continue
+            if self.addFile( filepath, filename ): numAdded += 1
+        return numAdded
+    # end of ZipPackager.addFolder
+
+
+    def _writeFinishedMembers( self, wait:bool=False ) -> None:
+        """
+        Write the finished members at the front of the queue to the archive
+            (so that members are always written in the order in which they were added).
+
+        If wait is set, wait for (at least) the first one.
+        """
+        while self.pendingMembers and (wait or self.pendingMembers[0][1].done()):
+            arcname, future = self.pendingMembers.popleft()
+            CRC, compressedSize, uncompressedSize, DOSDate, DOSTime, compressedData = future.result()
+            headerOffset = self.zipFile.tell()
+            if compressedSize > ZIP_MAX_32BIT or uncompressedSize > ZIP_MAX_32BIT \
+            or headerOffset + compressedSize > ZIP_MAX_32BIT or len(self.centralDirectoryEntries) >= ZIP_MAX_MEMBERS:
+                raise OverflowError( f"ZipPackager: {self.zipFilepath} would need ZIP64 extensions for {arcname!r}" )
+            try: arcnameBytes, flags = arcname.encode( 'ascii' ), 0
+            except UnicodeEncodeError: arcnameBytes, flags = arcname.encode( 'utf-8' ), ZIP_UTF8_FLAG
+            self.zipFile.write( LOCAL_HEADER_STRUCT.pack( b'PK\003\004', ZIP_VERSION, 0, flags, ZIP_DEFLATED,
+                                    DOSTime, DOSDate, CRC, compressedSize, uncompressedSize, len(arcnameBytes), 0 ) )
+            self.zipFile.write( arcnameBytes )
+            self.zipFile.write( compressedData )
+            self.centralDirectoryEntries.append( CENTRAL_DIRECTORY_STRUCT.pack( b'PK\001\002',
+                                    ZIP_VERSION, SYSTEM_UNIX, ZIP_VERSION, 0, flags, ZIP_DEFLATED,
+                                    DOSTime, DOSDate, CRC, compressedSize, uncompressedSize,
+                                    len(arcnameBytes), 0, 0, 0, 0, 0o100644 << 16, headerOffset ) + arcnameBytes )
+            self.numBytesIn += uncompressedSize
+            wait = False
+    # end of ZipPackager._writeFinishedMembers
+
+
+    def close( self ) -> None:
+        """
+        Wait for the remaining members, then write the central directory and close the archive.
+        """
+        fnPrint( debuggingThisModule, "ZipPackager.close()" )
+        if self.zipFile is None: self.open() # so that we still make an (empty) archive
+        while self.pendingMembers: self._writeFinishedMembers( wait=True )
+        self.executor.shutdown()
+        centralDirectoryOffset = self.zipFile.tell()
+        for entry in self.centralDirectoryEntries: self.zipFile.write( entry )
+        numMembers = len(self.centralDirectoryEntries)
+        self.zipFile.write( END_OF_CENTRAL_DIRECTORY_STRUCT.pack( b'PK\005\006', 0, 0, numMembers, numMembers,
+                                self.zipFile.tell() - centralDirectoryOffset, centralDirectoryOffset, 0 ) )
+        self.zipFile.close()
+        self.zipFile = self.executor = None
+        self.centralDirectoryEntries = []
+    # end of ZipPackager.close
+
+
+    def abandon( self ) -> None:
+        """
+        Stop and delete the incomplete archive.
+        """
+        fnPrint( debuggingThisModule, "ZipPackager.abandon()" )
+        if self.executor is not None:
+            for _arcname,future in self.pendingMembers: future.cancel() # (shutdown( cancel_futures=True ) needs Python 3.9)
+            self.executor.shutdown() # Waits for any that were already running
+            self.executor = None
+        self.pendingMembers.clear()
+        if self.zipFile is not None:
+            self.zipFile.close()
+            self.zipFile = None
+            try: os.remove( self.zipFilepath )
+            except OSError as err: logging.error( f"ZipPackager: Unable to delete incomplete {self.zipFilepath}: {err}" )
+    # end of ZipPackager.abandon
+# end of class ZipPackager
+
+
+
+def zipFolder( zipFilepath, folderpath, excludeExtensions:Iterable[str]=('.zip',), includeExtensions:Optional[Iterable[str]]=None ) -> int:
+    """
+    Convenience function to make an archive of the files in the folder.
+
+    Returns the number of files added.
+    """
+    with ZipPackager( zipFilepath ) as zipPackager:
+        return zipPackager.addFolder( folderpath, excludeExtensions, includeExtensions )
+# end of zipFolder
+
+
+
+def benchmarkZipPackager( numFiles:int=200, fileSize:int=200_000 ) -> None:
+    """
+    Compare zipping a folder of exported-sized files with zipfile (like the exporters used to)
+        with the packager.
+    """
+    import tempfile
+    import zipfile
+
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        for n in range( numFiles ):
+            with open( os.path.join( tempFolderpath, f'File{n:03}.htm' ), 'wt', encoding='utf-8' ) as myFile:
+                myFile.write( (f'<p class="verse">Verse {n} text with some words</p>\n' * (fileSize//48+1))[:fileSize] )
+
+        startTime = time.perf_counter()
+        zf = zipfile.ZipFile( os.path.join( tempFolderpath, 'Old.zip' ), 'w', compression=zipfile.ZIP_DEFLATED )
+        for filename in os.listdir( tempFolderpath ):
+            if not filename.endswith( '.zip' ):
+                zf.write( os.path.join( tempFolderpath, filename ), filename )
+        zf.close()
+        oldSeconds = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        zipFolder( os.path.join( tempFolderpath, 'New.zip' ), tempFolderpath )
+        newSeconds = time.perf_counter() - startTime
+
+        with zipfile.ZipFile( os.path.join( tempFolderpath, 'New.zip' ) ) as zf:
+            assert zf.testzip() is None
+            assert len( zf.namelist() ) == numFiles
+
+    vPrint( 'Quiet', debuggingThisModule, f"  Zipping {numFiles:,} files: zipfile took {oldSeconds:.2f}s, packager took {newSeconds:.2f}s ({oldSeconds/newSeconds:.1f}x)" )
+# end of benchmarkZipPackager
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate making a small archive.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import tempfile
+    import zipfile
+    with tempfile.TemporaryDirectory() as tempFolderpath:
+        zipFilepath = os.path.join( tempFolderpath, 'Demo.zip' )
+        with ZipPackager( zipFilepath ) as zipPackager:
+            for BBB in ('GEN','EXO','LEV'):
+                filepath = os.path.join( tempFolderpath, f'{BBB}.txt' )
+                with open( filepath, 'wt', encoding='utf-8' ) as myFile: myFile.write( f'Text of {BBB}\n' * 100 )
+                zipPackager.addFile( filepath )
+            zipPackager.addBytes( 'Ñote.txt', 'Some non-ASCII text: ἐν ἀρχῇ\n'.encode( 'utf-8' ) )
+            vPrint( 'Quiet', debuggingThisModule, zipPackager )
+        vPrint( 'Quiet', debuggingThisModule, zipPackager )
+        with zipfile.ZipFile( zipFilepath ) as zf:
+            vPrint( 'Quiet', debuggingThisModule, f"  {zf.namelist()} testzip={zf.testzip()}" )
+# end of ZipPackager.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+
+    benchmarkZipPackager()
+# end of ZipPackager.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of ZipPackager.py
@@ -131,6 +131,7 @@ class InternalBible:
         self.reverseDict, self.guesses = {}, '' # A program history
         self.preloadDone = self.loadedAllBooks = False
         self.triedLoadingBook, self.bookNeedsReloading = {}, {} # Dictionaries with BBB as key
+        self.bookFilePrefetcher = None # Only set (to a FilePrefetcher) while loadBooks() is reading the book files
         self.divisions = {}
         self.checkResultsDictionary = {}
         self.checkResultsDictionary['Priority Errors'] = [] # Put this one first in the ordered dictionary
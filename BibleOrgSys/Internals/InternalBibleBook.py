@@ -85,6 +85,14 @@ debuggingThisModule = False
 
 BCV_VERSION = '1.0'
 
+# Note field markers (which we remove from cleaned notes) -- longest first (so \\fqa isn't matched as \\fq)
+NOTE_FIELD_SFMS_TO_REMOVE = ( '\\xot*','\\xot ', '\\xnt*','\\xnt ', '\\xdc*','\\xdc ',
+                            '\\fqa*','\\fqa ', '\\fdc*','\\fdc ',
+                            '\\xo*','\\xo ', '\\xt*','\\xt ', '\\xk*','\\xk ', '\\xq*','\\xq ',
+                            '\\fr*','\\fr ', '\\ft*','\\ft ', '\\fq*','\\fq ',
+                            '\\fv*','\\fv ', '\\fk*','\\fk ', '\\fl*','\\fl ', )
+NOTE_FIELD_SFMS_REMOVAL_REGEX = re.compile( '|'.join( re.escape(SFM) for SFM in NOTE_FIELD_SFMS_TO_REMOVE ) )
+
 MAX_NONCRITICAL_ERRORS_PER_BOOK_NORMAL = 3
 MAX_NONCRITICAL_ERRORS_PER_BOOK_VERBOSE = 5
 
@@ -1004,12 +1012,9 @@ class InternalBibleBook:
                             .replace( '&quot;', '"' ) # Undo any replacements above
             for sign in ('- ', '+ '): # Remove common leader characters (and the following space)
                 cleanedNote = cleanedNote.replace( sign, '' )
-            for marker in ['\\xo*','\\xo ', '\\xt*','\\xt ', '\\xk*','\\xk ', '\\xq*','\\xq ',
-                            '\\xot*','\\xot ', '\\xnt*','\\xnt ', '\\xdc*','\\xdc ',
-                            '\\fr*','\\fr ','\\ft*','\\ft ','\\fqa*','\\fqa ','\\fq*','\\fq ',
-                            '\\fv*','\\fv ','\\fk*','\\fk ','\\fl*','\\fl ','\\fdc*','\\fdc ',] \
-                                + BibleOrgSysGlobals.internal_SFMs_to_remove:
-                cleanedNote = cleanedNote.replace( marker, '' )
+            if '\\' in cleanedNote:
+                cleanedNote = BibleOrgSysGlobals.loadedUSFMMarkers.removeInternalSFMs(
+                                    NOTE_FIELD_SFMS_REMOVAL_REGEX.sub( '', cleanedNote ) )
             if '\\z' in cleanedNote:
                 fixErrors.append( lineLocationSpace + _("Found custom marker in {}: {}").format( thisOne, cleanedNote ) )
                 logging.warning( _("processLineFix: Found custom marker after {} {}:{} in {}: {}").format( self.BBB, C, V, thisOne, cleanedNote ) )
@@ -2976,7 +2981,7 @@ class InternalBibleBook:
             for j,rawWord in enumerate(words):
                 if marker=='c' or marker=='v' and j==1 and rawWord.isdigit(): continue # Ignore the chapter and verse numbers (except ones like 6a)
                 word = rawWord
-                for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
+                word = BibleOrgSysGlobals.loadedUSFMMarkers.removeInternalSFMs( word )
                 word = BibleOrgSysGlobals.stripWordPunctuation( word )
                 if word and not word[0].isalnum():
                     #dPrint( 'Quiet', debuggingThisModule, word, BibleOrgSysGlobals.stripWordPunctuation( word ) )
@@ -4281,7 +4286,7 @@ class InternalBibleBook:
             for j,rawWord in enumerate(words):
                 if marker=='c' or marker=='v' and j==1 and rawWord.isdigit(): continue # Ignore the chapter and verse numbers (except ones like 6a)
                 word = rawWord
-                for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
+                word = BibleOrgSysGlobals.loadedUSFMMarkers.removeInternalSFMs( word )
                 word = stripWordPunctuation( word )
                 if word and not word[0].isalnum():
                     #dPrint( 'Quiet', debuggingThisModule, word, stripWordPunctuation( word ) )
@@ -6,7 +6,7 @@
 # Module to check and compare two closely related Bibles
 #   e.g., a book and its back-translation.
 #
-# Copyright (C) 2016-2020 Robert Hunt
+# Copyright (C) 2016-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -47,11 +47,13 @@ Includes:
                         illegalCompleteLineRegexes1=DEFAULT_ILLEGAL_COMPLETE_LINE_REGEXES_VERNACULAR, # For book1
                         illegalCompleteLineRegexes2=DEFAULT_ILLEGAL_COMPLETE_LINE_REGEXES_BACK_TRANSLATION, # For book2
                         breakOnOne=False )
-    _doCompare( parameters ) # for multiprocessing
+    iterCompareBibleBooks( Bible1, Bible2, BBBs, bookFunction=compareBooksPedantic, **options )
     segmentizeLine( line, segmentEndPunctuation='.?!;' )
+    normalizeSegmentWord( rawWord )
     segmentizeBooks( book1, book2 )
     analyzeWords( segmentList, dict12=None, dict21=None )
-    analyzeBibles( Bible1, Bible2 )
+    SegmentAligner( dict12=None, dict21=None ) # faster equivalent of the above two
+    analyzeBibles( Bible1, Bible2, dict12=None, dict21=None, aligner=None )
     compareBibles( Bible1, Bible2,
                         compareQuotes=DEFAULT_COMPARE_QUOTES,
                         comparePunctuation=DEFAULT_COMPARE_PUNCTUATION,
@@ -75,10 +77,13 @@ REGEX stuff:
         as well as numbers and the underscore. If the ASCII flag is used, only [a-zA-Z0-9_] is matched.
 """
 from gettext import gettext as _
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
+from collections import Counter
 from pathlib import Path
 import os.path
 import logging
+import copy
+import hashlib
 import re
 import unicodedata
 import multiprocessing
@@ -93,10 +98,10 @@ from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Bible import Bible, BibleBook
 
 
-LAST_MODIFIED_DATE = '2020-11-05' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "CompareBibles"
 PROGRAM_NAME = "Bible compare analyzer"
-PROGRAM_VERSION = '0.27'
+PROGRAM_VERSION = '0.29'
 programNameVersion = '{} v{}'.format( SHORT_PROGRAM_NAME, PROGRAM_VERSION )
 programNameVersionDate = '{} {} {}'.format( programNameVersion, _("last modified"), LAST_MODIFIED_DATE )
 
@@ -683,9 +688,92 @@ def compareBooksPedantic( book1, book2,
     return bcResults
 # end of compareBooksPedantic
 
-def _doCompare( parameters:List[Tuple[str,Bible,Bible]] ) -> List[Tuple[Tuple[str,str,str],str]]: # for multiprocessing
-    BBB, Bible1, Bible2 = parameters
-    return compareBooksPedantic( Bible1[BBB], Bible2[BBB] )
+def _detachBook( bBook:BibleBook ) -> BibleBook:
+    """
+    Return a shallow copy of the book without the links back to its (whole) Bible
+        so that it can be pickled (and sent to another process) by itself.
+    """
+    detachedBook = copy.copy( bBook )
+    detachedBook.containerBibleObject = None
+    if getattr( detachedBook, '_SectionIndex', None ) is not None: detachedBook._SectionIndex = None
+    return detachedBook
+# end of CompareBibles._detachBook
+
+
+_workerBibles = _workerBookFunction = _workerOptions = None
+def _initCompareWorker( bookFunction, options:dict, Bibles ) -> None: # for multiprocessing
+    """
+    Remember the book function and its options in this worker process.
+
+    Bibles is the (Bible1,Bible2) 2-tuple if the workers were forked from our process
+        (so they share its memory and nothing needs to be pickled), else None.
+    """
+    global _workerBibles, _workerBookFunction, _workerOptions
+    _workerBibles, _workerBookFunction, _workerOptions = Bibles, bookFunction, options
+# end of CompareBibles._initCompareWorker
+
+def _doCompare( parameters:Tuple[str,BibleBook,BibleBook] ) -> Tuple[str,list]: # for multiprocessing
+    """
+    Parameters are BBB and the two (detached) books
+        or BBB and None,None if the books are to be found in the forked Bibles.
+
+    Returns BBB and the book function result.
+    """
+    BBB, book1, book2 = parameters
+    if book1 is None: book1, book2 = _workerBibles[0][BBB], _workerBibles[1][BBB]
+    return BBB, _workerBookFunction( book1, book2, **_workerOptions )
+# end of CompareBibles._doCompare
+
+
+def iterCompareBibleBooks( Bible1:Bible, Bible2:Bible, BBBs:List[str], bookFunction=compareBooksPedantic, **options ):
+    """
+    Runs bookFunction( Bible1[BBB], Bible2[BBB], **options ) for each BBB,
+        using a pool of processes if BibleOrgSysGlobals.maxProcesses allows.
+
+    If the operating system forks the pool processes, they share the parent's copy of the Bibles,
+        otherwise only the two books being compared are sent to the process.
+
+    Yields (BBB,result) 2-tuples as each book is finished
+        (so not necessarily in the order of BBBs if using multiprocessing).
+    """
+    fnPrint( debuggingThisModule, f"iterCompareBibleBooks( {Bible1}, {Bible2}, {BBBs}, {bookFunction.__name__}, {options} )" )
+
+    if BibleOrgSysGlobals.maxProcesses > 1 and len(BBBs) > 1 \
+    and not BibleOrgSysGlobals.alreadyMultiprocessing: # Check all the books as quickly as possible
+        vPrint( 'Normal', debuggingThisModule, _("Comparing {} books using {} processes…").format( len(BBBs), BibleOrgSysGlobals.maxProcesses ) )
+        vPrint( 'Normal', debuggingThisModule, "  NOTE: Outputs (including error and warning messages) from scanning various books may be interspersed." )
+        forkFlag = multiprocessing.get_start_method() == 'fork'
+        if forkFlag: parameters = [(BBB,None,None) for BBB in BBBs]
+        else: parameters = ((BBB,_detachBook(Bible1[BBB]),_detachBook(Bible2[BBB])) for BBB in BBBs) # Only made as needed
+        BibleOrgSysGlobals.alreadyMultiprocessing = True
+        try:
+            with multiprocessing.Pool( processes=min( BibleOrgSysGlobals.maxProcesses, len(BBBs) ), initializer=_initCompareWorker,
+                                    initargs=(bookFunction, options, (Bible1,Bible2) if forkFlag else None) ) as pool: # start worker processes
+                yield from pool.imap_unordered( _doCompare, parameters ) # have the pool do our compares
+        finally: BibleOrgSysGlobals.alreadyMultiprocessing = False
+    else: # Just single threaded
+        for BBB in BBBs: # Do individual book prechecks
+            vPrint( 'Verbose', debuggingThisModule, "  " + _("Comparing {}…").format( BBB ) )
+            yield BBB, bookFunction( Bible1[BBB], Bible2[BBB], **options )
+# end of CompareBibles.iterCompareBibleBooks
+
+
+def normalizeSegmentWord( rawWord:str ) -> str:
+    """
+    Remove any internal SFMs and word punctuation from the raw word.
+
+    Returns the word or an empty string if there's nothing left
+        or if it's only a reference or number.
+    """
+    word = BibleOrgSysGlobals.loadedUSFMMarkers.removeInternalSFMs( rawWord )
+    word = BibleOrgSysGlobals.stripWordPunctuation( word )
+    if word and not word[0].isalnum() and len(word) > 1:
+        vPrint( 'Never', debuggingThisModule, "normalizeSegmentWord: " + _("Have unexpected character starting word {!r}").format( word ) )
+        word = word[1:]
+    for char in word:
+        if not char.isdigit() and char not in ':-,.': return word
+    return '' # It's a reference or number (or nothing)
+# end of normalizeSegmentWord
 
 
 def segmentizeLine( line:str, segmentEndPunctuation:str='.?!;:' ) -> List[List[str]]:
@@ -711,31 +799,9 @@ def segmentizeLine( line:str, segmentEndPunctuation:str='.?!;:' ) -> List[List[s
     for segment in line.split( 'SsSsSsS' ):
         segmentList = []
         for rawWord in segment.split():
-            word = rawWord
-            for internalMarker in BibleOrgSysGlobals.internal_SFMs_to_remove: word = word.replace( internalMarker, '' )
-            word = BibleOrgSysGlobals.stripWordPunctuation( word )
-            if word and not word[0].isalnum():
-                #dPrint( 'Quiet', debuggingThisModule, "not alnum", repr(rawWord), repr(word) )
-                if len(word) > 1:
-                    if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                        vPrint( 'Quiet', debuggingThisModule, "segmentizeLine: {} {}:{} ".format( self.BBB, C, V ) \
-                                            + _("Have unexpected character starting word {!r}").format( word ) )
-                    word = word[1:]
+            word = normalizeSegmentWord( rawWord )
             if word: # There's still some characters remaining after all that stripping
-                #dPrint( 'Quiet', debuggingThisModule, "here", repr(rawWord), repr(word) )
-                if 1 or BibleOrgSysGlobals.verbosityLevel > 3: # why???
-                    for k,char in enumerate(word):
-                        if not char.isalnum() and (k==0 or k==len(word)-1 or char not in BibleOrgSysGlobals.MEDIAL_WORD_PUNCT_CHARS):
-                            if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                                vPrint( 'Quiet', debuggingThisModule, "segmentizeLine: {} {}:{} ".format( self.BBB, C, V ) + _("Have unexpected {!r} in word {!r}").format( char, word ) )
-                lcWord = word.lower()
-                isAReferenceOrNumber = True
-                for char in word:
-                    if not char.isdigit() and char not in ':-,.': isAReferenceOrNumber = False; break
-                if not isAReferenceOrNumber:
-                    segmentList.append( word )
-                    #lDict['allWordCounts'][word] = 1 if word not in lDict['allWordCounts'] else lDict['allWordCounts'][word] + 1
-                    #lDict['allCaseInsensitiveWordCounts'][lcWord] = 1 if lcWord not in lDict['allCaseInsensitiveWordCounts'] else lDict['allCaseInsensitiveWordCounts'][lcWord] + 1
+                segmentList.append( word )
         lineList.append( segmentList )
 
     #dPrint( 'Quiet', debuggingThisModule, '  lineList', lineList )
@@ -743,33 +809,16 @@ def segmentizeLine( line:str, segmentEndPunctuation:str='.?!;:' ) -> List[List[s
 # end of segmentizeLine
 
 
-def segmentizeBooks( book1:BibleBook, book2:BibleBook ) -> Tuple[list,list]:
+def _iterMatchingLines( book1:BibleBook, book2:BibleBook, abResults:list ):
     """
     Given two Bible book objects,
-        break them into a list of segments
-            as well as a list of left-overs if the segments don't match.
+        step through the lines with matching markers (skipping a marker if necessary)
+        and yield (reference,line1,line2) 3-tuples for the Bible text lines.
 
-    Each segment list entry is a 3-tuple:
-        1/ 3-tuple being C, V, optional marker
-        2/ Segment list for book1
-        3/ Segment list for book2
+    reference is a 3-tuple being C, V, optional marker.
 
-    Each left-over list entry is a 2-tuple:
-        1/ 3-tuple being C, V, optional marker
-        2/ Error message string
+    Any problems are appended to abResults as (reference,errorMessage) 2-tuples.
     """
-    vPrint( 'Verbose', debuggingThisModule, f"segmentizeBooks( {book1}, {book2}, … ) for {book1.BBB}" )
-    assert isinstance( book1, BibleBook )
-    assert isinstance( book2, BibleBook )
-    assert book1.BBB == book2.BBB
-    assert book1.workName != book2.workName
-
-    abResults, segmentList = [], []
-    #if 'allWordCounts' not in dict1: dict1['allWordCounts'] = {}
-    #if 'allWordCounts' not in dict2: dict2['allWordCounts'] = {}
-    #if 'allCaseInsensitiveWordCounts' not in dict1: dict1['allCaseInsensitiveWordCounts'] = {}
-    #if 'allCaseInsensitiveWordCounts' not in dict2: dict2['allCaseInsensitiveWordCounts'] = {}
-
     len1, len2 = len(book1), len(book2)
     #dPrint( 'Quiet', debuggingThisModule, 'len', len1, len2 )
     if len1 != len2:
@@ -799,12 +848,7 @@ def segmentizeBooks( book1:BibleBook, book2:BibleBook ) -> Tuple[list,list]:
         if marker1 == marker2:
             numMismatchedMarkers = 0
             if (line1 or line2) and marker1 not in ( 'id','ide','rem', 'c','v', ): # Don't count these non-Bible-text fields
-                wordList1 = segmentizeLine( line1 )
-                wordList2 = segmentizeLine( line2 )
-                if len(wordList1) == len(wordList2): # both had the same number of segments
-                    for segment1List,segment2List in zip( wordList1, wordList2 ):
-                        if segment1List and segment2List:
-                            segmentList.append( (reference,segment1List,segment2List) )
+                yield reference, line1, line2
         else: # markers are different
             numMismatchedMarkers += 1
             if numMismatchedMarkers < MAX_MISMATCHED_MARKERS:
@@ -836,6 +880,43 @@ def segmentizeBooks( book1:BibleBook, book2:BibleBook ) -> Tuple[list,list]:
         abResults.append( (reference,"Extra marker{} remaining in book2: {!r}{}" \
                                 .format( '' if remaining==1 else 's ({})'.format( remaining ),
                                     book1._processedLines[ix2+offset2].getMarker(), '…' if remaining>1 else '' )) )
+# end of _iterMatchingLines
+
+
+def segmentizeBooks( book1:BibleBook, book2:BibleBook ) -> Tuple[list,list]:
+    """
+    Given two Bible book objects,
+        break them into a list of segments
+            as well as a list of left-overs if the segments don't match.
+
+    Each segment list entry is a 3-tuple:
+        1/ 3-tuple being C, V, optional marker
+        2/ Segment list for book1
+        3/ Segment list for book2
+
+    Each left-over list entry is a 2-tuple:
+        1/ 3-tuple being C, V, optional marker
+        2/ Error message string
+    """
+    vPrint( 'Verbose', debuggingThisModule, f"segmentizeBooks( {book1}, {book2}, … ) for {book1.BBB}" )
+    assert isinstance( book1, BibleBook )
+    assert isinstance( book2, BibleBook )
+    assert book1.BBB == book2.BBB
+    assert book1.workName != book2.workName
+
+    abResults, segmentList = [], []
+    #if 'allWordCounts' not in dict1: dict1['allWordCounts'] = {}
+    #if 'allWordCounts' not in dict2: dict2['allWordCounts'] = {}
+    #if 'allCaseInsensitiveWordCounts' not in dict1: dict1['allCaseInsensitiveWordCounts'] = {}
+    #if 'allCaseInsensitiveWordCounts' not in dict2: dict2['allCaseInsensitiveWordCounts'] = {}
+
+    for reference,line1,line2 in _iterMatchingLines( book1, book2, abResults ):
+        wordList1 = segmentizeLine( line1 )
+        wordList2 = segmentizeLine( line2 )
+        if len(wordList1) == len(wordList2): # both had the same number of segments
+            for segment1List,segment2List in zip( wordList1, wordList2 ):
+                if segment1List and segment2List:
+                    segmentList.append( (reference,segment1List,segment2List) )
 
     #dPrint( 'Quiet', debuggingThisModule, '\nsegmentList', len(segmentList), segmentList )
     #dPrint( 'Quiet', debuggingThisModule, '\nabResults', len(abResults), abResults )
@@ -975,15 +1056,260 @@ def analyzeWords( segmentList, dict12=None, dict21=None ):
 # end of CompareBibles.analyzeWords
 
 
-def analyzeBibles( Bible1:Bible, Bible2:Bible ) -> Dict[str,list]:
+class SegmentAligner:
+    """
+    Class for quickly checking a Bible against its back-translation
+        using the word compare dictionaries from loadWordCompares()
+        (giving the same results as segmentizeBooks() followed by analyzeWords()).
+
+    Each word is only normalized once and is then interned as an integer ID,
+        and the dictionary entries are compiled into tuples of word IDs
+        indexed by their first word,
+        so that each segment only checks the entries that it actually contains.
+
+    The results for each pair of lines are remembered (by a hash of their text)
+        so that analyzing the Bibles again after editing only redoes the lines that have changed.
     """
-    Given two Bible objects, break the two into words
+    def __init__( self, dict12=None, dict21=None, segmentEndPunctuation:str='.?!;:' ) -> None:
+        """
+        Compile the word compare dictionaries (either can be None).
+        """
+        fnPrint( debuggingThisModule, f"SegmentAligner.__init__( {None if dict12 is None else len(dict12)}, {None if dict21 is None else len(dict21)}, {segmentEndPunctuation!r} )" )
+        self.wordIDs:Dict[str,int] = {}
+        self.normalizedWords:Dict[str,Tuple[str,int]] = {} # Maps raw words to (word,wordID) or None
+        self.splitTable = str.maketrans( { **{char:'\x1e' for char in (segmentEndPunctuation or '')},
+                                            '—':' ', '–':' ' } ) # Treat em-dash and en-dash as word break characters
+        self.compiled12, self.compiled21 = self.compileWordCompares( dict12 ), self.compileWordCompares( dict21 )
+        self.lineResults = {} # Maps line hashes to (segmentPairs,messages) 2-tuples
+        # So a saved cache isn't used with different dictionaries
+        self.dictionariesHash = hashlib.md5( repr( (dict12,dict21,segmentEndPunctuation) ).encode( 'utf-8' ) ).hexdigest()
+    # end of SegmentAligner.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        This method returns the string representation of the aligner.
+        """
+        return "SegmentAligner object: {:,} words, {:,}+{:,} compare entries, {:,} cached lines" \
+                    .format( len(self.wordIDs), len(self.compiled12[0]), len(self.compiled21[0]), len(self.lineResults) )
+    # end of SegmentAligner.__str__
+
+
+    def getWordID( self, word:str ) -> int:
+        """
+        Returns the (interned) integer ID for the word.
+        """
+        try: return self.wordIDs[word]
+        except KeyError:
+            wordID = self.wordIDs[word] = len( self.wordIDs )
+            return wordID
+    # end of SegmentAligner.getWordID
+
+
+    def compileWordCompares( self, dictAB ):
+        """
+        Convert a word compare dictionary into a list of
+            (lEntry, isPhraseFlag, lWordIDs, list of rWordIDs) 4-tuples (in the same order)
+            and a dictionary mapping first word IDs to lists of indexes into that list.
+        """
+        entries, firstWordIndex = [], {}
+        if dictAB:
+            for lEntry,rEntryList in dictAB.items():
+                isPhraseFlag = ' ' in lEntry
+                lWordIDs = tuple( self.getWordID( word ) for word in (lEntry.split() if isPhraseFlag else (lEntry,)) )
+                if not lWordIDs: continue # Can never be found
+                firstWordIndex.setdefault( lWordIDs[0], [] ).append( len(entries) )
+                entries.append( (lEntry, isPhraseFlag, lWordIDs,
+                                    [tuple( self.getWordID( word ) for word in rEntry.split() ) if ' ' in rEntry
+                                        else (self.getWordID( rEntry ),) for rEntry in rEntryList]) )
+        return entries, firstWordIndex
+    # end of SegmentAligner.compileWordCompares
+
+
+    def tokenizeLine( self, line:str ) -> List[Tuple[Tuple[str,...],Tuple[int,...]]]:
+        """
+        Break the line into segments of normalized words like segmentizeLine() does.
+
+        Returns a list of (words,wordIDs) 2-tuples, one for each segment.
+        """
+        normalizedWords = self.normalizedWords
+        lineList = []
+        for segment in line.translate( self.splitTable ).split( '\x1e' ):
+            words, wordIDs = [], []
+            for rawWord in segment.split():
+                try: normalizedWord = normalizedWords[rawWord]
+                except KeyError:
+                    word = normalizeSegmentWord( rawWord )
+                    normalizedWord = normalizedWords[rawWord] = (word,self.getWordID( word )) if word else None
+                if normalizedWord is not None:
+                    words.append( normalizedWord[0] ); wordIDs.append( normalizedWord[1] )
+            lineList.append( (tuple(words),tuple(wordIDs)) )
+        return lineList
+    # end of SegmentAligner.tokenizeLine
+
+
+    @staticmethod
+    def _countOccurrences( wordIDs:Tuple[int,...], segmentIDs:Tuple[int,...], segmentCounter:Counter, positions:Dict[int,List[int]] ) -> int:
+        """
+        Count how many times the word or phrase (which may overlap itself) occurs in the segment.
+        """
+        if len(wordIDs) == 1: return segmentCounter[wordIDs[0]]
+        if not wordIDs or wordIDs[0] not in positions: return 0
+        numWords = len( wordIDs )
+        return sum( 1 for ix in positions[wordIDs[0]] if segmentIDs[ix:ix+numWords] == wordIDs )
+    # end of SegmentAligner._countOccurrences
+
+
+    def analyzeSegment( self, segmentA, segmentB, compiledAB ) -> List[str]:
+        """
+        Check that the dictionary entries found in segmentA
+            have enough of their corresponding words in segmentB
+            (like analyzeWordsInSegment() does).
+
+        Returns a list of error messages.
+        """
+        entries, firstWordIndex = compiledAB
+        (wordsA,wordIDsA), (wordsB,wordIDsB) = segmentA, segmentB
+        counterA, counterB = Counter( wordIDsA ), Counter( wordIDsB )
+        candidates = sorted( ix for wordID in counterA if wordID in firstWordIndex for ix in firstWordIndex[wordID] )
+        if not candidates: return []
+
+        positionsA, positionsB = {}, {}
+        for positions,wordIDs in ((positionsA,wordIDsA), (positionsB,wordIDsB)):
+            for ix,wordID in enumerate( wordIDs ): positions.setdefault( wordID, [] ).append( ix )
+
+        messages = []
+        foundLPhraseIDs = set()
+        for ix in candidates: # in the original dictionary order
+            lEntry, isPhraseFlag, lWordIDs, rWordIDsList = entries[ix]
+            lCount = self._countOccurrences( lWordIDs, wordIDsA, counterA, positionsA )
+            if not lCount: continue
+            if isPhraseFlag: foundLPhraseIDs.update( lWordIDs )
+            rCount = sum( self._countOccurrences( rWordIDs, wordIDsB, counterB, positionsB ) for rWordIDs in rWordIDsList )
+            if lCount > rCount:
+                if not isPhraseFlag and lWordIDs[0] in foundLPhraseIDs:
+                    vPrint( 'Info', debuggingThisModule, "  SegmentAligner.analyzeSegment: Skipping {!r} because already found in a phrase".format( lEntry ) )
+                else:
+                    messages.append( "{!r} from {}\n   not enough ({}/{}) in {}".format( lEntry, list(wordsA), lCount, rCount, list(wordsB) ) )
+        return messages
+    # end of SegmentAligner.analyzeSegment
+
+
+    def analyzeLines( self, line1:str, line2:str ):
+        """
+        Segmentize and check the two lines (or get the previous results if they haven't changed).
+
+        Returns the line hash, the list of (words1,words2) segment pairs,
+            the list of error messages, and True if the results were newly made.
+        """
+        lineHash = hashlib.md5( f'{line1}\x00{line2}'.encode( 'utf-8', 'surrogatepass' ) ).digest()
+        try: return (lineHash,) + self.lineResults[lineHash] + (False,)
+        except KeyError: pass
+
+        segmentPairs, messages = [], []
+        lineList1, lineList2 = self.tokenizeLine( line1 ), self.tokenizeLine( line2 )
+        if len(lineList1) == len(lineList2): # both had the same number of segments
+            for segment1,segment2 in zip( lineList1, lineList2 ):
+                if segment1[0] and segment2[0]:
+                    segmentPairs.append( (segment1[0],segment2[0]) )
+                    if self.compiled12[0]: messages.extend( self.analyzeSegment( segment1, segment2, self.compiled12 ) )
+                    if self.compiled21[0]: messages.extend( self.analyzeSegment( segment2, segment1, self.compiled21 ) )
+        self.lineResults[lineHash] = segmentPairs, messages
+        return lineHash, segmentPairs, messages, True
+    # end of SegmentAligner.analyzeLines
+
+
+    def analyzeBooks( self, book1:BibleBook, book2:BibleBook ):
+        """
+        Given two Bible book objects, segmentize and check them.
+
+        Returns the segment list and the list of left-overs (like segmentizeBooks() does),
+            the list of word results (like analyzeWords() does),
+            and a dictionary of the newly made line results (for updating another aligner).
+        """
+        vPrint( 'Verbose', debuggingThisModule, f"SegmentAligner.analyzeBooks( {book1}, {book2} ) for {book1.BBB}" )
+        assert book1.BBB == book2.BBB
+        assert book1.workName != book2.workName
+
+        segmentList, abResults, awResults, newLineResults = [], [], [], {}
+        for reference,line1,line2 in _iterMatchingLines( book1, book2, abResults ):
+            lineHash, segmentPairs, messages, newFlag = self.analyzeLines( line1, line2 )
+            if newFlag: newLineResults[lineHash] = segmentPairs, messages
+            for words1,words2 in segmentPairs:
+                segmentList.append( (reference,list(words1),list(words2)) )
+            for message in messages:
+                awResults.append( (reference,message) )
+        return segmentList, abResults, awResults, newLineResults
+    # end of SegmentAligner.analyzeBooks
+
+
+    def analyzeBibles( self, Bible1:Bible, Bible2:Bible, BBBs:Optional[List[str]]=None ) -> Dict[str,Tuple[list,list]]:
+        """
+        Segmentize and check the books that are in both Bibles
+            (using multiple processes if allowed).
+
+        Returns a dictionary mapping BBB to (leftOverResults,wordResults) 2-tuples.
+        """
+        fnPrint( debuggingThisModule, f"SegmentAligner.analyzeBibles( {Bible1}, {Bible2}, {BBBs} )" )
+        if BBBs is None: BBBs = [bBook.BBB for bBook in Bible1 if bBook.BBB in Bible2]
+
+        results = {}
+        for BBB,(abResults,awResults,newLineResults) in iterCompareBibleBooks( Bible1, Bible2, BBBs, _analyzeBooksWithAligner, aligner=self ):
+            self.lineResults.update( newLineResults ) # In case it was done in another process
+            results[BBB] = abResults, awResults
+        return { BBB:results[BBB] for BBB in BBBs } # Put them back in the correct order
+    # end of SegmentAligner.analyzeBibles
+
+
+    def saveLineResults( self, filename:str, folderName=None ) -> bool:
+        """
+        Save the line results so that they can be reused in the next session.
+
+        If folderName is None (or missing), uses the default cache folder.
+        """
+        return BibleOrgSysGlobals.pickleObject( (self.dictionariesHash,self.lineResults), filename, folderName )
+    # end of SegmentAligner.saveLineResults
+
+    def loadLineResults( self, filename:str, folderName=None ) -> int:
+        """
+        Load previously saved line results (if they were made with the same dictionaries).
+
+        Returns the number of lines loaded.
+        """
+        try: dictionariesHash, lineResults = BibleOrgSysGlobals.unpickleObject( filename, folderName )
+        except FileNotFoundError: return 0
+        if dictionariesHash != self.dictionariesHash:
+            vPrint( 'Normal', debuggingThisModule, _("SegmentAligner: Ignoring {} which was made with different dictionaries").format( filename ) )
+            return 0
+        self.lineResults.update( lineResults )
+        return len( lineResults )
+    # end of SegmentAligner.loadLineResults
+# end of class SegmentAligner
+
+
+def _analyzeBooksWithAligner( book1:BibleBook, book2:BibleBook, aligner:SegmentAligner ): # for multiprocessing
+    """
+    Returns the left-over and word results, and the newly made line results
+        (but not the segment list which isn't needed by analyzeBibles).
+    """
+    return aligner.analyzeBooks( book1, book2 )[1:]
+# end of CompareBibles._analyzeBooksWithAligner
+
+
+
+def analyzeBibles( Bible1:Bible, Bible2:Bible, dict12=None, dict21=None, aligner:Optional[SegmentAligner]=None ) -> Dict[str,list]:
+    """
+    Given two Bible objects, break the two into segments of words
+        and check the words using the (optional) word compare dictionaries from loadWordCompares()
         and return a dictionary.
 
     This is typically used to compare a translation and a matching back-translation.
 
-    The returned list is sorted by C:V
-    Each list entry is a 2-tuple, being BCV and error message.
+    If an aligner is given (instead of the dictionaries), it can be reused after editing
+        so that only the changed lines are checked again.
+
+    The returned dictionary maps BBB to a list.
+    Each list entry is a 2-tuple, being C/V/marker and error message.
     """
     vPrint( 'Verbose', debuggingThisModule, "analyzeBibles( {}, {} )".format( Bible1, Bible2 ) )
     assert isinstance( Bible1, Bible )
@@ -993,31 +1319,13 @@ def analyzeBibles( Bible1:Bible, Bible2:Bible ) -> Dict[str,list]:
     assert Bible2.discoveryResults
     vPrint( 'Quiet', debuggingThisModule, _("Running analyzeBibles…") )
 
-    bSegmentList, bResults = {}, {}
-
-    len1, len2 = len(Bible1), len(Bible2)
-    commonBooks = []
-    for bBook in Bible1:
-        if bBook.BBB in Bible2: commonBooks.append( bBook.BBB )
-    numBooks = len( commonBooks )
+    if aligner is None: aligner = SegmentAligner( dict12, dict21 )
+    else: assert dict12 is None and dict21 is None
 
-    vPrint( 'Info', debuggingThisModule, _("Running segmentizeBooks on both Bibles…") )
-    if BibleOrgSysGlobals.maxProcesses > 1: # Check all the books as quickly as possible
-        vPrint( 'Normal', debuggingThisModule, _("Comparing {} books using {} processes…").format( numBooks, BibleOrgSysGlobals.maxProcesses ) )
-        vPrint( 'Normal', debuggingThisModule, "  NOTE: Outputs (including error and warning messages) from scanning various books may be interspersed." )
-        BibleOrgSysGlobals.alreadyMultiprocessing = True
-        with multiprocessing.Pool( processes=BibleOrgSysGlobals.maxProcesses ) as pool: # start worker processes
-            results = pool.map( _doCompare, [(BBB,Bible1,Bible2) for BBB in commonBooks] ) # have the pool do our loads
-            assert len(results) == numBooks
-            for j,BBB in enumerate( commonBooks ):
-                bResults[BBB] = results[j] # Saves them in the correct order
-        BibleOrgSysGlobals.alreadyMultiprocessing = False
-    else: # Just single threaded
-        for BBB in commonBooks: # Do individual book prechecks
-            vPrint( 'Verbose', debuggingThisModule, "  " + _("Comparing {}…").format( BBB ) )
-            bSegmentList[BBB], bResults[BBB] = segmentizeBooks( Bible1[BBB], Bible2[BBB] ) #, abResults1, abResults2 )
-            vPrint( 'Quiet', debuggingThisModule, BBB, bSegmentList[BBB] )
-            vPrint( 'Quiet', debuggingThisModule, BBB, bResults[BBB] )
+    vPrint( 'Info', debuggingThisModule, _("Running SegmentAligner on both Bibles…") )
+    bResults = {}
+    for BBB,(abResults,awResults) in aligner.analyzeBibles( Bible1, Bible2 ).items():
+        bResults[BBB] = abResults + awResults
     return bResults
 # end of CompareBibles.analyzeBibles
 
@@ -1057,28 +1365,17 @@ def compareBibles( Bible1, Bible2,
     numBooks = len( commonBooks )
 
     vPrint( 'Info', debuggingThisModule, _("Running compareBooksPedantic on both Bibles…") )
-    bResults = {}
-    if BibleOrgSysGlobals.maxProcesses > 1: # Check all the books as quickly as possible
-        vPrint( 'Normal', debuggingThisModule, _("Comparing {} books using {} processes…").format( numBooks, BibleOrgSysGlobals.maxProcesses ) )
-        vPrint( 'Normal', debuggingThisModule, "  NOTE: Outputs (including error and warning messages) from scanning various books may be interspersed." )
-        BibleOrgSysGlobals.alreadyMultiprocessing = True
-        with multiprocessing.Pool( processes=BibleOrgSysGlobals.maxProcesses ) as pool: # start worker processes
-            results = pool.map( _doCompare, [(BBB,Bible1,Bible2) for BBB in commonBooks] ) # have the pool do our loads
-            assert len(results) == numBooks
-            for j,BBB in enumerate( commonBooks ):
-                bResults[BBB] = results[j] # Saves them in the correct order
-        BibleOrgSysGlobals.alreadyMultiprocessing = False
-    else: # Just single threaded
-        for BBB in commonBooks: # Do individual book prechecks
-            vPrint( 'Verbose', debuggingThisModule, "  " + _("Comparing {}…").format( BBB ) )
-            bResults[BBB] = compareBooksPedantic( Bible1[BBB], Bible2[BBB], compareQuotes=compareQuotes,
-                                                comparePunctuation=comparePunctuation, compareDigits=compareDigits,
-                                                illegalCleanTextOnlyStrings1=illegalCleanTextOnlyStrings1, illegalCleanTextOnlyStrings2=illegalCleanTextOnlyStrings2,
-                                                illegalCompleteLineStrings1=illegalCompleteLineStrings1, illegalCompleteLineStrings2=illegalCompleteLineStrings2,
-                                                legalPairs1=legalPairs1, legalPairs2=legalPairs2,
-                                                matchingPairs=matchingPairs,
-                                                illegalCompleteLineRegexes1=illegalCompleteLineRegexes1, illegalCompleteLineRegexes2=illegalCompleteLineRegexes2,
-                                                breakOnOne=breakOnOne )
+    unorderedResults = dict( iterCompareBibleBooks( Bible1, Bible2, commonBooks, compareBooksPedantic,
+                                        compareQuotes=compareQuotes,
+                                        comparePunctuation=comparePunctuation, compareDigits=compareDigits,
+                                        illegalCleanTextOnlyStrings1=illegalCleanTextOnlyStrings1, illegalCleanTextOnlyStrings2=illegalCleanTextOnlyStrings2,
+                                        illegalCompleteLineStrings1=illegalCompleteLineStrings1, illegalCompleteLineStrings2=illegalCompleteLineStrings2,
+                                        legalPairs1=legalPairs1, legalPairs2=legalPairs2,
+                                        matchingPairs=matchingPairs,
+                                        illegalCompleteLineRegexes1=illegalCompleteLineRegexes1, illegalCompleteLineRegexes2=illegalCompleteLineRegexes2,
+                                        breakOnOne=breakOnOne ) )
+    assert len(unorderedResults) == numBooks
+    bResults = { BBB:unorderedResults[BBB] for BBB in commonBooks } # Saves them in the correct order
     return bResults
 # end of CompareBibles.compareBibles
 
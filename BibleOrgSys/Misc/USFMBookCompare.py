@@ -5,7 +5,7 @@
 #
 # Module comparing USFM Bible book files
 #
-# Copyright (C) 2016-2020 Robert Hunt
+# Copyright (C) 2016-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -30,14 +30,22 @@ Module comparing USFM Bible book files
 Given two file paths, reads and compares the USFM Bible books
     and returns or prints a dictionary of results.
 
+USFMBookDiff (and USFMFolderDiff for folders of books) aligns the verses
+    of the two books by their C:V references (using patience diff)
+    and returns the changed, inserted, and deleted verses.
+
 This also functions as a stand-alone program.
 
 TODO: Needs internationalisation _("around strings")
 """
 
 from gettext import gettext as _
+from typing import Dict, List, Tuple, Any, Optional
+from collections import Counter
 import os
 import logging
+import bisect
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
 
@@ -50,12 +58,13 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 #from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys.InputOutput.USFMFile import USFMFile
+from BibleOrgSys.InputOutput.USFMFilenames import USFMFilenames
 
 
-LAST_MODIFIED_DATE = '2020-04-12' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "USFMBookCompare"
 PROGRAM_NAME = "USFM book file comparator"
-PROGRAM_VERSION = '0.17'
+PROGRAM_VERSION = '0.19'
 programNameVersion = '{} v{}'.format( SHORT_PROGRAM_NAME, PROGRAM_VERSION )
 
 debuggingThisModule = False
@@ -274,6 +283,13 @@ def USFMBookCompare( filepath1, filepath2, file1Name='file1', file2Name='file2'
         lineIndex += 1
 
 
+    # Find the verse-level differences
+    deltaCounts = Counter( delta[0] for delta in diffUSFMLines( uf1.lines, uf2.lines ) )
+    if deltaCounts:
+        resultDict['Summary']['Verses'] = "{} changed, {} only in {}, {} only in {}" \
+                    .format( deltaCounts['changed'], deltaCounts['deleted'], file1Name, deltaCounts['inserted'], file2Name )
+
+
     # Clean up and return
     for something,value in list( resultDict['Different'].items() ):
         if not value: del resultDict['Different'][something]
@@ -282,6 +298,246 @@ def USFMBookCompare( filepath1, filepath2, file1Name='file1', file2Name='file2'
 
 
 
+def tokenizeUSFMLines( lines:List[Tuple[str,str]] ) -> List[Tuple[str,str,str]]:
+    """
+    Given the (marker,text) 2-tuples from a USFMFile object,
+        return a list of (marker,C:V,text) 3-tuples.
+
+    Lines before the first chapter or verse marker (i.e., the book introduction) are in '0:0',
+        and lines after a chapter marker but before the first verse marker are in 'C:0'.
+    """
+    records = []
+    C, V = '0', '0'
+    for marker,text in lines:
+        if marker == 'c':
+            C, V = text.split()[0] if text.strip() else '?', '0'
+        elif marker == 'v':
+            if C == '0': C = '1' # Some one chapter books might not have a C marker
+            V = text.split()[0] if text.strip() else '?'
+        records.append( (marker,f'{C}:{V}',text) )
+    return records
+# end of USFMBookCompare.tokenizeUSFMLines
+
+
+def _groupRecords( records:List[Tuple[str,str,str]] ) -> Tuple[List[str],List[tuple]]:
+    """
+    Group consecutive records with the same C:V together.
+
+    Returns a list of C:V references and a matching list of tuples of (marker,text) lines.
+    """
+    references, units = [], []
+    for marker,reference,text in records:
+        if not references or reference != references[-1]:
+            references.append( reference ); units.append( [] )
+        units[-1].append( (marker,text) )
+    return references, [tuple(unit) for unit in units]
+# end of USFMBookCompare._groupRecords
+
+
+def _myersMiddleSnake( sequence1, start1:int, end1:int, sequence2, start2:int, end2:int ) -> Tuple[int,int,int,int]:
+    """
+    Runs Myers' forward and reverse searches at the same time until they overlap
+        (only keeping the furthest reaching x for each diagonal, so using linear space).
+
+    Returns (x,y,u,v) for the middle snake which goes from (x,y) to (u,v)
+        (relative to start1 and start2) on an optimal edit path.
+    """
+    len1, len2 = end1 - start1, end2 - start2
+    delta = len1 - len2
+    oddDelta = delta % 2 == 1
+    maxD = (len1 + len2 + 1) // 2
+    offset = maxD + 1
+    forwardV, reverseV = [0] * (2*maxD + 3), [0] * (2*maxD + 3) # Furthest x (from each end) for each diagonal k
+    for d in range( maxD + 1 ):
+        for k in range( -d, d+1, 2 ): # Forward from the start
+            x = forwardV[offset+k+1] if k==-d or (k!=d and forwardV[offset+k-1] < forwardV[offset+k+1]) else forwardV[offset+k-1] + 1
+            y = x - k
+            snakeX, snakeY = x, y
+            while x < len1 and y < len2 and sequence1[start1+x] == sequence2[start2+y]: x += 1; y += 1
+            forwardV[offset+k] = x
+            if oddDelta and -(d-1) <= delta-k <= d-1 and x + reverseV[offset+delta-k] >= len1:
+                return snakeX, snakeY, x, y
+        for k in range( -d, d+1, 2 ): # Reverse from the end
+            x = reverseV[offset+k+1] if k==-d or (k!=d and reverseV[offset+k-1] < reverseV[offset+k+1]) else reverseV[offset+k-1] + 1
+            y = x - k
+            snakeX, snakeY = x, y
+            while x < len1 and y < len2 and sequence1[end1-1-x] == sequence2[end2-1-y]: x += 1; y += 1
+            reverseV[offset+k] = x
+            if not oddDelta and -d <= delta-k <= d and x + forwardV[offset+delta-k] >= len1:
+                return len1-x, len2-y, len1-snakeX, len2-snakeY
+    raise ValueError( "No middle snake found" ) # Shouldn't happen
+# end of USFMBookCompare._myersMiddleSnake
+
+
+def _myersMatchRange( sequence1, start1:int, end1:int, sequence2, start2:int, end2:int, matches:list ) -> None:
+    """
+    Appends (index1,index2) 2-tuples for the entries of a longest common subsequence
+        of sequence1[start1:end1] and sequence2[start2:end2] to matches
+        by recursively matching either side of the middle snake.
+    """
+    while start1 < end1 and start2 < end2 and sequence1[start1] == sequence2[start2]:
+        matches.append( (start1,start2) ); start1 += 1; start2 += 1
+    suffixMatches = []
+    while start1 < end1 and start2 < end2 and sequence1[end1-1] == sequence2[end2-1]:
+        end1 -= 1; end2 -= 1; suffixMatches.append( (end1,end2) )
+
+    if start1 < end1 and start2 < end2: # Otherwise there's nothing more to match
+        x, y, u, v = _myersMiddleSnake( sequence1, start1, end1, sequence2, start2, end2 )
+        _myersMatchRange( sequence1, start1, start1+x, sequence2, start2, start2+y, matches )
+        matches.extend( (start1+ix, start2+y-x+ix) for ix in range( x, u ) )
+        _myersMatchRange( sequence1, start1+u, end1, sequence2, start2+v, end2, matches )
+
+    suffixMatches.reverse()
+    matches.extend( suffixMatches )
+# end of USFMBookCompare._myersMatchRange
+
+
+def _myersMatch( sequence1, sequence2 ) -> List[Tuple[int,int]]:
+    """
+    Uses Eugene Myers' O(ND) difference algorithm
+        to find a longest common subsequence of the two sequences.
+
+    This is the linear space version (which finds the middle snake and then divides and conquers)
+        so that we don't have to save the furthest reaching paths for every D
+        (which takes O(D**2) memory for very different sequences).
+
+    Returns a list of (index1,index2) 2-tuples for the matching entries (in order).
+    """
+    matches = []
+    _myersMatchRange( sequence1, 0, len(sequence1), sequence2, 0, len(sequence2), matches )
+    return matches
+# end of USFMBookCompare._myersMatch
+
+
+def _patienceMatch( keys1:List[str], keys2:List[str], start1:int, end1:int, start2:int, end2:int, matches:list ) -> None:
+    """
+    Uses patience diff to append (index1,index2) 2-tuples for the matching keys
+        in keys1[start1:end1] and keys2[start2:end2] to matches.
+
+    The keys that occur exactly once in both ranges (normally all the C:V references) are the anchors.
+    Falls back to _myersMatch if there are no anchors.
+    """
+    # Match any common start and end
+    while start1 < end1 and start2 < end2 and keys1[start1] == keys2[start2]:
+        matches.append( (start1,start2) ); start1 += 1; start2 += 1
+    suffixMatches = []
+    while start1 < end1 and start2 < end2 and keys1[end1-1] == keys2[end2-1]:
+        end1 -= 1; end2 -= 1; suffixMatches.append( (end1,end2) )
+
+    if start1 < end1 and start2 < end2:
+        counts1, counts2 = Counter( keys1[start1:end1] ), Counter( keys2[start2:end2] )
+        positions2 = { keys2[ix2]:ix2 for ix2 in range( start2, end2 ) if counts2[keys2[ix2]] == 1 }
+        uniqueMatches = [(ix1,positions2[keys1[ix1]]) for ix1 in range( start1, end1 )
+                                    if counts1[keys1[ix1]] == 1 and keys1[ix1] in positions2]
+        if uniqueMatches:
+            # Find the longest increasing subsequence (of index2) using patience sorting
+            pileTops, pileTopIndexes, backPointers = [], [], []
+            for ix,(ix1,ix2) in enumerate( uniqueMatches ):
+                pileIndex = bisect.bisect_left( pileTops, ix2 )
+                backPointers.append( pileTopIndexes[pileIndex-1] if pileIndex else None )
+                if pileIndex == len(pileTops): pileTops.append( ix2 ); pileTopIndexes.append( ix )
+                else: pileTops[pileIndex], pileTopIndexes[pileIndex] = ix2, ix
+            anchors, ix = [], pileTopIndexes[-1]
+            while ix is not None:
+                anchors.append( uniqueMatches[ix] ); ix = backPointers[ix]
+            anchors.reverse()
+
+            # Now recursively match the gaps between the anchors
+            for anchor1,anchor2 in anchors:
+                _patienceMatch( keys1, keys2, start1, anchor1, start2, anchor2, matches )
+                matches.append( (anchor1,anchor2) )
+                start1, start2 = anchor1 + 1, anchor2 + 1
+            _patienceMatch( keys1, keys2, start1, end1, start2, end2, matches )
+        else:
+            for ix1,ix2 in _myersMatch( keys1[start1:end1], keys2[start2:end2] ):
+                matches.append( (start1+ix1,start2+ix2) )
+
+    suffixMatches.reverse()
+    matches.extend( suffixMatches )
+# end of USFMBookCompare._patienceMatch
+
+
+def diffUSFMLines( lines1:List[Tuple[str,str]], lines2:List[Tuple[str,str]] ) -> List[Tuple[str,str,tuple,tuple]]:
+    """
+    Given the (marker,text) 2-tuples from two USFMFile objects,
+        align the verses by their C:V references and find the differences.
+
+    Returns a list of (changeType,C:V,lines1,lines2) 4-tuples
+        where changeType is 'deleted' (only in lines1), 'inserted' (only in lines2), or 'changed',
+        and lines1 and lines2 are tuples of the (marker,text) lines for that verse.
+    """
+    references1, units1 = _groupRecords( tokenizeUSFMLines( lines1 ) )
+    references2, units2 = _groupRecords( tokenizeUSFMLines( lines2 ) )
+    matches = []
+    _patienceMatch( references1, references2, 0, len(references1), 0, len(references2), matches )
+
+    deltas = []
+    ix1 = ix2 = 0
+    for match1,match2 in matches + [(len(references1),len(references2))]:
+        while ix1 < match1:
+            deltas.append( ('deleted',references1[ix1],units1[ix1],()) ); ix1 += 1
+        while ix2 < match2:
+            deltas.append( ('inserted',references2[ix2],(),units2[ix2]) ); ix2 += 1
+        if match1 < len(references1) and units1[match1] != units2[match2]:
+            deltas.append( ('changed',references1[match1],units1[match1],units2[match2]) )
+        ix1, ix2 = match1 + 1, match2 + 1
+    return deltas
+# end of USFMBookCompare.diffUSFMLines
+
+
+def USFMBookDiff( filepath1, filepath2, encoding:Optional[str]=None ) -> List[Tuple[str,str,tuple,tuple]]:
+    """
+    Given two USFM Bible book filepaths, return the verse differences
+        as a list of (changeType,C:V,lines1,lines2) 4-tuples (see diffUSFMLines).
+    """
+    fnPrint( debuggingThisModule, f"USFMBookDiff( {filepath1}, {filepath2}, {encoding} )" )
+    uf1, uf2 = USFMFile(), USFMFile()
+    uf1.read( filepath1, encoding=encoding )
+    uf2.read( filepath2, encoding=encoding )
+    return diffUSFMLines( uf1.lines, uf2.lines )
+# end of USFMBookCompare.USFMBookDiff
+
+def _USFMBookDiffMP( parameters:Tuple[str,str,str,Optional[str]] ): # for multiprocessing
+    BBB, filepath1, filepath2, encoding = parameters
+    return BBB, USFMBookDiff( filepath1, filepath2, encoding )
+# end of USFMBookCompare._USFMBookDiffMP
+
+
+def USFMFolderDiff( folderpath1, folderpath2, encoding:Optional[str]=None ) -> Dict[str,Any]:
+    """
+    Given two folders of USFM Bible book files, pair up the books (by BBB)
+        and find the verse differences for each pair (using multiple processes if allowed).
+
+    Returns a dictionary with 'Deltas' (a dictionary of BBB to the lists from USFMBookDiff)
+        and 'OnlyIn1' and 'OnlyIn2' (lists of BBBs).
+    """
+    fnPrint( debuggingThisModule, f"USFMFolderDiff( {folderpath1}, {folderpath2}, {encoding} )" )
+    filenames1 = dict( USFMFilenames( folderpath1 ).getMaximumPossibleFilenameTuples() )
+    filenames2 = dict( USFMFilenames( folderpath2 ).getMaximumPossibleFilenameTuples() )
+    resultDict = { 'Deltas':{},
+                    'OnlyIn1':[BBB for BBB in filenames1 if BBB not in filenames2],
+                    'OnlyIn2':[BBB for BBB in filenames2 if BBB not in filenames1] }
+    parameters = [(BBB, os.path.join( folderpath1, filename ), os.path.join( folderpath2, filenames2[BBB] ), encoding)
+                                for BBB,filename in filenames1.items() if BBB in filenames2]
+
+    if BibleOrgSysGlobals.maxProcesses > 1 and len(parameters) > 1 \
+    and not BibleOrgSysGlobals.alreadyMultiprocessing: # Compare all the books as quickly as possible
+        vPrint( 'Normal', debuggingThisModule, _("Comparing {} USFM books using {} processes…").format( len(parameters), BibleOrgSysGlobals.maxProcesses ) )
+        vPrint( 'Normal', debuggingThisModule, _("  NOTE: Outputs (including error and warning messages) from comparing various books may be interspersed.") )
+        BibleOrgSysGlobals.alreadyMultiprocessing = True
+        try:
+            with multiprocessing.Pool( processes=min( BibleOrgSysGlobals.maxProcesses, len(parameters) ) ) as pool: # start worker processes
+                unorderedResults = dict( pool.imap_unordered( _USFMBookDiffMP, parameters ) ) # have the pool do our compares
+        finally: BibleOrgSysGlobals.alreadyMultiprocessing = False
+    else: # Just single threaded
+        unorderedResults = dict( _USFMBookDiffMP( parameter ) for parameter in parameters )
+    for BBB,_filepath1,_filepath2,_encoding in parameters: # Put them back in the correct order
+        resultDict['Deltas'][BBB] = unorderedResults[BBB]
+    return resultDict
+# end of USFMBookCompare.USFMFolderDiff
+
+
+
 def briefDemo() -> None:
     """
     Brief demo to check class is working -- must be fast
@@ -64,7 +64,6 @@ More details are available from https://www.digitalbibleplatform.com/docs.
 from gettext import gettext as _
 import os
 import logging
-import urllib.request
 import json
 from pathlib import Path
 
@@ -77,12 +76,13 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys.Online.GenericOnlineBible import GenericOnlineBible
+from BibleOrgSys.Online.HTTPSession import getSharedHTTPSession
 
 
-LAST_MODIFIED_DATE = '2020-04-14' # by RJH
+LAST_MODIFIED_DATE = '2021-01-29' # by RJH
 SHORT_PROGRAM_NAME = "DigitalBiblePlatform"
 PROGRAM_NAME = "Digital Bible Platform online handler"
-PROGRAM_VERSION = '0.23'
+PROGRAM_VERSION = '0.25'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -160,11 +160,9 @@ class DBPBibles:
 
         requestString = '{}{}{}{}'.format( URL_BASE, fieldREST, self.URLFixedData, '&'+additionalParameters if additionalParameters else '' )
         #dPrint( 'Quiet', debuggingThisModule, "Request string is", repr(requestString) )
-        try: HTTPResponseObject = urllib.request.urlopen( requestString )
-        except urllib.error.URLError as err:
-            #errorClass, exceptionInstance, traceback = sys.exc_info()
-            #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-            logging.error( "DBP URLError '{}' from {}".format( err, requestString ) )
+        HTTPResponseObject = getSharedHTTPSession().get( requestString )
+        if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+            logging.error( "DBP error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', requestString ) )
             return None
         #dPrint( 'Quiet', debuggingThisModule, "HTTPResponseObject", HTTPResponseObject )
         contentType = HTTPResponseObject.info().get( 'content-type' )
@@ -496,6 +494,7 @@ class DBPBible( GenericOnlineBible ):
         GenericOnlineBible.__init__( self )
 
         self.damRoot = damRoot
+        self.verseCacheName = f'DBP:{damRoot}'
         self.key = getSecurityKey() # Our personal key
         self.URLFixedData = '?v={}&key={}'.format( DBP_VERSION, self.key )
 
@@ -564,8 +563,8 @@ class DBPBible( GenericOnlineBible ):
         vPrint( 'Info', debuggingThisModule, "Requesting data from {} for {}…".format( URL_BASE, self.damRoot ) )
         requestString = "{}{}{}{}".format( URL_BASE, fieldREST, self.URLFixedData, '&'+additionalParameters if additionalParameters else '' )
         #dPrint( 'Quiet', debuggingThisModule, "Request string is", repr(requestString) )
-        try: responseJSON = urllib.request.urlopen( requestString )
-        except urllib.error.URLError:
+        responseJSON = getSharedHTTPSession().get( requestString )
+        if responseJSON is None or responseJSON.status != 200:
             if BibleOrgSysGlobals.debugFlag: logging.critical( "DBPBible.getOnlineData: error fetching {!r} {!r}".format( fieldREST, additionalParameters ) )
             return None
         responseSTR = responseJSON.read().decode('utf-8')
@@ -573,6 +572,57 @@ class DBPBible( GenericOnlineBible ):
     # end of DBPBible.getOnlineData
 
 
+    def getVerseParameters( self, key ) -> str:
+        """
+        Returns the additional parameters for requesting the verse text.
+        """
+        info = self.books[key.getBBB()]
+        return 'dam_id={}&book_id={}&chapter_id={}&verse_start={}'.format( info['dam_id']+'2ET', info['book_id'], key.getChapterNumber(), key.getVerseNumber() )
+    # end of DBPBible.getVerseParameters
+
+
+    def makeVerseDataList( self, key, rawData ):
+        """
+        Convert the DBP JSON data for a verse to our verse data list
+            and add it to the cache.
+        """
+        resultList = []
+        if isinstance( rawData, list ) and len(rawData)==1:
+            rawDataDict = rawData[0]
+            #dPrint( 'Quiet', debuggingThisModule, len(rawDataDict), rawDataDict )
+            assert len(rawDataDict)==8 and isinstance( rawDataDict, dict )
+            resultList.append( ('p#','p#',rawDataDict['paragraph_number'],rawDataDict['paragraph_number'],[]) ) # Must be first for Biblelator
+            if key.getVerseNumber()=='1': resultList.append( ('c#','c#',rawDataDict['chapter_id'],rawDataDict['chapter_id'],[]) )
+            resultList.append( ('v','v',rawDataDict['verse_id'],rawDataDict['verse_id'],[]) )
+            resultList.append( ('v~','v~',rawDataDict['verse_text'].strip(),rawDataDict['verse_text'].strip(),[]) )
+            GenericOnlineBible.cacheVerse( self, key, resultList )
+        return resultList
+    # end of DBPBible.makeVerseDataList
+
+
+    def prefetchVerses( self, keys ) -> None:
+        """
+        Fetch the given verses (that aren't already cached) concurrently
+            and put them into the verse cache,
+            e.g., for a whole chapter before it's displayed.
+        """
+        fnPrint( debuggingThisModule, "DBPBible.prefetchVerses( {} keys ) for {!r}".format( len(keys), self.damRoot ) )
+
+        requestStrings = {}
+        for key in keys:
+            if key.getBBB() in self.books \
+            and not isinstance( GenericOnlineBible.getCachedVerseDataList( self, key ), list ):
+                requestStrings[key] = "{}text/verse{}&{}".format( URL_BASE, self.URLFixedData, self.getVerseParameters( key ) )
+        if not requestStrings: return
+        vPrint( 'Info', debuggingThisModule, "Prefetching {} verses from {} for {}…".format( len(requestStrings), URL_BASE, self.damRoot ) )
+        results = getSharedHTTPSession().getMany( requestStrings.values() )
+        for key,requestString in requestStrings.items():
+            responseJSON = results[requestString]
+            if responseJSON is not None and responseJSON.status == 200:
+                self.makeVerseDataList( key, json.loads( responseJSON.read().decode('utf-8') ) )
+    # end of DBPBible.prefetchVerses
+
+
     def getVerseDataList( self, key ):
         """
         Equivalent to the one in InternalBible, except we may have to fetch the data.
@@ -584,19 +634,8 @@ class DBPBible( GenericOnlineBible ):
 
         BBB = key.getBBB()
         if BBB in self.books:
-            info = self.books[BBB]
-            rawData = self.getOnlineData( 'text/verse', 'dam_id={}&book_id={}&chapter_id={}&verse_start={}'.format( info['dam_id']+'2ET', info['book_id'], key.getChapterNumber(), key.getVerseNumber() ) )
-            resultList = []
-            if isinstance( rawData, list ) and len(rawData)==1:
-                rawDataDict = rawData[0]
-                #dPrint( 'Quiet', debuggingThisModule, len(rawDataDict), rawDataDict )
-                assert len(rawDataDict)==8 and isinstance( rawDataDict, dict )
-                resultList.append( ('p#','p#',rawDataDict['paragraph_number'],rawDataDict['paragraph_number'],[]) ) # Must be first for Biblelator
-                if key.getVerseNumber()=='1': resultList.append( ('c#','c#',rawDataDict['chapter_id'],rawDataDict['chapter_id'],[]) )
-                resultList.append( ('v','v',rawDataDict['verse_id'],rawDataDict['verse_id'],[]) )
-                resultList.append( ('v~','v~',rawDataDict['verse_text'].strip(),rawDataDict['verse_text'].strip(),[]) )
-                GenericOnlineBible.cacheVerse( self, key, resultList )
-            return resultList
+            rawData = self.getOnlineData( 'text/verse', self.getVerseParameters( key ) )
+            return self.makeVerseDataList( key, rawData )
         else: # This version doesn't have this book
             vPrint( 'Info', debuggingThisModule, "  getVerseDataList: {} not in {} {}".format( BBB, self.damRoot, self.books.keys() ) )
     # end of DBPBible.getVerseDataList
@@ -783,6 +822,7 @@ def fullDemo() -> None:
         vPrint( 'Quiet', debuggingThisModule, '' )
         dbpBible2 = DBPBible( 'MBTWBT' )
         vPrint( 'Quiet', debuggingThisModule, dbpBible2 )
+        dbpBible2.prefetchVerses( [SimpleVerseKey( *testRef ) for testRef in testRefs] ) # Fetch them concurrently
         for testRef in testRefs:
             verseKey = SimpleVerseKey( *testRef )
             vPrint( 'Quiet', debuggingThisModule, verseKey )
@@ -37,7 +37,6 @@ More details are available from https://api-info.readthedocs.io/en/latest/dcs.ht
 from gettext import gettext as _
 import os
 import logging
-import urllib.request
 import json
 import tempfile
 import zipfile
@@ -52,12 +51,14 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys.Formats.USFMBible import USFMBible
+from BibleOrgSys.Online.GenericOnlineBible import getSharedVerseCache
+from BibleOrgSys.Online.HTTPSession import getSharedHTTPSession
 
 
-LAST_MODIFIED_DATE = '2020-05-06' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "Door43ContentService"
 PROGRAM_NAME = "Door43 Content Service online handler"
-PROGRAM_VERSION = '0.04'
+PROGRAM_VERSION = '0.07'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -109,11 +110,9 @@ class DCSBibles:
 
         requestString = f'{URL_FULL_BASE}{fieldREST}'
         vPrint( 'Never', debuggingThisModule, "Request string is", repr(requestString) )
-        try: HTTPResponseObject = urllib.request.urlopen( requestString )
-        except urllib.error.URLError as err:
-            #errorClass, exceptionInstance, traceback = sys.exc_info()
-            #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-            logging.error( "DCS URLError '{}' from {}".format( err, requestString ) )
+        HTTPResponseObject = getSharedHTTPSession().get( requestString )
+        if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+            logging.error( "DCS error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', requestString ) )
             return None
         #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
         contentType = HTTPResponseObject.info().get( 'content-type' )
@@ -318,6 +317,8 @@ class DCSBible( USFMBible ):
         #dPrint( 'Quiet', debuggingThisModule, 'resourceDict', resourceDict )
         #dPrint( 'Quiet', debuggingThisModule, 'resourceDict', resourceDict.keys() )
 
+        self.verseCache = getSharedVerseCache()
+        self.verseCacheName = f"DCS:{resourceDict['full_name']}@{resourceDict['updated_at']}"
         self.baseURL = resourceDict['html_url']
         #dPrint( 'Quiet', debuggingThisModule, 'self.baseURL', self.baseURL )
         adjustedRepoName = resourceDict['full_name'].replace( '/', '--' )
@@ -346,11 +347,9 @@ class DCSBible( USFMBible ):
                 zipURL = self.baseURL + '/archive/master.zip' # '/archive/master.tar.gz'
                 if BibleOrgSysGlobals.verbosityLevel > 1:
                     vPrint( 'Quiet', debuggingThisModule, "Downloading entire repo from '{}'…".format( zipURL ) )
-                try: HTTPResponseObject = urllib.request.urlopen( zipURL )
-                except urllib.error.URLError as err:
-                    #errorClass, exceptionInstance, traceback = sys.exc_info()
-                    #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-                    logging.critical( "DCS URLError '{}' from {}".format( err, zipURL ) )
+                HTTPResponseObject = getSharedHTTPSession().get( zipURL, conditional=False )
+                if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+                    logging.critical( "DCS error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', zipURL ) )
                     return
                 #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
                 contentType = HTTPResponseObject.info().get( 'content-type' )
@@ -386,6 +385,7 @@ class DCSBible( USFMBible ):
         else: # didn't request all books to be downloaded at once
             self.downloadedAllBooks = False
             self.attemptedDownload = {}
+            self.prefetchedBooks = set() # Downloaded by downloadBooks but not loaded yet
             try: os.makedirs( unzippedFolderpath )
             except FileExistsError: pass
             USFMBible.__init__( self, unzippedFolderpath, givenName=resourceDict['name'] )
@@ -394,6 +394,70 @@ class DCSBible( USFMBible ):
     # end of DCSBible.__init__
 
 
+    def getBookURL( self, BBB:str ):
+        """
+        Returns a 2-tuple with the USFM filename and the URL to download it from.
+        """
+        nn = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
+        if nn > 39: nn += 1 # DSC uses #41 for MAT (not 39)
+        uBBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getUSFMAbbreviation( BBB ).upper()
+        USFMfilename = f'{nn:02}-{uBBB}.usfm'
+        return USFMfilename, f'{self.baseURL}/raw/branch/master/{USFMfilename}'
+    # end of DCSBible.getBookURL
+
+
+    def saveDownloadedBook( self, BBB:str, USFMfilename:str, zipURL:str, HTTPResponseObject ) -> bool:
+        """
+        Save the downloaded USFM book into our source folder.
+
+        Returns True if successful.
+        """
+        if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+            logging.critical( "DCS error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', zipURL ) )
+            return False
+        #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
+        contentType = HTTPResponseObject.info().get( 'content-type' )
+        if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
+            vPrint( 'Quiet', debuggingThisModule, "    contentType", repr(contentType) )
+        if contentType == 'text/plain; charset=utf-8':
+            downloadedData = HTTPResponseObject.read()
+            if BibleOrgSysGlobals.verbosityLevel > 0:
+                vPrint( 'Quiet', debuggingThisModule, f"  Downloaded {len(downloadedData):,} bytes from '{zipURL}'" )
+            with open( os.path.join( self.sourceFolder, USFMfilename ), 'wt' ) as ourUSFMfile:
+                ourUSFMfile.write( downloadedData.decode( 'utf-8' ) )
+        else:
+            vPrint( 'Quiet', debuggingThisModule, "    contentType", repr(contentType) )
+            halt # unknown content type
+        return True
+    # end of DCSBible.saveDownloadedBook
+
+
+    def downloadBooks( self, BBBList ) -> None:
+        """
+        Download the given books (that haven't already been attempted) concurrently
+            so that loading them later is quicker.
+        """
+        fnPrint( debuggingThisModule, f"DCSBible.downloadBooks( {BBBList} )" )
+
+        if self.downloadedAllBooks: return
+        bookURLs = {}
+        for BBB in BBBList:
+            if BBB not in self.attemptedDownload or not self.attemptedDownload[BBB]:
+                self.attemptedDownload[BBB] = True
+                bookURLs[BBB] = self.getBookURL( BBB )
+        if not bookURLs: return
+        if BibleOrgSysGlobals.verbosityLevel > 1:
+            vPrint( 'Quiet', debuggingThisModule, f"Downloading {len(bookURLs)} book files from '{self.baseURL}'…" )
+        results = getSharedHTTPSession().getMany( [zipURL for _USFMfilename,zipURL in bookURLs.values()] )
+        for BBB,(USFMfilename,zipURL) in bookURLs.items():
+            if self.saveDownloadedBook( BBB, USFMfilename, zipURL, results[zipURL] ):
+                self.prefetchedBooks.add( BBB )
+        if self.prefetchedBooks:
+            self.preloadDone = False # Need to find the new files
+            self.preload()
+    # end of DCSBible.downloadBooks
+
+
     def loadBookIfNecessary( self, BBB:str ):
         """
         Download the book if necessary.
@@ -408,39 +472,15 @@ class DCSBible( USFMBible ):
                 self.attemptedDownload[BBB] = True
 
                 # TODO: Change to .tar.gz instead of zip
-                nn = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
-                if nn > 39: nn += 1 # DSC uses #41 for MAT (not 39)
-                uBBB = BibleOrgSysGlobals.loadedBibleBooksCodes.getUSFMAbbreviation( BBB ).upper()
-                USFMfilename = f'{nn:02}-{uBBB}.usfm'
-                zipURL = f'{self.baseURL}/raw/branch/master/{USFMfilename}'
+                USFMfilename, zipURL = self.getBookURL( BBB )
                 if BibleOrgSysGlobals.verbosityLevel > 1:
                     vPrint( 'Quiet', debuggingThisModule, "Downloading {} file from '{}'…".format( BBB, zipURL ) )
-                try: HTTPResponseObject = urllib.request.urlopen( zipURL )
-                except urllib.error.HTTPError as err:
-                    #errorClass, exceptionInstance, traceback = sys.exc_info()
-                    #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-                    logging.critical( "DCS HTTPError '{}' from {}".format( err, zipURL ) )
-                    return
-                except urllib.error.URLError as err:
-                    #errorClass, exceptionInstance, traceback = sys.exc_info()
-                    #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-                    logging.critical( "DCS URLError '{}' from {}".format( err, zipURL ) )
+                if not self.saveDownloadedBook( BBB, USFMfilename, zipURL, getSharedHTTPSession().get( zipURL ) ):
                     return
-                #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
-                contentType = HTTPResponseObject.info().get( 'content-type' )
-                if BibleOrgSysGlobals.debugFlag and debuggingThisModule:
-                    vPrint( 'Quiet', debuggingThisModule, "    contentType", repr(contentType) )
-                if contentType == 'text/plain; charset=utf-8':
-                    downloadedData = HTTPResponseObject.read()
-                    if BibleOrgSysGlobals.verbosityLevel > 0:
-                        vPrint( 'Quiet', debuggingThisModule, f"  Downloaded {len(downloadedData):,} bytes from '{zipURL}'" )
-                    with open( os.path.join( self.sourceFolder, USFMfilename ), 'wt' ) as ourUSFMfile:
-                        ourUSFMfile.write( downloadedData.decode( 'utf-8' ) )
-                else:
-                    vPrint( 'Quiet', debuggingThisModule, "    contentType", repr(contentType) )
-                    halt # unknown content type
                 if not self.preloadDone:
                     self.preload()
+            elif BBB in self.prefetchedBooks: # Downloaded but not loaded yet
+                self.prefetchedBooks.discard( BBB )
             else:
                 if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule or BibleOrgSysGlobals.debugFlag:
                     vPrint( 'Quiet', debuggingThisModule, f"{BBB} was already downloaded (or attempted)" )
@@ -448,6 +488,30 @@ class DCSBible( USFMBible ):
 
         USFMBible.loadBookIfNecessary( self, BBB )
     # end of DCSBible.loadBookIfNecessary
+
+    def getContextVerseData( self, BCVReference ):
+        """
+        Search for a Bible reference
+            and return a 2-tuple containing
+                the Bible text (in a InternalBibleEntryList)
+                along with the context.
+
+        Checks the (shared) online verse cache first
+            which might save downloading and loading the book.
+        Books which are already loaded don't go through the cache.
+        """
+        fnPrint( debuggingThisModule, f"DCSBible.getContextVerseData( {BCVReference} )" )
+
+        BBB = BCVReference[0] if isinstance( BCVReference, tuple ) else BCVReference.getBBB()
+        if BBB in self.books: # Already loaded so it's quick anyway
+            return USFMBible.getContextVerseData( self, BCVReference )
+        cachedResult = self.verseCache.get( self.verseCacheName, BCVReference )
+        if cachedResult is not None: return cachedResult
+        result = USFMBible.getContextVerseData( self, BCVReference )
+        if result is not None:
+            self.verseCache.put( self.verseCacheName, BCVReference, result )
+        return result
+    # end of DCSBible.getContextVerseData
 # end of class DCSBible
 
 
@@ -485,6 +549,8 @@ def briefDemo() -> None:
             dcsBible1 = DCSBible( searchResult, downloadAllBooks=downloadAllBooks )
             try: dcsBible1.preload()
             except FileNotFoundError: assert downloadAllBooks == False
+            if not downloadAllBooks: # Fetch all the books that we need concurrently
+                dcsBible1.downloadBooks( dict.fromkeys( testRef[0] for testRef in testRefs ) )
             vPrint( 'Normal', debuggingThisModule, dcsBible1, end='\n\n' )
             for testRef in testRefs:
                 verseKey = SimpleVerseKey( *testRef )
@@ -565,6 +631,8 @@ def fullDemo() -> None:
             dcsBible1 = DCSBible( searchResult, downloadAllBooks=downloadAllBooks )
             try: dcsBible1.preload()
             except FileNotFoundError: assert downloadAllBooks == False
+            if not downloadAllBooks: # Fetch all the books that we need concurrently
+                dcsBible1.downloadBooks( dict.fromkeys( testRef[0] for testRef in testRefs ) )
             vPrint( 'Normal', debuggingThisModule, dcsBible1, end='\n\n' )
             for testRef in testRefs:
                 verseKey = SimpleVerseKey( *testRef )
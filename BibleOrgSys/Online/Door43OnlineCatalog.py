@@ -39,7 +39,6 @@ More details are available from https://api-info.readthedocs.io/en/latest/index.
 from gettext import gettext as _
 import os
 import logging
-import urllib.request
 import json
 import tempfile
 import zipfile
@@ -56,12 +55,14 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys.Formats.USFMBible import USFMBible
+from BibleOrgSys.Online.GenericOnlineBible import getSharedVerseCache
+from BibleOrgSys.Online.HTTPSession import getSharedHTTPSession
 
 
-LAST_MODIFIED_DATE = '2020-06-10' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "Door43OnlineCatalog"
 PROGRAM_NAME = "Door43 Online Catalog online handler"
-PROGRAM_VERSION = '0.09'
+PROGRAM_VERSION = '0.12'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -105,11 +106,9 @@ class Door43CatalogResources:
 
         requestString = f'{URL_FULL_BASE}{fieldREST}'
         vPrint( 'Never', debuggingThisModule, "Request string is", repr(requestString) )
-        try: HTTPResponseObject = urllib.request.urlopen( requestString )
-        except urllib.error.URLError as err:
-            #errorClass, exceptionInstance, traceback = sys.exc_info()
-            #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-            logging.error( "Door43 URLError '{}' from {}".format( err, requestString ) )
+        HTTPResponseObject = getSharedHTTPSession().get( requestString )
+        if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+            logging.error( "Door43 error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', requestString ) )
             return None
         #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
         contentType = HTTPResponseObject.info().get( 'content-type' )
@@ -381,6 +380,8 @@ class Door43CatalogBible( USFMBible ):
         assert resourceDict and isinstance( resourceDict, dict )
         #dPrint( 'Quiet', debuggingThisModule, 'resourceDict', resourceDict )
         #dPrint( 'Quiet', debuggingThisModule, 'resourceDict', resourceDict.keys() )
+        self.verseCache = getSharedVerseCache()
+        self.verseCacheName = f"Door43Catalog:{resourceDict['language']}_{resourceDict['identifier']}@{resourceDict.get('issued')}"
 
         vPrint( 'Never', debuggingThisModule, 'formats', resourceDict['formats'] )
         if 'formats' in resourceDict:
@@ -417,11 +418,9 @@ class Door43CatalogBible( USFMBible ):
             vPrint( 'Normal', debuggingThisModule, "Skipping download because folder '{}' already exists.".format( unzippedFolderpath ) )
         else: # Download the zip file (containing all the USFM files, LICENSE.md, manifest.yaml, etc.)
             vPrint( 'Normal', debuggingThisModule, "Downloading {:,} bytes from '{}'…".format( size, zipURL ) )
-            try: HTTPResponseObject = urllib.request.urlopen( zipURL )
-            except urllib.error.URLError as err:
-                #errorClass, exceptionInstance, traceback = sys.exc_info()
-                #dPrint( 'Quiet', debuggingThisModule, '{!r}  {!r}  {!r}'.format( errorClass, exceptionInstance, traceback ) )
-                logging.critical( "Door43 URLError '{}' from {}".format( err, zipURL ) )
+            HTTPResponseObject = getSharedHTTPSession().get( zipURL, conditional=False )
+            if HTTPResponseObject is None or HTTPResponseObject.status != 200:
+                logging.critical( "Door43 error '{}' from {}".format( HTTPResponseObject.status if HTTPResponseObject else 'no connection', zipURL ) )
                 return None
             #dPrint( 'Quiet', debuggingThisModule, "  HTTPResponseObject", HTTPResponseObject )
             contentType = HTTPResponseObject.info().get( 'content-type' )
@@ -449,6 +448,30 @@ class Door43CatalogBible( USFMBible ):
                                     givenName=resourceDict['title'], givenAbbreviation=resourceDict['identifier'] )
         self.objectNameString = 'Door43 USFM Bible object'
     # end of Door43CatalogBible.__init__
+
+    def getContextVerseData( self, BCVReference ):
+        """
+        Search for a Bible reference
+            and return a 2-tuple containing
+                the Bible text (in a InternalBibleEntryList)
+                along with the context.
+
+        Checks the (shared) online verse cache first
+            which might save downloading and loading the book.
+        Books which are already loaded don't go through the cache.
+        """
+        fnPrint( debuggingThisModule, f"Door43CatalogBible.getContextVerseData( {BCVReference} )" )
+
+        BBB = BCVReference[0] if isinstance( BCVReference, tuple ) else BCVReference.getBBB()
+        if BBB in self.books: # Already loaded so it's quick anyway
+            return USFMBible.getContextVerseData( self, BCVReference )
+        cachedResult = self.verseCache.get( self.verseCacheName, BCVReference )
+        if cachedResult is not None: return cachedResult
+        result = USFMBible.getContextVerseData( self, BCVReference )
+        if result is not None:
+            self.verseCache.put( self.verseCacheName, BCVReference, result )
+        return result
+    # end of Door43CatalogBible.getContextVerseData
 # end of class Door43CatalogBible
 
 
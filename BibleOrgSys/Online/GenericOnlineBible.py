@@ -23,12 +23,28 @@
 #   along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+Base module for online Bibles.
+
+Contains:
+    OnlineVerseCache: a two-tier verse cache shared by the online Bibles
+        (a bounded in-memory LRU plus an optional SQLite file with a time-to-live
+            so that verses aren't fetched again every time the program is run).
+        Entries are kept pickled in both tiers so that get always returns a new copy
+            (and callers can't accidentally alter the cached data),
+        and disk writes are committed in batches (and when the cache is flushed or closed).
+    GenericOnlineBible: the base class for online Bibles (e.g., DBPBible).
 """
 from gettext import gettext as _
+from typing import Any, Dict, Optional
 import os
+import atexit
 import logging
 import urllib.request
 import json
+import pickle
+import sqlite3
+import threading
+import time
 from collections import OrderedDict
 
 if __name__ == '__main__':
@@ -39,16 +55,248 @@ from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.Misc.singleton import singleton
 
 
-LAST_MODIFIED_DATE = '2020-05-02' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "GenericOnlineBible"
 PROGRAM_NAME = "Generic online Bible handler"
-PROGRAM_VERSION = '0.02'
+PROGRAM_VERSION = '0.04'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
-MAX_CACHED_VERSES = 100 # Per Bible version in use
+MAX_CACHED_VERSES = 1_000 # Kept in memory (shared by all online Bible versions in use)
+VERSE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60 # Verses on disk are fetched again after 30 days
+VERSE_CACHE_COMMIT_BATCH_SIZE = 200 # Number of disk changes before we commit (and SQLite syncs the file)
+VERSE_CACHE_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( 'OnlineVerseCache.sqlite' )
+
+
+
+def makeVerseID( key ) -> str:
+    """
+    Given a SimpleVerseKey or a (B,C,V,S) tuple,
+        return a short, unambiguous string suitable for use as a cache key.
+    """
+    try: return key.makeHash() # SimpleVerseKey
+    except AttributeError: # Assume it's a tuple
+        return "{}_{}:{}!{}".format( key[0], key[1], key[2], key[3] if len(key)>3 and key[3] else '' )
+# end of makeVerseID
+
+
+
+class OnlineVerseCache:
+    """
+    Class to cache verse data for online Bibles (which is slow to fetch).
+
+    Entries are keyed by the source (e.g., 'DBP:ENGESV') and the verse ID.
+    The memory tier is a bounded LRU (least recently used entries get discarded).
+    The disk tier is a SQLite database where entries expire after TTLSeconds.
+    Both tiers hold the pickled data, so get returns a new copy each time.
+    Disk changes are committed every VERSE_CACHE_COMMIT_BATCH_SIZE changes
+        or when flush or close is called.
+
+    Can be shared between threads.
+    """
+    def __init__( self, maxEntries:int=MAX_CACHED_VERSES, filepath=VERSE_CACHE_FILEPATH, TTLSeconds:float=VERSE_CACHE_TTL_SECONDS ) -> None:
+        """
+        If filepath is None, only the memory tier is used.
+        """
+        fnPrint( debuggingThisModule, f"OnlineVerseCache.__init__( {maxEntries}, {filepath}, {TTLSeconds} )" )
+        self.maxEntries, self.filepath, self.TTLSeconds = maxEntries, filepath, TTLSeconds
+        self.memoryCache = OrderedDict() # has move_to_end function
+        self.stats = { 'memoryHits':0, 'diskHits':0, 'misses':0, 'stores':0, 'evictions':0, 'expired':0 }
+        self.__lock = threading.Lock()
+        self.__connection = None
+        self.__numUncommitted = 0
+        if filepath is not None:
+            try:
+                os.makedirs( os.path.dirname( filepath ), exist_ok=True )
+                self.__connection = sqlite3.connect( filepath, timeout=10, check_same_thread=False )
+                self.__connection.execute( 'CREATE TABLE IF NOT EXISTS verses (source TEXT, verseID TEXT, storedTime REAL, data BLOB, PRIMARY KEY (source, verseID)) WITHOUT ROWID' )
+                self.__connection.execute( 'DELETE FROM verses WHERE storedTime<?', (time.time()-TTLSeconds,) )
+                self.__connection.commit()
+            except (sqlite3.Error, OSError) as err:
+                logging.warning( f"OnlineVerseCache: Unable to use disk cache {filepath}: {err}" )
+                self.__connection = None
+    # end of OnlineVerseCache.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        Create a string representation of the cache object.
+        """
+        indent = 2
+        result = "Online verse cache object"
+        result += ('\n' if result else '') + ' '*indent + _("Memory entries: {:,} (max {:,})").format( len(self.memoryCache), self.maxEntries )
+        if self.__connection is not None: result += ('\n' if result else '') + ' '*indent + _("Disk cache: {}").format( self.filepath )
+        result += ('\n' if result else '') + ' '*indent + _("Hit rate: {:.1%}").format( self.getStats()['hitRate'] )
+        return result
+    # end of OnlineVerseCache.__str__
+
+
+    def __len__( self ) -> int:
+        """ Returns the number of entries in the memory tier. """
+        return len( self.memoryCache )
+
+
+    def get( self, source:str, key ) -> Optional[Any]:
+        """
+        Given a source name and a BCV key, see if we have the verse data in the cache.
+
+        Return None if not.
+        """
+        fnPrint( debuggingThisModule, f"OnlineVerseCache.get( {source}, {key} )…" )
+        cacheKey = (source, makeVerseID( key ))
+        with self.__lock:
+            if cacheKey in self.memoryCache:
+                vPrint( 'Never', debuggingThisModule, "  " + _("Retrieved from memory cache") )
+                self.memoryCache.move_to_end( cacheKey )
+                self.stats['memoryHits'] += 1
+                return pickle.loads( self.memoryCache[cacheKey] ) # A new copy
+
+            if self.__connection is not None:
+                try:
+                    row = self.__connection.execute( 'SELECT storedTime, data FROM verses WHERE source=? AND verseID=?', cacheKey ).fetchone()
+                    if row is not None:
+                        storedTime, pickledData = row
+                        if time.time() - storedTime < self.TTLSeconds:
+                            verseData = pickle.loads( pickledData )
+                            vPrint( 'Never', debuggingThisModule, "  " + _("Retrieved from disk cache") )
+                            self.__addToMemory( cacheKey, pickledData )
+                            self.stats['diskHits'] += 1
+                            return verseData
+                        self.stats['expired'] += 1
+                        self.__connection.execute( 'DELETE FROM verses WHERE source=? AND verseID=?', cacheKey )
+                        self.__noteChange()
+                except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError) as err:
+                    logging.warning( f"OnlineVerseCache: Unable to read {cacheKey} from disk cache: {err}" )
+
+            # Not found in the cache
+            self.stats['misses'] += 1
+            return None
+    # end of OnlineVerseCache.get
+
+
+    def put( self, source:str, key, verseData:Any ) -> None:
+        """
+        Given a source name and a BCV key, add the data to the cache.
+        """
+        fnPrint( debuggingThisModule, f"OnlineVerseCache.put( {source}, {key}, {verseData} )…" )
+        cacheKey = (source, makeVerseID( key ))
+        try: pickledData = pickle.dumps( verseData, pickle.HIGHEST_PROTOCOL ) # Also means that later changes to verseData don't affect the cache
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            logging.warning( f"OnlineVerseCache: Unable to cache {cacheKey}: {err}" )
+            return
+        with self.__lock:
+            if cacheKey in self.memoryCache and self.memoryCache[cacheKey] != pickledData:
+                logging.warning( f"New cached data for {key} {verseData} doesn't match previously cached data: {pickle.loads( self.memoryCache[cacheKey] )}" )
+            self.__addToMemory( cacheKey, pickledData )
+            self.stats['stores'] += 1
+            if self.__connection is not None:
+                try:
+                    self.__connection.execute( 'INSERT OR REPLACE INTO verses VALUES (?,?,?,?)',
+                                    (*cacheKey, time.time(), pickledData) )
+                    self.__noteChange()
+                except sqlite3.Error as err:
+                    logging.warning( f"OnlineVerseCache: Unable to save {cacheKey} to disk cache: {err}" )
+    # end of OnlineVerseCache.put
+
+
+    def __addToMemory( self, cacheKey, pickledData:bytes ) -> None:
+        """
+        Must be called with the lock held.
+        """
+        self.memoryCache[cacheKey] = pickledData
+        self.memoryCache.move_to_end( cacheKey )
+        while len(self.memoryCache) > self.maxEntries:
+            self.memoryCache.popitem( last=False ) # Discard the least recently used entry
+            self.stats['evictions'] += 1
+    # end of OnlineVerseCache.__addToMemory
+
+
+    def __noteChange( self ) -> None:
+        """
+        Commit the disk changes if we've got enough of them.
+
+        Must be called with the lock held.
+        """
+        self.__numUncommitted += 1
+        if self.__numUncommitted >= VERSE_CACHE_COMMIT_BATCH_SIZE:
+            self.__connection.commit()
+            self.__numUncommitted = 0
+    # end of OnlineVerseCache.__noteChange
+
+
+    def flush( self ) -> None:
+        """
+        Commit any outstanding changes to the disk cache.
+        """
+        fnPrint( debuggingThisModule, "OnlineVerseCache.flush()" )
+        with self.__lock:
+            if self.__connection is not None and self.__numUncommitted:
+                try: self.__connection.commit()
+                except sqlite3.Error as err:
+                    logging.warning( f"OnlineVerseCache: Unable to save disk cache: {err}" )
+                self.__numUncommitted = 0
+    # end of OnlineVerseCache.flush
+
+
+    def getStats( self ) -> Dict[str,Any]:
+        """
+        Returns a dictionary of counts and the overall hit rate (0.0 to 1.0).
+        """
+        stats = self.stats.copy()
+        numRequests = stats['memoryHits'] + stats['diskHits'] + stats['misses']
+        stats['hitRate'] = (stats['memoryHits'] + stats['diskHits']) / numRequests if numRequests else 0.0
+        return stats
+    # end of OnlineVerseCache.getStats
+
+
+    def clear( self, source:Optional[str]=None ) -> None:
+        """
+        Discard the cached entries (from both tiers) for the given source (or all sources if None).
+        """
+        fnPrint( debuggingThisModule, f"OnlineVerseCache.clear( {source} )" )
+        with self.__lock:
+            if source is None: self.memoryCache.clear()
+            else:
+                for cacheKey in [cacheKey for cacheKey in self.memoryCache if cacheKey[0]==source]:
+                    del self.memoryCache[cacheKey]
+            if self.__connection is not None:
+                try:
+                    if source is None: self.__connection.execute( 'DELETE FROM verses' )
+                    else: self.__connection.execute( 'DELETE FROM verses WHERE source=?', (source,) )
+                    self.__connection.commit()
+                    self.__numUncommitted = 0
+                except sqlite3.Error as err:
+                    logging.warning( f"OnlineVerseCache: Unable to clear disk cache: {err}" )
+    # end of OnlineVerseCache.clear
+
+
+    def close( self ) -> None:
+        """
+        Save and close the disk cache (the memory cache can still be used).
+        """
+        self.flush()
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+    # end of OnlineVerseCache.close
+# end of class OnlineVerseCache
+
+
+_sharedVerseCache = None
+def getSharedVerseCache() -> OnlineVerseCache:
+    """
+    Returns the OnlineVerseCache that's shared by all of the online Bibles
+        (creating it the first time).
+    """
+    global _sharedVerseCache
+    if _sharedVerseCache is None:
+        _sharedVerseCache = OnlineVerseCache()
+        atexit.register( _sharedVerseCache.close ) # Commit any final changes
+    return _sharedVerseCache
+# end of getSharedVerseCache
 
 
 
@@ -71,7 +319,8 @@ class GenericOnlineBible:
         self.bookList = None
         self.books = {}
 
-        self.cache = OrderedDict() # has move_to_end function
+        self.verseCache = getSharedVerseCache()
+        self.verseCacheName = self.__class__.__name__ # Subclasses should make this unique to the work/version
     # end of GenericOnlineBible.__init__
 
 
@@ -143,37 +392,23 @@ class GenericOnlineBible:
 
     def cacheVerse( self, key, verseData ):
         """
-        Given a BCV key, add the data to the cache.
+        Given a BCV key, add the data to the (shared) cache.
         """
         fnPrint( debuggingThisModule, f"GenericOnlineBible.cacheVerse( {key}, {verseData} )…" )
 
-        if str(key) in self.cache:
-            vPrint( 'Never', debuggingThisModule, "  " + _("Retrieved from cache") )
-            self.cache.move_to_end( str(key) )
-            cachedVerseData = self.cache[str(key)]
-            if cachedVerseData != verseData:
-                logging.warning( f"New cached data for {key} {verseData} doesn't match previously cached data: {cachedVerseData}" )
-
-        # Not found in the cache
-        self.cache[str(key)] = verseData
+        self.verseCache.put( self.verseCacheName, key, verseData )
     # end of GenericOnlineBible.cacheVerse
 
 
     def getCachedVerseDataList( self, key ):
         """
-        Given a BCV key, see if we have the verse data in the cache.
+        Given a BCV key, see if we have the verse data in the (shared) cache.
 
         Return None if not.
         """
         fnPrint( debuggingThisModule, f"GenericOnlineBible.getCachedVerseDataList( {key} )…" )
 
-        if str(key) in self.cache:
-            vPrint( 'Never', debuggingThisModule, "  " + _("Retrieved from cache") )
-            self.cache.move_to_end( str(key) )
-            return self.cache[str(key)]
-
-        # Not found in the cache
-        return None
+        return self.verseCache.get( self.verseCacheName, key )
     # end of GenericOnlineBible.getCachedVerseDataList
 
 
@@ -209,7 +444,7 @@ def briefDemo() -> None:
             verseKey = SimpleVerseKey( *testRef )
             vPrint( 'Quiet', debuggingThisModule, verseKey )
             dbpBible1.cacheVerse( verseKey, [f"Verse text for {verseKey}"] )
-            vPrint( 'Quiet', debuggingThisModule, f"  Cache length: {len(dbpBible1.cache)}" )
+            vPrint( 'Quiet', debuggingThisModule, f"  Cache length: {len(dbpBible1.verseCache)}" )
             vPrint( 'Quiet', debuggingThisModule, " ", dbpBible1.getCachedVerseDataList( verseKey ) )
          # Now test the GenericOnlineBible class caching
         vPrint( 'Quiet', debuggingThisModule, '' )
@@ -217,6 +452,7 @@ def briefDemo() -> None:
             verseKey = SimpleVerseKey( *testRef )
             vPrint( 'Quiet', debuggingThisModule, verseKey, "cached" )
             vPrint( 'Quiet', debuggingThisModule, " ", dbpBible1.getCachedVerseDataList( verseKey ) )
+        vPrint( 'Quiet', debuggingThisModule, dbpBible1.verseCache )
 # end of GenericOnlineBible.briefDemo
 
 def fullDemo() -> None:
@@ -237,7 +473,7 @@ def fullDemo() -> None:
             verseKey = SimpleVerseKey( *testRef )
             vPrint( 'Quiet', debuggingThisModule, verseKey )
             dbpBible1.cacheVerse( verseKey, [f"Verse text for {verseKey}"] )
-            vPrint( 'Quiet', debuggingThisModule, f"  Cache length: {len(dbpBible1.cache)}" )
+            vPrint( 'Quiet', debuggingThisModule, f"  Cache length: {len(dbpBible1.verseCache)}" )
             vPrint( 'Quiet', debuggingThisModule, " ", dbpBible1.getCachedVerseDataList( verseKey ) )
          # Now test the GenericOnlineBible class caching
         vPrint( 'Quiet', debuggingThisModule, '' )
@@ -245,6 +481,7 @@ def fullDemo() -> None:
             verseKey = SimpleVerseKey( *testRef )
             vPrint( 'Quiet', debuggingThisModule, verseKey, "cached" )
             vPrint( 'Quiet', debuggingThisModule, " ", dbpBible1.getCachedVerseDataList( verseKey ) )
+        vPrint( 'Quiet', debuggingThisModule, dbpBible1.verseCache )
 # end of GenericOnlineBible.fullDemo
 
 if __name__ == '__main__':
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# HTTPSession.py
+#
+# Module for making (keep-alive) HTTP requests for the online Bibles
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module for fetching online data.
+
+urllib.request.urlopen makes a new connection (and TLS handshake) for every request
+    which is slow when fetching many verses or books from the same site.
+
+  HTTPSession: Keeps one keep-alive connection per site per thread,
+        retries (with exponential backoff) after connection errors
+            and temporary server errors (429 and 5xx),
+        remembers ETag and Last-Modified headers and makes conditional GETs
+            (so that unchanged resources aren't downloaded again),
+        and can fetch a list of URLs concurrently (using BibleOrgSysGlobals.maxIOThreads threads).
+    The pool of threads (and hence their connections) is kept until the session is closed,
+        and the remembered bodies are limited to maxRememberedLength bytes in total
+        (the least recently used ones are forgotten first).
+
+  HTTPResult: The result of a GET, with info() and read() methods
+        like the object returned by urllib.request.urlopen.
+
+Contains the classes: HTTPResult, HTTPSession
+and the function getSharedHTTPSession.
+"""
+from gettext import gettext as _
+from typing import Dict, Iterable, Optional
+from collections import OrderedDict
+import os
+import logging
+import threading
+import time
+import http.client
+import ssl
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "HTTPSession"
+PROGRAM_NAME = "HTTP session handler"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5 # Doubled after each retry
+MAX_BACKOFF_SECONDS = 30
+MAX_REDIRECTS = 5
+MAX_REMEMBERED_BODY_LENGTH = 4_000_000 # Bigger responses aren't kept for conditional GETs
+MAX_REMEMBERED_TOTAL_LENGTH = 32_000_000 # For all of the remembered responses together
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+USER_AGENT = f'BibleOrgSys/{BibleOrgSysGlobals.PROGRAM_VERSION}'
+
+
+
+class HTTPResult:
+    """
+    The (fully read) result of an HTTP GET.
+    """
+    def __init__( self, URL:str, status:int, headers:http.client.HTTPMessage, body:bytes, notModified:bool=False ) -> None:
+        self.URL, self.status, self.headers, self.body = URL, status, headers, body
+        self.notModified = notModified # True if the server said our remembered copy is still current
+
+    def __str__( self ) -> str:
+        return f"HTTPResult {self.status} with {len(self.body):,} bytes from {self.URL}" \
+                + (' (not modified)' if self.notModified else '')
+
+    def info( self ) -> http.client.HTTPMessage:
+        """ Returns the response headers (like urlopen). """
+        return self.headers
+
+    def read( self ) -> bytes:
+        """ Returns the response body (like urlopen). """
+        return self.body
+# end of class HTTPResult
+
+
+
+class HTTPSession:
+    """
+    Class for making HTTP(S) GET requests
+        reusing connections where possible.
+
+    Can be shared between threads (each thread gets its own connections).
+    """
+    def __init__( self, timeout:float=DEFAULT_TIMEOUT_SECONDS, maxRetries:int=DEFAULT_MAX_RETRIES,
+                                    backoffSeconds:float=DEFAULT_BACKOFF_SECONDS,
+                                    maxRememberedLength:int=MAX_REMEMBERED_TOTAL_LENGTH ) -> None:
+        """
+        """
+        fnPrint( debuggingThisModule, f"HTTPSession.__init__( {timeout}, {maxRetries}, {backoffSeconds}, {maxRememberedLength} )" )
+        self.timeout, self.maxRetries, self.backoffSeconds = timeout, maxRetries, backoffSeconds
+        self.maxRememberedLength = maxRememberedLength
+        self.stats = { 'requests':0, 'connections':0, 'retries':0, 'notModified':0 }
+        self.__local = threading.local() # Holds the connections for each thread
+        self.__allConnections = [] # 2-tuples: the thread that owns it, connection
+        self.__lock = threading.Lock()
+        self.__remembered = OrderedDict() # URL: (ETag, Last-Modified, status, headers, body) with the most recently used last
+        self.__rememberedLength = 0 # Total length of the remembered bodies
+        self.__executor, self.__executorSize = None, 0 # Our long-lived pool of threads for getMany
+    # end of HTTPSession.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        Create a string representation of the session object.
+        """
+        indent = 2
+        result = "HTTP session object"
+        result += ('\n' if result else '') + ' '*indent + _("Requests: {:,} using {:,} connection(s)").format( self.stats['requests'], self.stats['connections'] )
+        if self.stats['retries']: result += ('\n' if result else '') + ' '*indent + _("Retries: {:,}").format( self.stats['retries'] )
+        if self.stats['notModified']: result += ('\n' if result else '') + ' '*indent + _("Not modified: {:,}").format( self.stats['notModified'] )
+        return result
+    # end of HTTPSession.__str__
+
+
+    def __enter__( self ):
+        return self
+    def __exit__( self, excType, excValue, traceback ) -> None:
+        self.close()
+
+
+    def __getConnection( self, scheme:str, netloc:str ) -> http.client.HTTPConnection:
+        """
+        Returns the open connection for this thread (or makes a new one).
+        """
+        try: connections = self.__local.connections
+        except AttributeError: connections = self.__local.connections = {}
+        if (scheme,netloc) not in connections:
+            vPrint( 'Never', debuggingThisModule, f"HTTPSession: Opening {scheme} connection to {netloc}" )
+            if scheme == 'https':
+                connection = http.client.HTTPSConnection( netloc, timeout=self.timeout, context=ssl.create_default_context() )
+            else: connection = http.client.HTTPConnection( netloc, timeout=self.timeout )
+            connections[(scheme,netloc)] = connection
+            with self.__lock:
+                self.__allConnections.append( (threading.current_thread(), connection) )
+                self.stats['connections'] += 1
+        return connections[(scheme,netloc)]
+    # end of HTTPSession.__getConnection
+
+
+    def __dropConnection( self, scheme:str, netloc:str ) -> None:
+        """
+        Close and forget this thread's connection (e.g., after an error or if the server is closing it).
+        """
+        connection = self.__local.connections.pop( (scheme,netloc), None )
+        if connection is not None:
+            connection.close()
+            with self.__lock:
+                try: self.__allConnections.remove( (threading.current_thread(), connection) )
+                except ValueError: pass
+    # end of HTTPSession.__dropConnection
+
+
+    def __closeFinishedThreadConnections( self ) -> None:
+        """
+        Close and forget the connections that belonged to threads which have now finished
+            (e.g., the workers of a pool that we've replaced).
+        """
+        with self.__lock:
+            finishedThreadConnections = [(thread,connection) for thread,connection in self.__allConnections if not thread.is_alive()]
+            for thread,connection in finishedThreadConnections:
+                self.__allConnections.remove( (thread,connection) )
+        for _thread,connection in finishedThreadConnections: connection.close()
+    # end of HTTPSession.__closeFinishedThreadConnections
+
+
+    def __getBackoff( self, attemptNumber:int, retryAfter:Optional[str]=None ) -> float:
+        """
+        Returns the number of seconds to wait before the next attempt.
+        """
+        if retryAfter and retryAfter.strip().isdigit():
+            return min( int(retryAfter), MAX_BACKOFF_SECONDS )
+        return min( self.backoffSeconds * 2**attemptNumber, MAX_BACKOFF_SECONDS )
+    # end of HTTPSession.__getBackoff
+
+
+    def __getRemembered( self, URL:str ) -> Optional[tuple]:
+        """
+        Returns our remembered (ETag, Last-Modified, status, headers, body) for the URL (or None).
+        """
+        with self.__lock:
+            remembered = self.__remembered.get( URL )
+            if remembered is not None: self.__remembered.move_to_end( URL )
+        return remembered
+    # end of HTTPSession.__getRemembered
+
+
+    def __remember( self, URL:str, remembered:tuple ) -> None:
+        """
+        Remember the (ETag, Last-Modified, status, headers, body) for the URL
+            forgetting the least recently used ones if we're over our size limit.
+        """
+        with self.__lock:
+            previous = self.__remembered.pop( URL, None )
+            if previous is not None: self.__rememberedLength -= len( previous[4] )
+            self.__remembered[URL] = remembered
+            self.__rememberedLength += len( remembered[4] )
+            while self.__rememberedLength > self.maxRememberedLength and self.__remembered:
+                _forgottenURL, forgotten = self.__remembered.popitem( last=False )
+                self.__rememberedLength -= len( forgotten[4] )
+    # end of HTTPSession.__remember
+
+
+    def get( self, URL:str, conditional:bool=True ) -> Optional[HTTPResult]:
+        """
+        Does an HTTP GET (following redirects).
+
+        If conditional is True and we've fetched this URL before,
+            the server is asked if it has changed
+            and our remembered copy is returned if not (with notModified set).
+
+        Returns an HTTPResult (which might have an error status like 404)
+            or None if the server couldn't be contacted.
+        """
+        fnPrint( debuggingThisModule, f"HTTPSession.get( {URL}, {conditional} )" )
+
+        requestURL = URL
+        for _redirectCount in range( MAX_REDIRECTS + 1 ):
+            headers = { 'User-Agent':USER_AGENT }
+            remembered = self.__getRemembered( requestURL ) if conditional else None
+            if remembered is not None:
+                ETag, lastModified = remembered[0], remembered[1]
+                if ETag: headers['If-None-Match'] = ETag
+                if lastModified: headers['If-Modified-Since'] = lastModified
+
+            result = self.__getOnce( requestURL, headers )
+            if result is None: return None
+            if result.status in REDIRECT_STATUS_CODES and result.headers.get( 'Location' ):
+                requestURL = urllib.parse.urljoin( requestURL, result.headers['Location'] )
+                vPrint( 'Never', debuggingThisModule, f"HTTPSession: Redirected to {requestURL}" )
+                continue
+            if result.status == 304 and remembered is not None:
+                with self.__lock: self.stats['notModified'] += 1
+                return HTTPResult( requestURL, remembered[2], remembered[3], remembered[4], notModified=True )
+            if result.status == 200 and len(result.body) <= MAX_REMEMBERED_BODY_LENGTH:
+                ETag, lastModified = result.headers.get( 'ETag' ), result.headers.get( 'Last-Modified' )
+                if ETag or lastModified:
+                    self.__remember( requestURL, (ETag, lastModified, result.status, result.headers, result.body) )
+            return result
+        logging.error( f"HTTPSession: Too many redirects from {URL}" )
+        return None
+    # end of HTTPSession.get
+
+
+    def __getOnce( self, URL:str, headers:Dict[str,str] ) -> Optional[HTTPResult]:
+        """
+        Does the actual GET (without following redirects) retrying if necessary.
+        """
+        splitURL = urllib.parse.urlsplit( URL )
+        scheme, netloc = splitURL.scheme.lower(), splitURL.netloc
+        if scheme not in ('http','https'):
+            logging.error( f"HTTPSession: Unable to fetch {URL}" )
+            return None
+        path = splitURL.path or '/'
+        if splitURL.query: path += '?' + splitURL.query
+
+        for attemptNumber in range( self.maxRetries + 1 ):
+            if attemptNumber:
+                with self.__lock: self.stats['retries'] += 1
+            connection = self.__getConnection( scheme, netloc )
+            try:
+                with self.__lock: self.stats['requests'] += 1
+                connection.request( 'GET', path, headers=headers )
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as err:
+                # Could just be a keep-alive connection that the server has closed
+                self.__dropConnection( scheme, netloc )
+                if attemptNumber < self.maxRetries:
+                    vPrint( 'Info', debuggingThisModule, f"HTTPSession: Retrying {URL} after {err}" )
+                    if attemptNumber: time.sleep( self.__getBackoff( attemptNumber-1 ) )
+                    continue
+                logging.error( f"HTTPSession: Unable to fetch {URL}: {err}" )
+                return None
+            if response.will_close: self.__dropConnection( scheme, netloc )
+            if response.status in RETRY_STATUS_CODES and attemptNumber < self.maxRetries:
+                vPrint( 'Info', debuggingThisModule, f"HTTPSession: Retrying {URL} after status {response.status}" )
+                time.sleep( self.__getBackoff( attemptNumber, response.headers.get( 'Retry-After' ) ) )
+                continue
+            return HTTPResult( URL, response.status, response.headers, body )
+    # end of HTTPSession.__getOnce
+
+
+    def __getExecutor( self, numThreads:int ) -> ThreadPoolExecutor:
+        """
+        Returns our thread pool (only making a new one if we need more threads than before).
+
+        Because the same worker threads get reused,
+            so do their keep-alive connections.
+        """
+        oldExecutor = None
+        with self.__lock:
+            if self.__executor is None or numThreads > self.__executorSize:
+                oldExecutor = self.__executor
+                self.__executor = ThreadPoolExecutor( max_workers=numThreads, thread_name_prefix='BOSHTTP' )
+                self.__executorSize = numThreads
+            executor = self.__executor
+        if oldExecutor is not None: # Let it finish any existing work and then close its threads' connections
+            oldExecutor.shutdown( wait=True )
+            self.__closeFinishedThreadConnections()
+        return executor
+    # end of HTTPSession.__getExecutor
+
+
+    def getMany( self, URLs:Iterable[str], maxThreads:Optional[int]=None, conditional:bool=True ) -> Dict[str,Optional[HTTPResult]]:
+        """
+        Fetches the URLs concurrently
+            using up to maxThreads threads (default BibleOrgSysGlobals.maxIOThreads).
+
+        Returns a dictionary with the URL as the key and the result of get (above) as the value.
+        """
+        fnPrint( debuggingThisModule, f"HTTPSession.getMany( …, {maxThreads}, {conditional} )" )
+        URLs = list( dict.fromkeys( URLs ) ) # Remove duplicates (but keep the order)
+        if maxThreads is None: maxThreads = BibleOrgSysGlobals.maxIOThreads
+        if maxThreads < 2 or len(URLs) < 2:
+            return { URL:self.get( URL, conditional ) for URL in URLs }
+        executor = self.__getExecutor( maxThreads ) # Not min'd with the number of URLs so that the pool size stays constant
+        return dict( zip( URLs, executor.map( lambda URL: self.get( URL, conditional ), URLs ) ) )
+    # end of HTTPSession.getMany
+
+
+    def close( self ) -> None:
+        """
+        Close all open connections and our pool of threads
+            (they'll be reopened if necessary).
+        """
+        fnPrint( debuggingThisModule, "HTTPSession.close()" )
+        with self.__lock:
+            executor, self.__executor, self.__executorSize = self.__executor, None, 0
+        if executor is not None: executor.shutdown( wait=True ) # So that no thread is still using a connection
+        with self.__lock:
+            for _thread,connection in self.__allConnections: connection.close()
+            self.__allConnections = []
+        self.__local = threading.local()
+    # end of HTTPSession.close
+# end of class HTTPSession
+
+
+_sharedHTTPSession = None
+def getSharedHTTPSession() -> HTTPSession:
+    """
+    Returns the HTTPSession that's shared by all of the online modules
+        (creating it the first time).
+    """
+    global _sharedHTTPSession
+    if _sharedHTTPSession is None:
+        _sharedHTTPSession = HTTPSession()
+    return _sharedHTTPSession
+# end of getSharedHTTPSession
+
+
+
+def briefDemo() -> None:
+    """
+    Demonstrate fetching some data from Door43.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    testURLs = ( 'https://git.door43.org/api/v1/version', 'https://api.door43.org/v3/subjects/pivoted.json', )
+    with HTTPSession() as session:
+        for URL in testURLs + testURLs: # Second time should be conditional
+            startTime = time.perf_counter()
+            result = session.get( URL )
+            vPrint( 'Quiet', debuggingThisModule, f"  {result} in {(time.perf_counter()-startTime)*1000:.1f} ms" )
+        vPrint( 'Quiet', debuggingThisModule, session )
+# end of HTTPSession.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+
+    with HTTPSession() as session:
+        testURLs = [f'https://git.door43.org/unfoldingWord/en_ult/raw/branch/master/{nn:02}-{USFMAbbreviation}.usfm'
+                        for nn,USFMAbbreviation in ((57,'TIT'),(58,'PHM'),(65,'2JN'),(66,'3JN'),(67,'JUD'))]
+        for maxThreads in (1, BibleOrgSysGlobals.maxIOThreads):
+            startTime = time.perf_counter()
+            results = session.getMany( testURLs, maxThreads, conditional=False )
+            vPrint( 'Quiet', debuggingThisModule, f"  Fetched {sum(len(result.body) for result in results.values() if result):,} bytes from {len(results)} URLs using {maxThreads} thread(s) in {(time.perf_counter()-startTime)*1000:.1f} ms" )
+        vPrint( 'Quiet', debuggingThisModule, session )
+# end of HTTPSession.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of HTTPSession.py
@@ -5,7 +5,7 @@
 #
 # Module handling the Greek lexicon
 #
-# Copyright (C) 2014-2020 Robert Hunt
+# Copyright (C) 2014-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -28,9 +28,13 @@ Module handling the Greek lexicon.
     The later class is the one for users to
         access the Strongs lexical entries
         via various keys and in various formats.
+
+    Unless load() is called to load everything into memory,
+        entries are read individually from a compiled lexicon store
+        which is built (from the XML or distributed pickle) the first time it's needed.
 """
 from gettext import gettext as _
-from typing import Optional
+from typing import Any, Dict, Optional
 # import logging
 import os.path
 import sys
@@ -41,17 +45,62 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.OriginalLanguages.LexiconStore import LexiconStore, getLexiconStore
 
 
-LAST_MODIFIED_DATE = '2020-05-03' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "GreekLexicon"
 PROGRAM_NAME = "Greek Lexicon handler"
-PROGRAM_VERSION = '0.17'
+PROGRAM_VERSION = '0.18'
 programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
+GREEK_LEXICON_PICKLE_FILEPATH = BibleOrgSysGlobals.BOS_DISTRIBUTED_FILES_FOLDERPATH.joinpath( 'GreekLexicon_Strongs_Table.1.pickle' )
+
+
+
+def loadGreekLexiconTables( XMLFolder=None ) -> Dict[str,Dict[str,Any]]:
+    """
+    Load the Greek lexicon table
+        from the distributed pickle file if it's there,
+        otherwise from the XML (slower).
+
+    Returns a dictionary of tables (which are each dictionaries of entries).
+    """
+    fnPrint( debuggingThisModule, f"loadGreekLexiconTables( {XMLFolder} )" )
+    if GREEK_LEXICON_PICKLE_FILEPATH.is_file():
+        import pickle
+        vPrint( 'Info', debuggingThisModule, f"Loading pickle file {GREEK_LEXICON_PICKLE_FILEPATH}…" )
+        with open( GREEK_LEXICON_PICKLE_FILEPATH, 'rb') as pickleFile:
+            StrongsEntries = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
+    else: # Load the original XML
+        from BibleOrgSys.OriginalLanguages.Converters.GreekLexiconConverter import GreekStrongsFileConverter
+        gStr = GreekStrongsFileConverter() # Create the empty object
+        gStr.loadAndValidate( XMLFolder ) # Load the XML
+        StrongsEntries = gStr.importDataToPython()
+    return { 'Strongs':StrongsEntries }
+# end of loadGreekLexiconTables
+
+
+def getGreekLexiconStore( XMLFolder=None ) -> LexiconStore:
+    """
+    Returns the (shared) compiled store for the Greek lexicon.
+
+    It's compiled from the distributed pickle file if it's there,
+        otherwise from the XML file in the given folder,
+        and is recompiled automatically if that source file changes.
+    """
+    from BibleOrgSys.OriginalLanguages.Converters.GreekLexiconConverter import DEFAULT_LEXICON_FOLDERPATH, GreekStrongsFileConverter
+
+    if XMLFolder is None: XMLFolder = DEFAULT_LEXICON_FOLDERPATH
+    sourceFilepaths = [GREEK_LEXICON_PICKLE_FILEPATH] if GREEK_LEXICON_PICKLE_FILEPATH.is_file() \
+        else [os.path.join( XMLFolder, GreekStrongsFileConverter.databaseFilename )]
+    return getLexiconStore( 'GreekLexicon', sourceFilepaths, lambda: loadGreekLexiconTables( XMLFolder ) )
+# end of getGreekLexiconStore
+
+
 
 class GreekLexicon:
     """
@@ -67,32 +116,39 @@ class GreekLexicon:
         fnPrint( debuggingThisModule, "GreekLexicon.__init__( {} )".format( XMLFolder ) )
         self.XMLFolder = XMLFolder
         self.StrongsEntries = None
+        self.store = None
         if preload: self.load()
     # end of GreekLexicon.__init__
 
 
     def load( self ) -> None:
         """
-        Load the pickle file if it's there,
-            Otherwise use the converter to load the XML (slower).
+        Load everything into memory
+            from the compiled store (which is built the first time from the pickle file or the XML).
+
+        Note that this isn't necessary just to look up entries.
         """
         fnPrint( debuggingThisModule, "GreekLexicon.load()" )
         assert self.StrongsEntries is None
 
-        standardPickleFilepath = BibleOrgSysGlobals.BOS_DISTRIBUTED_FILES_FOLDERPATH.joinpath( 'GreekLexicon_Strongs_Table.1.pickle' )
-        if standardPickleFilepath.is_file():
-            import pickle
-            vPrint( 'Info', debuggingThisModule, f"Loading pickle file {standardPickleFilepath}…" )
-            with open( standardPickleFilepath, 'rb') as pickleFile:
-                self.StrongsEntries = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
-        else: # Load the original XML
-            from BibleOrgSys.OriginalLanguages.Converters.GreekLexiconConverter import GreekStrongsFileConverter
-            gStr = GreekStrongsFileConverter() # Create the empty object
-            gStr.loadAndValidate( self.XMLFolder ) # Load the XML
-            self.StrongsEntries = gStr.importDataToPython()
+        if self.store is None: self.store = getGreekLexiconStore( self.XMLFolder )
+        self.StrongsEntries = self.store.loadTable( 'Strongs' )
     # end of GreekLexicon.load
 
 
+    def _lookup( self, keyDigits:str ):
+        """
+        Returns the Strongs entry for the key
+            (from memory if load() has been called, otherwise from the compiled store).
+
+        Returns None if the key is not found.
+        """
+        if self.StrongsEntries is not None: return self.StrongsEntries.get( keyDigits )
+        if self.store is None: self.store = getGreekLexiconStore( self.XMLFolder )
+        return self.store.get( 'Strongs', keyDigits )
+    # end of GreekLexicon._lookup
+
+
     def __str__( self ) -> str:
         """
         This method returns the string representation of the GreekLexicon object.
@@ -123,9 +179,7 @@ class GreekLexicon:
             assert key and key[0]=='G' and key[1:].isdigit()
 
         keyDigits = key[1:]
-        if self.StrongsEntries is None: self.load()
-        if keyDigits in self.StrongsEntries:
-            return self.StrongsEntries[keyDigits]
+        return self._lookup( keyDigits )
     # end of GreekLexicon.getStrongsEntryData
 
 
@@ -140,11 +194,11 @@ class GreekLexicon:
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag:
             assert key and key[0]=='G' and key[1:].isdigit()
         keyDigits = key[1:]
-        if self.StrongsEntries is None: self.load()
-        if keyDigits in self.StrongsEntries:
-            #for f,d in self.StrongsEntries[keyDigits]:
+        entry = self._lookup( keyDigits )
+        if entry is not None:
+            #for f,d in entry:
                 #if f==fieldName: return d
-            if fieldName in self.StrongsEntries[keyDigits]: return self.StrongsEntries[keyDigits][fieldName]
+            if fieldName in entry: return entry[fieldName]
     # end of GreekLexicon.getStrongsEntryField
 
 
@@ -169,9 +223,8 @@ class GreekLexicon:
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag:
             assert key and key[0]=='G' and key[1:].isdigit()
         keyDigits = key[1:].lstrip( '0' ) # Remove leading zeroes
-        if self.StrongsEntries is None: self.load()
-        if keyDigits in self.StrongsEntries:
-            entry = self.StrongsEntries[keyDigits]
+        entry = self._lookup( keyDigits )
+        if entry is not None:
             vPrint( 'Verbose', debuggingThisModule, f"  GreekLexicon.getStrongsEntryHTML got entry: {entry}" )
             wordEntry = '{}'.format( entry['Entry'].replace('<StrongsRef>','<span class="StrongsRef">').replace('</StrongsRef>','</span>').replace('<def>','<span class="def">').replace('</def>','</span>') ) \
                         if 'Entry' in entry else ''
@@ -5,7 +5,7 @@
 #
 # Module handling Hebrew language
 #
-# Copyright (C) 2011-2020 Robert Hunt
+# Copyright (C) 2011-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -24,9 +24,13 @@
 
 """
 Module handling Hebrew language particularities.
+
+The mark removal and transliteration functions use precompiled tables
+    and can process a whole verse or book (or a list of words) at once.
 """
 from gettext import gettext as _
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import re
 import unicodedata
 
 if __name__ == '__main__':
@@ -39,10 +43,10 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 
 
-LAST_MODIFIED_DATE = '2020-05-03' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "Hebrew"
 PROGRAM_NAME = "Hebrew language handler"
-PROGRAM_VERSION = '0.09'
+PROGRAM_VERSION = '0.10'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -290,6 +294,135 @@ if BibleOrgSysGlobals.debugFlag and debuggingThisModule: # Check that our tables
 
 
 
+# Precompiled deletion tables for str.translate (one pass instead of one replace per mark)
+#   Note that removing other marks also removes any remaining meteg/siluq marks
+CANTILLATION_DELETION_TABLE = str.maketrans( '', '', ''.join( cantillationMarks ) )
+VOWEL_DELETION_TABLE = str.maketrans( '', '', ''.join( vowelPoints ) )
+OTHER_MARKS_DELETION_TABLE = str.maketrans( '', '', ''.join( otherMarks ) + metegOrSiluq )
+DELETION_TABLES = {} # Indexed by (removeCantillation, removeVowels, removeOthers)
+for removeCantillation in (False, True):
+    for removeVowels in (False, True):
+        for removeOthers in (False, True):
+            DELETION_TABLES[(removeCantillation,removeVowels,removeOthers)] = str.maketrans( '', '',
+                        (''.join( cantillationMarks ) if removeCantillation else '')
+                        + (''.join( vowelPoints ) if removeVowels else '')
+                        + (''.join( otherMarks ) + metegOrSiluq if removeOthers else '') )
+del removeCantillation, removeVowels, removeOthers
+
+
+def _compileTransliterationScheme( schemeTuple ) -> Tuple[re.Pattern,Dict[str,str],Dict[int,str]]:
+    """
+    Converts a scheme of (Hebrew,transliteration) substitutions (applied in order)
+        into a regex and dictionary for the multi-character sequences
+        plus a str.translate table for the single characters.
+
+    The multi-character sequences always precede the single characters that they contain
+        in our schemes, so they are substituted first.
+    """
+    sequenceDict, characterDict = {}, {}
+    for hebrew,transliteration in schemeTuple:
+        if len(hebrew) == 1:
+            characterDict.setdefault( hebrew, transliteration ) # The first one given wins
+        elif hebrew not in sequenceDict:
+            assert not any( char in characterDict for char in hebrew ) # Check our assumption
+            sequenceDict[hebrew] = transliteration
+    sequenceRegex = re.compile( '|'.join( re.escape( hebrew ) for hebrew in sorted( sequenceDict, key=len, reverse=True ) ) )
+    return sequenceRegex, sequenceDict, str.maketrans( characterDict )
+# end of _compileTransliterationScheme
+
+compiledTransliterationSchemes = { schemeName:_compileTransliterationScheme( schemeTuple ) for schemeName,schemeTuple in transliterationSchemes.items() }
+
+
+def removeMetegOrSiluqMarks( text:str, asVowel:bool ) -> str:
+    """
+    Remove meteg/siluq marks which appear to be vowel points (if asVowel is True)
+        or which appear to be cantillation marks (if asVowel is False).
+
+    It's actually often impossible to tell automatically which purpose this Unicode mark has.
+
+    This is done in one pass through the text (jumping from one meteg/siluq to the next).
+    """
+    if metegOrSiluq not in text: return text # Nothing to do (the usual case)
+
+    resultParts = []
+    startIndex, previousMark = 0, ''
+    j = text.find( metegOrSiluq )
+    while j != -1:
+        if j > startIndex: previousMark = text[j-1] # else it's the previous (kept) meteg or the mark before a deleted one
+        resultParts.append( text[startIndex:j] )
+        isVowelMeteg = previousMark in ( patah, segol ) # Assume it's a vowel point meteg
+        deleteIt = isVowelMeteg == asVowel
+        if BibleOrgSysGlobals.verbosityLevel > 2:
+            nextMark = text[j+1] if j<len(text)-1 else ''
+            vPrint( 'Info', debuggingThisModule, f"{'Deleting' if deleteIt else 'Ignoring'} ({'vowel point' if isVowelMeteg else 'cantillation mark'}) meteg/siluq"
+                        f" after {previousMark!r} ({unicodedata.name(previousMark) if previousMark else ''}) and before {nextMark!r} ({unicodedata.name(nextMark) if nextMark else ''})" )
+        if not deleteIt:
+            resultParts.append( metegOrSiluq )
+            previousMark = metegOrSiluq
+        startIndex = j + 1
+        j = text.find( metegOrSiluq, startIndex )
+    resultParts.append( text[startIndex:] )
+    return ''.join( resultParts )
+# end of removeMetegOrSiluqMarks
+
+
+def removeHebrewMarks( text:str, removeCantillation:bool=True, removeVowels:bool=False, removeOthers:bool=False, removeMetegOrSiluq:bool=False ) -> str:
+    """
+    Return the text (which can be a word, a verse, or a whole book) with the requested marks removed.
+
+    This gives the same result as calling the Hebrew object methods
+        removeCantillationMarks, removeVowelPointing, and removeOtherMarks in that order.
+    """
+    if removeMetegOrSiluq:
+        # Which meteg/siluq marks get removed depends on the surrounding marks, so we have to go step by step
+        if removeCantillation: text = removeMetegOrSiluqMarks( text, asVowel=False ).translate( CANTILLATION_DELETION_TABLE )
+        if removeVowels: text = removeMetegOrSiluqMarks( text, asVowel=True ).translate( VOWEL_DELETION_TABLE )
+        if removeOthers: text = text.translate( OTHER_MARKS_DELETION_TABLE )
+        return text
+    return text.translate( DELETION_TABLES[(removeCantillation,removeVowels,removeOthers)] )
+# end of removeHebrewMarks
+
+
+def transliterateHebrew( text:str, scheme:Optional[str]=None ) -> str:
+    """
+    Return a (roughly) transliterated version of the text (which can be a word, a verse, or a whole book).
+    """
+    if scheme is None: scheme = 'Default'
+    sequenceRegex, sequenceDict, characterTable = compiledTransliterationSchemes[scheme]
+    return sequenceRegex.sub( lambda match: sequenceDict[match.group()], text ).translate( characterTable )
+# end of transliterateHebrew
+
+
+BATCH_SEPARATOR = '\n'
+def _processBatch( function, texts, **kwargs ) -> List[str]:
+    """
+    Apply the function to all of the texts (e.g., words) at once
+        by joining them together and splitting the result apart again.
+    """
+    texts = list( texts )
+    if any( BATCH_SEPARATOR in text for text in texts ): # Can't do it all at once
+        return [function( text, **kwargs ) for text in texts]
+    return function( BATCH_SEPARATOR.join( texts ), **kwargs ).split( BATCH_SEPARATOR ) if texts else []
+# end of _processBatch
+
+def removeHebrewMarksBatch( texts, **kwargs ) -> List[str]:
+    """
+    Given an iterable of texts (e.g., all the words in a verse or book),
+        return a list of them with the requested marks removed (see removeHebrewMarks for the parameters).
+    """
+    return _processBatch( removeHebrewMarks, texts, **kwargs )
+# end of removeHebrewMarksBatch
+
+def transliterateHebrewBatch( texts, scheme:Optional[str]=None ) -> List[str]:
+    """
+    Given an iterable of texts (e.g., all the words in a verse or book),
+        return a list of their transliterations.
+    """
+    return _processBatch( transliterateHebrew, texts, scheme=scheme )
+# end of transliterateHebrewBatch
+
+
+
 class Hebrew():
     """
     Class for handling a Hebrew string.
@@ -361,8 +494,7 @@ class Hebrew():
             self.currentText = self.removeAllMetegOrSiluq( self.currentText ) # recursive call
             return self.currentText
         # else we were given some text to process
-        text = text.replace( metegOrSiluq, '' )
-        return text
+        return text.replace( metegOrSiluq, '' )
     # end of Hebrew.removeAllMetegOrSiluq
 
 
@@ -371,32 +503,7 @@ class Hebrew():
         It's actually often impossible to tell automatically which purpose this Unicode mark has.
         """
         #dPrint( 'Quiet', debuggingThisModule, "_removeMetegOrSiluq( {!r}, {} )".format( text, asVowel ) )
-
-        while text:
-            textLength = len( text )
-            madeChanges = False
-            for j,mark in enumerate(text):
-                if mark != metegOrSiluq: continue
-                previousMark = text[j-1] if j>0 else ''
-                nextMark = text[j+1] if j<textLength-1 else ''
-                if previousMark in ( patah, segol ) or nextMark in (): # Assume it's a vowel point meteg
-                    if asVowel:
-                        vPrint( 'Info', debuggingThisModule, f"Deleting (vowel point) meteg after {previousMark!r} ({unicodedata.name(previousMark) if previousMark else ''}) and before {nextMark!r} ({unicodedata.name(nextMark) if nextMark else ''})" )
-                        text = text[:j] + text[j+1:]
-                        madeChanges = True
-                        break
-                    else:
-                        vPrint( 'Info', debuggingThisModule, f"Ignoring (vowel point) meteg/siluq after {previousMark!r} ({unicodedata.name(previousMark) if previousMark else ''}) and before {nextMark!r} ({unicodedata.name(nextMark) if nextMark else ''})" )
-                else: # it doesn't appear to be a vowel point meteg
-                    if not asVowel:
-                        vPrint( 'Info', debuggingThisModule, f"Deleting (cantillation mark) siluq after {previousMark!r} ({unicodedata.name(previousMark) if previousMark else ''}) and before {nextMark!r} ({unicodedata.name(nextMark) if nextMark else ''})" )
-                        text = text[:j] + text[j+1:]
-                        madeChanges = True
-                        break
-                    else:
-                        vPrint( 'Info', debuggingThisModule, f"Ignoring (cantillation mark) meteg/siluq after {previousMark!r} ({unicodedata.name(previousMark) if previousMark else ''}) and before {nextMark!r} ({unicodedata.name(nextMark) if nextMark else ''})" )
-            if not madeChanges: break # Check for another meteg if we made any changes
-        return text
+        return removeMetegOrSiluqMarks( text, asVowel )
     # end of Hebrew._removeMetegOrSiluq
 
 
@@ -411,9 +518,7 @@ class Hebrew():
             return self.currentText
 
         # else we were given some text to process
-        if removeMetegOrSiluq: text = self._removeMetegOrSiluq( text, asVowel=False )
-        for cantillationMark in cantillationMarks: text = text.replace(cantillationMark, '')
-        return text
+        return removeHebrewMarks( text, removeCantillation=True, removeMetegOrSiluq=removeMetegOrSiluq )
     # end of Hebrew.removeCantillationMarks
 
 
@@ -424,12 +529,10 @@ class Hebrew():
         #dPrint( 'Quiet', debuggingThisModule, "removeVowelPointing( {!r}, {} )".format( text, removeMetegOrSiluq ) )
 
         if text is None: # Use our own text
-            self.currentText = self.removeVowelPointing( self.currentText ) # recursive call
+            self.currentText = self.removeVowelPointing( self.currentText, removeMetegOrSiluq ) # recursive call
             return self.currentText
         # else we were given some text to process
-        if removeMetegOrSiluq: text = self._removeMetegOrSiluq( text, asVowel=True )
-        for vowelPoint in vowelPoints: text = text.replace(vowelPoint, '') # Remove the easy vowel points
-        return text
+        return removeHebrewMarks( text, removeCantillation=False, removeVowels=True, removeMetegOrSiluq=removeMetegOrSiluq )
     # end of Hebrew.removeVowelPointing
 
 
@@ -443,9 +546,7 @@ class Hebrew():
             self.currentText = self.removeOtherMarks( self.currentText ) # recursive call
             return self.currentText
         # else we were given some text to process
-        text = self.removeAllMetegOrSiluq( text )
-        for otherMark in otherMarks: text = text.replace(otherMark, '')
-        return text
+        return text.translate( OTHER_MARKS_DELETION_TABLE ) # Also removes all meteg/siluq marks
     # end of Hebrew.removeOtherMarks
 
 
@@ -457,11 +558,9 @@ class Hebrew():
             outputText = self.transliterate( self.currentText, scheme=scheme )
             return outputText
         # else we were given some text to process
-        outputText = text
         if scheme is None: scheme = 'Default'
         assert scheme in ('Default','Standard','Names')
-        for h,tr in transliterationSchemes[scheme]: outputText = outputText.replace( h, tr )
-        return outputText
+        return transliterateHebrew( text, scheme )
 # end of Hebrew class
 
 
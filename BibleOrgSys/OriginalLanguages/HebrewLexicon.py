@@ -5,7 +5,7 @@
 #
 # Module handling the Hebrew lexicon
 #
-# Copyright (C) 2011-2020 Robert Hunt
+# Copyright (C) 2011-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -28,9 +28,13 @@ Module handling the OpenScriptures Hebrew lexicon.
     The classes are the ones for users to
         access the Strongs and Brown, Driver, Briggs lexical entries
         via various keys and in various formats.
+
+    Unless load() is called to load everything into memory,
+        entries are read individually from a compiled lexicon store
+        which is built (from the XML or distributed pickle) the first time it's needed.
 """
 from gettext import gettext as _
-from typing import Optional
+from typing import Any, Dict, Optional
 # import logging
 import os.path
 import re
@@ -42,17 +46,82 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.OriginalLanguages.LexiconStore import LexiconStore, getLexiconStore
 
 
-LAST_MODIFIED_DATE = '2020-05-03' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "HebrewLexicon"
 PROGRAM_NAME = "Hebrew Lexicon handler"
-PROGRAM_VERSION = '0.20'
+PROGRAM_VERSION = '0.22'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
+HEBREW_LEXICON_PICKLE_FILEPATH = BibleOrgSysGlobals.BOS_DISTRIBUTED_FILES_FOLDERPATH.joinpath( 'HebrewLexicon_Tables.1.pickle' )
+
+
+
+def loadHebrewLexiconTables( XMLFolder=None ) -> Dict[str,Dict[str,Any]]:
+    """
+    Load all of the Hebrew lexicon tables
+        from the distributed pickle file if it's there,
+        otherwise from the XML (slow).
+
+    Returns a dictionary of tables (which are each dictionaries of entries).
+    """
+    fnPrint( debuggingThisModule, f"loadHebrewLexiconTables( {XMLFolder} )" )
+    if HEBREW_LEXICON_PICKLE_FILEPATH.is_file():
+        import pickle
+        vPrint( 'Info', debuggingThisModule, f"Loading pickle file {HEBREW_LEXICON_PICKLE_FILEPATH}…" )
+        with open( HEBREW_LEXICON_PICKLE_FILEPATH, 'rb') as pickleFile: # The protocol version used is detected automatically, so we do not have to specify it
+            indexEntries1 = pickle.load( pickleFile ) # Augmented Strongs
+            indexEntries2 = pickle.load( pickleFile ) # Augmented Strongs
+            indexEntries = pickle.load( pickleFile ) # lix.entries
+            StrongsEntries = pickle.load( pickleFile ) # hlc.entries
+            BrownDriverBriggsEntries = pickle.load( pickleFile ) # bdb.entries
+    else: # Load the original XML
+        from BibleOrgSys.OriginalLanguages.Converters.HebrewLexiconConverter import AugmentedStrongsIndexFileConverter, \
+                LexicalIndexFileConverter, HebrewStrongsFileConverter, BrownDriverBriggsFileConverter
+        hASIndex = AugmentedStrongsIndexFileConverter() # Create the empty object
+        hASIndex.loadAndValidate( XMLFolder ) # Load the XML
+        indexEntries1, indexEntries2 = hASIndex.importDataToPython()
+        hLexIndex = LexicalIndexFileConverter() # Create the empty object
+        hLexIndex.loadAndValidate( XMLFolder ) # Load the XML
+        indexEntries = hLexIndex.importDataToPython()
+        hStr = HebrewStrongsFileConverter() # Create the empty object
+        hStr.loadAndValidate( XMLFolder ) # Load the XML
+        StrongsEntries = hStr.importDataToPython()
+        hBrDrBr = BrownDriverBriggsFileConverter() # Create the empty object
+        hBrDrBr.loadAndValidate( XMLFolder ) # Load the XML
+        BrownDriverBriggsEntries = hBrDrBr.importDataToPython()
+
+    return { 'AugIndex1':indexEntries1, 'AugIndex2':indexEntries2,
+            'LexicalIndex_heb':indexEntries['heb'], 'LexicalIndex_arc':indexEntries['arc'],
+            'Strongs':StrongsEntries,
+            'BrDrBr_heb':BrownDriverBriggsEntries['heb'], 'BrDrBr_arc':BrownDriverBriggsEntries['arc'] }
+# end of loadHebrewLexiconTables
+
+
+def getHebrewLexiconStore( XMLFolder=None ) -> LexiconStore:
+    """
+    Returns the (shared) compiled store for the Hebrew lexicon.
+
+    It's compiled from the distributed pickle file if it's there,
+        otherwise from the XML files in the given folder,
+        and is recompiled automatically if those source files change.
+    """
+    from BibleOrgSys.OriginalLanguages.Converters.HebrewLexiconConverter import DEFAULT_LEXICON_FOLDERPATH, \
+            AugmentedStrongsIndexFileConverter, LexicalIndexFileConverter, HebrewStrongsFileConverter, BrownDriverBriggsFileConverter
+
+    if XMLFolder is None: XMLFolder = DEFAULT_LEXICON_FOLDERPATH
+    sourceFilepaths = [HEBREW_LEXICON_PICKLE_FILEPATH] if HEBREW_LEXICON_PICKLE_FILEPATH.is_file() \
+        else [os.path.join( XMLFolder, filename ) for filename in (AugmentedStrongsIndexFileConverter.indexFilename,
+                LexicalIndexFileConverter.indexFilename, HebrewStrongsFileConverter.databaseFilename, BrownDriverBriggsFileConverter.databaseFilename)]
+    return getLexiconStore( 'HebrewLexicon', sourceFilepaths, lambda: loadHebrewLexiconTables( XMLFolder ) )
+# end of getHebrewLexiconStore
+
+
 
 class HebrewLexiconIndex:
     """
@@ -67,32 +136,44 @@ class HebrewLexiconIndex:
         """
         fnPrint( debuggingThisModule, "HebrewLexiconIndex.__init__( {} )".format( XMLFolder ) )
         self.XMLFolder = XMLFolder
+        self.indexEntries1 = self.indexEntries2 = self.indexEntries = None
+        self.store = None
     # end of HebrewLexiconIndex.__init__
 
 
     def load( self ) -> None:
         """
-        Load from the XML
-        """
-        from BibleOrgSys.OriginalLanguages.Converters.HebrewLexiconConverter import AugmentedStrongsIndexFileConverter, LexicalIndexFileConverter
+        Load the index into memory
+            from the compiled store (which is built the first time from the pickled data or the XML).
 
+        Note that this isn't necessary just to look up entries.
+        """
         vPrint( 'Verbose', debuggingThisModule, _("HebrewLexiconIndex.load()") )
-        if self.XMLFolder is None:
-            self.XMLFolder = BibleOrgSysGlobals.BADBAD_PARALLEL_RESOURCES_BASE_FOLDERPATH.joinpath( 'HebrewLexicon/' ) # Hebrew lexicon folder
-
-        hASIndex = AugmentedStrongsIndexFileConverter() # Create the empty object
-        hASIndex.loadAndValidate( self.XMLFolder ) # Load the XML
-        self.indexEntries1, self.indexEntries2 = hASIndex.importDataToPython()
+        if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+        self.indexEntries1 = self.store.loadTable( 'AugIndex1' )
+        self.indexEntries2 = self.store.loadTable( 'AugIndex2' )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert len(self.indexEntries1) == len(self.indexEntries2)
-        hLexIndex = LexicalIndexFileConverter() # Create the empty object
-        hLexIndex.loadAndValidate( self.XMLFolder ) # Load the XML
-        self.indexEntries = hLexIndex.importDataToPython()
-        if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
-            assert len(self.indexEntries) == 2
+        self.indexEntries = { 'heb':self.store.loadTable( 'LexicalIndex_heb' ), 'arc':self.store.loadTable( 'LexicalIndex_arc' ) }
     # end of HebrewLexiconIndex.load()
 
 
+    def _lookup( self, tableName:str, key:str ):
+        """
+        Returns the entry for the key from the given table
+            (from memory if load() has been called, otherwise from the compiled store).
+
+        Returns None if the key is not found.
+        """
+        if self.indexEntries1 is None: # Not loaded into memory
+            if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+            return self.store.get( tableName, key )
+        if tableName == 'AugIndex1': return self.indexEntries1.get( key )
+        if tableName == 'AugIndex2': return self.indexEntries2.get( key )
+        return self.indexEntries[tableName[-3:]].get( key ) # LexicalIndex_heb or LexicalIndex_arc
+    # end of HebrewLexiconIndex._lookup
+
+
     def __str__( self ) -> str:
         """
         This method returns the string representation of a Bible book code.
@@ -104,9 +185,13 @@ class HebrewLexiconIndex:
         #if self.title: result += ('\n' if result else '') + self.title
         #if self.version: result += ('\n' if result else '') + "Version: {} ".format( self.version )
         #if self.date: result += ('\n' if result else '') + "Date: {}".format( self.date )
-        result += ('\n' if result else '') + "  " + _("Number of augmented Strong's index entries = {:,}").format( len(self.indexEntries1) )
-        result += ('\n' if result else '') + "  " + _("Number of Hebrew lexical index entries = {:,}").format( len(self.indexEntries['heb']) )
-        result += ('\n' if result else '') + "  " + _("Number of Aramaic lexical index entries = {:,}").format( len(self.indexEntries['arc']) )
+        if self.indexEntries1 is None: # Not loaded into memory
+            if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+            tableSizes = self.store.getTableSizes()
+        else: tableSizes = { 'AugIndex1':len(self.indexEntries1), 'LexicalIndex_heb':len(self.indexEntries['heb']), 'LexicalIndex_arc':len(self.indexEntries['arc']) }
+        result += ('\n' if result else '') + "  " + _("Number of augmented Strong's index entries = {:,}").format( tableSizes['AugIndex1'] )
+        result += ('\n' if result else '') + "  " + _("Number of Hebrew lexical index entries = {:,}").format( tableSizes['LexicalIndex_heb'] )
+        result += ('\n' if result else '') + "  " + _("Number of Aramaic lexical index entries = {:,}").format( tableSizes['LexicalIndex_arc'] )
         return result
     # end of HebrewLexiconIndex.__str__
 
@@ -118,8 +203,7 @@ class HebrewLexiconIndex:
         Returns a lexicon internal code like 'acd'.
         """
         if key and key[0]=='H': key = key[1:] # Remove any leading 'H'
-        keyDigits = key[1:]
-        if key in self.indexEntries1: return self.indexEntries1[key]
+        return self._lookup( 'AugIndex1', key )
     # end of HebrewLexiconIndex.getLexiconCodeFromStrongsNumber
 
 
@@ -129,7 +213,7 @@ class HebrewLexiconIndex:
 
         Returns a Hebrew Strong's number (but only the digits -- no preceding H)
         """
-        if key in self.indexEntries2: return self.indexEntries2[key]
+        return self._lookup( 'AugIndex2', key )
     # end of HebrewLexiconIndex.getStrongsNumberFromLexiconCode1
 
 
@@ -139,9 +223,9 @@ class HebrewLexiconIndex:
 
         Returns a Hebrew Strong's number (but only the digits -- no preceding H)
         """
-        keyDigits = key[1:]
-        if key in self.indexEntries['heb']: return self.indexEntries['heb'][key][4]
-        if key in self.indexEntries['arc']: return self.indexEntries['arc'][key][4]
+        for tableName in ('LexicalIndex_heb','LexicalIndex_arc'):
+            entry = self._lookup( tableName, key )
+            if entry is not None: return entry[4]
     # end of HebrewLexiconIndex.getStrongsNumberFromLexiconCode2
 
 
@@ -151,14 +235,13 @@ class HebrewLexiconIndex:
 
         Returns a Hebrew Strong's number (but only the digits -- no preceding H)
         """
-        keyDigits = key[1:]
         if BibleOrgSysGlobals.debugFlag:
             result1 = self._getStrongsNumberFromLexiconCode1( key )
             result2 = self._getStrongsNumberFromLexiconCode2( key )
             assert result1 == result2
             return result1
         # Normally…
-        if key in self.indexEntries2: return self.indexEntries2[key]
+        return self._lookup( 'AugIndex2', key )
     # end of HebrewLexiconIndex.getStrongsNumberFromLexiconCode
 
 
@@ -168,9 +251,9 @@ class HebrewLexiconIndex:
 
         Returns a BrDrBr code, e.g., 'm.ba.aa'
         """
-        keyDigits = key[1:]
-        if key in self.indexEntries['heb']: return self.indexEntries['heb'][key][3]
-        if key in self.indexEntries['arc']: return self.indexEntries['arc'][key][3]
+        for tableName in ('LexicalIndex_heb','LexicalIndex_arc'):
+            entry = self._lookup( tableName, key )
+            if entry is not None: return entry[3]
     # end of HebrewLexiconIndex.getBrDrBrCodeFromLexiconCode
 
 
@@ -184,8 +267,8 @@ class HebrewLexiconIndex:
 
         if key and key[0]=='H': key = key[1:] # Remove any leading 'H'
         #keyDigits = key[1:]
-        if key in self.indexEntries1:
-            internalCode = self.indexEntries1[key]
+        internalCode = self._lookup( 'AugIndex1', key )
+        if internalCode is not None:
             return self.getBrDrBrCodeFromLexiconCode( internalCode )
     # end of HebrewLexiconIndex.getBrDrBrCodeFromStrongsNumber
 
@@ -196,9 +279,9 @@ class HebrewLexiconIndex:
 
         Returns a BrDrBr code, e.g., '4a'
         """
-        keyDigits = key[1:]
-        if key in self.indexEntries['heb']: return self.indexEntries['heb'][key][6]
-        if key in self.indexEntries['arc']: return self.indexEntries['arc'][key][6]
+        for tableName in ('LexicalIndex_heb','LexicalIndex_arc'):
+            entry = self._lookup( tableName, key )
+            if entry is not None: return entry[6]
     # end of HebrewLexiconIndex.getTWOTCodeFromLexiconCode
 # end of HebrewLexiconIndex class
 
@@ -218,27 +301,39 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.__init__( {} )".format( XMLFolder ) )
         self.XMLFolder = XMLFolder
         self.StrongsEntries = self.BrownDriverBriggsEntries = None
+        self.store = None
         if preload: self.load()
     # end of HebrewLexiconSimple.__init__
 
 
-    def load( self ):
+    def load( self ) -> None:
         """
-        Load the actual lexicon (slow).
+        Load the Strongs and BrDrBr entries into memory
+            from the compiled store (which is built the first time from the pickled data or the XML).
+
+        Note that this isn't necessary just to look up entries.
         """
-        from BibleOrgSys.OriginalLanguages.Converters.HebrewLexiconConverter import HebrewStrongsFileConverter, BrownDriverBriggsFileConverter
+        fnPrint( debuggingThisModule, "HebrewLexiconSimple.load()" )
+        if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+        self.StrongsEntries = self.store.loadTable( 'Strongs' )
+        self.BrownDriverBriggsEntries = { 'heb':self.store.loadTable( 'BrDrBr_heb' ), 'arc':self.store.loadTable( 'BrDrBr_arc' ) }
+    # end of HebrewLexiconSimple.load
 
-        if self.XMLFolder is None:
-            self.XMLFolder = BibleOrgSysGlobals.BADBAD_PARALLEL_RESOURCES_BASE_FOLDERPATH.joinpath( 'HebrewLexicon/' ) # Hebrew lexicon folder
 
-        hStr = HebrewStrongsFileConverter() # Create the empty object
-        hStr.loadAndValidate( self.XMLFolder ) # Load the XML
-        self.StrongsEntries = hStr.importDataToPython()
+    def _lookup( self, tableName:str, key:str ):
+        """
+        Returns the entry for the key from the given table
+            (from memory if load() has been called, otherwise from the compiled store).
 
-        hBrDrBr = BrownDriverBriggsFileConverter() # Create the empty object
-        hBrDrBr.loadAndValidate( self.XMLFolder ) # Load the XML
-        self.BrownDriverBriggsEntries = hBrDrBr.importDataToPython()
-    # end of HebrewLexiconSimple.load
+        Returns None if the key is not found.
+        """
+        if tableName == 'Strongs':
+            if self.StrongsEntries is not None: return self.StrongsEntries.get( key )
+        elif self.BrownDriverBriggsEntries is not None: # BrDrBr_heb or BrDrBr_arc
+            return self.BrownDriverBriggsEntries[tableName[-3:]].get( key )
+        if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+        return self.store.get( tableName, key )
+    # end of HebrewLexiconSimple._lookup
 
 
     def __str__( self ) -> str:
@@ -252,6 +347,7 @@ class HebrewLexiconSimple:
         #if self.title: result += ('\n' if result else '') + self.title
         #if self.version: result += ('\n' if result else '') + "Version: {} ".format( self.version )
         #if self.date: result += ('\n' if result else '') + "Date: {}".format( self.date )
+        if self.store is not None: result += ('\n' if result else '') + "  " + _("Using compiled store {}").format( self.store.storeFilepath )
         if self.StrongsEntries:
             result += ('\n' if result else '') + "  " + _("Number of Strong's Hebrew entries = {:,}").format( len(self.StrongsEntries) )
         if self.BrownDriverBriggsEntries:
@@ -273,10 +369,9 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.getStrongsEntryData( {!r} )".format( key ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key[0]=='H' and key[1:].isdigit()
-        if self.StrongsEntries is None: self.load()
 
         keyDigits = key[1:]
-        if keyDigits in self.StrongsEntries: return self.StrongsEntries[keyDigits]
+        return self._lookup( 'Strongs', keyDigits )
     # end of HebrewLexiconSimple.getStrongsEntryData
 
 
@@ -291,13 +386,13 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.getStrongsEntryField( {!r}, {!r} )".format( key, fieldName ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key[0]=='H' and key[1:].isdigit()
-        if self.StrongsEntries is None: self.load()
 
         keyDigits = key[1:]
-        if keyDigits in self.StrongsEntries:
-            #for f,d in self.StrongsEntries[keyDigits]:
+        entry = self._lookup( 'Strongs', keyDigits )
+        if entry is not None:
+            #for f,d in entry:
                 #if f==fieldName: return d
-            if fieldName in self.StrongsEntries[keyDigits]: return self.StrongsEntries[keyDigits][fieldName]
+            if fieldName in entry: return entry[fieldName]
     # end of HebrewLexiconSimple.getStrongsEntryField
 
 
@@ -322,14 +417,13 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, f"HebrewLexiconSimple.getStrongsEntryHTML( {key} )…" )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key[0]=='H' and key[1:].isdigit()
-        if self.StrongsEntries is None: self.load()
 
         #if key == 'H1':
             #dPrint( 'Quiet', debuggingThisModule, "Should be:" )
             #dPrint( 'Quiet', debuggingThisModule, 'sHTML: <li value="1" id="ot:1"><i title="{awb}" xml:lang="hbo">אָב</i> a primitive word; father, in a literal and immediate, or figurative and remote application): <span class="kjv_def">chief, (fore-)father(-less), X patrimony, principal</span>. Compare names in "Abi-".</li>' )
         keyDigits = key[1:].lstrip( '0' ) # Remove leading zeroes
-        if keyDigits in self.StrongsEntries:
-            entry = self.StrongsEntries[keyDigits]
+        entry = self._lookup( 'Strongs', keyDigits )
+        if entry is not None:
             for j, (subentry,article) in enumerate( entry.items() ):
                 vPrint( 'Verbose', debuggingThisModule, f"    {j} {subentry}={article}" )
             wordEntry = entry['word']
@@ -377,10 +471,10 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.getBrDrBrEntryData( {!r} )".format( key ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key.count('.')==2
-        if self.BrownDriverBriggsEntries is None: self.load()
 
-        if key in self.BrownDriverBriggsEntries['heb']: return self.BrownDriverBriggsEntries['heb'][key]
-        if key in self.BrownDriverBriggsEntries['arc']: return self.BrownDriverBriggsEntries['arc'][key]
+        for tableName in ('BrDrBr_heb','BrDrBr_arc'):
+            entry = self._lookup( tableName, key )
+            if entry is not None: return entry
     # end of HebrewLexiconSimple.getBrDrBrEntryData
 
 
@@ -395,7 +489,6 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.getBrDrBrEntryField( {!r}, {!r} )".format( key, fieldName ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key.count('.')==2
-        if self.BrownDriverBriggsEntries is None: self.load()
 
         entry =  self.getBrDrBrEntryData( key )
         #dPrint( 'Quiet', debuggingThisModule, "HebrewLexiconSimple.getBrDrBrEntryField entry: {}".format( entry ) )
@@ -415,7 +508,6 @@ class HebrewLexiconSimple:
         fnPrint( debuggingThisModule, "HebrewLexiconSimple.getBrDrBrEntryHTML( {!r} )".format( key ) )
         if debuggingThisModule or BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag:
             assert key and key.count('.')==2
-        if self.BrownDriverBriggsEntries is None: self.load()
 
         entry =  self.getBrDrBrEntryData( key )
         vPrint( 'Verbose', debuggingThisModule, f"  HebrewLexiconSimple.getBrDrBrEntryHTML got entry: {entry}" )
@@ -472,30 +564,32 @@ class HebrewLexicon( HebrewLexiconSimple ):
 
     def load( self ) -> None:
         """
-        Load the pickled data if possible.
+        Load everything into memory
+            from the compiled store (which is built the first time from the pickled data or the XML).
 
-        Otherwise lLoad the actual XML lexicon (slow).
+        Note that this isn't necessary just to look up entries.
         """
         fnPrint( debuggingThisModule, "HebrewLexicon.load()" )
-        standardPickleFilepath = BibleOrgSysGlobals.BOS_DISTRIBUTED_FILES_FOLDERPATH.joinpath( 'HebrewLexicon_Tables.1.pickle' )
-        if standardPickleFilepath.is_file():
-            import pickle
-            self.hlix = HebrewLexiconIndex()
-            vPrint( 'Info', debuggingThisModule, f"Loading pickle file {standardPickleFilepath}…" )
-            with open( standardPickleFilepath, 'rb') as pickleFile: # The protocol version used is detected automatically, so we do not have to specify it
-                self.hlix.indexEntries1 = pickle.load( pickleFile ) # Augmented Strongs
-                self.hlix.indexEntries2 = pickle.load( pickleFile ) # Augmented Strongs
-                self.hlix.indexEntries = pickle.load( pickleFile ) # lix.entries
-                self.StrongsEntries = pickle.load( pickleFile ) # hlc.entries
-                self.BrownDriverBriggsEntries = pickle.load( pickleFile ) # bdb.entries
-        else: # Load the original XML
-            HebrewLexiconSimple.load( self )
-            assert self.hlix is None
-            self.hlix = HebrewLexiconIndex( self.XMLFolder ) # Load and process the XML
-            self.hlix.load()
+        if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+        self.hlix = HebrewLexiconIndex( self.XMLFolder )
+        self.hlix.store = self.store
+        self.hlix.load()
+        HebrewLexiconSimple.load( self )
     # end of HebrewLexicon.load
 
 
+    def _getIndex( self ) -> HebrewLexiconIndex:
+        """
+        Returns the index object (without loading it all into memory).
+        """
+        if self.hlix is None:
+            if self.store is None: self.store = getHebrewLexiconStore( self.XMLFolder )
+            self.hlix = HebrewLexiconIndex( self.XMLFolder )
+            self.hlix.store = self.store
+        return self.hlix
+    # end of HebrewLexicon._getIndex
+
+
     def __str__( self ) -> str:
         """
         This method returns the string representation of a Bible book code.
@@ -507,7 +601,7 @@ class HebrewLexicon( HebrewLexiconSimple ):
         #if self.title: result += ('\n' if result else '') + self.title
         #if self.version: result += ('\n' if result else '') + "Version: {} ".format( self.version )
         #if self.date: result += ('\n' if result else '') + "Date: {}".format( self.date )
-        if self.hlix is not None:
+        if self.hlix is not None and self.hlix.indexEntries1 is not None:
             result += ('\n' if result else '') + "  " + _("Number of augmented Strong's index entries = {:,}").format( len(self.hlix.indexEntries1) )
             result += ('\n' if result else '') + "  " + _("Number of Hebrew lexical index entries = {:,}").format( len(self.hlix.indexEntries['heb']) )
             result += ('\n' if result else '') + "  " + _("Number of Aramaic lexical index entries = {:,}").format( len(self.hlix.indexEntries['arc']) )
@@ -532,8 +626,7 @@ class HebrewLexicon( HebrewLexiconSimple ):
         """
         fnPrint( debuggingThisModule, "HebrewLexicon.getBrDrBrEntryData( {!r} )".format( key ) )
         if '.' not in key: # assume it's a Strongs code then
-            if self.hlix is None: self.load()
-            key = self.hlix.getBrDrBrCodeFromStrongsNumber( key )
+            key = self._getIndex().getBrDrBrCodeFromStrongsNumber( key )
         if key:
             return HebrewLexiconSimple.getBrDrBrEntryData( self, key )
     # end of HebrewLexicon.getBrDrBrEntryData
@@ -551,8 +644,7 @@ class HebrewLexicon( HebrewLexiconSimple ):
         fnPrint( debuggingThisModule, "HebrewLexicon.getBrDrBrEntryField( {!r}, {!r} )".format( key, fieldName ) )
 
         if '.' not in key: # assume it's a Strongs code then
-            if self.hlix is None: self.load()
-            key = self.hlix.getBrDrBrCodeFromStrongsNumber( key )
+            key = self._getIndex().getBrDrBrCodeFromStrongsNumber( key )
             #dPrint( 'Quiet', debuggingThisModule, "HebrewLexicon.getBrDrBrEntryField got key: {}".format( key ) )
         if key:
             return HebrewLexiconSimple.getBrDrBrEntryField( self, key, fieldName ) # Recursive call
@@ -569,8 +661,7 @@ class HebrewLexicon( HebrewLexiconSimple ):
         """
         fnPrint( debuggingThisModule, f"HebrewLexicon.getBrDrBrEntryHTML( {key} )…" )
         if '.' not in key: # assume it's a Strongs code then
-            if self.hlix is None: self.load()
-            key = self.hlix.getBrDrBrCodeFromStrongsNumber( key )
+            key = self._getIndex().getBrDrBrCodeFromStrongsNumber( key )
         if key:
             html = HebrewLexiconSimple.getBrDrBrEntryHTML( self, key )
             vPrint( 'Verbose', debuggingThisModule, f"  HebrewLexicon.getBrDrBrEntryHTML about to return: {html}" )
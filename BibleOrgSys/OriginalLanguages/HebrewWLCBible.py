@@ -5,7 +5,7 @@
 #
 # Module handling Open Scriptures Hebrew WLC.
 #
-# Copyright (C) 2011-2020 Robert Hunt
+# Copyright (C) 2011-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -28,27 +28,33 @@ Module handling the Hebrew WLC OSIS files from Open Scriptures.
 from gettext import gettext as _
 from pathlib import Path
 import os.path
+import sys
 import logging
 import pickle
+import struct
+import mmap
+import sqlite3
+import threading
+from array import array
 
 if __name__ == '__main__':
-    import sys
     aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
     if aboveAboveFolderpath not in sys.path:
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 from BibleOrgSys.OriginalLanguages import Hebrew
+from BibleOrgSys.OriginalLanguages.LexiconStore import getSourceSignature
 from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntry, InternalBibleExtra, parseWordAttributes
 from BibleOrgSys.Formats.OSISXMLBible import OSISXMLBible
 from BibleOrgSys.Formats.PickledBible import PickledBible, ZIPPED_PICKLE_FILENAME_END
 
 
 
-LAST_MODIFIED_DATE = '2020-05-27' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "HebrewWLCBibleHandler"
 PROGRAM_NAME = "Hebrew WLC format handler"
-PROGRAM_VERSION = '0.26'
+PROGRAM_VERSION = '0.30'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -58,8 +64,12 @@ INPUT_RESOURCES_FOLDERPATH = Path( '/home/robert/Programming/WebDevelopment/Open
 
 DEFAULT_OSIS_WLC_FILEPATH = INPUT_RESOURCES_FOLDERPATH.joinpath( 'morphhb/wlc/' )
 DEFAULT_ZIPPED_PICKLED_WLC_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_DOWNLOADED_RESOURCES_FOLDERPATH.joinpath( f'WLC{ZIPPED_PICKLE_FILENAME_END}' )
+WORD_TABLE_FILENAME_END = '.BOSWordTable.bin' # Saved next to the zipped pickle (replacing ZIPPED_PICKLE_FILENAME_END)
+DEFAULT_OSIS_WORD_TABLE_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( f'WLC.OSIS{WORD_TABLE_FILENAME_END}' )
 
-DEFAULT_GLOSSING_DICT_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_DATAFILES_FOLDERPATH.joinpath( 'ManuallyEditedFiles/', 'WLCHebrewGlosses.pickle' )
+DEFAULT_GLOSSING_DICT_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_DATAFILES_FOLDERPATH.joinpath( 'ManuallyEditedFiles/', 'WLCHebrewGlosses.sqlite' )
+    # A .pickle file with the same name (from older versions) is converted the first time that it's loaded
+GLOSSING_STORE_FORMAT_VERSION = 1
 DEFAULT_GLOSSING_EXPORT_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'WLCHebrewGlosses.txt' )
 DEFAULT_GENERIC_GLOSSING_REVERSE_EXPORT_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'WLCHebrewGenericGlossesReversed.txt' )
 
@@ -104,6 +114,441 @@ GENDER_NAMES = { 'b':_("both(mf)"), 'c':_("common(mf)"), 'f':_("feminine"), 'm':
 NUMBER_NAMES = { 'd':_("dual"), 'p':_("plural"), 's':_("singular") }
 STATE_NAMES = { 'a':_("absolute"), 'c':_("construct"), 'd':_("determined") }
 
+morphologyExpansionCache = {} # Filled by expandMorphologyAbbreviations
+
+
+WORD_TABLE_MAGIC = b'BOSWLCWT'
+WORD_TABLE_FORMAT_VERSION = 1
+WORD_TABLE_COLUMNS = ( ('bookIndexes','B'), ('chapters','H'), ('verses','H'), ('wordNumbers','H'),
+                       ('wordIDs','I'), ('normalizedIDs','I'), ('strongIDs','I'), ('morphIDs','I'), ('otherIDs','I') )
+WORD_TABLE_STRING_TABLES = ( ('wordIDs','wordForms'), ('normalizedIDs','normalizedForms'),
+                             ('strongIDs','strongs'), ('morphIDs','morphs'), ('otherIDs','otherAttributes') )
+
+
+class WLCWordTable():
+    """
+    Class for a compiled, columnar table of every word (token) in the WLC.
+
+    Each row is one token from a v~ or p~ entry and the columns are arrays of
+        bookIndexes (into self.BBBs), chapters, verses, wordNumbers (starting with 1 for each entry),
+        wordIDs, normalizedIDs, strongIDs, morphIDs and otherIDs
+            (indexes into the string tables, where ID 0 is always the empty string).
+    The otherAttributes table holds tuples of any remaining (name,value) word attributes,
+        and morphExpansions runs parallel to the morphs table.
+
+    A saved table is a pickled header followed by the raw (native) array bytes
+        so a loaded table uses memoryviews straight into a memory-mapped file (and is read-only).
+    """
+    def __init__( self ) -> None:
+        """
+        Create an empty table.
+        """
+        fnPrint( debuggingThisModule, "WLCWordTable.__init__()" )
+        self.BBBs = []
+        self.wordForms, self.normalizedForms, self.strongs, self.morphs = [''], [''], [''], ['']
+        self.otherAttributes = [()]
+        self.morphExpansions = ['']
+        self.verseIndex = {} # Keys are (BBB,C,V) strings, entries are (firstRow,lastRow+1)
+        self.columns = { columnName:array( typecode ) for columnName,typecode in WORD_TABLE_COLUMNS }
+        self.numRows = 0
+        self.sourceSignature = None
+        self._stringIDDicts = { columnName:{} for columnName,_tableName in WORD_TABLE_STRING_TABLES }
+        self._mappedFile = self._mappedView = None
+    # end of WLCWordTable.__init__
+
+    def __len__( self ) -> int: return self.numRows
+
+
+    def _getStringID( self, columnName:str, value ) -> int:
+        """
+        Return the ID for the value in the string table for the given column (adding it if necessary).
+        """
+        if not value: return 0
+        IDDict = self._stringIDDicts[columnName]
+        try: return IDDict[value]
+        except KeyError:
+            stringTable = getattr( self, dict(WORD_TABLE_STRING_TABLES)[columnName] )
+            IDDict[value] = newID = len( stringTable )
+            stringTable.append( value )
+            return newID
+    # end of WLCWordTable._getStringID
+
+
+    def appendVerse( self, BBB:str, C:str, V:str, verseDictList, normalizedWords ) -> None:
+        """
+        Append the words for one v~ or p~ entry
+            (as returned by HebrewWLCBibleAddon.getVerseDictList)
+            along with their normalized forms.
+        """
+        assert self._mappedFile is None # Loaded tables are read-only
+        if not C.isdigit() or not V.isdigit():
+            logging.error( f"WLCWordTable can't handle {BBB} {C}:{V} reference" ); return
+
+        try: bookIndex = self.BBBs.index( BBB )
+        except ValueError:
+            bookIndex = len( self.BBBs )
+            self.BBBs.append( BBB )
+        columns = self.columns
+        firstRow = self.numRows
+        for j,(verseDict,normalizedWord) in enumerate( zip( verseDictList, normalizedWords ) ):
+            columns['bookIndexes'].append( bookIndex )
+            columns['chapters'].append( int(C) )
+            columns['verses'].append( int(V) )
+            columns['wordNumbers'].append( j + 1 )
+            columns['wordIDs'].append( self._getStringID( 'wordIDs', verseDict['word'] ) )
+            columns['normalizedIDs'].append( self._getStringID( 'normalizedIDs', normalizedWord ) )
+            columns['strongIDs'].append( self._getStringID( 'strongIDs', verseDict.get( 'strong' ) ) )
+            columns['morphIDs'].append( self._getStringID( 'morphIDs', verseDict.get( 'morph' ) ) )
+            columns['otherIDs'].append( self._getStringID( 'otherIDs',
+                        tuple( (name,value) for name,value in verseDict.items() if name not in ('word','strong','morph') ) ) )
+            self.numRows += 1
+        # Verses can be split over several entries (but they're always consecutive)
+        key = (BBB,C,V)
+        self.verseIndex[key] = (self.verseIndex[key][0] if key in self.verseIndex else firstRow, self.numRows)
+    # end of WLCWordTable.appendVerse
+
+
+    def getVerseRows( self, BBB:str, C:str, V:str ) -> range:
+        """
+        Return the range of rows for the given verse (which will be empty if we don't have it).
+        """
+        try: return range( *self.verseIndex[(BBB,str(C),str(V))] )
+        except KeyError: return range( 0 )
+    # end of WLCWordTable.getVerseRows
+
+
+    def getWordDict( self, row:int ):
+        """
+        Return the word dictionary for the given row
+            (the same as the one originally given by getVerseDictList).
+        """
+        columns = self.columns
+        wordDict = { 'word':self.wordForms[columns['wordIDs'][row]] }
+        strongID, morphID = columns['strongIDs'][row], columns['morphIDs'][row]
+        if strongID: wordDict['strong'] = self.strongs[strongID]
+        if morphID: wordDict['morph'] = self.morphs[morphID]
+        wordDict.update( self.otherAttributes[columns['otherIDs'][row]] )
+        return wordDict
+    # end of WLCWordTable.getWordDict
+
+    def getVerseDictList( self, BBB:str, C:str, V:str ):
+        """
+        Return a list of word dictionaries for the entire verse.
+        """
+        return [self.getWordDict( row ) for row in self.getVerseRows( BBB, C, V )]
+    # end of WLCWordTable.getVerseDictList
+
+    def getNormalizedWord( self, row:int ) -> str:
+        return self.normalizedForms[self.columns['normalizedIDs'][row]]
+
+    def getMorphologyExpansion( self, row:int ) -> str:
+        return self.morphExpansions[self.columns['morphIDs'][row]]
+
+    def getFullReference( self, row:int ):
+        """
+        Return the BBB,C,V,word# reference tuple (as used by the glossing dictionary) for the given row.
+        """
+        columns = self.columns
+        return (self.BBBs[columns['bookIndexes'][row]], str(columns['chapters'][row]),
+                    str(columns['verses'][row]), str(columns['wordNumbers'][row]))
+    # end of WLCWordTable.getFullReference
+
+
+    def save( self, filepath ) -> None:
+        """
+        Save the table to the given binary file.
+
+        The file is written under a temporary name and then moved into place.
+        """
+        fnPrint( debuggingThisModule, f"WLCWordTable.save( {filepath} )" )
+        vPrint( 'Info', debuggingThisModule, f"  Saving WLC word table ({self.numRows:,} rows) to {filepath}…" )
+
+        columnOffsets, offset = {}, 0
+        for columnName,typecode in WORD_TABLE_COLUMNS:
+            columnOffsets[columnName] = offset
+            offset += (self.numRows * array(typecode).itemsize + 7) & ~7 # Keep each column 8-byte aligned
+        header = { 'formatVersion':WORD_TABLE_FORMAT_VERSION, 'sourceSignature':self.sourceSignature,
+                'byteorder':sys.byteorder, 'itemsizes':{ typecode:array(typecode).itemsize for _columnName,typecode in WORD_TABLE_COLUMNS },
+                'numRows':self.numRows, 'columnOffsets':columnOffsets, 'BBBs':self.BBBs,
+                'wordForms':self.wordForms, 'normalizedForms':self.normalizedForms,
+                'strongs':self.strongs, 'morphs':self.morphs, 'otherAttributes':self.otherAttributes,
+                'morphExpansions':self.morphExpansions, 'verseIndex':self.verseIndex }
+        headerBytes = pickle.dumps( header, protocol=pickle.HIGHEST_PROTOCOL )
+
+        os.makedirs( os.path.dirname( filepath ), exist_ok=True )
+        tempFilepath = f'{filepath}.tmp{os.getpid()}'
+        with open( tempFilepath, 'wb' ) as tableFile:
+            tableFile.write( WORD_TABLE_MAGIC + struct.pack( '<Q', len(headerBytes) ) + headerBytes )
+            tableFile.write( bytes( -tableFile.tell() % 8 ) )
+            for columnName,_typecode in WORD_TABLE_COLUMNS:
+                columnBytes = self.columns[columnName].tobytes()
+                tableFile.write( columnBytes + bytes( -len(columnBytes) % 8 ) )
+        os.replace( tempFilepath, filepath )
+    # end of WLCWordTable.save
+
+
+    def load( self, filepath, sourceSignature=None ) -> bool:
+        """
+        Memory-map a previously saved table.
+
+        Returns False (and leaves the table empty)
+            if the file is missing, invalid, or doesn't match the given source signature.
+        """
+        fnPrint( debuggingThisModule, f"WLCWordTable.load( {filepath}, {sourceSignature} )" )
+        assert self.numRows == 0
+
+        try:
+            with open( filepath, 'rb' ) as tableFile:
+                mappedFile = mmap.mmap( tableFile.fileno(), 0, access=mmap.ACCESS_READ )
+        except (OSError, ValueError): # ValueError is for an empty file
+            return False
+        try:
+            if mappedFile[:8] != WORD_TABLE_MAGIC: raise ValueError( "Not a word table" )
+            headerLength = struct.unpack_from( '<Q', mappedFile, 8 )[0]
+            header = pickle.loads( mappedFile[16:16+headerLength] )
+            if header['formatVersion'] != WORD_TABLE_FORMAT_VERSION \
+            or header['byteorder'] != sys.byteorder \
+            or any( array(typecode).itemsize != itemsize for typecode,itemsize in header['itemsizes'].items() ):
+                raise ValueError( "Incompatible word table" )
+        except (ValueError, struct.error, pickle.UnpicklingError, KeyError, EOFError) as err:
+            logging.warning( f"WLCWordTable ignoring invalid {filepath}: {err}" )
+            mappedFile.close()
+            return False
+        if sourceSignature is not None and header['sourceSignature'] != sourceSignature:
+            vPrint( 'Info', debuggingThisModule, f"  WLC word table {filepath} is out-of-date" )
+            mappedFile.close()
+            return False
+
+        self.sourceSignature, self.numRows = header['sourceSignature'], header['numRows']
+        for tableName in ('BBBs','wordForms','normalizedForms','strongs','morphs','otherAttributes','morphExpansions','verseIndex'):
+            setattr( self, tableName, header[tableName] )
+        dataStart = (16 + headerLength + 7) & ~7
+        self._mappedFile, self._mappedView = mappedFile, memoryview( mappedFile )
+        for columnName,typecode in WORD_TABLE_COLUMNS:
+            start = dataStart + header['columnOffsets'][columnName]
+            self.columns[columnName] = self._mappedView[start:start+self.numRows*header['itemsizes'][typecode]].cast( typecode )
+        vPrint( 'Info', debuggingThisModule, f"  Loaded WLC word table ({self.numRows:,} rows) from {filepath}" )
+        return True
+    # end of WLCWordTable.load
+
+
+    def close( self ) -> None:
+        """
+        Release any memory-mapped file.
+        """
+        if self._mappedFile is not None:
+            for columnName,typecode in WORD_TABLE_COLUMNS:
+                self.columns[columnName].release()
+                self.columns[columnName] = array( typecode )
+            self._mappedView.release()
+            self._mappedFile.close()
+            self._mappedFile = self._mappedView = None
+            self.numRows = 0
+            self.verseIndex = {}
+    # end of WLCWordTable.close
+# end of WLCWordTable class
+
+
+
+def glossingReferenceToID( ref ) -> int:
+    """
+    Convert a BBB,C,V,word# glossing reference tuple to a single integer ID
+        (which sorts into the same order as the references).
+
+    Raises ValueError if the reference can't be encoded.
+    """
+    try:
+        BBB, C, V, wordNumber = ref
+        C, V, wordNumber = int(C), int(V), int(wordNumber)
+        bookNumber = BibleOrgSysGlobals.loadedBibleBooksCodes.getReferenceNumber( BBB )
+    except (TypeError, ValueError, KeyError): raise ValueError( f"Can't encode {ref!r} glossing reference" )
+    if not (0 <= C < 1000 and 0 <= V < 1000 and 0 <= wordNumber < 1000):
+        raise ValueError( f"Can't encode {ref!r} glossing reference" )
+    return ((bookNumber * 1000 + C) * 1000 + V) * 1000 + wordNumber
+# end of glossingReferenceToID
+
+def glossingReferenceSortKey( ref ):
+    """
+    Sort key for glossing references
+        (any that can't be encoded by glossingReferenceToID sort after the others).
+    """
+    try: return (glossingReferenceToID( ref ), '')
+    except ValueError: return (sys.maxsize, str(ref))
+# end of glossingReferenceSortKey
+
+def IDToGlossingReference( refID:int ):
+    """
+    Convert an integer ID from glossingReferenceToID back to a BBB,C,V,word# reference tuple.
+    """
+    refID, wordNumber = divmod( refID, 1000 )
+    refID, V = divmod( refID, 1000 )
+    bookNumber, C = divmod( refID, 1000 )
+    return (BibleOrgSysGlobals.loadedBibleBooksCodes.getBBBFromReferenceNumber( bookNumber ), str(C), str(V), str(wordNumber))
+# end of IDToGlossingReference
+
+
+
+class GlossingDict( dict ):
+    """
+    Dictionary of normalized Hebrew words -> (genericGloss,genericReferencesSet,specificReferencesDict)
+        which remembers which words have been changed or deleted since it was last saved.
+
+    Note: Changes must be made by item assignment or del (not by update, pop, etc.)
+        so an entry must be reassigned after its references are changed.
+    """
+    def __init__( self, *args, **kwargs ) -> None:
+        dict.__init__( self, *args, **kwargs )
+        self.changedWords, self.deletedWords = set(), set()
+
+    def __setitem__( self, word:str, entry ) -> None:
+        dict.__setitem__( self, word, entry )
+        self.changedWords.add( word )
+        self.deletedWords.discard( word )
+
+    def __delitem__( self, word:str ) -> None:
+        dict.__delitem__( self, word )
+        self.changedWords.discard( word )
+        self.deletedWords.add( word )
+
+    def hasChanges( self ) -> bool: return bool( self.changedWords or self.deletedWords )
+# end of GlossingDict class
+
+
+
+class GlossingStore():
+    """
+    Class for the SQLite file that holds a glossing dictionary.
+
+    Each word is a separate record so that a save only writes the changed (or deleted) words.
+        The generic references are saved as a sorted array of reference IDs (see glossingReferenceToID)
+            and the specific glosses as a pickled dictionary with reference ID keys.
+
+    Can be shared between threads.
+    """
+    def __init__( self, storeFilepath ) -> None:
+        """
+        Doesn't actually open (or create) the store until it's used.
+        """
+        fnPrint( debuggingThisModule, f"GlossingStore.__init__( {storeFilepath} )" )
+        self.storeFilepath = storeFilepath
+        self.__lock = threading.RLock()
+        self.__connection = self.__connectionPID = None
+    # end of GlossingStore.__init__
+
+
+    def _getConnection( self ):
+        """
+        Returns an open connection (creating the store if necessary).
+        """
+        if self.__connection is None or self.__connectionPID != os.getpid():
+            os.makedirs( os.path.dirname( self.storeFilepath ), exist_ok=True )
+            connection = sqlite3.connect( self.storeFilepath, timeout=10, check_same_thread=False )
+            connection.execute( 'CREATE TABLE IF NOT EXISTS glosses (word TEXT PRIMARY KEY, genericGloss TEXT NOT NULL, referenceIDs BLOB NOT NULL, specificGlosses BLOB NOT NULL) WITHOUT ROWID' )
+            connection.execute( 'CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, data BLOB)' )
+            connection.execute( 'INSERT OR IGNORE INTO info VALUES (?,?)', ('formatVersion', pickle.dumps( GLOSSING_STORE_FORMAT_VERSION )) )
+            connection.commit()
+            formatVersion = pickle.loads( connection.execute( "SELECT data FROM info WHERE name='formatVersion'" ).fetchone()[0] )
+            if formatVersion != GLOSSING_STORE_FORMAT_VERSION:
+                connection.close()
+                raise ValueError( f"Glossing store {self.storeFilepath} has unexpected format version {formatVersion}" )
+            self.__connection, self.__connectionPID = connection, os.getpid()
+        return self.__connection
+    # end of GlossingStore._getConnection
+
+
+    def loadAll( self ) -> GlossingDict:
+        """
+        Returns the entire glossing dictionary.
+        """
+        fnPrint( debuggingThisModule, "GlossingStore.loadAll()" )
+        with self.__lock:
+            rows = self._getConnection().execute( 'SELECT word, genericGloss, referenceIDs, specificGlosses FROM glosses' ).fetchall()
+        glossingDict = GlossingDict()
+        for word,genericGloss,referenceIDBytes,specificGlossBytes in rows:
+            referenceIDs = array( 'q' )
+            referenceIDs.frombytes( referenceIDBytes )
+            dict.__setitem__( glossingDict, word, (genericGloss,
+                        { IDToGlossingReference( refID ) for refID in referenceIDs },
+                        { IDToGlossingReference( refID ):specificGloss for refID,specificGloss in pickle.loads( specificGlossBytes ).items() }) )
+        return glossingDict
+    # end of GlossingStore.loadAll
+
+
+    def saveChanges( self, glossingDict:GlossingDict, replaceAll:bool=False ) -> int:
+        """
+        Write the changed and deleted words (or every word if replaceAll is set) in one transaction
+            and then clear the change records in the glossingDict.
+
+        Returns the number of records written.
+        """
+        fnPrint( debuggingThisModule, f"GlossingStore.saveChanges( {len(glossingDict)}, {replaceAll} )" )
+        def getReferenceID( word:str, ref ):
+            """
+            Returns the reference ID or None (after logging an error) if it can't be encoded,
+                so that one bad reference doesn't stop everything else from being saved.
+            """
+            try: return glossingReferenceToID( ref )
+            except ValueError as err:
+                logging.error( f"GlossingStore: Not saving {ref!r} reference for {word!r} in {self.storeFilepath}: {err}" )
+        # end of saveChanges.getReferenceID
+
+        def makeRecord( word:str ):
+            genericGloss,genericReferences,specificReferencesDict = glossingDict[word]
+            genericReferenceIDs = ( getReferenceID( word, ref ) for ref in genericReferences )
+            specificGlossDict = { getReferenceID( word, ref ):specificGloss for ref,specificGloss in specificReferencesDict.items() }
+            specificGlossDict.pop( None, None )
+            return (word, genericGloss, array( 'q', sorted( refID for refID in genericReferenceIDs if refID is not None ) ).tobytes(),
+                    pickle.dumps( specificGlossDict, pickle.HIGHEST_PROTOCOL ))
+        # end of saveChanges.makeRecord
+
+        with self.__lock:
+            records = [makeRecord( word ) for word in (glossingDict if replaceAll else glossingDict.changedWords)]
+            connection = self._getConnection()
+            with connection: # Commits (or rolls back) the transaction
+                if replaceAll: connection.execute( 'DELETE FROM glosses' )
+                else: connection.executemany( 'DELETE FROM glosses WHERE word=?', ((word,) for word in glossingDict.deletedWords) )
+                connection.executemany( 'INSERT OR REPLACE INTO glosses VALUES (?,?,?,?)', records )
+            glossingDict.changedWords.clear()
+            glossingDict.deletedWords.clear()
+        return len( records )
+    # end of GlossingStore.saveChanges
+
+
+    def backup( self, numBackups:int=1 ) -> None:
+        """
+        Make a backup copy of the store file (if it exists) as .bak
+            after moving any older backups along (to .bak2, .bak3, etc. up to numBackups).
+
+        The store file itself is never moved, so there's always a store even if we're stopped part way through.
+        """
+        fnPrint( debuggingThisModule, f"GlossingStore.backup( {numBackups} )" )
+        with self.__lock:
+            if not os.path.isfile( self.storeFilepath ): return
+            backupFilepath = f'{self.storeFilepath}.bak'
+            for n in range( numBackups, 1, -1 ): # e.g., .bak3->.bak4, .bak2->.bak3, .bak->.bak2
+                olderFilepath = backupFilepath + ('' if n==2 else str(n-1))
+                if os.path.isfile( olderFilepath ): os.replace( olderFilepath, backupFilepath+str(n) )
+            newBackupFilepath = f'{backupFilepath}.new'
+            backupConnection = sqlite3.connect( newBackupFilepath )
+            try: self._getConnection().backup( backupConnection ) # A consistent copy (even if another process is using the store)
+            finally: backupConnection.close()
+            os.replace( newBackupFilepath, backupFilepath )
+    # end of GlossingStore.backup
+
+
+    def close( self ) -> None:
+        """
+        Close the store (it will be reopened if it's used again).
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                if self.__connectionPID == os.getpid(): # Don't close a connection inherited from our parent process
+                    self.__connection.close()
+                self.__connection = self.__connectionPID = None
+    # end of GlossingStore.close
+# end of GlossingStore class
+
+
 
 class HebrewWLCBibleAddon():
     """
@@ -120,6 +565,9 @@ class HebrewWLCBibleAddon():
         fnPrint( debuggingThisModule, "HebrewWLCBibleAddon.__init__()" )
 
         self.glossingDict, self.haveGlossingDictChanges, self.loadedGlossEntryCount = None, False, 0
+        self.glossingDictFilepath = self.glossingStore = None
+        self.replaceAllGlosses = self.haveBackedUpGlosses = False
+        self.wordTable = None # Compiled (or loaded) by getWordTable()
     # end of HebrewWLCBibleAddon.__init__
 
 
@@ -234,6 +682,8 @@ class HebrewWLCBibleAddon():
         """
         fnPrint( debuggingThisModule, "HebrewWLCBibleAddon.expandMorphologyAbbreviations( {} )".format( morphAbbrev ) )
         if not morphAbbrev: return ''
+        try: return morphologyExpansionCache[morphAbbrev]
+        except KeyError: originalMorphAbbrev = morphAbbrev
 
         if morphAbbrev.startswith( 'OSHM:' ): morphAbbrev = morphAbbrev[5:] # Open Scriptures Hebrew Morphology
         assert morphAbbrev[0] in 'HA' # Hebrew or Aramaic
@@ -285,10 +735,118 @@ class HebrewWLCBibleAddon():
                 resultString += PART_OF_SPEECH_TYPE_DICT[bit[:2]].replace( ' ', '_' )
                 resultString += handleRemainder( bit[2:] )
             else: resultString += PART_OF_SPEECH_TYPE_DICT[bit].replace( ' ', '_' )
+        morphologyExpansionCache[originalMorphAbbrev] = resultString
         return resultString
     # end of HebrewWLCBibleAddon.expandMorphologyAbbreviations
 
 
+    def getWordTableFilepath( self ) -> Path:
+        """
+        Return the filepath for our compiled word table
+            which is next to the zipped pickle if we have one.
+        """
+        pickleFilepath = getattr( self, 'pickleFilepath', None )
+        if pickleFilepath and str(pickleFilepath).endswith( ZIPPED_PICKLE_FILENAME_END ):
+            return Path( str(pickleFilepath)[:-len(ZIPPED_PICKLE_FILENAME_END)] + WORD_TABLE_FILENAME_END )
+        return DEFAULT_OSIS_WORD_TABLE_FILEPATH
+    # end of HebrewWLCBibleAddon.getWordTableFilepath
+
+
+    def _getWordTableSourceSignature( self ):
+        """
+        Return the signature of the source file(s) that the word table is compiled from.
+        """
+        sourcePath = getattr( self, 'pickleFilepath', None ) or getattr( self, 'sourceFilepath', None ) \
+                        or getattr( self, 'sourceFolder', None )
+        if not sourcePath: return None
+        if os.path.isdir( sourcePath ):
+            return getSourceSignature( os.path.join( sourcePath, filename ) for filename in sorted( os.listdir( sourcePath ) )
+                                                    if os.path.isfile( os.path.join( sourcePath, filename ) ) )
+        return getSourceSignature( [sourcePath] )
+    # end of HebrewWLCBibleAddon._getWordTableSourceSignature
+
+
+    def getWordTable( self ) -> WLCWordTable:
+        """
+        Return our WLCWordTable of every word in the WLC,
+            memory-mapping the saved table if it's up-to-date,
+            otherwise compiling it (once) from the loaded books and saving it.
+        """
+        fnPrint( debuggingThisModule, "HebrewWLCBibleAddon.getWordTable()" )
+        if self.wordTable is not None: return self.wordTable
+
+        from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+
+        wordTableFilepath = self.getWordTableFilepath()
+        try: sourceSignature = self._getWordTableSourceSignature()
+        except OSError: sourceSignature = None
+        wordTable = WLCWordTable()
+        if sourceSignature is not None and wordTable.load( wordTableFilepath, sourceSignature ):
+            self.wordTable = wordTable
+            return wordTable
+
+        vPrint( 'Normal', debuggingThisModule, _("Compiling WLC word table…") )
+        self.loadBooks()
+        for BBB,bookObject in self.books.items():
+            C = V = '-1'
+            for verseDataEntry in bookObject._processedLines:
+                marker = verseDataEntry.getMarker()
+                if marker == 'c': C, V = verseDataEntry.getCleanText(), '0'
+                elif marker == 'v': V = verseDataEntry.getCleanText()
+                elif marker in ('v~','p~'):
+                    if not C.isdigit() or not V.isdigit(): # e.g., book introduction or verse bridge
+                        if C != '-1': logging.error( f"getWordTable: ignoring {BBB} {C}:{V} text" )
+                        continue
+                    verseDictList = self.getVerseDictList( verseDataEntry, SimpleVerseKey( BBB, C, V ) )
+                    # Normalize all the words in the entry at once
+                    normalizedHebrewWords = [normalizedHebrewWord.replace( ORIGINAL_MORPHEME_BREAK_CHAR, OUR_MORPHEME_BREAK_CHAR )
+                            for normalizedHebrewWord in Hebrew.removeHebrewMarksBatch( (verseDict['word'] for verseDict in verseDictList), removeMetegOrSiluq=True )]
+                    wordTable.appendVerse( BBB, C, V, verseDictList, normalizedHebrewWords )
+        # Now expand each distinct morphology code just once
+        for morphAbbrev in wordTable.morphs[1:]:
+            try: wordTable.morphExpansions.append( self.expandMorphologyAbbreviations( morphAbbrev ) )
+            except (KeyError, IndexError, AssertionError):
+                logging.error( f"getWordTable: unable to expand {morphAbbrev!r} morphology" )
+                wordTable.morphExpansions.append( '' )
+        vPrint( 'Normal', debuggingThisModule, "  "+_("{:,} words in {:,} verses with {:,} distinct normalized forms and {:,} morphology codes").format(
+                    len(wordTable), len(wordTable.verseIndex), len(wordTable.normalizedForms)-1, len(wordTable.morphs)-1 ) )
+
+        if sourceSignature is not None:
+            wordTable.sourceSignature = sourceSignature
+            try: wordTable.save( wordTableFilepath )
+            except OSError as err: logging.error( f"Unable to save WLC word table to {wordTableFilepath}: {err}" )
+        self.wordTable = wordTable
+        return wordTable
+    # end of HebrewWLCBibleAddon.getWordTable
+
+
+    def getVerseWordDictList( self, verseKey ):
+        """
+        Return a list of dictionaries (one for each word) for the entire verse
+            looked up in our compiled word table (see getWordTable)
+            rather than by re-parsing the verse entries and their extras (see getVerseDictList).
+
+        As well as the word attributes given by getVerseDictList,
+            each dictionary has the 'normalized' word (as used for the glossing dictionary keys),
+            the 'morphExpansion' (if there's a morph) and the 'glossingReference',
+        e.g., {'word': 'הַ/מַּיִם', 'strong': 'd/4325', 'morph': 'HTd/Ncmpa', 'cantillationLevel': '0.1.1.0',
+                'normalized': 'הַ=מַּיִם', 'morphExpansion': '…', 'glossingReference': ('GEN','1','2','14')}
+
+        Returns an empty list if the verse isn't in the table.
+        """
+        fnPrint( debuggingThisModule, f"HebrewWLCBibleAddon.getVerseWordDictList( {verseKey} )" )
+        wordTable = self.getWordTable()
+        resultList = []
+        for row in wordTable.getVerseRows( *verseKey.getBCV() ):
+            wordDict = wordTable.getWordDict( row )
+            wordDict['normalized'] = wordTable.getNormalizedWord( row )
+            if 'morph' in wordDict: wordDict['morphExpansion'] = wordTable.getMorphologyExpansion( row )
+            wordDict['glossingReference'] = wordTable.getFullReference( row )
+            resultList.append( wordDict )
+        return resultList
+    # end of HebrewWLCBibleAddon.getVerseWordDictList
+
+
 #####################################################################################################################
 #
 # Functions for normalising Hebrew words
@@ -316,8 +874,7 @@ class HebrewWLCBibleAddon():
             return self.currentText
 
         # else we were passed a text string
-        h = Hebrew.Hebrew( text )
-        return h.removeCantillationMarks( removeMetegOrSiluq=removeMetegOrSiluq )
+        return Hebrew.removeHebrewMarks( text, removeCantillation=True, removeMetegOrSiluq=removeMetegOrSiluq )
     # end of HebrewWLCBibleAddon.removeCantillationMarks
 
     def removeVowelPointing( self, text=None, removeMetegOrSiluq=False ):
@@ -326,11 +883,10 @@ class HebrewWLCBibleAddon():
         """
         if text is None:
             # Recursive call
-            self.currentText = self.removeVowelPointing( self.currentText ) if self.currentText else self.currentText
+            self.currentText = self.removeVowelPointing( self.currentText, removeMetegOrSiluq ) if self.currentText else self.currentText
             return self.currentText
         # else we were passed a text string
-        h = Hebrew.Hebrew( text )
-        return h.removeVowelPointing( None, removeMetegOrSiluq )
+        return Hebrew.removeHebrewMarks( text, removeCantillation=False, removeVowels=True, removeMetegOrSiluq=removeMetegOrSiluq )
     # end of HebrewWLCBibleAddon.removeVowelPointing
 
 
@@ -351,7 +907,7 @@ class HebrewWLCBibleAddon():
             #dPrint( 'Quiet', debuggingThisModule, repr(word), repr(genericGloss), genericReferencesList )
             assert isinstance( word, str ) and word
             assert isinstance( genericGloss, str ) and genericGloss
-            assert isinstance( genericReferencesList, list )
+            assert isinstance( genericReferencesList, set )
             if ' ' in word or ORIGINAL_MORPHEME_BREAK_CHAR in word:
                 logging.critical( _("Removing invalid Hebrew (normalized) word: {!r}").format( word ) )
                 del self.glossingDict[word]
@@ -368,7 +924,6 @@ class HebrewWLCBibleAddon():
                     assert len(reference) == 4 # BBB,C,V,word# (starting with 1)
                     for part in reference:
                         assert isinstance( part, str ) # We don't use INTs for references
-                    assert genericReferencesList.count( reference ) == 1 # Don't allow multiples
             else: # the genericReferencesList is empty!
                 logging.critical( _("Removing {!r} = {!r} entry with no references").format( word, genericGloss ) )
                 del self.glossingDict[word]
@@ -395,22 +950,34 @@ class HebrewWLCBibleAddon():
 
     def loadGlossingDict( self, glossingDictFilepath=None ):
         """
-        """
-        self.glossingDictFilepath = glossingDictFilepath
-        if glossingDictFilepath is None:
-            self.glossingDictFilepath = DEFAULT_GLOSSING_DICT_FILEPATH
+        Load the glossing dictionary from our SQLite glossing store.
 
-        # Read our glossing data from the pickle file
-        if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
-            vPrint( 'Quiet', debuggingThisModule, _("Loading Hebrew glossing dictionary from '{}'…").format( self.glossingDictFilepath ) )
-        with open( self.glossingDictFilepath, 'rb' ) as pickleFile:
-            self.glossingDict = pickle.load( pickleFile )
-            # It's a dictionary with (pointed and parsed) Hebrew keys and 2-tuple entries
+        If the store doesn't exist yet, but there's a (older format) pickle file with the same name,
+            it's converted (once) to a new store.
+        """
+        self.glossingDictFilepath = Path( glossingDictFilepath if glossingDictFilepath else DEFAULT_GLOSSING_DICT_FILEPATH ).with_suffix( '.sqlite' )
+        self.glossingStore = GlossingStore( self.glossingDictFilepath )
+        self.replaceAllGlosses = self.haveBackedUpGlosses = False
+
+        legacyPickleFilepath = self.glossingDictFilepath.with_suffix( '.pickle' )
+        if not os.path.isfile( self.glossingDictFilepath ) and os.path.isfile( legacyPickleFilepath ):
+            vPrint( 'Normal', debuggingThisModule, _("Converting Hebrew glossing dictionary from '{}'…").format( legacyPickleFilepath ) )
+            with open( legacyPickleFilepath, 'rb' ) as pickleFile:
+                legacyGlossingDict = pickle.load( pickleFile )
+            self.glossingDict = GlossingDict( (word,(genericGloss,set(genericReferencesList),specificReferencesDict))
+                        for word,(genericGloss,genericReferencesList,specificReferencesDict) in legacyGlossingDict.items() )
+            self.glossingStore.saveChanges( self.glossingDict, replaceAll=True )
+        else:
+            # Read our glossing data from the store
+            if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
+                vPrint( 'Quiet', debuggingThisModule, _("Loading Hebrew glossing dictionary from '{}'…").format( self.glossingDictFilepath ) )
+            self.glossingDict = self.glossingStore.loadAll()
+            # It's a dictionary with (pointed and parsed) Hebrew keys and 3-tuple entries
             #   Hebrew keys have morphological breaks separated by =
-            #   2-tuple entries consist of a generic gloss,
+            #   3-tuple entries consist of a generic gloss,
             #      (with generic gloss alternatives separated by /)
-            #   followed by a list of currently known/parsed references
-            #dPrint( 'Quiet', debuggingThisModule, "glossingDict:", self.glossingDict )
+            #   followed by a set of currently known/parsed references
+            #   and a dictionary of specific glosses (indexed by reference)
         self.loadedGlossEntryCount = len( self.glossingDict )
         self.haveGlossingDictChanges = False
         if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
@@ -424,18 +991,30 @@ class HebrewWLCBibleAddon():
 
     def saveAnyChangedGlosses( self, exportAlso=False ):
         """
-        Save the glossing dictionary to a pickle file.
+        Save any changed entries in the glossing dictionary to the glossing store.
+
+        Only the changed (or deleted) words are written
+            (unless the whole dictionary has been replaced, e.g., by importGlossingDictionary).
         """
         fnPrint( debuggingThisModule, "saveAnyChangedGlosses()" )
 
-        if self.haveGlossingDictChanges:
-            BibleOrgSysGlobals.backupAnyExistingFile( self.glossingDictFilepath, numBackups=9 )
+        if not isinstance( self.glossingDict, GlossingDict ): # Someone has replaced it with a plain dict
+            self.glossingDict, self.replaceAllGlosses = GlossingDict( self.glossingDict ), True
+        if self.haveGlossingDictChanges or self.replaceAllGlosses or self.glossingDict.hasChanges():
+            if self.glossingStore is None:
+                if self.glossingDictFilepath is None: self.glossingDictFilepath = DEFAULT_GLOSSING_DICT_FILEPATH
+                self.glossingStore = GlossingStore( Path( self.glossingDictFilepath ).with_suffix( '.sqlite' ) )
+            if not self.haveBackedUpGlosses: # only once per session
+                self.glossingStore.backup( numBackups=9 )
+                self.haveBackedUpGlosses = True
+            numChangedEntries = len(self.glossingDict) if self.replaceAllGlosses \
+                                    else len(self.glossingDict.changedWords) + len(self.glossingDict.deletedWords)
             if BibleOrgSysGlobals.verbosityLevel > 2 or debuggingThisModule:
-                vPrint( 'Quiet', debuggingThisModule, "  Saving Hebrew glossing dictionary ({}->{} entries) to '{}'…".format( self.loadedGlossEntryCount, len(self.glossingDict), self.glossingDictFilepath ) )
+                vPrint( 'Quiet', debuggingThisModule, "  Saving {:,} changed Hebrew glossing entries ({}->{} entries) to '{}'…".format( numChangedEntries, self.loadedGlossEntryCount, len(self.glossingDict), self.glossingStore.storeFilepath ) )
             elif BibleOrgSysGlobals.verbosityLevel > 1:
-                vPrint( 'Quiet', debuggingThisModule, "  Saving Hebrew glossing dictionary ({}->{} entries)…".format( self.loadedGlossEntryCount, len(self.glossingDict) ) )
-            with open( self.glossingDictFilepath, 'wb' ) as pickleFile:
-                pickle.dump( self.glossingDict, pickleFile )
+                vPrint( 'Quiet', debuggingThisModule, "  Saving {:,} changed Hebrew glossing entries ({}->{} entries)…".format( numChangedEntries, self.loadedGlossEntryCount, len(self.glossingDict) ) )
+            self.glossingStore.saveChanges( self.glossingDict, replaceAll=self.replaceAllGlosses )
+            self.haveGlossingDictChanges = self.replaceAllGlosses = False
 
             if exportAlso: self.exportGlossingDictionary()
     # end of HebrewWLCBibleAddon.saveAnyChangedGlosses
@@ -481,6 +1060,7 @@ class HebrewWLCBibleAddon():
                         genericReferencesList = ast.literal_eval( referencesText )
                         #dPrint( 'Quiet', debuggingThisModule, "references", repr(referencesText), repr(genericReferencesList) )
                         assert isinstance( genericReferencesList, list )
+                        genericReferencesList = set( genericReferencesList )
                         specificReferencesDict = ast.literal_eval( specificReferencesDictText )
                         #dPrint( 'Quiet', debuggingThisModule, "references", repr(referencesText), repr(genericReferencesList) )
                         assert isinstance( specificReferencesDict, dict )
@@ -490,7 +1070,8 @@ class HebrewWLCBibleAddon():
             vPrint( 'Normal', debuggingThisModule, f"  Loaded {len(newDict):,} entries." )
             if len(newDict) > self.loadedGlossEntryCount-10: # Seems to have been successful
                 if len(newDict) != self.loadedGlossEntryCount: vPrint( 'Quiet', debuggingThisModule, "  Went from {} to {} entries!".format( self.loadedGlossEntryCount, len(newDict) ) )
-                self.glossingDict = newDict # Replace the dictionary with the upgraded one
+                self.glossingDict = GlossingDict( newDict ) # Replace the dictionary with the upgraded one
+                self.replaceAllGlosses = True # so the entire store gets rewritten on the next save
                 if BibleOrgSysGlobals.debugFlag or BibleOrgSysGlobals.strictCheckingFlag or debuggingThisModule:
                     self._checkLoadedDict()
     # end of HebrewWLCBibleAddon.importGlossingDictionary
@@ -524,7 +1105,7 @@ class HebrewWLCBibleAddon():
                     logging.error( _("Generic gloss {!r} and word {!r} has different numbers of morphemes").format( genericGloss, word ) )
                 if not genericReferencesList:
                     logging.error( _("Generic gloss {!r} for {!r} has no references").format( genericGloss, word ) )
-                exportFile.write( '{}  {}  {}  {}\n'.format( genericReferencesList, specificReferencesDict, genericGloss, word ) ) # Works best in editors with English on the left, Hebrew on the right
+                exportFile.write( '{}  {}  {}  {}\n'.format( sorted( genericReferencesList, key=glossingReferenceSortKey ), specificReferencesDict, genericGloss, word ) ) # Works best in editors with English on the left, Hebrew on the right
 
         if self.glossingDict:
             vPrint( 'Normal', debuggingThisModule, _("Exporting reverse glossing dictionary ({:,} entries) to '{}'…").format( len(self.glossingDict), DEFAULT_GENERIC_GLOSSING_REVERSE_EXPORT_FILEPATH ) )
@@ -561,10 +1142,10 @@ class HebrewWLCBibleAddon():
             if ref not in prevRefList:
                 if BibleOrgSysGlobals.verbosityLevel > 1:
                     vPrint( 'Quiet', debuggingThisModule, _("Adding {} for generic gloss {!r} for {!r}").format( ref, prevGenericGloss, normalizedHebrewWord ) )
-                prevRefList.append( ref )
+                prevRefList.add( ref )
             self.glossingDict[normalizedHebrewWord] = (prevGenericGloss,prevRefList,prevSpecificGlossDict)
         else: # it's a new entry
-            self.glossingDict[normalizedHebrewWord] = (genericGloss,[ref],{})
+            self.glossingDict[normalizedHebrewWord] = (genericGloss,{ref},{})
         self.haveGlossingDictChanges = True
     # end of HebrewWLCBibleAddon.setNewGenericGloss
 
@@ -611,7 +1192,7 @@ class HebrewWLCBibleAddon():
         (genericGloss,genericReferencesList,specificReferencesDict) = self.glossingDict[normalizedHebrewWord]
         assert ref not in genericReferencesList
         if ref not in genericReferencesList:
-            genericReferencesList.append( ref )
+            genericReferencesList.add( ref )
             self.glossingDict[normalizedHebrewWord] = (genericGloss,genericReferencesList,specificReferencesDict)
             self.haveGlossingDictChanges = True
     # end of HebrewWLCBibleAddon.addNewGenericGlossingReference
@@ -621,50 +1202,30 @@ class HebrewWLCBibleAddon():
         """
         Go through the entire WLC and check for words that we already have a gloss for
             and update the reference fields.
+
+        Uses the compiled word table so it's just a pass over the normalizedIDs column.
         """
-        from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
         vPrint( 'Normal', debuggingThisModule, _("Updating references for WLC generic glosses…") )
 
-        self.loadBooks()
+        wordTable = self.getWordTable()
+
+        # Find the normalized forms that have a usable generic gloss
+        glossedNormalizedIDs = set()
+        for normalizedID,normalizedHebrewWord in enumerate( wordTable.normalizedForms ):
+            if normalizedHebrewWord in self.glossingDict:
+                genericGloss = self.glossingDict[normalizedHebrewWord][0]
+                if genericGloss and genericGloss not in '־׃ספ-':
+                    glossedNormalizedIDs.add( normalizedID )
+
         numRefsAdded = 0
-        for BBB,bookObject in self.books.items(): # These don't seem to be in order!
-            # The following few lines show a way to iterate through all verses
-            #   (assuming all chapters are full of verses -- not sure how it handles bridged verses)
-            C = V = 1
-            #dPrint( 'Quiet', debuggingThisModule, BBB )
-            while True:
-                currentVerseKey = SimpleVerseKey( BBB, C, V )
-                try: verseDataList, context = self.getContextVerseData( currentVerseKey )
-                except KeyError:
-                    C, V = C+1, 1
-                    currentVerseKey = SimpleVerseKey( BBB, C, V )
-                    try: verseDataList, context = self.getContextVerseData( currentVerseKey )
-                    except KeyError: break # start next book
-                #dPrint( 'Quiet', debuggingThisModule, "context", context )
-                #dPrint( 'Quiet', debuggingThisModule, "verseDataList", verseDataList )
-                for verseDataEntry in verseDataList:
-                    #dPrint( 'Quiet', debuggingThisModule, "verseDataEntry", verseDataEntry )
-                    assert isinstance( verseDataEntry, InternalBibleEntry )
-                    marker, cleanText, extras = verseDataEntry.getMarker(), verseDataEntry.getCleanText(), verseDataEntry.getExtras()
-                    adjustedText, originalText = verseDataEntry.getAdjustedText(), verseDataEntry.getOriginalText()
-                    if marker in ('v~','p~'):
-                        verseDictList = self.getVerseDictList( verseDataEntry, currentVerseKey )
-                        #dPrint( 'Quiet', debuggingThisModule, currentVerseKey.getShortText(), "verseDictList", verseDictList )
-                        for j,verseDict in enumerate( verseDictList ): # each verseDict represents one word or token
-                            fullRefTuple = (BBB,str(C),str(V),str(j+1))
-                            #dPrint( 'Quiet', debuggingThisModule, fullRefTuple, verseDict )
-                            word = verseDict['word']
-                            normalizedHebrewWord =  self.removeCantillationMarks( word, removeMetegOrSiluq=True ) \
-                                        .replace( ORIGINAL_MORPHEME_BREAK_CHAR, OUR_MORPHEME_BREAK_CHAR )
-                            #dPrint( 'Quiet', debuggingThisModule, '  ', len(word), repr(word), len(normalizedHebrewWord), repr(normalizedHebrewWord) )
-                            genericGloss,genericReferencesList,specificReferencesDict = self.glossingDict[normalizedHebrewWord] \
-                                                    if normalizedHebrewWord in self.glossingDict else ('',[],{})
-                            #if genericGloss: vPrint( 'Quiet', debuggingThisModule, fullRefTuple, repr(genericGloss) )
-                            if genericGloss and genericGloss not in '־׃ספ-' and fullRefTuple not in genericReferencesList:
-                                #dPrint( 'Quiet', debuggingThisModule, "  Adding {}".format( fullRefTuple ) )
-                                self.addNewGenericGlossingReference( normalizedHebrewWord, fullRefTuple )
-                                numRefsAdded += 1
-                V = V + 1
+        for row,normalizedID in enumerate( wordTable.columns['normalizedIDs'] ):
+            if normalizedID in glossedNormalizedIDs:
+                normalizedHebrewWord = wordTable.normalizedForms[normalizedID]
+                fullRefTuple = wordTable.getFullReference( row )
+                if fullRefTuple not in self.glossingDict[normalizedHebrewWord][1]: # genericReferencesList
+                    #dPrint( 'Quiet', debuggingThisModule, "  Adding {}".format( fullRefTuple ) )
+                    self.addNewGenericGlossingReference( normalizedHebrewWord, fullRefTuple )
+                    numRefsAdded += 1
         vPrint( 'Quiet', debuggingThisModule, "  {:,} new references added ({:,} words in dict)".format( numRefsAdded, len(self.glossingDict) ) )
     # end of HebrewWLCBibleAddon.updateGenericGlossingReferences
 # end of HebrewWLCBibleAddon class
@@ -717,7 +1278,7 @@ def briefDemo() -> None:
     Main program to handle command line parameters and then run what they want.
     """
     from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
-    from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList, InternalBibleEntry
+    from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList
 
     BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
 
@@ -783,19 +1344,13 @@ def briefDemo() -> None:
             consonantalVerseText = wlc.removeVowelPointing()
             vPrint( 'Normal', debuggingThisModule, "Without vowel pointing" )
             vPrint( 'Normal', debuggingThisModule, str(consonantalVerseText)+'\n' )
-            # Check code for expanding morphological abbreviations
-            if verseDataList is not None:
-                for verseDataEntry in verseDataList:
-                    assert isinstance( verseDataEntry, InternalBibleEntry )
-                    marker = verseDataEntry.getMarker()
-                    if marker in ('v~','p~'):
-                        verseDictList = wlc.getVerseDictList( verseDataEntry, testKey )
-                        vPrint( 'Quiet', debuggingThisModule, "verseDictList", verseDictList )
-                        for j, verseDict in enumerate( verseDictList ):
-                            vPrint( 'Quiet', debuggingThisModule, "verseDict", verseDict ) # for one word
-                            #word = verseDict['word']
-                            if 'morph' in verseDict:
-                                vPrint( 'Quiet', debuggingThisModule, "  {}".format( wlc.expandMorphologyAbbreviations( verseDict['morph'] ) ) )
+            # Check code for expanding morphological abbreviations (looked up in the compiled word table)
+            verseDictList = wlc.getVerseWordDictList( testKey )
+            vPrint( 'Quiet', debuggingThisModule, "verseDictList", verseDictList )
+            for verseDict in verseDictList:
+                vPrint( 'Quiet', debuggingThisModule, "verseDict", verseDict ) # for one word
+                if 'morph' in verseDict:
+                    vPrint( 'Quiet', debuggingThisModule, "  {}".format( verseDict['morphExpansion'] ) )
             break
 
     if 1: # Load books as we test
@@ -870,7 +1425,7 @@ def fullDemo() -> None:
     Full demo to check class is working
     """
     from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
-    from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList, InternalBibleEntry
+    from BibleOrgSys.Internals.InternalBibleInternals import InternalBibleEntryList
 
     BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
 
@@ -935,19 +1490,13 @@ def fullDemo() -> None:
             consonantalVerseText = wlc.removeVowelPointing()
             vPrint( 'Normal', debuggingThisModule, "Without vowel pointing" )
             vPrint( 'Normal', debuggingThisModule, str(consonantalVerseText)+'\n' )
-            # Check code for expanding morphological abbreviations
-            if verseDataList is not None:
-                for verseDataEntry in verseDataList:
-                    assert isinstance( verseDataEntry, InternalBibleEntry )
-                    marker = verseDataEntry.getMarker()
-                    if marker in ('v~','p~'):
-                        verseDictList = wlc.getVerseDictList( verseDataEntry, testKey )
-                        vPrint( 'Quiet', debuggingThisModule, "verseDictList", verseDictList )
-                        for j, verseDict in enumerate( verseDictList ):
-                            vPrint( 'Quiet', debuggingThisModule, "verseDict", verseDict ) # for one word
-                            #word = verseDict['word']
-                            if 'morph' in verseDict:
-                                vPrint( 'Quiet', debuggingThisModule, "  {}".format( wlc.expandMorphologyAbbreviations( verseDict['morph'] ) ) )
+            # Check code for expanding morphological abbreviations (looked up in the compiled word table)
+            verseDictList = wlc.getVerseWordDictList( testKey )
+            vPrint( 'Quiet', debuggingThisModule, "verseDictList", verseDictList )
+            for verseDict in verseDictList:
+                vPrint( 'Quiet', debuggingThisModule, "verseDict", verseDict ) # for one word
+                if 'morph' in verseDict:
+                    vPrint( 'Quiet', debuggingThisModule, "  {}".format( verseDict['morphExpansion'] ) )
 
     if 1: # Load books as we test
         testFolder = DEFAULT_OSIS_WLC_FILEPATH # Hebrew
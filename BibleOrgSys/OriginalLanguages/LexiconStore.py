@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# LexiconStore.py
+#
+# Module handling compiled (indexed, on-disk) lexicon stores
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module handling compiled lexicon stores.
+
+The lexicon XML files are slow to parse and validate,
+    so they are converted once into a SQLite file
+    in which each entry is individually pickled and indexed by (table, key).
+A lookup then only has to read and unpickle the single entry requested.
+
+The signature (filename, modification time, size) of the source files
+    is saved in the store, and the store is rebuilt automatically
+    if any of the source files change.
+
+Contains:
+    LexiconStore: the class to build and read a store.
+    getLexiconStore: returns a shared store for the given name and source files.
+"""
+from gettext import gettext as _
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import pickle
+import sqlite3
+import threading
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "LexiconStore"
+PROGRAM_NAME = "Compiled lexicon store handler"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+LEXICON_STORE_FOLDERPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( 'LexiconStores/' )
+LEXICON_STORE_FORMAT_VERSION = 1 # Increment this if the layout of the SQLite file changes
+
+
+
+def getSourceSignature( sourceFilepaths ) -> List[Tuple[str,int,int]]:
+    """
+    Returns a list of (filepath, modification time, size) entries
+        for each of the given source files.
+
+    Raises FileNotFoundError if any of them don't exist.
+    """
+    signature = []
+    for sourceFilepath in sourceFilepaths:
+        statResult = os.stat( sourceFilepath )
+        signature.append( (str(sourceFilepath), statResult.st_mtime_ns, statResult.st_size) )
+    return signature
+# end of getSourceSignature
+
+
+
+class LexiconStore:
+    """
+    Class for a compiled lexicon store.
+
+    The buildFunction is called (with no parameters) if the store is missing or out-of-date.
+        It must return a dictionary of tables, each of which is a dictionary of entries
+            (the keys are converted to strings and the entries must be picklable).
+
+    Can be shared between threads.
+    """
+    def __init__( self, storeName:str, sourceFilepaths, buildFunction:Callable[[],Dict[str,Dict[str,Any]]], storeFolderpath=None ) -> None:
+        """
+        Doesn't actually open (or build) the store until it's used.
+        """
+        fnPrint( debuggingThisModule, f"LexiconStore.__init__( {storeName}, {sourceFilepaths}, {buildFunction}, {storeFolderpath} )" )
+        self.storeName, self.sourceFilepaths, self.buildFunction = storeName, list( sourceFilepaths ), buildFunction
+        if storeFolderpath is None: storeFolderpath = LEXICON_STORE_FOLDERPATH
+        self.storeFilepath = os.path.join( storeFolderpath, f'{storeName}.sqlite' )
+        self.buildCount = 0 # Number of times that we've (re)built the store
+        self.__lock = threading.RLock()
+        self.__connection = self.__connectionPID = self.__signature = None
+    # end of LexiconStore.__init__
+
+
+    def __str__( self ) -> str:
+        """
+        Create a string representation of the store object.
+        """
+        indent = 2
+        result = "Lexicon store object"
+        result += ('\n' if result else '') + ' '*indent + _("Name: {}").format( self.storeName )
+        result += ('\n' if result else '') + ' '*indent + _("Filepath: {}").format( self.storeFilepath )
+        result += ('\n' if result else '') + ' '*indent + _("Source files: {}").format( len(self.sourceFilepaths) )
+        return result
+    # end of LexiconStore.__str__
+
+
+    def __readSignature( self, connection ) -> Optional[List[Tuple[str,int,int]]]:
+        """
+        Returns the signature of the source files saved in the store
+            or None if there isn't one (or the store is in an older format).
+        """
+        try:
+            rows = connection.execute( 'SELECT name, data FROM info' ).fetchall()
+        except sqlite3.Error: return None
+        info = { name:pickle.loads( data ) for name,data in rows }
+        if info.get( 'formatVersion' ) != LEXICON_STORE_FORMAT_VERSION: return None
+        return info.get( 'sourceSignature' )
+    # end of LexiconStore.__readSignature
+
+
+    def open( self ) -> None:
+        """
+        Open the store, (re)building it first if it's missing or out-of-date.
+
+        Raises FileNotFoundError if the source files aren't available.
+        """
+        fnPrint( debuggingThisModule, "LexiconStore.open()" )
+        with self.__lock:
+            signature = getSourceSignature( self.sourceFilepaths ) # Can raise FileNotFoundError
+            if self.__connection is not None:
+                if self.__connectionPID == os.getpid() and self.__signature == signature:
+                    return # Already open and still up-to-date
+                self.close()
+
+            if os.path.isfile( self.storeFilepath ):
+                connection = sqlite3.connect( self.storeFilepath, timeout=10, check_same_thread=False )
+                if self.__readSignature( connection ) == signature:
+                    self.__connection, self.__connectionPID, self.__signature = connection, os.getpid(), signature
+                    return
+                connection.close()
+                vPrint( 'Normal', debuggingThisModule, _("Lexicon store {} is out-of-date").format( self.storeFilepath ) )
+            self.build( signature )
+            self.__connection = sqlite3.connect( self.storeFilepath, timeout=10, check_same_thread=False )
+            self.__connectionPID, self.__signature = os.getpid(), signature
+    # end of LexiconStore.open
+
+
+    def build( self, signature=None ) -> None:
+        """
+        Build the store from the source files.
+
+        The store is written to a temporary file first
+            so that other processes never see a half-written store.
+        """
+        fnPrint( debuggingThisModule, f"LexiconStore.build( {signature} )" )
+        vPrint( 'Normal', debuggingThisModule, _("Compiling lexicon store {}…").format( self.storeFilepath ) )
+        if signature is None: signature = getSourceSignature( self.sourceFilepaths )
+        tables = self.buildFunction()
+
+        os.makedirs( os.path.dirname( self.storeFilepath ), exist_ok=True )
+        tempFilepath = f'{self.storeFilepath}.{os.getpid()}.tmp'
+        if os.path.exists( tempFilepath ): os.remove( tempFilepath )
+        connection = sqlite3.connect( tempFilepath )
+        try:
+            connection.execute( 'CREATE TABLE entries (tableName TEXT, key TEXT, data BLOB, PRIMARY KEY (tableName, key)) WITHOUT ROWID' )
+            connection.execute( 'CREATE TABLE info (name TEXT PRIMARY KEY, data BLOB)' )
+            for tableName,table in tables.items():
+                connection.executemany( 'INSERT INTO entries VALUES (?,?,?)',
+                        ((tableName, str(key), pickle.dumps( entry, pickle.HIGHEST_PROTOCOL )) for key,entry in table.items()) )
+            connection.executemany( 'INSERT INTO info VALUES (?,?)',
+                        (('formatVersion', pickle.dumps( LEXICON_STORE_FORMAT_VERSION )),
+                         ('sourceSignature', pickle.dumps( signature )),
+                         ('tableSizes', pickle.dumps( { tableName:len(table) for tableName,table in tables.items() } ))) )
+            connection.commit()
+        finally: connection.close()
+        os.replace( tempFilepath, self.storeFilepath ) # Atomic
+        self.buildCount += 1
+    # end of LexiconStore.build
+
+
+    def _getConnection( self ):
+        """
+        Returns an open connection (opening or reopening the store if necessary,
+            e.g., if we've been forked into a new process).
+        """
+        if self.__connection is None or self.__connectionPID != os.getpid():
+            self.open()
+        return self.__connection
+    # end of LexiconStore._getConnection
+
+
+    def get( self, tableName:str, key ) -> Optional[Any]:
+        """
+        Returns the entry with the given key in the given table.
+
+        Returns None if the key is not found.
+        """
+        fnPrint( debuggingThisModule, f"LexiconStore.get( {tableName}, {key} )" )
+        with self.__lock:
+            row = self._getConnection().execute( 'SELECT data FROM entries WHERE tableName=? AND key=?', (tableName, str(key)) ).fetchone()
+        if row is not None: return pickle.loads( row[0] )
+    # end of LexiconStore.get
+
+
+    def contains( self, tableName:str, key ) -> bool:
+        """
+        Returns True if the key is in the given table.
+        """
+        with self.__lock:
+            return self._getConnection().execute( 'SELECT 1 FROM entries WHERE tableName=? AND key=?', (tableName, str(key)) ).fetchone() is not None
+    # end of LexiconStore.contains
+
+
+    def getTableSizes( self ) -> Dict[str,int]:
+        """
+        Returns a dictionary with the number of entries in each table.
+        """
+        with self.__lock:
+            row = self._getConnection().execute( "SELECT data FROM info WHERE name='tableSizes'" ).fetchone()
+        return pickle.loads( row[0] )
+    # end of LexiconStore.getTableSizes
+
+
+    def loadTable( self, tableName:str ) -> Dict[str,Any]:
+        """
+        Returns an entire table as a dictionary.
+        """
+        fnPrint( debuggingThisModule, f"LexiconStore.loadTable( {tableName} )" )
+        with self.__lock:
+            rows = self._getConnection().execute( 'SELECT key, data FROM entries WHERE tableName=?', (tableName,) ).fetchall()
+        return { key:pickle.loads( data ) for key,data in rows }
+    # end of LexiconStore.loadTable
+
+
+    def close( self ) -> None:
+        """
+        Close the store (it will be reopened if it's used again).
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                if self.__connectionPID == os.getpid(): # Don't close a connection inherited from our parent process
+                    self.__connection.close()
+                self.__connection = self.__connectionPID = self.__signature = None
+    # end of LexiconStore.close
+# end of class LexiconStore
+
+
+_sharedStores:Dict[Tuple,LexiconStore] = {}
+_sharedStoresLock = threading.Lock()
+def getLexiconStore( storeName:str, sourceFilepaths, buildFunction:Callable[[],Dict[str,Dict[str,Any]]], storeFolderpath=None ) -> LexiconStore:
+    """
+    Returns the LexiconStore that's shared by all of the lexicon objects
+        using the same source files (creating it the first time).
+    """
+    storeKey = (storeName, tuple( str(sourceFilepath) for sourceFilepath in sourceFilepaths ), str(storeFolderpath))
+    with _sharedStoresLock:
+        if storeKey not in _sharedStores:
+            _sharedStores[storeKey] = LexiconStore( storeName, sourceFilepaths, buildFunction, storeFolderpath )
+        return _sharedStores[storeKey]
+# end of getLexiconStore
+
+
+
+def briefDemo() -> None:
+    """
+    Main program to handle command line parameters and then run what they want.
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as folderpath:
+        sourceFilepath = os.path.join( folderpath, 'Source.txt' )
+        with open( sourceFilepath, 'wt', encoding='utf-8' ) as sourceFile:
+            sourceFile.write( 'H1=father\nH2=father (Aramaic)\n' )
+        def buildFunction():
+            with open( sourceFilepath, 'rt', encoding='utf-8' ) as sourceFile:
+                return { 'Strongs': dict( line.rstrip( '\n' ).split( '=', 1 ) for line in sourceFile ) }
+        store = LexiconStore( 'Demo', [sourceFilepath], buildFunction, storeFolderpath=folderpath )
+        vPrint( 'Quiet', debuggingThisModule, store )
+        vPrint( 'Quiet', debuggingThisModule, "H1 is", store.get( 'Strongs', 'H1' ) )
+        vPrint( 'Quiet', debuggingThisModule, "Table sizes are", store.getTableSizes() )
+        store.close()
+# end of LexiconStore.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check class is working
+    """
+    briefDemo()
+# end of LexiconStore.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of LexiconStore.py
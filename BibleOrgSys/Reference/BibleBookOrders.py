@@ -37,6 +37,7 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 
 LAST_MODIFIED_DATE = '2020-04-16' # by RJH
@@ -72,6 +73,12 @@ class BibleBookOrderSystems:
         """ Loads the XML data file and imports it to dictionary format (if not done already). """
         if not self.__DataDicts or not self.__DataLists: # Don't do this unnecessarily
             if XMLFolder is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'BibleBookOrders' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using BibleBookOrders from the reference data bundle" )
+                    self.__DataDicts, self.__DataLists = bundleData
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( 'BibleBookOrders.xml' )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'BibleBookOrders_Tables.pickle' )
@@ -49,6 +49,7 @@ if __name__ == '__main__':
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 
 LAST_MODIFIED_DATE = '2021-01-01' # by RJH
@@ -86,6 +87,12 @@ class BibleBooksCodes:
         """
         if not self.__DataDicts: # We need to load them once -- don't do this unnecessarily
             if XMLFileOrFilepath is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'BibleBooksCodes' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using BibleBooksCodes from the reference data bundle" )
+                    self.__DataDicts = bundleData
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( 'BibleBooksCodes.xml' )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'BibleBooksCodes_Tables.pickle' )
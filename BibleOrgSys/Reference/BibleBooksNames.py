@@ -38,6 +38,7 @@ if __name__ == '__main__':
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 
 LAST_MODIFIED_DATE = '2020-05-02' # by RJH
@@ -225,6 +226,12 @@ class BibleBooksNamesSystems:
         """
         if not self.__DataDicts: # Don't do this unnecessarily
             if XMLFolder is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'BibleBooksNames' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using BibleBooksNames from the reference data bundle" )
+                    self.__DataDicts = bundleData
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( 'BibleBooksNames.xml' )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'BibleBooksNames_Tables.pickle' )
@@ -65,6 +65,7 @@ if __name__ == '__main__':
         sys.path.insert( 0, aboveAboveFolderpath )
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 #from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys.Reference.BibleBookOrders import BibleBookOrderSystem
@@ -104,6 +105,12 @@ class BibleOrganisationalSystems:
         result = None
         if not self.__dataDict or not self.__indexDict: # Don't do this unnecessarily
             if XMLFileOrFilepath is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'BibleOrganisationalSystems' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using BibleOrganisationalSystems from the reference data bundle" )
+                    self.__dataDict, self.__indexDict, self.__combinedIndexDict = bundleData
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( "BibleOrganisationalSystems.xml" )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( "BibleOrganisationalSystems_Tables.pickle" )
@@ -37,6 +37,7 @@ if __name__ == '__main__':
 #from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 
 LAST_MODIFIED_DATE = '2020-05-02' # by RJH
@@ -68,6 +69,12 @@ class BiblePunctuationSystems:
         """ Loads the XML data file and imports it to dictionary format (if not done already). """
         if not self.__DataDict: # Don't do this unnecessarily
             if XMLFolder is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'BiblePunctuationSystems' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using BiblePunctuationSystems from the reference data bundle" )
+                    self.__DataDict = bundleData
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( 'BiblePunctuationSystems.xml' )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( 'BiblePunctuationSystems_Tables.pickle' )
@@ -5,7 +5,7 @@
 #
 # Module handling ISO_639_3
 #
-# Copyright (C) 2010-2020 Robert Hunt
+# Copyright (C) 2010-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -24,10 +24,21 @@
 
 """
 Module handling ISO_639_3_Languages.
+
+Name searches use a LanguageNameIndex which is an inverted index
+    of the 1-, 2- and 3-character n-grams in the accent-folded names.
+    It's built the first time that it's needed and cached.
 """
 
 from gettext import gettext as _
+from typing import Dict, List, Optional
 import os
+import hashlib
+import heapq
+import logging
+import pickle
+import unicodedata
+from array import array
 
 if __name__ == '__main__':
     import sys
@@ -39,15 +50,140 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 
 
-LAST_MODIFIED_DATE = '2020-04-05' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "ISOLanguages"
 PROGRAM_NAME = "ISO 639_3_Languages handler"
-PROGRAM_VERSION = '0.85'
+PROGRAM_VERSION = '0.86'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
+NAME_INDEX_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( 'iso_639_3_Languages_NameIndex.pickle' )
+NAME_INDEX_FORMAT_VERSION = 1
+MAX_NGRAM_LENGTH = 3
+
+
+
+def foldName( name:str ) -> str:
+    """
+    Return the name in UPPERCASE with any accents (combining marks) removed
+        so that, e.g., 'Arbëreshë' matches 'ARBERESHE'.
+    """
+    return ''.join( char for char in unicodedata.normalize( 'NFKD', name ) if not unicodedata.combining( char ) ).upper()
+# end of foldName
+
+
+
+class LanguageNameIndex:
+    """
+    Class for a ranked substring index of a list of names.
+
+    The index maps every 1-, 2- and 3-character n-gram of the folded names
+        to a sorted array of the IDs (list indexes) of the names which contain it.
+    A search for up to three characters is then a single lookup,
+        and a longer search only has to check the names containing all of its trigrams.
+    """
+    def __init__( self, names:List[str] ) -> None:
+        """
+        Doesn't build the index until build() or loadCache() is called.
+        """
+        self.names = list( names )
+        self.foldedNames = [foldName( name ) for name in self.names]
+        self.signature = hashlib.sha1( '\n'.join( self.names ).encode( 'utf-8' ) ).hexdigest()
+        self.nGramIndex = None
+    # end of LanguageNameIndex.__init__
+
+
+    def build( self ) -> None:
+        """
+        Build the n-gram index.
+        """
+        fnPrint( debuggingThisModule, f"LanguageNameIndex.build() for {len(self.names):,} names" )
+        postings = {}
+        for nameID,foldedName in enumerate( self.foldedNames ):
+            for n in range( 1, MAX_NGRAM_LENGTH+1 ):
+                for ix in range( len(foldedName) - n + 1 ):
+                    nGram = foldedName[ix:ix+n]
+                    try: postings[nGram].add( nameID )
+                    except KeyError: postings[nGram] = { nameID }
+        self.nGramIndex = { nGram:array( 'I', sorted( nameIDs ) ) for nGram,nameIDs in postings.items() }
+    # end of LanguageNameIndex.build
+
+
+    def loadCache( self, cacheFilepath ) -> bool:
+        """
+        Load the index from the cache file.
+
+        Returns False if it's missing or was built from different names.
+        """
+        fnPrint( debuggingThisModule, f"LanguageNameIndex.loadCache( {cacheFilepath} )" )
+        try:
+            with open( cacheFilepath, 'rb' ) as pickleFile:
+                formatVersion, signature, nGramIndex = pickle.load( pickleFile )
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError): return False
+        if formatVersion != NAME_INDEX_FORMAT_VERSION or signature != self.signature: return False
+        self.nGramIndex = nGramIndex
+        return True
+    # end of LanguageNameIndex.loadCache
+
+
+    def saveCache( self, cacheFilepath ) -> None:
+        """
+        Save the index to the cache file.
+        """
+        fnPrint( debuggingThisModule, f"LanguageNameIndex.saveCache( {cacheFilepath} )" )
+        os.makedirs( os.path.dirname( cacheFilepath ), exist_ok=True )
+        tempFilepath = f'{cacheFilepath}.{os.getpid()}.tmp'
+        with open( tempFilepath, 'wb' ) as pickleFile:
+            pickle.dump( (NAME_INDEX_FORMAT_VERSION, self.signature, self.nGramIndex), pickleFile, pickle.HIGHEST_PROTOCOL )
+        os.replace( tempFilepath, cacheFilepath ) # Atomic
+    # end of LanguageNameIndex.saveCache
+
+
+    def _getMatchingIDs( self, foldedQuery:str ):
+        """
+        Return the IDs of all the names which contain the (folded) query.
+        """
+        if not foldedQuery: return range( len(self.names) )
+        if len(foldedQuery) <= MAX_NGRAM_LENGTH: return self.nGramIndex.get( foldedQuery, () )
+
+        postingsList = sorted( (self.nGramIndex.get( foldedQuery[ix:ix+MAX_NGRAM_LENGTH], () )
+                                    for ix in range( len(foldedQuery) - MAX_NGRAM_LENGTH + 1 )), key=len )
+        candidateIDs = set( postingsList[0] )
+        for postings in postingsList[1:]:
+            if not candidateIDs: break
+            candidateIDs.intersection_update( postings )
+        return [nameID for nameID in candidateIDs if foldedQuery in self.foldedNames[nameID]] # Check the order of the trigrams
+    # end of LanguageNameIndex._getMatchingIDs
+
+
+    def find( self, query:str, maxResults:Optional[int]=None ) -> List[int]:
+        """
+        Return the IDs of the names which contain the query
+            ranked with exact matches first, then names starting with the query,
+            then names with a word starting with the query, then any other matches
+            (and then shorter names first).
+        """
+        foldedQuery = foldName( query )
+        foldedNames = self.foldedNames
+        def getRankKey( nameID:int ):
+            foldedName = foldedNames[nameID]
+            if foldedName == foldedQuery: rank = 0
+            else:
+                ix = foldedName.find( foldedQuery )
+                rank = 1 if ix==0 else 2 if not foldedName[ix-1].isalnum() else 3
+            return (rank, len(foldedName), foldedName)
+        # end of find.getRankKey
+
+        matchingIDs = self._getMatchingIDs( foldedQuery )
+        if maxResults is not None and maxResults < len(matchingIDs):
+            return heapq.nsmallest( maxResults, matchingIDs, key=getRankKey )
+        return sorted( matchingIDs, key=getRankKey )
+    # end of LanguageNameIndex.find
+# end of LanguageNameIndex class
+
+
 
 @singleton # Can only ever have one instance
 class ISO_639_3_Languages:
@@ -64,6 +200,7 @@ class ISO_639_3_Languages:
         Constructor:
         """
         self.__IDDict, self.__NameDict = None, None # We'll import into this in loadData
+        self.__nameIndex = self.__foldedNameDict = None # Built when first needed
     # end of ISO_639_3_Languages.__init__
 
     def __str__( self ) -> str:
@@ -146,22 +283,48 @@ class ISO_639_3_Languages:
         """ Return the optional 3-character ISO 639-2B code for the given language code (or None). """
         return self.__IDDict[ccc][4] # The fifth field is the (optional) part2code
 
+    def _getNameIndex( self ) -> LanguageNameIndex:
+        """
+        Return the name index (loading it from the cache or building it if necessary).
+        """
+        if self.__nameIndex is None:
+            nameCodes = list( self.__NameDict.values() )
+            nameIndex = LanguageNameIndex( [self.__IDDict[ccc][0] for ccc in nameCodes] ) # The mixed case language names
+            if not nameIndex.loadCache( NAME_INDEX_FILEPATH ):
+                vPrint( 'Info', debuggingThisModule, _("Building ISO 639-3 language name index…") )
+                nameIndex.build()
+                try: nameIndex.saveCache( NAME_INDEX_FILEPATH )
+                except OSError as err: logging.warning( f"Unable to cache ISO 639-3 language name index: {err}" )
+            foldedNameDict = {}
+            for foldedName,ccc in zip( nameIndex.foldedNames, nameCodes ):
+                foldedNameDict.setdefault( foldedName, ccc )
+            self.__nameIndex, self.__foldedNameDict = nameIndex, foldedNameDict
+        return self.__nameIndex
+    # end of ISO_639_3_Languages._getNameIndex
+
     def getLanguageCode( self, name ):
-        """ Return the 3-character code for the given language name (or None if one can't be found). """
+        """ Return the 3-character code for the given language name (or None if one can't be found).
+            Accents are ignored if there's no exact match. """
         UCName = name.upper() # Convert to UPPERCASE for searching
         if UCName in self.__NameDict: return self.__NameDict[UCName]
+        self._getNameIndex()
+        return self.__foldedNameDict.get( foldName( name ) )
+
+    def getLanguageCodes( self, names ) -> Dict[str,Optional[str]]:
+        """ Return a dictionary with the 3-character code (or None) for each of the given language names. """
+        return { name:self.getLanguageCode( name ) for name in names }
+
+    def getNameMatches( self, namePortion, maxResults=None ):
+        """ Return a ranked list of matching names for the given part of a name
+                (exact matches first, then names starting with it, then names with a word starting with it).
+            Case and accents are ignored.
+        """
+        nameIndex = self._getNameIndex()
+        return [nameIndex.names[nameID] for nameID in nameIndex.find( namePortion, maxResults )]
 
-    def getNameMatches( self, namePortion ):
-        """ Return a list of matching names for the given part of a name.
-            This is slow because it is a brute-force search.
-        """
-        UCNamePortion = namePortion.upper()
-        results = []
-        for UCName in self.__NameDict:
-            if UCNamePortion in UCName:
-                ccc = self.__NameDict[UCName]
-                results.append( self.__IDDict[ccc][0] ) # Get the mixed case language name
-        return results
+    def getNameMatchesDict( self, namePortions, maxResults=None ) -> Dict[str,List[str]]:
+        """ Return a dictionary with the ranked list of matching names for each of the given parts of names. """
+        return { namePortion:self.getNameMatches( namePortion, maxResults ) for namePortion in namePortions }
 # end of ISO_639_3_Languages class
 
 
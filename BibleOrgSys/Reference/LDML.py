@@ -5,7 +5,7 @@
 #
 # Module handling Unicode LOCALE DATA MARKUP LANGUAGE (XML) files
 #
-# Copyright (C) 2017 Robert Hunt
+# Copyright (C) 2017-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -49,6 +49,11 @@ CLDR stands for Common Locale Data Repository.
 
 NOTE: This preliminary module currently parses a range of XML files
         but does not yet store the parsed data in many cases.
+
+The parsed data is cached (in the BOS object cache folder) keyed by the LDML filepath,
+    modification time and size, so an unchanged file is never parsed twice.
+    Each top-level section (e.g., characters, delimiters, dates) is pickled separately
+    and only unpickled when it's first used.
 """
 
 from gettext import gettext as _
@@ -56,6 +61,10 @@ import sys
 import os
 import logging
 import multiprocessing
+import hashlib
+import pickle
+import struct
+from collections.abc import Mapping
 from xml.etree.ElementTree import ElementTree
 
 if __name__ == '__main__':
@@ -67,10 +76,10 @@ from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
 
 
-LAST_MODIFIED_DATE = '2019-05-28' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 SHORT_PROGRAM_NAME = "LDML_Handler"
 PROGRAM_NAME = "Unicode LOCALE DATA MARKUP LANGUAGE handler"
-PROGRAM_VERSION = '0.13'
+PROGRAM_VERSION = '0.14'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
@@ -80,6 +89,9 @@ DRAFT_VALUES = ( 'provisional', 'contributed', 'unconfirmed', 'approved',
                 'proposed', # 'proposed' is not in the Unicode standard but does occur in SIL sldr files
                 'generated', 'suspect' ) # Seems new ??? TODO: Check it out
 
+LDML_CACHE_FOLDERPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( 'LDML/' )
+LDML_CACHE_FORMAT_VERSION = 1 # Increment this if the layout of the cache files changes
+
 
 
 def getFlagFromAttribute( attributeName, attributeValue ):
@@ -104,6 +116,102 @@ def getFlagFromText( subelement ):
 
 
 
+class CachedLDMLData( Mapping ):
+    """
+    A read-only dictionary of LDML sections as loaded from an LDML cache file.
+
+    Each section is only unpickled when it's first accessed.
+
+    Pickles (and deep-copies) as an ordinary dictionary.
+    """
+    def __init__( self, cacheBytes, dataStart:int, sectionOffsets ) -> None:
+        """
+        sectionOffsets is a list of (sectionName, offset, length) with offsets from dataStart.
+        """
+        self._cacheView = memoryview( cacheBytes )
+        self._sectionOffsets = { sectionName:(dataStart+offset, length) for sectionName,offset,length in sectionOffsets }
+        self._loadedSections = {}
+
+    def __getitem__( self, sectionName:str ):
+        try: return self._loadedSections[sectionName]
+        except KeyError:
+            start, length = self._sectionOffsets[sectionName] # Raises KeyError if we don't have it
+            section = self._loadedSections[sectionName] = pickle.loads( self._cacheView[start:start+length] )
+            return section
+
+    def __iter__( self ): return iter( self._sectionOffsets )
+    def __len__( self ) -> int: return len( self._sectionOffsets )
+    def __repr__( self ) -> str: return repr( dict( self.items() ) )
+    def __reduce__( self ): return (dict, (dict( self.items() ),))
+# end of CachedLDMLData class
+
+
+def getLDMLCacheFilepath( LDMLFilepath ):
+    """
+    Return the path of the cache file for the given LDML file.
+    """
+    return LDML_CACHE_FOLDERPATH.joinpath( hashlib.sha1( os.path.abspath( LDMLFilepath ).encode( 'utf-8' ) ).hexdigest() + '.LDMLCache' )
+# end of getLDMLCacheFilepath
+
+
+def _getLDMLSignature( LDMLFilepath ):
+    """
+    Return the (filepath, modification time, size) of the LDML file.
+    """
+    statResult = os.stat( LDMLFilepath )
+    return (os.path.abspath( LDMLFilepath ), statResult.st_mtime_ns, statResult.st_size)
+# end of _getLDMLSignature
+
+
+def loadCachedLDML( LDMLFilepath ):
+    """
+    Return a CachedLDMLData for the LDML file
+        or None if the cache file is missing or out-of-date.
+    """
+    fnPrint( debuggingThisModule, f"loadCachedLDML( {LDMLFilepath} )" )
+    try:
+        with open( getLDMLCacheFilepath( LDMLFilepath ), 'rb' ) as cacheFile:
+            cacheBytes = cacheFile.read()
+        headerLength = struct.unpack_from( '<I', cacheBytes )[0]
+        header = pickle.loads( cacheBytes[4:4+headerLength] )
+    except (OSError, struct.error, pickle.UnpicklingError, EOFError): return None
+    if not isinstance( header, dict ) \
+    or header.get( 'formatVersion' ) != LDML_CACHE_FORMAT_VERSION \
+    or header.get( 'programVersion' ) != PROGRAM_VERSION \
+    or header.get( 'signature' ) != _getLDMLSignature( LDMLFilepath ):
+        return None
+    return CachedLDMLData( cacheBytes, 4+headerLength, header['sections'] )
+# end of loadCachedLDML
+
+
+def saveCachedLDML( LDMLFilepath, LDMLData, signature=None ) -> None:
+    """
+    Save the parsed LDMLData dictionary for the LDML file into the cache
+        with each top-level section pickled separately.
+    """
+    fnPrint( debuggingThisModule, f"saveCachedLDML( {LDMLFilepath}, … )" )
+    if signature is None: signature = _getLDMLSignature( LDMLFilepath )
+    sectionOffsets, sectionBytesList, offset = [], [], 0
+    for sectionName,section in LDMLData.items():
+        sectionBytes = pickle.dumps( section, pickle.HIGHEST_PROTOCOL )
+        sectionOffsets.append( (sectionName, offset, len(sectionBytes)) )
+        sectionBytesList.append( sectionBytes )
+        offset += len( sectionBytes )
+    headerBytes = pickle.dumps( { 'formatVersion':LDML_CACHE_FORMAT_VERSION, 'programVersion':PROGRAM_VERSION,
+                                'signature':signature, 'sections':sectionOffsets }, pickle.HIGHEST_PROTOCOL )
+
+    cacheFilepath = getLDMLCacheFilepath( LDMLFilepath )
+    os.makedirs( LDML_CACHE_FOLDERPATH, exist_ok=True )
+    tempFilepath = f'{cacheFilepath}.{os.getpid()}.tmp'
+    with open( tempFilepath, 'wb' ) as cacheFile:
+        cacheFile.write( struct.pack( '<I', len(headerBytes) ) )
+        cacheFile.write( headerBytes )
+        for sectionBytes in sectionBytesList: cacheFile.write( sectionBytes )
+    os.replace( tempFilepath, cacheFilepath ) # Atomic
+# end of saveCachedLDML
+
+
+
 class LDMLFile:
     """
     A class to load and validate the XML Unicode LOCALE DATA MARKUP LANGUAGE files.
@@ -124,13 +232,38 @@ class LDMLFile:
     # end of LDMLFile.__init__
 
 
-    def load( self ):
+    def load( self, useCache:bool=True ):
+        """
+        Load the something.ldml file (which is an LDML file) and return the parsed dictionary.
+
+        Uses the (lazily loaded) cached data if the file hasn't changed since it was last parsed
+            (except when strict checking, so that the file is always fully checked).
+        """
+        fnPrint( debuggingThisModule, f"load( {useCache} )" )
+
+        if not useCache: return self.parse()
+        if not BibleOrgSysGlobals.strictCheckingFlag:
+            cachedLDMLData = loadCachedLDML( self.filepath )
+            if cachedLDMLData is not None:
+                vPrint( 'Verbose', debuggingThisModule, "    Loaded cached LDML data for {}".format( self.filepath ) )
+                return cachedLDMLData
+
+        signature = _getLDMLSignature( self.filepath ) # Before parsing in case the file changes meanwhile
+        LDMLData = self.parse()
+        try: saveCachedLDML( self.filepath, LDMLData, signature )
+        except (OSError, pickle.PicklingError) as err:
+            logging.warning( f"Unable to cache LDML data for {self.filepath}: {err}" )
+        return LDMLData
+    # end of LDMLFile.load
+
+
+    def parse( self ):
         """
-        Load the something.ldml file (which is an LDML file) and parse it into the dictionary PTXLanguages.
+        Parse the something.ldml file (which is an LDML file) into a dictionary.
 
         LDML = Locale Data Markup Language (see http://unicode.org/reports/tr35/tr35-4.html)
         """
-        fnPrint( debuggingThisModule, "load()" )
+        fnPrint( debuggingThisModule, "parse()" )
 
         SIL_URN_Prefix = '{urn://www.sil.org/ldml/0.1}'
         lenSILURNPrefix = len( SIL_URN_Prefix )
@@ -3829,7 +3962,7 @@ class LDMLFile:
         elif debuggingThisModule:
             vPrint( 'Quiet', debuggingThisModule, '\nLDMLData for {} ({}): {}'.format( self.languageCode, len(LDMLData), LDMLData ) )
         return LDMLData
-    # end of LDML.load
+    # end of LDMLFile.parse
 # end of class LDMLFile
 
 
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ReferenceDataBundle.py
+#
+# Module handling a single combined (and lazily loaded) file of BOS reference tables
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module handling a single combined file (the "bundle") containing
+    all of the derived reference tables used by the Reference singletons, i.e.,
+        BibleBooksCodes, USFM3Markers, BibleVersificationSystems, BibleBookOrders,
+        BibleBooksNames, BiblePunctuationSystems and BibleOrganisationalSystems.
+
+Rather than each loadData() function separately stat-ing XML/pickle/JSON files
+    and then unpickling everything, the bundle file contains a small header
+    (with the file format version and an index of sections)
+    followed by separately pickled sections.
+Sections are only unpickled on first access,
+    and large system dictionaries (e.g., the versification systems)
+    are split so that only the individual systems that are actually used get unpickled.
+
+The bundle is made by buildReferenceDataBundle() which also does a consistency check
+    across the various tables (e.g., that every book code used is a valid BBB).
+It's not distributed -- it gets built on first use in the writeable cache folder
+    (like other derived data) from the XML (or else from the derived pickle files).
+Each section remembers the size and mtime of the XML files that it was made from
+    so that we can detect when the bundle is out-of-date (in which case it gets rebuilt).
+
+Contains functions:
+    getReferenceDataSection( sectionName:str ) -> Optional[Any]
+    buildReferenceDataBundle( filepath=None ) -> bool
+    checkReferenceDataConsistency( sectionsDict ) -> List[str]
+    benchmarkPreload( numRuns:int=5 ) -> Dict[str,float]
+"""
+from gettext import gettext as _
+from typing import Any, Dict, List, Optional, Tuple
+from collections.abc import Mapping
+from pathlib import Path
+import os
+import struct
+import pickle
+import threading
+import logging
+
+if __name__ == '__main__':
+    import sys
+    aboveAboveFolderpath = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+    if aboveAboveFolderpath not in sys.path:
+        sys.path.insert( 0, aboveAboveFolderpath )
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+SHORT_PROGRAM_NAME = "ReferenceDataBundle"
+PROGRAM_NAME = "Reference Data Bundle handler"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+debuggingThisModule = False
+
+
+BUNDLE_FORMAT_VERSION = 2 # Must be incremented if the file layout or any section format gets changed
+BUNDLE_MAGIC = b'BOSRefData\x00'
+BUNDLE_FILENAME = 'BOSReferenceData.bundle'
+STANDARD_BUNDLE_FILEPATH = BibleOrgSysGlobals.DEFAULT_WRITEABLE_CACHE_FOLDERPATH.joinpath( BUNDLE_FILENAME )
+
+# For each section: (XML source filename/glob relative to BOS_DATAFILES_FOLDERPATH,
+#                    derived pickle filename, number of objects in the pickle file,
+#                    splitFlag -- True if each top-level dictionary entry gets unpickled separately)
+SECTION_SPECS = {
+    'BibleBooksCodes': ( 'BibleBooksCodes.xml', 'BibleBooksCodes_Tables.pickle', 1, True ),
+    'USFM3Markers': ( 'USFM3Markers.xml', 'USFM3Markers_Tables.pickle', 1, True ),
+    'BibleBookOrders': ( 'BookOrders/BibleBookOrder_*.xml', 'BibleBookOrders_Tables.pickle', 2, False ),
+    'BibleBooksNames': ( 'BookNames/BibleBooksNames_*.xml', 'BibleBooksNames_Tables.pickle', 1, True ),
+    'BiblePunctuationSystems': ( 'PunctuationSystems/BiblePunctuationSystem_*.xml', 'BiblePunctuationSystems_Tables.pickle', 1, False ),
+    'BibleVersificationSystems': ( 'VersificationSystems/BibleVersificationSystem_*.xml', 'BibleVersificationSystems_Tables.pickle', 1, True ),
+    'BibleOrganisationalSystems': ( 'BibleOrganisationalSystems.xml', 'BibleOrganisationalSystems_Tables.pickle', 1, False ),
+    }
+
+
+
+def _getSourceFilepaths( sectionName:str ) -> List[Path]:
+    """
+    Returns a sorted list of the XML source files for the given section
+        (which will be empty for an installed package which doesn't include the XML files).
+    """
+    sourceSpec = SECTION_SPECS[sectionName][0]
+    return sorted( BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.glob( sourceSpec ) )
+# end of _getSourceFilepaths
+
+
+
+class _LazySectionDict( Mapping ):
+    """
+    A read-only dictionary where each value is only unpickled on first access.
+
+    This is what split sections are returned as, so callers that only use
+        one versification system (for example) don't pay to unpickle them all.
+    """
+    def __init__( self, bundle:'ReferenceDataBundle', sectionName:str, keyList:List[Any] ) -> None:
+        self.__bundle, self.__sectionName = bundle, sectionName
+        self.__keyList = keyList
+        self.__keySet = set( keyList )
+        self.__loadedValues = {}
+
+
+    def __getitem__( self, key ):
+        try: return self.__loadedValues[key]
+        except KeyError:
+            if key not in self.__keySet: raise
+        value = self.__bundle._loadEntry( self.__sectionName, key )
+        self.__loadedValues[key] = value
+        return value
+
+
+    def __contains__( self, key ) -> bool:
+        return key in self.__keySet
+
+    def __iter__( self ):
+        return iter( self.__keyList )
+
+    def __len__( self ) -> int:
+        return len( self.__keyList )
+
+    def __repr__( self ) -> str:
+        return f"_LazySectionDict({self.__sectionName!r}, {len(self.__loadedValues)}/{len(self.__keyList)} loaded)"
+
+
+    def __reduce__( self ):
+        """
+        Make sure that we pickle (e.g., for multiprocessing) as a normal (fully loaded) dict.
+        """
+        return ( dict, (dict(self.items()),) )
+# end of class _LazySectionDict
+
+
+
+class ReferenceDataBundle:
+    """
+    Class for reading the combined reference data bundle file.
+
+    Only the header is read when the object is created.
+    The file is reopened for each section read (rather than keeping a file handle open)
+        so that it's safe to use across forked multiprocessing workers.
+    """
+    def __init__( self, filepath=None ) -> None:
+        """
+        Constructor: reads and checks the header.
+
+        Raises ValueError if the file isn't a valid bundle of the current format version.
+        """
+        fnPrint( debuggingThisModule, f"ReferenceDataBundle.__init__( {filepath} )" )
+        self.filepath = Path( filepath ) if filepath else STANDARD_BUNDLE_FILEPATH
+        with open( self.filepath, 'rb' ) as bundleFile:
+            magic = bundleFile.read( len(BUNDLE_MAGIC) )
+            if magic != BUNDLE_MAGIC:
+                raise ValueError( f"{self.filepath} is not a BOS reference data bundle" )
+            headerLength, = struct.unpack( '<I', bundleFile.read( 4 ) )
+            header = pickle.loads( bundleFile.read( headerLength ) )
+        if header.get( 'formatVersion' ) != BUNDLE_FORMAT_VERSION:
+            raise ValueError( f"{self.filepath} has bundle format version {header.get('formatVersion')} (expected {BUNDLE_FORMAT_VERSION})" )
+        self.__dataStartOffset = len(BUNDLE_MAGIC) + 4 + headerLength
+        self.__sectionIndex = header['sections']
+        self.__sectionCache = {}
+        self.__checkedSections = {}
+        self.__lock = threading.Lock()
+    # end of ReferenceDataBundle.__init__
+
+
+    def __str__( self ) -> str:
+        result = f"ReferenceDataBundle v{BUNDLE_FORMAT_VERSION} from {self.filepath}"
+        result += f"\n  Sections = {', '.join( self.__sectionIndex )}"
+        result += f"\n  Loaded sections = {', '.join( self.__sectionCache ) if self.__sectionCache else 'None'}"
+        return result
+    # end of ReferenceDataBundle.__str__
+
+
+    def __contains__( self, sectionName:str ) -> bool:
+        return sectionName in self.__sectionIndex
+
+
+    def getSectionNames( self ) -> List[str]:
+        """ Returns a list of the sections available in the bundle. """
+        return list( self.__sectionIndex )
+
+
+    def _readBlob( self, offset:int, length:int ) -> Any:
+        """
+        Reads and unpickles one blob from the bundle.
+        """
+        with open( self.filepath, 'rb' ) as bundleFile:
+            bundleFile.seek( self.__dataStartOffset + offset )
+            return pickle.loads( bundleFile.read( length ) )
+    # end of ReferenceDataBundle._readBlob
+
+
+    def _loadEntry( self, sectionName:str, key:Any ) -> Any:
+        """
+        Reads and unpickles one entry from a split section.
+        """
+        offset, length = self.__sectionIndex[sectionName]['entries'][key]
+        return self._readBlob( offset, length )
+    # end of ReferenceDataBundle._loadEntry
+
+
+    def isSectionCurrent( self, sectionName:str ) -> bool:
+        """
+        Returns True if the XML source files haven't changed since this section was built.
+
+        If the XML files aren't there (e.g., a pip-installed package), we just trust the bundle.
+        Only the sizes and mtimes are compared -- the source files never get read here.
+        """
+        try: return self.__checkedSections[sectionName]
+        except KeyError: pass
+        sectionInfo = self.__sectionIndex[sectionName]
+        isCurrent = True
+        sourceFilepaths = _getSourceFilepaths( sectionName )
+        if sourceFilepaths: # If not, we can't check anything
+            builtSources = sectionInfo['sources']
+            if len(sourceFilepaths) != len(builtSources):
+                isCurrent = False
+            else:
+                for sourceFilepath in sourceFilepaths:
+                    relativeName = sourceFilepath.relative_to( BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH ).as_posix()
+                    try: builtSize, builtMTime = builtSources[relativeName]
+                    except KeyError: isCurrent = False; break
+                    fileStat = os.stat( sourceFilepath )
+                    if fileStat.st_size != builtSize or fileStat.st_mtime_ns != builtMTime:
+                        isCurrent = False; break
+        if not isCurrent:
+            logging.info( f"ReferenceDataBundle: {sectionName} section is out-of-date with its XML source files" )
+        self.__checkedSections[sectionName] = isCurrent
+        return isCurrent
+    # end of ReferenceDataBundle.isSectionCurrent
+
+
+    def getSection( self, sectionName:str ) -> Optional[Any]:
+        """
+        Returns the data for the given section (loading it if necessary)
+            or None if the section isn't available or is out-of-date.
+
+        Split sections are returned as a lazy (read-only) dictionary.
+        """
+        fnPrint( debuggingThisModule, f"ReferenceDataBundle.getSection( {sectionName} )" )
+        try: return self.__sectionCache[sectionName]
+        except KeyError: pass
+        if sectionName not in self.__sectionIndex \
+        or not self.isSectionCurrent( sectionName ):
+            return None
+        with self.__lock:
+            if sectionName not in self.__sectionCache: # Might have been loaded by another thread
+                sectionInfo = self.__sectionIndex[sectionName]
+                if 'entries' in sectionInfo:
+                    self.__sectionCache[sectionName] = _LazySectionDict( self, sectionName, list(sectionInfo['entries']) )
+                else:
+                    self.__sectionCache[sectionName] = self._readBlob( *sectionInfo['blob'] )
+        return self.__sectionCache[sectionName]
+    # end of ReferenceDataBundle.getSection
+# end of class ReferenceDataBundle
+
+
+
+_standardBundle = None # Gets set to False if there's no usable bundle file (or while it's being built)
+_standardBundleLock = threading.Lock()
+
+def _makeStandardBundle( rebuild:bool ):
+    """
+    Opens the standard bundle file, (re)building it in the cache folder first
+        if it's not there or not usable (or if rebuild is set).
+
+    Must be called with _standardBundleLock held and _standardBundle set to False
+        so that the loadData() calls made while building use their previous methods.
+
+    Returns the ReferenceDataBundle object or False.
+    """
+    fnPrint( debuggingThisModule, f"_makeStandardBundle( {rebuild} )" )
+    if not rebuild:
+        try: return ReferenceDataBundle()
+        except FileNotFoundError:
+            vPrint( 'Info', debuggingThisModule, f"No reference data bundle found at {STANDARD_BUNDLE_FILEPATH}" )
+        except (ValueError, pickle.UnpicklingError, struct.error, EOFError) as err:
+            logging.info( f"Rebuilding unusable reference data bundle {STANDARD_BUNDLE_FILEPATH}: {err}" )
+    try:
+        if buildReferenceDataBundle( STANDARD_BUNDLE_FILEPATH ):
+            return ReferenceDataBundle()
+    except OSError as err: # e.g., cache folder not writeable, or no source files
+        logging.warning( f"Unable to build reference data bundle {STANDARD_BUNDLE_FILEPATH}: {err}" )
+    return False
+# end of _makeStandardBundle
+
+
+def getReferenceDataSection( sectionName:str ) -> Optional[Any]:
+    """
+    Returns the data for the given section from the standard bundle file
+        or None if there's no usable bundle.
+
+    The bundle is built on first use,
+        and rebuilt (once) if the section is out-of-date with its XML source files.
+
+    This is what the various Reference loadData() functions call first.
+    """
+    global _standardBundle
+    if _standardBundle is None:
+        with _standardBundleLock:
+            if _standardBundle is None:
+                _standardBundle = False # Nested calls (while building) return None
+                _standardBundle = _makeStandardBundle( rebuild=False )
+    bundle = _standardBundle
+    if not bundle: return None
+    sectionData = bundle.getSection( sectionName )
+    if sectionData is None and sectionName in bundle: # must be out-of-date
+        with _standardBundleLock:
+            if _standardBundle is bundle: # No other thread has rebuilt it yet
+                _standardBundle = False # Nested calls (while building) return None
+                _standardBundle = _makeStandardBundle( rebuild=True )
+        if _standardBundle: sectionData = _standardBundle.getSection( sectionName )
+    return sectionData
+# end of getReferenceDataSection
+
+
+def _resetStandardBundle() -> None:
+    """
+    Forget the standard bundle (e.g., after it's been rebuilt) so it gets reopened on next use.
+    """
+    global _standardBundle
+    _standardBundle = None
+# end of _resetStandardBundle
+
+
+
+def _loadSectionFromSources( sectionName:str ) -> Any:
+    """
+    Loads the section data the slow way, i.e., from the XML via the converter
+        or else (if there's no XML) from the individual derived pickle file.
+
+    Returns the section data in the same form as stored in the individual pickle files.
+    """
+    fnPrint( debuggingThisModule, f"_loadSectionFromSources( {sectionName} )" )
+    sourceSpec, pickleFilename, numPickledObjects, _splitFlag = SECTION_SPECS[sectionName]
+    if _getSourceFilepaths( sectionName ):
+        vPrint( 'Info', debuggingThisModule, f"  Converting XML for {sectionName}…" )
+        if sectionName == 'BibleBooksCodes':
+            from BibleOrgSys.Reference.Converters.BibleBooksCodesConverter import BibleBooksCodesConverter
+            return BibleBooksCodesConverter().loadAndValidate().importDataToPython()
+        if sectionName == 'USFM3Markers':
+            from BibleOrgSys.Reference.Converters.USFM3MarkersConverter import USFM3MarkersConverter
+            return USFM3MarkersConverter().loadAndValidate().importDataToPython()
+        if sectionName == 'BibleBookOrders':
+            from BibleOrgSys.Reference.Converters.BibleBookOrdersConverter import BibleBookOrdersConverter
+            return BibleBookOrdersConverter().loadSystems().importDataToPython()
+        if sectionName == 'BibleBooksNames':
+            from BibleOrgSys.Reference.Converters.BibleBooksNamesConverter import BibleBooksNamesConverter
+            return BibleBooksNamesConverter().loadSystems().importDataToPython()[0] # Don't need the expanded dicts
+        if sectionName == 'BiblePunctuationSystems':
+            from BibleOrgSys.Reference.Converters.BiblePunctuationSystemsConverter import BiblePunctuationSystemsConverter
+            return BiblePunctuationSystemsConverter().loadSystems().importDataToPython()
+        if sectionName == 'BibleVersificationSystems':
+            from BibleOrgSys.Reference.Converters.BibleVersificationSystemsConverter import BibleVersificationSystemsConverter
+            return BibleVersificationSystemsConverter().loadSystems().importDataToPython()
+        if sectionName == 'BibleOrganisationalSystems':
+            from BibleOrgSys.Reference.Converters.BibleOrganisationalSystemsConverter import BibleOrganisationalSystemsConverter
+            return BibleOrganisationalSystemsConverter().loadAndValidate().importDataToPython()
+        raise KeyError( f"No converter known for {sectionName}" )
+
+    # else no XML, so use the pickle
+    vPrint( 'Info', debuggingThisModule, f"  Loading {pickleFilename} for {sectionName}…" )
+    with open( BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( pickleFilename ), 'rb' ) as pickleFile:
+        pickledObjects = tuple( pickle.load( pickleFile ) for _n in range( numPickledObjects ) )
+    return pickledObjects[0] if numPickledObjects==1 else pickledObjects
+# end of _loadSectionFromSources
+
+
+def checkReferenceDataConsistency( sectionsDict:Dict[str,Any] ) -> List[str]:
+    """
+    Checks that the various reference tables agree with each other,
+        e.g., that every book code used in the other systems is a valid BBB.
+    Unknown system names in the organisational systems are only logged as warnings.
+
+    Returns a list of error messages (empty if all is well).
+    """
+    fnPrint( debuggingThisModule, f"checkReferenceDataConsistency( {list(sectionsDict)} )" )
+    errors = []
+    for sectionName in SECTION_SPECS:
+        if not sectionsDict.get( sectionName ):
+            errors.append( f"Missing or empty {sectionName} section" )
+    if errors: return errors
+
+    BBCDicts = sectionsDict['BibleBooksCodes']
+    validBBBs = set( BBCDicts['referenceAbbreviationDict'] )
+    if len(BBCDicts['referenceNumberDict']) != len(validBBBs):
+        errors.append( f"BibleBooksCodes has {len(validBBBs)} codes but {len(BBCDicts['referenceNumberDict'])} reference numbers" )
+    for BBB in BBCDicts['sequenceList']:
+        if BBB not in validBBBs: errors.append( f"BibleBooksCodes sequenceList has invalid {BBB!r}" )
+
+    USFMDict = sectionsDict['USFM3Markers']
+    for listName in ( 'newlineMarkersList', 'internalMarkersList', 'noteMarkersList', 'deprecatedMarkersList' ):
+        for marker in USFMDict[listName]:
+            if marker not in USFMDict['combinedMarkerDict']:
+                errors.append( f"USFM3Markers {listName} has unknown {marker!r} marker" )
+
+    bookOrderDicts, bookOrderLists = sectionsDict['BibleBookOrders']
+    if set(bookOrderDicts) != set(bookOrderLists):
+        errors.append( "BibleBookOrders dicts and lists have different system names" )
+    for systemName, BBBList in bookOrderLists.items():
+        for BBB in BBBList:
+            if BBB not in validBBBs: errors.append( f"BibleBookOrders {systemName} has invalid {BBB!r}" )
+
+    for systemName, systemDict in sectionsDict['BibleVersificationSystems'].items():
+        for BBB in systemDict['CV']:
+            if BBB not in validBBBs: errors.append( f"BibleVersificationSystems {systemName} has invalid {BBB!r}" )
+
+    for systemName, (divisionsDict, _bookNamesDict, _inputDict) in sectionsDict['BibleBooksNames'].items():
+        for divisionAbbreviation, divisionDict in divisionsDict.items():
+            for BBB in divisionDict['includedBooks']:
+                if BBB not in validBBBs: errors.append( f"BibleBooksNames {systemName} {divisionAbbreviation} has invalid {BBB!r}" )
+
+    orgDataDict = sectionsDict['BibleOrganisationalSystems'][0]
+    for fieldName, otherSectionName in ( ('versificationSystem','BibleVersificationSystems'),
+                                        ('punctuationSystem','BiblePunctuationSystems'), ):
+        otherSystemNames = sectionsDict[otherSectionName]
+        for systemCode, systemDict in orgDataDict.items():
+            otherSystemName = systemDict.get( fieldName )
+            if otherSystemName and otherSystemName not in ('None','Unknown','???') \
+            and otherSystemName not in otherSystemNames: # Not fatal -- BibleOrganisationalSystem copes with this at run-time
+                logging.warning( f"checkReferenceDataConsistency: BibleOrganisationalSystems {systemCode} has unknown {fieldName} {otherSystemName!r}" )
+    for systemCode, systemDict in orgDataDict.items():
+        for BBB in systemDict.get( 'includesBooks', () ):
+            if BBB not in validBBBs: errors.append( f"BibleOrganisationalSystems {systemCode} includes invalid {BBB!r}" )
+    return errors
+# end of checkReferenceDataConsistency
+
+
+def buildReferenceDataBundle( filepath=None ) -> bool:
+    """
+    Loads all the reference sections (the slow way), checks their consistency,
+        and then writes the bundle file.
+
+    Returns True if successful.
+    """
+    fnPrint( debuggingThisModule, f"buildReferenceDataBundle( {filepath} )" )
+    if not filepath: filepath = STANDARD_BUNDLE_FILEPATH
+    vPrint( 'Info', debuggingThisModule, _("Building reference data bundle {}…").format( filepath ) )
+
+    if BibleOrgSysGlobals.loadedBibleBooksCodes is None: # Needed by some of the converters
+        BibleOrgSysGlobals.preloadCommonData()
+
+    sectionsDict, sourcesDict = {}, {}
+    for sectionName in SECTION_SPECS:
+        sourcesDict[sectionName] = {}
+        for sourceFilepath in _getSourceFilepaths( sectionName ): # Get these first so we're not newer than the data
+            fileStat = os.stat( sourceFilepath )
+            relativeName = sourceFilepath.relative_to( BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH ).as_posix()
+            sourcesDict[sectionName][relativeName] = ( fileStat.st_size, fileStat.st_mtime_ns )
+        sectionsDict[sectionName] = _loadSectionFromSources( sectionName )
+
+    errors = checkReferenceDataConsistency( sectionsDict )
+    if errors:
+        for error in errors: logging.critical( f"buildReferenceDataBundle: {error}" )
+        logging.critical( _("Reference data bundle NOT written because of {} consistency error(s)").format( len(errors) ) )
+        return False
+
+    blobs, sectionIndex, offset = [], {}, 0
+    def addBlob( thisObject ) -> Tuple[int,int]:
+        nonlocal offset
+        blob = pickle.dumps( thisObject, pickle.HIGHEST_PROTOCOL )
+        blobs.append( blob )
+        offset += len(blob)
+        return offset-len(blob), len(blob)
+    for sectionName, sectionData in sectionsDict.items():
+        sectionIndex[sectionName] = { 'sources': sourcesDict[sectionName] }
+        if SECTION_SPECS[sectionName][3]: # split into separate entries
+            sectionIndex[sectionName]['entries'] = { key:addBlob(value) for key,value in sectionData.items() }
+        else: sectionIndex[sectionName]['blob'] = addBlob( sectionData )
+    header = pickle.dumps( { 'formatVersion':BUNDLE_FORMAT_VERSION, 'sections':sectionIndex }, pickle.HIGHEST_PROTOCOL )
+
+    os.makedirs( Path( filepath ).parent, exist_ok=True )
+    tempFilepath = Path( f'{filepath}.{os.getpid()}.tmp' ) # In case another process is building it at the same time
+    with open( tempFilepath, 'wb' ) as bundleFile:
+        bundleFile.write( BUNDLE_MAGIC )
+        bundleFile.write( struct.pack( '<I', len(header) ) )
+        bundleFile.write( header )
+        for blob in blobs: bundleFile.write( blob )
+    os.replace( tempFilepath, filepath ) # So that a reader never sees a half-written bundle
+    vPrint( 'Info', debuggingThisModule, f"  Wrote {len(sectionIndex)} sections ({offset:,} data bytes) to {filepath}" )
+    if Path(filepath) == STANDARD_BUNDLE_FILEPATH: _resetStandardBundle()
+    return True
+# end of buildReferenceDataBundle
+
+
+
+def benchmarkPreload( numRuns:int=5 ) -> Dict[str,float]:
+    """
+    Times BibleOrgSysGlobals.preloadCommonData() (plus the creation of a typical BibleOrganisationalSystem)
+        in fresh Python processes, both with and without the bundle file.
+
+    Returns a dictionary with the best times (in seconds).
+    """
+    import subprocess, sys
+    timingCode = (
+        "import time; startTime=time.perf_counter()\n"
+        "from BibleOrgSys import BibleOrgSysGlobals\n"
+        "from BibleOrgSys.Reference import ReferenceDataBundle\n"
+        "if not {useBundle}: ReferenceDataBundle._standardBundle = False\n"
+        "importTime = time.perf_counter()\n"
+        "BibleOrgSysGlobals.preloadCommonData()\n"
+        "preloadTime = time.perf_counter()\n"
+        "from BibleOrgSys.Reference.BibleOrganisationalSystems import BibleOrganisationalSystem\n"
+        "BibleOrganisationalSystem( 'GENERIC-KJV-66-ENG' )\n"
+        "print( preloadTime-importTime, time.perf_counter()-preloadTime )\n" )
+    getReferenceDataSection( 'BibleBooksCodes' ) # Builds the bundle (if necessary) before we start timing
+    results = {}
+    for useBundle in (False, True):
+        preloadTimes, orgSysTimes = [], []
+        for _n in range( numRuns ):
+            output = subprocess.run( [sys.executable, '-c', timingCode.format( useBundle=useBundle )],
+                                    cwd=BibleOrgSysGlobals.BOS_LIBRARY_BASE_FOLDERPATH,
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True ).stdout
+            preloadTime, orgSysTime = ( float(field) for field in output.split() )
+            preloadTimes.append( preloadTime ); orgSysTimes.append( orgSysTime )
+        results[f"{'bundle' if useBundle else 'separateFiles'}_preloadCommonData"] = min( preloadTimes )
+        results[f"{'bundle' if useBundle else 'separateFiles'}_BibleOrganisationalSystem"] = min( orgSysTimes )
+    return results
+# end of benchmarkPreload
+
+
+
+def briefDemo() -> None:
+    """
+    Brief demo to check module is working -- must be fast
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    getReferenceDataSection( 'BibleBooksCodes' ) # Builds the bundle if necessary
+    bundle = ReferenceDataBundle()
+    vPrint( 'Quiet', debuggingThisModule, bundle ) # Just print a summary
+    BBCDicts = bundle.getSection( 'BibleBooksCodes' )
+    vPrint( 'Quiet', debuggingThisModule, f"  BibleBooksCodes has {len(BBCDicts['referenceAbbreviationDict'])} codes" )
+    vPrint( 'Quiet', debuggingThisModule, f"  {bundle.getSection( 'BibleVersificationSystems' )!r}" )
+# end of ReferenceDataBundle.briefDemo
+
+def fullDemo() -> None:
+    """
+    Full demo to check module is working
+    """
+    BibleOrgSysGlobals.introduceProgram( __name__, programNameVersion, LAST_MODIFIED_DATE )
+
+    if BibleOrgSysGlobals.commandLineArguments.export:
+        buildReferenceDataBundle()
+    else: getReferenceDataSection( 'BibleBooksCodes' ) # Builds the bundle if necessary
+
+    bundle = ReferenceDataBundle()
+    vPrint( 'Quiet', debuggingThisModule, bundle ) # Just print a summary
+    for sectionName in bundle.getSectionNames():
+        vPrint( 'Quiet', debuggingThisModule, f"  {sectionName}: current={bundle.isSectionCurrent( sectionName )}" )
+
+    vPrint( 'Quiet', debuggingThisModule, "\nTiming preloadCommonData() in fresh processes…" )
+    for name,seconds in benchmarkPreload().items():
+        vPrint( 'Quiet', debuggingThisModule, f"  {name}: {seconds*1000:.1f} milliseconds" )
+# end of ReferenceDataBundle.fullDemo
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( SHORT_PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    fullDemo()
+
+    BibleOrgSysGlobals.closedown( PROGRAM_NAME, PROGRAM_VERSION )
+# end of ReferenceDataBundle.py
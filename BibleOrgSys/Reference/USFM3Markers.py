@@ -35,6 +35,7 @@ Contains the singleton class: USFM3Markers
 from gettext import gettext as _
 from typing import List, Optional
 import os
+import re
 import logging
 
 if __name__ == '__main__':
@@ -45,17 +46,26 @@ if __name__ == '__main__':
 from BibleOrgSys.Misc.singleton import singleton
 from BibleOrgSys import BibleOrgSysGlobals
 from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.ReferenceDataBundle import getReferenceDataSection
 
 
-LAST_MODIFIED_DATE = '2021-01-10' # by RJH
+LAST_MODIFIED_DATE = '2021-01-26' # by RJH
 SHORT_PROGRAM_NAME = "USFM3Markers"
 PROGRAM_NAME = "USFM3 Markers handler"
-PROGRAM_VERSION = '0.10'
+PROGRAM_VERSION = '0.11'
 programNameVersion = f'{SHORT_PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 debuggingThisModule = False
 
 
+# Bit flags used in USFM3Markers.markerFlags
+USFM_MARKER_FLAG_NEWLINE, USFM_MARKER_FLAG_INTERNAL, USFM_MARKER_FLAG_NOTE, USFM_MARKER_FLAG_DEPRECATED, \
+    USFM_MARKER_FLAG_COMPULSORY, USFM_MARKER_FLAG_NUMBERABLE, USFM_MARKER_FLAG_NESTING, USFM_MARKER_FLAG_PRINTED \
+        = 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80
+CLOSURE_TYPE_CODES = { 'No':'N', 'Always':'A', 'Optional':'O', 'Self':'S' }
+CONTENT_TYPE_CODES = { 'Never':'N', 'Always':'A', 'Sometimes':'S' }
+
+
 # STATIC USFM TABLES
 OFTEN_IGNORED_USFM_HEADER_MARKERS = ( 'id','usfm','ide', 'sts','h', 'toc1','toc2','toc3', 'cl¤', 'rem' )
 # NOTE: the following sets include unnumbered markers, e.g., q, as well as q1
@@ -294,6 +304,13 @@ class USFM3Markers:
         """ Loads the XML data file and imports it to dictionary format (if not done already). """
         if not self.__DataDict: # We need to load them once -- don't do this unnecessarily
             if XMLFileOrFilepath is None:
+                # See if we can load from the combined reference data bundle (fastest)
+                bundleData = getReferenceDataSection( 'USFM3Markers' )
+                if bundleData is not None:
+                    vPrint( 'Info', debuggingThisModule, "Using USFM3Markers from the reference data bundle" )
+                    self.__DataDict = bundleData
+                    self.__compileLookupTables()
+                    return self # So this command can be chained after the object creation
                 # See if we can load from the pickle file (faster than loading from the XML)
                 standardXMLFileOrFilepath = BibleOrgSysGlobals.BOS_DATAFILES_FOLDERPATH.joinpath( 'USFM3Markers.xml' )
                 standardPickleFilepath = BibleOrgSysGlobals.BOS_DERIVED_DATAFILES_FOLDERPATH.joinpath( "USFM3Markers_Tables.pickle" )
@@ -310,6 +327,7 @@ class USFM3Markers:
                     vPrint( 'Info', debuggingThisModule, _("Loading pickle file {}…").format( standardPickleFilepath ) )
                     with open( standardPickleFilepath, 'rb') as pickleFile:
                         self.__DataDict = pickle.load( pickleFile ) # The protocol version used is detected automatically, so we do not have to specify it
+                    self.__compileLookupTables()
                     return self # So this command can be chained after the object creation
                 elif debuggingThisModule:
                     vPrint( 'Quiet', debuggingThisModule, "USFM3Markers pickle file can't be loaded!" )
@@ -319,10 +337,73 @@ class USFM3Markers:
             umc = USFM3MarkersConverter()
             umc.loadAndValidate( XMLFileOrFilepath ) # Load the XML (if not done already)
             self.__DataDict = umc.importDataToPython() # Get the various dictionaries organised for quick lookup
+            self.__compileLookupTables()
         return self # So this command can be chained after the object creation
     # end of USFM3Markers.loadData
 
 
+    def __compileLookupTables( self ) -> None:
+        """
+        Precomputes flat lookup tables from the nested data dictionaries
+            so that the frequently called functions (e.g., isNewlineMarker, getMarkerClosureType)
+            don't have to go through toRawMarker and then search lists.
+
+        Sets the following (public, read-only) attributes:
+            markerFlags: dict of marker -> USFM_MARKER_FLAG_xxx bits
+            newlineMarkerSet, internalMarkerSet, noteMarkerSet, deprecatedMarkerSet, characterMarkerSet: frozensets
+            closureTypes, contentTypes: dicts of marker -> single character code
+            standardMarkers: dict of marker -> standard marker (e.g., q->q1)
+            internalSFMsToRemove: tuple of backslash markers (longest first)
+            internalSFMsRemovalRegex: compiled regex matching any of the above
+        """
+        fnPrint( debuggingThisModule, "USFM3Markers.__compileLookupTables()" )
+        combinedMarkerDict, rawMarkerDict = self.__DataDict['combinedMarkerDict'], self.__DataDict['rawMarkerDict']
+        newlineMarkers, internalMarkers, noteMarkers = set( self.__DataDict['combinedNewlineMarkersList'] ), \
+                                    set( self.__DataDict['internalMarkersList'] ), set( self.__DataDict['noteMarkersList'] )
+        self.deprecatedMarkerSet = frozenset( self.__DataDict['deprecatedMarkersList'] )
+
+        self.markerFlags, self.closureTypes, self.contentTypes = {}, {}, {}
+        for marker, rawMarker in combinedMarkerDict.items():
+            rawMarkerEntry = rawMarkerDict[rawMarker]
+            flags = 0
+            if rawMarker in newlineMarkers: flags |= USFM_MARKER_FLAG_NEWLINE
+            if rawMarker in internalMarkers: flags |= USFM_MARKER_FLAG_INTERNAL
+            if rawMarker in noteMarkers: flags |= USFM_MARKER_FLAG_NOTE
+            if marker in self.deprecatedMarkerSet: flags |= USFM_MARKER_FLAG_DEPRECATED
+            if rawMarkerEntry['compulsoryFlag']: flags |= USFM_MARKER_FLAG_COMPULSORY
+            if rawMarkerEntry['highestNumberSuffix'] != 'None': flags |= USFM_MARKER_FLAG_NUMBERABLE
+            if rawMarkerEntry['nestsFlag']: flags |= USFM_MARKER_FLAG_NESTING
+            if rawMarkerEntry['printedFlag']: flags |= USFM_MARKER_FLAG_PRINTED
+            self.markerFlags[marker] = flags
+            # NOTE: Unknown closure/content values are left out so that the get functions still raise KeyError
+            if rawMarkerEntry['closed'] in CLOSURE_TYPE_CODES: self.closureTypes[marker] = CLOSURE_TYPE_CODES[rawMarkerEntry['closed']]
+            if rawMarkerEntry['hasContent'] in CONTENT_TYPE_CODES: self.contentTypes[marker] = CONTENT_TYPE_CODES[rawMarkerEntry['hasContent']]
+        self.newlineMarkerSet = frozenset( m for m,flags in self.markerFlags.items() if flags & USFM_MARKER_FLAG_NEWLINE )
+        self.internalMarkerSet = frozenset( m for m,flags in self.markerFlags.items() if flags & USFM_MARKER_FLAG_INTERNAL )
+        self.noteMarkerSet = frozenset( m for m,flags in self.markerFlags.items() if flags & USFM_MARKER_FLAG_NOTE )
+        self.characterMarkerSet = frozenset( self.getCharacterMarkersList( expandNumberableMarkers=True ) )
+
+        self.standardMarkers = dict( self.__DataDict['conversionDict'] )
+        for marker in combinedMarkerDict:
+            if marker not in self.standardMarkers: self.standardMarkers[marker] = marker
+
+        self.internalSFMsToRemove = tuple( sorted( self.getCharacterMarkersList( includeBackslash=True, includeNestedMarkers=True, includeEndMarkers=True ),
+                                                    key=len, reverse=True ) ) # Longest first
+        self.internalSFMsRemovalRegex = re.compile( '|'.join( re.escape(SFM) for SFM in self.internalSFMsToRemove ) )
+    # end of USFM3Markers.__compileLookupTables
+
+
+    def removeInternalSFMs( self, text:str ) -> str:
+        """
+        Removes all internal (character) backslash markers (including nested and end markers) from the text.
+
+        Does the same as replacing each of internalSFMsToRemove (longest first) with nothing,
+            but in a single pass.
+        """
+        return self.internalSFMsRemovalRegex.sub( '', text ) if '\\' in text else text
+    # end of USFM3Markers.removeInternalSFMs
+
+
     def __str__( self ) -> str:
         """
         This method returns the string representation of the USFM markers object.
@@ -364,66 +445,56 @@ class USFM3Markers:
 
     def isNewlineMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.toRawMarker(marker) in self.__DataDict['combinedNewlineMarkersList']
+        return marker in self.newlineMarkerSet
 
 
     def isInternalMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.toRawMarker(marker) in self.__DataDict["internalMarkersList"]
+        return marker in self.internalMarkerSet
 
 
     def isNoteMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.toRawMarker(marker) in self.__DataDict["noteMarkersList"]
+        return marker in self.noteMarkerSet
 
 
     def isDeprecatedMarker( self, marker ):
         """ Return True or False. """
-        return marker in self.__DataDict["deprecatedMarkersList"]
+        return marker in self.deprecatedMarkerSet
 
 
     def isCompulsoryMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['compulsoryFlag']
+        return bool( self.markerFlags.get( marker, 0 ) & USFM_MARKER_FLAG_COMPULSORY )
 
 
     def isNumberableMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['highestNumberSuffix'] != 'None'
+        return bool( self.markerFlags.get( marker, 0 ) & USFM_MARKER_FLAG_NUMBERABLE )
 
 
     def isNestingMarker( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['nestsFlag']
+        return bool( self.markerFlags.get( marker, 0 ) & USFM_MARKER_FLAG_NESTING )
 
 
     def isPrinted( self, marker ):
         """ Return True or False. """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        return self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['printedFlag']
+        return bool( self.markerFlags.get( marker, 0 ) & USFM_MARKER_FLAG_PRINTED )
 
 
     def getMarkerClosureType( self, marker ):
         """
         Return 'N', 'O', 'A', 'S' for "never", "optional", "always", "self".
 
-        Raises KeyError for an invalid marker.
+        Returns False for an invalid marker.
+        Raises KeyError for an invalid closure type in the data tables.
         """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        closed = self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['closed']
-        #if closed is None: return 'N'
-        if closed == "No": return 'N'
-        if closed == "Always": return 'A'
-        if closed == "Optional": return 'O'
-        if closed == "Self": return 'S'
-        vPrint( 'Quiet', debuggingThisModule, 'msbc {}'.format( closed ))
-        raise KeyError # Should be something better here
+        try: return self.closureTypes[marker]
+        except KeyError:
+            if marker not in self.markerFlags: return False
+            vPrint( 'Quiet', debuggingThisModule, 'msbc {}'.format( self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['closed'] ) )
+            raise # Should be something better here
     # end of USFM3Markers.getMarkerClosureType
 
 
@@ -431,16 +502,14 @@ class USFM3Markers:
         """
         Return "N", "S", "A" for "never", "sometimes", "always".
 
-        Raises KeyError for an invalid marker.
+        Returns False for an invalid marker.
+        Raises KeyError for an invalid content type in the data tables.
         """
-        if marker not in self.__DataDict['combinedMarkerDict']: return False
-        hasContent = self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]["hasContent"]
-        #if hasContent is None: return "N"
-        if hasContent == "Never": return "N"
-        if hasContent == "Always": return "A"
-        if hasContent == "Sometimes": return "S"
-        vPrint( 'Quiet', debuggingThisModule, 'mshc {}'.format( hasContent ))
-        raise KeyError # Should be something better here
+        try: return self.contentTypes[marker]
+        except KeyError:
+            if marker not in self.markerFlags: return False
+            vPrint( 'Quiet', debuggingThisModule, 'mshc {}'.format( self.__DataDict['rawMarkerDict'][self.toRawMarker(marker)]['hasContent'] ) )
+            raise # Should be something better here
     # end of USFM3Markers.getMarkerContentType
 
 
@@ -451,11 +520,7 @@ class USFM3Markers:
 
     def toStandardMarker( self, marker ):
         """ Returns a standard marker, i.e., s->s1, q->q1, etc. """
-        if marker in self.__DataDict['conversionDict']: return self.__DataDict['conversionDict'][marker]
-        #else
-        if marker in self.__DataDict['combinedMarkerDict']: return marker
-        #else must be something wrong
-        raise KeyError
+        return self.standardMarkers[marker] # Raises KeyError if something wrong
     # end of USFM3Markers.toStandardMarker
 
 
@@ -758,6 +823,45 @@ class USFM3Markers:
 
 
 
+def benchmarkMarkerLookups( numLoops:int=200 ) -> dict:
+    """
+    Times the precompiled lookup tables against the previous (toRawMarker then list search) method
+        for all known markers, and the single-pass internal SFM removal against sequential str.replace.
+
+    Returns a dictionary with the times (in seconds).
+    """
+    import timeit
+    um = BibleOrgSysGlobals.loadedUSFMMarkers if BibleOrgSysGlobals.loadedUSFMMarkers is not None \
+            else USFM3Markers().loadData()
+    dataDict = um._USFM3Markers__DataDict
+    markers = list( dataDict['combinedMarkerDict'] ) + ['xyz', 'v~', '']
+    def oldLookups():
+        for marker in markers:
+            if marker not in dataDict['combinedMarkerDict']: continue
+            rawMarker = dataDict['combinedMarkerDict'][marker]
+            rawMarker in dataDict['combinedNewlineMarkersList']
+            rawMarker in dataDict['internalMarkersList']
+            rawMarker in dataDict['noteMarkersList']
+            dataDict['rawMarkerDict'][rawMarker]['closed']
+    def newLookups():
+        for marker in markers:
+            marker in um.newlineMarkerSet
+            marker in um.internalMarkerSet
+            marker in um.noteMarkerSet
+            um.closureTypes.get( marker )
+    words = "In \\wj the\\wj* \\add beginning\\add* \\+nd God\\+nd* created \\w heaven|strong=\"H8064\"\\w*".split() * 20
+    def oldRemoval():
+        for word in words:
+            for internalMarker in um.internalSFMsToRemove: word = word.replace( internalMarker, '' )
+    def newRemoval():
+        for word in words: um.removeInternalSFMs( word )
+    return { name:timeit.timeit( function, number=numLoops )
+                for name,function in (('oldLookups',oldLookups), ('newLookups',newLookups),
+                                        ('oldRemoval',oldRemoval), ('newRemoval',newRemoval)) }
+# end of benchmarkMarkerLookups
+
+
+
 def briefDemo() -> None:
     """
     Demonstration program to handle command line parameters and then run what they want.
@@ -900,6 +1004,8 @@ def fullDemo() -> None:
     vPrint( 'Quiet', debuggingThisModule, "\nFor text: {!r}".format( text ) )
     replacements = ( (('add',),'<span>','</span>'), (('wj',),'<i>','</i>'), )
     vPrint( 'Quiet', debuggingThisModule, "  replace = {!r}".format( replaceUSFMCharacterFields( replacements, text ) ) )
+
+    vPrint( 'Quiet', debuggingThisModule, "\nMarker lookup timings: {}".format( benchmarkMarkerLookups() ) )
 # end of USFM3Markers.fullDemo
 
 if __name__ == '__main__':
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# BibleWriterTests.py
+#
+# Module testing BibleWriter.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing BibleWriter.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Bible writer tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import re
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Formats.USFMBible import USFMBible
+
+
+testFolderpath = os.path.join( os.path.dirname( __file__ ), 'DataFilesForTests/USFMTest1/' )
+
+
+def getTextContent( filepath ) -> str:
+    """
+    Returns the text of the XML or HTML file with the markup removed
+        and each run of whitespace reduced to a single space.
+    """
+    with open( filepath, 'rt', encoding='utf-8' ) as myFile: fileText = myFile.read()
+    return re.sub( r'\s+', ' ', re.sub( r'<[^>]*>', '', fileText ) ).strip()
+# end of getTextContent
+
+
+class BibleWriterTests( unittest.TestCase ):
+    """ Unit tests for the BibleWriter exports. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        cls.Bible = USFMBible( testFolderpath )
+        cls.Bible.loadBooks()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def checkMachineMode( self, functionName, filename ):
+        """
+        Export in both modes and check that only the whitespace differs
+            (i.e., that machine mode doesn't join any words together).
+        """
+        textContents = []
+        for humanReadable in (True, False):
+            outputFolderpath = os.path.join( self.tempFolder.name, f'{functionName}{humanReadable}/' )
+            getattr( self.Bible, functionName )( outputFolderpath, humanReadable=humanReadable )
+            filepath = os.path.join( outputFolderpath, filename )
+            self.assertTrue( os.path.isfile( filepath ) )
+            textContents.append( getTextContent( filepath ) )
+        self.assertGreater( len(textContents[0]), 50 )
+        self.assertEqual( textContents[1], textContents[0] )
+
+    def test_1010_USFXMachineMode( self ):
+        """ Test that machine mode USFX has the same text as the human readable version. """
+        self.checkMachineMode( 'toUSFXXML', 'Unknown_USFX_Bible.xml' )
+    # end of test_1010_USFXMachineMode
+
+    def test_1020_OSISMachineMode( self ):
+        """ Test that machine mode OSIS has the same text as the human readable version. """
+        self.checkMachineMode( 'toOSISXML', 'Unknown_OSIS_Bible.xml' )
+    # end of test_1020_OSISMachineMode
+
+    def test_1030_HTML5MachineMode( self ):
+        """ Test that machine mode HTML5 has the same text as the human readable version. """
+        self.checkMachineMode( 'toHTML5', 'Website/Unknown_GEN.html' )
+    # end of test_1030_HTML5MachineMode
+
+    def test_1040_abandonedArchive( self ):
+        """ Test that no incomplete archive is left if an export fails. """
+        self.assertTrue( self.Bible.toMarkdown( self.tempFolder.name ) )
+        self.assertTrue( os.path.isfile( os.path.join( self.tempFolder.name, 'AllMarkdownFiles.zip' ) ) )
+        brokenBible = USFMBible( testFolderpath )
+        brokenBible.loadBooks()
+        brokenBible.books['EXO']._processedLines = None
+        outputFolderpath = os.path.join( self.tempFolder.name, 'Broken/' )
+        with self.assertRaises( TypeError ):
+            brokenBible.toMarkdown( outputFolderpath )
+        self.assertTrue( os.path.isfile( os.path.join( outputFolderpath, 'BOS-BibleWriter-GEN.md' ) ) )
+        self.assertFalse( os.path.exists( os.path.join( outputFolderpath, 'AllMarkdownFiles.zip' ) ) )
+    # end of test_1040_abandonedArchive
+
+    def test_1050_TeXClassFiles( self ):
+        """ Test that the TeX class files (including the generic one used by the .tex files) are copied. """
+        self.Bible.toTeX( self.tempFolder.name )
+        with open( os.path.join( self.tempFolder.name, 'All-BOS-BibleWriter.tex' ), 'rt', encoding='utf-8' ) as texFile:
+            self.assertIn( '{Bible}', texFile.read() )
+        for filename in ( 'Bible.cls', 'Bible1.cls', 'Bible2.cls' ):
+            self.assertTrue( os.path.isfile( os.path.join( self.tempFolder.name, filename ) ) )
+    # end of test_1050_TeXClassFiles
+# end of BibleWriterTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of BibleWriterTests.py
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# CompareBiblesTests.py
+#
+# Module testing CompareBibles.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing CompareBibles.py.
+
+The multiprocessing results are checked against the single process results.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Compare Bibles tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import pickle
+import tempfile
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Formats.USFMBible import USFMBible
+from BibleOrgSys.Misc import CompareBibles
+
+
+class CompareBiblesTests( unittest.TestCase ):
+    """ Unit tests for the CompareBibles functions. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        # Compare a Bible against another copy of itself so that the book contents match
+        cls.Bible1 = USFMBible( BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest2/' ), givenName='Test One', givenAbbreviation='T1' )
+        cls.Bible2 = USFMBible( BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest2/' ), givenName='Test Two', givenAbbreviation='T2' )
+        for Bible in (cls.Bible1, cls.Bible2):
+            Bible.preload()
+            for BBB in ('GEN','MAT','JDE','REV'): Bible.loadBook( BBB )
+
+    def setUp( self ):
+        self.savedMaxProcesses = BibleOrgSysGlobals.maxProcesses
+
+    def tearDown( self ):
+        BibleOrgSysGlobals.maxProcesses = self.savedMaxProcesses
+
+    def test_1010_compareBibles( self ):
+        """ Test that multiprocessing gives the same results (in the same order) with the same options. """
+        options = { 'illegalCompleteLineStrings1':('Sikan',) }
+        BibleOrgSysGlobals.maxProcesses = 1
+        results1, resultsWithOptions1 = CompareBibles.compareBibles( self.Bible1, self.Bible2 ), \
+                                        CompareBibles.compareBibles( self.Bible1, self.Bible2, **options )
+        self.assertEqual( list( results1 ), ['GEN','MAT','JDE','REV'] )
+        self.assertNotEqual( results1, resultsWithOptions1 )
+        BibleOrgSysGlobals.maxProcesses = 2
+        results2, resultsWithOptions2 = CompareBibles.compareBibles( self.Bible1, self.Bible2 ), \
+                                        CompareBibles.compareBibles( self.Bible1, self.Bible2, **options )
+        self.assertEqual( list( results2 ), ['GEN','MAT','JDE','REV'] )
+        self.assertEqual( results1, results2 )
+        self.assertEqual( resultsWithOptions1, resultsWithOptions2 )
+    # end of test_1010_compareBibles
+
+    def test_1020_detachedBooks( self ):
+        """ Test the worker function with books sent by themselves (as when the processes aren't forked). """
+        book1, book2 = CompareBibles._detachBook( self.Bible1['GEN'] ), CompareBibles._detachBook( self.Bible2['GEN'] )
+        self.assertIsNone( book1.containerBibleObject )
+        self.assertIs( self.Bible1['GEN'].containerBibleObject, self.Bible1 ) # The original isn't changed
+        self.assertLess( len( pickle.dumps( book1 ) ), len( pickle.dumps( self.Bible1['GEN'] ) ) )
+        CompareBibles._initCompareWorker( CompareBibles.compareBooksPedantic, {'compareDigits':''}, None )
+        self.assertEqual( CompareBibles._doCompare( ('GEN',pickle.loads( pickle.dumps( book1 ) ),book2) ),
+                ('GEN',CompareBibles.compareBooksPedantic( self.Bible1['GEN'], self.Bible2['GEN'], compareDigits='' )) )
+    # end of test_1020_detachedBooks
+
+    def test_1030_segmentAligner( self ):
+        """ Test that the aligner gives the same results as segmentizeBooks and analyzeWords. """
+        dict12 = { 'Sikan naa':['So','Therefore'], 'Manama':['God','God'], 'ka':['the'], 'naa':['now'], }
+        dict21 = { 'te':['of'], 'wey':['and','wey'], }
+        aligner = CompareBibles.SegmentAligner( dict12, dict21 )
+        for BBB in ('GEN','MAT','JDE','REV'):
+            segmentList, abResults = CompareBibles.segmentizeBooks( self.Bible1[BBB], self.Bible2[BBB] )
+            awResults = CompareBibles.analyzeWords( segmentList, dict12, dict21 )
+            self.assertTrue( awResults )
+            self.assertEqual( aligner.analyzeBooks( self.Bible1[BBB], self.Bible2[BBB] )[:3], (segmentList,abResults,awResults) )
+            self.assertEqual( aligner.analyzeBooks( self.Bible1[BBB], self.Bible2[BBB] )[3], {} ) # Nothing new the second time
+        self.assertEqual( CompareBibles.normalizeSegmentWord( '“Manama,’' ), 'Manama' )
+        self.assertEqual( CompareBibles.normalizeSegmentWord( '3:16,' ), '' )
+    # end of test_1030_segmentAligner
+
+    def test_1040_segmentAlignerCache( self ):
+        """ Test reusing the line results in another session (and with multiprocessing). """
+        BibleOrgSysGlobals.maxProcesses = 2
+        aligner1 = CompareBibles.SegmentAligner( { 'Manama':['God'] } )
+        results1 = aligner1.analyzeBibles( self.Bible1, self.Bible2 )
+        self.assertEqual( list( results1 ), ['GEN','MAT','JDE','REV'] )
+        self.assertGreater( len(aligner1.lineResults), 1000 ) # Returned from the other processes
+        with tempfile.TemporaryDirectory() as cacheFolderpath:
+            self.assertTrue( aligner1.saveLineResults( 'Aligner.pickle', cacheFolderpath ) )
+            aligner2 = CompareBibles.SegmentAligner( { 'Manama':['God'] } )
+            self.assertEqual( aligner2.loadLineResults( 'Aligner.pickle', cacheFolderpath ), len(aligner1.lineResults) )
+            self.assertEqual( CompareBibles.SegmentAligner( { 'Manama':['Lord'] } ).loadLineResults( 'Aligner.pickle', cacheFolderpath ), 0 )
+        BibleOrgSysGlobals.maxProcesses = 1
+        self.assertEqual( aligner2.analyzeBooks( self.Bible1['MAT'], self.Bible2['MAT'] )[3], {} ) # All from the saved results
+        self.assertEqual( aligner2.analyzeBibles( self.Bible1, self.Bible2 ), results1 )
+    # end of test_1040_segmentAlignerCache
+# end of CompareBiblesTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of CompareBiblesTests.py
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ExternalJobRunnerTests.py
+#
+# Module testing ExternalJobRunner.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing ExternalJobRunner.py.
+
+The jobs run a little stub program (written by the tests)
+    so that TeX and LibreOffice don't need to be installed.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "External Job Runner tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+import time
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput import ExternalJobRunner
+
+
+# The stub copies its input file to an output file, and can also sleep and/or fail
+STUB_PROGRAM = """import sys, time
+inputFilename, sleepSeconds, returnCode = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+time.sleep( sleepSeconds )
+with open( inputFilename ) as inputFile: text = inputFile.read()
+with open( inputFilename.replace( '.tex', '.pdf' ), 'wt' ) as outputFile: outputFile.write( text.upper() )
+print( 'Processed', inputFilename )
+if returnCode: print( 'Oops', file=sys.stderr )
+sys.exit( returnCode )
+"""
+
+
+class ExternalJobRunnerTests( unittest.TestCase ):
+    """ Unit tests for the job runners. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.folderpath = self.tempFolder.name
+        self.stubFilepath = os.path.join( self.folderpath, 'stub.py' )
+        with open( self.stubFilepath, 'wt' ) as stubFile: stubFile.write( STUB_PROGRAM )
+        self.inputFilepath = os.path.join( self.folderpath, 'GEN.tex' )
+        with open( self.inputFilepath, 'wt' ) as inputFile: inputFile.write( 'In the beginning' )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def addStubJob( self, runner, jobName:str, sleepSeconds:float, returnCode:int=0, timeoutSeconds=None ):
+        runner.addJob( jobName, [sys.executable, self.stubFilepath, 'GEN.tex', str(sleepSeconds), str(returnCode)],
+                        inputFileDict={'GEN.tex':self.inputFilepath},
+                        outputFileDict={'GEN.pdf':os.path.join( self.folderpath, jobName+'.pdf' )},
+                        timeoutSeconds=timeoutSeconds )
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        with ExternalJobRunner.ExternalJobRunner( maxJobs=2 ) as runner:
+            result = str( runner )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    def test_1020_concurrentJobs( self ):
+        """ Test that the jobs run at the same time, each in its own folder. """
+        startTime = time.monotonic()
+        with ExternalJobRunner.ExternalJobRunner( maxJobs=4 ) as runner:
+            for n in range( 4 ): self.addStubJob( runner, f'Job{n}', 1.5 )
+        self.assertLess( time.monotonic() - startTime, 4.5 ) # Would be at least 6s one at a time
+        self.assertEqual( [result['name'] for result in runner.results], ['Job0','Job1','Job2','Job3'] )
+        self.assertEqual( runner.getFailures(), [] )
+        for n, result in enumerate( runner.results ):
+            self.assertEqual( result['returnCode'], 0 )
+            self.assertEqual( result['stdout'], 'Processed GEN.tex\n' )
+            self.assertEqual( result['outputs'], [os.path.join( self.folderpath, f'Job{n}.pdf' )] )
+            with open( result['outputs'][0] ) as outputFile: self.assertEqual( outputFile.read(), 'IN THE BEGINNING' )
+        self.assertFalse( os.path.exists( os.path.join( self.folderpath, 'GEN.pdf' ) ) )
+    # end of test_1020_concurrentJobs
+
+    def test_1030_failures( self ):
+        """ Test collecting timeouts and errors. """
+        with ExternalJobRunner.ExternalJobRunner( maxJobs=2, defaultTimeoutSeconds=30 ) as runner:
+            self.addStubJob( runner, 'Slow', 60, timeoutSeconds=1 )
+            self.addStubJob( runner, 'Bad', 0, returnCode=3 )
+            runner.addJob( 'Missing', [os.path.join( self.folderpath, 'NoSuchProgram' )] )
+            self.addStubJob( runner, 'Good', 0 )
+        slowResult, badResult, missingResult, goodResult = runner.results
+        self.assertTrue( slowResult['timedOut'] )
+        self.assertLess( slowResult['seconds'], 30 )
+        self.assertEqual( slowResult['outputs'], [] )
+        self.assertEqual( badResult['returnCode'], 3 )
+        self.assertEqual( badResult['stderr'], 'Oops\n' )
+        self.assertEqual( len(badResult['outputs']), 1 ) # We still get the output
+        self.assertIsNone( missingResult['returnCode'] )
+        self.assertTrue( missingResult['error'] )
+        self.assertEqual( runner.getFailures(), [slowResult, badResult, missingResult] )
+        self.assertEqual( goodResult['returnCode'], 0 )
+    # end of test_1030_failures
+
+    @unittest.skipIf( ExternalJobRunner.uno, "LibreOffice is installed" )
+    def test_1040_officeWithoutLibreOffice( self ):
+        """ Test that office jobs fail cleanly if LibreOffice can't be started. """
+        def neverCalled( frameDesktop, BBB ): raise AssertionError( "Shouldn't be called" )
+        with ExternalJobRunner.OfficeJobRunner( maxJobs=2 ) as runner:
+            runner.addJob( 'GEN', neverCalled, 'GEN' )
+            runner.addJob( 'EXO', neverCalled, 'EXO' )
+        self.assertEqual( len(runner.getFailures()), 2 )
+        self.assertIn( 'ImportError', runner.results[0]['error'] )
+        self.assertFalse( any( connection.isRunning() for connection in runner.connections ) )
+    # end of test_1040_officeWithoutLibreOffice
+
+    def test_1050_iterResults( self ):
+        """ Test that each result is available (in order) as soon as its job finishes. """
+        startTime = time.monotonic()
+        with ExternalJobRunner.ExternalJobRunner( maxJobs=2 ) as runner:
+            self.addStubJob( runner, 'Quick', 0 )
+            self.addStubJob( runner, 'Slow', 3 )
+            resultTimes = [(result['name'], time.monotonic()-startTime) for result in runner.iterResults()]
+        self.assertEqual( [name for name,_seconds in resultTimes], ['Quick','Slow'] )
+        self.assertLess( resultTimes[0][1], 2.5 ) # Didn't wait for the slow one
+        self.assertGreaterEqual( resultTimes[1][1], 3 )
+        self.assertEqual( [result['name'] for result in runner.results], ['Quick','Slow'] )
+    # end of test_1050_iterResults
+# end of ExternalJobRunnerTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of ExternalJobRunnerTests.py
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# FilePrefetcherTests.py
+#
+# Module testing FilePrefetcher.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing FilePrefetcher.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "File prefetcher tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput.FilePrefetcher import FilePrefetcher
+
+
+NUM_FILES = 8
+FILE_LENGTH = 100
+
+
+class FilePrefetcherTests( unittest.TestCase ):
+    """ Unit tests for the FilePrefetcher class. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.filepaths, self.fileContents = [], []
+        for n in range( NUM_FILES ):
+            filepath = os.path.join( self.tempFolder.name, f'File{n}.txt' )
+            fileBytes = f'File {n}\r\n'.encode( 'utf-8' ).ljust( FILE_LENGTH, b'x' )
+            with open( filepath, 'wb' ) as binaryFile: binaryFile.write( fileBytes )
+            self.filepaths.append( filepath )
+            self.fileContents.append( fileBytes )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def deleteFiles( self, startIndex:int ) -> None:
+        """ Delete the files from startIndex on (so that any later reads fail). """
+        for filepath in self.filepaths[startIndex:]: os.remove( filepath )
+
+    def test_1010_inOrder( self ):
+        """ Test that the files are all handed back (once) when claimed in order. """
+        with FilePrefetcher( self.filepaths, maxThreads=4 ) as prefetcher:
+            self.assertEqual( len(prefetcher), NUM_FILES )
+            self.assertIn( self.filepaths[-1], prefetcher )
+            self.assertEqual( prefetcher.getBytes( self.filepaths[0] ), self.fileContents[0] )
+            self.assertEqual( prefetcher.getText( self.filepaths[1] ), self.fileContents[1].decode( 'utf-8' ).replace( '\r\n', '\n' ) )
+            with prefetcher.openBinary( self.filepaths[2] ) as binaryFile:
+                self.assertEqual( binaryFile.read(), self.fileContents[2] )
+            for n in range( 3, NUM_FILES ):
+                with prefetcher.open( self.filepaths[n] ) as textFile:
+                    self.assertEqual( textFile.readline(), f'File {n}\n' )
+            self.assertEqual( len(prefetcher), 0 )
+            self.assertIsNone( prefetcher.getBytes( self.filepaths[0] ) ) # Only handed back once
+        self.assertIn( '(closed)', str(prefetcher) )
+    # end of test_1010_inOrder
+
+    def test_1020_outOfOrder( self ):
+        """ Test that claiming a file discards the earlier ones (which are then read normally). """
+        with FilePrefetcher( self.filepaths, maxThreads=2, maxFiles=2 ) as prefetcher:
+            self.assertEqual( prefetcher.getBytes( self.filepaths[5] ), None ) # Not read yet
+            self.assertEqual( len(prefetcher), NUM_FILES-6 )
+            self.assertNotIn( self.filepaths[2], prefetcher )
+            self.assertIsNone( prefetcher.getBytes( self.filepaths[2] ) )
+            with prefetcher.openBinary( self.filepaths[2] ) as binaryFile: # Reads it normally
+                self.assertEqual( binaryFile.read(), self.fileContents[2] )
+            self.assertEqual( prefetcher.getBytes( self.filepaths[7] ), self.fileContents[7] )
+            self.assertEqual( len(prefetcher), 0 )
+    # end of test_1020_outOfOrder
+
+    def test_1030_errors( self ):
+        """ Test that files which can't be read or decoded give the usual errors. """
+        missingFilepath = os.path.join( self.tempFolder.name, 'Missing.txt' )
+        badFilepath = self.filepaths[1]
+        with open( badFilepath, 'wb' ) as binaryFile: binaryFile.write( b'\xff\xfe\xfa' )
+        with FilePrefetcher( [self.filepaths[0], missingFilepath, badFilepath, self.filepaths[2]], maxThreads=4 ) as prefetcher:
+            self.assertEqual( prefetcher.getBytes( self.filepaths[0] ), self.fileContents[0] )
+            self.assertIsNone( prefetcher.getBytes( missingFilepath ) )
+            with self.assertRaises( FileNotFoundError ):
+                prefetcher.open( missingFilepath )
+            self.assertIn( badFilepath, prefetcher )
+            with self.assertRaises( UnicodeDecodeError ):
+                with prefetcher.open( badFilepath, encoding='utf-8' ) as textFile: textFile.read()
+            self.assertEqual( prefetcher.getBytes( self.filepaths[2] ), self.fileContents[2] )
+    # end of test_1030_errors
+
+    def test_1040_fileLimit( self ):
+        """ Test that only maxFiles files are read ahead. """
+        with FilePrefetcher( self.filepaths, maxThreads=4, maxFiles=2 ) as prefetcher:
+            self.deleteFiles( 2 ) # Not started yet
+            results = [prefetcher.getBytes( filepath ) for filepath in self.filepaths]
+        self.assertEqual( results, self.fileContents[:2] + [None]*(NUM_FILES-2) )
+    # end of test_1040_fileLimit
+
+    def test_1050_byteLimit( self ):
+        """ Test that no more reads are started once the unclaimed files hold maxBytes. """
+        with FilePrefetcher( self.filepaths, maxThreads=2, maxBytes=int( 1.5*FILE_LENGTH ) ) as prefetcher:
+            self.deleteFiles( 3 ) # Only three files can be started before the first one is claimed
+            results = [prefetcher.getBytes( filepath ) for filepath in self.filepaths]
+        self.assertEqual( results, self.fileContents[:3] + [None]*(NUM_FILES-3) )
+    # end of test_1050_byteLimit
+# end of FilePrefetcherTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of FilePrefetcherTests.py
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GenericOnlineBibleTests.py
+#
+# Module testing GenericOnlineBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing GenericOnlineBible.py (the online verse cache).
+
+Uses a local HTTP server as a stand-in for an online Bible platform.
+"""
+
+LAST_MODIFIED_DATE = '2021-01-28' # by RJH
+PROGRAM_NAME = "Generic Online Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import json
+import tempfile
+import sqlite3
+import threading
+import urllib.request
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Online import GenericOnlineBible
+from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+
+
+class StandInHandler( BaseHTTPRequestHandler ):
+    """ Returns a JSON verse for any GET request (and counts them). """
+    requestCount = 0
+    def do_GET( self ):
+        StandInHandler.requestCount += 1
+        responseBytes = json.dumps( [{'verse_text':f'Text for {self.path}'}] ).encode( 'utf-8' )
+        self.send_response( 200 )
+        self.send_header( 'Content-Type', 'application/json' )
+        self.send_header( 'Content-Length', str(len(responseBytes)) )
+        self.end_headers()
+        self.wfile.write( responseBytes )
+    def log_message( self, *args ): pass # Keep quiet
+
+
+class StandInOnlineBible( GenericOnlineBible.GenericOnlineBible ):
+    """ A minimal online Bible using the stand-in server. """
+    def __init__( self, URLBase, verseCache ):
+        GenericOnlineBible.GenericOnlineBible.__init__( self )
+        self.URLBase, self.verseCache, self.verseCacheName = URLBase, verseCache, 'StandIn:TEST'
+    def getVerseDataList( self, key ):
+        cachedResult = self.getCachedVerseDataList( key )
+        if cachedResult is not None: return cachedResult
+        with urllib.request.urlopen( f'{self.URLBase}/{key.getBBB()}/{key.getChapterNumber()}/{key.getVerseNumber()}' ) as response:
+            result = [('v~',json.loads( response.read().decode( 'utf-8' ) )[0]['verse_text'])]
+        self.cacheVerse( key, result )
+        return result
+
+
+class OnlineVerseCacheTests( unittest.TestCase ):
+    """ Unit tests for the OnlineVerseCache object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.cacheFilepath = os.path.join( self.tempFolder.name, 'TestVerseCache.sqlite' )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        cache = GenericOnlineBible.OnlineVerseCache( 10, None )
+        result = str( cache )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    def test_1020_LRU( self ):
+        """ Test that the memory tier is bounded and discards the least recently used entries. """
+        cache = GenericOnlineBible.OnlineVerseCache( 3, None )
+        for V in ('1','2','3'): cache.put( 'Test', ('GEN','1',V,''), [V] )
+        self.assertEqual( cache.get( 'Test', ('GEN','1','1','') ), ['1'] ) # Now most recently used
+        cache.put( 'Test', ('GEN','1','4',''), ['4'] )
+        self.assertEqual( len(cache), 3 )
+        self.assertIsNone( cache.get( 'Test', ('GEN','1','2','') ) )
+        self.assertEqual( cache.get( 'Test', SimpleVerseKey('GEN','1','1') ), ['1'] ) # Same key either way
+        self.assertIsNone( cache.get( 'Other', ('GEN','1','1','') ) )
+        stats = cache.getStats()
+        self.assertEqual( (stats['memoryHits'],stats['misses'],stats['evictions']), (2,2,1) )
+        self.assertAlmostEqual( stats['hitRate'], 0.5 )
+    # end of test_1020_LRU
+
+    def test_1030_disk( self ):
+        """ Test that the disk tier persists and expires entries. """
+        cache = GenericOnlineBible.OnlineVerseCache( 2, self.cacheFilepath )
+        for V in ('1','2','3'): cache.put( 'Test', ('JHN','3',V,''), [V] )
+        self.assertEqual( cache.get( 'Test', ('JHN','3','1','') ), ['1'] ) # from disk
+        self.assertEqual( cache.getStats()['diskHits'], 1 )
+        cache.close()
+        cache = GenericOnlineBible.OnlineVerseCache( 2, self.cacheFilepath )
+        self.assertEqual( cache.get( 'Test', ('JHN','3','3','') ), ['3'] )
+        cache.clear( 'Test' )
+        self.assertIsNone( cache.get( 'Test', ('JHN','3','3','') ) )
+        cache.put( 'Test', ('JHN','3','16',''), ['16'] )
+        cache.close()
+        cache = GenericOnlineBible.OnlineVerseCache( 2, self.cacheFilepath, TTLSeconds=0 )
+        self.assertIsNone( cache.get( 'Test', ('JHN','3','16','') ) ) # Expired
+        cache.close()
+    # end of test_1030_disk
+
+    def test_1035_copiesAndBatches( self ):
+        """ Test that cached data can't be altered by callers and that disk writes are batched. """
+        cache = GenericOnlineBible.OnlineVerseCache( 10, self.cacheFilepath )
+        verseData = [('v~','In the beginning')]
+        cache.put( 'Test', ('GEN','1','1',''), verseData )
+        verseData.append( ('p','Changed after caching') )
+        firstResult = cache.get( 'Test', ('GEN','1','1','') )
+        self.assertEqual( firstResult, [('v~','In the beginning')] )
+        firstResult.clear()
+        self.assertEqual( cache.get( 'Test', ('GEN','1','1','') ), [('v~','In the beginning')] )
+        otherConnection = sqlite3.connect( self.cacheFilepath )
+        self.assertEqual( otherConnection.execute( 'SELECT COUNT(*) FROM verses' ).fetchone()[0], 0 ) # Not committed yet
+        for V in range( 2, GenericOnlineBible.VERSE_CACHE_COMMIT_BATCH_SIZE+1 ):
+            cache.put( 'Test', ('GEN','1',str(V),''), [V] )
+        self.assertEqual( otherConnection.execute( 'SELECT COUNT(*) FROM verses' ).fetchone()[0], GenericOnlineBible.VERSE_CACHE_COMMIT_BATCH_SIZE )
+        cache.put( 'Test', ('GEN','2','1',''), ['2:1'] )
+        cache.flush()
+        self.assertEqual( otherConnection.execute( 'SELECT COUNT(*) FROM verses' ).fetchone()[0], GenericOnlineBible.VERSE_CACHE_COMMIT_BATCH_SIZE+1 )
+        otherConnection.close()
+        cache.close()
+    # end of test_1035_copiesAndBatches
+
+    def test_1040_standInServer( self ):
+        """ Test that an online Bible only fetches each verse once. """
+        server = HTTPServer( ('127.0.0.1',0), StandInHandler )
+        serverThread = threading.Thread( target=server.serve_forever, daemon=True )
+        serverThread.start()
+        try:
+            StandInHandler.requestCount = 0
+            cache = GenericOnlineBible.OnlineVerseCache( 10, self.cacheFilepath )
+            onlineBible = StandInOnlineBible( f'http://127.0.0.1:{server.server_port}', cache )
+            for _n in range( 3 ):
+                for V in ('1','2'):
+                    result = onlineBible.getContextVerseData( SimpleVerseKey('MAT','1',V) )
+                    self.assertEqual( result, ([('v~',f'Text for /MAT/1/{V}')], []) )
+            self.assertEqual( StandInHandler.requestCount, 2 )
+            cache.close()
+            onlineBible.verseCache = GenericOnlineBible.OnlineVerseCache( 10, self.cacheFilepath ) # Next run
+            onlineBible.getVerseDataList( SimpleVerseKey('MAT','1','2') )
+            self.assertEqual( StandInHandler.requestCount, 2 )
+            onlineBible.verseCache.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+    # end of test_1040_standInServer
+# end of OnlineVerseCacheTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of GenericOnlineBibleTests.py
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# GoBibleTests.py
+#
+# Module testing GoBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing GoBible.py.
+
+The .jar file is built by the test so no sample Bible is needed.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Go Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+import struct
+import zipfile
+from unittest import mock
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Formats import GoBible
+
+
+def makeTestJar( filepath ) -> None:
+    """
+    Write a small Go Bible .jar file with two books.
+
+    Genesis has its two chapters in two different text files.
+    """
+    def makeString( text:str ) -> bytes:
+        return bytes( [len(text)] ) + text.encode( 'ascii' ) + b'\0'
+
+    mainIndexBytes = struct.pack( '<H', 2 )
+    with zipfile.ZipFile( filepath, 'w', zipfile.ZIP_DEFLATED ) as jarFile:
+        jarFile.writestr( 'META-INF/MANIFEST.MF', 'Manifest-Version: 1.0\n' )
+        jarFile.writestr( 'ui.properties', 'name=Test\n' )
+        for bookName, filenameBase, chapters in ( ('Genesis', 'Gen.sfm', [ (0, ['In the beginning God created.', 'The earth was formless.']),
+                                                                            (1, ['\x01[The garden]\x01 Thus the heavens were finished.']) ]),
+                                                  ('Exodus', 'Exo.sfm', [ (0, ['These are the names.', 'Reuben, Simeon.', 'Issachar.']) ]) ):
+            mainIndexBytes += makeString( bookName ) + makeString( filenameBase ) + struct.pack( '<HH', 1, len(chapters) )
+            bookIndexBytes, textFileBytes = b'', {}
+            for fileNumber, verses in chapters:
+                chapterBytes = ''.join( verses ).encode( 'utf-8' )
+                mainIndexBytes += struct.pack( '>I', len(chapterBytes) ) + bytes( [len(verses), fileNumber] )
+                bookIndexBytes += b''.join( struct.pack( '>H', len(verse.encode( 'utf-8' )) ) for verse in verses )
+                textFileBytes[fileNumber] = textFileBytes.get( fileNumber, b'' ) + chapterBytes
+            jarFile.writestr( f'Bible Data/{filenameBase}/Index', bookIndexBytes )
+            for fileNumber, textBytes in textFileBytes.items():
+                jarFile.writestr( f'Bible Data/{filenameBase}/{filenameBase} {fileNumber}', struct.pack( '>I', len(textBytes) ) + textBytes )
+        jarFile.writestr( 'Bible Data/Index', mainIndexBytes )
+# end of makeTestJar
+
+
+class GoBibleTests( unittest.TestCase ):
+    """ Unit tests for the GoBible object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        cls.tempFolder = tempfile.TemporaryDirectory()
+        cls.jarFilepath = os.path.join( cls.tempFolder.name, 'Test.jar' )
+        makeTestJar( cls.jarFilepath )
+        cls.fullBible = GoBible.GoBible( cls.jarFilepath )
+        cls.fullBible.preload()
+        cls.fullBible.loadBooks()
+
+    @classmethod
+    def tearDownClass( cls ):
+        cls.tempFolder.cleanup()
+
+    def getLines( self, bookObject ):
+        return [(entry.getMarker(),entry.getFullText()) for entry in bookObject._processedLines]
+
+    def test_1010_preload( self ):
+        """ Test that preloading reads the index without extracting anything. """
+        goBible = GoBible.GoBible( self.jarFilepath )
+        goBible.preload()
+        self.assertEqual( goBible.bookList, ['GEN','EXO'] )
+        self.assertEqual( goBible.books, {} )
+        self.assertEqual( os.listdir( self.tempFolder.name ), ['Test.jar'] )
+    # end of test_1010_preload
+
+    def test_1020_fullLoad( self ):
+        """ Test the loaded text. """
+        self.assertEqual( list( self.fullBible.books.keys() ), ['GEN','EXO'] )
+        self.assertTrue( self.fullBible.getVerseText( ('GEN','1','2') ).endswith( 'The earth was formless.' ) ) # after any paragraph or heading indicators
+        self.assertTrue( self.fullBible.getVerseText( ('GEN','2','1') ).endswith( 'Thus the heavens were finished.' ) )
+        self.assertTrue( self.fullBible.getVerseText( ('EXO','1','3') ).endswith( 'Issachar.' ) )
+    # end of test_1020_fullLoad
+
+    def test_1030_singleBook( self ):
+        """ Test that loading a single book gives the same result as the full load. """
+        goBible = GoBible.GoBible( self.jarFilepath )
+        goBible.loadBook( 'GEN' )
+        self.assertEqual( list( goBible.books.keys() ), ['GEN'] )
+        self.assertEqual( self.getLines( goBible.books['GEN'] ), self.getLines( self.fullBible.books['GEN'] ) )
+    # end of test_1030_singleBook
+
+    def test_1040_parallelLoad( self ):
+        """ Test that loading the remaining books in separate processes gives the same result. """
+        savedMaxProcesses = BibleOrgSysGlobals.maxProcesses
+        BibleOrgSysGlobals.maxProcesses = 2
+        try:
+            goBible = GoBible.GoBible( self.jarFilepath )
+            goBible.loadBook( 'EXO' )
+            goBible.loadBooks()
+        finally: BibleOrgSysGlobals.maxProcesses = savedMaxProcesses
+        self.assertEqual( sorted( goBible.books.keys() ), ['EXO','GEN'] )
+        for BBB in goBible.books:
+            self.assertEqual( self.getLines( goBible.books[BBB] ), self.getLines( self.fullBible.books[BBB] ) )
+    # end of test_1040_parallelLoad
+
+    def test_1050_archiveOpenedOnce( self ):
+        """ Test that loading all the books one by one only opens the .jar file once after preloading. """
+        savedMaxProcesses = BibleOrgSysGlobals.maxProcesses
+        BibleOrgSysGlobals.maxProcesses = 1
+        try:
+            goBible = GoBible.GoBible( self.jarFilepath )
+            goBible.preload()
+            with mock.patch( 'zipfile.ZipFile', wraps=zipfile.ZipFile ) as mockZipFile:
+                goBible.loadBooks()
+        finally: BibleOrgSysGlobals.maxProcesses = savedMaxProcesses
+        self.assertEqual( mockZipFile.call_count, 1 )
+        self.assertIsNone( goBible.archive )
+        for BBB in goBible.books:
+            self.assertEqual( self.getLines( goBible.books[BBB] ), self.getLines( self.fullBible.books[BBB] ) )
+    # end of test_1050_archiveOpenedOnce
+# end of GoBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of GoBibleTests.py
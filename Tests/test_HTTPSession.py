@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# HTTPSessionTests.py
+#
+# Module testing HTTPSession.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing HTTPSession.py.
+
+Uses a local HTTP server as a stand-in for the online sites.
+"""
+
+LAST_MODIFIED_DATE = '2021-01-29' # by RJH
+PROGRAM_NAME = "HTTP Session tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Online import HTTPSession
+
+
+class StandInHandler( BaseHTTPRequestHandler ):
+    """
+    Handles:
+        /book/XXX -- returns some text (with an ETag)
+        /busy -- fails with 503 the first time
+        /moved -- redirects to /book/MOV
+    """
+    protocol_version = 'HTTP/1.1' # So that connections are kept alive
+    lock = threading.Lock()
+    requestPaths = []
+    connectionCount = openConnectionCount = 0
+
+    def setup( self ):
+        BaseHTTPRequestHandler.setup( self )
+        with StandInHandler.lock:
+            StandInHandler.connectionCount += 1
+            StandInHandler.openConnectionCount += 1
+
+    def finish( self ):
+        BaseHTTPRequestHandler.finish( self )
+        with StandInHandler.lock: StandInHandler.openConnectionCount -= 1
+
+    def do_GET( self ):
+        with StandInHandler.lock:
+            StandInHandler.requestPaths.append( self.path )
+            numPrevious = StandInHandler.requestPaths.count( self.path ) - 1
+        if self.path == '/busy' and not numPrevious: return self.sendResponse( 503, b'' )
+        if self.path == '/moved': return self.sendResponse( 302, b'', {'Location':'/book/MOV'} )
+        if self.path.startswith( '/book/' ) or self.path == '/busy':
+            ETag = f'"{self.path}"'
+            if self.headers.get( 'If-None-Match' ) == ETag: return self.sendResponse( 304, b'' )
+            return self.sendResponse( 200, f'\\id {self.path[-3:]}\n'.encode( 'utf-8' ), {'ETag':ETag} )
+        self.sendResponse( 404, b'' )
+
+    def sendResponse( self, status, body, headers=None ):
+        self.send_response( status )
+        self.send_header( 'Content-Type', 'text/plain; charset=utf-8' )
+        self.send_header( 'Content-Length', str(len(body)) )
+        for name,value in (headers or {}).items(): self.send_header( name, value )
+        self.end_headers()
+        self.wfile.write( body )
+
+    def log_message( self, *args ): pass # Keep quiet
+
+
+class HTTPSessionTests( unittest.TestCase ):
+    """ Unit tests for the HTTPSession object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        cls.server = ThreadingHTTPServer( ('127.0.0.1',0), StandInHandler )
+        cls.serverThread = threading.Thread( target=cls.server.serve_forever, daemon=True )
+        cls.serverThread.start()
+        cls.URLBase = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass( cls ):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp( self ):
+        StandInHandler.requestPaths, StandInHandler.connectionCount = [], 0
+        self.session = HTTPSession.HTTPSession( backoffSeconds=0.01 )
+
+    def tearDown( self ):
+        self.session.close()
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        result = str( self.session )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    def test_1020_keepAlive( self ):
+        """ Test that the connection is reused. """
+        for BBB in ('GEN','EXO','LEV'):
+            result = self.session.get( f'{self.URLBase}/book/{BBB}' )
+            self.assertEqual( result.status, 200 )
+            self.assertEqual( result.read(), f'\\id {BBB}\n'.encode( 'utf-8' ) )
+            self.assertEqual( result.info().get_content_charset(), 'utf-8' )
+        self.assertEqual( self.session.get( f'{self.URLBase}/nothing' ).status, 404 )
+        self.assertEqual( StandInHandler.connectionCount, 1 )
+        self.assertEqual( self.session.stats['connections'], 1 )
+    # end of test_1020_keepAlive
+
+    def test_1030_conditional( self ):
+        """ Test that an unchanged resource isn't downloaded again. """
+        URL = f'{self.URLBase}/book/NUM'
+        firstResult = self.session.get( URL )
+        self.assertFalse( firstResult.notModified )
+        secondResult = self.session.get( URL )
+        self.assertTrue( secondResult.notModified )
+        self.assertEqual( (secondResult.status,secondResult.read()), (200,firstResult.read()) )
+        self.assertFalse( self.session.get( URL, conditional=False ).notModified )
+        self.assertEqual( self.session.stats['notModified'], 1 )
+    # end of test_1030_conditional
+
+    def test_1040_retryAndRedirect( self ):
+        """ Test retrying after a server error and following a redirect. """
+        result = self.session.get( f'{self.URLBase}/busy' )
+        self.assertEqual( result.status, 200 )
+        self.assertEqual( StandInHandler.requestPaths, ['/busy','/busy'] )
+        self.assertEqual( self.session.stats['retries'], 1 )
+        result = self.session.get( f'{self.URLBase}/moved' )
+        self.assertEqual( (result.status,result.URL), (200,f'{self.URLBase}/book/MOV') )
+        self.assertIsNone( self.session.get( 'http://127.0.0.1:1/nowhere' ) ) # Nothing listening
+    # end of test_1040_retryAndRedirect
+
+    def test_1050_getMany( self ):
+        """ Test fetching a list of URLs concurrently. """
+        BBBs = ('MAT','MRK','LUK','JHN','ACT','ROM')
+        URLs = [f'{self.URLBase}/book/{BBB}' for BBB in BBBs]
+        results = self.session.getMany( URLs + URLs[:2], maxThreads=3 )
+        self.assertEqual( list(results), URLs )
+        for BBB,URL in zip( BBBs, URLs ):
+            self.assertEqual( results[URL].read(), f'\\id {BBB}\n'.encode( 'utf-8' ) )
+        self.assertEqual( len(StandInHandler.requestPaths), len(BBBs) )
+        self.assertLessEqual( StandInHandler.connectionCount, 3 )
+    # end of test_1050_getMany
+
+    def test_1060_getManyAgain( self ):
+        """ Test that later calls reuse the same threads (and their connections). """
+        URLs = [f'{self.URLBase}/book/{BBB}' for BBB in ('GAL','EPH','PHP','COL','TH1','TH2')]
+        for _k in range( 4 ):
+            results = self.session.getMany( URLs, maxThreads=3, conditional=False )
+            self.assertEqual( [result.status for result in results.values()], [200]*len(URLs) )
+        self.assertEqual( len(StandInHandler.requestPaths), 4*len(URLs) )
+        self.assertLessEqual( StandInHandler.connectionCount, 3 )
+        self.session.close()
+        self.assertEqual( self.session.getMany( URLs[:2], maxThreads=3 )[URLs[1]].status, 200 )
+    # end of test_1060_getManyAgain
+
+    def test_1070_rememberedLimit( self ):
+        """ Test that the least recently used responses are forgotten. """
+        session = HTTPSession.HTTPSession( maxRememberedLength=20 ) # Room for two of our 8-byte bodies
+        with session:
+            for BBB in ('GEN','EXO','LEV'): session.get( f'{self.URLBase}/book/{BBB}' )
+            self.assertTrue( session.get( f'{self.URLBase}/book/LEV' ).notModified )
+            self.assertTrue( session.get( f'{self.URLBase}/book/EXO' ).notModified )
+            self.assertFalse( session.get( f'{self.URLBase}/book/GEN' ).notModified ) # Forgotten
+            self.assertFalse( session.get( f'{self.URLBase}/book/LEV' ).notModified ) # Forgotten to make room for GEN
+            self.assertTrue( session.get( f'{self.URLBase}/book/GEN' ).notModified )
+    # end of test_1070_rememberedLimit
+
+    def test_1080_biggerPool( self ):
+        """ Test that the connections of a replaced (smaller) pool of threads are closed. """
+        URLs = [f'{self.URLBase}/book/{BBB}' for BBB in ('TI1','TI2','TIT','PHM','HEB','JAS')]
+        self.session.getMany( URLs, maxThreads=2, conditional=False )
+        self.session.getMany( URLs, maxThreads=3, conditional=False )
+        deadline = time.monotonic() + 5
+        while StandInHandler.openConnectionCount > 3 and time.monotonic() < deadline: time.sleep( 0.05 ) # Wait for the server to notice
+        self.assertLessEqual( StandInHandler.openConnectionCount, 3 )
+        self.assertGreater( StandInHandler.connectionCount, 3 )
+    # end of test_1080_biggerPool
+# end of HTTPSessionTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of HTTPSessionTests.py
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# HebrewTests.py
+#
+# Module testing Hebrew.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing Hebrew.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Hebrew tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.OriginalLanguages import Hebrew
+
+
+DAN_1_5 = "וַיְמַן֩ לָהֶ֨ם הַמֶּ֜לֶךְ דְּבַר־י֣וֹם בְּיוֹמ֗וֹ מִפַּת־בַּ֤ג הַמֶּ֙לֶךְ֙ וּמִיֵּ֣ין מִשְׁתָּ֔יו וּֽלְגַדְּלָ֖ם שָׁנִ֣ים שָׁל֑וֹשׁ וּמִ֨קְצָתָ֔ם יַֽעַמְד֖וּ לִפְנֵ֥י הַמֶּֽלֶךְ ׃"
+
+
+class HebrewTests( unittest.TestCase ):
+    """ Unit tests for the Hebrew functions and object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def test_1010_removeHebrewMarks( self ):
+        """ Test the mark removal functions. """
+        word = "מֶֽלֶךְ־יְהוּדָ֑ה"
+        self.assertEqual( Hebrew.removeHebrewMarks( word ), "מֶֽלֶךְ־יְהוּדָה" )
+        self.assertEqual( Hebrew.removeHebrewMarks( word, removeMetegOrSiluq=True ), "מֶֽלֶךְ־יְהוּדָה" ) # It's a vowel meteg
+        self.assertEqual( Hebrew.removeHebrewMarks( word, removeCantillation=False, removeVowels=True, removeMetegOrSiluq=True ), "מלך־יהוּד֑ה" )
+        self.assertEqual( Hebrew.removeHebrewMarks( word, True, True, True ), "מלך־יהודה" )
+        self.assertEqual( Hebrew.removeMetegOrSiluqMarks( "אֽֽ", asVowel=False ), "א" )
+        for removeMetegOrSiluq in (False, True):
+            h = Hebrew.Hebrew( DAN_1_5 )
+            h.removeCantillationMarks( removeMetegOrSiluq=removeMetegOrSiluq )
+            h.removeVowelPointing( removeMetegOrSiluq=removeMetegOrSiluq )
+            h.removeOtherMarks()
+            self.assertEqual( h.currentText, Hebrew.removeHebrewMarks( DAN_1_5, True, True, True, removeMetegOrSiluq ) )
+            self.assertFalse( h.verifyConsonantsOnly( h.currentText.replace( '׃', '' ) ) )
+    # end of test_1010_removeHebrewMarks
+
+    def test_1020_transliterate( self ):
+        """ Test the transliteration function and the batch functions. """
+        self.assertEqual( Hebrew.transliterateHebrew( "מֶֽלֶךְ־יְהוּדָה" ), 'meleq(ə)-y(ə)hudāh' )
+        self.assertEqual( Hebrew.transliterateHebrew( "מֶלֶךְ", scheme='Standard' ), 'meleq(ə)' )
+        words = DAN_1_5.split()
+        self.assertEqual( Hebrew.removeHebrewMarksBatch( words, removeMetegOrSiluq=True ),
+                            [Hebrew.Hebrew( word ).removeCantillationMarks( removeMetegOrSiluq=True ) for word in words] )
+        self.assertEqual( Hebrew.transliterateHebrewBatch( words, scheme='Names' ), [Hebrew.transliterateHebrew( word, 'Names' ) for word in words] )
+        self.assertEqual( Hebrew.removeHebrewMarksBatch( [] ), [] )
+        self.assertEqual( Hebrew.removeHebrewMarksBatch( ['א\nב֑'] ), ['א\nב'] )
+    # end of test_1020_transliterate
+# end of HebrewTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of HebrewTests.py
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# HebrewWLCBibleTests.py
+#
+# Module testing HebrewWLCBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing HebrewWLCBible.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Hebrew WLC Bible tests"
+PROGRAM_VERSION = '0.02'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import pickle
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+from BibleOrgSys.OriginalLanguages import HebrewWLCBible
+
+
+GEN_1_1 = [ {'word':'בְּ/רֵאשִׁ֖ית', 'strong':'b/7225', 'morph':'HR/Ncfsa', 'cantillationLevel':'0.1.1.0'},
+            {'word':'בָּרָ֣א', 'strong':'1254 a', 'morph':'HVqp3ms'},
+            {'word':'אֱלֹהִ֑ים', 'strong':'430', 'morph':'HNcmpa'},
+            {'word':'׃'} ]
+
+
+class HebrewWLCBibleTests( unittest.TestCase ):
+    """ Unit tests for the Hebrew WLC word table and glossing dictionary. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData() # for the glossing reference IDs
+
+    def makeWordTable( self ):
+        wordTable = HebrewWLCBible.WLCWordTable()
+        normalizedWords = [verseDict['word'].replace( '֖', '' ).replace( '֣', '' ).replace( '֑', '' ).replace( '/', '=' ) for verseDict in GEN_1_1]
+        wordTable.appendVerse( 'GEN', '1', '1', GEN_1_1[:2], normalizedWords[:2] )
+        wordTable.appendVerse( 'GEN', '1', '1', GEN_1_1[2:], normalizedWords[2:] ) # Same verse split over two entries
+        wordTable.appendVerse( 'GEN', '1', '2', GEN_1_1[1:2], normalizedWords[1:2] )
+        wordTable.morphExpansions += ['EXP'+morph for morph in wordTable.morphs[1:]]
+        return wordTable
+
+    def test_1010_wordTable( self ):
+        """ Test building, saving and memory-mapping the word table. """
+        wordTable = self.makeWordTable()
+        self.assertEqual( len(wordTable), 5 )
+        self.assertEqual( wordTable.getVerseDictList( 'GEN', '1', '1' ), GEN_1_1 )
+        self.assertEqual( wordTable.getVerseDictList( 'GEN', '2', '1' ), [] )
+        self.assertEqual( wordTable.getFullReference( 2 ), ('GEN','1','1','1') ) # Word numbers restart for each entry
+        self.assertEqual( len(wordTable.wordForms), 5 ) # The repeated word is only stored once (plus the empty string)
+        with tempfile.TemporaryDirectory() as tempFolderpath:
+            tableFilepath = os.path.join( tempFolderpath, 'WLC'+HebrewWLCBible.WORD_TABLE_FILENAME_END )
+            wordTable.sourceSignature = [('WLC.zip', 123, 456)]
+            wordTable.save( tableFilepath )
+            self.assertFalse( HebrewWLCBible.WLCWordTable().load( tableFilepath, [('WLC.zip', 124, 456)] ) )
+            loadedTable = HebrewWLCBible.WLCWordTable()
+            self.assertTrue( loadedTable.load( tableFilepath, [('WLC.zip', 123, 456)] ) )
+            self.assertEqual( len(loadedTable), 5 )
+            for row in range( len(wordTable) ):
+                self.assertEqual( loadedTable.getWordDict( row ), wordTable.getWordDict( row ) )
+                self.assertEqual( loadedTable.getFullReference( row ), wordTable.getFullReference( row ) )
+                self.assertEqual( loadedTable.getNormalizedWord( row ), wordTable.getNormalizedWord( row ) )
+            self.assertEqual( loadedTable.getMorphologyExpansion( 1 ), 'EXPHVqp3ms' )
+            self.assertEqual( loadedTable.getVerseDictList( 'GEN', 1, 2 ), GEN_1_1[1:2] )
+            loadedTable.close()
+            self.assertEqual( len(loadedTable), 0 )
+            with open( tableFilepath, 'wb' ) as tableFile: tableFile.write( b'rubbish' )
+            self.assertFalse( HebrewWLCBible.WLCWordTable().load( tableFilepath ) )
+    # end of test_1010_wordTable
+
+    def test_1020_updateGenericGlossingReferences( self ):
+        """ Test that the glossing references are updated from the word table. """
+        wlc = HebrewWLCBible.HebrewWLCBibleAddon()
+        wlc.wordTable = self.makeWordTable()
+        wlc.glossingDict = HebrewWLCBible.GlossingDict( { 'בָּרָא':('created',{('GEN','1','2','1')},{}), 'אֱלֹהִים':('God',set(),{}), '׃':('׃',set(),{}) } )
+        wlc.updateGenericGlossingReferences()
+        self.assertEqual( wlc.glossingDict['בָּרָא'][1], {('GEN','1','2','1'),('GEN','1','1','2')} )
+        self.assertEqual( wlc.glossingDict['אֱלֹהִים'][1], {('GEN','1','1','1')} )
+        self.assertEqual( wlc.glossingDict['׃'][1], set() )
+        self.assertEqual( wlc.glossingDict.changedWords, {'בָּרָא','אֱלֹהִים'} )
+        self.assertTrue( wlc.haveGlossingDictChanges )
+        self.assertEqual( wlc.expandMorphologyAbbreviations( 'OSHM:HVqp3ms' ), 'qal verb perfect_(qatal) 3rd-person masculine singular' )
+    # end of test_1020_updateGenericGlossingReferences
+
+    def test_1030_glossingStore( self ):
+        """ Test that the glossing dictionary is converted, loaded and incrementally saved. """
+        self.assertEqual( HebrewWLCBible.IDToGlossingReference( HebrewWLCBible.glossingReferenceToID( ('PSA','119','176','12') ) ), ('PSA','119','176','12') )
+        self.assertLess( HebrewWLCBible.glossingReferenceToID( ('GEN','2','1','1') ), HebrewWLCBible.glossingReferenceToID( ('GEN','10','1','1') ) )
+        self.assertRaises( ValueError, HebrewWLCBible.glossingReferenceToID, ('GEN','1','1a','1') )
+        with tempfile.TemporaryDirectory() as tempFolderpath:
+            pickleFilepath = os.path.join( tempFolderpath, 'Glosses.pickle' )
+            with open( pickleFilepath, 'wb' ) as pickleFile:
+                pickle.dump( { 'בָּרָא':('created',[('GEN','1','1','2'),('GEN','2','3','9')],{('GEN','2','3','9'):'made'}) }, pickleFile )
+            wlc = HebrewWLCBible.HebrewWLCBibleAddon()
+            wlc.loadGlossingDict( pickleFilepath ) # Converts it
+            self.assertTrue( os.path.isfile( os.path.join( tempFolderpath, 'Glosses.sqlite' ) ) )
+            self.assertEqual( wlc.glossingDict['בָּרָא'], ('created',{('GEN','1','1','2'),('GEN','2','3','9')},{('GEN','2','3','9'):'made'}) )
+            wlc.setNewGenericGloss( 'אֱלֹהִים', 'God', ('GEN','1','1','3') )
+            wlc.setNewSpecificGloss( 'אֱלֹהִים', 'gods', ('GEN','1','1','3') )
+            self.assertEqual( wlc.glossingDict.changedWords, {'אֱלֹהִים'} )
+            wlc.saveAnyChangedGlosses()
+            self.assertFalse( wlc.glossingDict.hasChanges() )
+            del wlc.glossingDict['בָּרָא']
+            wlc.saveAnyChangedGlosses()
+            wlc.glossingStore.close()
+
+            wlc2 = HebrewWLCBible.HebrewWLCBibleAddon()
+            wlc2.loadGlossingDict( os.path.join( tempFolderpath, 'Glosses.sqlite' ) )
+            self.assertEqual( dict(wlc2.glossingDict), { 'אֱלֹהִים':('God',{('GEN','1','1','3')},{('GEN','1','1','3'):'gods'}) } )
+            wlc2.glossingStore.close()
+    # end of test_1030_glossingStore
+
+    def test_1040_glossingStoreBackup( self ):
+        """ Test that backups are rotated and copied without ever moving the store itself. """
+        with tempfile.TemporaryDirectory() as tempFolderpath:
+            storeFilepath = os.path.join( tempFolderpath, 'Glosses.sqlite' )
+            store = HebrewWLCBible.GlossingStore( storeFilepath )
+            store.backup( numBackups=3 ) # Nothing to back up yet
+            self.assertFalse( os.path.exists( storeFilepath+'.bak' ) )
+            for n in range( 4 ):
+                store.saveChanges( HebrewWLCBible.GlossingDict( { 'אֱלֹהִים':(f'God{n}',{('GEN','1','1','3')},{}) } ), replaceAll=True )
+                store.backup( numBackups=3 )
+                self.assertTrue( os.path.isfile( storeFilepath ) )
+            self.assertEqual( sorted( os.listdir( tempFolderpath ) ), ['Glosses.sqlite','Glosses.sqlite.bak','Glosses.sqlite.bak2','Glosses.sqlite.bak3'] )
+            for extension, expectedGloss in ( ('',"God3"), ('.bak',"God3"), ('.bak2',"God2"), ('.bak3',"God1") ):
+                backupStore = HebrewWLCBible.GlossingStore( storeFilepath+extension )
+                self.assertEqual( backupStore.loadAll()['אֱלֹהִים'][0], expectedGloss )
+                backupStore.close()
+            self.assertEqual( store.loadAll()['אֱלֹהִים'][0], "God3" ) # Still usable
+            store.close()
+    # end of test_1040_glossingStoreBackup
+
+    def test_1050_unencodableGlossingReferences( self ):
+        """ Test that references which can't be encoded are skipped (rather than stopping the save or conversion). """
+        badReferences = [('GEN','1','1a','1'), ('GEN','1000','1','1'), ('XYZ','1','1','1'), ('GEN','1','1')]
+        self.assertEqual( sorted( badReferences[:2]+[('GEN','2','1','1'),('GEN','1','1','1')], key=HebrewWLCBible.glossingReferenceSortKey ),
+                            [('GEN','1','1','1'),('GEN','2','1','1'),('GEN','1','1a','1'),('GEN','1000','1','1')] )
+        with tempfile.TemporaryDirectory() as tempFolderpath:
+            pickleFilepath = os.path.join( tempFolderpath, 'Glosses.pickle' )
+            with open( pickleFilepath, 'wb' ) as pickleFile:
+                pickle.dump( { 'בָּרָא':('created',[('GEN','1','1','2')]+badReferences,{('GEN','1','1a','1'):'made'}),
+                                'אֱלֹהִים':('God',[('GEN','1','1','3')],{('GEN','1','1','3'):'gods'}) }, pickleFile )
+            wlc = HebrewWLCBible.HebrewWLCBibleAddon()
+            with self.assertLogs( level='ERROR' ):
+                wlc.loadGlossingDict( pickleFilepath ) # Converts it
+            wlc.glossingStore.close()
+
+            wlc2 = HebrewWLCBible.HebrewWLCBibleAddon()
+            wlc2.loadGlossingDict( os.path.join( tempFolderpath, 'Glosses.sqlite' ) )
+            self.assertEqual( dict(wlc2.glossingDict), { 'בָּרָא':('created',{('GEN','1','1','2')},{}),
+                                                        'אֱלֹהִים':('God',{('GEN','1','1','3')},{('GEN','1','1','3'):'gods'}) } )
+            wlc2.glossingStore.close()
+    # end of test_1050_unencodableGlossingReferences
+
+    def test_1060_getVerseWordDictList( self ):
+        """ Test looking up the words of a verse in the word table. """
+        wlc = HebrewWLCBible.HebrewWLCBibleAddon()
+        wlc.wordTable = self.makeWordTable()
+        verseWordDictList = wlc.getVerseWordDictList( SimpleVerseKey( 'GEN', '1', '1' ) )
+        self.assertEqual( [{ key:value for key,value in wordDict.items() if key not in ('normalized','morphExpansion','glossingReference') }
+                                    for wordDict in verseWordDictList], GEN_1_1 )
+        self.assertEqual( verseWordDictList[1]['normalized'], 'בָּרָא' )
+        self.assertEqual( verseWordDictList[1]['morphExpansion'], 'EXPHVqp3ms' )
+        self.assertEqual( [wordDict['glossingReference'] for wordDict in verseWordDictList],
+                            [('GEN','1','1','1'),('GEN','1','1','2'),('GEN','1','1','1'),('GEN','1','1','2')] )
+        self.assertNotIn( 'morphExpansion', verseWordDictList[3] )
+        self.assertEqual( wlc.getVerseWordDictList( SimpleVerseKey( 'GEN', '2', '1' ) ), [] )
+    # end of test_1060_getVerseWordDictList
+# end of HebrewWLCBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of HebrewWLCBibleTests.py
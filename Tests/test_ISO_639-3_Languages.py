@@ -6,7 +6,7 @@
 #
 # Module testing ISO_639_3_Languages.py
 #
-# Copyright (C) 2011-2014 Robert Hunt
+# Copyright (C) 2011-2021 Robert Hunt
 # Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
 # License: See gpl-3.0.txt
 #
@@ -27,13 +27,14 @@
 Module testing ISO_639_3_Languages.py.
 """
 
-LAST_MODIFIED_DATE = '2020-04-06' # by RJH
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
 PROGRAM_NAME = "ISO-639-3 language code tests"
-PROGRAM_VERSION = '0.85'
+PROGRAM_VERSION = '0.86'
 programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
 
 
 import os.path
+import tempfile
 import unittest
 import sys
 
@@ -229,6 +230,35 @@ class ISO_639_3_LanguagesTests( unittest.TestCase ):
         for badName in ('Deutschen','Francais','SomeName',):
             self.assertEqual( self.isoLgs.getNameMatches(badName), [] )
     # end of test_2090_getScope
+
+    def test_2100_rankedNameMatches( self ):
+        """ Test the ranking, accent folding and bulk functions. """
+        self.assertEqual( self.isoLgs.getNameMatches( 'english' )[0], 'English' )
+        self.assertEqual( self.isoLgs.getNameMatches( 'English', maxResults=3 ), self.isoLgs.getNameMatches( 'English' )[:3] )
+        self.assertEqual( self.isoLgs.getNameMatches( 'arbereshe' ), ['Albanian, Arbëreshë'] )
+        self.assertEqual( self.isoLgs.getLanguageCode( 'Albanian, Arbereshe' ), 'aae' )
+        self.assertEqual( self.isoLgs.getLanguageCodes( ['English','german','SomeName'] ), {'English':'eng', 'german':'deu', 'SomeName':None} )
+        self.assertEqual( self.isoLgs.getNameMatchesDict( ['Matigsalug','stupid'] ), {'Matigsalug':['Manobo, Matigsalug'], 'stupid':[]} )
+        for namePortion in ('a','Ma','bo, M','Manobo','(1100'): # Compare with a brute-force search
+            self.assertEqual( sorted( self.isoLgs.getNameMatches( namePortion ) ),
+                    sorted( self.isoLgs.getLanguageName( ccc ) for UCName,ccc in self.isoLgs._ISO_639_3_Languages__NameDict.items()
+                                    if ISO_639_3_Languages.foldName( namePortion ) in ISO_639_3_Languages.foldName( UCName ) ) )
+    # end of test_2100_rankedNameMatches
+
+    def test_2110_nameIndexCache( self ):
+        """ Test saving and loading the name index. """
+        names = ['Ghotuo', 'Albanian, Arbëreshë', 'Manobo, Matigsalug']
+        nameIndex = ISO_639_3_Languages.LanguageNameIndex( names )
+        nameIndex.build()
+        with tempfile.TemporaryDirectory() as tempFolderpath:
+            cacheFilepath = os.path.join( tempFolderpath, 'NameIndex.pickle' )
+            nameIndex.saveCache( cacheFilepath )
+            loadedIndex = ISO_639_3_Languages.LanguageNameIndex( names )
+            self.assertTrue( loadedIndex.loadCache( cacheFilepath ) )
+            self.assertEqual( loadedIndex.find( 'a' ), nameIndex.find( 'a' ) )
+            self.assertEqual( loadedIndex.find( 'MATIG' ), [2] )
+            self.assertFalse( ISO_639_3_Languages.LanguageNameIndex( names[:2] ).loadCache( cacheFilepath ) ) # Different names
+    # end of test_2110_nameIndexCache
 # end of ISO_639_3_LanguagesTests class
 
 
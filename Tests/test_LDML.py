@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# LDMLTests.py
+#
+# Module testing LDML.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing LDML.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "LDML tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import pickle
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference import LDML
+
+
+TEST_LDML = """<?xml version="1.0" encoding="utf-8"?>
+<ldml>
+    <identity>
+        <version number="$Revision$" />
+        <generation date="$Date$" />
+        <language type="tst" />
+    </identity>
+    <characters>
+        <exemplarCharacters>[a b c d e f g h i j k l m n o p q r s t u v w x y z]</exemplarCharacters>
+        <exemplarCharacters type="auxiliary">[á é í ó ú]</exemplarCharacters>
+    </characters>
+    <delimiters>
+        <quotationStart>“</quotationStart>
+        <quotationEnd>”</quotationEnd>
+    </delimiters>
+    <layout>
+        <orientation>
+            <characterOrder>{}</characterOrder>
+        </orientation>
+    </layout>
+</ldml>
+"""
+
+
+class LDMLTests( unittest.TestCase ):
+    """ Unit tests for the LDML cache. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.savedCacheFolderpath = LDML.LDML_CACHE_FOLDERPATH
+        LDML.LDML_CACHE_FOLDERPATH = Path( self.tempFolder.name ).joinpath( 'Cache/' )
+        with open( os.path.join( self.tempFolder.name, 'tst.ldml' ), 'wt', encoding='utf-8' ) as LDMLFile:
+            LDMLFile.write( TEST_LDML.format( 'left-to-right' ) )
+
+    def tearDown( self ):
+        LDML.LDML_CACHE_FOLDERPATH = self.savedCacheFolderpath
+        self.tempFolder.cleanup()
+
+    def test_1010_cachedLoad( self ):
+        """ Test that the cached data matches a fresh parse. """
+        freshData = LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).parse()
+        self.assertEqual( freshData['delimiters']['quotationStart'], '“' )
+        firstData = LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load() # Parses and caches it
+        self.assertIsInstance( firstData, dict )
+        self.assertTrue( os.path.isfile( LDML.getLDMLCacheFilepath( os.path.join( self.tempFolder.name, 'tst.ldml' ) ) ) )
+        cachedData = LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load()
+        self.assertIsInstance( cachedData, LDML.CachedLDMLData )
+        self.assertEqual( list(cachedData), list(freshData) )
+        self.assertEqual( cachedData['characters'], freshData['characters'] )
+        self.assertEqual( list(cachedData._loadedSections), ['characters'] ) # Only unpickled when used
+        self.assertEqual( dict(cachedData), freshData )
+        self.assertEqual( pickle.loads( pickle.dumps( cachedData ) ), freshData )
+        self.assertNotIn( 'dates', cachedData )
+    # end of test_1010_cachedLoad
+
+    def test_1020_outOfDateCache( self ):
+        """ Test that a changed LDML file is parsed again. """
+        LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load()
+        with open( os.path.join( self.tempFolder.name, 'tst.ldml' ), 'wt', encoding='utf-8' ) as LDMLFile:
+            LDMLFile.write( TEST_LDML.format( 'right-to-left' ) + '<!-- Changed -->\n' ) # Make sure that the size changes
+        newData = LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load()
+        self.assertIsInstance( newData, dict )
+        self.assertEqual( newData['layout']['orientation']['characterOrder'], 'right-to-left' )
+        self.assertEqual( LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load()['layout'], newData['layout'] )
+        self.assertEqual( LDML.LDMLFile( self.tempFolder.name, 'tst.ldml' ).load( useCache=False ), newData )
+    # end of test_1020_outOfDateCache
+# end of LDMLTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of LDMLTests.py
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# LexiconStoreTests.py
+#
+# Module testing LexiconStore.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing LexiconStore.py.
+
+The lexicon XML isn't distributed, so small made-up tables are used.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Lexicon store tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.OriginalLanguages import LexiconStore, HebrewLexicon
+
+
+class LexiconStoreTests( unittest.TestCase ):
+    """ Unit tests for the LexiconStore object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.folderpath = self.tempFolder.name
+        self.sourceFilepath = os.path.join( self.folderpath, 'Source.txt' )
+        self.writeSource( '1=father\n2=father (Aramaic)\n' )
+        self.buildCount = 0
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def writeSource( self, text ):
+        with open( self.sourceFilepath, 'wt', encoding='utf-8' ) as sourceFile:
+            sourceFile.write( text )
+
+    def buildTables( self ):
+        self.buildCount += 1
+        with open( self.sourceFilepath, 'rt', encoding='utf-8' ) as sourceFile:
+            entries = dict( line.rstrip( '\n' ).split( '=', 1 ) for line in sourceFile )
+        return { 'Strongs': { key:{ 'usage':usage } for key,usage in entries.items() }, 'Empty':{} }
+
+    def test_1010_getAndRebuild( self ):
+        """ Test lookups and that the store is only rebuilt when the source changes. """
+        store = LexiconStore.LexiconStore( 'Test', [self.sourceFilepath], self.buildTables, self.folderpath )
+        self.assertGreater( len(str(store)), 20 )
+        self.assertEqual( store.get( 'Strongs', '1' ), { 'usage':'father' } )
+        self.assertIsNone( store.get( 'Strongs', '3' ) )
+        self.assertIsNone( store.get( 'Empty', '1' ) )
+        self.assertTrue( store.contains( 'Strongs', '2' ) )
+        self.assertEqual( store.getTableSizes(), { 'Strongs':2, 'Empty':0 } )
+        store.close()
+        self.assertEqual( self.buildCount, 1 )
+
+        store2 = LexiconStore.LexiconStore( 'Test', [self.sourceFilepath], self.buildTables, self.folderpath )
+        self.assertEqual( store2.get( 'Strongs', '2' ), { 'usage':'father (Aramaic)' } )
+        self.assertEqual( self.buildCount, 1 ) # Reused the compiled store
+        store2.close()
+
+        self.writeSource( '1=father\n2=father (Aramaic)\n3=mourn\n' )
+        store3 = LexiconStore.LexiconStore( 'Test', [self.sourceFilepath], self.buildTables, self.folderpath )
+        self.assertEqual( store3.get( 'Strongs', '3' ), { 'usage':'mourn' } )
+        self.assertEqual( self.buildCount, 2 ) # Rebuilt because the source changed
+        self.assertEqual( store3.loadTable( 'Strongs' )['3'], { 'usage':'mourn' } )
+        store3.close()
+
+        store4 = LexiconStore.LexiconStore( 'Test', [os.path.join( self.folderpath, 'Missing.txt' )], self.buildTables, self.folderpath )
+        with self.assertRaises( FileNotFoundError ):
+            store4.get( 'Strongs', '1' )
+    # end of test_1010_getAndRebuild
+
+    def test_1020_HebrewLexicon( self ):
+        """ Test that the Hebrew lexicon classes look up single entries from a store. """
+        def buildTables():
+            return { 'AugIndex1':{ '1':'aaa' }, 'AugIndex2':{ 'aaa':'1' },
+                    'LexicalIndex_heb':{ 'aaa':('ab','n-m','father','a.ab.aa','1','1','4a',None,None,None) }, 'LexicalIndex_arc':{},
+                    'Strongs':{ '1':{ 'word':('אָב','awb','ab','n-m'), 'usage':'chief, (fore-)father(-less)' } },
+                    'BrDrBr_heb':{ 'a.ab.aa':('<w>אָב</w> <def>father</def>','base','ref') }, 'BrDrBr_arc':{} }
+        store = LexiconStore.LexiconStore( 'Hebrew', [self.sourceFilepath], buildTables, self.folderpath )
+        hl = HebrewLexicon.HebrewLexicon()
+        hl.store = store
+        self.assertEqual( hl.getStrongsEntryField( 'H1', 'usage' ), 'chief, (fore-)father(-less)' )
+        self.assertIsNone( hl.getStrongsEntryData( 'H2' ) )
+        self.assertIn( 'awb', hl.getStrongsEntryHTML( 'H1' ) )
+        self.assertEqual( hl.getBrDrBrEntryField( 'H1', 'status' ), 'ref' )
+        self.assertIn( '<span class="Def">father</span>', hl.getBrDrBrEntryHTML( 'a.ab.aa' ) )
+        self.assertEqual( hl.hlix.getTWOTCodeFromLexiconCode( 'aaa' ), '4a' )
+        self.assertIsNone( hl.StrongsEntries ) # Nothing loaded into memory
+        hl.load()
+        self.assertEqual( len(hl.StrongsEntries), 1 )
+        self.assertEqual( hl.getBrDrBrEntryData( '1' ), ('<w>אָב</w> <def>father</def>','base','ref') )
+        store.close()
+    # end of test_1020_HebrewLexicon
+
+    def test_1030_HebrewLexiconLoad( self ):
+        """ Test that the simple and index classes load everything from the store (rather than the XML). """
+        def buildTables():
+            return { 'AugIndex1':{ '1':'aaa' }, 'AugIndex2':{ 'aaa':'1' },
+                    'LexicalIndex_heb':{}, 'LexicalIndex_arc':{ 'aaa':('ab','n-m','father','a.ab.aa','1','1','4a',None,None,None) },
+                    'Strongs':{ '1':{ 'usage':'father' } }, 'BrDrBr_heb':{}, 'BrDrBr_arc':{ 'a.ab.aa':('<w>אַב</w>','base','ref') } }
+        store = LexiconStore.LexiconStore( 'Hebrew', [self.sourceFilepath], buildTables, self.folderpath )
+        hlix = HebrewLexicon.HebrewLexiconIndex( os.path.join( self.folderpath, 'NoXMLHere/' ) )
+        hlix.store = store
+        hlix.load()
+        self.assertEqual( hlix.indexEntries1, { '1':'aaa' } )
+        self.assertEqual( set(hlix.indexEntries), { 'heb', 'arc' } )
+        self.assertEqual( hlix.getBrDrBrCodeFromStrongsNumber( 'H1' ), 'a.ab.aa' )
+        hls = HebrewLexicon.HebrewLexiconSimple( os.path.join( self.folderpath, 'NoXMLHere/' ) )
+        hls.store = store
+        hls.load()
+        self.assertEqual( hls.StrongsEntries, { '1':{ 'usage':'father' } } )
+        self.assertEqual( hls.getBrDrBrEntryData( 'a.ab.aa' ), ('<w>אַב</w>','base','ref') )
+        store.close()
+    # end of test_1030_HebrewLexiconLoad
+# end of LexiconStoreTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of LexiconStoreTests.py
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# MySwordBibleTests.py
+#
+# Module testing MySwordBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing MySwordBible.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "MySword Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import shutil
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+from BibleOrgSys.InputOutput.SQLiteBulkWriter import SQLiteBulkWriter
+from BibleOrgSys.Formats.USFMBible import USFMBible
+from BibleOrgSys.Formats.MySwordBible import MySwordBible
+
+
+testFilepath = os.path.join( os.path.dirname( __file__ ), 'DataFilesForTests/USFMTest2/MBT66JUD.SCP' ) # Just one NT book
+
+
+class MySwordBibleTests( unittest.TestCase ):
+    """ Unit tests for reading (and writing) MySword modules. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def test_1010_roundTrip( self ):
+        """ Test that exporting a module and loading it again (all at once or by book) gives the same verse text. """
+        sourceFolderpath = os.path.join( self.tempFolder.name, 'USFM/' )
+        os.mkdir( sourceFolderpath )
+        shutil.copy( testFilepath, sourceFolderpath )
+        USFMBibleObject = USFMBible( sourceFolderpath, 'Test', 'TST' )
+        USFMBibleObject.loadBooks()
+        self.assertTrue( USFMBibleObject.toMySword( self.tempFolder.name ) )
+
+        loadedBible = MySwordBible( self.tempFolder.name, 'TST.bbl.mybible' )
+        loadedBible.preload()
+        self.assertEqual( loadedBible.suppliedMetadata['MySword']['Abbreviation'], 'TST' )
+        loadedBible.load()
+        self.assertEqual( loadedBible.getBookList(), ['JDE'] )
+        bookLoadedBible = MySwordBible( self.tempFolder.name, 'TST.bbl.mybible' )
+        bookLoadedBible.preload()
+        bookLoadedBible.loadBook( 'JDE' )
+        bookLoadedBible.loadBook( 'MAT' ) # Not in the module
+        self.assertEqual( bookLoadedBible.getBookList(), ['JDE'] )
+        for V in range( 1, 26 ):
+            verseKey = SimpleVerseKey( 'JDE', '1', str(V) )
+            verseText = USFMBibleObject.getVerseText( verseKey ).replace( '¶', '' ) # (Paragraphs can move slightly)
+            self.assertEqual( loadedBible.getVerseText( verseKey ).replace( '¶', '' ), verseText )
+            self.assertEqual( bookLoadedBible.getVerseText( verseKey ).replace( '¶', '' ), verseText )
+    # end of test_1010_roundTrip
+
+    def test_1020_partialBook( self ):
+        """ Test loading a book that only has some of its verses (plus some that don't fit the versification). """
+        filepath = os.path.join( self.tempFolder.name, 'Partial.bbl.mybible' )
+        with SQLiteBulkWriter( filepath ) as writer:
+            writer.execute( 'CREATE TABLE Details(Description NVARCHAR(255), Abbreviation NVARCHAR(50), OT BOOL, NT BOOL)' )
+            writer.execute( 'INSERT INTO "Details" VALUES(?,?,?,?)', ('Partial Bible','PRT',True,False) )
+            writer.execute( 'CREATE TABLE Bible(Book INT, Chapter INT, Verse INT, Scripture TEXT, Primary Key(Book,Chapter,Verse))' )
+            writer.executemany( 'INSERT INTO "Bible" VALUES(?,?,?,?)', ( (1,2,1,'Gen two one'), (1,1,2,'Gen one two'), # Out of order
+                                                                        (1,1,1,'Gen one one'), (1,51,1,'No such chapter'),
+                                                                        (1,1,99,'No such verse'), (2,1,1,'Exo one one'), ) )
+        partialBible = MySwordBible( self.tempFolder.name, 'Partial.bbl.mybible' )
+        partialBible.preload()
+        partialBible.loadBook( 'GEN' )
+        partialBible.loadBook( 'LEV' ) # No verses
+        self.assertEqual( partialBible.getBookList(), ['GEN'] )
+        self.assertEqual( partialBible.getVerseText( SimpleVerseKey( 'GEN', '1', '1' ) ), 'Gen one one' )
+        self.assertEqual( partialBible.getVerseText( SimpleVerseKey( 'GEN', '1', '2' ) ), 'Gen one two' )
+        self.assertEqual( partialBible.getVerseText( SimpleVerseKey( 'GEN', '2', '1' ) ), 'Gen two one' )
+        for C, V in ( ('1','3'), ('1','31'), ('50','26'), ('51','1'), ('1','99') ): # Missing or ignored
+            with self.assertRaises( KeyError ):
+                partialBible.getVerseText( SimpleVerseKey( 'GEN', C, V ) )
+        for entry in partialBible.books['GEN']._processedLines:
+            self.assertNotIn( 'No such', entry.getFullText() or '' )
+    # end of test_1020_partialBook
+
+    def test_1030_failedExport( self ):
+        """ Test that no incomplete SQLite module is left if an export fails part way through. """
+        sourceFolderpath = os.path.join( self.tempFolder.name, 'USFM/' )
+        os.mkdir( sourceFolderpath )
+        shutil.copy( testFilepath, sourceFolderpath )
+        USFMBibleObject = USFMBible( sourceFolderpath, 'Test', 'TST' )
+        USFMBibleObject.loadBooks()
+        def brokenGetSetting( settingName ): raise ValueError( "Can't get setting" )
+        USFMBibleObject.getSetting = brokenGetSetting # Fails while writing the settings (before the verses)
+        for exportFunctionName in ( 'toMySword', 'toESword', 'toMyBible' ):
+            outputFolderpath = os.path.join( self.tempFolder.name, exportFunctionName+'/' )
+            with self.assertRaises( ValueError ):
+                getattr( USFMBibleObject, exportFunctionName )( outputFolderpath )
+            self.assertEqual( [filename for filename in os.listdir( outputFolderpath ) if not filename.endswith( '.txt' )], [] )
+    # end of test_1030_failedExport
+# end of MySwordBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of MySwordBibleTests.py
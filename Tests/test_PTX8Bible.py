@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# PTX8BibleTests.py
+#
+# Module testing PTX8Bible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing PTX8Bible.py.
+
+A small Paratext project is written into a temporary folder
+    to check the on-demand (and cached) loading of the metadata.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Paratext-8 Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+import pickle
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Formats import PTX8Bible
+
+
+PROJECT_FILES = {
+    'Settings.xml': '<ScriptureText><Naming PrePart="" PostPart="TST.SFM" BookNameForm="41MAT" /><FullName>Test Bible</FullName></ScriptureText>',
+    '41MATTST.SFM': '\\id MAT Test\n\\c 1\n\\p\n\\v 1 The book of the genealogy.\n',
+    'BookNames.xml': '<BookNames><book code="MAT" abbr="Mt" short="Matthew" long="The Gospel of Matthew" /></BookNames>',
+    'AutoCorrect.txt': 'ab-->cd\n',
+    'unique.id': '0123abcd-0123-4567-89ab-0123456789ab',
+    }
+
+
+class PTX8BibleTests( unittest.TestCase ):
+    """ Unit tests for the PTX8Bible object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.projectFolderpath = os.path.join( self.tempFolder.name, 'TST' )
+        self.cacheFolderpath = os.path.join( self.tempFolder.name, 'Cache' )
+        os.mkdir( self.projectFolderpath )
+        for filename,contents in PROJECT_FILES.items():
+            with open( os.path.join( self.projectFolderpath, filename ), 'wt', encoding='utf-8' ) as myFile:
+                myFile.write( contents )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def makeBible( self ):
+        PTX8_Bible = PTX8Bible.PTX8Bible( self.projectFolderpath )
+        PTX8_Bible.metadataCacheFolderpath = self.cacheFolderpath
+        PTX8_Bible.preload()
+        return PTX8_Bible
+
+    def test_1010_onDemand( self ):
+        """ Test that the metadata files are only parsed when they're used. """
+        PTX8_Bible = self.makeBible()
+        bookNamesFilepath = os.path.join( self.projectFolderpath, 'BookNames.xml' )
+        self.assertIn( bookNamesFilepath, PTX8_Bible.filepathsNotYetLoaded )
+        self.assertEqual( PTX8_Bible.suppliedMetadata['PTX8']['Settings']['FullName'], 'Test Bible' )
+        PTX8_Bible.loadBooks()
+        self.assertIn( 'MAT', PTX8_Bible )
+        self.assertIn( bookNamesFilepath, PTX8_Bible.filepathsNotYetLoaded ) # Still not needed
+        self.assertEqual( PTX8_Bible.suppliedMetadata['PTX8']['BooksNames']['MAT'], ('MAT','Mt','Matthew','The Gospel of Matthew') )
+        self.assertNotIn( bookNamesFilepath, PTX8_Bible.filepathsNotYetLoaded )
+        self.assertIn( 'UniqueId', PTX8_Bible.suppliedMetadata['PTX8'] )
+        self.assertNotIn( 'Notes', PTX8_Bible.suppliedMetadata['PTX8'] )
+        self.assertIsNone( PTX8_Bible.suppliedMetadata['PTX8'].get( 'PTXNotesByName' ) )
+    # end of test_1010_onDemand
+
+    def test_1020_loadAll( self ):
+        """ Test loading all the metadata at once with and without threads. """
+        PTX8_Bible1, PTX8_Bible2 = self.makeBible(), self.makeBible()
+        PTX8_Bible1.metadataCacheFolderpath = PTX8_Bible2.metadataCacheFolderpath = None
+        PTX8_Bible1.loadPTX8Metadata( maxThreads=1 )
+        PTX8_Bible2.loadPTX8Metadata( maxThreads=4 )
+        self.assertEqual( dict( PTX8_Bible1.suppliedMetadata['PTX8'] ), dict( PTX8_Bible2.suppliedMetadata['PTX8'] ) )
+        self.assertEqual( sorted( PTX8_Bible2.suppliedMetadata['PTX8'] ), ['Autocorrects','BooksNames','Settings','UniqueId'] )
+        self.assertEqual( PTX8_Bible2.filepathsNotYetLoaded, [os.path.join( self.projectFolderpath, '41MATTST.SFM' )] )
+    # end of test_1020_loadAll
+
+    def test_1030_cache( self ):
+        """ Test that the cached metadata is only used while the file is unchanged. """
+        self.assertEqual( self.makeBible().suppliedMetadata['PTX8']['Autocorrects'], {'ab':'cd'} )
+        autocorrectFilepath = os.path.join( self.projectFolderpath, 'AutoCorrect.txt' )
+        fileStat = os.stat( autocorrectFilepath )
+        with open( autocorrectFilepath, 'wt', encoding='utf-8' ) as myFile: myFile.write( 'xy-->zz\n' ) # Same size
+        os.utime( autocorrectFilepath, ns=(fileStat.st_atime_ns,fileStat.st_mtime_ns) )
+        PTX8_Bible = self.makeBible()
+        self.assertEqual( PTX8_Bible.suppliedMetadata['PTX8']['Autocorrects'], {'ab':'cd'} ) # from the cache
+        self.assertNotIn( autocorrectFilepath, PTX8_Bible.filepathsNotYetLoaded )
+        with open( autocorrectFilepath, 'wt', encoding='utf-8' ) as myFile: myFile.write( 'xy-->zzz\n' )
+        self.assertEqual( self.makeBible().suppliedMetadata['PTX8']['Autocorrects'], {'xy':'zzz'} )
+    # end of test_1030_cache
+
+    def test_1040_pickle( self ):
+        """ Test that a Bible with metadata still to be loaded can be pickled. """
+        PTX8_Bible = self.makeBible()
+        self.assertEqual( len(PTX8_Bible.suppliedMetadata['PTX8'].pendingLoaders), len(PTX8Bible.PTX8_METADATA_LOADERS) )
+        newBible = pickle.loads( pickle.dumps( PTX8_Bible ) )
+        self.assertIs( newBible.suppliedMetadata['PTX8'].BibleObject, newBible )
+        self.assertEqual( newBible.suppliedMetadata['PTX8']['UniqueId'], PROJECT_FILES['unique.id'] )
+    # end of test_1040_pickle
+# end of PTX8BibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of PTX8BibleTests.py
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# PalmDBBibleTests.py
+#
+# Module testing PalmDBBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing PalmDBBible.py.
+
+The PDB file is built by the test so no sample Bible is needed.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "PalmDB Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+import struct
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Formats import PalmDBBible
+
+
+def makeTestPDB( filepath ) -> None:
+    """
+    Write a small PalmDB Bible (not byte-shifted) with two books.
+
+    Each book has a header record and two text records,
+        and there's one compressed word in the word list.
+    """
+    words = ['In','to','the','God','and','said','light','waters']
+    wordIndexEntries, wordListBytes, allWords = [], b'', []
+    for wordLength in sorted( set( len(word) for word in words ) ):
+        lengthWords = [word for word in words if len(word)==wordLength]
+        wordIndexEntries.append( struct.pack( '>HHBB', wordLength, len(lengthWords), 0, 0 ) )
+        for word in lengthWords:
+            wordListBytes += word.encode( 'ascii' ); allWords.append( word )
+    wordIndexEntries.append( struct.pack( '>HHBB', 4, 1, 1, 0 ) ) # One compressed word
+    wordListBytes += struct.pack( '>HH', allWords.index( 'In' )+1, allWords.index( 'the' )+1 ); allWords.append( 'In the' )
+
+    bookRecords = []
+    for bookNumber, shortName, longName, chapters in ( (10, 'Gen', 'Genesis', [[['In the','God','said'], ['light','and','waters']], [['God','said','to','the','waters']]]),
+                                                        (20, 'Exo', 'Exodus', [[['the','waters','and','the','light'], ['said','God']]]) ):
+        tokens, accumulatedVerses, tokensPerChapter, tokensPerVerse = [], [], [], []
+        for chapter in chapters:
+            tokensPerChapter.append( len(tokens) )
+            chapterStart = len(tokens)
+            tokens.append( 0xFFFE ) # <CHAPTER>
+            tokensPerVerse.append( len(tokens) - chapterStart )
+            for verse in chapter:
+                tokens.extend( allWords.index( word )+1 for word in verse )
+                tokensPerVerse.append( len(tokens) - chapterStart )
+            accumulatedVerses.append( len(tokensPerVerse) )
+        headerRecord = struct.pack( '>H', len(chapters) ) + b''.join( struct.pack( '>H', n ) for n in accumulatedVerses ) \
+                        + b''.join( struct.pack( '>I', n ) for n in tokensPerChapter ) + b''.join( struct.pack( '>H', n ) for n in tokensPerVerse )
+        textBytes = b''.join( struct.pack( '>H', token ) for token in tokens )
+        half = len(tokens) // 2 * 2
+        bookRecords.append( (bookNumber, shortName, longName, [headerRecord, textBytes[:half], textBytes[half:]]) )
+
+    records = [None] # The Bible header record is filled in below
+    bookIndexBytes = b''
+    for bookNumber, shortName, longName, theseRecords in bookRecords:
+        bookIndexBytes += struct.pack( '>HHH', bookNumber, len(records), len(theseRecords) ) \
+                            + shortName.encode( 'ascii' ).ljust( 8, b'\0' ) + longName.encode( 'ascii' ).ljust( 32, b'\0' )
+        records.extend( theseRecords )
+    records[0] = b'Test'.ljust( 16, b'\0' ) + b'Test Bible'.ljust( 128, b'\0' ) + b' ' \
+                    + struct.pack( '>BHHH', 2, len(records), 1, len(bookRecords) ) + bookIndexBytes
+    records.append( struct.pack( '>H', len(wordIndexEntries) ) + b''.join( wordIndexEntries ) )
+    records.append( wordListBytes )
+
+    PDBBytes = b'Test'.ljust( 32, b'\0' ) + bytes( 28 ) + b'bibl' + b'PPBL' + bytes( 8 ) + struct.pack( '>H', len(records) )
+    recordOffset = len(PDBBytes) + 8 * len(records)
+    for record in records:
+        PDBBytes += struct.pack( '>IBBBB', recordOffset, 0, 0, 0, 0 )
+        recordOffset += len(record)
+    with open( filepath, 'wb' ) as PDBFile:
+        PDBFile.write( PDBBytes + b''.join( records ) )
+# end of makeTestPDB
+
+
+class PalmDBBibleTests( unittest.TestCase ):
+    """ Unit tests for the PalmDBBible object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        cls.tempFolder = tempfile.TemporaryDirectory()
+        makeTestPDB( os.path.join( cls.tempFolder.name, 'Test.PDB' ) )
+        cls.fullBible = PalmDBBible.PalmDBBible( cls.tempFolder.name, 'Test' )
+        cls.fullBible.load()
+
+    @classmethod
+    def tearDownClass( cls ):
+        cls.tempFolder.cleanup()
+
+    def getLines( self, bookObject ):
+        return [(entry.getMarker(),entry.getFullText()) for entry in bookObject._processedLines]
+
+    def test_1010_preload( self ):
+        """ Test that preloading only indexes the books. """
+        PDBBible = PalmDBBible.PalmDBBible( self.tempFolder.name, 'Test' )
+        PDBBible.preload()
+        self.assertEqual( PDBBible.bookList, ['GEN','EXO'] )
+        self.assertIsNone( PDBBible.words )
+        self.assertEqual( PDBBible.books, {} )
+    # end of test_1010_preload
+
+    def test_1020_fullLoad( self ):
+        """ Test the decoded text. """
+        self.assertEqual( list( self.fullBible.books.keys() ), ['GEN','EXO'] )
+        self.assertTrue( self.fullBible.getVerseText( ('GEN','1','1') ).endswith( 'In the God said' ) ) # after any paragraph or heading indicators
+        self.assertTrue( self.fullBible.getVerseText( ('GEN','2','1') ).endswith( 'God said to the waters' ) )
+        self.assertTrue( self.fullBible.getVerseText( ('EXO','1','2') ).endswith( 'said God' ) )
+    # end of test_1020_fullLoad
+
+    def test_1030_singleBook( self ):
+        """ Test that loading a single book gives the same result as the full load. """
+        PDBBible = PalmDBBible.PalmDBBible( self.tempFolder.name, 'Test' )
+        PDBBible.preload()
+        PDBBible.loadBook( 'EXO' )
+        self.assertEqual( list( PDBBible.books.keys() ), ['EXO'] )
+        self.assertEqual( self.getLines( PDBBible.books['EXO'] ), self.getLines( self.fullBible.books['EXO'] ) )
+    # end of test_1030_singleBook
+
+    def test_1040_parallelLoad( self ):
+        """ Test that loading the books in separate processes gives the same result. """
+        savedMaxProcesses = BibleOrgSysGlobals.maxProcesses
+        BibleOrgSysGlobals.maxProcesses = 2
+        try:
+            PDBBible = PalmDBBible.PalmDBBible( self.tempFolder.name, 'Test' )
+            PDBBible.load()
+        finally: BibleOrgSysGlobals.maxProcesses = savedMaxProcesses
+        self.assertEqual( list( PDBBible.books.keys() ), ['GEN','EXO'] )
+        for BBB in PDBBible.books:
+            self.assertIs( PDBBible.books[BBB].containerBibleObject, PDBBible )
+            self.assertEqual( self.getLines( PDBBible.books[BBB] ), self.getLines( self.fullBible.books[BBB] ) )
+    # end of test_1040_parallelLoad
+# end of PalmDBBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of PalmDBBibleTests.py
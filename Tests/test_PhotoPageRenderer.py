@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# PhotoPageRendererTests.py
+#
+# Module testing PhotoPageRenderer.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing PhotoPageRenderer.py.
+
+The Pillow tests are skipped if Pillow isn't installed.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "PhotoBible page renderer tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+from unittest import mock
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput import PhotoPageRenderer
+
+
+class StandInPopen:
+    """ Records the convert command lines (and fails any with more than one page if one is named Bad). """
+    parameterLists = []
+    def __init__( self, parameters, stdout=None, stderr=None ):
+        StandInPopen.parameterLists.append( parameters )
+        numPages = parameters.count( '(' )
+        self.returncode = 1 if numPages > 1 and any( 'Bad' in parameter for parameter in parameters ) else 0
+    def communicate( self ):
+        return b'', b''
+
+
+class PhotoPageRendererTests( unittest.TestCase ):
+    """ Unit tests for the PhotoBible page renderers. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.folderpath = self.tempFolder.name
+        self.blankFilepath = os.path.join( BOSTopFolderpath, 'ControlFiles', 'yblank-240x320.jpg' )
+        self.commandList = ['-font', 'Andika', '-pointsize', '20', '-fill', 'opaque', '-draw', "text 1,22 'Genesis 1'",
+                            '-font', 'Charis-SIL', '-fill', 'red1', '-draw', "text 1,46.5 '¹In the beginning'"]
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def test_1010_getRenderer( self ):
+        """ Test choosing a renderer. """
+        self.assertIsNone( PhotoPageRenderer.getPhotoPageRenderer( self.blankFilepath, 'NoSuchRenderer' ) )
+        renderer = PhotoPageRenderer.getPhotoPageRenderer( self.blankFilepath, 'ImageMagick', maxWorkers=2 )
+        self.assertEqual( renderer.rendererName, 'ImageMagick' )
+        self.assertGreater( len(str(renderer)), 20 )
+    # end of test_1010_getRenderer
+
+    @unittest.skipUnless( PhotoPageRenderer.Image, "Pillow isn't installed" )
+    def test_1020_Pillow( self ):
+        """ Test rendering some pages in batches with Pillow (and that the output is repeatable). """
+        with PhotoPageRenderer.PillowPageRenderer( self.blankFilepath, maxWorkers=2, maxPagesPerBatch=2 ) as renderer:
+            for n in range( 5 ):
+                renderer.addPage( self.commandList, os.path.join( self.folderpath, f'{n}.jpg' ) )
+        self.assertEqual( renderer.stats['pages'], 5 )
+        self.assertEqual( renderer.stats['batches'], 3 )
+        self.assertEqual( renderer.stats['failedBatches'], 0 )
+        with open( os.path.join( self.folderpath, '0.jpg' ), 'rb' ) as firstFile: firstBytes = firstFile.read()
+        with open( os.path.join( self.folderpath, '4.jpg' ), 'rb' ) as lastFile: lastBytes = lastFile.read()
+        self.assertEqual( firstBytes, lastBytes )
+        with open( self.blankFilepath, 'rb' ) as blankFile: self.assertNotEqual( firstBytes, blankFile.read() )
+    # end of test_1020_Pillow
+
+    def test_1030_ImageMagickBatches( self ):
+        """ Test that ImageMagick command lines are kept short and that failed batches are retried one page at a time. """
+        StandInPopen.parameterLists = []
+        pageNames = ['Good0','Good1','Good2','BadP3','Good4','Good5','Good6'] # All the same length
+        with mock.patch.object( PhotoPageRenderer.subprocess, 'Popen', StandInPopen ):
+            with PhotoPageRenderer.ImageMagickPageRenderer( self.blankFilepath, maxWorkers=1 ) as renderer:
+                pageLength = sum( len(parameter)+3 for parameter in renderer._getPageParameters( self.commandList, os.path.join( self.folderpath, 'Good0.jpg' ) ) )
+                renderer.maxCommandLineLength = int( 3.5 * pageLength ) # Room for three of our pages (and the rest of the command line)
+                for pageName in pageNames:
+                    renderer.addPage( self.commandList, os.path.join( self.folderpath, f'{pageName}.jpg' ) )
+        self.assertEqual( renderer.stats['failedBatches'], 0 )
+        pageCounts = [parameters.count( '(' ) for parameters in StandInPopen.parameterLists]
+        self.assertEqual( pageCounts, [3,3,1,1,1,1] ) # The second one (with Bad3) was retried
+        for parameters in StandInPopen.parameterLists:
+            self.assertLessEqual( sum( len(parameter)+3 for parameter in parameters ), renderer.maxCommandLineLength )
+        retriedPages = [parameters[parameters.index( '(' )+1] for parameters in StandInPopen.parameterLists[2:]]
+        self.assertEqual( retriedPages, [os.path.join( self.folderpath, f'{pageName}.jpg' ) for pageName in pageNames[3:]] )
+        for pageName in pageNames: # The blank pages were still created
+            self.assertTrue( os.path.isfile( os.path.join( self.folderpath, f'{pageName}.jpg' ) ) )
+    # end of test_1030_ImageMagickBatches
+# end of PhotoPageRendererTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of PhotoPageRendererTests.py
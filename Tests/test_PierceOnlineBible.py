@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# PierceOnlineBibleTests.py
+#
+# Module testing PierceOnlineBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing PierceOnlineBible.py.
+
+There are no Online Bible modules in the test data (and the index file loaders
+    expect the full-sized KJV files), so these tests use a tiny synthetic Text.Dat
+    with the index and dictionary set up directly.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Pierce Online Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import tempfile
+import unittest
+import sys
+from array import array
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+from BibleOrgSys.Formats.PierceOnlineBible import PierceOnlineBible
+
+
+NUM_KJV_VERSES = 31102
+DICTIONARY = { 5:('in',0), 6:('the',0), # Common (8-bit) words
+                257:('beginning',0), 258:('god',0), 259:('created',0), } # Regular (15-bit) words
+VERSE_BYTES = ( b'\x01\x05\x06\x81\x02\x01\x82\x02\x83\x02', # GEN 1:1 = In the beginning God created
+                b'', # GEN 1:2 is empty
+                b'\x06\x81\x02', ) # GEN 1:3 = the beginning (then all the following verses are empty)
+
+
+class PierceOnlineBibleTests( unittest.TestCase ):
+    """ Unit tests for decoding Online Bible verses. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        with open( os.path.join( self.tempFolder.name, 'Text.Dat' ), 'wb' ) as textFile:
+            textFile.write( b''.join( VERSE_BYTES ) )
+        self.Bible = PierceOnlineBible( self.tempFolder.name )
+        self.Bible.abbreviation = 'TEST'
+        self.Bible.textIndex = array( 'L' )
+        endAt = 0
+        for verseBytes in VERSE_BYTES:
+            endAt += len(verseBytes)
+            self.Bible.textIndex.append( endAt )
+        self.Bible.textIndex.extend( [endAt] * (NUM_KJV_VERSES-len(VERSE_BYTES)) )
+        self.Bible.dictionary = dict( DICTIONARY )
+        self.Bible.haveStrongsFlag = False
+        self.Bible.preloaded = True # Text.Dat gets mapped when the first verse is requested
+
+    def tearDown( self ):
+        self.Bible.closeFiles()
+        self.tempFolder.cleanup()
+
+    def test_1010_getVerse( self ):
+        """ Test decoding single verses. """
+        self.assertIsNone( self.Bible.textBytes )
+        self.assertEqual( self.Bible.getVerse( ('GEN','1','1') ), 'In the beginning God created' )
+        self.assertIsNotNone( self.Bible.textBytes ) # It's mapped now
+        self.assertEqual( self.Bible.getVerse( ('GEN','1','3') ), 'the beginning' )
+        self.assertEqual( self.Bible.getVerse( ('REV','22','21') ), '' )
+        self.assertIsNone( self.Bible.getVerse( ('GEN','99','1') ) )
+    # end of test_1010_getVerse
+
+    def test_1020_emptyVerse( self ):
+        """ Test that an empty verse gives an empty result (rather than an error). """
+        self.assertEqual( self.Bible.getVerseBytes( 1 ), b'' )
+        self.assertEqual( self.Bible.getVerse( ('GEN','1','2') ), '' )
+        with self.assertRaises( IndexError ):
+            self.Bible.getVerseBytes( NUM_KJV_VERSES )
+    # end of test_1020_emptyVerse
+
+    def test_1030_loadBooks( self ):
+        """ Test decoding all of the verses into books. """
+        self.Bible.loadBooks()
+        self.Bible.closeFiles()
+        self.assertEqual( len(self.Bible.books), 66 )
+        self.assertEqual( self.Bible.getVerseText( SimpleVerseKey( 'GEN', '1', '1' ) ), 'In the beginning God created' )
+        self.assertEqual( self.Bible.getVerseText( SimpleVerseKey( 'GEN', '1', '2' ) ), '' )
+        self.assertEqual( self.Bible.getVerseText( SimpleVerseKey( 'GEN', '1', '3' ) ), 'the beginning' )
+        self.assertEqual( self.Bible.getVerseText( SimpleVerseKey( 'REV', '22', '21' ) ), '' )
+    # end of test_1030_loadBooks
+
+    def test_1040_findWordInDictionary( self ):
+        """ Test the reverse dictionary lookup. """
+        self.assertEqual( self.Bible.findWordInDictionary( 'God' ), [('god',258)] )
+        self.assertEqual( self.Bible.findWordInDictionary( 'THE' ), [('the',6)] )
+        self.assertEqual( self.Bible.findWordInDictionary( 'missing' ), [] )
+        self.Bible.dictionary[260] = ('God',0) # The reverse dictionary has already been built
+        self.assertEqual( self.Bible.findWordInDictionary( 'god' ), [('god',258)] )
+    # end of test_1040_findWordInDictionary
+# end of PierceOnlineBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of PierceOnlineBibleTests.py
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ReferenceDataBundleTests.py
+#
+# Module testing ReferenceDataBundle.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing ReferenceDataBundle.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "Reference Data Bundle tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import pickle
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference import ReferenceDataBundle
+
+
+class ReferenceDataBundleTests( unittest.TestCase ):
+    """ Unit tests for the ReferenceDataBundle object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        cls.tempFolder = tempfile.TemporaryDirectory()
+        cls.bundleFilepath = os.path.join( cls.tempFolder.name, ReferenceDataBundle.BUNDLE_FILENAME )
+        assert ReferenceDataBundle.buildReferenceDataBundle( cls.bundleFilepath )
+
+    @classmethod
+    def tearDownClass( cls ):
+        cls.tempFolder.cleanup()
+
+    def setUp( self ):
+        self.bundle = ReferenceDataBundle.ReferenceDataBundle( self.bundleFilepath )
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        result = str( self.bundle )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    def test_1020_getSectionNames( self ):
+        """ Test the getSectionNames function. """
+        result = self.bundle.getSectionNames()
+        self.assertEqual( sorted(result), sorted(ReferenceDataBundle.SECTION_SPECS) )
+        for sectionName in result:
+            self.assertIn( sectionName, self.bundle )
+            self.assertTrue( self.bundle.isSectionCurrent( sectionName ) )
+        self.assertNotIn( 'XYZ', self.bundle )
+        self.assertIsNone( self.bundle.getSection( 'XYZ' ) )
+    # end of test_1020_getSectionNames
+
+    def test_1030_matchesSources( self ):
+        """ Test that each section gives the same data as the slow (converter/pickle) loading. """
+        for sectionName in ('BibleBooksCodes','USFM3Markers','BibleBookOrders','BibleVersificationSystems','BibleOrganisationalSystems'):
+            bundleData = self.bundle.getSection( sectionName )
+            sourceData = ReferenceDataBundle._loadSectionFromSources( sectionName )
+            if isinstance( sourceData, dict ): self.assertEqual( dict(bundleData), sourceData )
+            else: self.assertEqual( bundleData, sourceData )
+    # end of test_1030_matchesSources
+
+    def test_1040_lazySection( self ):
+        """ Test that split sections only load the entries that are used. """
+        versificationSystems = self.bundle.getSection( 'BibleVersificationSystems' )
+        self.assertIn( 'KJV', versificationSystems )
+        self.assertIn( '0/', repr(versificationSystems) ) # Nothing loaded yet
+        self.assertEqual( versificationSystems['KJV']['CV']['GEN']['numChapters'], '50' )
+        self.assertIn( '1/', repr(versificationSystems) )
+        self.assertRaises( KeyError, versificationSystems.__getitem__, 'XYZ' )
+        self.assertIs( self.bundle.getSection( 'BibleVersificationSystems' ), versificationSystems ) # Cached
+        unpickled = pickle.loads( pickle.dumps( versificationSystems ) )
+        self.assertTrue( isinstance( unpickled, dict ) )
+        self.assertEqual( len(unpickled), len(versificationSystems) )
+    # end of test_1040_lazySection
+
+    def test_1050_checkReferenceDataConsistency( self ):
+        """ Test the checkReferenceDataConsistency function. """
+        sectionsDict = { sectionName:self.bundle.getSection( sectionName ) for sectionName in self.bundle.getSectionNames() }
+        self.assertEqual( ReferenceDataBundle.checkReferenceDataConsistency( sectionsDict ), [] )
+        badBookOrderDicts, badBookOrderLists = sectionsDict['BibleBookOrders']
+        badBookOrderLists = { 'Bad':['GEN','XYZ'] }
+        sectionsDict['BibleBookOrders'] = badBookOrderDicts, badBookOrderLists
+        result = ReferenceDataBundle.checkReferenceDataConsistency( sectionsDict )
+        self.assertTrue( any( 'XYZ' in error for error in result ) )
+        del sectionsDict['USFM3Markers']
+        result = ReferenceDataBundle.checkReferenceDataConsistency( sectionsDict )
+        self.assertEqual( result, ['Missing or empty USFM3Markers section'] )
+    # end of test_1050_checkReferenceDataConsistency
+
+    def test_1060_badFile( self ):
+        """ Test that an invalid bundle file is rejected. """
+        badFilepath = os.path.join( self.tempFolder.name, 'Bad.bundle' )
+        with open( badFilepath, 'wb' ) as badFile: badFile.write( b'Not a bundle' )
+        self.assertRaises( ValueError, ReferenceDataBundle.ReferenceDataBundle, badFilepath )
+    # end of test_1060_badFile
+
+    def test_1070_buildOnFirstUse( self ):
+        """ Test that the standard bundle gets built (or rebuilt if it's unusable) when it's first used. """
+        standardFilepath = Path( self.tempFolder.name ).joinpath( 'Cache', ReferenceDataBundle.BUNDLE_FILENAME )
+        with mock.patch.object( ReferenceDataBundle, 'STANDARD_BUNDLE_FILEPATH', standardFilepath ):
+            try:
+                ReferenceDataBundle._resetStandardBundle()
+                BBCDicts = ReferenceDataBundle.getReferenceDataSection( 'BibleBooksCodes' )
+                self.assertTrue( standardFilepath.is_file() )
+                self.assertEqual( dict(BBCDicts), dict(self.bundle.getSection( 'BibleBooksCodes' )) )
+
+                with open( standardFilepath, 'wb' ) as badFile: badFile.write( b'Not a bundle' )
+                ReferenceDataBundle._resetStandardBundle()
+                self.assertIsNotNone( ReferenceDataBundle.getReferenceDataSection( 'USFM3Markers' ) )
+                self.assertTrue( ReferenceDataBundle.ReferenceDataBundle( standardFilepath ).isSectionCurrent( 'USFM3Markers' ) )
+            finally: ReferenceDataBundle._resetStandardBundle()
+    # end of test_1070_buildOnFirstUse
+# end of ReferenceDataBundleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of ReferenceDataBundleTests.py
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SQLiteBulkWriterTests.py
+#
+# Module testing SQLiteBulkWriter.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing SQLiteBulkWriter.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "SQLite bulk writer tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import sqlite3
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput.SQLiteBulkWriter import SQLiteBulkWriter
+
+
+class SQLiteBulkWriterTests( unittest.TestCase ):
+    """ Unit tests for the SQLiteBulkWriter class. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join( self.tempFolder.name, 'Test.SQLite3' )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def writeVerses( self, numVerses:int ) -> SQLiteBulkWriter:
+        """ Write a one-chapter verses table (with a deferred index). """
+        with SQLiteBulkWriter( self.filepath ) as writer:
+            writer.execute( 'CREATE TABLE verses (book_number NUMERIC, chapter NUMERIC, verse NUMERIC, text TEXT)' )
+            writer.deferStatement( 'CREATE UNIQUE INDEX verses_index on "verses" (book_number, chapter, verse)' )
+            self.assertEqual( writer.executemany( 'INSERT INTO verses VALUES(?,?,?,?)', ((10,1,V,f'Verse {V}') for V in range( 1, numVerses+1 )) ), numVerses )
+            writer.cursor.execute( "SELECT count(*) FROM sqlite_master WHERE type='index'" )
+            self.assertEqual( writer.cursor.fetchone()[0], 0 ) # The index isn't made until the end
+        return writer
+
+    def readVerses( self ):
+        """ Returns the verse rows and the names of the indexes. """
+        connection = sqlite3.connect( self.filepath )
+        try:
+            rows = connection.execute( 'SELECT verse, text FROM verses ORDER BY verse' ).fetchall()
+            indexNames = [row[0] for row in connection.execute( "SELECT name FROM sqlite_master WHERE type='index'" )]
+        finally: connection.close()
+        return rows, indexNames
+
+    def test_1010_write( self ):
+        """ Test that everything is committed (with the deferred statements run) at the end. """
+        writer = self.writeVerses( 31 )
+        self.assertEqual( writer.numRows, 31 )
+        self.assertIsNone( writer.connection )
+        self.assertEqual( writer.deferredStatements, [] )
+        self.assertIn( '(closed)', str(writer) )
+        rows, indexNames = self.readVerses()
+        self.assertEqual( len(rows), 31 )
+        self.assertEqual( rows[-1], (31,'Verse 31') )
+        self.assertEqual( indexNames, ['verses_index'] )
+    # end of test_1010_write
+
+    def test_1020_replace( self ):
+        """ Test that an existing file is replaced (rather than added to). """
+        self.writeVerses( 31 )
+        self.writeVerses( 5 )
+        rows, indexNames = self.readVerses()
+        self.assertEqual( len(rows), 5 )
+    # end of test_1020_replace
+
+    def test_1030_abandon( self ):
+        """ Test that the incomplete file is deleted if there's an exception. """
+        def makeRows():
+            yield (10,1,1,'Verse 1')
+            raise ValueError( "Can't make the second row" )
+        with self.assertRaises( ValueError ):
+            with SQLiteBulkWriter( self.filepath ) as writer:
+                writer.execute( 'CREATE TABLE verses (book_number NUMERIC, chapter NUMERIC, verse NUMERIC, text TEXT)' )
+                writer.executemany( 'INSERT INTO verses VALUES(?,?,?,?)', makeRows() )
+        self.assertIsNone( writer.connection )
+        self.assertFalse( os.path.exists( self.filepath ) )
+    # end of test_1030_abandon
+# end of SQLiteBulkWriterTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of SQLiteBulkWriterTests.py
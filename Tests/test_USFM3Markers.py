@@ -553,6 +553,20 @@ class USFM3MarkersTests( unittest.TestCase ):
         self.assertEqual( self.UMs.getMarkerListFromText('This \\bk book\\bk* is good'), \
                                 [('bk',5,' ','\\bk ',['bk'],1,'book'), ('bk',13,'*','\\bk*',[],None,' is good')] )
     #end of test_2210_getMarkerListFromText
+
+    def test_2220_lookupTables( self ):
+        """ Test the precompiled lookup tables and the removeInternalSFMs function. """
+        for marker in ('p','q','q1','s2','v','c','f','x','fr','wj','tc2','nd','xyz','v~',''):
+            self.assertEqual( marker in self.UMs.newlineMarkerSet, marker in self.UMs.getNewlineMarkersList( 'Combined' ) )
+            self.assertEqual( marker in self.UMs.characterMarkerSet, marker in self.UMs.getCharacterMarkersList( expandNumberableMarkers=True ) )
+        self.assertEqual( self.UMs.toStandardMarker( 'q' ), 'q1' )
+        self.assertEqual( self.UMs.getMarkerClosureType( 'xyz' ), False )
+        for text in ('', 'plain', 'In \\wj the\\wj* \\add \\+nd Lord\\+nd*\\add*', '\\w heaven|strong="H8064"\\w*'):
+            result = text
+            for SFM in self.UMs.internalSFMsToRemove: result = result.replace( SFM, '' )
+            self.assertEqual( self.UMs.removeInternalSFMs( text ), result )
+        self.assertEqual( self.UMs.removeInternalSFMs( '\\+nd Lord\\+nd*' ), ' Lord' )
+    #end of test_2220_lookupTables
 # end of USFM3MarkersTests class
 
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# USFMBookCompareTests.py
+#
+# Module testing USFMBookCompare.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing USFMBookCompare.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "USFM book compare tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import random
+import unittest
+import sys
+import shutil
+import tempfile
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Misc import USFMBookCompare
+
+
+class USFMBookCompareTests( unittest.TestCase ):
+    """ Unit tests for the USFMBookCompare functions. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+        cls.filepath1 = BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest2/MBT01GEN.SCP' )
+        cls.filepath2 = BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest2/MBT01GEN.SCP.BAK' )
+
+    def setUp( self ):
+        self.savedMaxProcesses = BibleOrgSysGlobals.maxProcesses
+
+    def tearDown( self ):
+        BibleOrgSysGlobals.maxProcesses = self.savedMaxProcesses
+
+    def test_1010_diffUSFMLines( self ):
+        """ Test inserted, deleted, and changed verses (including a repeated verse number). """
+        lines1 = [('id','JDE'), ('c','1'), ('p',''), ('v','1 One.'), ('v','2 Two.'), ('v','3 Three.'), ('v','4 Four.'), ('v','4 Four again.')]
+        lines2 = [('id','JDE'), ('c','1'), ('p',''), ('v','1 One.'), ('v','3 Thre.'), ('v','3a New.'), ('v','4 Four.'), ('v','4 Four again!')]
+        self.assertEqual( USFMBookCompare.tokenizeUSFMLines( lines1 )[:4], [('id','0:0','JDE'), ('c','1:0','1'), ('p','1:0',''), ('v','1:1','1 One.')] )
+        self.assertEqual( USFMBookCompare.diffUSFMLines( lines1, lines2 ),
+                            [('deleted','1:2',(('v','2 Two.'),),()),
+                             ('changed','1:3',(('v','3 Three.'),),(('v','3 Thre.'),)),
+                             ('inserted','1:3a',(),(('v','3a New.'),)),
+                             ('changed','1:4',(('v','4 Four.'),('v','4 Four again.')),(('v','4 Four.'),('v','4 Four again!')))] )
+        self.assertEqual( USFMBookCompare.diffUSFMLines( lines1, lines1 ), [] )
+    # end of test_1010_diffUSFMLines
+
+    def test_1020_USFMBookDiff( self ):
+        """ Test comparing two versions of a book file. """
+        deltas = USFMBookCompare.USFMBookDiff( self.filepath1, self.filepath2 )
+        self.assertEqual( [(changeType,reference) for changeType,reference,lines1,lines2 in deltas],
+                            [('changed','0:0'), ('changed','3:0'), ('changed','50:0'), ('changed','50:1')] )
+        self.assertEqual( deltas[3][3][1], ('v','1 Duplicate verse number. >>>>>> asdjk239sd090') )
+        resultDict = USFMBookCompare.USFMBookCompare( self.filepath1, self.filepath2 )
+        self.assertEqual( resultDict['Summary']['Verses'], "4 changed, 0 only in file1, 0 only in file2" )
+    # end of test_1020_USFMBookDiff
+
+    def test_1030_USFMFolderDiff( self ):
+        """ Test comparing folders of books using multiple processes. """
+        BibleOrgSysGlobals.maxProcesses = 2
+        with tempfile.TemporaryDirectory() as folderpath:
+            folderpath1, folderpath2 = os.path.join( folderpath, 'One' ), os.path.join( folderpath, 'Two' )
+            os.mkdir( folderpath1 ); os.mkdir( folderpath2 )
+            for filename in ('MBT41MAT.SCP','MBT66JUD.SCP','MBT67REV.SCP'):
+                shutil.copy( BibleOrgSysGlobals.BOS_TEST_DATA_FOLDERPATH.joinpath( 'USFMTest2/', filename ), folderpath1 )
+            shutil.copy( self.filepath2, os.path.join( folderpath2, 'MBT01GEN.SCP' ) )
+            for filename in ('MBT41MAT.SCP','MBT66JUD.SCP'):
+                with open( os.path.join( folderpath1, filename ), 'rt', encoding='utf-8' ) as myFile: text = myFile.read()
+                with open( os.path.join( folderpath2, filename ), 'wt', encoding='utf-8' ) as myFile:
+                    myFile.write( text.replace( '\\v 3 ', '\\v 3 Changed ' ) if filename=='MBT66JUD.SCP' else text )
+            resultDict = USFMBookCompare.USFMFolderDiff( folderpath1, folderpath2 )
+        self.assertEqual( resultDict['OnlyIn1'], ['REV'] )
+        self.assertEqual( resultDict['OnlyIn2'], ['GEN'] )
+        self.assertEqual( list( resultDict['Deltas'] ), ['MAT','JDE'] )
+        self.assertEqual( resultDict['Deltas']['MAT'], [] )
+        self.assertEqual( [(changeType,reference) for changeType,reference,lines1,lines2 in resultDict['Deltas']['JDE']], [('changed','1:3')] )
+    # end of test_1030_USFMFolderDiff
+
+    def test_1040_myersMatch( self ):
+        """ Test that the linear space Myers matching finds a longest common subsequence. """
+        def getLCSLength( sequence1, sequence2 ):
+            previousRow = [0] * (len(sequence2)+1)
+            for entry1 in sequence1:
+                thisRow = [0]
+                for ix2,entry2 in enumerate( sequence2 ):
+                    thisRow.append( previousRow[ix2]+1 if entry1==entry2 else max( previousRow[ix2+1], thisRow[ix2] ) )
+                previousRow = thisRow
+            return previousRow[-1]
+        randomGenerator = random.Random( 1 )
+        for j in range( 300 ):
+            sequence1 = [randomGenerator.choice( 'abcd' ) for _ in range( randomGenerator.randint( 0, 30 ) )]
+            sequence2 = [randomGenerator.choice( 'abcd' ) for _ in range( randomGenerator.randint( 0, 30 ) )]
+            matches = USFMBookCompare._myersMatch( sequence1, sequence2 )
+            self.assertEqual( len(matches), getLCSLength( sequence1, sequence2 ) )
+            for (ix1,ix2),(nextIx1,nextIx2) in zip( matches, matches[1:] ):
+                self.assertLess( ix1, nextIx1 ); self.assertLess( ix2, nextIx2 )
+            for ix1,ix2 in matches: self.assertEqual( sequence1[ix1], sequence2[ix2] )
+        self.assertEqual( len(USFMBookCompare._myersMatch( list( 'abcabba' ), list( 'cbabac' ) )), 4 ) # The example from Myers' paper
+        self.assertEqual( USFMBookCompare._myersMatch( list( range( 1000 ) ), list( range( 1000, 2000 ) ) ), [] ) # Completely different
+    # end of test_1040_myersMatch
+# end of USFMBookCompareTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of USFMBookCompareTests.py
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# XMLValidatorTests.py
+#
+# Module testing XMLValidator.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing XMLValidator.py.
+
+Only runs if lxml (or xmllint) is available.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-01' # by RJH
+PROGRAM_NAME = "XML Validator tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput import XMLValidator
+
+
+canValidate = XMLValidator.etree is not None or os.access( XMLValidator.XMLLINT_FILEPATH, os.X_OK )
+TEST_SCHEMA = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:element name="book" type="xs:string"/></xs:schema>'
+
+
+class XMLValidatorTests( unittest.TestCase ):
+    """ Unit tests for the XMLValidator object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.schemaFilepath = self.makeFile( 'Test.xsd', TEST_SCHEMA )
+        self.validator = XMLValidator.XMLValidator()
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def makeFile( self, filename, text ):
+        filepath = os.path.join( self.tempFolder.name, filename )
+        with open( filepath, 'wt', encoding='utf-8' ) as myFile: myFile.write( text )
+        return filepath
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        result = str( self.validator )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    @unittest.skipUnless( canValidate, "Needs lxml or xmllint" )
+    def test_1020_validate( self ):
+        """ Test validating good and bad files. """
+        goodFilepath = self.makeFile( 'Good.xml', '<book>Good</book>' )
+        self.assertEqual( self.validator.validate( goodFilepath, self.schemaFilepath ), (0,'','') )
+        result = self.validator.validate( self.makeFile( 'Bad.xml', '<chapter>Bad</chapter>' ), self.schemaFilepath, 'BadBook' )
+        self.assertEqual( result[0], 3 )
+        self.assertTrue( result[2].startswith( 'BadBook:\n' ) )
+        self.assertEqual( self.validator.validate( goodFilepath, self.makeFile( 'Broken.xsd', '<xs:schema' ) )[0], 5 )
+    # end of test_1020_validate
+
+    @unittest.skipUnless( XMLValidator.etree is not None, "Needs lxml" )
+    def test_1030_validateMany( self ):
+        """ Test that the schema is only compiled once per thread. """
+        filepathsAndNames = [(self.makeFile( f'Book{j}.xml', '<book>Good</book>' ),None) for j in range( 10 )]
+        results = self.validator.validateMany( filepathsAndNames, self.schemaFilepath, maxThreads=1 )
+        self.assertEqual( results, [(0,'','')]*10 )
+        self.assertEqual( self.validator.stats['compiledSchemas'], 1 )
+        results = self.validator.validateMany( filepathsAndNames, self.schemaFilepath, maxThreads=3 )
+        self.assertEqual( results, [(0,'','')]*10 )
+        self.assertLessEqual( self.validator.stats['compiledSchemas'], 4 )
+    # end of test_1030_validateMany
+
+    @unittest.skipUnless( XMLValidator.etree is not None, "Needs lxml" )
+    def test_1040_validateManyAgain( self ):
+        """ Test that later calls reuse the same threads (and their compiled schemas). """
+        filepathsAndNames = [(self.makeFile( f'Book{j}.xml', '<book>Good</book>' ),None) for j in range( 10 )]
+        for _k in range( 5 ):
+            self.assertEqual( self.validator.validateMany( filepathsAndNames, self.schemaFilepath, maxThreads=2 ), [(0,'','')]*10 )
+        self.assertLessEqual( self.validator.stats['compiledSchemas'], 2 ) # Once per pool thread
+        self.validator.close()
+        self.assertEqual( self.validator.validateMany( filepathsAndNames[:2], self.schemaFilepath, maxThreads=2 ), [(0,'','')]*2 )
+        self.validator.close()
+    # end of test_1040_validateManyAgain
+# end of XMLValidatorTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of XMLValidatorTests.py
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# ZipPackagerTests.py
+#
+# Module testing ZipPackager.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing ZipPackager.py.
+
+The archives are checked by reading them back with zipfile.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "ZIP Packager tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import unittest
+import sys
+import tempfile
+import zipfile
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.InputOutput import ZipPackager
+
+
+class ZipPackagerTests( unittest.TestCase ):
+    """ Unit tests for the ZipPackager object. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+        self.folderpath = self.tempFolder.name
+        self.fileContents = {}
+        for BBB in ('GEN','EXO','LEV','NUM'):
+            self.fileContents[f'{BBB}.txt'] = f'\\id {BBB}\n'.encode( 'utf-8' ) * (1000 if BBB=='GEN' else 10)
+            with open( os.path.join( self.folderpath, f'{BBB}.txt' ), 'wb' ) as myFile:
+                myFile.write( self.fileContents[f'{BBB}.txt'] )
+        self.zipFilepath = os.path.join( self.folderpath, 'AllFiles.zip' )
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def test_1010_str( self ):
+        """ Test the __str__ function. """
+        result = str( ZipPackager.ZipPackager( self.zipFilepath ) )
+        self.assertTrue( isinstance( result, str ) )
+        self.assertGreater( len(result), 20 )
+    # end of test_1010_str
+
+    def test_1020_addAndFolder( self ):
+        """ Test adding files, bytes, and the rest of a folder. """
+        with ZipPackager.ZipPackager( self.zipFilepath, maxThreads=3 ) as zipPackager:
+            self.assertTrue( zipPackager.addFile( os.path.join( self.folderpath, 'LEV.txt' ) ) )
+            self.assertTrue( zipPackager.addBytes( 'Ñotes/ἀρχῇ.txt', 'ἐν ἀρχῇ\n'.encode( 'utf-8' ) ) )
+            self.assertEqual( zipPackager.addFolder( self.folderpath ), 3 ) # Not LEV again, and not ourself
+            self.assertFalse( zipPackager.addFile( os.path.join( self.folderpath, 'GEN.txt' ) ) ) # Already there
+        with zipfile.ZipFile( self.zipFilepath ) as zf:
+            self.assertIsNone( zf.testzip() )
+            self.assertEqual( zf.namelist()[:2], ['LEV.txt','Ñotes/ἀρχῇ.txt'] ) # In the order they were added
+            self.assertEqual( len(zf.namelist()), 5 )
+            self.assertEqual( zf.read( 'Ñotes/ἀρχῇ.txt' ), 'ἐν ἀρχῇ\n'.encode( 'utf-8' ) )
+            for filename,contents in self.fileContents.items():
+                self.assertEqual( zf.read( filename ), contents )
+                self.assertEqual( zf.getinfo( filename ).compress_type, zipfile.ZIP_DEFLATED )
+    # end of test_1020_addAndFolder
+
+    def test_1030_zipFolderAndAbandon( self ):
+        """ Test the convenience function (with extension filters) and deleting an incomplete archive. """
+        self.assertEqual( ZipPackager.zipFolder( self.zipFilepath, self.folderpath, includeExtensions=('.txt',) ), 4 )
+        self.assertEqual( ZipPackager.zipFolder( self.zipFilepath+'2', self.folderpath, excludeExtensions=('O.txt','V.txt','.zip') ), 2 )
+        with zipfile.ZipFile( self.zipFilepath+'2' ) as zf:
+            self.assertEqual( sorted( zf.namelist() ), ['GEN.txt','NUM.txt'] )
+        with self.assertRaises( ValueError ):
+            with ZipPackager.ZipPackager( self.zipFilepath ) as zipPackager:
+                zipPackager.addFolder( self.folderpath )
+                raise ValueError( "Stopped" )
+        self.assertFalse( os.path.exists( self.zipFilepath ) )
+    # end of test_1030_zipFolderAndAbandon
+# end of ZipPackagerTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser, exportAvailable=True )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of ZipPackagerTests.py
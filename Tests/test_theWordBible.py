@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# theWordBibleTests.py
+#
+# Module testing theWordBible.py
+#
+# Copyright (C) 2021 Robert Hunt
+# Author: Robert Hunt <Freely.Given.org+BOS@gmail.com>
+# License: See gpl-3.0.txt
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module testing theWordBible.py.
+"""
+
+LAST_MODIFIED_DATE = '2021-02-02' # by RJH
+PROGRAM_NAME = "theWord Bible tests"
+PROGRAM_VERSION = '0.01'
+programNameVersion = f'{PROGRAM_NAME} v{PROGRAM_VERSION}'
+
+
+import os.path
+import shutil
+import tempfile
+import unittest
+import sys
+
+BOSTopFolderpath = os.path.dirname( os.path.dirname( __file__ ) )
+if BOSTopFolderpath not in sys.path:
+    sys.path.insert( 0, BOSTopFolderpath ) # So we can run it from the above folder and still do these imports
+from BibleOrgSys import BibleOrgSysGlobals
+from BibleOrgSys.BibleOrgSysGlobals import fnPrint, vPrint, dPrint
+from BibleOrgSys.Reference.VerseReferences import SimpleVerseKey
+from BibleOrgSys.Formats.USFMBible import USFMBible
+from BibleOrgSys.Formats import theWordBible
+
+
+testFilepath = os.path.join( os.path.dirname( __file__ ), 'DataFilesForTests/USFMTest2/MBT66JUD.SCP' ) # Just one NT book
+
+
+class theWordBibleTests( unittest.TestCase ):
+    """ Unit tests for the theWord verse tables and modules. """
+
+    @classmethod
+    def setUpClass( cls ):
+        parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+        BibleOrgSysGlobals.preloadCommonData()
+
+    def setUp( self ):
+        self.tempFolder = tempfile.TemporaryDirectory()
+
+    def tearDown( self ):
+        self.tempFolder.cleanup()
+
+    def makeModule( self ):
+        """ Export Jude to a theWord module and return the USFM Bible. """
+        sourceFolderpath = os.path.join( self.tempFolder.name, 'USFM/' )
+        os.mkdir( sourceFolderpath )
+        shutil.copy( testFilepath, sourceFolderpath )
+        USFMBibleObject = USFMBible( sourceFolderpath, 'Test', 'TST' )
+        USFMBibleObject.loadBooks()
+        self.assertTrue( USFMBibleObject.totheWord( self.tempFolder.name ) )
+        return USFMBibleObject
+
+    def test_1010_verseTables( self ):
+        """ Test the line number <-> verse lookups for each volume type. """
+        for volumeType, numLines, numBooks, firstBCV, lastBCV in ( ('OT',23145,39,('GEN',1,1),('MAL',4,6)),
+                                                                    ('NT',7957,27,('MAT',1,1),('REV',22,21)),
+                                                                    ('BOTH',31102,66,('GEN',1,1),('REV',22,21)) ):
+            verseTable = theWordBible.getTheWordVerseTable( volumeType )
+            self.assertIs( theWordBible.getTheWordVerseTable( volumeType ), verseTable ) # Only made once
+            self.assertEqual( len(verseTable), numLines )
+            self.assertEqual( len(verseTable.books), numBooks )
+            self.assertEqual( verseTable.getBBBCV( 0 ), firstBCV )
+            self.assertEqual( verseTable.getBBBCV( numLines-1 ), lastBCV )
+            self.assertEqual( verseTable.getBBBCV( numLines+2 ), ('MDA',0,2) )
+            self.assertEqual( theWordBible.theWordGetBBBCV( numLines-1, volumeType ), lastBCV )
+            for lineNumber in range( 0, numLines, 97 ):
+                BBB, C, V = verseTable.getBBBCV( lineNumber )
+                self.assertEqual( verseTable.getLineNumber( BBB, str(C), str(V) ), lineNumber )
+                self.assertIn( lineNumber, verseTable.getBookLines( BBB ) )
+            self.assertEqual( sum( len(verseTable.getBookLines( BBB )) for BBB in verseTable.books ), numLines )
+            self.assertEqual( len(verseTable.bookLastLines), numBooks )
+        NTTable = theWordBible.getTheWordVerseTable( 'NT' )
+        self.assertEqual( NTTable.getLineNumber( 'MAT', 1, 1 ), 0 )
+        self.assertIsNone( NTTable.getLineNumber( 'GEN', 1, 1 ) )
+        self.assertIsNone( NTTable.getLineNumber( 'MAT', 'x', 1 ) )
+        self.assertEqual( len(NTTable.getBookLines( 'GEN' )), 0 )
+        with self.assertRaises( TypeError ):
+            NTTable.BCVLines[('GEN',1,1)] = 0 # It's immutable
+    # end of test_1010_verseTables
+
+    def test_1020_roundTrip( self ):
+        """ Test that exporting a module and loading it again gives the same verse text (and the same export). """
+        USFMBibleObject = self.makeModule()
+        self.assertTrue( os.path.isfile( os.path.join( self.tempFolder.name, 'TST.nt' ) ) )
+        theWordBibleObject = theWordBible.theWordBible( self.tempFolder.name, 'TST.nt' )
+        theWordBibleObject.load()
+        self.assertEqual( theWordBibleObject.getBookList(), ['JDE'] )
+        for V in range( 1, 26 ):
+            verseKey = SimpleVerseKey( 'JDE', '1', str(V) )
+            self.assertEqual( theWordBibleObject.getVerseText( verseKey ).replace( '¶', '' ), # (Paragraphs can move slightly)
+                                USFMBibleObject.getVerseText( verseKey ).replace( '¶', '' ) )
+        reexportFolderpath = os.path.join( self.tempFolder.name, 'Reexport/' )
+        self.assertTrue( theWordBibleObject.totheWord( reexportFolderpath ) )
+        with open( os.path.join( self.tempFolder.name, 'TST.nt' ), 'rb' ) as firstFile, \
+             open( os.path.join( reexportFolderpath, 'TST.nt' ), 'rb' ) as secondFile:
+            self.assertEqual( secondFile.read(), firstFile.read() )
+    # end of test_1020_roundTrip
+
+    def test_1030_getVerseLine( self ):
+        """ Test reading single verse lines without loading the module. """
+        self.makeModule()
+        theWordBibleObject = theWordBible.theWordBible( self.tempFolder.name, 'TST.nt' )
+        self.assertEqual( theWordBibleObject.getVerseLine( 'JDE', '1', '2' ),
+                            'Ka Manama ka egbehey kaniyu te timul pad ne keyid-u, keupianan wey geyinawa.<CM>' )
+        self.assertEqual( theWordBibleObject.getVerseLine( 'MAT', 1, 1 ), '' )
+        self.assertIsNone( theWordBibleObject.getVerseLine( 'GEN', '1', '1' ) ) # Not in an NT module
+        with open( theWordBibleObject.sourceFilepath, 'wt', encoding='utf-8' ) as moduleFile: # Change it
+            moduleFile.write( 'First line\nSecond line\n' )
+        self.assertEqual( theWordBibleObject.getVerseLine( 'MAT', '1', '2' ), 'Second line' ) # It gets indexed again
+        self.assertIsNone( theWordBibleObject.getVerseLine( 'MAT', '1', '3' ) ) # Past the end of the file
+    # end of test_1030_getVerseLine
+# end of theWordBibleTests class
+
+
+if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support() # Multiprocessing support for frozen Windows executables
+
+    # Configure basic set-up
+    parser = BibleOrgSysGlobals.setup( PROGRAM_NAME, PROGRAM_VERSION, LAST_MODIFIED_DATE )
+    BibleOrgSysGlobals.addStandardOptionsAndProcess( parser )
+
+    vPrint( 'Normal', False, programNameVersion )
+
+    unittest.main() # Automatically runs all of the above tests
+# end of theWordBibleTests.py